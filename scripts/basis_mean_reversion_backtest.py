@@ -27,6 +27,7 @@ from __future__ import annotations
 
 import argparse
 import sqlite3
+import sys
 from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass
@@ -34,6 +35,12 @@ from pathlib import Path
 
 import numpy as np
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.stats import rolling_mean_std
+
 TAKER_FEE_BPS = {
     "coinbase": 6.0,
     "hyperliquid": 3.5,
@@ -82,36 +89,13 @@ def load_venue_ticks(db_path: Path) -> dict[str, VenueTicks]:
     return out
 
 
-def rolling_mean_std(
-    x: np.ndarray, window_ms: int, ts: np.ndarray,
-) -> tuple[np.ndarray, np.ndarray]:
-    """Rolling mean and std of x over a trailing window_ms. Expanding until full."""
-    n = len(x)
-    mean = np.zeros(n)
-    std = np.zeros(n)
-    csum = np.cumsum(x)
-    csum2 = np.cumsum(x * x)
-    j_start = 0
-    for i in range(n):
-        while ts[i] - ts[j_start] > window_ms and j_start < i:
-            j_start += 1
-        count = i - j_start + 1
-        s1 = csum[i] - (csum[j_start - 1] if j_start > 0 else 0.0)
-        s2 = csum2[i] - (csum2[j_start - 1] if j_start > 0 else 0.0)
-        m = s1 / count
-        var = max(s2 / count - m * m, 0.0)
-        mean[i] = m
-        std[i] = var ** 0.5
-    return mean, std
-
-
 def describe_deviations(venues: dict[str, VenueTicks], window_ms: int) -> None:
     print(f"\nrolling basis stats (window={window_ms/60000:.0f} min):")
     print(f"{'venue':<14} {'n':>8} {'mean':>10} {'std_of_basis':>14} "
           f"{'abs_z>2':>10} {'abs_z>3':>10}")
     print("-" * 72)
     for venue, vt in sorted(venues.items()):
-        mean, std = rolling_mean_std(vt.basis_estimate, window_ms, vt.ts)
+        mean, std = rolling_mean_std(vt.ts, vt.basis_estimate, window_ms)
         good = std > 0.01
         z = np.where(good, (vt.basis_estimate - mean) / np.maximum(std, 1e-9), 0.0)
         pct2 = (np.abs(z[good]) > 2).mean() if good.any() else 0.0
@@ -167,7 +151,7 @@ def backtest_venue(
     else:
         basis_series = vt.basis_estimate
 
-    mean, std = rolling_mean_std(basis_series, window_ms, vt.ts)
+    mean, std = rolling_mean_std(vt.ts, basis_series, window_ms)
     z = np.where(std > 0.01, (basis_series - mean) / np.maximum(std, 1e-9), 0.0)
 
     ref_ts = rt.ts.tolist()
@@ -0,0 +1,189 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Time the icarus.dex LP engine on a range/trigger grid.
+
+Runs, over one swap history:
+
+  * the passive fixed-range sweep for every ``--range-pcts`` width in one
+    batched call, and again as one call per width;
+  * a per-swap Python loop for a single width, the shape of the research
+    scripts before icarus.dex, as the baseline (its grid time is that
+    times the number of widths);
+  * the active rebalancing simulation for every (range, trigger) pair.
+
+Swaps come from ``--swaps``/``--cex`` dumps (see dex_pull_swaps and
+dex_pull_cex_ref) or, without them, a synthetic ``--days``-long random walk.
+
+    scripts/bench_dex_lp.py
+    scripts/bench_dex_lp.py --swaps data/dex_cache/swaps_0x96d4b53a_30d.jsonl.gz \\
+        --cex data/dex_cache/cex_eth_1m_30d.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.dex import (
+    Q96,
+    CexReference,
+    SwapArrays,
+    SwapPath,
+    load_cex,
+    load_swaps,
+    passive_lp_sweep,
+    price_to_sqrtx96,
+    range_bounds,
+    simulate_active_lp,
+)
+
+
+def synthetic_swaps(days: float, mean_gap_s: float, seed: int) -> tuple[SwapArrays, CexReference]:
+    rng = np.random.default_rng(seed)
+    n = int(days * 86_400 / mean_gap_s)
+    timestamp = 1_700_000_000 + np.cumsum(rng.integers(0, int(2 * mean_gap_s) + 1, n)).astype(
+        np.int64
+    )
+    price = 3_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.0004, n)))
+    sqrt_price = price_to_sqrtx96(price)
+    pool_liquidity = 5e17 * rng.uniform(0.5, 2.0, n)
+    amount1 = pool_liquidity * np.diff(sqrt_price, prepend=sqrt_price[0]) / Q96 / 1e6
+    amount0 = -amount1 / price
+    swaps = SwapArrays(
+        timestamp=timestamp,
+        log_index=np.arange(n, dtype=np.int64),
+        sqrt_price_x96=sqrt_price,
+        amount0=amount0,
+        amount1=amount1,
+        amount_usd=np.abs(amount0) * price,
+    )
+    bars = np.arange(timestamp[0] - 60, timestamp[-1] + 60, 60, dtype=np.int64)
+    cex = CexReference(
+        timestamp=bars,
+        price=np.interp(bars, timestamp, price) * np.exp(rng.normal(0.0, 0.0003, len(bars))),
+    )
+    return swaps, cex
+
+
+def scalar_value(
+    liquidity: float, sqrt_p: float, sqrt_lo: float, sqrt_hi: float, mark: float
+) -> float:
+    if sqrt_p <= sqrt_lo:
+        x, y = liquidity * (1.0 / sqrt_lo - 1.0 / sqrt_hi) * Q96, 0.0
+    elif sqrt_p >= sqrt_hi:
+        x, y = 0.0, liquidity * (sqrt_hi - sqrt_lo) / Q96
+    else:
+        x, y = (
+            liquidity * (1.0 / sqrt_p - 1.0 / sqrt_hi) * Q96,
+            liquidity * (sqrt_p - sqrt_lo) / Q96,
+        )
+    return x / 1e18 * mark + y / 1e6
+
+
+def scalar_passive(path: SwapPath, range_pct: float, deposit: float, fee_bps: float) -> float:
+    """Fees plus LVR for one width, one swap at a time in plain floats."""
+    center = path.deposit_price
+    sqrt_lo, sqrt_hi = (float(b) for b in range_bounds(center, range_pct))
+    liquidity = deposit / scalar_value(1.0, path.deposit_sqrt, sqrt_lo, sqrt_hi, center)
+    fees = 0.0
+    lvr = 0.0
+    rows = zip(
+        path.sqrt_pre.tolist(),
+        path.sqrt_post.tolist(),
+        path.amount_usd.tolist(),
+        path.ext_price.tolist(),
+        path.pool_liquidity.tolist(),
+        strict=True,
+    )
+    for sp, sq, usd, ext, pool_l in rows:
+        mid = 0.5 * (sp + sq)
+        if math.isfinite(pool_l) and pool_l > 0 and sqrt_lo <= mid <= sqrt_hi:
+            fees += usd * fee_bps / 10_000.0 * liquidity / pool_l
+        if (sqrt_lo <= sp <= sqrt_hi) or (sqrt_lo <= sq <= sqrt_hi):
+            lvr -= scalar_value(liquidity, sq, sqrt_lo, sqrt_hi, ext) - scalar_value(
+                liquidity, sp, sqrt_lo, sqrt_hi, ext
+            )
+    return fees - lvr
+
+
+def timed(label: str, count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1e3:>10.1f} ms  ({count} configs)")
+    return elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--swaps", type=Path, default=None)
+    ap.add_argument("--cex", type=Path, default=None)
+    ap.add_argument("--days", type=float, default=30.0)
+    ap.add_argument("--mean-gap-s", type=float, default=12.0)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument(
+        "--range-pcts", type=float, nargs="+", default=[float(p) for p in np.arange(0.5, 20.5, 0.5)]
+    )
+    ap.add_argument("--trigger-pcts", type=float, nargs="+", default=[0.5, 1.0, 2.0, 4.0])
+    ap.add_argument("--deposit-usd", type=float, default=10_000.0)
+    ap.add_argument("--fee-bps", type=float, default=5.0)
+    ap.add_argument("--gas-usd", type=float, default=0.5)
+    ap.add_argument("--skip-s", type=float, default=3600.0)
+    args = ap.parse_args()
+
+    if (args.swaps is None) != (args.cex is None):
+        ap.error("--swaps and --cex go together")
+    start = time.perf_counter()
+    if args.swaps is not None:
+        cex = load_cex(args.cex)
+        swaps = load_swaps(args.swaps).window(int(cex.timestamp[0]), int(cex.timestamp[-1]))
+    else:
+        swaps, cex = synthetic_swaps(args.days, args.mean_gap_s, args.seed)
+    path = SwapPath.build(swaps, cex, skip_s=args.skip_s)
+    print(
+        f"{len(path):,} swaps over {path.span_s / 86_400:.1f} days "
+        f"(load + path {(time.perf_counter() - start) * 1e3:.0f} ms)\n"
+    )
+
+    ranges = args.range_pcts
+    common = {"deposit": args.deposit_usd, "fee_bps": args.fee_bps}
+    batched = timed(
+        "passive sweep, batched", len(ranges), lambda: passive_lp_sweep(path, ranges, **common)
+    )
+    timed(
+        "passive sweep, one call per range",
+        len(ranges),
+        lambda: [passive_lp_sweep(path, [r], **common) for r in ranges],
+    )
+    one = timed(
+        "per-swap loop, one range",
+        1,
+        lambda: scalar_passive(path, ranges[len(ranges) // 2], **common),
+    )
+    grid = [(r, t) for r in ranges for t in args.trigger_pcts if t <= r]
+    timed(
+        "active grid",
+        len(grid),
+        lambda: [
+            simulate_active_lp(path, range_pct=r, trigger_pct=t, gas_usd=args.gas_usd, **common)
+            for r, t in grid
+        ],
+    )
+    print(
+        f"\nper-swap loop over the passive grid ~{one * len(ranges):.1f} s "
+        f"({one * len(ranges) / batched:.0f}x the batched sweep)"
+    )
+
+
+if __name__ == "__main__":
+    main()
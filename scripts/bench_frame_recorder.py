@@ -0,0 +1,118 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Microbenchmark the raw frame recorder's cost on the socket read path.
+
+Feeds synthetic venue-sized JSON frames through ``FrameRecorder.record`` as
+fast as possible and reports the per-frame cost seen by the caller (the
+number that lands on a socket's read loop), alongside a bare ``json.loads``
+of the same frames for scale. The writer thread compresses concurrently;
+its throughput, compression ratio and any dropped frames are reported after
+``close``. Finally the recording is read back through the segment index.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.capture.frames import DEFAULT_BLOCK_FRAMES, FrameRecorder, iter_recorded_frames
+
+
+def synthetic_frames(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    mid = 60_000.0
+    frames = []
+    for sequence in range(count):
+        mid += rng.gauss(0.0, 0.5)
+        frames.append(
+            json.dumps(
+                {
+                    "channel": "ticker",
+                    "timestamp": "2026-10-17T12:00:00.000000Z",
+                    "sequence_num": sequence,
+                    "events": [
+                        {
+                            "type": "update",
+                            "tickers": [
+                                {
+                                    "product_id": "BTC-USD",
+                                    "price": f"{mid:.2f}",
+                                    "best_bid": f"{mid - 0.01:.2f}",
+                                    "best_bid_quantity": f"{rng.uniform(0, 2):.8f}",
+                                    "best_ask": f"{mid + 0.01:.2f}",
+                                    "best_ask_quantity": f"{rng.uniform(0, 2):.8f}",
+                                }
+                            ],
+                        }
+                    ],
+                }
+            )
+        )
+    return frames
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--frames", type=int, default=200_000, help="frames to record")
+    p.add_argument("--codec", choices=["gzip", "zstd"], default="gzip")
+    p.add_argument("--level", type=int, default=None, help="compression level")
+    p.add_argument("--block-frames", type=int, default=DEFAULT_BLOCK_FRAMES)
+    p.add_argument("--out-dir", type=Path, default=None,
+                   help="keep the recording here (default: a temporary directory)")
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    frames = synthetic_frames(args.frames, args.seed)
+    raw_mb = sum(len(frame) for frame in frames) / 1e6
+
+    started = time.perf_counter_ns()
+    for frame in frames:
+        json.loads(frame)
+    parse_ns = (time.perf_counter_ns() - started) / len(frames)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.out_dir or Path(tmp)
+        recorder = FrameRecorder(
+            directory,
+            "bench",
+            codec=args.codec,
+            level=args.level,
+            block_frames=args.block_frames,
+        )
+        record = recorder.record
+        started = time.perf_counter_ns()
+        for frame in frames:
+            record(frame)
+        record_ns = (time.perf_counter_ns() - started) / len(frames)
+
+        started = time.perf_counter_ns()
+        recorder.close()
+        drain_ms = (time.perf_counter_ns() - started) / 1e6
+        stats = recorder.stats()
+
+        started = time.perf_counter_ns()
+        replayed = sum(1 for _ in iter_recorded_frames(directory, "bench"))
+        read_s = (time.perf_counter_ns() - started) / 1e9
+
+    print(f"frames={len(frames):,} raw={raw_mb:.1f} MB codec={args.codec}")
+    print(f"record():        {record_ns / 1000:.3f} us/frame (caller side)")
+    print(f"json.loads():    {parse_ns / 1000:.3f} us/frame (for scale)")
+    print(f"writer drain on close: {drain_ms:.1f} ms; blocks={stats.blocks_written} "
+          f"segments={stats.segments} dropped={stats.dropped_frames}")
+    print(f"compressed={stats.compressed_bytes / 1e6:.2f} MB "
+          f"ratio={stats.raw_bytes / max(stats.compressed_bytes, 1):.1f}x")
+    print(f"read back {replayed:,} frames in {read_s:.2f}s ({replayed / read_s:,.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Compare JSON decoding backends on the socket parse path.
+
+Runs venue frames through each installed backend (stdlib, orjson, msgspec)
+via the sockets' own ``parse_message`` and ``convert_message_to_observations``,
+in both numeric modes, and reports the best-of-N time per frame for decoding
+alone and for decoding plus normalisation, with the speedup over the stdlib.
+Every backend's observations are checked against the stdlib's. Kraken always
+keeps float text for its checksums, so its "orjson" row runs on the next best.
+
+Frames come from ``--frames-dir`` (recorded by ``capture_filter_eval
+--record-frames-dir``, sockets built as ``replay_capture`` builds them) or,
+without it, synthetic compact Coinbase level2 update frames. In float mode
+with msgspec those take the typed ``l2_data`` schema.
+
+    scripts/bench_json_decoders.py
+    scripts/bench_json_decoders.py --frames-dir data/frames --asset ETH --limit 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import random
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from multi_venue_basis_fair_value import apply_asset_defaults
+from replay_capture import build_parser as build_replay_parser, replay_sockets
+from icarus.capture.frames import frame_labels, iter_recorded_frames
+from icarus.observations import Observation
+from icarus.sockets.base import BaseSocket
+from icarus.sockets.coinbase import CoinbaseSocket
+from icarus.sockets.decoding import JsonBackend, available_json_backends
+
+NUMERIC_MODES = ("decimal", "float")
+
+
+def synthetic_l2_frames(count: int, updates: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    mid = 60_000.0
+    frames = []
+    for sequence in range(count):
+        mid += rng.gauss(0.0, 0.5)
+        levels = [
+            {
+                "side": "bid" if i % 2 == 0 else "offer",
+                "event_time": "2026-10-17T12:00:00.000000Z",
+                "price_level": f"{mid + (0.01 if i % 2 else -0.01) * (i // 2 + 1):.2f}",
+                "new_quantity": f"{rng.uniform(0, 2):.8f}",
+            }
+            for i in range(updates)
+        ]
+        frames.append(
+            # Compact, as Coinbase sends it.
+            json.dumps(
+                {
+                    "channel": "l2_data",
+                    "client_id": "",
+                    "timestamp": "2026-10-17T12:00:00.000000Z",
+                    "sequence_num": sequence,
+                    "events": [{"type": "update", "product_id": "BTC-USD", "updates": levels}],
+                },
+                separators=(",", ":"),
+            )
+        )
+    return frames
+
+
+def load_frames(args: argparse.Namespace) -> dict[str, list[str | bytes]]:
+    if args.frames_dir is None:
+        return {"coinbase": list(synthetic_l2_frames(args.frames, args.updates, args.seed))}
+    frames: dict[str, list[str | bytes]] = {}
+    for label in frame_labels(args.frames_dir):
+        payloads: list[str | bytes] = []
+        for frame in iter_recorded_frames(args.frames_dir, label):
+            payloads.append(frame.payload)
+            if len(payloads) >= args.limit:
+                break
+        frames[label] = payloads
+    return frames
+
+
+def socket_factory(args: argparse.Namespace) -> Callable[[str, str, JsonBackend], BaseSocket]:
+    replay_args = apply_asset_defaults(build_replay_parser().parse_args(["--asset", args.asset]))
+
+    def build(label: str, numeric_mode: str, backend: JsonBackend) -> BaseSocket:
+        if args.frames_dir is None:
+            return CoinbaseSocket(
+                "BTC-USD",
+                numeric_mode=numeric_mode,  # type: ignore[arg-type]
+                keep_raw_messages=False,
+                json_backend=backend,
+            )
+        replay_args.numeric_mode = numeric_mode
+        replay_args.json_backend = backend
+        return replay_sockets(replay_args)[label][0]
+
+    return build
+
+
+def decode(socket: BaseSocket, frames: list[str | bytes]) -> None:
+    parse = socket.parse_message
+    for frame in frames:
+        parse(frame)
+
+
+def normalise(socket: BaseSocket, frames: list[str | bytes]) -> list[Observation]:
+    parse = socket.parse_message
+    convert: Any = socket.convert_message_to_observations  # type: ignore[attr-defined]
+    observations: list[Observation] = []
+    for frame in frames:
+        observations.extend(convert(parse(frame)))
+    return observations
+
+
+def best_ns(run: Callable[[], object], repeats: int) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter_ns()
+        run()
+        best = min(best, time.perf_counter_ns() - started)
+    return best
+
+
+def comparable(observations: list[Observation]) -> list[Observation]:
+    # Typed decoding keeps only the keys the normalisers read.
+    return [replace(observation, raw_message={}) for observation in observations]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--frames-dir", type=Path, default=None)
+    p.add_argument("--asset", default="BTC", help="markets for --frames-dir sockets")
+    p.add_argument("--limit", type=int, default=20_000, help="frames per venue from --frames-dir")
+    p.add_argument("--frames", type=int, default=20_000, help="synthetic frames")
+    p.add_argument("--updates", type=int, default=20, help="level updates per synthetic frame")
+    p.add_argument("--repeats", type=int, default=5, help="best of this many runs")
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    frames_by_label = load_frames(args)
+    build = socket_factory(args)
+    backends = list(reversed(available_json_backends()))
+    print(f"backends: {', '.join(backends)}")
+    print(
+        "{:<18} {:<8} {:<8} {:>10} {:>8} {:>12} {:>8}".format(
+            "venue", "numeric", "backend", "decode us", "x", "+normal us", "x"
+        )
+    )
+    for label, frames in frames_by_label.items():
+        if not frames:
+            continue
+        for numeric_mode in NUMERIC_MODES:
+            baseline: tuple[float, float] | None = None
+            expected: list[Observation] | None = None
+            for backend in backends:
+                try:
+                    socket = build(label, numeric_mode, backend)
+                except KeyError:
+                    print(f"skipping frames for unknown venue {label!r}")
+                    break
+                observations = comparable(normalise(socket, frames))
+                if expected is None:
+                    expected = observations
+                elif observations != expected:
+                    raise SystemExit(f"{label} {numeric_mode} {backend}: observations differ")
+                decode_ns = best_ns(lambda s=socket, f=frames: decode(s, f), args.repeats)
+                normalise_ns = best_ns(lambda s=socket, f=frames: normalise(s, f), args.repeats)
+                if baseline is None:
+                    baseline = (decode_ns, normalise_ns)
+                print(
+                    f"{label:<18} {numeric_mode:<8} {backend:<8} "
+                    f"{decode_ns / len(frames) / 1000:10.2f} {baseline[0] / decode_ns:7.2f}x "
+                    f"{normalise_ns / len(frames) / 1000:12.2f} "
+                    f"{baseline[1] / normalise_ns:7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
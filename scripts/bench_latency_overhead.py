@@ -0,0 +1,154 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Measure what pipeline latency instrumentation costs on the socket path.
+
+Replays synthetic Coinbase ticker frames through ``CoinbaseSocket`` (parse,
+normalise, book building), then passes the observations through the
+observation queue in batches, once plain and once with a ``LatencyRecorder``
+attached to the socket and a ``TimedQueue`` in place of the queue. The two
+halves are timed apart so event-loop scheduling noise stays out of the
+comparison. Reports the best-of-N time per frame and relative overhead of
+each, the bare cost of one ``LatencyHistogram.record`` and the resulting
+per-stage percentiles.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import math
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from bench_frame_recorder import synthetic_frames
+from icarus.observations import Observation
+from icarus.sockets.coinbase import CoinbaseSocket
+from icarus.telemetry import LatencyHistogram, LatencyRecorder, TimedQueue, format_snapshot
+from icarus.telemetry.latency import DEFAULT_SAMPLE_EVERY
+
+
+class ReplayWebSocket:
+    def __init__(self, socket: CoinbaseSocket, frames: list[str]) -> None:
+        self.socket = socket
+        self.frames = frames
+
+    async def __aiter__(self):  # type: ignore[no-untyped-def]
+        for frame in self.frames:
+            yield frame
+        self.socket._closed = True
+
+    async def close(self) -> None:
+        pass
+
+
+class ReplaySocket(CoinbaseSocket):
+    def __init__(self, frames: list[str]) -> None:
+        super().__init__("BTC-USD", keep_raw_messages=False)
+        self.frames = frames
+
+    async def connect(self) -> None:
+        self._ws = ReplayWebSocket(self, self.frames)  # type: ignore[assignment]
+
+
+async def stream(frames: list[str], recorder: LatencyRecorder | None) -> list[Observation]:
+    socket = ReplaySocket(frames)
+    if recorder is not None:
+        socket.latency = recorder
+        socket.latency_label = "coinbase"
+    return [observation async for observation in socket.stream_observations()]
+
+
+def hop(observations: list[Observation], recorder: LatencyRecorder | None) -> None:
+    observation_queue: asyncio.Queue[Observation] = asyncio.Queue()
+    if recorder is not None:
+        observation_queue = TimedQueue(
+            recorder.histogram("queue"), sample_every=recorder.sample_every
+        )
+    put = observation_queue.put_nowait
+    get = observation_queue.get_nowait
+    # Batches, as the capture loop drains whatever the sockets queued.
+    for start in range(0, len(observations), 64):
+        batch = observations[start : start + 64]
+        for observation in batch:
+            put(observation)
+        for _ in batch:
+            get()
+
+
+def elapsed_ns(
+    run: Callable[[LatencyRecorder | None], object], recorder: LatencyRecorder | None
+) -> int:
+    gc.collect()
+    started = time.perf_counter_ns()
+    run(recorder)
+    return time.perf_counter_ns() - started
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--frames", type=int, default=100_000)
+    p.add_argument("--repeats", type=int, default=5, help="best of this many runs")
+    p.add_argument("--sample-every", type=int, default=DEFAULT_SAMPLE_EVERY)
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    frames = synthetic_frames(args.frames, args.seed)
+
+    histogram = LatencyHistogram("bench")
+    record = histogram.record
+    values = [(i * 7919) % 5_000_000 for i in range(args.frames)]
+    started = time.perf_counter_ns()
+    for value in values:
+        record(value)
+    record_ns = (time.perf_counter_ns() - started) / len(values)
+
+    recorder = LatencyRecorder(sample_every=args.sample_every)
+    observations = asyncio.run(stream(frames, None))
+    plain: dict[str, float] = {"socket": math.inf, "queue": math.inf}
+    timed = dict(plain)
+    runs: dict[str, Callable[[LatencyRecorder | None], object]] = {
+        "socket": lambda latency: asyncio.run(stream(frames, latency)),
+        "queue": lambda latency: hop(observations, latency),
+    }
+    # Interleaved so drift in machine load hits both sides alike.
+    for _ in range(args.repeats):
+        for stage, run in runs.items():
+            plain[stage] = min(plain[stage], elapsed_ns(run, None))
+            timed[stage] = min(timed[stage], elapsed_ns(run, recorder))
+
+    print(
+        f"frames={args.frames:,} observations={len(observations):,} "
+        f"sample_every={args.sample_every}"
+    )
+    print(f"record():  {record_ns:8.0f} ns/sample")
+    print("{:<9} {:>12} {:>12} {:>9}".format("stage", "plain us", "timed us", "overhead"))
+    for stage in ("socket", "queue"):
+        print(
+            f"{stage:<9} {plain[stage] / args.frames / 1000:12.3f} "
+            f"{timed[stage] / args.frames / 1000:12.3f} "
+            f"{(timed[stage] / plain[stage] - 1) * 100:8.2f}%"
+        )
+    total_plain = sum(plain.values())
+    total_timed = sum(timed.values())
+    print(
+        f"{'total':<9} {total_plain / args.frames / 1000:12.3f} "
+        f"{total_timed / args.frames / 1000:12.3f} {(total_timed / total_plain - 1) * 100:8.2f}%"
+    )
+    print("per-frame cost; stage percentiles accumulated over every timed run:")
+    for snapshot in recorder.snapshot():
+        print(f"  {format_snapshot(snapshot)}")
+
+
+if __name__ == "__main__":
+    main()
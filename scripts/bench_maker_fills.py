@@ -0,0 +1,152 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Time the maker fill kernel per backtest cell, plain Python versus numba.
+
+Runs one quoting cell over a deterministic synthetic tick stream (random-walk
+mid, variable spread, occasional missing sides, bursty taker flow) through
+``MakerFillSimulator`` with each available backend, plus the live one-tick
+``step`` path. Reports milliseconds per cell, nanoseconds per tick and whether
+every backend produced the same fills. The numba column is skipped when numba
+is not installed; its first call (compilation or cache load) is not timed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.backtest import MakerFills, MakerFillSimulator, MakerQuoteConfig, MakerTicks
+from icarus.backtest import maker
+
+
+def synthetic_ticks(n: int, seed: int) -> MakerTicks:
+    rng = np.random.default_rng(seed)
+    mid = 60_000.0 + rng.normal(0.0, 0.5, n).cumsum()
+    spread = rng.uniform(0.01, 2.0, n)
+    bid = mid - spread / 2
+    ask = mid + spread / 2
+    bid[rng.random(n) < 0.01] = np.nan
+    ask[rng.random(n) < 0.01] = np.nan
+    return MakerTicks(
+        timestamp_ms=np.cumsum(rng.integers(1, 300, n)).astype(np.int64),
+        venue_mid=mid,
+        venue_bid=bid,
+        venue_ask=ask,
+        top_bid_depth=rng.exponential(1.0, n),
+        top_ask_depth=rng.exponential(1.0, n),
+        trade_buy_size=np.where(rng.random(n) < 0.3, rng.exponential(0.5, n), 0.0),
+        trade_sell_size=np.where(rng.random(n) < 0.3, rng.exponential(0.5, n), 0.0),
+    )
+
+
+def run_cell(
+    config: MakerQuoteConfig, ticks: MakerTicks, drift_hat: np.ndarray, use_numba: bool
+) -> MakerFills:
+    return MakerFillSimulator(config, use_numba=use_numba).run(ticks, drift_hat)
+
+
+def step_cell(
+    config: MakerQuoteConfig, ticks: MakerTicks, drift_hat: np.ndarray
+) -> list[tuple[int, int, float, float]]:
+    simulator = MakerFillSimulator(config)
+    fills = []
+    rows = zip(
+        ticks.timestamp_ms.tolist(),
+        ticks.venue_mid.tolist(),
+        ticks.venue_bid.tolist(),
+        ticks.venue_ask.tolist(),
+        ticks.top_bid_depth.tolist(),
+        ticks.top_ask_depth.tolist(),
+        ticks.trade_buy_size.tolist(),
+        ticks.trade_sell_size.tolist(),
+        drift_hat.tolist(),
+        strict=True,
+    )
+    for i, (ts, mid, bid, ask, bid_depth, ask_depth, buys, sells, hat) in enumerate(rows):
+        for side, price, fee in simulator.step(
+            ts,
+            mid,
+            None if math.isnan(bid) else bid,
+            None if math.isnan(ask) else ask,
+            bid_depth,
+            ask_depth,
+            buys,
+            sells,
+            hat,
+        ):
+            fills.append((i, side, price, fee))
+    return fills
+
+
+def as_rows(fills: MakerFills) -> list[tuple[int, int, float, float]]:
+    return list(
+        zip(
+            fills.index.tolist(),
+            fills.side.tolist(),
+            fills.price.tolist(),
+            fills.fee.tolist(),
+            strict=True,
+        )
+    )
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--ticks", type=int, default=200_000)
+    p.add_argument("--repeats", type=int, default=3, help="best of this many runs")
+    p.add_argument("--seed", type=int, default=7)
+    args = p.parse_args()
+
+    ticks = synthetic_ticks(args.ticks, args.seed)
+    drift_hat = np.random.default_rng(args.seed + 1).normal(0.0, 0.3, args.ticks)
+    config = MakerQuoteConfig(
+        half_spread=0.5,
+        fee_bps=-1.0,
+        max_inventory=5.0,
+        skew_coef=1.0,
+        inventory_skew=0.05,
+        latency_ms=50,
+        requote_threshold=0.5,
+    )
+
+    backends = [("python", False)]
+    if maker.numba is not None:
+        run_cell(config, ticks, drift_hat, True)
+        backends.append(("numba", True))
+
+    timings: list[tuple[str, float, list[tuple[int, int, float, float]]]] = []
+    for name, use_numba in backends:
+        best = math.inf
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            fills = run_cell(config, ticks, drift_hat, use_numba)
+            best = min(best, time.perf_counter() - started)
+        timings.append((name, best, as_rows(fills)))
+    # The live path: one ``step`` per tick through the plain-Python kernel.
+    started = time.perf_counter()
+    stepped = step_cell(config, ticks, drift_hat)
+    timings.append(("step", time.perf_counter() - started, stepped))
+
+    _, baseline, reference = timings[0]
+    print(f"ticks={args.ticks}")
+    header = ("backend", "ms/cell", "ns/tick", "speedup", "fills", "same")
+    print("{:<8} {:>10} {:>9} {:>8} {:>7} {:>6}".format(*header))
+    for name, seconds, rows in timings:
+        print(
+            f"{name:<8} {seconds * 1e3:10.1f} {seconds / args.ticks * 1e9:9.0f} "
+            f"{baseline / seconds:7.1f}x {len(rows):7d} {'yes' if rows == reference else 'NO':>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
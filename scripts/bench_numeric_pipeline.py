@@ -0,0 +1,218 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Compare Decimal vs float64 numeric modes across the per-tick hot path.
+
+Replays Coinbase websocket frames (``--frames``, one raw JSON message per line,
+ticker + level2) or a deterministic synthetic stream through the same chain the
+live scripts run on every message:
+
+  normalizer -> order book builder -> measurement engine -> raw fair value
+
+once with ``numeric_mode="decimal"`` and once with ``numeric_mode="float"``.
+Frames are pre-decoded so JSON parsing is excluded from both timings. Reports
+messages/sec per mode and the max absolute fair-value difference between them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.measurements import MarketMeasurementEngine
+from icarus.observations import (
+    CoinbaseObservationNormalizer,
+    OrderBookDeltaObservation,
+    OrderBookObservation,
+)
+from icarus.observations.types import NumericMode
+from icarus.orderbooks import CoinbaseOrderBookBuilder
+from icarus.strategy.fair_value.estimator import RawFairValueEstimator
+
+FRAME_INTERVAL_MS = 50
+
+
+def load_recorded_frames(path: Path) -> list[dict[str, Any]]:
+    frames: list[dict[str, Any]] = []
+    with path.open() as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                frames.append(json.loads(line))
+    return frames
+
+
+def synthetic_frames(*, n_frames: int, levels_per_side: int, seed: int) -> list[dict[str, Any]]:
+    """Level2 snapshot, then l2update deltas interleaved with ticker frames."""
+    rng = random.Random(seed)
+    start = datetime(2026, 4, 17, tzinfo=UTC)
+    mid_ticks = 7_516_594
+
+    def stamp(i: int) -> str:
+        moment = start + timedelta(milliseconds=FRAME_INTERVAL_MS * i)
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def level(side: str, ticks: int, size: float) -> dict[str, str]:
+        return {"side": side, "price_level": f"{ticks / 100:.2f}", "new_quantity": f"{size:.8f}"}
+
+    frames: list[dict[str, Any]] = [
+        {
+            "channel": "l2_data",
+            "timestamp": stamp(0),
+            "sequence_num": 0,
+            "events": [
+                {
+                    "type": "snapshot",
+                    "product_id": "BTC-USD",
+                    "updates": [
+                        level("bid", mid_ticks - i, rng.uniform(0.01, 2.0))
+                        for i in range(1, levels_per_side + 1)
+                    ]
+                    + [
+                        level("offer", mid_ticks + i, rng.uniform(0.01, 2.0))
+                        for i in range(1, levels_per_side + 1)
+                    ],
+                }
+            ],
+        }
+    ]
+    for i in range(1, n_frames):
+        mid_ticks += rng.choice((-1, 0, 0, 1))
+        if rng.random() < 0.3:
+            frames.append(
+                {
+                    "channel": "ticker",
+                    "timestamp": stamp(i),
+                    "sequence_num": i,
+                    "events": [
+                        {
+                            "type": "update",
+                            "tickers": [
+                                {
+                                    "product_id": "BTC-USD",
+                                    "best_bid": f"{(mid_ticks - 1) / 100:.2f}",
+                                    "best_bid_quantity": f"{rng.uniform(0.01, 2.0):.8f}",
+                                    "best_ask": f"{(mid_ticks + 1) / 100:.2f}",
+                                    "best_ask_quantity": f"{rng.uniform(0.01, 2.0):.8f}",
+                                }
+                            ],
+                        }
+                    ],
+                }
+            )
+            continue
+        updates = []
+        for _ in range(rng.randint(1, 4)):
+            side = rng.choice(("bid", "offer"))
+            offset = int(rng.expovariate(0.1)) + 1
+            ticks = mid_ticks - offset if side == "bid" else mid_ticks + offset
+            size = 0.0 if rng.random() < 0.4 else rng.uniform(0.01, 2.0)
+            updates.append(level(side, ticks, size))
+        frames.append(
+            {
+                "channel": "l2_data",
+                "timestamp": stamp(i),
+                "sequence_num": i,
+                "events": [{"type": "update", "product_id": "BTC-USD", "updates": updates}],
+            }
+        )
+    return frames
+
+
+def run_pipeline(
+    frames: list[dict[str, Any]],
+    *,
+    numeric_mode: NumericMode,
+    book_depth: int | None,
+) -> tuple[float, int, list[float]]:
+    normalizer = CoinbaseObservationNormalizer(numeric_mode=numeric_mode)
+    builders: dict[str, CoinbaseOrderBookBuilder] = {}
+    engines: dict[str, MarketMeasurementEngine] = {}
+    estimator = RawFairValueEstimator()
+    fair_values: list[float] = []
+    estimates = 0
+
+    start = time.perf_counter()
+    for index, frame in enumerate(frames):
+        received_ms = index * FRAME_INTERVAL_MS
+        for observation in normalizer.normalize_message(frame, received_timestamp_ms=received_ms):
+            if isinstance(observation, OrderBookObservation | OrderBookDeltaObservation):
+                builder = builders.get(observation.market)
+                if builder is None:
+                    builder = CoinbaseOrderBookBuilder(depth=book_depth)
+                    builders[observation.market] = builder
+                book_observation = builder.on_observation(observation)
+                if book_observation is None:
+                    continue
+                observation = book_observation
+            engine = engines.get(observation.market)
+            if engine is None:
+                engine = MarketMeasurementEngine(exchange="coinbase", market=observation.market)
+                engines[observation.market] = engine
+            measurement = engine.on_observation(observation)
+            if measurement is None:
+                continue
+            estimate = estimator.estimate(measurement)
+            if estimate.raw_fair_value is not None:
+                estimates += 1
+                fair_values.append(float(estimate.raw_fair_value))
+    return time.perf_counter() - start, estimates, fair_values
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--frames", type=Path, default=None,
+                   help="JSONL of recorded Coinbase ticker/level2 frames; synthetic if omitted")
+    p.add_argument("--synthetic-frames", type=int, default=50_000)
+    p.add_argument("--levels-per-side", type=int, default=500)
+    p.add_argument("--book-depth", type=int, default=10,
+                   help="levels per side emitted by the builder (0 = full depth)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeats", type=int, default=3)
+    args = p.parse_args()
+
+    if args.frames is not None:
+        frames = load_recorded_frames(args.frames)
+        source = str(args.frames)
+    else:
+        frames = synthetic_frames(
+            n_frames=args.synthetic_frames,
+            levels_per_side=args.levels_per_side,
+            seed=args.seed,
+        )
+        source = "synthetic"
+    book_depth = args.book_depth or None
+    print(f"source={source} frames={len(frames):,} book_depth={book_depth}")
+
+    results: dict[str, tuple[float, list[float]]] = {}
+    for mode in ("decimal", "float"):
+        runs = [
+            run_pipeline(frames, numeric_mode=mode, book_depth=book_depth)
+            for _ in range(args.repeats)
+        ]
+        best, estimates, fair_values = min(runs, key=lambda run: run[0])
+        results[mode] = (best, fair_values)
+        rate = len(frames) / best if best > 0 else float("inf")
+        print(f"{mode:<8} total={best:8.3f}s  msgs/sec={rate:12,.0f}  estimates={estimates:,}")
+
+    decimal_time, decimal_fvs = results["decimal"]
+    float_time, float_fvs = results["float"]
+    if float_time > 0:
+        print(f"speedup: {decimal_time / float_time:.2f}x")
+    if decimal_fvs and len(decimal_fvs) == len(float_fvs):
+        max_diff = max(abs(a - b) for a, b in zip(decimal_fvs, float_fvs, strict=True))
+        print(f"max |fair_value(decimal) - fair_value(float)| = {max_diff:.3e}")
+
+
+if __name__ == "__main__":
+    main()
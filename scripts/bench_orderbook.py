@@ -0,0 +1,212 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Microbenchmark the order book by replaying level2 snapshot + delta streams.
+
+Replays either recorded Coinbase level2 websocket frames (``--frames``, one raw
+JSON message per line) or a deterministic synthetic stream through two books:
+
+  * ``OrderBook``     — the sorted price-ladder book used by the builders.
+  * ``DictOrderBook`` — the previous plain-dict implementation, kept here only
+                        as the baseline.
+
+Each delta is applied and then the builder-facing reads are exercised: best
+bid/ask, a depth-limited view, and (optionally) the full ``levels()`` tuple
+that ``to_observation`` emits. Reports per-delta cost and the speedup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.observations import (
+    CoinbaseObservationNormalizer,
+    OrderBookDeltaObservation,
+    OrderBookLevel,
+    OrderBookObservation,
+)
+from icarus.orderbooks import OrderBook
+
+
+class DictOrderBook:
+    """Baseline: the original dict-backed book that sorts on every read."""
+
+    def __init__(self) -> None:
+        self._bids: dict[Decimal, Decimal] = {}
+        self._asks: dict[Decimal, Decimal] = {}
+
+    def load_snapshot(self, levels: tuple[OrderBookLevel, ...]) -> None:
+        self._bids.clear()
+        self._asks.clear()
+        self.apply_delta(levels)
+
+    def apply_delta(self, levels: tuple[OrderBookLevel, ...]) -> None:
+        for level in levels:
+            book_side = self._bids if level.side == "buy" else self._asks
+            if level.size <= 0:
+                book_side.pop(level.price, None)
+            else:
+                book_side[level.price] = level.size
+
+    def truncate(self, depth: int) -> None:
+        self._bids = dict(sorted(self._bids.items(), reverse=True)[:depth])
+        self._asks = dict(sorted(self._asks.items())[:depth])
+
+    def best_bid_level(self) -> OrderBookLevel | None:
+        if not self._bids:
+            return None
+        best_price = max(self._bids)
+        return OrderBookLevel(side="buy", price=best_price, size=self._bids[best_price])
+
+    def best_ask_level(self) -> OrderBookLevel | None:
+        if not self._asks:
+            return None
+        best_price = min(self._asks)
+        return OrderBookLevel(side="sell", price=best_price, size=self._asks[best_price])
+
+    def levels(self, depth: int | None = None) -> tuple[OrderBookLevel, ...]:
+        bids = sorted(self._bids.items(), reverse=True)
+        asks = sorted(self._asks.items())
+        if depth is not None:
+            bids, asks = bids[:depth], asks[:depth]
+        return tuple(OrderBookLevel(side="buy", price=p, size=s) for p, s in bids) + tuple(
+            OrderBookLevel(side="sell", price=p, size=s) for p, s in asks
+        )
+
+
+def load_recorded_stream(
+    path: Path,
+) -> tuple[tuple[OrderBookLevel, ...], list[tuple[OrderBookLevel, ...]]]:
+    normalizer = CoinbaseObservationNormalizer()
+    snapshot: tuple[OrderBookLevel, ...] | None = None
+    deltas: list[tuple[OrderBookLevel, ...]] = []
+    with path.open() as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            for observation in normalizer.normalize_message(json.loads(line)):
+                if isinstance(observation, OrderBookObservation):
+                    if snapshot is None:
+                        snapshot = observation.levels
+                elif isinstance(observation, OrderBookDeltaObservation) and snapshot is not None:
+                    deltas.append(observation.levels)
+    if snapshot is None:
+        raise SystemExit(f"no level2 snapshot found in {path}")
+    return snapshot, deltas
+
+
+def synthetic_stream(
+    *,
+    levels_per_side: int,
+    n_deltas: int,
+    seed: int,
+) -> tuple[tuple[OrderBookLevel, ...], list[tuple[OrderBookLevel, ...]]]:
+    """Random-walk mid with level churn concentrated near the touch, like level2."""
+    rng = random.Random(seed)
+    tick = Decimal("0.01")
+    mid_ticks = 6_000_000
+    snapshot = tuple(
+        OrderBookLevel(side="buy", price=(mid_ticks - i) * tick, size=Decimal(rng.randint(1, 9)))
+        for i in range(1, levels_per_side + 1)
+    ) + tuple(
+        OrderBookLevel(side="sell", price=(mid_ticks + i) * tick, size=Decimal(rng.randint(1, 9)))
+        for i in range(1, levels_per_side + 1)
+    )
+    deltas: list[tuple[OrderBookLevel, ...]] = []
+    for _ in range(n_deltas):
+        mid_ticks += rng.choice((-1, 0, 0, 1))
+        batch: list[OrderBookLevel] = []
+        for _ in range(rng.randint(1, 4)):
+            side = rng.choice(("buy", "sell"))
+            offset = int(rng.expovariate(0.05)) + 1
+            price_ticks = mid_ticks - offset if side == "buy" else mid_ticks + offset
+            size = Decimal(0) if rng.random() < 0.4 else Decimal(rng.randint(1, 9))
+            batch.append(OrderBookLevel(side=side, price=price_ticks * tick, size=size))
+        deltas.append(tuple(batch))
+    return snapshot, deltas
+
+
+def replay(
+    book: OrderBook | DictOrderBook,
+    snapshot: tuple[OrderBookLevel, ...],
+    deltas: list[tuple[OrderBookLevel, ...]],
+    *,
+    view_depth: int,
+    full_levels: bool,
+    truncate_depth: int | None,
+) -> float:
+    book.load_snapshot(snapshot)
+    start = time.perf_counter()
+    for delta in deltas:
+        book.apply_delta(delta)
+        if truncate_depth is not None:
+            book.truncate(truncate_depth)
+        book.best_bid_level()
+        book.best_ask_level()
+        book.levels(view_depth)
+        if full_levels:
+            book.levels()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--frames", type=Path, default=None,
+                   help="JSONL of recorded Coinbase level2 frames; synthetic if omitted")
+    p.add_argument("--levels-per-side", type=int, default=2_000)
+    p.add_argument("--deltas", type=int, default=20_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--view-depth", type=int, default=10)
+    p.add_argument("--full-levels", action="store_true",
+                   help="also materialize the full book per delta (full-depth emission)")
+    p.add_argument("--truncate-depth", type=int, default=None,
+                   help="truncate after every delta, as the Kraken builder does")
+    p.add_argument("--repeats", type=int, default=3)
+    args = p.parse_args()
+
+    if args.frames is not None:
+        snapshot, deltas = load_recorded_stream(args.frames)
+        source = str(args.frames)
+    else:
+        snapshot, deltas = synthetic_stream(
+            levels_per_side=args.levels_per_side,
+            n_deltas=args.deltas,
+            seed=args.seed,
+        )
+        source = "synthetic"
+    print(f"source={source} snapshot_levels={len(snapshot):,} deltas={len(deltas):,}")
+
+    timings: dict[str, float] = {}
+    for name, factory in (("DictOrderBook", DictOrderBook), ("OrderBook", OrderBook)):
+        best = min(
+            replay(
+                factory(),
+                snapshot,
+                deltas,
+                view_depth=args.view_depth,
+                full_levels=args.full_levels,
+                truncate_depth=args.truncate_depth,
+            )
+            for _ in range(args.repeats)
+        )
+        timings[name] = best
+        per_delta_us = best / max(len(deltas), 1) * 1e6
+        print(f"{name:<14} total={best:8.3f}s  per_delta={per_delta_us:8.2f}us")
+
+    if timings["OrderBook"] > 0:
+        print(f"speedup: {timings['DictOrderBook'] / timings['OrderBook']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Measure what carrying raw payloads on observations costs, per message type.
+
+Each synthetic venue message is decoded from its JSON text (as the socket
+does) and normalized, with the resulting observations kept alive the way a
+buffering consumer would. Three ways of attaching ``raw_message`` are compared:
+
+  deepcopy  the previous behaviour: a deep copy of the payload per observation
+  shared    one read-only view of the decoded payload shared by all observations
+  drop      ``keep_raw_messages=False``: no payload kept past the book builders
+
+Book messages go through their order book builder, and only what the builder
+emits is kept, as on the live path. Reports microseconds per message, bytes
+still held per message (tracemalloc) and generation-0/2 garbage collections
+per 10k messages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.observations import (
+    BaseObservationNormalizer,
+    CoinbaseObservationNormalizer,
+    Observation,
+    OkxObservationNormalizer,
+    OrderBookDeltaObservation,
+    OrderBookObservation,
+)
+from icarus.orderbooks import CoinbaseOrderBookBuilder, OkxOrderBookBuilder
+
+MODES = ("deepcopy", "shared", "drop")
+
+
+def coinbase_ticker(rng: random.Random, _: int) -> dict[str, Any]:
+    mid = 60_000 + rng.uniform(-50, 50)
+    ticker = {
+        "type": "ticker",
+        "product_id": "BTC-USD",
+        "price": f"{mid:.2f}",
+        "best_bid": f"{mid - 0.01:.2f}",
+        "best_bid_quantity": f"{rng.uniform(0, 2):.8f}",
+        "best_ask": f"{mid + 0.01:.2f}",
+        "best_ask_quantity": f"{rng.uniform(0, 2):.8f}",
+    }
+    return {
+        "channel": "ticker",
+        "timestamp": "2026-10-17T12:00:00.000000Z",
+        "sequence_num": 1,
+        "events": [{"type": "update", "tickers": [ticker]}],
+    }
+
+
+def coinbase_level2_snapshot(rng: random.Random, levels: int) -> dict[str, Any]:
+    updates = [
+        {
+            "side": side,
+            "event_time": "2026-10-17T12:00:00.000000Z",
+            "price_level": f"{60_000 + sign * (i + 1) * 0.01:.2f}",
+            "new_quantity": f"{rng.uniform(0, 2):.8f}",
+        }
+        for side, sign in (("bid", -1), ("offer", 1))
+        for i in range(levels)
+    ]
+    return {
+        "channel": "l2_data",
+        "timestamp": "2026-10-17T12:00:00.000000Z",
+        "sequence_num": 1,
+        "events": [{"type": "snapshot", "product_id": "BTC-USD", "updates": updates}],
+    }
+
+
+def coinbase_market_trades(rng: random.Random, trades: int) -> dict[str, Any]:
+    batch = [
+        {
+            "trade_id": str(1_000_000 + i),
+            "product_id": "BTC-USD",
+            "price": f"{60_000 + rng.uniform(-5, 5):.2f}",
+            "size": f"{rng.uniform(0, 0.5):.8f}",
+            "side": rng.choice(("BUY", "SELL")),
+            "time": "2026-10-17T12:00:00.000000Z",
+        }
+        for i in range(trades)
+    ]
+    return {
+        "channel": "market_trades",
+        "timestamp": "2026-10-17T12:00:00.000000Z",
+        "sequence_num": 1,
+        "events": [{"type": "update", "trades": batch}],
+    }
+
+
+def okx_books5(rng: random.Random, _: int) -> dict[str, Any]:
+    def level(sign: int, i: int) -> list[str]:
+        return [f"{60_000 + sign * (i + 1) * 0.1:.1f}", f"{rng.uniform(0, 2):.8f}", "0", "1"]
+
+    return {
+        "arg": {"channel": "books5", "instId": "BTC-USDT"},
+        "data": [
+            {
+                "bids": [level(-1, i) for i in range(5)],
+                "asks": [level(1, i) for i in range(5)],
+                "ts": "1776384015100",
+            }
+        ],
+    }
+
+
+type MessageFactory = Callable[[random.Random, int], dict[str, Any]]
+type Pipeline = Callable[[dict[str, Any]], list[Observation]]
+
+
+def coinbase_pipeline(keep_raw_messages: bool) -> Pipeline:
+    """Normalizer plus book builder, keeping what a live consumer would see."""
+    normalizer = CoinbaseObservationNormalizer(keep_raw_messages=keep_raw_messages)
+    builder = CoinbaseOrderBookBuilder(depth=50, keep_raw_messages=keep_raw_messages)
+    return _with_builder(normalizer, builder.on_observation)
+
+
+def okx_pipeline(keep_raw_messages: bool) -> Pipeline:
+    normalizer = OkxObservationNormalizer(keep_raw_messages=keep_raw_messages)
+    builder = OkxOrderBookBuilder(keep_raw_messages=keep_raw_messages)
+    return _with_builder(normalizer, builder.on_observation)
+
+
+def _with_builder(
+    normalizer: BaseObservationNormalizer,
+    on_book: Callable[[Observation], Observation | None],
+) -> Pipeline:
+    def pipeline(message: dict[str, Any]) -> list[Observation]:
+        observations = []
+        for observation in normalizer.normalize_message(message):
+            if isinstance(observation, OrderBookObservation | OrderBookDeltaObservation):
+                built = on_book(observation)
+                if built is not None:
+                    observations.append(built)
+            else:
+                observations.append(observation)
+        return observations
+
+    return pipeline
+
+
+def message_types(
+    levels: int, trades: int
+) -> list[tuple[str, MessageFactory, int, Callable[[bool], Pipeline]]]:
+    return [
+        ("coinbase ticker", coinbase_ticker, 0, coinbase_pipeline),
+        (
+            f"coinbase level2 snapshot x{levels * 2}",
+            coinbase_level2_snapshot,
+            levels,
+            coinbase_pipeline,
+        ),
+        (f"coinbase market_trades x{trades}", coinbase_market_trades, trades, coinbase_pipeline),
+        ("okx books5", okx_books5, 0, okx_pipeline),
+    ]
+
+
+def run(mode: str, frames: list[str], pipeline: Pipeline) -> list[object]:
+    kept: list[object] = []
+    for frame in frames:
+        message = json.loads(frame)
+        observations = pipeline(message)
+        kept.extend(observations)
+        if mode == "deepcopy":
+            # The previous normalizers deep-copied the payload into every
+            # observation, and the book builders copied it once more.
+            kept.extend(deepcopy(message) for _ in observations)
+    return kept
+
+
+def measure(mode: str, frames: list[str], pipeline: Pipeline) -> tuple[float, float, int, int]:
+    gc.collect()
+    before = gc.get_stats()
+    started = time.perf_counter()
+    kept = run(mode, frames, pipeline)
+    elapsed = time.perf_counter() - started
+    after = gc.get_stats()
+    del kept
+    gc.collect()
+
+    tracemalloc.start()
+    kept = run(mode, frames, pipeline)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    count = len(frames)
+    gen0 = after[0]["collections"] - before[0]["collections"]
+    gen2 = after[2]["collections"] - before[2]["collections"]
+    return elapsed / count * 1e6, held / count, gen0, gen2
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("--messages", type=int, default=500, help="messages per type")
+    p.add_argument("--levels", type=int, default=250, help="levels per side in level2 snapshots")
+    p.add_argument("--trades", type=int, default=50, help="trades per market_trades batch")
+    p.add_argument("--seed", type=int, default=3)
+    args = p.parse_args()
+
+    rng = random.Random(args.seed)
+    header = ("message", "mode", "us/msg", "held B/msg", "gc0/10k", "gc2/10k")
+    print("{:<34} {:<9} {:>9} {:>11} {:>8} {:>8}".format(*header))
+    for label, factory, size, pipeline_factory in message_types(args.levels, args.trades):
+        frames = [json.dumps(factory(rng, size)) for _ in range(args.messages)]
+        scale = 10_000 / len(frames)
+        for mode in MODES:
+            us, held, gen0, gen2 = measure(mode, frames, pipeline_factory(mode != "drop"))
+            print(
+                f"{label:<34} {mode:<9} {us:9.1f} {held:11,.0f} "
+                f"{gen0 * scale:8.1f} {gen2 * scale:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
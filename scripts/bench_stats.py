@@ -0,0 +1,144 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Time icarus.stats against the per-script loops it replaced.
+
+On a synthetic tick stream (``--n`` samples, ``--mean-gap-ms`` apart on
+average), compares:
+
+  * batch rolling mean/std over a ``--window-ms`` span with the
+    ``while``-loop over cumulative sums from basis_mean_reversion_backtest;
+  * a batch trailing quantile with a percentile per window;
+  * streaming trade-flow sums (``RollingSum``) with the deque that was
+    re-summed on every snapshot, at ``--trades-per-snapshot`` trades
+    between snapshots.
+
+    scripts/bench_stats.py
+    scripts/bench_stats.py --n 2000000 --window-ms 300000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.stats import RollingSum, rolling_mean_std, trailing_windows, window_quantile
+
+
+def loop_mean_std(x: np.ndarray, window_ms: int, ts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n = len(x)
+    mean = np.zeros(n)
+    std = np.zeros(n)
+    csum = np.cumsum(x)
+    csum2 = np.cumsum(x * x)
+    j_start = 0
+    for i in range(n):
+        while ts[i] - ts[j_start] > window_ms and j_start < i:
+            j_start += 1
+        count = i - j_start + 1
+        s1 = csum[i] - (csum[j_start - 1] if j_start > 0 else 0.0)
+        s2 = csum2[i] - (csum2[j_start - 1] if j_start > 0 else 0.0)
+        m = s1 / count
+        mean[i] = m
+        std[i] = max(s2 / count - m * m, 0.0) ** 0.5
+    return mean, std
+
+
+def resummed_flow(ts: list[int], sizes: list[float], window_ms: int, every: int) -> float:
+    events: deque[tuple[int, float]] = deque()
+    total = 0.0
+    for i, (t, size) in enumerate(zip(ts, sizes, strict=True)):
+        events.append((t, size))
+        if i % every == 0:
+            while events and events[0][0] < t - window_ms:
+                events.popleft()
+            total += sum(e[1] for e in events)
+    return total
+
+
+def streamed_flow(ts: list[int], sizes: list[float], window_ms: int, every: int) -> float:
+    flow = RollingSum(window_ms)
+    total = 0.0
+    for i, (t, size) in enumerate(zip(ts, sizes, strict=True)):
+        flow.add(t, size)
+        if i % every == 0:
+            flow.advance(t)
+            total += flow.total
+    return total
+
+
+def timed[T](label: str, fn: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1e3:>10.1f} ms")
+    return result, elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    ap.add_argument("--n", type=int, default=500_000)
+    ap.add_argument("--mean-gap-ms", type=float, default=50.0)
+    ap.add_argument("--window-ms", type=int, default=60_000)
+    ap.add_argument(
+        "--quantile-n",
+        type=int,
+        default=20_000,
+        help="samples for the per-window percentile baseline",
+    )
+    ap.add_argument("--trades-per-snapshot", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    ts = np.cumsum(rng.integers(0, int(2 * args.mean_gap_ms) + 1, args.n)).astype(np.int64)
+    x = np.cumsum(rng.normal(0.0, 0.1, args.n))
+    per_window = args.window_ms / args.mean_gap_ms
+    print(f"{args.n:,} samples, ~{per_window:,.0f} per {args.window_ms:,} ms window\n")
+
+    (m0, s0), loop_s = timed(
+        "rolling mean/std, while-loop", lambda: loop_mean_std(x, args.window_ms, ts)
+    )
+    (m1, s1), batch_s = timed(
+        "rolling mean/std, icarus.stats", lambda: rolling_mean_std(ts, x, args.window_ms)
+    )
+    print(
+        f"  {loop_s / batch_s:.0f}x; max |diff| mean {np.abs(m0 - m1).max():.2e} "
+        f"std {np.abs(s0 - s1).max():.2e}\n"
+    )
+
+    k = min(args.quantile_n, args.n)
+    start, stop = trailing_windows(ts[:k], args.window_ms)
+    q0, loop_s = timed(
+        f"p95, percentile per window ({k:,})",
+        lambda: np.array([np.percentile(x[lo:hi], 95) for lo, hi in zip(start, stop, strict=True)]),
+    )
+    q1, batch_s = timed(
+        f"p95, window_quantile ({k:,})", lambda: window_quantile(x[:k], start, stop, 0.95)
+    )
+    print(f"  {loop_s / batch_s:.0f}x; max |diff| {np.abs(q0 - q1).max():.2e}\n")
+
+    sizes = rng.exponential(1.0, args.n).tolist()
+    times = ts.tolist()
+    every = args.trades_per_snapshot
+    f0, loop_s = timed(
+        "trade flow, deque re-sum", lambda: resummed_flow(times, sizes, args.window_ms, every)
+    )
+    f1, stream_s = timed(
+        "trade flow, RollingSum", lambda: streamed_flow(times, sizes, args.window_ms, every)
+    )
+    print(f"  {loop_s / stream_s:.0f}x; relative diff {abs(f0 - f1) / abs(f0):.1e}")
+
+
+if __name__ == "__main__":
+    main()
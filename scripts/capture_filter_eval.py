@@ -5,15 +5,17 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import copy
 import json
 import logging
 import sqlite3
 import sys
-from collections import deque
+import time
+from collections.abc import Sequence
 from dataclasses import replace
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
 if str(PROJECT_SRC) not in sys.path:
@@ -27,7 +29,6 @@ from multi_venue_basis_fair_value import (  # noqa: E402
     build_basis_filter_config,
     build_filter,
     build_parser as build_basis_parser,
-    build_venue_state,
     is_perp_exchange,
     stream_socket_observations,
 )
@@ -35,25 +36,40 @@ from multi_venue_fair_value import (  # noqa: E402
     _add_kalman_cli_args,
     build_kalman_config,
 )
-from icarus.measurements import MarketMeasurementEngine  # noqa: E402
+from icarus.capture import (  # noqa: E402
+    CaptureSink,
+    CaptureWriterStats,
+    CaptureWriterThread,
+    ColumnarCaptureWriter,
+    FrameRecorder,
+)
+from icarus.capture.store import DEFAULT_SEGMENT_ROWS  # noqa: E402
+from icarus.capture.writer import DEFAULT_MAX_COMMIT_DELAY_S, DEFAULT_MAX_QUEUE  # noqa: E402
+from icarus.ingest import MarketRouter, MultiProcessIngestor, VenueIngestStats  # noqa: E402
+from icarus.ingest.ring import DEFAULT_BOOK_LEVELS, DEFAULT_CAPACITY  # noqa: E402
+from icarus.measurements import (  # noqa: E402
+    ClockOffsetConfig,
+    ClockOffsetEstimator,
+    MeasurementEngineConfig,
+    VenueClockEstimate,
+    event_timestamp_ms,
+)
+from icarus.measurements.clock import TIMESTAMP_BASES  # noqa: E402
 from icarus.observations import Observation, TradeObservation  # noqa: E402
 from icarus.sockets.coinbase import CoinbaseSocket  # noqa: E402
+from icarus.sockets.decoding import JSON_BACKENDS  # noqa: E402
 from icarus.sockets.hyperliquid import HyperliquidSocket  # noqa: E402
 from icarus.sockets.kraken import KrakenSocket  # noqa: E402
 from icarus.sockets.okx import OkxSocket  # noqa: E402
-from icarus.strategy.fair_value.combiner import (  # noqa: E402
-    CrossVenueCombinerConfig,
-    CrossVenueFairValueCombiner,
-)
-from icarus.strategy.fair_value.estimator import RawFairValueEstimator  # noqa: E402
-from icarus.strategy.fair_value.filters.kalman_1d import (  # noqa: E402
-    AdaptiveEfficientPriceKalman,
-    VenueObservation,
-)
-from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import (  # noqa: E402
-    VenueBasisKalmanFilter,
-    VenueBasisObservation,
+from icarus.stats import TradeFlowTracker  # noqa: E402
+from icarus.telemetry import (  # noqa: E402
+    LatencyRecorder,
+    LatencyReporter,
+    TimedQueue,
 )
+from icarus.telemetry.latency import DEFAULT_SAMPLE_EVERY  # noqa: E402
+from icarus.strategy.fair_value.combiner import CrossVenueCombinerConfig  # noqa: E402
+from icarus.strategy.fair_value.pipeline import AssetFairValuePipeline  # noqa: E402
 from icarus.strategy.fair_value.types import VenueFairValueState  # noqa: E402
 from _hyperliquid_spot import resolve_hyperliquid_spot_subscription_coin  # noqa: E402
 
@@ -61,25 +77,75 @@ if TYPE_CHECKING:
     from icarus.sockets.base import BaseSocket
 
 
-class TradeFlowTracker:
-    """Per-venue rolling window of taker flow."""
-
-    def __init__(self, window_ms: int = 1000) -> None:
-        self.window_ms = window_ms
-        self._events: deque[tuple[int, float, float]] = deque()  # (ts, buy, sell)
+VENUE_ROW_FIELDS = (
+    "exchange",
+    "venue_kind",
+    "fair_value",
+    "variance",
+    "age_ms",
+    "bid_price",
+    "ask_price",
+    "microprice",
+    "depth_imbalance",
+    "top_bid_depth",
+    "top_ask_depth",
+    "mid_volatility_bps",
+    "trade_net_flow",
+    "trade_buy_size",
+    "trade_sell_size",
+    "trade_count",
+)
 
-    def add(self, ts_ms: int, side: str, size: float) -> None:
-        buy = size if side == "buy" else 0.0
-        sell = size if side == "sell" else 0.0
-        self._events.append((ts_ms, buy, sell))
 
-    def snapshot(self, now_ms: int) -> tuple[float, float, float, int]:
-        cutoff = now_ms - self.window_ms
-        while self._events and self._events[0][0] < cutoff:
-            self._events.popleft()
-        buy_size = sum(e[1] for e in self._events)
-        sell_size = sum(e[2] for e in self._events)
-        return (buy_size - sell_size, buy_size, sell_size, len(self._events))
+def build_venue_rows(
+    *,
+    now_ms: int,
+    latest_venue_states: dict[str, VenueFairValueState],
+    venue_top_of_book: dict[str, tuple[float | None, float | None]],
+    venue_microstructure: dict[
+        str,
+        tuple[
+            float | None,
+            float | None,
+            float | None,
+            float | None,
+            float | None,
+        ],
+    ],
+    venue_trade_flow: dict[str, tuple[float, float, float, int]],
+) -> list[tuple[object, ...]]:
+    """Per-venue capture rows in ``VENUE_ROW_FIELDS`` order, shared by both stores."""
+    rows: list[tuple[object, ...]] = []
+    for state in latest_venue_states.values():
+        bid, ask = venue_top_of_book.get(state.exchange, (None, None))
+        micro = venue_microstructure.get(
+            state.exchange, (None, None, None, None, None)
+        )
+        microprice, depth_imbalance, top_bid_depth, top_ask_depth, mid_vol = micro
+        net_flow, buy_size, sell_size, trade_count = venue_trade_flow.get(
+            state.exchange, (0.0, 0.0, 0.0, 0)
+        )
+        rows.append(
+            (
+                state.exchange,
+                "perp" if is_perp_exchange(state.exchange) else "spot",
+                float(state.fair_value),
+                float(state.variance),
+                float(max(now_ms - state.timestamp_ms, 0)),
+                bid,
+                ask,
+                microprice,
+                depth_imbalance,
+                top_bid_depth,
+                top_ask_depth,
+                mid_vol,
+                net_flow,
+                buy_size,
+                sell_size,
+                trade_count,
+            )
+        )
+    return rows
 
 
 class EvalCaptureDB:
@@ -88,7 +154,6 @@ class EvalCaptureDB:
         self.conn = sqlite3.connect(path)
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA synchronous=NORMAL")
-        self._pending = 0
         self._create_schema()
 
     def _create_schema(self) -> None:
@@ -219,37 +284,16 @@ class EvalCaptureDB:
         )
         update_id = int(cursor.lastrowid)
 
-        venue_rows = []
-        for state in latest_venue_states.values():
-            bid, ask = venue_top_of_book.get(state.exchange, (None, None))
-            micro = venue_microstructure.get(
-                state.exchange, (None, None, None, None, None)
-            )
-            microprice, depth_imbalance, top_bid_depth, top_ask_depth, mid_vol = micro
-            net_flow, buy_size, sell_size, trade_count = venue_trade_flow.get(
-                state.exchange, (0.0, 0.0, 0.0, 0)
-            )
-            venue_rows.append(
-                (
-                    update_id,
-                    state.exchange,
-                    "perp" if is_perp_exchange(state.exchange) else "spot",
-                    float(state.fair_value),
-                    float(state.variance),
-                    float(max(now_ms - state.timestamp_ms, 0)),
-                    bid,
-                    ask,
-                    microprice,
-                    depth_imbalance,
-                    top_bid_depth,
-                    top_ask_depth,
-                    mid_vol,
-                    net_flow,
-                    buy_size,
-                    sell_size,
-                    trade_count,
-                )
+        venue_rows = [
+            (update_id, *row)
+            for row in build_venue_rows(
+                now_ms=now_ms,
+                latest_venue_states=latest_venue_states,
+                venue_top_of_book=venue_top_of_book,
+                venue_microstructure=venue_microstructure,
+                venue_trade_flow=venue_trade_flow,
             )
+        ]
         self.conn.executemany(
             """
             INSERT INTO venue_states (
@@ -295,22 +339,151 @@ class EvalCaptureDB:
             """,
             basis_rows,
         )
-        self._pending += 1
 
-    def maybe_commit(self, commit_every: int) -> None:
-        if self._pending >= commit_every:
-            self.conn.commit()
-            self._pending = 0
+    def write(self, record: dict[str, Any]) -> None:
+        self.insert_snapshot(**record)
+
+    def commit(self) -> None:
+        self.conn.commit()
 
     def close(self) -> None:
         self.conn.commit()
         self.conn.close()
 
 
+class ColumnarEvalCaptureDB:
+    """``EvalCaptureDB`` drop-in that appends to a columnar capture store.
+
+    A commit publishes the open segment once it is full or once
+    ``flush_interval_s`` has passed since the last flush, so a crash loses
+    at most about one interval of updates, as with SQLite commits. Quiet
+    captures therefore write segments smaller than ``segment_rows``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        segment_rows: int = DEFAULT_SEGMENT_ROWS,
+        flush_interval_s: float = DEFAULT_MAX_COMMIT_DELAY_S,
+    ) -> None:
+        if flush_interval_s <= 0:
+            raise ValueError("flush_interval_s must be positive.")
+        self.writer = ColumnarCaptureWriter(path, segment_rows=segment_rows)
+        self.flush_interval_s = flush_interval_s
+        self._last_flush = time.monotonic()
+
+    def insert_snapshot(
+        self,
+        *,
+        now_ms: int,
+        event_exchange: str,
+        event_market: str,
+        anchor_exchange: str,
+        latest_venue_states: dict[str, VenueFairValueState],
+        composite_price: float | None,
+        composite_variance: float | None,
+        contributing_exchanges: tuple[str, ...],
+        kalman_filtered_price: float | None,
+        kalman_raw_fused_price: float | None,
+        kalman_used_venues: list[str],
+        basis_common_price: float | None,
+        basis_common_stddev: float | None,
+        basis_is_live: bool,
+        basis_active_venues: list[str],
+        basis_estimates: dict[str, float],
+        basis_stddevs: dict[str, float],
+        venue_top_of_book: dict[str, tuple[float | None, float | None]],
+        venue_microstructure: dict[
+            str,
+            tuple[
+                float | None,
+                float | None,
+                float | None,
+                float | None,
+                float | None,
+            ],
+        ],
+        venue_trade_flow: dict[str, tuple[float, float, float, int]],
+    ) -> None:
+        writer = self.writer
+        update_id = writer.next_update_id()
+        writer.append_update(
+            {
+                "update_id": update_id,
+                "timestamp_ms": now_ms,
+                "event_exchange": writer.symbol_code(event_exchange),
+                "event_market": writer.symbol_code(event_market),
+                "anchor_exchange": writer.symbol_code(anchor_exchange),
+                "anchor_present": anchor_exchange in latest_venue_states,
+                "basis_is_live": basis_is_live,
+                "composite_price": composite_price,
+                "composite_variance": composite_variance,
+                "kalman_filtered_price": kalman_filtered_price,
+                "kalman_raw_fused_price": kalman_raw_fused_price,
+                "basis_common_price": basis_common_price,
+                "basis_common_stddev": basis_common_stddev,
+                "contributing_exchanges_mask": writer.symbol_mask(contributing_exchanges),
+                "kalman_used_venues_mask": writer.symbol_mask(kalman_used_venues),
+                "basis_active_venues_mask": writer.symbol_mask(basis_active_venues),
+            }
+        )
+        for row in build_venue_rows(
+            now_ms=now_ms,
+            latest_venue_states=latest_venue_states,
+            venue_top_of_book=venue_top_of_book,
+            venue_microstructure=venue_microstructure,
+            venue_trade_flow=venue_trade_flow,
+        ):
+            values = dict(zip(VENUE_ROW_FIELDS, row, strict=True))
+            writer.append_venue_state(
+                str(values["exchange"]),
+                {
+                    **values,
+                    "update_id": update_id,
+                    "timestamp_ms": now_ms,
+                    "is_perp": values["venue_kind"] == "perp",
+                },
+            )
+        for exchange in sorted(basis_estimates):
+            writer.append_basis_state(
+                exchange,
+                {
+                    "update_id": update_id,
+                    "timestamp_ms": now_ms,
+                    "basis_estimate": float(basis_estimates[exchange]),
+                    "basis_stddev": float(basis_stddevs.get(exchange, 0.0)),
+                },
+            )
+
+    def write(self, record: dict[str, Any]) -> None:
+        self.insert_snapshot(**record)
+
+    def commit(self) -> None:
+        now = time.monotonic()
+        if self.writer.maybe_flush():
+            self._last_flush = now
+        elif self.writer.pending_updates and now - self._last_flush >= self.flush_interval_s:
+            self.writer.flush()
+            self._last_flush = now
+
+    def close(self) -> None:
+        self.writer.close()
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = build_basis_parser()
     parser.description = "Capture live fair-value snapshots and filter outputs into SQLite."
     _add_kalman_cli_args(parser)
+    parser.add_argument(
+        "--assets",
+        nargs="+",
+        default=None,
+        help="Capture several assets over shared venue connections, one store per asset "
+        "(overrides --asset). Market flags then take an {asset} template, e.g. "
+        "--kraken-market '{asset}/USD'. Stores get an .<ASSET> infix on --db-path, or an "
+        "<ASSET>/ subdirectory of --capture-dir with --rotate-daily.",
+    )
     parser.add_argument(
         "--db-path",
         default="data/filter_eval.sqlite3",
@@ -326,313 +499,705 @@ def build_parser() -> argparse.ArgumentParser:
         default="data/capture",
         help="Directory for daily rolled captures when --rotate-daily is set.",
     )
+    parser.add_argument(
+        "--ingest",
+        default="inline",
+        choices=["inline", "multiprocess"],
+        help="inline: every socket on the capture loop. multiprocess: one worker process per "
+        "socket (parsing, normalisation, book building) feeding shared-memory rings.",
+    )
+    parser.add_argument(
+        "--ingest-ring-capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Records per venue ring in multiprocess ingest; a full ring drops and counts.",
+    )
+    parser.add_argument(
+        "--ingest-book-levels",
+        type=int,
+        default=DEFAULT_BOOK_LEVELS,
+        help="Book levels per side carried across the ring in multiprocess ingest.",
+    )
+    parser.add_argument(
+        "--json-backend",
+        default="auto",
+        choices=JSON_BACKENDS,
+        help="Frame decoder: auto picks the fastest installed of msgspec, orjson and the "
+        "stdlib. With msgspec and --numeric-mode float --drop-raw-messages, Coinbase level2 "
+        "frames are decoded typed. Kraken keeps float text for its checksums, so it uses "
+        "msgspec or the stdlib even when orjson is chosen. See scripts/bench_json_decoders.py.",
+    )
+    parser.add_argument(
+        "--store",
+        default="sqlite",
+        choices=["sqlite", "columnar"],
+        help="Capture backend: row-per-update SQLite, or a columnar .npy segment store "
+        "(written next to --db-path / in --capture-dir with a .cols suffix).",
+    )
+    parser.add_argument(
+        "--segment-rows",
+        type=int,
+        default=DEFAULT_SEGMENT_ROWS,
+        help="Updates per columnar segment (--store columnar only).",
+    )
     parser.add_argument(
         "--commit-every",
         type=int,
         default=100,
-        help="Commit SQLite writes every N updates.",
+        help="Group-commit capture writes every N updates.",
+    )
+    parser.add_argument(
+        "--commit-interval-s",
+        type=float,
+        default=1.0,
+        help="Commit pending capture writes at least this often, even below --commit-every "
+        "(--store columnar flushes a segment at most this often).",
+    )
+    parser.add_argument(
+        "--writer-queue-size",
+        type=int,
+        default=DEFAULT_MAX_QUEUE,
+        help="Updates buffered for the capture writer thread before the capture loop waits.",
+    )
+    parser.add_argument(
+        "--record-frames-dir",
+        default=None,
+        help="Also record every raw websocket frame into compressed, indexed segments under "
+        "this directory, so history can be re-normalised (see scripts/replay_capture.py).",
+    )
+    parser.add_argument(
+        "--frame-codec",
+        default="gzip",
+        choices=["gzip", "zstd"],
+        help="Compression for recorded frame segments; zstd needs the zstandard package.",
+    )
+    parser.add_argument(
+        "--timestamp-basis",
+        default="received",
+        choices=TIMESTAMP_BASES,
+        help="Clock for measurements and captured updates. received: local arrival time. "
+        "source: the venue's own timestamp. corrected: venue time shifted by an online "
+        "per-venue clock-offset estimate, so network jitter does not show up as lead-lag.",
+    )
+    parser.add_argument(
+        "--clock-window-s",
+        type=float,
+        default=30.0,
+        help="Window of the running minimum (received - source) behind each venue's offset.",
+    )
+    parser.add_argument(
+        "--latency-report-s",
+        type=float,
+        default=0.0,
+        help="Time every pipeline stage (parse, normalise, book, queue, measure, filters, "
+        "store) and report per-stage percentiles this often; 0 disables instrumentation.",
+    )
+    parser.add_argument(
+        "--latency-log",
+        default=None,
+        help="Append latency reports as JSON lines to this file instead of the log.",
+    )
+    parser.add_argument(
+        "--latency-sample-every",
+        type=int,
+        default=DEFAULT_SAMPLE_EVERY,
+        help="Time one message in this many on the per-message socket, queue and store stages.",
     )
     return parser
 
 
-def daily_capture_path(base_dir: Path) -> Path:
+def daily_capture_path(base_dir: Path, *, store: str = "sqlite") -> Path:
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    return base_dir / f"{today}.sqlite3"
+    suffix = ".cols" if store == "columnar" else ".sqlite3"
+    return base_dir / f"{today}{suffix}"
+
+
+def format_ingest_stats(stats: list[VenueIngestStats]) -> str:
+    return " ".join(
+        f"{venue.venue}[pub={venue.published} drop={venue.dropped} backlog={venue.backlog} "
+        f"lag_ms={venue.last_lag_ms}/{venue.max_lag_ms}{'' if venue.alive else ' DEAD'}]"
+        for venue in stats
+    )
+
+
+def open_capture_db(path: Path, args: argparse.Namespace) -> CaptureSink:
+    if args.store == "columnar":
+        return ColumnarEvalCaptureDB(
+            path, segment_rows=args.segment_rows, flush_interval_s=args.commit_interval_s
+        )
+    return EvalCaptureDB(path)
+
+
+def format_writer_stats(stats: CaptureWriterStats) -> str:
+    return (
+        f"queue={stats.queue_depth} (max {stats.max_queue_depth}) "
+        f"commits={stats.commits} commit_ms last={stats.last_commit_ms:.1f} "
+        f"mean={stats.mean_commit_ms:.1f} max={stats.max_commit_ms:.1f} "
+        f"producer_waits={stats.producer_waits} ({stats.producer_wait_ms:.0f}ms)"
+    )
+
+
+# Per-venue market arguments. ``{asset}`` in them is replaced per captured asset;
+# with --assets they must use it.
+MARKET_ARGS = (
+    "coinbase_market",
+    "hyperliquid_market",
+    "okx_market",
+    "kraken_market",
+    "hyperliquid_perp_market",
+    "hyperliquid_subscription_coin",
+    "hyperliquid_perp_subscription_coin",
+)
+
+
+def capture_assets(args: argparse.Namespace) -> list[argparse.Namespace]:
+    """One argument namespace per captured asset, with its venue markets filled in."""
+    names = dict.fromkeys(asset.upper() for asset in args.assets) if args.assets else [args.asset]
+    assets: list[argparse.Namespace] = []
+    for asset in names:
+        asset_args = copy.copy(args)
+        asset_args.asset = asset
+        for name in MARKET_ARGS:
+            value = getattr(args, name)
+            if value is not None:
+                setattr(asset_args, name, value.format(asset=asset))
+        assets.append(apply_asset_defaults(asset_args))
+    return assets
+
 
+def asset_capture_dir(args: argparse.Namespace, asset: str | None) -> Path | None:
+    """Daily-rotation directory, with one subdirectory per asset when ``asset`` is given."""
+    if not args.rotate_daily:
+        return None
+    capture_dir = Path(args.capture_dir)
+    return capture_dir / asset if asset is not None else capture_dir
 
-def build_socket_specs(args: argparse.Namespace) -> list[tuple[BaseSocket, str | None, str | None]]:
-    specs: list[tuple[BaseSocket, str | None, str | None]] = [
+
+def asset_capture_path(args: argparse.Namespace, asset: str | None) -> Path:
+    """Initial store path; ``--db-path`` gets an ``.<ASSET>`` infix when ``asset`` is given."""
+    capture_dir = asset_capture_dir(args, asset)
+    if capture_dir is not None:
+        return daily_capture_path(capture_dir, store=args.store)
+    path = Path(args.db_path)
+    if asset is not None:
+        path = path.with_name(f"{path.stem}.{asset}{path.suffix}")
+    return path.with_suffix(".cols") if args.store == "columnar" else path
+
+
+type SocketSpec = tuple[BaseSocket, str | None, str | None]
+
+
+def build_socket_specs(
+    args: argparse.Namespace, assets: Sequence[argparse.Namespace]
+) -> list[SocketSpec]:
+    """One connection per venue shared by every asset; Hyperliquid perps get one per asset.
+
+    The perp sockets carry a fixed ``hyperliquid_perp``/``<ASSET>-PERP``
+    override, so they cannot be shared. ``assets`` must already have their
+    Hyperliquid spot subscription coins resolved.
+    """
+    keep_raw_messages = not args.drop_raw_messages
+    specs: list[SocketSpec] = [
         (
             CoinbaseSocket(
-                args.coinbase_market,
+                [asset.coinbase_market for asset in assets],
                 channels=args.coinbase_channels or ["ticker", "heartbeats", "level2", "market_trades"],
                 sandbox=args.sandbox,
+                numeric_mode=args.numeric_mode,
+                keep_raw_messages=keep_raw_messages,
+                json_backend=args.json_backend,
             ),
             None,
             None,
         )
     ]
     if not args.disable_hyperliquid:
-        hyperliquid_subscription_coin = (
-            args.hyperliquid_subscription_coin
-            or resolve_hyperliquid_spot_subscription_coin(
-                args.hyperliquid_market,
-                testnet=args.testnet,
-            )
-        )
         specs.append(
             (
                 HyperliquidSocket(
-                    args.hyperliquid_market.split("/", 1)[0],
-                    subscription_coin=hyperliquid_subscription_coin,
+                    [asset.hyperliquid_market.split("/", 1)[0] for asset in assets],
+                    subscription_coin=[asset.hyperliquid_subscription_coin for asset in assets],
                     testnet=args.testnet,
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=keep_raw_messages,
+                    json_backend=args.json_backend,
                 ),
                 None,
                 None,
             )
         )
     if args.enable_hyperliquid_perp:
+        for asset in assets:
+            specs.append(
+                (
+                    HyperliquidSocket(
+                        asset.hyperliquid_perp_market,
+                        subscription_coin=(
+                            asset.hyperliquid_perp_subscription_coin
+                            or asset.hyperliquid_perp_market
+                        ),
+                        testnet=args.testnet,
+                        numeric_mode=args.numeric_mode,
+                        keep_raw_messages=keep_raw_messages,
+                        json_backend=args.json_backend,
+                    ),
+                    "hyperliquid_perp",
+                    f"{asset.hyperliquid_perp_market}-PERP",
+                )
+            )
+    if not args.disable_okx:
         specs.append(
             (
-                HyperliquidSocket(
-                    args.hyperliquid_perp_market,
-                    subscription_coin=(
-                        args.hyperliquid_perp_subscription_coin or args.hyperliquid_perp_market
-                    ),
-                    testnet=args.testnet,
+                OkxSocket(
+                    [asset.okx_market for asset in assets],
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=keep_raw_messages,
+                    json_backend=args.json_backend,
                 ),
-                "hyperliquid_perp",
-                f"{args.hyperliquid_perp_market}-PERP",
+                None,
+                None,
             )
         )
-    if not args.disable_okx:
-        specs.append((OkxSocket(args.okx_market), None, None))
     if not args.disable_kraken:
-        specs.append((KrakenSocket(args.kraken_market), None, None))
+        specs.append(
+            (
+                KrakenSocket(
+                    [asset.kraken_market for asset in assets],
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=keep_raw_messages,
+                    json_backend=args.json_backend,
+                ),
+                None,
+                None,
+            )
+        )
     return specs
 
 
+def resolve_subscription_coins(assets: Sequence[argparse.Namespace]) -> None:
+    for asset in assets:
+        if not asset.disable_hyperliquid and asset.hyperliquid_subscription_coin is None:
+            asset.hyperliquid_subscription_coin = resolve_hyperliquid_spot_subscription_coin(
+                asset.hyperliquid_market,
+                testnet=asset.testnet,
+            )
+
+
+def asset_markets(asset: argparse.Namespace) -> list[tuple[str, str]]:
+    """The ``(exchange, market)`` pairs this asset's observations arrive under."""
+    markets = [("coinbase", asset.coinbase_market)]
+    if not asset.disable_hyperliquid:
+        markets.append(("hyperliquid", asset.hyperliquid_subscription_coin))
+    if asset.enable_hyperliquid_perp:
+        markets.append(("hyperliquid_perp", f"{asset.hyperliquid_perp_market}-PERP"))
+    if not asset.disable_okx:
+        markets.append(("okx", asset.okx_market))
+    if not asset.disable_kraken:
+        markets.append(("kraken", asset.kraken_market))
+    return markets
+
+
+def frame_label(socket: BaseSocket, exchange_override: str | None) -> str:
+    return exchange_override or type(socket).__name__.removesuffix("Socket").lower()
+
+
+def attach_latency(
+    specs: list[tuple[BaseSocket, str | None, str | None]],
+    recorder: LatencyRecorder,
+) -> None:
+    for socket, exchange_override, _ in specs:
+        socket.latency = recorder
+        socket.latency_label = frame_label(socket, exchange_override)
+
+
+def attach_frame_recorders(
+    specs: list[tuple[BaseSocket, str | None, str | None]],
+    args: argparse.Namespace,
+) -> None:
+    for socket, exchange_override, _ in specs:
+        socket.frame_recorder = FrameRecorder(
+            Path(args.record_frames_dir),
+            frame_label(socket, exchange_override),
+            codec=args.frame_codec,
+        )
+
+
+class AssetCapture:
+    """One asset's measurement/filter pipeline and the writer for its store.
+
+    ``capture_dir`` is set in daily-rotation mode; the store then rolls over
+    to a new file in that directory at UTC midnight. With ``latency`` set the
+    measurement (venue pipeline), ``combine``, ``kalman`` and ``basis`` stages
+    are timed into ``<prefix>measure`` and friends.
+    """
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        writer: CaptureWriterThread,
+        path: Path,
+        *,
+        capture_dir: Path | None,
+        latency: LatencyRecorder | None = None,
+        latency_prefix: str = "",
+        clock: ClockOffsetEstimator | None = None,
+    ) -> None:
+        self.asset = args.asset
+        self.anchor_exchange = args.basis_anchor_exchange
+        self.writer = writer
+        self.path = path
+        self.capture_dir = capture_dir
+        self.store = args.store
+        self.observations = 0
+        self.updates = 0
+        self.latency = latency
+        self.pipeline = AssetFairValuePipeline(
+            args.asset,
+            basis_config=build_basis_filter_config(args),
+            kalman_config=build_kalman_config(args),
+            combiner_config=CrossVenueCombinerConfig(
+                stale_after_ms=args.stale_after_ms,
+                age_penalty_per_second=args.age_penalty_per_second,
+            ),
+            filter_factory=lambda: build_filter(args),
+            engine_config=MeasurementEngineConfig(timestamp_basis=args.timestamp_basis),
+            clock=clock,
+            stage_latency=(
+                [
+                    latency.histogram(f"{latency_prefix}{stage}")
+                    for stage in ("measure", "combine", "kalman", "basis")
+                ]
+                if latency is not None
+                else None
+            ),
+        )
+        self.trade_flow_trackers: dict[str, TradeFlowTracker] = {}
+
+    async def on_observation(self, observation: Observation, now_ms: int) -> bool:
+        """Feed one observation through the pipeline; True if an update was captured."""
+        self.observations += 1
+        snapshot = self.snapshot(observation, now_ms)
+        if snapshot is None:
+            return False
+        await self.writer.put(snapshot)
+
+        if self.capture_dir is not None:
+            new_path = daily_capture_path(self.capture_dir, store=self.store)
+            if new_path != self.path:
+                logging.info("rotating DB at UTC midnight: %s -> %s", self.path, new_path)
+                await self.writer.rotate(new_path)
+                self.path = new_path
+        self.updates += 1
+        return True
+
+    def snapshot(self, observation: Observation, now_ms: int) -> dict[str, Any] | None:
+        if isinstance(observation, TradeObservation):
+            tracker = self.trade_flow_trackers.get(observation.exchange)
+            if tracker is None:
+                tracker = TradeFlowTracker()
+                self.trade_flow_trackers[observation.exchange] = tracker
+            tracker.add(now_ms, observation.side, float(observation.size))
+            return None
+
+        step = self.pipeline.step(observation, now_ms)
+        if step is None:
+            return None
+        latest_venue_states = step.venue_states
+        venue_top_of_book: dict[str, tuple[float | None, float | None]] = {}
+        venue_microstructure: dict[
+            str,
+            tuple[
+                float | None,
+                float | None,
+                float | None,
+                float | None,
+                float | None,
+            ],
+        ] = {}
+        for exchange, current_measurement in self.pipeline.venue_pipeline.measurements().items():
+            venue_top_of_book[exchange] = (
+                float(current_measurement.bid_price)
+                if current_measurement.bid_price is not None
+                else None,
+                float(current_measurement.ask_price)
+                if current_measurement.ask_price is not None
+                else None,
+            )
+            venue_microstructure[exchange] = (
+                float(current_measurement.microprice)
+                if current_measurement.microprice is not None
+                else None,
+                float(current_measurement.depth_imbalance)
+                if current_measurement.depth_imbalance is not None
+                else None,
+                float(current_measurement.top_bid_depth)
+                if current_measurement.top_bid_depth is not None
+                else None,
+                float(current_measurement.top_ask_depth)
+                if current_measurement.top_ask_depth is not None
+                else None,
+                float(current_measurement.mid_volatility_bps)
+                if current_measurement.mid_volatility_bps is not None
+                else None,
+            )
+
+        combined = step.composite
+        kalman_result = step.kalman
+        basis_result = step.basis
+        basis_snapshot = step.last_basis
+
+        venue_trade_flow: dict[str, tuple[float, float, float, int]] = {
+            exchange: tracker.snapshot(now_ms)
+            for exchange, tracker in self.trade_flow_trackers.items()
+        }
+
+        # Every value here is rebuilt per event and never mutated afterwards, so
+        # the record can be handed to the writer thread without copying.
+        return dict(
+            now_ms=now_ms,
+            event_exchange=observation.exchange,
+            event_market=observation.market,
+            anchor_exchange=self.anchor_exchange,
+            latest_venue_states=latest_venue_states,
+            composite_price=float(combined.fair_value) if combined is not None else None,
+            composite_variance=float(combined.variance) if combined is not None else None,
+            contributing_exchanges=combined.contributing_exchanges if combined is not None else (),
+            kalman_filtered_price=(
+                float(kalman_result.filtered_price) if kalman_result is not None else None
+            ),
+            kalman_raw_fused_price=(
+                float(kalman_result.raw_fused_price) if kalman_result is not None else None
+            ),
+            kalman_used_venues=(
+                list(kalman_result.used_venues) if kalman_result is not None else []
+            ),
+            basis_common_price=(
+                float(basis_snapshot.common_price)
+                if basis_snapshot is not None
+                else None
+            ),
+            basis_common_stddev=(
+                float(basis_snapshot.common_price_stddev)
+                if basis_snapshot is not None
+                else None
+            ),
+            basis_is_live=basis_result is not None,
+            basis_active_venues=(
+                list(basis_snapshot.active_venues) if basis_snapshot is not None else []
+            ),
+            basis_estimates=(
+                basis_snapshot.basis_estimates if basis_snapshot is not None else {}
+            ),
+            basis_stddevs=(
+                basis_snapshot.basis_stddevs if basis_snapshot is not None else {}
+            ),
+            venue_top_of_book=venue_top_of_book,
+            venue_microstructure=venue_microstructure,
+            venue_trade_flow=venue_trade_flow,
+        )
+
+
+def format_clock_estimates(estimates: Sequence[VenueClockEstimate]) -> str:
+    return " ".join(
+        f"{estimate.exchange}[offset={estimate.offset_ms}ms "
+        f"excess={estimate.mean_excess_ms:.1f}ms last={estimate.last_excess_ms}ms "
+        f"n={estimate.samples}{'' if estimate.ready else ' warming'}]"
+        for estimate in estimates
+    )
+
+
+def format_asset_throughput(
+    captures: Sequence[AssetCapture], previous: dict[str, int], elapsed_s: float
+) -> str:
+    """Per-asset updates captured, and updates/s since the ``previous`` counts."""
+    parts = []
+    for capture in captures:
+        rate = (capture.updates - previous.get(capture.asset, 0)) / max(elapsed_s, 1e-9)
+        parts.append(
+            f"{capture.asset}[obs={capture.observations} updates={capture.updates} "
+            f"rate={rate:.1f}/s queue={capture.writer.stats().queue_depth}]"
+        )
+    return " ".join(parts)
+
+
 async def run_capture(args: argparse.Namespace) -> None:
-    capture_dir = Path(args.capture_dir) if args.rotate_daily else None
-    current_path = (
-        daily_capture_path(capture_dir) if capture_dir is not None else Path(args.db_path)
+    assets = capture_assets(args)
+    multi_asset = bool(args.assets)
+    resolve_subscription_coins(assets)
+    latency = (
+        LatencyRecorder(sample_every=args.latency_sample_every)
+        if args.latency_report_s > 0
+        else None
     )
-    db = EvalCaptureDB(current_path)
-    if capture_dir is not None:
-        logging.info("capture starting in rolling mode: %s", current_path)
-    observation_queue: asyncio.Queue[Observation] = asyncio.Queue()
-    socket_specs = build_socket_specs(args)
-    tasks = [
-        asyncio.create_task(
-            stream_socket_observations(
-                socket,
-                observation_queue,
-                exchange_override=exchange_override,
-                market_override=market_override,
+    basis = args.timestamp_basis
+    clock = ClockOffsetEstimator(
+        ClockOffsetConfig(window_ms=int(args.clock_window_s * 1000)), latency=latency
+    )
+    captures: list[AssetCapture] = []
+    for asset in assets:
+        label = asset.asset if multi_asset else None
+        capture_dir = asset_capture_dir(args, label)
+        store_path = asset_capture_path(args, label)
+        writer = CaptureWriterThread(
+            lambda path: open_capture_db(path, args),
+            store_path,
+            max_queue=args.writer_queue_size,
+            commit_every=args.commit_every,
+            max_commit_delay_s=args.commit_interval_s,
+            latency=latency,
+            latency_label="store" if label is None else f"store.{label}",
+        )
+        writer.start()
+        if capture_dir is not None:
+            logging.info("capture starting in rolling mode: %s", store_path)
+        captures.append(
+            AssetCapture(
+                asset,
+                writer,
+                store_path,
+                capture_dir=capture_dir,
+                latency=latency,
+                latency_prefix="" if label is None else f"{label}.",
+                clock=clock,
             )
         )
-        for socket, exchange_override, market_override in socket_specs
-    ]
+    # A single asset takes everything its sockets send, as before; several
+    # assets are told apart by the market each observation arrived on.
+    router: MarketRouter[AssetCapture] = MarketRouter(
+        default=None if multi_asset else captures[0]
+    )
+    if multi_asset:
+        for asset, capture in zip(assets, captures, strict=True):
+            for exchange, market in asset_markets(asset):
+                router.add(exchange, market, capture)
 
-    measurement_engines: dict[tuple[str, str], MarketMeasurementEngine] = {}
-    estimators: dict[tuple[str, str], RawFairValueEstimator] = {}
-    filters: dict[tuple[str, str], object | None] = {}
-    latest_venue_states: dict[str, VenueFairValueState] = {}
-    combiner = CrossVenueFairValueCombiner(
-        args.asset,
-        config=CrossVenueCombinerConfig(
-            stale_after_ms=args.stale_after_ms,
-            age_penalty_per_second=args.age_penalty_per_second,
-        ),
+    observation_queue: asyncio.Queue[Observation] = (
+        TimedQueue(latency.histogram("queue"), sample_every=latency.sample_every)
+        if latency is not None
+        else asyncio.Queue()
+    )
+    socket_specs = build_socket_specs(args, assets)
+    if args.record_frames_dir is not None:
+        attach_frame_recorders(socket_specs, args)
+    # Socket stages run in the worker processes under multiprocess ingest and
+    # are only timed inline; the queue hop then starts at the ring pump.
+    if latency is not None and args.ingest == "inline":
+        attach_latency(socket_specs, latency)
+    ingestor: MultiProcessIngestor | None = None
+    if args.ingest == "multiprocess":
+        ingestor = MultiProcessIngestor(
+            socket_specs,
+            capacity=args.ingest_ring_capacity,
+            book_levels=args.ingest_book_levels,
+        )
+        ingestor.start()
+        tasks = [asyncio.create_task(ingestor.pump(observation_queue))]
+    else:
+        tasks = [
+            asyncio.create_task(
+                stream_socket_observations(
+                    socket,
+                    observation_queue,
+                    exchange_override=exchange_override,
+                    market_override=market_override,
+                )
+            )
+            for socket, exchange_override, market_override in socket_specs
+        ]
+    reporter_task: asyncio.Task[None] | None = None
+    if latency is not None:
+        reporter = LatencyReporter(
+            latency,
+            interval_s=args.latency_report_s,
+            path=Path(args.latency_log) if args.latency_log is not None else None,
+        )
+        reporter_task = asyncio.create_task(reporter.run())
+    logging.info(
+        "capturing %s over %s connections",
+        ",".join(capture.asset for capture in captures),
+        len(socket_specs),
     )
-    kalman = AdaptiveEfficientPriceKalman(config=build_kalman_config(args))
-    basis_filter = VenueBasisKalmanFilter(config=build_basis_filter_config(args))
-    last_basis_result = None
-    trade_flow_trackers: dict[str, TradeFlowTracker] = {}
 
     count = 0
+    capture_clock_ms = 0
+    report_started = time.monotonic()
+    report_counts: dict[str, int] = {}
     try:
         while True:
             observation = await observation_queue.get()
+            corrected_ms = clock.observe(observation)
             now_ms = (
-                observation.received_timestamp_ms
-                if observation.received_timestamp_ms is not None
-                else observation.source_timestamp_ms
+                corrected_ms if basis == "corrected" else event_timestamp_ms(observation, basis)
             )
             if now_ms is None:
                 continue
-
-            if isinstance(observation, TradeObservation):
-                tracker = trade_flow_trackers.get(observation.exchange)
-                if tracker is None:
-                    tracker = TradeFlowTracker()
-                    trade_flow_trackers[observation.exchange] = tracker
-                tracker.add(now_ms, observation.side, float(observation.size))
-                continue
-
-            engine_key = (observation.exchange, observation.market)
-            measurement_engine = measurement_engines.get(engine_key)
-            if measurement_engine is None:
-                measurement_engine = MarketMeasurementEngine(
-                    exchange=observation.exchange,
-                    market=observation.market,
-                )
-                measurement_engines[engine_key] = measurement_engine
-            measurement_engine.on_observation(observation)
-
-            latest_venue_states.clear()
-            venue_top_of_book: dict[str, tuple[float | None, float | None]] = {}
-            venue_microstructure: dict[
-                str,
-                tuple[
-                    float | None,
-                    float | None,
-                    float | None,
-                    float | None,
-                    float | None,
-                ],
-            ] = {}
-            for current_engine_key, current_engine in measurement_engines.items():
-                estimator = estimators.get(current_engine_key)
-                if estimator is None:
-                    estimator = RawFairValueEstimator()
-                    estimators[current_engine_key] = estimator
-                if current_engine_key not in filters:
-                    filters[current_engine_key] = build_filter(args)
-                venue_state = build_venue_state(
-                    engine=current_engine,
-                    estimator=estimator,
-                    fair_value_filter=filters[current_engine_key],
-                    market=args.asset,
-                    now_ms=now_ms,
-                )
-                if venue_state is None:
-                    continue
-                latest_venue_states[current_engine.exchange] = venue_state
-                current_measurement = current_engine.current_measurement(now_ms)
-                if current_measurement is not None:
-                    venue_top_of_book[current_engine.exchange] = (
-                        float(current_measurement.bid_price)
-                        if current_measurement.bid_price is not None
-                        else None,
-                        float(current_measurement.ask_price)
-                        if current_measurement.ask_price is not None
-                        else None,
-                    )
-                    venue_microstructure[current_engine.exchange] = (
-                        float(current_measurement.microprice)
-                        if current_measurement.microprice is not None
-                        else None,
-                        float(current_measurement.depth_imbalance)
-                        if current_measurement.depth_imbalance is not None
-                        else None,
-                        float(current_measurement.top_bid_depth)
-                        if current_measurement.top_bid_depth is not None
-                        else None,
-                        float(current_measurement.top_ask_depth)
-                        if current_measurement.top_ask_depth is not None
-                        else None,
-                        float(current_measurement.mid_volatility_bps)
-                        if current_measurement.mid_volatility_bps is not None
-                        else None,
-                    )
-
-            if not latest_venue_states:
+            if basis != "received":
+                # Event times reach us out of order across venues; the capture
+                # clock only moves forward so the filters never step back.
+                capture_clock_ms = now_ms = max(now_ms, capture_clock_ms)
+            capture = router.route(observation)
+            if capture is None:
                 continue
-
-            spot_venue_states = [
-                state for state in latest_venue_states.values() if not is_perp_exchange(state.exchange)
-            ]
-            if not spot_venue_states:
+            if not await capture.on_observation(observation, now_ms):
                 continue
 
-            for venue_state in spot_venue_states:
-                combiner.update(venue_state, now_ms=now_ms)
-            combined = combiner.combine(now_ms=now_ms)
-
-            kalman_result = kalman.update(
-                timestamp_s=now_ms / 1000.0,
-                observations=[
-                    VenueObservation(
-                        name=state.exchange,
-                        fair_value=float(state.fair_value),
-                        local_variance=float(state.variance),
-                        age_ms=float(max(now_ms - state.timestamp_ms, 0)),
-                    )
-                    for state in spot_venue_states
-                ],
-            )
-
-            basis_result = basis_filter.update(
-                timestamp_s=now_ms / 1000.0,
-                observations=[
-                    VenueBasisObservation(
-                        name=state.exchange,
-                        fair_value=state.fair_value,
-                        local_variance=state.variance,
-                        age_ms=float(max(now_ms - state.timestamp_ms, 0)),
-                        venue_kind="perp" if is_perp_exchange(state.exchange) else "spot",
-                    )
-                    for state in latest_venue_states.values()
-                ],
-            )
-            if basis_result is not None:
-                last_basis_result = basis_result
-            basis_snapshot = basis_result if basis_result is not None else last_basis_result
-
-            venue_trade_flow: dict[str, tuple[float, float, float, int]] = {
-                exchange: tracker.snapshot(now_ms)
-                for exchange, tracker in trade_flow_trackers.items()
-            }
-
-            db.insert_snapshot(
-                now_ms=now_ms,
-                event_exchange=observation.exchange,
-                event_market=observation.market,
-                anchor_exchange=args.basis_anchor_exchange,
-                latest_venue_states=latest_venue_states,
-                composite_price=float(combined.fair_value) if combined is not None else None,
-                composite_variance=float(combined.variance) if combined is not None else None,
-                contributing_exchanges=combined.contributing_exchanges if combined is not None else (),
-                kalman_filtered_price=(
-                    float(kalman_result.filtered_price) if kalman_result is not None else None
-                ),
-                kalman_raw_fused_price=(
-                    float(kalman_result.raw_fused_price) if kalman_result is not None else None
-                ),
-                kalman_used_venues=kalman_result.used_venues if kalman_result is not None else [],
-                basis_common_price=(
-                    float(basis_snapshot.common_price)
-                    if basis_snapshot is not None
-                    else None
-                ),
-                basis_common_stddev=(
-                    float(basis_snapshot.common_price_stddev)
-                    if basis_snapshot is not None
-                    else None
-                ),
-                basis_is_live=basis_result is not None,
-                basis_active_venues=(
-                    basis_snapshot.active_venues if basis_snapshot is not None else []
-                ),
-                basis_estimates=(
-                    basis_snapshot.basis_estimates if basis_snapshot is not None else {}
-                ),
-                basis_stddevs=(
-                    basis_snapshot.basis_stddevs if basis_snapshot is not None else {}
-                ),
-                venue_top_of_book=venue_top_of_book,
-                venue_microstructure=venue_microstructure,
-                venue_trade_flow=venue_trade_flow,
-            )
-            db.maybe_commit(args.commit_every)
-
-            if capture_dir is not None:
-                new_path = daily_capture_path(capture_dir)
-                if new_path != current_path:
-                    logging.info("rotating DB at UTC midnight: %s -> %s", current_path, new_path)
-                    db.close()
-                    db = EvalCaptureDB(new_path)
-                    current_path = new_path
-
             count += 1
             if count % 1000 == 0:
-                logging.info("captured %s updates into %s", count, current_path)
+                now = time.monotonic()
+                if multi_asset:
+                    logging.info(
+                        "captured %s updates; %s unrouted=%s",
+                        count,
+                        format_asset_throughput(captures, report_counts, now - report_started),
+                        router.unrouted,
+                    )
+                    report_started = now
+                    report_counts = {capture.asset: capture.updates for capture in captures}
+                for capture in captures:
+                    logging.info(
+                        "captured %s updates into %s; writer %s",
+                        capture.updates,
+                        capture.path,
+                        format_writer_stats(capture.writer.stats()),
+                    )
+                if ingestor is not None:
+                    logging.info("ingest %s", format_ingest_stats(ingestor.stats()))
+                logging.info("clock %s", format_clock_estimates(clock.estimates()))
             if args.limit and count >= args.limit:
                 break
     finally:
         for task in tasks:
             task.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
-        for socket, _, _ in socket_specs:
-            await socket.close()
-        db.close()
+        if ingestor is not None:
+            ingestor.close()
+        else:
+            for socket, _, _ in socket_specs:
+                await socket.close()
+        for capture in captures:
+            await capture.writer.close()
+            logging.info(
+                "capture writer closed for %s: %s",
+                capture.path,
+                format_writer_stats(capture.writer.stats()),
+            )
+        # Last, so the final report includes the writers' drain.
+        if reporter_task is not None:
+            reporter_task.cancel()
+            await asyncio.gather(reporter_task, return_exceptions=True)
 
 
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
-    apply_asset_defaults(args)
+    if args.assets:
+        for name in MARKET_ARGS:
+            value = getattr(args, name)
+            if value is not None and "{asset}" not in value:
+                parser.error(
+                    f"--{name.replace('_', '-')} must contain {{asset}} with --assets, "
+                    f"e.g. '{{asset}}/USD'."
+                )
     logging.basicConfig(
         level=getattr(logging, args.log_level),
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
@@ -0,0 +1,46 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Convert capture_filter_eval SQLite files into columnar capture stores.
+
+Each ``<name>.sqlite3`` becomes ``<name>.cols/`` next to it (or under
+``--out-dir``): one directory of ``.npy`` column segments plus ``index.json``.
+walk_forward_lagged, simulate_basis_maker and filter_innovation_mae accept the
+``.cols`` path anywhere they accept the SQLite one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.capture import convert_sqlite_capture
+from icarus.capture.store import DEFAULT_SEGMENT_ROWS
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    p.add_argument("db_paths", type=Path, nargs="+", help="SQLite capture files to convert")
+    p.add_argument("--out-dir", type=Path, default=None,
+                   help="directory for the .cols stores (default: next to each input)")
+    p.add_argument("--segment-rows", type=int, default=DEFAULT_SEGMENT_ROWS,
+                   help="updates per column segment")
+    args = p.parse_args()
+
+    for db_path in args.db_paths:
+        out_dir = args.out_dir if args.out_dir is not None else db_path.parent
+        store_path = out_dir / db_path.with_suffix(".cols").name
+        start = time.perf_counter()
+        updates = convert_sqlite_capture(db_path, store_path, segment_rows=args.segment_rows)
+        elapsed = time.perf_counter() - start
+        print(f"{db_path} -> {store_path}: {updates:,} updates in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,9 @@
 """Pull Coinbase ETH-USD 1-minute candles as external LVR reference.
 
 30d × 24h × 60m = 43,200 bars. Coinbase caps each request at 300 candles,
-so ~145 paged requests, rate-limited.
+so ~145 pages; icarus.fetch requests them concurrently within Coinbase's
+rate budget and caches settled pages under data/dex_cache/pages, so a rerun
+(or a resumed, interrupted one) only fetches what it does not have.
 
 Output: JSONL at data/dex_cache/cex_eth_1m_<days>d.jsonl
     {ts_s, open, high, low, close, volume}
@@ -13,30 +15,40 @@ Output: JSONL at data/dex_cache/cex_eth_1m_<days>d.jsonl
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import sys
 import time
-import urllib.parse
-import urllib.request
-from datetime import UTC, datetime
 from pathlib import Path
 
-CB_URL = "https://api.exchange.coinbase.com/products/ETH-USD/candles"
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.fetch import AsyncHttpClient, ResponseCache, TimeWindow, coinbase_candles
+
+PRODUCT = "ETH-USD"
 CACHE_DIR = Path("data/dex_cache")
 
 
-def fetch_page(start_s: int, end_s: int) -> list[list]:
-    params = {
-        "granularity": 60,
-        "start": datetime.fromtimestamp(start_s, UTC).isoformat(),
-        "end": datetime.fromtimestamp(end_s, UTC).isoformat(),
-    }
-    req = urllib.request.Request(
-        f"{CB_URL}?{urllib.parse.urlencode(params)}",
-        headers={"User-Agent": "icarus-research/0.1"},
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read())
+async def pull(days: float) -> list[list[float]]:
+    now = int(time.time())
+    start = now - int(days * 86_400)
+    print(f"pulling {PRODUCT} 1m from {start} to {now}")
+    pages = {"fetched": 0, "cached": 0}
+
+    def progress(window: TimeWindow, rows: list[list[float]], from_cache: bool) -> None:
+        pages["cached" if from_cache else "fetched"] += 1
+        if not from_cache and pages["fetched"] % 20 == 0:
+            print(f"  fetched {pages['fetched']} pages  (latest window {window.start})")
+
+    async with AsyncHttpClient() as client:
+        rows = await coinbase_candles(
+            client, PRODUCT, 60, start, now,
+            cache=ResponseCache(CACHE_DIR / "pages"), on_page=progress,
+        )
+    print(f"  {pages['fetched']} pages fetched, {pages['cached']} from cache")
+    return rows
 
 
 def main() -> None:
@@ -47,34 +59,9 @@ def main() -> None:
 
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
     out = args.output or CACHE_DIR / f"cex_eth_1m_{int(args.days)}d.jsonl"
-    now = int(time.time())
-    start = now - int(args.days * 86_400)
-    print(f"pulling ETH-USD 1m from {start} to {now}")
     print(f"output: {out}")
+    rows = asyncio.run(pull(args.days))
 
-    # page forward by 300 minutes
-    cursor = start
-    step = 300 * 60
-    seen: dict[int, list] = {}
-    page = 0
-    while cursor < now:
-        page_end = min(cursor + step, now)
-        try:
-            batch = fetch_page(cursor, page_end)
-        except Exception as e:
-            print(f"  err at {cursor}: {e}", file=sys.stderr)
-            time.sleep(2.0)
-            cursor = page_end
-            continue
-        for c in batch:
-            seen[int(c[0])] = c
-        page += 1
-        if page % 20 == 0:
-            print(f"  page {page}  cursor_ts={cursor}  candles={len(seen):,}")
-        cursor = page_end
-        time.sleep(0.15)
-
-    rows = sorted(seen.values(), key=lambda c: c[0])
     with out.open("w") as fh:
         for c in rows:
             fh.write(json.dumps({
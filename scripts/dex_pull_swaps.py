@@ -4,10 +4,14 @@
 """Pull swap + modifyLiquidity events for a Uniswap V4 pool on Base.
 
 Reads subgraph credentials from .env (GRAPH_API_KEY, UNISWAPV4_BASE_SUBGRAPH_ID)
-and paginates swaps by ascending timestamp into a gzipped JSONL cache.
+and pulls the pool's swaps into a gzipped JSONL file sorted by (timestamp,
+logIndex).
 
-Resumable: if cache exists, resumes from the last captured timestamp. Useful
-for 30-day pulls that take ~10 minutes wall-time.
+The span is split into fixed time windows fetched concurrently through
+icarus.fetch (paging by id inside a window). Windows older than an hour are
+cached under data/dex_cache/pages as they complete, so an interrupted pull
+resumes where it stopped and a later pull of "the last N days" only fetches
+the new windows.
 
 Target pool (default): ETH/USDC 0.05%, no hooks,
     0x96d4b53a38337a5733179751781178a2613306063c511b78cd02684739288c0a
@@ -16,13 +20,20 @@ Target pool (default): ETH/USDC 0.05%, no hooks,
 from __future__ import annotations
 
 import argparse
+import asyncio
 import gzip
 import json
 import os
 import sys
 import time
-import urllib.request
 from pathlib import Path
+from typing import Any
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.fetch import AsyncHttpClient, ResponseCache, TimeWindow, graph_swaps
 
 DEFAULT_POOL = "0x96d4b53a38337a5733179751781178a2613306063c511b78cd02684739288c0a"
 GRAPH_URL_TEMPLATE = "https://gateway.thegraph.com/api/{key}/subgraphs/id/{sg}"
@@ -50,89 +61,26 @@ def graph_url(env_key: str = "UNISWAPV4_BASE_SUBGRAPH_ID") -> str:
     return GRAPH_URL_TEMPLATE.format(key=key, sg=sg)
 
 
-def post(url: str, query: str, retries: int = 6, sleep_s: float = 2.0) -> dict:
-    """POST a GraphQL query with simple retry on 5xx / indexer errors."""
-    body = json.dumps({"query": query}).encode()
-    headers = {"Content-Type": "application/json", "User-Agent": "Mozilla/5.0 icarus/0.1"}
-    for attempt in range(retries):
-        try:
-            req = urllib.request.Request(url, data=body, headers=headers)
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                r = json.loads(resp.read())
-            if "errors" in r:
-                # indexer transient errors — retry
-                msg = str(r["errors"])[:300]
-                if "indexer" in msg or "bad indexer" in msg:
-                    print(f"  retry (indexer): {msg}", file=sys.stderr)
-                    time.sleep(sleep_s * (2 ** attempt))
-                    continue
-                raise RuntimeError(f"GraphQL errors: {msg}")
-            return r["data"]
-        except urllib.error.HTTPError as e:
-            if 500 <= e.code < 600:
-                print(f"  retry ({e.code})", file=sys.stderr)
-                time.sleep(sleep_s * (2 ** attempt))
-                continue
-            raise
-        except (urllib.error.URLError, TimeoutError) as e:
-            print(f"  retry (network): {e}", file=sys.stderr)
-            time.sleep(sleep_s * (2 ** attempt))
-    raise RuntimeError("exhausted retries")
-
-
-def build_swap_query(pool: str, since_ts: int, first: int) -> str:
-    return (
-        "{ swaps("
-        f'where: {{pool: "{pool}", timestamp_gt: "{since_ts}"}} '
-        "orderBy: timestamp orderDirection: asc "
-        f"first: {first}"
-        ") { id timestamp sender origin amount0 amount1 amountUSD "
-        "sqrtPriceX96 tick logIndex } }"
-    )
-
-
-def pull_swaps(pool: str, since_ts: int, until_ts: int, cache_path: Path,
-               page_size: int = 1000,
-               env_key: str = "UNISWAPV4_BASE_SUBGRAPH_ID") -> int:
-    """Append new swaps to cache_path (gzipped JSONL). Return count written."""
-    url = graph_url(env_key)
-    written = 0
-    cursor = since_ts
-    with gzip.open(cache_path, "at") as fh:
-        while True:
-            q = build_swap_query(pool, cursor, page_size)
-            data = post(url, q)
-            swaps = data.get("swaps", []) if data else []
-            if not swaps:
-                break
-            for s in swaps:
-                ts = int(s["timestamp"])
-                if ts > until_ts:
-                    return written
-                fh.write(json.dumps(s) + "\n")
-                written += 1
-                cursor = max(cursor, ts)
-            print(f"  +{len(swaps):>5}  total {written:>7}  "
-                  f"cursor_ts={cursor}  last_log={swaps[-1]['logIndex']}")
-            if len(swaps) < page_size:
-                break
-    return written
-
-
-def last_timestamp_in_cache(path: Path) -> int:
-    """Stream the gzip once to find the max timestamp seen. Cheap enough."""
-    if not path.exists():
-        return 0
-    last = 0
-    with gzip.open(path, "rt") as fh:
-        for line in fh:
-            try:
-                ts = int(json.loads(line)["timestamp"])
-                if ts > last:
-                    last = ts
-            except Exception:
-                continue
-    return last
+async def pull_swaps(pool: str, since_ts: int, until_ts: int, *, url: str,
+                     window_s: int, page_size: int, concurrency: int) -> list[dict[str, Any]]:
+    """Swaps of ``pool`` in ``[since_ts, until_ts)``, sorted."""
+    pages = {"fetched": 0, "cached": 0, "swaps": 0}
+
+    def progress(window: TimeWindow, swaps: list[dict[str, Any]], from_cache: bool) -> None:
+        pages["cached" if from_cache else "fetched"] += 1
+        pages["swaps"] += len(swaps)
+        if not from_cache:
+            print(f"  +{len(swaps):>6}  window {window.start}..{window.end}  "
+                  f"total {pages['swaps']:>8}")
+
+    async with AsyncHttpClient(headers={"User-Agent": "Mozilla/5.0 icarus/0.1"}) as client:
+        swaps = await graph_swaps(
+            client, url, pool, since_ts, until_ts,
+            window_s=window_s, page_size=page_size, concurrency=concurrency,
+            cache=ResponseCache(CACHE_DIR / "pages"), on_page=progress,
+        )
+    print(f"  {pages['fetched']} windows fetched, {pages['cached']} from cache")
+    return swaps
 
 
 def main() -> None:
@@ -143,6 +91,9 @@ def main() -> None:
                     help="pull swaps from now-days to now")
     ap.add_argument("--output", type=Path, default=None)
     ap.add_argument("--page-size", type=int, default=1000)
+    ap.add_argument("--window-hours", type=float, default=6.0,
+                    help="time window per concurrent page sequence (and cache entry)")
+    ap.add_argument("--concurrency", type=int, default=8)
     ap.add_argument("--subgraph-env", default="UNISWAPV4_BASE_SUBGRAPH_ID",
                     help="env var holding the subgraph id (use "
                          "UNISWAPV3_BASE_SUBGRAPH_ID for V3)")
@@ -154,15 +105,20 @@ def main() -> None:
     print(f"output: {out}")
 
     now = int(time.time())
-    target_since = now - int(args.days * 86_400)
-    resume_from = last_timestamp_in_cache(out)
-    start = max(target_since, resume_from)
-    print(f"target window: since={target_since} ({args.days}d ago)  "
-          f"now={now}  resume_from={resume_from}  start={start}")
-
-    written = pull_swaps(args.pool, start, now, out, args.page_size,
-                         env_key=args.subgraph_env)
-    print(f"\nwrote {written:,} swaps to {out}")
+    since = now - int(args.days * 86_400)
+    print(f"target window: since={since} ({args.days}d ago)  now={now}")
+
+    swaps = asyncio.run(pull_swaps(
+        args.pool, since, now + 1, url=graph_url(args.subgraph_env),
+        window_s=int(args.window_hours * 3600), page_size=args.page_size,
+        concurrency=args.concurrency,
+    ))
+    partial = out.with_name(out.name + ".partial")
+    with gzip.open(partial, "wt") as fh:
+        for s in swaps:
+            fh.write(json.dumps(s) + "\n")
+    partial.replace(out)
+    print(f"\nwrote {len(swaps):,} swaps to {out}")
 
 
 if __name__ == "__main__":
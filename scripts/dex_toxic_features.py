@@ -17,51 +17,50 @@ Label: toxicity magnitude = -dv_ext from attribution (loss at CEX price);
 binary label = toxicity > threshold (default: top quantile).
 
 Output: CSV with features + labels, ready for classifier training.
+
+The pool/LP math comes from icarus.dex and the rolling features from the
+batch window reductions in icarus.stats.
 """
 
 from __future__ import annotations
 
 import argparse
-import gzip
-import json
-import math
-from collections import deque
+import sys
 from pathlib import Path
 
 import numpy as np
 
-Q96 = 2**96
-ETH_DEC = 18
-USDC_DEC = 6
-DEC_ADJ = 10 ** (ETH_DEC - USDC_DEC)
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.dex import SwapPath, load_cex, load_swaps, range_bounds, swap_attribution
+from icarus.stats import trailing_windows, window_quantile, window_sum
 
+WARMUP_S = 3600
+BIG_WINDOW = 100  # rolling window (swaps) for the p95 size
 
-def sqrtx96_to_price(sqrt_x96: float) -> float:
-    s = sqrt_x96 / Q96
-    return (s * s) * DEC_ADJ
 
+def realized_vol(log_hist: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """Root sum of squared log returns over history ``[start, stop)``; NaN if < 3 points."""
+    sq = np.zeros_like(log_hist)
+    sq[1:] = np.diff(log_hist) ** 2
+    # The first point of a window contributes no return.
+    lead = np.minimum(start + 1, stop)
+    out = np.sqrt(np.maximum(window_sum(sq, lead, stop), 0.0))
+    return np.where(stop - start >= 3, out, np.nan)
 
-def load_swaps(path: Path) -> list[dict]:
-    rows: list[dict] = []
-    with gzip.open(path, "rt") as fh:
-        for line in fh:
-            rows.append(json.loads(line))
-    rows.sort(key=lambda r: (int(r["timestamp"]), int(r["logIndex"])))
-    return rows
 
+def trailing_p95(sizes: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """p95 of ``sizes[stop - BIG_WINDOW:stop]`` per entry; 0 with no history."""
+    start = np.maximum(stop - BIG_WINDOW, 0)
+    return np.nan_to_num(window_quantile(sizes, start, stop, 0.95), nan=0.0)
 
-def load_cex(path: Path) -> tuple[np.ndarray, np.ndarray]:
-    ts: list[int] = []
-    px: list[float] = []
-    with path.open() as fh:
-        for line in fh:
-            r = json.loads(line)
-            ts.append(int(r["ts_s"]))
-            px.append(float(r["close"]))
-    a = np.asarray(ts)
-    p = np.asarray(px)
-    order = np.argsort(a)
-    return a[order], p[order]
+
+def format_column(values: np.ndarray) -> list[str]:
+    if values.dtype.kind == "f":
+        return [f"{v:.6g}" for v in values.tolist()]
+    return [str(v) for v in values.tolist()]
 
 
 def main() -> None:
@@ -81,176 +80,104 @@ def main() -> None:
     args = ap.parse_args()
 
     print(f"loading {args.swaps}")
-    swaps = load_swaps(args.swaps)
-    cex_ts, cex_px = load_cex(args.cex)
-    t0, t1 = int(cex_ts[0]), int(cex_ts[-1])
-    swaps = [s for s in swaps if t0 <= int(s["timestamp"]) <= t1]
+    cex = load_cex(args.cex)
+    swaps = load_swaps(args.swaps).window(int(cex.timestamp[0]), int(cex.timestamp[-1]))
     print(f"  {len(swaps):,} swaps in window")
 
     # Use first hour for warm-up; we need price history before labeling makes sense
-    warm_end = int(swaps[0]["timestamp"]) + 3600
+    warm_end = int(swaps.timestamp[0]) + WARMUP_S
 
     # Compute LP range center from median first-hour pool price
-    warm_prices = [sqrtx96_to_price(float(s["sqrtPriceX96"]))
-                   for s in swaps if int(s["timestamp"]) < warm_end]
-    center = float(np.median(warm_prices))
+    prices = swaps.price
+    center = float(np.median(prices[swaps.timestamp < warm_end]))
     rp = args.range_pct / 100.0
     p_lo = center * (1.0 - rp)
     p_hi = center * (1.0 + rp)
-    sqrt_lo = math.sqrt(p_lo / DEC_ADJ) * Q96
-    sqrt_hi = math.sqrt(p_hi / DEC_ADJ) * Q96
+    sqrt_lo, sqrt_hi = range_bounds(center, args.range_pct)
     print(f"center=${center:.2f}  range=[${p_lo:.2f}, ${p_hi:.2f}]")
 
-    # Dummy L_pos for labeling (deposit-scale-invariant since we emit magnitude)
-    L_pos = 1.0
-
-    def token_amounts(L, sqrtP, sqrtPl, sqrtPh):
-        if sqrtP <= sqrtPl:
-            return L * (1.0 / sqrtPl - 1.0 / sqrtPh) * Q96, 0.0
-        if sqrtP >= sqrtPh:
-            return 0.0, L * (sqrtPh - sqrtPl) / Q96
-        return (L * (1.0 / sqrtP - 1.0 / sqrtPh) * Q96,
-                L * (sqrtP - sqrtPl) / Q96)
-
-    # Rolling buffers for features
-    price_hist: deque[tuple[int, float]] = deque()  # (ts, pool_mid)
-    flow_hist: deque[tuple[int, float]] = deque()   # (ts, signed_usd)
-    size_hist: deque[float] = deque()                # last 100 abs usd
-
-    BIG_WINDOW = 100  # rolling window for p95 size
-
-    def prune(buf: deque, cutoff: int):
-        while buf and buf[0][0] < cutoff:
-            buf.popleft()
-
-    def rv(prices: list[float]) -> float:
-        if len(prices) < 3:
-            return float("nan")
-        lr = np.diff(np.log(np.asarray(prices)))
-        return float(np.sqrt(np.sum(lr * lr)))
-
-    out_rows = []
-    prev_sqrt = float(swaps[0]["sqrtPriceX96"])
-    last_big_ts = int(swaps[0]["timestamp"])
-
-    for s in swaps[1:]:
-        ts = int(s["timestamp"])
-        sqrt_post = float(s["sqrtPriceX96"])
-        a0 = float(s["amount0"])
-        usd = float(s["amountUSD"])
-        pool_pre = sqrtx96_to_price(prev_sqrt)
-        pool_post = sqrtx96_to_price(sqrt_post)
-        signed_usd = -math.copysign(usd, a0)  # a0>0 = user sold ETH = sell-flow
-
-        if ts < warm_end:
-            price_hist.append((ts, pool_pre))
-            flow_hist.append((ts, signed_usd))
-            size_hist.append(abs(usd))
-            if len(size_hist) > BIG_WINDOW:
-                size_hist.popleft()
-            prev_sqrt = sqrt_post
-            continue
-
-        # CEX at swap time
-        j = int(np.searchsorted(cex_ts, ts))
-        j = min(max(j, 0), len(cex_px) - 1)
-        ext = float(cex_px[j])
-
-        # Basis (pre-swap)
-        basis_bps = (pool_pre - ext) / ext * 1e4
-
-        # Realized vol over last 5/15/60 min (from pool mids)
-        prune(price_hist, ts - 3600)
-        prices_60 = [p for (t, p) in price_hist]
-        prices_15 = [p for (t, p) in price_hist if t >= ts - 900]
-        prices_5  = [p for (t, p) in price_hist if t >= ts - 300]
-        rv_5 = rv(prices_5) * 1e4  # bps of log-return sum
-        rv_15 = rv(prices_15) * 1e4
-        rv_60 = rv(prices_60) * 1e4
-
-        # Flow imbalance last 5/30 min
-        prune(flow_hist, ts - 1800)
-        fl30 = sum(v for (t, v) in flow_hist)
-        fl5  = sum(v for (t, v) in flow_hist if t >= ts - 300)
-
-        # Swap rate last 5 min
-        rate_5 = sum(1 for (t, _) in flow_hist if t >= ts - 300) / 5.0
-
-        # Recent size stats
-        p95_size = float(np.percentile(list(size_hist), 95)) if size_hist else 0.0
-        time_since_big = ts - last_big_ts
-
-        # --- Label: position dV at ext using this swap ---
-        x_pre, y_pre = token_amounts(L_pos, prev_sqrt, sqrt_lo, sqrt_hi)
-        x_post, y_post = token_amounts(L_pos, sqrt_post, sqrt_lo, sqrt_hi)
-        # Valued at ext price
-        v_pre = (x_pre / 10**ETH_DEC) * ext + y_pre / 10**USDC_DEC
-        v_post = (x_post / 10**ETH_DEC) * ext + y_post / 10**USDC_DEC
-        dv_ext = v_post - v_pre  # negative = LP lost
-        # Toxicity magnitude: |dv_ext| scaled by deposit for legibility
-        # (dv_ext for L=1 is tiny; scale relative to ourselves)
-        toxicity = -dv_ext  # positive = loss
-
-        in_range = (sqrt_lo <= prev_sqrt <= sqrt_hi) or (sqrt_lo <= sqrt_post <= sqrt_hi)
-
-        out_rows.append({
-            "ts": ts,
-            "size_usd": usd,
-            "signed_usd": signed_usd,
-            "basis_bps": basis_bps,
-            "abs_basis_bps": abs(basis_bps),
-            "rv_5m": rv_5, "rv_15m": rv_15, "rv_60m": rv_60,
-            "flow_5m": fl5, "flow_30m": fl30,
-            "rate_5m": rate_5,
-            "p95_size_usd": p95_size,
-            "time_since_big_s": time_since_big,
-            "in_range": int(in_range),
-            "pool_pre": pool_pre, "pool_post": pool_post, "ext": ext,
-            "toxicity_raw": toxicity,
-        })
-
-        # Update rolling state AFTER emitting (features are pre-swap)
-        price_hist.append((ts, pool_post))
-        flow_hist.append((ts, signed_usd))
-        size_hist.append(abs(usd))
-        if len(size_hist) > BIG_WINDOW:
-            size_hist.popleft()
-        if abs(usd) > p95_size:
-            last_big_ts = ts
-
-        prev_sqrt = sqrt_post
-
-    print(f"  emitted {len(out_rows):,} feature rows")
-
-    # Scale toxicity per-dollar-of-deposit:
-    # dv_ext at L=1 is in units of "raw token deltas / Q96".
-    # Magnitudes are relative; normalize by max so label cutoff is sensible.
-    tox = np.asarray([r["toxicity_raw"] for r in out_rows])
-    tox_in_range = np.asarray([r["toxicity_raw"] for r in out_rows if r["in_range"]])
-    print(f"toxicity (in-range) distribution:")
+    # Every swap after the first, as (pre, post) pairs. Dummy L_pos = 1 for
+    # labeling (deposit-scale-invariant since we emit magnitude).
+    path = SwapPath.build(swaps, cex)
+    attribution = swap_attribution(path, sqrt_lo, sqrt_hi, 1.0, fee_bps=0.0)
+
+    ts = path.timestamp
+    amount0 = swaps.amount0[1:]
+    signed_usd = -np.copysign(path.amount_usd, amount0)  # a0>0 = user sold ETH = sell-flow
+    abs_usd = np.abs(path.amount_usd)
+
+    # Feature rows start after the warm-up; each sees only the swaps before it.
+    # History prices are the pre-swap mid during warm-up, post-swap after.
+    first = int(np.searchsorted(ts, warm_end, side="left"))
+    rows = np.arange(first, len(ts))
+    hist_price = np.concatenate((path.price_pre[:first], path.price_post[first:]))
+    log_hist = np.log(hist_price)
+    t = ts[rows]
+
+    # Window starts for each swap's trailing span; stops are the swap itself
+    # (exclusive), so a row never sees its own swap.
+    def starts(lookback_s: int) -> np.ndarray:
+        return trailing_windows(ts, lookback_s)[0][rows]
+
+    rv_5 = realized_vol(log_hist, starts(300), rows) * 1e4  # bps
+    rv_15 = realized_vol(log_hist, starts(900), rows) * 1e4
+    rv_60 = realized_vol(log_hist, starts(3600), rows) * 1e4
+
+    start_5 = starts(300)
+    start_30 = starts(1800)
+    fl5 = window_sum(signed_usd, start_5, rows)
+    fl30 = window_sum(signed_usd, start_30, rows)
+    rate_5 = (rows - start_5) / 5.0
+
+    p95_size = trailing_p95(abs_usd, rows)
+    # Last swap (after warm-up) bigger than its own trailing p95.
+    big = abs_usd[rows] > p95_size
+    big_ts = np.maximum.accumulate(np.where(big, t, swaps.timestamp[0]))
+    last_big_ts = np.concatenate(([swaps.timestamp[0]], big_ts[:-1]))
+    time_since_big = t - last_big_ts
+
+    ext = path.ext_price[rows]
+    pool_pre = path.price_pre[rows]
+    basis_bps = (pool_pre - ext) / ext * 1e4
+    # Toxicity: position dV at the CEX price on this swap (positive = loss).
+    toxicity = -attribution.value_change[rows]
+    in_range = attribution.in_range[rows]
+    print(f"  emitted {rows.size:,} feature rows")
+
+    # Magnitudes are relative (L=1); the label cutoff is a quantile of them.
+    tox_in_range = toxicity[in_range]
+    print("toxicity (in-range) distribution:")
     print(f"  n={tox_in_range.size:,}  "
           f"median={np.median(tox_in_range):.3e}  "
           f"p95={np.percentile(tox_in_range, args.label_pct):.3e}  "
           f"p99={np.percentile(tox_in_range, 99):.3e}")
     cutoff = float(np.percentile(tox_in_range[tox_in_range > 0], args.label_pct))
-
-    pos = 0
+    is_toxic = in_range & (toxicity > cutoff)
+
+    columns = {
+        "ts": t,
+        "size_usd": path.amount_usd[rows],
+        "signed_usd": signed_usd[rows],
+        "basis_bps": basis_bps,
+        "abs_basis_bps": np.abs(basis_bps),
+        "rv_5m": rv_5, "rv_15m": rv_15, "rv_60m": rv_60,
+        "flow_5m": fl5, "flow_30m": fl30,
+        "rate_5m": rate_5,
+        "p95_size_usd": p95_size,
+        "time_since_big_s": time_since_big,
+        "in_range": in_range.astype(np.int64),
+        "pool_pre": pool_pre, "pool_post": path.price_post[rows], "ext": ext,
+        "toxicity_raw": toxicity,
+        "is_toxic": is_toxic.astype(np.int64),
+    }
     args.output.parent.mkdir(parents=True, exist_ok=True)
     with args.output.open("w") as fh:
-        cols = ["ts", "size_usd", "signed_usd", "basis_bps", "abs_basis_bps",
-                "rv_5m", "rv_15m", "rv_60m", "flow_5m", "flow_30m",
-                "rate_5m", "p95_size_usd", "time_since_big_s",
-                "in_range", "pool_pre", "pool_post", "ext",
-                "toxicity_raw", "is_toxic"]
-        fh.write(",".join(cols) + "\n")
-        for r in out_rows:
-            is_toxic = int(r["in_range"] == 1 and r["toxicity_raw"] > cutoff)
-            pos += is_toxic
-            r["is_toxic"] = is_toxic
-            fh.write(",".join(f"{r[c]:.6g}" if isinstance(r[c], float) else str(r[c])
-                              for c in cols) + "\n")
+        fh.write(",".join(columns) + "\n")
+        formatted = [format_column(values) for values in columns.values()]
+        fh.writelines(",".join(fields) + "\n" for fields in zip(*formatted, strict=True))
+    pos = int(is_toxic.sum())
     print(f"  wrote {args.output}  "
-          f"(toxic rate: {pos}/{len(out_rows)} = {pos/len(out_rows)*100:.2f}%)")
+          f"(toxic rate: {pos}/{rows.size} = {pos/rows.size*100:.2f}%)")
 
 
 if __name__ == "__main__":
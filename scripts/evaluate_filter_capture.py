@@ -3,23 +3,41 @@
 from __future__ import annotations
 
 import argparse
-import bisect
 import math
 import sqlite3
-from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
-from icarus.strategy.fair_value.weighting import cap_and_renormalize
+import numpy as np
+import numpy.typing as npt
+
+from icarus.capture import ColumnarCaptureReader
+from icarus.strategy.fair_value.weighting import cap_and_renormalize_rows
+
+type FloatArray = npt.NDArray[np.float64]
+type BoolArray = npt.NDArray[np.bool_]
+type IntArray = npt.NDArray[np.int64]
+
+UPDATE_COLUMNS = (
+    "update_id",
+    "timestamp_ms",
+    "basis_is_live",
+    "composite_price",
+    "kalman_filtered_price",
+    "basis_common_price",
+)
+SQLITE_FETCH_ROWS = 200_000
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description="Evaluate captured filter snapshots from SQLite.",
+        description="Evaluate captured filter snapshots from SQLite or a columnar store.",
     )
     parser.add_argument(
         "--db-path",
         default="data/filter_eval.sqlite3",
-        help="SQLite file produced by capture_filter_eval.py.",
+        help="SQLite file or columnar store produced by capture_filter_eval.py.",
     )
     parser.add_argument(
         "--anchor-exchange",
@@ -63,62 +81,46 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def median_value(values: list[float]) -> float:
-    n = len(values)
-    if n == 0:
-        raise ValueError("cannot take median of empty list")
-    ordered = sorted(values)
-    if n % 2 == 1:
-        return ordered[n // 2]
-    return 0.5 * (ordered[n // 2 - 1] + ordered[n // 2])
-
-
-def mean(values: list[float]) -> float:
-    return sum(values) / len(values) if values else float("nan")
+# Metric reductions go through the builtin ``sum`` (compensated summation)
+# rather than numpy's pairwise sums, so figures match per-row Python loops.
+def mean(values: FloatArray) -> float:
+    return sum(values.tolist()) / len(values) if len(values) else float("nan")
 
 
-def rmse(values: list[float]) -> float:
-    return math.sqrt(sum(v * v for v in values) / len(values)) if values else float("nan")
+def rmse(values: FloatArray) -> float:
+    if not len(values):
+        return float("nan")
+    return math.sqrt(sum((values * values).tolist()) / len(values))
 
 
-def format_metric(label: str, values: list[float]) -> str:
+def format_metric(label: str, values: FloatArray) -> str:
     return f"  {label:<18} mae={mean(values):>8.4f} rmse={rmse(values):>8.4f} n={len(values)}"
 
 
-def correlation(xs: list[float], ys: list[float]) -> float:
-    if not xs or len(xs) != len(ys):
+def correlation(xs: FloatArray, ys: FloatArray) -> float:
+    if not len(xs) or len(xs) != len(ys):
         return float("nan")
-    mean_x = mean(xs)
-    mean_y = mean(ys)
-    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
-    var_x = sum((x - mean_x) ** 2 for x in xs)
-    var_y = sum((y - mean_y) ** 2 for y in ys)
+    dx = xs - mean(xs)
+    dy = ys - mean(ys)
+    cov = sum((dx * dy).tolist())
+    var_x = sum((dx * dx).tolist())
+    var_y = sum((dy * dy).tolist())
     if var_x <= 0.0 or var_y <= 0.0:
         return float("nan")
     return cov / math.sqrt(var_x * var_y)
 
 
-def sign_hit_rate(signals: list[float], returns: list[float]) -> float:
-    if not signals or len(signals) != len(returns):
+def sign_hit_rate(signals: FloatArray, returns: FloatArray) -> float:
+    if not len(signals) or len(signals) != len(returns):
         return float("nan")
-    hits = 0
-    total = 0
-    for signal, future_return in zip(signals, returns):
-        if signal == 0.0 or future_return == 0.0:
-            continue
-        total += 1
-        if (signal > 0.0 and future_return > 0.0) or (signal < 0.0 and future_return < 0.0):
-            hits += 1
-    return (hits / total) if total else float("nan")
-
-
-def avg_by_signal_sign(signals: list[float], returns: list[float], positive: bool) -> float:
-    selected = [
-        future_return
-        for signal, future_return in zip(signals, returns)
-        if (signal > 0.0 if positive else signal < 0.0)
-    ]
-    return mean(selected)
+    counted = (signals != 0.0) & (returns != 0.0)
+    hits = counted & (((signals > 0.0) & (returns > 0.0)) | ((signals < 0.0) & (returns < 0.0)))
+    total = int(counted.sum())
+    return (int(hits.sum()) / total) if total else float("nan")
+
+
+def avg_by_signal_sign(signals: FloatArray, returns: FloatArray, positive: bool) -> float:
+    return mean(returns[signals > 0.0] if positive else returns[signals < 0.0])
 
 
 def target_label(target_kind: str, target_name: str) -> str:
@@ -127,7 +129,7 @@ def target_label(target_kind: str, target_name: str) -> str:
     return target_kind
 
 
-def paired_diff_stats(a: list[float], b: list[float]) -> dict[str, float]:
+def paired_diff_stats(a: FloatArray, b: FloatArray) -> dict[str, float]:
     """Summarize pairwise (a[i] - b[i]) differences.
 
     Returns mean, sem, t-statistic, fraction where a < b (a beats b),
@@ -139,16 +141,17 @@ def paired_diff_stats(a: list[float], b: list[float]) -> dict[str, float]:
         return {"n": 0, "mean": float("nan"), "sem": float("nan"),
                 "t": float("nan"), "a_better_frac": float("nan"),
                 "tie_frac": float("nan")}
-    diffs = [x - y for x, y in zip(a, b)]
-    mean_diff = sum(diffs) / n
+    diffs = a - b
+    mean_diff = sum(diffs.tolist()) / n
     if n > 1:
-        variance = sum((d - mean_diff) ** 2 for d in diffs) / (n - 1)
+        deviations = diffs - mean_diff
+        variance = sum((deviations * deviations).tolist()) / (n - 1)
         sem = (variance / n) ** 0.5
     else:
         sem = float("nan")
     t_stat = mean_diff / sem if sem and sem > 0 else float("inf" if mean_diff != 0 else "nan")
-    wins = sum(1 for x, y in zip(a, b) if x < y)
-    ties = sum(1 for x, y in zip(a, b) if x == y)
+    wins = int((a < b).sum())
+    ties = int((a == b).sum())
     return {
         "n": n,
         "mean": mean_diff,
@@ -159,234 +162,423 @@ def paired_diff_stats(a: list[float], b: list[float]) -> dict[str, float]:
     }
 
 
-def is_fresh_venue_row(row: sqlite3.Row | None, *, max_venue_age_ms: float) -> bool:
-    if row is None:
-        return False
-    age_ms = row["age_ms"]
-    if age_ms is None:
-        return False
-    return float(age_ms) <= max_venue_age_ms
+@dataclass(frozen=True, slots=True)
+class CaptureArrays:
+    """A capture as dense arrays, one row per update in (timestamp_ms, id) order.
 
+    Update prices are NaN where the capture has none. Venue and basis
+    states are (update, venue) matrices over ``venues`` in name order;
+    ``venue_present`` / ``basis_present`` mark the cells that have a row.
+    """
 
-def load_rows(conn: sqlite3.Connection) -> tuple[list[sqlite3.Row], dict[int, dict[str, sqlite3.Row]], dict[int, dict[str, sqlite3.Row]]]:
-    conn.row_factory = sqlite3.Row
-    updates = conn.execute(
-        "SELECT * FROM updates ORDER BY timestamp_ms, id"
-    ).fetchall()
+    venues: list[str]
+    timestamp_ms: IntArray
+    basis_is_live: BoolArray
+    composite_price: FloatArray
+    kalman_filtered_price: FloatArray
+    basis_common_price: FloatArray
+    venue_present: BoolArray
+    is_spot: BoolArray
+    fair_value: FloatArray
+    variance: FloatArray
+    age_ms: FloatArray
+    basis_present: BoolArray
+    basis_estimate: FloatArray
+
+    def venue_column(self, exchange: str) -> int | None:
+        return self.venues.index(exchange) if exchange in self.venues else None
+
+
+def load_capture(db_path: Path) -> CaptureArrays:
+    if ColumnarCaptureReader.is_store(db_path):
+        return _load_columnar_capture(db_path)
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return _load_sqlite_capture(conn)
+    finally:
+        conn.close()
+
+
+def _load_sqlite_capture(conn: sqlite3.Connection) -> CaptureArrays:
+    update_columns = _fetch_columns(
+        conn.execute(
+            """
+            SELECT id, timestamp_ms, basis_is_live, composite_price,
+                   kalman_filtered_price, basis_common_price
+            FROM updates
+            ORDER BY timestamp_ms, id
+            """
+        ),
+        (np.int64, np.int64, np.bool_, np.float64, np.float64, np.float64),
+    )
+    exchanges = [
+        str(row[0])
+        for row in conn.execute(
+            "SELECT exchange FROM venue_states UNION SELECT exchange FROM basis_states"
+        )
+    ]
+    updates = dict(zip(UPDATE_COLUMNS, update_columns, strict=True))
+    if not exchanges:
+        # No venue or basis rows at all; an empty CASE would not parse.
+        return _assemble_capture(updates, {}, {})
+    # Venue codes come from SQLite so no per-row exchange strings are built.
+    venue_code = "CASE exchange " + " ".join("WHEN ? THEN ?" for _ in exchanges) + " END"
+    code_params = [value for code, name in enumerate(exchanges) for value in (name, code)]
+    venue_ids, venue_codes, is_spot, fair_value, variance, age_ms = _fetch_columns(
+        conn.execute(
+            f"""
+            SELECT update_id, {venue_code}, venue_kind = 'spot', fair_value, variance, age_ms
+            FROM venue_states
+            """,
+            code_params,
+        ),
+        (np.int64, np.int64, np.bool_, np.float64, np.float64, np.float64),
+    )
+    basis_ids, basis_codes, basis_estimate = _fetch_columns(
+        conn.execute(
+            f"SELECT update_id, {venue_code}, basis_estimate FROM basis_states", code_params
+        ),
+        (np.int64, np.int64, np.float64),
+    )
 
-    venues_by_update: dict[int, dict[str, sqlite3.Row]] = defaultdict(dict)
-    for row in conn.execute("SELECT * FROM venue_states ORDER BY update_id, exchange"):
-        venues_by_update[int(row["update_id"])][str(row["exchange"])] = row
+    venue_rows: dict[str, dict[str, npt.NDArray[Any]]] = {}
+    basis_rows: dict[str, dict[str, npt.NDArray[Any]]] = {}
+    for code, exchange in enumerate(exchanges):
+        picked = venue_codes == code
+        if picked.any():
+            venue_rows[exchange] = {
+                "update_id": venue_ids[picked],
+                "is_spot": is_spot[picked],
+                "fair_value": fair_value[picked],
+                "variance": variance[picked],
+                "age_ms": age_ms[picked],
+            }
+        picked = basis_codes == code
+        if picked.any():
+            basis_rows[exchange] = {
+                "update_id": basis_ids[picked],
+                "basis_estimate": basis_estimate[picked],
+            }
+    return _assemble_capture(updates, venue_rows, basis_rows)
+
+
+def _fetch_columns(cursor: sqlite3.Cursor, dtypes: tuple[Any, ...]) -> list[npt.NDArray[Any]]:
+    """A query's result as one array per column, read in chunks; NULL floats become NaN."""
+    chunks: list[list[npt.NDArray[Any]]] = [[] for _ in dtypes]
+    while rows := cursor.fetchmany(SQLITE_FETCH_ROWS):
+        for parts, values, dtype in zip(chunks, zip(*rows, strict=True), dtypes, strict=True):
+            parts.append(np.array(values, dtype=dtype))
+    return [
+        np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        for parts, dtype in zip(chunks, dtypes, strict=True)
+    ]
 
-    basis_by_update: dict[int, dict[str, sqlite3.Row]] = defaultdict(dict)
-    for row in conn.execute("SELECT * FROM basis_states ORDER BY update_id, exchange"):
-        basis_by_update[int(row["update_id"])][str(row["exchange"])] = row
 
-    return updates, venues_by_update, basis_by_update
+def _load_columnar_capture(store_path: Path) -> CaptureArrays:
+    reader = ColumnarCaptureReader(store_path)
+    updates = reader.read_updates(list(UPDATE_COLUMNS))
+    order = np.lexsort((updates["update_id"], updates["timestamp_ms"]))
+    venue_rows: dict[str, dict[str, npt.NDArray[Any]]] = {}
+    basis_rows: dict[str, dict[str, npt.NDArray[Any]]] = {}
+    for venue in reader.venues():
+        part = reader.read_venue(
+            venue, ["update_id", "is_perp", "fair_value", "variance", "age_ms"]
+        )
+        part["is_spot"] = ~part.pop("is_perp")
+        venue_rows[venue] = part
+        basis = reader.read_basis(venue, ["update_id", "basis_estimate"])
+        if len(basis["update_id"]):
+            basis_rows[venue] = basis
+    return _assemble_capture(
+        {name: updates[name][order] for name in UPDATE_COLUMNS}, venue_rows, basis_rows
+    )
 
 
-def find_future_index(
-    timestamps: list[int],
-    updates: list[sqlite3.Row],
-    start_index: int,
-    target_time: int,
-    target_prices_for_target: dict[int, float],
-) -> int | None:
-    future_index = bisect.bisect_left(timestamps, target_time, lo=start_index + 1)
-    while future_index < len(updates):
-        if int(updates[future_index]["id"]) in target_prices_for_target:
-            return future_index
-        future_index += 1
-    return None
+def _assemble_capture(
+    updates: dict[str, npt.NDArray[Any]],
+    venue_rows: dict[str, dict[str, npt.NDArray[Any]]],
+    basis_rows: dict[str, dict[str, npt.NDArray[Any]]],
+) -> CaptureArrays:
+    """Scatter per-venue rows onto the (already ordered) update rows."""
+    update_ids = updates["update_id"]
+    venues = sorted(venue_rows.keys() | basis_rows.keys())
+    shape = (len(update_ids), len(venues))
+    venue_present = np.zeros(shape, dtype=np.bool_)
+    is_spot = np.zeros(shape, dtype=np.bool_)
+    fair_value = np.full(shape, np.nan)
+    variance = np.full(shape, np.nan)
+    age_ms = np.full(shape, np.nan)
+    basis_present = np.zeros(shape, dtype=np.bool_)
+    basis_estimate = np.full(shape, np.nan)
+
+    for column, venue in enumerate(venues):
+        if venue in venue_rows:
+            part = venue_rows[venue]
+            rows, found = _update_positions(update_ids, part["update_id"])
+            venue_present[rows, column] = True
+            is_spot[rows, column] = part["is_spot"][found]
+            fair_value[rows, column] = part["fair_value"][found]
+            variance[rows, column] = part["variance"][found]
+            age_ms[rows, column] = part["age_ms"][found]
+        if venue in basis_rows:
+            part = basis_rows[venue]
+            rows, found = _update_positions(update_ids, part["update_id"])
+            basis_present[rows, column] = True
+            basis_estimate[rows, column] = part["basis_estimate"][found]
+
+    return CaptureArrays(
+        venues=venues,
+        timestamp_ms=updates["timestamp_ms"].astype(np.int64),
+        basis_is_live=updates["basis_is_live"].astype(np.bool_),
+        composite_price=updates["composite_price"].astype(np.float64),
+        kalman_filtered_price=updates["kalman_filtered_price"].astype(np.float64),
+        basis_common_price=updates["basis_common_price"].astype(np.float64),
+        venue_present=venue_present,
+        is_spot=is_spot,
+        fair_value=fair_value,
+        variance=variance,
+        age_ms=age_ms,
+        basis_present=basis_present,
+        basis_estimate=basis_estimate,
+    )
+
+
+def _update_positions(update_ids: IntArray, row_ids: IntArray) -> tuple[IntArray, BoolArray]:
+    """Update row of each of ``row_ids`` that exists, and which of them do."""
+    if not len(update_ids):
+        return np.empty(0, dtype=np.int64), np.zeros(len(row_ids), dtype=np.bool_)
+    order = np.argsort(update_ids, kind="stable")
+    slots = np.searchsorted(update_ids, row_ids, sorter=order)
+    rows = order[np.minimum(slots, len(order) - 1)]
+    found = update_ids[rows] == row_ids
+    return rows[found], found
+
+
+def builtin_sum_rows(values: FloatArray, mask: BoolArray) -> FloatArray:
+    """Per-row ``sum()`` of the entries where ``mask`` is set, in column order.
+
+    Follows the builtin's compensated (Neumaier) float summation step for
+    step, so each row equals ``sum()`` over that row's entries exactly.
+    """
+    total = np.zeros(len(values))
+    compensation = np.zeros(len(values))
+    with np.errstate(invalid="ignore"):
+        for column, keep in zip(values.T, mask.T, strict=True):
+            step = total + column
+            error = np.where(
+                np.abs(total) >= np.abs(column), (total - step) + column, (column - step) + total
+            )
+            compensation = np.where(keep, compensation + error, compensation)
+            total = np.where(keep, step, total)
+        return np.where(
+            (compensation != 0.0) & np.isfinite(compensation), total + compensation, total
+        )
+
+
+def masked_median(values: FloatArray, mask: BoolArray) -> FloatArray:
+    """Per-row median of the entries where ``mask`` is set; NaN for empty rows."""
+    count = mask.sum(axis=1)
+    if not values.shape[1]:
+        return np.full(len(values), np.nan)
+    ordered = np.sort(np.where(mask, values, np.inf), axis=1)
+    rows = np.arange(len(values))
+    upper = ordered[rows, np.minimum(count // 2, values.shape[1] - 1)]
+    lower = ordered[rows, np.maximum(count // 2 - 1, 0)]
+    median = np.where(count % 2 == 1, upper, 0.5 * (lower + upper))
+    return np.where(count > 0, median, np.nan)
+
+
+def masked_inverse_variance_mean(
+    values: FloatArray, variance: FloatArray, mask: BoolArray
+) -> FloatArray:
+    """Per-row inverse-variance weighted mean over masked entries.
+
+    Entries without a finite positive variance carry no weight; weights
+    accumulate in column order. NaN where nothing carries weight.
+    """
+    total_weight = np.zeros(len(values))
+    weighted_sum = np.zeros(len(values))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for column in range(values.shape[1]):
+            column_variance = variance[:, column]
+            keep = mask[:, column] & np.isfinite(column_variance) & (column_variance > 0.0)
+            weight = 1.0 / column_variance
+            total_weight = np.where(keep, total_weight + weight, total_weight)
+            weighted_sum = np.where(keep, weighted_sum + weight * values[:, column], weighted_sum)
+        return np.where(total_weight > 0.0, weighted_sum / total_weight, np.nan)
+
+
+def fresh_venue_states(capture: CaptureArrays, *, max_venue_age_ms: float) -> BoolArray:
+    return capture.venue_present & (capture.age_ms <= max_venue_age_ms)
+
+
+def consensus_prices(
+    values: FloatArray,
+    variance: FloatArray,
+    mask: BoolArray,
+    *,
+    mode: str,
+    min_consensus_venues: int,
+) -> FloatArray:
+    """Per-row consensus of the masked venues; NaN below ``min_consensus_venues``."""
+    if mode == "consensus_median":
+        prices = masked_median(values, mask)
+    elif mode == "consensus_weighted":
+        prices = masked_inverse_variance_mean(values, variance, mask)
+    else:
+        raise ValueError(f"unknown consensus mode: {mode!r}")
+    return np.where(mask.sum(axis=1) >= min_consensus_venues, prices, np.nan)
 
 
 def compute_target_prices(
-    updates: list[sqlite3.Row],
-    venues_by_update: dict[int, dict[str, sqlite3.Row]],
+    capture: CaptureArrays,
+    fresh: BoolArray,
     *,
     prediction_targets: list[tuple[str, str]],
-    max_venue_age_ms: float,
     min_consensus_venues: int,
-) -> dict[tuple[str, str], dict[int, float]]:
-    """Precompute per-update target price for every requested target kind."""
-    targets: dict[tuple[str, str], dict[int, float]] = {
-        target: {} for target in prediction_targets
-    }
-    for update in updates:
-        uid = int(update["id"])
-        venue_rows = venues_by_update.get(uid, {})
-        fresh_spot_rows = [
-            row
-            for row in venue_rows.values()
-            if row["venue_kind"] == "spot"
-            and is_fresh_venue_row(row, max_venue_age_ms=max_venue_age_ms)
-        ]
-
-        for target in prediction_targets:
-            target_kind, target_name = target
-            if target_kind == "exchange":
-                row = venue_rows.get(target_name)
-                if is_fresh_venue_row(row, max_venue_age_ms=max_venue_age_ms):
-                    targets[target][uid] = float(row["fair_value"])
-            elif target_kind == "composite":
-                value = update["composite_price"]
-                if value is not None:
-                    targets[target][uid] = float(value)
-            elif target_kind == "consensus_median":
-                if len(fresh_spot_rows) >= min_consensus_venues:
-                    targets[target][uid] = median_value(
-                        [float(row["fair_value"]) for row in fresh_spot_rows]
-                    )
-            elif target_kind == "consensus_weighted":
-                if len(fresh_spot_rows) >= min_consensus_venues:
-                    total_weight = 0.0
-                    weighted_sum = 0.0
-                    for row in fresh_spot_rows:
-                        variance = float(row["variance"])
-                        if not math.isfinite(variance) or variance <= 0.0:
-                            continue
-                        weight = 1.0 / variance
-                        total_weight += weight
-                        weighted_sum += weight * float(row["fair_value"])
-                    if total_weight > 0.0:
-                        targets[target][uid] = weighted_sum / total_weight
+) -> dict[tuple[str, str], FloatArray]:
+    """Per-update target price for every requested target kind; NaN where unavailable."""
+    spot_fresh = fresh & capture.is_spot
+    targets: dict[tuple[str, str], FloatArray] = {}
+    for target in prediction_targets:
+        target_kind, target_name = target
+        if target_kind == "exchange":
+            column = capture.venue_column(target_name)
+            targets[target] = (
+                np.full(len(fresh), np.nan)
+                if column is None
+                else np.where(fresh[:, column], capture.fair_value[:, column], np.nan)
+            )
+        elif target_kind == "composite":
+            targets[target] = capture.composite_price
+        else:
+            targets[target] = consensus_prices(
+                capture.fair_value,
+                capture.variance,
+                spot_fresh,
+                mode=target_kind,
+                min_consensus_venues=min_consensus_venues,
+            )
     return targets
 
 
-def basis_predicted_consensus_price(
-    update: sqlite3.Row,
-    *,
-    update_id: int,
-    venues_by_update: dict[int, dict[str, sqlite3.Row]],
-    basis_by_update: dict[int, dict[str, sqlite3.Row]],
-    max_venue_age_ms: float,
-    min_consensus_venues: int,
-    mode: str,
-) -> float | None:
-    """Filter's prediction of a consensus target, using the same venue set."""
-    basis_common = update["basis_common_price"]
-    if basis_common is None:
-        return None
-    basis_common_f = float(basis_common)
-    venue_rows = venues_by_update.get(update_id, {})
-    basis_rows = basis_by_update.get(update_id, {})
-
-    per_venue: list[tuple[float, float]] = []  # (reconstructed_price, variance)
-    for exchange, venue_row in venue_rows.items():
-        if venue_row["venue_kind"] != "spot":
-            continue
-        if not is_fresh_venue_row(venue_row, max_venue_age_ms=max_venue_age_ms):
-            continue
-        basis_row = basis_rows.get(exchange)
-        basis_estimate = float(basis_row["basis_estimate"]) if basis_row is not None else 0.0
-        predicted_price = basis_common_f + basis_estimate
-        variance = float(venue_row["variance"])
-        per_venue.append((predicted_price, variance))
-
-    if len(per_venue) < min_consensus_venues:
-        return None
+def reconstructed_venue_prices(capture: CaptureArrays) -> FloatArray:
+    """basis_common + each venue's basis estimate (0 where the venue has no basis row)."""
+    basis_estimate = np.where(capture.basis_present, capture.basis_estimate, 0.0)
+    return capture.basis_common_price[:, None] + basis_estimate
 
-    if mode == "consensus_median":
-        return median_value([price for price, _ in per_venue])
-    if mode == "consensus_weighted":
-        total_weight = 0.0
-        weighted_sum = 0.0
-        for price, variance in per_venue:
-            if not math.isfinite(variance) or variance <= 0.0:
-                continue
-            weight = 1.0 / variance
-            total_weight += weight
-            weighted_sum += weight * price
-        if total_weight <= 0.0:
-            return None
-        return weighted_sum / total_weight
-    raise ValueError(f"unknown consensus mode: {mode!r}")
-
-
-def basis_predicted_exchange_price(
-    update: sqlite3.Row,
-    *,
-    update_id: int,
-    exchange: str,
-    anchor_exchange: str,
-    basis_by_update: dict[int, dict[str, sqlite3.Row]],
-) -> float | None:
-    basis_common = update["basis_common_price"]
-    if basis_common is None:
-        return None
-    if exchange == anchor_exchange:
-        return float(basis_common)
 
-    basis_row = basis_by_update.get(update_id, {}).get(exchange)
-    if basis_row is None:
-        return None
-    return float(basis_common) + float(basis_row["basis_estimate"])
+def basis_predicted_exchange_prices(
+    capture: CaptureArrays, *, exchange: str, anchor_exchange: str
+) -> FloatArray:
+    basis_common = capture.basis_common_price
+    if exchange == anchor_exchange:
+        return basis_common
+    column = capture.venue_column(exchange)
+    if column is None:
+        return np.full(len(basis_common), np.nan)
+    return np.where(
+        capture.basis_present[:, column],
+        basis_common + capture.basis_estimate[:, column],
+        np.nan,
+    )
 
 
-def basis_predicted_composite_price(
-    update: sqlite3.Row,
+def basis_predicted_composite_prices(
+    capture: CaptureArrays,
+    spot_fresh: BoolArray,
     *,
-    update_id: int,
     anchor_exchange: str,
-    venues_by_update: dict[int, dict[str, sqlite3.Row]],
-    basis_by_update: dict[int, dict[str, sqlite3.Row]],
-    max_venue_age_ms: float,
     composite_max_weight: float,
-) -> float | None:
-    venue_rows = venues_by_update.get(update_id, {})
-    if not venue_rows:
-        return None
-
-    raw_weights: list[float] = []
-    predicted_prices: list[float] = []
-    for exchange, venue_row in venue_rows.items():
-        if venue_row["venue_kind"] != "spot":
-            continue
-        if not is_fresh_venue_row(venue_row, max_venue_age_ms=max_venue_age_ms):
-            continue
-
-        predicted_price = basis_predicted_exchange_price(
-            update,
-            update_id=update_id,
-            exchange=exchange,
-            anchor_exchange=anchor_exchange,
-            basis_by_update=basis_by_update,
-        )
-        if predicted_price is None:
-            continue
-
-        variance = float(venue_row["variance"])
-        if not math.isfinite(variance) or variance <= 0.0:
-            continue
+) -> FloatArray:
+    """Spot-only inverse-variance composite of the basis filter's venue prices."""
+    basis_common = capture.basis_common_price
+    predicted = basis_common[:, None] + capture.basis_estimate
+    has_prediction = capture.basis_present.copy()
+    anchor_column = capture.venue_column(anchor_exchange)
+    if anchor_column is not None:
+        predicted[:, anchor_column] = basis_common
+        has_prediction[:, anchor_column] = True
+
+    variance = capture.variance
+    valid = (
+        spot_fresh
+        & has_prediction
+        & ~np.isnan(basis_common)[:, None]
+        & np.isfinite(variance)
+        & (variance > 0.0)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_weights = np.where(valid, 1.0 / variance, 0.0)
+        weight_sum = builtin_sum_rows(raw_weights, valid)
+        weighted = valid.any(axis=1) & (weight_sum > 0.0)
+        normalized_weights = raw_weights / weight_sum[:, None]
+    capped_weights = cap_and_renormalize_rows(
+        normalized_weights,
+        valid & weighted[:, None],
+        max_weight=composite_max_weight,
+    )
+    prices = builtin_sum_rows(capped_weights * predicted, valid)
+    return np.where(weighted, prices, np.nan)
 
-        raw_weights.append(1.0 / variance)
-        predicted_prices.append(predicted_price)
 
-    if not raw_weights:
-        return None
+def compute_basis_predictions(
+    capture: CaptureArrays,
+    fresh: BoolArray,
+    *,
+    prediction_targets: list[tuple[str, str]],
+    anchor_exchange: str,
+    composite_max_weight: float,
+    min_consensus_venues: int,
+) -> dict[tuple[str, str], FloatArray]:
+    """The basis filter's per-update prediction of each target; NaN where it has none."""
+    spot_fresh = fresh & capture.is_spot
+    predictions: dict[tuple[str, str], FloatArray] = {}
+    for target in prediction_targets:
+        target_kind, target_name = target
+        if target_kind == "exchange":
+            predictions[target] = basis_predicted_exchange_prices(
+                capture, exchange=target_name, anchor_exchange=anchor_exchange
+            )
+        elif target_kind == "composite":
+            predictions[target] = basis_predicted_composite_prices(
+                capture,
+                spot_fresh,
+                anchor_exchange=anchor_exchange,
+                composite_max_weight=composite_max_weight,
+            )
+        else:
+            # Same venue set as the consensus target; needs basis_common.
+            mask = spot_fresh & ~np.isnan(capture.basis_common_price)[:, None]
+            predictions[target] = consensus_prices(
+                reconstructed_venue_prices(capture),
+                capture.variance,
+                mask,
+                mode=target_kind,
+                min_consensus_venues=min_consensus_venues,
+            )
+    return predictions
 
-    weight_sum = sum(raw_weights)
-    if weight_sum <= 0.0:
-        return None
 
-    normalized_weights = [weight / weight_sum for weight in raw_weights]
-    capped_weights = cap_and_renormalize(
-        normalized_weights,
-        max_weight=composite_max_weight,
-    )
-    return sum(weight * price for weight, price in zip(capped_weights, predicted_prices))
+def future_indices(timestamps: IntArray, horizon_ms: int, available: BoolArray) -> IntArray:
+    """Per update, the first later update at or after ``timestamp + horizon_ms``
+    whose target is ``available``; ``len(timestamps)`` where there is none."""
+    n = len(timestamps)
+    first = np.searchsorted(timestamps, timestamps + horizon_ms, side="left")
+    first = np.maximum(first, np.arange(1, n + 1))
+    next_available = np.append(np.where(available, np.arange(n), n), n)
+    next_available = np.minimum.accumulate(next_available[::-1])[::-1]
+    return next_available[first]
 
 
 def main() -> None:
     args = build_parser().parse_args()
-    conn = sqlite3.connect(Path(args.db_path))
-    updates, venues_by_update, basis_by_update = load_rows(conn)
-    conn.close()
+    capture = load_capture(Path(args.db_path))
 
-    if not updates:
+    n = len(capture.timestamp_ms)
+    if not n:
         raise SystemExit(f"no captured updates found in {args.db_path}")
 
-    timestamps = [int(row["timestamp_ms"]) for row in updates]
     prediction_targets: list[tuple[str, str]] = [
         ("exchange", args.anchor_exchange),
         ("exchange", "kraken"),
@@ -394,228 +586,107 @@ def main() -> None:
         ("consensus_median", "consensus_median"),
         ("consensus_weighted", "consensus_weighted"),
     ]
+    fresh = fresh_venue_states(capture, max_venue_age_ms=args.max_venue_age_ms)
     target_prices = compute_target_prices(
-        updates,
-        venues_by_update,
+        capture,
+        fresh,
         prediction_targets=prediction_targets,
-        max_venue_age_ms=args.max_venue_age_ms,
+        min_consensus_venues=args.min_consensus_venues,
+    )
+    basis_predictions = compute_basis_predictions(
+        capture,
+        fresh,
+        prediction_targets=prediction_targets,
+        anchor_exchange=args.anchor_exchange,
+        composite_max_weight=args.composite_max_weight,
         min_consensus_venues=args.min_consensus_venues,
     )
 
-    outside_counts = {"composite": 0, "kalman": 0, "basis": 0}
-    outside_denoms = {"composite": 0, "kalman": 0, "basis": 0}
-
-    basis_reconstruction_errors: list[float] = []
-    horizon_errors: dict[tuple[str, str, int], dict[str, list[float]]] = {
-        (target_kind, target_name, horizon): {
-            "composite": [],
-            "kalman": [],
-            "basis_live": [],
-            "basis_held": [],
-            "composite_with_perp": [],
-            "composite_without_perp": [],
-            "kalman_with_perp": [],
-            "kalman_without_perp": [],
-            "basis_live_with_perp": [],
-            "basis_live_without_perp": [],
-            "basis_held_with_perp": [],
-            "basis_held_without_perp": [],
-        }
-        for target_kind, target_name in prediction_targets
-        for horizon in args.horizons_ms
-    }
-    # Paired per-row error tuples for rows where composite, kalman, and
-    # basis_live all produced a prediction and the target is available.
-    paired_errors: dict[
-        tuple[str, str, int], list[tuple[float, float, float]]
-    ] = defaultdict(list)
-    horizon_signals: dict[int, dict[str, list[float]]] = {
-        horizon: {
-            "composite": [],
-            "composite_return": [],
-            "kalman": [],
-            "kalman_return": [],
-            "basis": [],
-            "basis_return": [],
-        }
-        for horizon in args.horizons_ms
-    }
-
-    for index, update in enumerate(updates):
-        update_id = int(update["id"])
-        venue_rows = venues_by_update.get(update_id, {})
-        if not venue_rows:
-            continue
-
-        spot_prices = [
-            float(row["fair_value"])
-            for row in venue_rows.values()
-            if row["venue_kind"] == "spot"
-            and is_fresh_venue_row(row, max_venue_age_ms=args.max_venue_age_ms)
-        ]
-        if spot_prices:
-            low = min(spot_prices)
-            high = max(spot_prices)
-            for key, column in (
-                ("composite", "composite_price"),
-                ("kalman", "kalman_filtered_price"),
-                ("basis", "basis_common_price"),
-            ):
-                value = update[column]
-                if value is None:
-                    continue
-                outside_denoms[key] += 1
-                value_f = float(value)
-                if value_f < low or value_f > high:
-                    outside_counts[key] += 1
-
-        basis_is_live = int(update["basis_is_live"]) == 1
-        basis_common = update["basis_common_price"]
-        if basis_common is not None and basis_is_live:
-            basis_common_f = float(basis_common)
-            basis_rows = basis_by_update.get(update_id, {})
-            for exchange, venue_row in venue_rows.items():
-                if not is_fresh_venue_row(venue_row, max_venue_age_ms=args.max_venue_age_ms):
-                    continue
-                basis_row = basis_rows.get(exchange)
-                basis_estimate = float(basis_row["basis_estimate"]) if basis_row is not None else 0.0
-                predicted = basis_common_f + basis_estimate
-                basis_reconstruction_errors.append(abs(float(venue_row["fair_value"]) - predicted))
-
-        anchor_row = venue_rows.get(args.anchor_exchange)
-        anchor_price_now = (
-            float(anchor_row["fair_value"])
-            if is_fresh_venue_row(anchor_row, max_venue_age_ms=args.max_venue_age_ms)
-            else None
-        )
-        has_perp = is_fresh_venue_row(
-            venue_rows.get("hyperliquid_perp"),
-            max_venue_age_ms=args.max_venue_age_ms,
-        )
-        basis_exchange_predictions = {
-            target_name: basis_predicted_exchange_price(
-                update,
-                update_id=update_id,
-                exchange=target_name,
-                anchor_exchange=args.anchor_exchange,
-                basis_by_update=basis_by_update,
+    # Only updates with at least one venue row are evaluated.
+    has_venues = capture.venue_present.any(axis=1)
+    basis_is_live = capture.basis_is_live
+    perp_column = capture.venue_column("hyperliquid_perp")
+    has_perp = fresh[:, perp_column] if perp_column is not None else np.zeros(n, dtype=np.bool_)
+    composite = capture.composite_price
+    kalman = capture.kalman_filtered_price
+    basis_common = capture.basis_common_price
+    has_composite = ~np.isnan(composite)
+    has_kalman = ~np.isnan(kalman)
+    has_basis_common = ~np.isnan(basis_common)
+
+    spot_fresh = fresh & capture.is_spot
+    in_cloud_rows = has_venues & spot_fresh.any(axis=1)
+    low = np.min(np.where(spot_fresh, capture.fair_value, np.inf), axis=1, initial=np.inf)
+    high = np.max(np.where(spot_fresh, capture.fair_value, -np.inf), axis=1, initial=-np.inf)
+    outside_counts: dict[str, int] = {}
+    outside_denoms: dict[str, int] = {}
+    for key, values in (("composite", composite), ("kalman", kalman), ("basis", basis_common)):
+        counted = in_cloud_rows & ~np.isnan(values)
+        outside_denoms[key] = int(counted.sum())
+        outside_counts[key] = int((counted & ((values < low) | (values > high))).sum())
+
+    # Row-major boolean indexing keeps update-major, venue-minor order.
+    reconstruction_rows = has_venues & basis_is_live & has_basis_common
+    basis_reconstruction_errors = np.abs(
+        capture.fair_value - reconstructed_venue_prices(capture)
+    )[fresh & reconstruction_rows[:, None]]
+
+    horizon_errors: dict[tuple[str, str, int], dict[str, FloatArray]] = {}
+    # Per-row (basis_live, kalman, composite) errors for rows where all three
+    # produced a prediction and the target is available.
+    paired_errors: dict[tuple[str, str, int], tuple[FloatArray, FloatArray, FloatArray]] = {}
+    for target in prediction_targets:
+        prices = target_prices[target]
+        future_prices = np.append(prices, np.nan)
+        basis_prediction = basis_predictions[target]
+        has_basis = ~np.isnan(basis_prediction)
+        for horizon in args.horizons_ms:
+            future = future_indices(capture.timestamp_ms, horizon, ~np.isnan(prices))
+            evaluated = has_venues & (future < n)
+            target_price = future_prices[future]
+            with np.errstate(invalid="ignore"):
+                composite_err = np.abs(composite - target_price)
+                kalman_err = np.abs(kalman - target_price)
+                basis_err = np.abs(basis_prediction - target_price)
+
+            basis_live = evaluated & has_basis & basis_is_live
+            horizon_errors[(*target, horizon)] = {
+                "composite": composite_err[evaluated & has_composite],
+                "kalman": kalman_err[evaluated & has_kalman],
+                "basis_live": basis_err[basis_live],
+                "basis_held": basis_err[evaluated & has_basis & ~basis_is_live],
+                "basis_live_with_perp": basis_err[basis_live & has_perp],
+                "basis_live_without_perp": basis_err[basis_live & ~has_perp],
+            }
+            paired = basis_live & has_kalman & has_composite
+            paired_errors[(*target, horizon)] = (
+                basis_err[paired],
+                kalman_err[paired],
+                composite_err[paired],
             )
-            for target_kind, target_name in prediction_targets
-            if target_kind == "exchange"
-        }
-        basis_composite_prediction = basis_predicted_composite_price(
-            update,
-            update_id=update_id,
-            anchor_exchange=args.anchor_exchange,
-            venues_by_update=venues_by_update,
-            basis_by_update=basis_by_update,
-            max_venue_age_ms=args.max_venue_age_ms,
-            composite_max_weight=args.composite_max_weight,
-        )
-        basis_consensus_median_prediction = basis_predicted_consensus_price(
-            update,
-            update_id=update_id,
-            venues_by_update=venues_by_update,
-            basis_by_update=basis_by_update,
-            max_venue_age_ms=args.max_venue_age_ms,
-            min_consensus_venues=args.min_consensus_venues,
-            mode="consensus_median",
-        )
-        basis_consensus_weighted_prediction = basis_predicted_consensus_price(
-            update,
-            update_id=update_id,
-            venues_by_update=venues_by_update,
-            basis_by_update=basis_by_update,
-            max_venue_age_ms=args.max_venue_age_ms,
-            min_consensus_venues=args.min_consensus_venues,
-            mode="consensus_weighted",
-        )
-
-        def basis_prediction_for(target_kind: str, target_name: str) -> float | None:
-            if target_kind == "exchange":
-                return basis_exchange_predictions.get(target_name)
-            if target_kind == "composite":
-                return basis_composite_prediction
-            if target_kind == "consensus_median":
-                return basis_consensus_median_prediction
-            if target_kind == "consensus_weighted":
-                return basis_consensus_weighted_prediction
-            return None
 
-        for horizon in args.horizons_ms:
-            target_time = int(update["timestamp_ms"]) + horizon
-            for target_kind, target_name in prediction_targets:
-                target_map = target_prices[(target_kind, target_name)]
-                future_index = find_future_index(
-                    timestamps, updates, index, target_time, target_map
-                )
-                if future_index is None:
-                    continue
-                future_uid = int(updates[future_index]["id"])
-                target_price = target_map[future_uid]
-
-                bucket = horizon_errors[(target_kind, target_name, horizon)]
-                suffix = "with_perp" if has_perp else "without_perp"
-                composite_err: float | None = None
-                kalman_err: float | None = None
-                basis_live_err: float | None = None
-
-                if update["composite_price"] is not None:
-                    composite_err = abs(float(update["composite_price"]) - target_price)
-                    bucket["composite"].append(composite_err)
-                    bucket[f"composite_{suffix}"].append(composite_err)
-                if update["kalman_filtered_price"] is not None:
-                    kalman_err = abs(float(update["kalman_filtered_price"]) - target_price)
-                    bucket["kalman"].append(kalman_err)
-                    bucket[f"kalman_{suffix}"].append(kalman_err)
-
-                basis_prediction = basis_prediction_for(target_kind, target_name)
-                if basis_prediction is not None:
-                    basis_error = abs(basis_prediction - target_price)
-                    if basis_is_live:
-                        bucket["basis_live"].append(basis_error)
-                        bucket[f"basis_live_{suffix}"].append(basis_error)
-                        basis_live_err = basis_error
-                    else:
-                        bucket["basis_held"].append(basis_error)
-                        bucket[f"basis_held_{suffix}"].append(basis_error)
-
-                if (
-                    basis_live_err is not None
-                    and kalman_err is not None
-                    and composite_err is not None
-                ):
-                    paired_errors[(target_kind, target_name, horizon)].append(
-                        (basis_live_err, kalman_err, composite_err)
-                    )
-
-            anchor_target_map = target_prices[("exchange", args.anchor_exchange)]
-            future_index = find_future_index(
-                timestamps, updates, index, target_time, anchor_target_map
+    anchor_prices = target_prices[("exchange", args.anchor_exchange)]
+    future_anchor_prices = np.append(anchor_prices, np.nan)
+    horizon_signals: dict[int, dict[str, tuple[FloatArray, FloatArray]]] = {}
+    for horizon in args.horizons_ms:
+        future = future_indices(capture.timestamp_ms, horizon, ~np.isnan(anchor_prices))
+        evaluated = has_venues & (future < n) & ~np.isnan(anchor_prices)
+        future_return = future_anchor_prices[future] - anchor_prices
+        horizon_signals[horizon] = {}
+        for key, values, emitted in (
+            ("composite", composite, has_composite),
+            ("kalman", kalman, has_kalman),
+            ("basis", basis_common, has_basis_common & basis_is_live),
+        ):
+            rows = evaluated & emitted
+            horizon_signals[horizon][key] = (
+                (values - anchor_prices)[rows],
+                future_return[rows],
             )
-            if future_index is not None and anchor_price_now is not None:
-                future_uid = int(updates[future_index]["id"])
-                target_price = anchor_target_map[future_uid]
-                future_return = target_price - anchor_price_now
-                if update["composite_price"] is not None:
-                    horizon_signals[horizon]["composite"].append(
-                        float(update["composite_price"]) - anchor_price_now
-                    )
-                    horizon_signals[horizon]["composite_return"].append(future_return)
-                if update["kalman_filtered_price"] is not None:
-                    horizon_signals[horizon]["kalman"].append(
-                        float(update["kalman_filtered_price"]) - anchor_price_now
-                    )
-                    horizon_signals[horizon]["kalman_return"].append(future_return)
-                if update["basis_common_price"] is not None and basis_is_live:
-                    horizon_signals[horizon]["basis"].append(
-                        float(update["basis_common_price"]) - anchor_price_now
-                    )
-                    horizon_signals[horizon]["basis_return"].append(future_return)
-
-    live_rows = sum(1 for row in updates if int(row["basis_is_live"]) == 1)
-    held_rows = len(updates) - live_rows
-    print(f"rows: {len(updates)}  basis_live={live_rows}  basis_held={held_rows}")
+
+    live_rows = int(basis_is_live.sum())
+    held_rows = n - live_rows
+    print(f"rows: {n}  basis_live={live_rows}  basis_held={held_rows}")
     print(f"anchor target: {args.anchor_exchange}")
     print(f"horizons_ms: {', '.join(str(h) for h in args.horizons_ms)}")
     print()
@@ -645,22 +716,19 @@ def main() -> None:
     print("Signal vs future anchor return:")
     for horizon in args.horizons_ms:
         print(f"  horizon={horizon}ms")
-        for label, key, return_key in (
-            ("raw_composite", "composite", "composite_return"),
-            ("kalman_1d", "kalman", "kalman_return"),
-            ("basis_common", "basis", "basis_return"),
+        for label, key in (
+            ("raw_composite", "composite"),
+            ("kalman_1d", "kalman"),
+            ("basis_common", "basis"),
         ):
-            signals = horizon_signals[horizon][key]
-            returns = horizon_signals[horizon][return_key]
-            n = min(len(signals), len(returns))
-            signals = signals[:n]
-            returns = returns[:n]
+            signals, returns = horizon_signals[horizon][key]
+            n_signals = len(signals)
             print(
                 f"  {label:<18} corr={correlation(signals, returns):>8.4f} "
                 f"hit_rate={sign_hit_rate(signals, returns):>8.4%} "
                 f"avg_ret_pos={avg_by_signal_sign(signals, returns, positive=True):>8.4f} "
                 f"avg_ret_neg={avg_by_signal_sign(signals, returns, positive=False):>8.4f} "
-                f"n={n}"
+                f"n={n_signals}"
             )
         print()
     print("Paired error tests (rows where basis_live + kalman + composite all emitted):")
@@ -668,10 +736,9 @@ def main() -> None:
         label = target_label(target_kind, target_name)
         print(f"Target: future {label}")
         for horizon in args.horizons_ms:
-            rows = paired_errors[(target_kind, target_name, horizon)]
-            basis_errs = [r[0] for r in rows]
-            kalman_errs = [r[1] for r in rows]
-            composite_errs = [r[2] for r in rows]
+            basis_errs, kalman_errs, composite_errs = paired_errors[
+                (target_kind, target_name, horizon)
+            ]
             bk = paired_diff_stats(basis_errs, kalman_errs)
             bc = paired_diff_stats(basis_errs, composite_errs)
             print(f"  horizon={horizon}ms  n={bk['n']}")
@@ -10,76 +10,56 @@ other venues' histories) and the realized observation. The innovation
 (obs - predicted) is the one-step-ahead prediction error; aggregate |innov|
 per venue to get a calibration-free accuracy metric.
 
+The capture's recorded quotes are replayed through the live fair-value stack
+(``icarus.replay``), so venue fair values are recomputed with the current
+estimator rather than read back from the capture. Captures that predate the
+top-of-book columns carry no quotes and replay nothing.
+
 This is the standard way to score a Kalman filter's predictive quality.
 """
 
 from __future__ import annotations
 
 import argparse
-import sqlite3
 from collections import defaultdict
+from collections.abc import Iterator
 from pathlib import Path
 
 import numpy as np
 
+from icarus.replay import iter_capture_quotes, replay
 from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import (
+    VenueBasisFilterResult,
     VenueBasisKalmanConfig,
-    VenueBasisKalmanFilter,
-    VenueBasisObservation,
 )
+from icarus.strategy.fair_value.pipeline import AssetFairValuePipeline
+
 
+SPOT_EXCHANGES = ("coinbase", "hyperliquid", "okx", "kraken")
+PERP_EXCHANGES = ("hyperliquid_perp",)
 
-PERP_EXCHANGES = {"hyperliquid_perp"}
-
-
-def is_perp(exchange: str) -> bool:
-    return exchange in PERP_EXCHANGES or exchange.endswith("_perp")
-
-
-def load_updates(db_path: Path) -> list[tuple[int, int, list[VenueBasisObservation]]]:
-    """Return list of (update_id, timestamp_ms, [observations]) ordered by id."""
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    rows = conn.execute(
-        """
-        SELECT u.id, u.timestamp_ms, v.exchange, v.venue_kind, v.fair_value,
-               v.variance, v.age_ms
-        FROM updates u
-        JOIN venue_states v ON v.update_id = u.id
-        ORDER BY u.id
-        """
-    ).fetchall()
-    conn.close()
-
-    grouped: dict[int, tuple[int, list[VenueBasisObservation]]] = {}
-    for r in rows:
-        obs = VenueBasisObservation(
-            name=r["exchange"],
-            fair_value=float(r["fair_value"]),
-            local_variance=float(r["variance"]),
-            age_ms=float(r["age_ms"]),
-            venue_kind=r["venue_kind"] if r["venue_kind"] in ("spot", "perp") else "spot",
-        )
-        if r["id"] not in grouped:
-            grouped[r["id"]] = (int(r["timestamp_ms"]), [])
-        grouped[r["id"]][1].append(obs)
-    return [(uid, ts, obs) for uid, (ts, obs) in sorted(grouped.items())]
-
-
-def build_config(args: argparse.Namespace, venues_present: set[str]) -> VenueBasisKalmanConfig:
-    spot_order: list[str] = []
-    perp_order: list[str] = []
-    # Match the Makefile default order: coinbase anchor first.
-    for v in ["coinbase", "hyperliquid", "okx", "kraken"]:
-        if v in venues_present:
-            spot_order.append(v)
-    for v in sorted(venues_present):
-        if is_perp(v):
-            perp_order.append(v)
+
+def replay_updates(
+    db_path: Path, asset: str, config: VenueBasisKalmanConfig
+) -> Iterator[tuple[int, VenueBasisFilterResult]]:
+    """Yield (timestamp_ms, result) for every basis filter update of a replayed capture."""
+    pipeline = AssetFairValuePipeline(asset, basis_config=config)
+    for step in replay(iter_capture_quotes(db_path), pipeline=pipeline):
+        if step.basis is None:
+            continue
+        # The innovations are per-venue diagnostics, which only the full result carries.
+        result = pipeline.basis_filter.last_result()
+        assert result is not None
+        yield step.timestamp_ms, result
+
+
+def build_config(args: argparse.Namespace) -> VenueBasisKalmanConfig:
+    # Match the Makefile default order: coinbase anchor first. Venues missing
+    # from the capture never get a state; unlisted ones are discovered.
     return VenueBasisKalmanConfig(
         anchor_exchange=args.anchor_exchange,
-        venue_order=tuple(spot_order),
-        perp_exchange_order=tuple(perp_order),
+        venue_order=SPOT_EXCHANGES,
+        perp_exchange_order=PERP_EXCHANGES,
         common_price_process_var_per_sec=args.common_price_process_var_per_sec,
         default_basis_process_var_per_sec=args.basis_process_var_per_sec,
         default_basis_rho_per_second=args.basis_rho_per_second,
@@ -92,6 +72,7 @@ def build_config(args: argparse.Namespace, venues_present: set[str]) -> VenueBas
 def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--db-path", type=Path, default=Path("data/capture/2026-04-21.sqlite3"))
+    p.add_argument("--asset", default="BTC")
     p.add_argument("--anchor-exchange", default="coinbase")
     p.add_argument("--common-price-process-var-per-sec", type=float, default=20.0)
     p.add_argument("--basis-process-var-per-sec", type=float, default=0.005)
@@ -103,23 +84,8 @@ def main() -> None:
                    help="discard innovations in the first N minutes")
     args = p.parse_args()
 
-    print(f"loading {args.db_path}")
-    updates = load_updates(args.db_path)
-    if not updates:
-        raise SystemExit("no updates loaded")
-    print(f"loaded {len(updates):,} updates")
-
-    venues_present: set[str] = set()
-    for _, _, obs_list in updates:
-        for o in obs_list:
-            venues_present.add(o.name)
-    print(f"venues: {sorted(venues_present)}")
-
-    config = build_config(args, venues_present)
-    filt = VenueBasisKalmanFilter(config=config)
-
-    ts0_ms = updates[0][1]
-    warmup_cutoff_ms = ts0_ms + int(args.warmup_minutes * 60_000)
+    print(f"replaying {args.db_path}")
+    updates = replay_updates(args.db_path, args.asset, build_config(args))
 
     abs_innovations: dict[str, list[float]] = defaultdict(list)
     sq_innovations: dict[str, list[float]] = defaultdict(list)
@@ -127,11 +93,15 @@ def main() -> None:
 
     bps_denoms: dict[str, list[float]] = defaultdict(list)  # for bps conversion
 
-    for _, ts_ms, obs_list in updates:
-        result = filt.update(timestamp_s=ts_ms / 1000.0, observations=obs_list)
-        if result is None:
-            continue
+    n_updates = 0
+    warmup_cutoff_ms: int | None = None
+    venues_present: set[str] = set()
+    for ts_ms, result in updates:
+        n_updates += 1
+        if warmup_cutoff_ms is None:
+            warmup_cutoff_ms = ts_ms + int(args.warmup_minutes * 60_000)
         for d in result.observation_diagnostics:
+            venues_present.add(d.name)
             if ts_ms < warmup_cutoff_ms:
                 counts_pre_warmup[d.name] += 1
                 continue
@@ -139,6 +109,10 @@ def main() -> None:
             sq_innovations[d.name].append(d.innovation ** 2)
             if d.fair_value > 0:
                 bps_denoms[d.name].append(d.fair_value)
+    if not n_updates:
+        raise SystemExit("no filter updates replayed")
+    print(f"replayed {n_updates:,} filter updates")
+    print(f"venues: {sorted(venues_present)}")
 
     # Report.
     print(f"\nwarmup skipped: first {args.warmup_minutes:.1f} min "
@@ -23,133 +23,68 @@ Approach:
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
 import sys
 import time
-import urllib.parse
-import urllib.request
 from datetime import UTC, datetime
 from pathlib import Path
 
 import numpy as np
 
-HL_URL = "https://api.hyperliquid.xyz/info"
-CB_URL_TEMPLATE = "https://api.exchange.coinbase.com/products/{product}/candles"
-KR_URL = "https://api.kraken.com/0/public/OHLC"
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.fetch import (
+    AsyncHttpClient,
+    HttpError,
+    ResponseCache,
+    coinbase_candles,
+    hyperliquid_candles,
+    kraken_ohlc,
+)
 
 ROUND_TRIP_FEE_BPS = 19.0  # 6 spot taker × 2 + 3.5 perp taker × 2, conservative retail
 
 
-def post_json(url: str, body: dict) -> list | dict:
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(
-        url, data=data, headers={"Content-Type": "application/json"}
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read())
+async def fetch_hourly_closes(
+    coin: str,
+    cb_product: str,
+    kraken_pair: str | None,
+    start_ms: int,
+    end_ms: int,
+    cache: ResponseCache,
+) -> dict[str, dict[int, float]]:
+    """Hourly closes by bar open time (ms) per venue, all venues concurrently.
 
+    Settled pages are cached, so reruns only fetch the latest hours.
+    """
 
-def get_json(url: str, params: dict) -> list | dict:
-    qs = urllib.parse.urlencode(params)
-    req = urllib.request.Request(
-        f"{url}?{qs}",
-        headers={"User-Agent": "icarus-research/0.1"},
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read())
-
-
-def fetch_hl_hourly(coin: str, start_ms: int, end_ms: int) -> dict[int, float]:
-    out: dict[int, float] = {}
-    cursor = start_ms
-    step_ms = 500 * 3_600_000
-    while cursor < end_ms:
-        page_end = min(cursor + step_ms, end_ms)
-        batch = post_json(HL_URL, {
-            "type": "candleSnapshot",
-            "req": {"coin": coin, "interval": "1h",
-                    "startTime": cursor, "endTime": page_end},
-        })
-        assert isinstance(batch, list)
-        if not batch:
-            cursor = page_end
-            continue
-        for c in batch:
-            out[int(c["t"])] = float(c["c"])
-        cursor = int(batch[-1]["t"]) + 3_600_000
-    return out
-
-
-def fetch_coinbase_hourly(product: str, start_ms: int, end_ms: int) -> dict[int, float]:
-    out: dict[int, float] = {}
-    step_s = 300 * 3600
-    cursor = start_ms // 1000
-    end_s = end_ms // 1000
-    url = CB_URL_TEMPLATE.format(product=product)
-    while cursor < end_s:
-        page_end = min(cursor + step_s, end_s)
-        params = {
-            "granularity": 3600,
-            "start": datetime.fromtimestamp(cursor, UTC).isoformat(),
-            "end": datetime.fromtimestamp(page_end, UTC).isoformat(),
-        }
-        try:
-            batch = get_json(url, params)
-        except Exception as e:
-            print(f"coinbase fail ({cursor}): {e}", file=sys.stderr)
-            cursor = page_end
-            time.sleep(1.0)
-            continue
-        assert isinstance(batch, list)
-        for row in batch:
-            out[int(row[0]) * 1000] = float(row[4])  # close
-        cursor = page_end
-        time.sleep(0.25)
-    return out
-
-
-def fetch_kraken_hourly(pair: str, start_ms: int, end_ms: int) -> dict[int, float]:
-    """Kraken returns up to 720 OHLC rows; walk window in chunks."""
-    out: dict[int, float] = {}
-    cursor = start_ms // 1000
-    end_s = end_ms // 1000
-    step_s = 720 * 3600
-    while cursor < end_s:
+    async def coinbase() -> dict[int, float]:
+        rows = await coinbase_candles(
+            client, cb_product, 3600, start_ms // 1000, end_ms // 1000, cache=cache
+        )
+        return {int(row[0]) * 1000: float(row[4]) for row in rows}
+
+    async def hyperliquid() -> dict[int, float]:
+        rows = await hyperliquid_candles(client, coin, "1h", start_ms, end_ms, cache=cache)
+        return {int(c["t"]): float(c["c"]) for c in rows}
+
+    async def kraken(pair: str) -> dict[int, float]:
+        # Kraken only serves its latest 720 bars.
         try:
-            data = get_json(KR_URL, {"pair": pair, "interval": 60, "since": cursor})
-        except Exception as e:
+            rows = await kraken_ohlc(client, pair, 60, start_ms // 1000, end_ms // 1000)
+        except (HttpError, RuntimeError, OSError) as e:
             print(f"kraken fail: {e}", file=sys.stderr)
-            cursor += step_s
-            time.sleep(1.0)
-            continue
-        result = data.get("result", {}) if isinstance(data, dict) else {}
-        # Kraken result is dict with one pair key + "last"
-        rows: list = []
-        for k, v in result.items():
-            if k != "last" and isinstance(v, list):
-                rows = v
-                break
-        if not rows:
-            break
-        for row in rows:
-            t = int(row[0]) * 1000
-            if t <= end_ms:
-                out[t] = float(row[4])  # close
-        last_t = int(rows[-1][0])
-        if last_t <= cursor:
-            break
-        cursor = last_t + 1
-        time.sleep(0.3)
-    return out
-
-
-def cached(path: Path, producer):  # noqa: ANN001
-    if path.exists():
-        return {int(k): float(v) for k, v in json.loads(path.read_text()).items()}
-    data = producer()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data))
-    return data
+            return {}
+        return {int(row[0]) * 1000: float(row[4]) for row in rows}
+
+    async with AsyncHttpClient() as client:
+        venues = {"coinbase": coinbase(), "hyperliquid_perp": hyperliquid()}
+        if kraken_pair is not None:
+            venues["kraken"] = kraken(kraken_pair)
+        closes = await asyncio.gather(*venues.values())
+    return dict(zip(venues, closes, strict=True))
 
 
 def align_returns(
@@ -325,20 +260,10 @@ def main() -> None:
     if args.coin == "BTC":
         kraken_pair = "XXBTZUSD"
 
-    prices: dict[str, dict[int, float]] = {}
-    prices["coinbase"] = cached(
-        args.cache_dir / f"cb_{cbp}_{start_ms}_{end_ms}.json",
-        lambda: {str(k): v for k, v in fetch_coinbase_hourly(cbp, start_ms, end_ms).items()},
-    )
-    prices["hyperliquid_perp"] = cached(
-        args.cache_dir / f"hl_{args.coin}_{start_ms}_{end_ms}.json",
-        lambda: {str(k): v for k, v in fetch_hl_hourly(args.coin, start_ms, end_ms).items()},
-    )
-    if args.include_kraken:
-        prices["kraken"] = cached(
-            args.cache_dir / f"kr_{kraken_pair}_{start_ms}_{end_ms}.json",
-            lambda: {str(k): v for k, v in fetch_kraken_hourly(kraken_pair, start_ms, end_ms).items()},
-        )
+    prices = asyncio.run(fetch_hourly_closes(
+        args.coin, cbp, kraken_pair if args.include_kraken else None, start_ms, end_ms,
+        ResponseCache(args.cache_dir / "pages"),
+    ))
 
     for v, d in prices.items():
         print(f"  {v}: {len(d):,} hourly bars")
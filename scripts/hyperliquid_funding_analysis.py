@@ -27,122 +27,48 @@ Assumptions:
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
 import sys
 import time
-import urllib.parse
-import urllib.request
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
-HL_URL = "https://api.hyperliquid.xyz/info"
-CB_URL_TEMPLATE = "https://api.exchange.coinbase.com/products/{product}/candles"
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.fetch import (
+    AsyncHttpClient,
+    ResponseCache,
+    coinbase_candles,
+    hyperliquid_candles,
+    hyperliquid_funding,
+)
 
 # Retail taker fees (bps).
 CB_SPOT_TAKER_BPS = 6.0
 HL_PERP_TAKER_BPS = 3.5
 
 
-def post_json(url: str, body: dict) -> list | dict:
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(
-        url, data=data, headers={"Content-Type": "application/json"}
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read())
-
-
-def get_json(url: str, params: dict) -> list | dict:
-    qs = urllib.parse.urlencode(params)
-    req = urllib.request.Request(
-        f"{url}?{qs}",
-        headers={"User-Agent": "icarus-research/0.1 (github.com/icarus)"},
-    )
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read())
-
-
-def fetch_funding_history(coin: str, start_ms: int, end_ms: int) -> list[dict]:
-    """Hyperliquid returns list of {coin, fundingRate, premium, time}."""
-    out: list[dict] = []
-    cursor = start_ms
-    # API returns at most 500 per request; page forward by last.time+1
-    while cursor < end_ms:
-        batch = post_json(HL_URL, {
-            "type": "fundingHistory",
-            "coin": coin,
-            "startTime": cursor,
-            "endTime": end_ms,
-        })
-        if not batch:
-            break
-        assert isinstance(batch, list)
-        out.extend(batch)
-        if len(batch) < 500:
-            break
-        cursor = int(batch[-1]["time"]) + 1
-    return out
-
-
-def fetch_perp_candles(coin: str, interval: str, start_ms: int, end_ms: int) -> list[dict]:
-    """Hyperliquid candles: list of {t, T, c, h, l, o, n, s, v}."""
-    out: list[dict] = []
-    cursor = start_ms
-    step_ms = 500 * 3_600_000  # ~500 hourly bars per page
-    while cursor < end_ms:
-        page_end = min(cursor + step_ms, end_ms)
-        batch = post_json(HL_URL, {
-            "type": "candleSnapshot",
-            "req": {"coin": coin, "interval": interval,
-                    "startTime": cursor, "endTime": page_end},
-        })
-        assert isinstance(batch, list)
-        if not batch:
-            cursor = page_end
-            continue
-        out.extend(batch)
-        cursor = int(batch[-1]["t"]) + 3_600_000
-    # dedupe by t
-    seen: dict[int, dict] = {}
-    for c in out:
-        seen[int(c["t"])] = c
-    return [seen[t] for t in sorted(seen)]
-
-
-def fetch_coinbase_candles(product: str, start_ms: int, end_ms: int) -> list[list]:
-    """Coinbase candles: [[time_s, low, high, open, close, volume], ...].
-    Coinbase caps returns to 300 rows per request.
+async def fetch_inputs(
+    coin: str, cb_product: str, start_ms: int, end_ms: int, cache: ResponseCache
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[list[float]]]:
+    """Funding history, HL hourly perp candles and Coinbase hourly candles, concurrently.
+
+    Settled pages are cached, so reruns only fetch the latest hours.
     """
-    out: list[list] = []
-    step_s = 300 * 3600  # 300 hourly bars per page
-    cursor = start_ms // 1000
-    end_s = end_ms // 1000
-    url = CB_URL_TEMPLATE.format(product=product)
-    while cursor < end_s:
-        page_end = min(cursor + step_s, end_s)
-        params = {
-            "granularity": 3600,
-            "start": datetime.fromtimestamp(cursor, UTC).isoformat(),
-            "end": datetime.fromtimestamp(page_end, UTC).isoformat(),
-        }
-        try:
-            batch = get_json(url, params)
-        except Exception as e:
-            print(f"coinbase request failed ({cursor}): {e}", file=sys.stderr)
-            cursor = page_end
-            time.sleep(1.0)
-            continue
-        assert isinstance(batch, list)
-        out.extend(batch)
-        cursor = page_end
-        time.sleep(0.25)  # be polite to public API
-    # dedupe + sort ascending by time
-    seen: dict[int, list] = {}
-    for c in out:
-        seen[int(c[0])] = c
-    return [seen[t] for t in sorted(seen)]
+    async with AsyncHttpClient() as client:
+        funding, hl_candles, cb_candles = await asyncio.gather(
+            hyperliquid_funding(client, coin, start_ms, end_ms, cache=cache),
+            hyperliquid_candles(client, coin, "1h", start_ms, end_ms, cache=cache),
+            coinbase_candles(
+                client, cb_product, 3600, start_ms // 1000, end_ms // 1000, cache=cache
+            ),
+        )
+    return funding, hl_candles, cb_candles
 
 
 def simulate(
@@ -292,33 +218,12 @@ def main() -> None:
     print(f"fetching {args.days}d  {datetime.fromtimestamp(start_ms/1000, UTC):%Y-%m-%d} → "
           f"{datetime.fromtimestamp(end_ms/1000, UTC):%Y-%m-%d}")
 
-    fn_cache = args.cache_dir / f"funding_{args.coin}_{start_ms}_{end_ms}.json"
-    hl_cache = args.cache_dir / f"perp_candles_{args.coin}_{start_ms}_{end_ms}.json"
-    cb_cache = args.cache_dir / f"cb_candles_{cb_product}_{start_ms}_{end_ms}.json"
-
-    if fn_cache.exists():
-        funding = json.loads(fn_cache.read_text())
-        print(f"funding (cached): {len(funding)} records")
-    else:
-        funding = fetch_funding_history(args.coin, start_ms, end_ms)
-        fn_cache.write_text(json.dumps(funding))
-        print(f"funding fetched: {len(funding)} records")
-
-    if hl_cache.exists():
-        hl_candles = json.loads(hl_cache.read_text())
-        print(f"HL candles (cached): {len(hl_candles)} bars")
-    else:
-        hl_candles = fetch_perp_candles(args.coin, "1h", start_ms, end_ms)
-        hl_cache.write_text(json.dumps(hl_candles))
-        print(f"HL candles fetched: {len(hl_candles)} bars")
-
-    if cb_cache.exists():
-        cb_candles = json.loads(cb_cache.read_text())
-        print(f"CB candles (cached): {len(cb_candles)} bars")
-    else:
-        cb_candles = fetch_coinbase_candles(cb_product, start_ms, end_ms)
-        cb_cache.write_text(json.dumps(cb_candles))
-        print(f"CB candles fetched: {len(cb_candles)} bars")
+    funding, hl_candles, cb_candles = asyncio.run(fetch_inputs(
+        args.coin, cb_product, start_ms, end_ms, ResponseCache(args.cache_dir / "pages")
+    ))
+    print(f"funding: {len(funding)} records")
+    print(f"HL candles: {len(hl_candles)} bars")
+    print(f"CB candles: {len(cb_candles)} bars")
 
     # Index by hour.
     perp_by_hr = {int(c["t"]): c for c in hl_candles}
@@ -49,6 +49,7 @@ from icarus.sockets.coinbase import CoinbaseSocket
 from icarus.sockets.hyperliquid import HyperliquidSocket
 from icarus.sockets.kraken import KrakenSocket
 from icarus.sockets.okx import OkxSocket
+from icarus.stats import TradeFlowTracker
 from icarus.strategy.fair_value.combiner import (
     CrossVenueCombinerConfig,
     CrossVenueFairValueCombiner,
@@ -65,27 +66,6 @@ from _hyperliquid_spot import resolve_hyperliquid_spot_subscription_coin
 VENUES = ("coinbase", "hyperliquid", "okx", "kraken")
 
 
-@dataclass
-class TradeFlowTracker:
-    window_ms: int = 1000
-
-    def __post_init__(self) -> None:
-        self._events: deque[tuple[int, float, float]] = deque()
-
-    def add(self, ts_ms: int, side: str, size: float) -> None:
-        buy = size if side == "buy" else 0.0
-        sell = size if side == "sell" else 0.0
-        self._events.append((ts_ms, buy, sell))
-
-    def snapshot(self, now_ms: int) -> tuple[float, float]:
-        cutoff = now_ms - self.window_ms
-        while self._events and self._events[0][0] < cutoff:
-            self._events.popleft()
-        buy = sum(e[1] for e in self._events)
-        sell = sum(e[2] for e in self._events)
-        return (buy - sell, buy + sell)
-
-
 def _estimate_q_windowed(
     xi: np.ndarray,
     y: np.ndarray,
@@ -415,7 +395,10 @@ async def stream_plot_points(
                 mid = float(vs.fair_value)
                 venue_mids[eng.exchange] = mid
                 tracker = trade_flow_trackers.get(eng.exchange)
-                net_flow, total_size = tracker.snapshot(now_ms) if tracker else (0.0, 0.0)
+                net_flow, buy_size, sell_size, _ = (
+                    tracker.snapshot(now_ms) if tracker else (0.0, 0.0, 0.0, 0)
+                )
+                total_size = buy_size + sell_size
                 venue_features[eng.exchange] = (
                     float(m.microprice) - mid,
                     float(m.depth_imbalance),
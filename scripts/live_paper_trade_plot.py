@@ -20,10 +20,8 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import bisect
 import logging
 import queue
-import sqlite3
 import sys
 import threading
 import tkinter as tk
@@ -49,6 +47,7 @@ from multi_venue_basis_fair_value import (
     build_venue_state,
     stream_socket_observations,
 )
+from icarus.backtest import BUY, MakerFillSimulator, MakerQuoteConfig
 from icarus.measurements import MarketMeasurementEngine
 from icarus.observations import Observation, TradeObservation
 from icarus.sockets.base import BaseSocket
@@ -56,6 +55,7 @@ from icarus.sockets.coinbase import CoinbaseSocket
 from icarus.sockets.hyperliquid import HyperliquidSocket
 from icarus.sockets.kraken import KrakenSocket
 from icarus.sockets.okx import OkxSocket
+from icarus.stats import TradeFlowTracker
 from icarus.strategy.fair_value.combiner import (
     CrossVenueCombinerConfig,
     CrossVenueFairValueCombiner,
@@ -66,14 +66,9 @@ from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import (
     VenueBasisObservation,
 )
 from _hyperliquid_spot import resolve_hyperliquid_spot_subscription_coin
-from walk_forward_lagged import (
-    OWN_FEATURE_NAMES,
-    LAGGED_FEATURE_INDICES,
-    LAGGED_FEATURE_NAMES,
-    load_series,
-    build_dataset,
-    build_feature_names,
-)
+from icarus.features import OWN_FEATURE_NAMES, lagged_feature_rows
+from icarus.features.lagged import MAX_LAG_GAP_WINDOWS
+from walk_forward_lagged import load_series, build_dataset
 
 VENUES = ("coinbase", "hyperliquid", "okx", "kraken")
 PREDICT_VENUE = "coinbase"
@@ -143,60 +138,44 @@ def train_ridge(
 # -----------------------------------------------------------------------------
 
 
-@dataclass
-class TradeFlowTracker:
-    window_ms: int = 1000
-    _events: deque[tuple[int, float, float]] = field(default_factory=deque)
-
-    def add(self, ts_ms: int, side: str, size: float) -> None:
-        buy = size if side == "buy" else 0.0
-        sell = size if side == "sell" else 0.0
-        self._events.append((ts_ms, buy, sell))
+class VenueBuffer:
+    """Per-venue rolling buffer of (ts_ms, 6-feature vector) in growable arrays.
 
-    def snapshot(self, now_ms: int) -> tuple[float, float]:
-        cutoff = now_ms - self.window_ms
-        while self._events and self._events[0][0] < cutoff:
-            self._events.popleft()
-        buy = sum(e[1] for e in self._events)
-        sell = sum(e[2] for e in self._events)
-        return (buy - sell, buy + sell)
+    ``history()`` returns views of the live rows, so the feature assembler can
+    run the same as-of lookups over it that training runs over a whole capture.
+    """
 
+    def __init__(self, retain_ms: int = 20_000, capacity: int = 1024) -> None:
+        self.retain_ms = retain_ms
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._feats = np.empty((capacity, len(OWN_FEATURE_NAMES)), dtype=np.float64)
+        self._n = 0
 
-@dataclass
-class VenueBuffer:
-    """Per-venue rolling buffer of (ts_ms, 6-feature vector). Lists + bisect for O(log n) lookup."""
-    ts: list[int] = field(default_factory=list)
-    feats: list[np.ndarray] = field(default_factory=list)
-    retain_ms: int = 20_000
-    _cleanup_every: int = 256
-    _since_cleanup: int = 0
+    def __len__(self) -> int:
+        return self._n
 
     def push(self, ts_ms: int, feat: np.ndarray) -> None:
-        self.ts.append(ts_ms)
-        self.feats.append(feat)
-        self._since_cleanup += 1
-        if self._since_cleanup >= self._cleanup_every:
-            self._since_cleanup = 0
-            cutoff = ts_ms - self.retain_ms
-            i = bisect.bisect_left(self.ts, cutoff)
-            if i > 0:
-                del self.ts[:i]
-                del self.feats[:i]
-
-    def lookup(self, target_ts: int, max_gap_ms: int) -> np.ndarray | None:
-        if not self.ts:
-            return None
-        i = bisect.bisect_right(self.ts, target_ts) - 1
-        if i < 0:
-            return None
-        if target_ts - self.ts[i] > max_gap_ms:
-            return None
-        return self.feats[i]
+        if self._n == len(self._ts):
+            # Drop expired rows before growing.
+            keep_from = int(np.searchsorted(self._ts[: self._n], ts_ms - self.retain_ms))
+            kept = self._n - keep_from
+            if kept > len(self._ts) // 2:
+                self._ts = np.resize(self._ts, 2 * len(self._ts))
+                self._feats = np.resize(self._feats, (2 * len(self._feats), self._feats.shape[1]))
+            self._ts[:kept] = self._ts[keep_from : self._n]
+            self._feats[:kept] = self._feats[keep_from : self._n]
+            self._n = kept
+        self._ts[self._n] = ts_ms
+        self._feats[self._n] = feat
+        self._n += 1
+
+    def history(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._ts[: self._n], self._feats[: self._n]
 
     def latest(self) -> tuple[int, np.ndarray] | None:
-        if not self.ts:
+        if not self._n:
             return None
-        return self.ts[-1], self.feats[-1]
+        return int(self._ts[self._n - 1]), self._feats[self._n - 1]
 
 
 def assemble_feature_vector(
@@ -205,38 +184,39 @@ def assemble_feature_vector(
     own_feat: np.ndarray,
     buffers: dict[str, VenueBuffer],
 ) -> tuple[np.ndarray | None, str | None]:
-    """Build the 40-dim feature vector; return (features, fail_reason)."""
-    parts: list[np.ndarray] = [own_feat]
+    """Build the 40-dim feature vector; return (features, fail_reason).
+
+    Rows come from the same ``lagged_feature_rows`` the training matrix is
+    built with, so live and calibration features match exactly.
+    """
+    current = [own_feat]
     for ov in model.other_venues:
         latest = buffers[ov].latest()
         if latest is None:
             return None, f"no-latest:{ov}"
-        parts.append(latest[1])
+        current.append(latest[1])
 
-    lagged: list[float] = []
-    max_gap = {w: 2 * w for w in model.lag_windows_ms}
     venue_order = [PREDICT_VENUE] + model.other_venues
+    x, ok = lagged_feature_rows(
+        np.asarray([now_ms], dtype=np.int64),
+        [feat.reshape(1, -1) for feat in current],
+        [buffers[v].history() for v in venue_order],
+        model.lag_windows_ms,
+    )
+    if ok[0]:
+        return x[0], None
     for v in venue_order:
-        if v == PREDICT_VENUE:
-            cur = own_feat
-        else:
-            latest = buffers[v].latest()
-            if latest is None:
-                return None, f"no-latest:{v}"
-            cur = latest[1]
-        for fi in LAGGED_FEATURE_INDICES:
-            for w in model.lag_windows_ms:
-                past = buffers[v].lookup(now_ms - w, max_gap[w])
-                if past is None:
-                    oldest = buffers[v].ts[0] if buffers[v].ts else None
-                    newest = buffers[v].ts[-1] if buffers[v].ts else None
-                    return None, (
-                        f"lag-miss:{v}@-{w}ms (target={now_ms - w}, "
-                        f"buf=[{oldest},{newest}], n={len(buffers[v].ts)})"
-                    )
-                lagged.append(float(cur[fi]) - float(past[fi]))
-    parts.append(np.asarray(lagged))
-    return np.concatenate(parts), None
+        ts, _ = buffers[v].history()
+        for w in model.lag_windows_ms:
+            k = int(np.searchsorted(ts, now_ms - w, side="right")) - 1
+            if k < 0 or now_ms - int(ts[k]) > MAX_LAG_GAP_WINDOWS * w:
+                oldest = int(ts[0]) if len(ts) else None
+                newest = int(ts[-1]) if len(ts) else None
+                return None, (
+                    f"lag-miss:{v}@-{w}ms (target={now_ms - w}, "
+                    f"buf=[{oldest},{newest}], n={len(ts)})"
+                )
+    return None, "lag-miss"
 
 
 # -----------------------------------------------------------------------------
@@ -255,18 +235,43 @@ class PaperTradeState:
     requote_threshold: float
     order_size: float
 
-    inventory: float = 0.0
-    cash: float = 0.0
+    fills: list["FillEvent"] = field(default_factory=list)
+    # Quote, queue and position state lives in the shared maker fill kernel.
+    simulator: MakerFillSimulator = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.simulator = MakerFillSimulator(
+            MakerQuoteConfig(
+                half_spread=self.half_spread,
+                fee_bps=self.fee_bps,
+                max_inventory=self.max_inventory,
+                order_size=self.order_size,
+                skew_coef=self.skew_coef,
+                latency_ms=self.latency_ms,
+                queue_scale=self.queue_scale,
+                requote_threshold=self.requote_threshold,
+            )
+        )
 
-    live_bid_price: float | None = None
-    live_bid_queue: float = 0.0
-    live_bid_go_live_ts: int = 0
-    live_ask_price: float | None = None
-    live_ask_queue: float = 0.0
-    live_ask_go_live_ts: int = 0
+    @property
+    def inventory(self) -> float:
+        return self.simulator.inventory
 
-    fills: list["FillEvent"] = field(default_factory=list)
-    total_quotes_posted: int = 0
+    @property
+    def cash(self) -> float:
+        return self.simulator.cash
+
+    @property
+    def live_bid_price(self) -> float | None:
+        return self.simulator.live_bid_price
+
+    @property
+    def live_ask_price(self) -> float | None:
+        return self.simulator.live_ask_price
+
+    @property
+    def total_quotes_posted(self) -> int:
+        return self.simulator.quotes_posted
 
 
 @dataclass
@@ -290,93 +295,22 @@ def step_paper_trade(
     trade_sell_size: float,
     drift_hat: float,
 ) -> None:
-    center = venue_mid + state.skew_coef * drift_hat
-    desired_bid = center - state.half_spread
-    desired_ask = center + state.half_spread
-
-    # Manage live bid
-    if state.inventory < state.max_inventory:
-        if (
-            state.live_bid_price is None
-            or abs(state.live_bid_price - desired_bid) > state.requote_threshold
-        ):
-            state.live_bid_price = desired_bid
-            if venue_bid is not None and desired_bid > venue_bid:
-                state.live_bid_queue = 0.0
-            else:
-                state.live_bid_queue = top_bid_depth * state.queue_scale
-            state.live_bid_go_live_ts = now_ms + state.latency_ms
-            state.total_quotes_posted += 1
-    else:
-        state.live_bid_price = None
-
-    # Manage live ask
-    if state.inventory > -state.max_inventory:
-        if (
-            state.live_ask_price is None
-            or abs(state.live_ask_price - desired_ask) > state.requote_threshold
-        ):
-            state.live_ask_price = desired_ask
-            if venue_ask is not None and desired_ask < venue_ask:
-                state.live_ask_queue = 0.0
-            else:
-                state.live_ask_queue = top_ask_depth * state.queue_scale
-            state.live_ask_go_live_ts = now_ms + state.latency_ms
-            state.total_quotes_posted += 1
-    else:
-        state.live_ask_price = None
-
-    fee_rate = state.fee_bps / 10_000.0
-
-    # Bid fill
-    if (
-        state.live_bid_price is not None
-        and now_ms >= state.live_bid_go_live_ts
-        and state.inventory < state.max_inventory
-    ):
-        crossed = venue_ask is not None and venue_ask <= state.live_bid_price
-        at_or_inside = venue_bid is None or state.live_bid_price >= venue_bid
-        fill = False
-        if crossed:
-            fill = True
-        elif at_or_inside and trade_sell_size > 0:
-            consumed = min(trade_sell_size, state.live_bid_queue)
-            state.live_bid_queue -= consumed
-            remaining = trade_sell_size - consumed
-            if remaining > 0 and state.live_bid_queue <= 0.0:
-                fill = True
-        if fill:
-            p = state.live_bid_price
-            fee = fee_rate * p * state.order_size
-            state.cash -= p * state.order_size + fee
-            state.inventory += state.order_size
-            state.fills.append(FillEvent(now_ms, "buy", p, fee, drift_hat))
-            state.live_bid_price = None
-
-    # Ask fill
-    if (
-        state.live_ask_price is not None
-        and now_ms >= state.live_ask_go_live_ts
-        and state.inventory > -state.max_inventory
-    ):
-        crossed = venue_bid is not None and venue_bid >= state.live_ask_price
-        at_or_inside = venue_ask is None or state.live_ask_price <= venue_ask
-        fill = False
-        if crossed:
-            fill = True
-        elif at_or_inside and trade_buy_size > 0:
-            consumed = min(trade_buy_size, state.live_ask_queue)
-            state.live_ask_queue -= consumed
-            remaining = trade_buy_size - consumed
-            if remaining > 0 and state.live_ask_queue <= 0.0:
-                fill = True
-        if fill:
-            p = state.live_ask_price
-            fee = fee_rate * p * state.order_size
-            state.cash += p * state.order_size - fee
-            state.inventory -= state.order_size
-            state.fills.append(FillEvent(now_ms, "sell", p, fee, drift_hat))
-            state.live_ask_price = None
+    """One tick through the same fill kernel simulate_basis_maker.py sweeps with."""
+    fills = state.simulator.step(
+        now_ms,
+        venue_mid,
+        venue_bid,
+        venue_ask,
+        top_bid_depth,
+        top_ask_depth,
+        trade_buy_size,
+        trade_sell_size,
+        drift_hat,
+    )
+    for side, price, fee in fills:
+        state.fills.append(
+            FillEvent(now_ms, "buy" if side == BUY else "sell", price, fee, drift_hat)
+        )
 
 
 def mtm(state: PaperTradeState, last_mid: float) -> float:
@@ -621,7 +555,8 @@ async def stream_plot_points(
                 if est is None:
                     continue
                 reconstructed = basis_common + est
-                net_flow, total_size = trade_flow_trackers[venue].snapshot(now_ms)
+                net_flow, buy_size, sell_size, _ = trade_flow_trackers[venue].snapshot(now_ms)
+                total_size = buy_size + sell_size
                 mid = float(vs.fair_value)
                 feat = np.asarray(
                     (
@@ -681,10 +616,7 @@ async def stream_plot_points(
             top_bid_depth = float(meas.top_bid_depth or 0.0)
             top_ask_depth = float(meas.top_ask_depth or 0.0)
             tracker = trade_flow_trackers[PREDICT_VENUE]
-            net_flow, total_flow = tracker.snapshot(now_ms)
-            # snapshot returns (buy-sell, buy+sell) → recover each side.
-            buy_flow = max(0.0, (total_flow + net_flow) / 2.0)
-            sell_flow = max(0.0, (total_flow - net_flow) / 2.0)
+            _, buy_flow, sell_flow, _ = tracker.snapshot(now_ms)
             mid_cb = float(own_vs.fair_value)
 
             prev_fill_count = len(paper.fills)
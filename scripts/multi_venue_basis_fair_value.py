@@ -36,6 +36,7 @@ from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import (  # no
     VenueBasisKalmanFilter,
     VenueBasisObservation,
 )
+from icarus.strategy.fair_value.pipeline import VenueFairValuePipeline  # noqa: E402
 from icarus.strategy.fair_value.types import VenueFairValueState  # noqa: E402
 from _hyperliquid_spot import resolve_hyperliquid_spot_subscription_coin  # noqa: E402
 
@@ -182,6 +183,17 @@ def build_parser() -> argparse.ArgumentParser:
         help="Combiner-only age penalty used for the printed composite estimate.",
     )
     _add_basis_filter_args(parser)
+    parser.add_argument(
+        "--numeric-mode",
+        default="decimal",
+        choices=["decimal", "float"],
+        help="Parse venue prices/sizes as exact Decimal or as float64 (faster hot path).",
+    )
+    parser.add_argument(
+        "--drop-raw-messages",
+        action="store_true",
+        help="Don't keep raw websocket payloads on observations once books are validated.",
+    )
     parser.add_argument(
         "--limit",
         type=int,
@@ -271,6 +283,13 @@ def _add_basis_filter_args(parser: argparse.ArgumentParser) -> None:
         default=defaults.local_var_floor,
         help="Lower bound on per-venue observation variance.",
     )
+    group.add_argument(
+        "--basis-update-method",
+        default=defaults.update_method,
+        choices=["joint", "sequential"],
+        help="joint: dense matrix update. sequential: one scalar update per venue "
+        "(same posterior, cheaper per tick).",
+    )
 
 
 def build_basis_filter_config(args: argparse.Namespace) -> VenueBasisKalmanConfig:
@@ -298,6 +317,7 @@ def build_basis_filter_config(args: argparse.Namespace) -> VenueBasisKalmanConfi
         min_live_spot_venues=args.basis_min_live_spot_venues,
         stale_cutoff_ms=args.basis_stale_cutoff_ms,
         local_var_floor=args.basis_local_var_floor,
+        update_method=args.basis_update_method,
     )
 
 
@@ -369,6 +389,8 @@ async def run_multi_venue_basis(args: argparse.Namespace) -> None:
                 args.coinbase_market,
                 channels=args.coinbase_channels or ["ticker", "heartbeats", "level2"],
                 sandbox=args.sandbox,
+                numeric_mode=args.numeric_mode,
+                keep_raw_messages=not args.drop_raw_messages,
             ),
             None,
             None,
@@ -388,6 +410,8 @@ async def run_multi_venue_basis(args: argparse.Namespace) -> None:
                     args.hyperliquid_market.split("/", 1)[0],
                     subscription_coin=hyperliquid_subscription_coin,
                     testnet=args.testnet,
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=not args.drop_raw_messages,
                 ),
                 None,
                 None,
@@ -402,15 +426,38 @@ async def run_multi_venue_basis(args: argparse.Namespace) -> None:
                         args.hyperliquid_perp_subscription_coin or args.hyperliquid_perp_market
                     ),
                     testnet=args.testnet,
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=not args.drop_raw_messages,
                 ),
                 "hyperliquid_perp",
                 f"{args.hyperliquid_perp_market}-PERP",
             )
         )
+    keep_raw_messages = not args.drop_raw_messages
     if not args.disable_okx:
-        sockets.append((OkxSocket(args.okx_market), None, None))
+        sockets.append(
+            (
+                OkxSocket(
+                    args.okx_market,
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=keep_raw_messages,
+                ),
+                None,
+                None,
+            )
+        )
     if not args.disable_kraken:
-        sockets.append((KrakenSocket(args.kraken_market), None, None))
+        sockets.append(
+            (
+                KrakenSocket(
+                    args.kraken_market,
+                    numeric_mode=args.numeric_mode,
+                    keep_raw_messages=keep_raw_messages,
+                ),
+                None,
+                None,
+            )
+        )
 
     tasks = [
         asyncio.create_task(
@@ -424,10 +471,7 @@ async def run_multi_venue_basis(args: argparse.Namespace) -> None:
         for socket, exchange_override, market_override in sockets
     ]
 
-    measurement_engines: dict[tuple[str, str], MarketMeasurementEngine] = {}
-    estimators: dict[tuple[str, str], RawFairValueEstimator] = {}
-    filters: dict[tuple[str, str], EMAFairValueFilter | None] = {}
-    latest_venue_states: dict[str, VenueFairValueState] = {}
+    venue_pipeline = VenueFairValuePipeline(args.asset, filter_factory=lambda: build_filter(args))
     combiner = CrossVenueFairValueCombiner(
         args.asset,
         config=CrossVenueCombinerConfig(
@@ -450,38 +494,8 @@ async def run_multi_venue_basis(args: argparse.Namespace) -> None:
             if now_ms is None:
                 continue
 
-            engine_key = (observation.exchange, observation.market)
-            measurement_engine = measurement_engines.get(engine_key)
-            if measurement_engine is None:
-                measurement_engine = MarketMeasurementEngine(
-                    exchange=observation.exchange,
-                    market=observation.market,
-                )
-                measurement_engines[engine_key] = measurement_engine
-
-            measurement_engine.on_observation(observation)
-
-            latest_venue_states.clear()
-            for current_engine_key, current_engine in measurement_engines.items():
-                estimator = estimators.get(current_engine_key)
-                if estimator is None:
-                    estimator = RawFairValueEstimator()
-                    estimators[current_engine_key] = estimator
-
-                if current_engine_key not in filters:
-                    filters[current_engine_key] = build_filter(args)
-                fair_value_filter = filters[current_engine_key]
-
-                venue_state = build_venue_state(
-                    engine=current_engine,
-                    estimator=estimator,
-                    fair_value_filter=fair_value_filter,
-                    market=args.asset,
-                    now_ms=now_ms,
-                )
-                if venue_state is None:
-                    continue
-                latest_venue_states[current_engine.exchange] = venue_state
+            venue_pipeline.on_observation(observation)
+            latest_venue_states = venue_pipeline.refresh(now_ms)
 
             if not latest_venue_states:
                 continue
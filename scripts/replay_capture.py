@@ -0,0 +1,207 @@
+#!/usr/bin/env -S poetry run python
+# ruff: noqa: E402, I001
+
+"""Replay recorded captures through the live fair-value pipeline.
+
+Rebuilds every venue's quote stream from one or more capture_filter_eval
+captures (SQLite or ``.cols``), merges them in timestamp order and drives the
+same AssetFairValuePipeline (venue pipeline, composite, 1-D Kalman and basis
+filter) the live capture runs. Filter, Kalman and basis flags are shared with
+the live scripts, so a parameter change can be replayed against yesterday's data before going live.
+
+With ``--frames-dir`` the input is instead the raw websocket frames recorded
+by ``capture_filter_eval --record-frames-dir``, re-normalised with the current
+socket/normaliser code, so normaliser changes can be checked on history too.
+
+    scripts/replay_capture.py data/capture/2026-10-17.sqlite3 --basis-rho-per-second 0.01
+    scripts/replay_capture.py data/capture/2026-10-17.cols --speed 10 --print-every 1
+    scripts/replay_capture.py --frames-dir data/frames --asset ETH
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from multi_venue_basis_fair_value import (
+    apply_asset_defaults,
+    build_basis_filter_config,
+    build_filter,
+    build_parser as build_basis_parser,
+)
+from multi_venue_fair_value import _add_kalman_cli_args, build_kalman_config
+from icarus.capture.frames import frame_labels, iter_recorded_frames
+from icarus.observations import Observation
+from icarus.replay import (
+    ReplayStep,
+    iter_capture_quotes,
+    iter_frame_observations,
+    merge_observations,
+    replay,
+)
+from icarus.sockets.base import BaseSocket
+from icarus.sockets.coinbase import CoinbaseSocket
+from icarus.sockets.decoding import JSON_BACKENDS
+from icarus.sockets.hyperliquid import HyperliquidSocket
+from icarus.sockets.kraken import KrakenSocket
+from icarus.sockets.okx import OkxSocket
+from icarus.strategy.fair_value.combiner import CrossVenueCombinerConfig
+from icarus.strategy.fair_value.pipeline import AssetFairValuePipeline
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = build_basis_parser()
+    parser.description = __doc__
+    parser.formatter_class = argparse.RawDescriptionHelpFormatter
+    _add_kalman_cli_args(parser)
+    parser.add_argument("captures", type=Path, nargs="*", help="capture files or .cols stores")
+    parser.add_argument("--frames-dir", type=Path, default=None,
+                        help="replay recorded raw frames from this directory instead")
+    parser.add_argument("--json-backend", default="auto", choices=JSON_BACKENDS,
+                        help="frame decoder for --frames-dir (see capture_filter_eval)")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="pace events at this multiple of wall-clock time (default: flat out)")
+    parser.add_argument("--start-ms", type=int, default=None, help="first update timestamp")
+    parser.add_argument("--end-ms", type=int, default=None, help="exclusive end timestamp")
+    parser.add_argument("--print-every", type=int, default=0,
+                        help="print every Nth step (0: summary only)")
+    return parser
+
+
+type SocketSpec = tuple[BaseSocket, str | None, str | None]
+
+
+def replay_sockets(args: argparse.Namespace) -> dict[str, SocketSpec]:
+    """Sockets (never connected) keyed by frame label, with capture_filter_eval's overrides.
+
+    Replay never looks at raw payloads past the book builders, so they are dropped.
+    """
+    options = {
+        "numeric_mode": args.numeric_mode,
+        "keep_raw_messages": False,
+        "json_backend": args.json_backend,
+    }
+    return {
+        "coinbase": (CoinbaseSocket(args.coinbase_market, **options), None, None),
+        "hyperliquid": (
+            HyperliquidSocket(args.hyperliquid_market.split("/", 1)[0], **options),
+            None,
+            None,
+        ),
+        "hyperliquid_perp": (
+            HyperliquidSocket(args.hyperliquid_perp_market, **options),
+            "hyperliquid_perp",
+            f"{args.hyperliquid_perp_market}-PERP",
+        ),
+        "okx": (OkxSocket(args.okx_market, **options), None, None),
+        "kraken": (KrakenSocket(args.kraken_market, **options), None, None),
+    }
+
+
+def frame_streams(args: argparse.Namespace) -> list[Iterator[Observation]]:
+    sockets = replay_sockets(args)
+    start_ns = args.start_ms * 1_000_000 if args.start_ms is not None else None
+    end_ns = args.end_ms * 1_000_000 if args.end_ms is not None else None
+    streams = []
+    for label in frame_labels(args.frames_dir):
+        if label not in sockets:
+            print(f"skipping frames for unknown venue {label!r}")
+            continue
+        socket, exchange, market = sockets[label]
+        frames = iter_recorded_frames(args.frames_dir, label, start_ns=start_ns, end_ns=end_ns)
+        streams.append(iter_frame_observations(socket, frames, exchange=exchange, market=market))
+    return streams
+
+
+def capture_streams(args: argparse.Namespace) -> list[Iterator[Observation]]:
+    markets = {
+        "coinbase": args.coinbase_market,
+        "hyperliquid": args.hyperliquid_market,
+        "okx": args.okx_market,
+        "kraken": args.kraken_market,
+        "hyperliquid_perp": args.hyperliquid_perp_market,
+    }
+    return [
+        iter_capture_quotes(
+            path,
+            markets=markets,
+            numeric_mode=args.numeric_mode,
+            start_ms=args.start_ms,
+            end_ms=args.end_ms,
+        )
+        for path in args.captures
+    ]
+
+
+def format_step(step: ReplayStep) -> str:
+    head = f"{step.timestamp_ms} {step.observation.exchange:<16}"
+    if step.composite is not None:
+        head += f" composite={float(step.composite.fair_value):.4f}"
+    if step.kalman is not None:
+        head += f" kalman={step.kalman.filtered_price:.4f}"
+    basis = step.last_basis
+    if basis is None:
+        return f"{head} basis not live"
+    active = ",".join(basis.active_venues)
+    return (
+        f"{head} common={basis.common_price:.4f} sd={basis.common_price_stddev:.4f} "
+        f"active={active}"
+    )
+
+
+def main() -> None:
+    parser = build_parser()
+    args = apply_asset_defaults(parser.parse_args())
+    if args.frames_dir is not None:
+        streams = frame_streams(args)
+    elif args.captures:
+        streams = capture_streams(args)
+    else:
+        parser.error("give capture paths or --frames-dir")
+    pipeline = AssetFairValuePipeline(
+        args.asset,
+        basis_config=build_basis_filter_config(args),
+        kalman_config=build_kalman_config(args),
+        combiner_config=CrossVenueCombinerConfig(
+            stale_after_ms=args.stale_after_ms,
+            age_penalty_per_second=args.age_penalty_per_second,
+        ),
+        filter_factory=lambda: build_filter(args),
+    )
+
+    steps = 0
+    live = 0
+    last: ReplayStep | None = None
+    started = time.perf_counter()
+    for step in replay(
+        merge_observations(*streams),
+        pipeline=pipeline,
+        speed=args.speed,
+    ):
+        steps += 1
+        live += step.basis is not None
+        last = step
+        if args.print_every and steps % args.print_every == 0:
+            print(format_step(step))
+        if args.limit and steps >= args.limit:
+            break
+    elapsed = time.perf_counter() - started
+
+    print(f"steps={steps} basis_updates={live} elapsed={elapsed:.2f}s "
+          f"rate={steps / elapsed if elapsed > 0 else 0.0:,.0f} steps/s")
+    if last is not None:
+        print(format_step(last))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@
 # Usage:
 #   scripts/run_capture_daemon.sh                       # start (foreground)
 #   nohup scripts/run_capture_daemon.sh >capture.log 2>&1 &   # detach
+#   scripts/run_capture_daemon.sh --assets BTC ETH SOL  # one process, shared connections,
+#                                                       # data/capture/<ASSET>/YYYY-MM-DD.sqlite3
 #
 # Stop with: pkill -f capture_filter_eval.py  (or Ctrl+C if foreground)
 
@@ -21,7 +23,7 @@ while true; do
 
   PYTHONPATH=src python scripts/capture_filter_eval.py \
     --asset BTC \
-    --kraken-market BTC/USD \
+    --kraken-market '{asset}/USD' \
     --basis-anchor-exchange coinbase \
     --basis-min-live-spot-venues 1 \
     --basis-common-price-process-var-per-sec 20 \
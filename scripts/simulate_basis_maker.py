@@ -22,25 +22,48 @@ quoting systematically off-market on venues with persistent premia.
 
 Fill rule: my bid is filled when the venue's best ask drops to or below my bid
 price (a taker-sell is willing to trade there). Symmetric for the ask.
+
+Every --half-spreads x --drift-skew-coefs x --fee-bps x --latency-ms x
+--queue-scale cell runs over the same tick columns. The drift predictor only
+learns from realized mids, never from our quotes, so it runs once and all
+skewed cells share its drift_hat path. --workers deals cells out to a process
+pool; output is identical either way.
 """
 
 from __future__ import annotations
 
 import argparse
+import multiprocessing
 import sqlite3
 import sys
 from bisect import bisect_left
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
 SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
 from _drift_predictor import DriftPredictor, FEATURE_NAMES  # noqa: F401
+from icarus.backtest import (
+    BUY,
+    MakerFillSimulator,
+    MakerQuoteConfig,
+    MakerTicks,
+    SweepCell,
+    collect_round_robin,
+    deal_round_robin,
+    sweep_grid,
+)
+from icarus.capture import ColumnarCaptureReader
 
 
 @dataclass(frozen=True, slots=True)
@@ -79,6 +102,8 @@ DEFAULT_FEE_BPS = {
 
 
 def load_ticks(db_path: Path, venue: str, max_age_ms: float) -> list[Tick]:
+    if ColumnarCaptureReader.is_store(db_path):
+        return _load_columnar_ticks(db_path, venue, max_age_ms)
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
     has_bbo = _has_bid_ask_columns(conn)
@@ -169,6 +194,88 @@ def load_ticks(db_path: Path, venue: str, max_age_ms: float) -> list[Tick]:
     return ticks
 
 
+def _load_columnar_ticks(store_path: Path, venue: str, max_age_ms: float) -> list[Tick]:
+    """``load_ticks`` for a columnar capture store: filter as whole columns, then box."""
+    reader = ColumnarCaptureReader(store_path)
+    if venue not in reader.venues():
+        return []
+    cols = reader.read_venue_joined(
+        venue,
+        [
+            "fair_value", "age_ms", "microprice", "depth_imbalance", "mid_volatility_bps",
+            "bid_price", "ask_price", "trade_net_flow", "trade_buy_size", "trade_sell_size",
+            "top_bid_depth", "top_ask_depth",
+        ],
+        update_columns=["basis_is_live", "basis_common_price"],
+        basis_columns=["basis_estimate", "basis_stddev"],
+    )
+    age = cols["age_ms"]
+    rows = np.flatnonzero(
+        cols["basis_is_live"]
+        & np.isfinite(cols["basis_common_price"])
+        & np.isfinite(cols["basis_estimate"])
+        & np.isfinite(age)
+        & (age <= max_age_ms)
+    )
+    rows = rows[np.lexsort((cols["update_id"][rows], cols["timestamp_ms"][rows]))]
+
+    def column(name: str, *, fill: float | None = None) -> list[float | None]:
+        values = cols[name][rows]
+        if fill is not None:
+            return np.nan_to_num(values, nan=fill).tolist()
+        return [None if value != value else value for value in values.tolist()]
+
+    mid = column("fair_value")
+    microprice = column("microprice")
+    imb = column("depth_imbalance")
+    vol = column("mid_volatility_bps")
+    net_flow = column("trade_net_flow", fill=0.0)
+    buy = column("trade_buy_size", fill=0.0)
+    sell = column("trade_sell_size", fill=0.0)
+    reconstructed = (cols["basis_common_price"][rows] + cols["basis_estimate"][rows]).tolist()
+    ticks: list[Tick] = []
+    for i, (timestamp_ms, bid, ask, stddev, age_ms, bid_depth, ask_depth) in enumerate(
+        zip(
+            cols["timestamp_ms"][rows].tolist(),
+            column("bid_price"),
+            column("ask_price"),
+            column("basis_stddev", fill=0.0),
+            column("age_ms"),
+            column("top_bid_depth", fill=0.0),
+            column("top_ask_depth", fill=0.0),
+            strict=True,
+        )
+    ):
+        venue_mid = mid[i]
+        assert venue_mid is not None and age_ms is not None
+        features: tuple[float, ...] | None = None
+        if microprice[i] is not None and imb[i] is not None and vol[i] is not None:
+            features = (
+                microprice[i] - venue_mid,
+                imb[i],
+                vol[i],
+                net_flow[i],
+                buy[i] + sell[i],
+            )
+        ticks.append(
+            Tick(
+                timestamp_ms=timestamp_ms,
+                venue_mid=venue_mid,
+                venue_bid=bid,
+                venue_ask=ask,
+                reconstructed=reconstructed[i],
+                basis_stddev=stddev,
+                age_ms=age_ms,
+                features=features,
+                top_bid_depth=bid_depth,
+                top_ask_depth=ask_depth,
+                trade_buy_size=buy[i],
+                trade_sell_size=sell[i],
+            )
+        )
+    return ticks
+
+
 def _has_bid_ask_columns(conn: sqlite3.Connection) -> bool:
     cols = {row[1] for row in conn.execute("PRAGMA table_info(venue_states)")}
     return "bid_price" in cols and "ask_price" in cols
@@ -265,6 +372,82 @@ def calibrate_predictor(
     return predictor, cal_end
 
 
+@dataclass(frozen=True, slots=True)
+class TickColumns:
+    """``ticks`` as arrays, loaded once per sweep; a missing bid/ask is NaN."""
+
+    timestamp_ms: np.ndarray
+    venue_mid: np.ndarray
+    venue_bid: np.ndarray
+    venue_ask: np.ndarray
+    reconstructed: np.ndarray
+    basis_stddev: np.ndarray
+    top_bid_depth: np.ndarray
+    top_ask_depth: np.ndarray
+    trade_buy_size: np.ndarray
+    trade_sell_size: np.ndarray
+
+
+def tick_columns(ticks: list[Tick]) -> TickColumns:
+    def floats(values: list[float | None]) -> np.ndarray:
+        return np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+
+    return TickColumns(
+        timestamp_ms=np.asarray([t.timestamp_ms for t in ticks], dtype=np.int64),
+        venue_mid=floats([t.venue_mid for t in ticks]),
+        venue_bid=floats([t.venue_bid for t in ticks]),
+        venue_ask=floats([t.venue_ask for t in ticks]),
+        reconstructed=floats([t.reconstructed for t in ticks]),
+        basis_stddev=floats([t.basis_stddev for t in ticks]),
+        top_bid_depth=floats([t.top_bid_depth for t in ticks]),
+        top_ask_depth=floats([t.top_ask_depth for t in ticks]),
+        trade_buy_size=floats([t.trade_buy_size for t in ticks]),
+        trade_sell_size=floats([t.trade_sell_size for t in ticks]),
+    )
+
+
+def drift_path(
+    ticks: list[Tick],
+    predictor: DriftPredictor | None,
+    calibration_end: int,
+    horizon_ms: int,
+    external_predictions: dict[int, float] | None,
+) -> np.ndarray:
+    """Unclipped drift_hat per tick for a nonzero skew coefficient; NaN where none.
+
+    Quoting never feeds back into the predictor, so one path serves every
+    half-spread and skew coefficient. ``predictor`` is advanced in place.
+    """
+    drift = np.full(len(ticks), np.nan)
+    if external_predictions is not None:
+        for idx, tick in enumerate(ticks):
+            ext = external_predictions.get(tick.timestamp_ms)
+            if ext is not None:
+                drift[idx] = float(ext)
+        return drift
+    if predictor is None:
+        return drift
+
+    # Pending updates: (target_ts, xi_standardized, mid_at_t). Processed FIFO
+    # when current tick ts >= target_ts so the Kalman update only uses realized data.
+    pending: deque[tuple[int, np.ndarray, float]] = deque()
+    for idx, tick in enumerate(ticks):
+        while pending and pending[0][0] <= tick.timestamp_ms:
+            _, xi_past, mid_past = pending.popleft()
+            predictor.update(xi_past, tick.venue_mid - mid_past)
+        if idx >= calibration_end and tick.features is not None:
+            xi = predictor.standardize(tick.features)
+            drift[idx] = predictor.predict(xi)
+            pending.append((tick.timestamp_ms + horizon_ms, xi, tick.venue_mid))
+    return drift
+
+
+def clipped_drift_hats(drift: np.ndarray, half_spread: float) -> np.ndarray:
+    """The drift_hats a cell quotes on: available values clipped to ±half_spread."""
+    available = drift[~np.isnan(drift)]
+    return np.maximum(-half_spread, np.minimum(half_spread, available))
+
+
 def simulate(
     ticks: list[Tick],
     half_spread: float,
@@ -284,194 +467,152 @@ def simulate(
     unwind_half_spread_mult: float,
     external_predictions: dict[int, float] | None = None,
 ) -> tuple[list[Fill], float, dict[str, float]]:
-    fills: list[Fill] = []
-    inventory = 0.0
-    cash = 0.0
-    fee_rate = fee_bps / 10_000.0
-    drift_hats: list[float] = []
+    drift = None
+    if drift_skew_coef != 0.0:
+        drift = drift_path(ticks, predictor, calibration_end, horizon_ms, external_predictions)
+    [result] = simulate_cells(
+        tick_columns(ticks),
+        [SweepCell(half_spread, drift_skew_coef, fee_bps, latency_ms, queue_scale)],
+        drift,
+        inventory_skew,
+        max_inventory,
+        max_basis_stddev,
+        single_sided,
+        order_size,
+        requote_threshold,
+        unwind_half_spread_mult,
+    )
+    if drift is not None:
+        print_drift_stats(clipped_drift_hats(drift, half_spread))
+    return result
 
-    # Pending updates: (target_ts, xi_standardized, mid_at_t). Processed FIFO
-    # when current tick ts >= target_ts so the Kalman update only uses realized data.
-    pending: deque[tuple[int, np.ndarray, float]] = deque()
 
-    # Live quote state — persisted across ticks so the queue model can reason
-    # about "did we sit on this price long enough to be at the front?".
-    # When the desired quote moves by more than requote_threshold we cancel +
-    # repost, eating the latency penalty and resetting the queue.
-    live_bid_price: float | None = None
-    live_bid_queue: float = 0.0  # base units ahead of our order at the bid
-    live_bid_go_live_ts: int = 0  # ts when our bid post becomes live (post + latency)
-    live_ask_price: float | None = None
-    live_ask_queue: float = 0.0
-    live_ask_go_live_ts: int = 0
-
-    # Diagnostics
-    total_quotes_posted = 0  # bid or ask postings
-    total_fills = 0
-    total_quote_ms_bid = 0
-    total_quote_ms_ask = 0
-    last_tick_ts = ticks[0].timestamp_ms if ticks else 0
+def simulate_cells(
+    columns: TickColumns,
+    cells: list[SweepCell],
+    drift: np.ndarray | None,
+    inventory_skew: float,
+    max_inventory: float,
+    max_basis_stddev: float | None,
+    single_sided: bool,
+    order_size: float,
+    requote_threshold: float,
+    unwind_half_spread_mult: float,
+) -> list[tuple[list[Fill], float, dict[str, float]]]:
+    """Run the maker fill kernel once per cell over shared tick columns.
 
-    for idx, tick in enumerate(ticks):
-        dt_ms = tick.timestamp_ms - last_tick_ts
-        last_tick_ts = tick.timestamp_ms
-
-        # Apply any pending Kalman updates whose horizon has elapsed.
-        if predictor is not None:
-            while pending and pending[0][0] <= tick.timestamp_ms:
-                _, xi_past, mid_past = pending.popleft()
-                predictor.update(xi_past, tick.venue_mid - mid_past)
-
-        drift_hat = 0.0
-        if drift_skew_coef != 0.0:
-            if external_predictions is not None:
-                ext = external_predictions.get(tick.timestamp_ms)
-                if ext is not None:
-                    drift_hat = max(-half_spread, min(half_spread, float(ext)))
-                    drift_hats.append(drift_hat)
-            elif (
-                predictor is not None
-                and idx >= calibration_end
-                and tick.features is not None
-            ):
-                xi = predictor.standardize(tick.features)
-                drift_hat = predictor.predict(xi)
-                drift_hat = max(-half_spread, min(half_spread, drift_hat))
-                drift_hats.append(drift_hat)
-                pending.append((tick.timestamp_ms + horizon_ms, xi, tick.venue_mid))
-
-        if max_basis_stddev is not None and tick.basis_stddev > max_basis_stddev:
-            # Cancel any live quotes when basis uncertainty spikes.
-            live_bid_price = None
-            live_ask_price = None
-            continue
+    ``drift`` is a ``drift_path`` (or None when no cell skews). Module-level so
+    sweep workers can run a chunk of cells each.
+    """
+    ticks = MakerTicks(
+        timestamp_ms=columns.timestamp_ms,
+        venue_mid=columns.venue_mid,
+        venue_bid=columns.venue_bid,
+        venue_ask=columns.venue_ask,
+        top_bid_depth=columns.top_bid_depth,
+        top_ask_depth=columns.top_ask_depth,
+        trade_buy_size=columns.trade_buy_size,
+        trade_sell_size=columns.trade_sell_size,
+    )
+    # Quotes are cancelled while basis uncertainty spikes.
+    quotable = None
+    if max_basis_stddev is not None:
+        quotable = ~(columns.basis_stddev > max_basis_stddev)
+    dislocation = columns.venue_mid - columns.reconstructed if single_sided else None
+    return [
+        _simulate_cell(
+            ticks,
+            cell,
+            drift,
+            quotable,
+            dislocation,
+            inventory_skew,
+            max_inventory,
+            single_sided,
+            order_size,
+            requote_threshold,
+            unwind_half_spread_mult,
+        )
+        for cell in cells
+    ]
 
-        skew = -inventory * inventory_skew
-        center = tick.venue_mid + drift_skew_coef * drift_hat + skew
-        desired_bid = center - half_spread
-        desired_ask = center + half_spread
-
-        quote_bid = inventory < max_inventory
-        quote_ask = inventory > -max_inventory
-        if single_sided:
-            dislocation = tick.venue_mid - tick.reconstructed
-            quote_bid = quote_bid and dislocation < 0
-            quote_ask = quote_ask and dislocation > 0
-
-        # --- Bid side: manage live quote ---
-        if quote_bid:
-            if live_bid_price is None or abs(live_bid_price - desired_bid) > requote_threshold:
-                # Repost — pay latency. Queue: 0 if we're strictly inside best,
-                # else top-of-book depth scaled (we're behind existing resters).
-                live_bid_price = desired_bid
-                if tick.venue_bid is not None and live_bid_price > tick.venue_bid:
-                    live_bid_queue = 0.0
-                else:
-                    live_bid_queue = tick.top_bid_depth * queue_scale
-                live_bid_go_live_ts = tick.timestamp_ms + latency_ms
-                total_quotes_posted += 1
-            else:
-                total_quote_ms_bid += dt_ms
-        else:
-            live_bid_price = None
-
-        # --- Ask side: manage live quote ---
-        if quote_ask:
-            if live_ask_price is None or abs(live_ask_price - desired_ask) > requote_threshold:
-                live_ask_price = desired_ask
-                if tick.venue_ask is not None and live_ask_price < tick.venue_ask:
-                    live_ask_queue = 0.0
-                else:
-                    live_ask_queue = tick.top_ask_depth * queue_scale
-                live_ask_go_live_ts = tick.timestamp_ms + latency_ms
-                total_quotes_posted += 1
-            else:
-                total_quote_ms_ask += dt_ms
-        else:
-            live_ask_price = None
-
-        # --- Fill check ---
-        # A maker bid fills when (a) the book crosses us (venue_ask <= our bid),
-        # or (b) we're at-or-inside the best bid and enough sell flow arrived to
-        # drain the queue ahead of us. Symmetric for ask.
-        bid_fills = False
-        if (
-            live_bid_price is not None
-            and tick.timestamp_ms >= live_bid_go_live_ts
-            and inventory < max_inventory
-        ):
-            crossed = tick.venue_ask is not None and tick.venue_ask <= live_bid_price
-            at_or_inside = tick.venue_bid is None or live_bid_price >= tick.venue_bid
-            if crossed:
-                bid_fills = True
-            elif at_or_inside and tick.trade_sell_size > 0:
-                consumed = min(tick.trade_sell_size, live_bid_queue)
-                live_bid_queue -= consumed
-                remaining = tick.trade_sell_size - consumed
-                if remaining > 0 and live_bid_queue <= 0.0:
-                    bid_fills = True
-
-        ask_fills = False
-        if (
-            live_ask_price is not None
-            and tick.timestamp_ms >= live_ask_go_live_ts
-            and inventory > -max_inventory
-        ):
-            crossed = tick.venue_bid is not None and tick.venue_bid >= live_ask_price
-            at_or_inside = tick.venue_ask is None or live_ask_price <= tick.venue_ask
-            if crossed:
-                ask_fills = True
-            elif at_or_inside and tick.trade_buy_size > 0:
-                consumed = min(tick.trade_buy_size, live_ask_queue)
-                live_ask_queue -= consumed
-                remaining = tick.trade_buy_size - consumed
-                if remaining > 0 and live_ask_queue <= 0.0:
-                    ask_fills = True
-
-        if bid_fills:
-            fill_price = live_bid_price
-            fee = fee_rate * fill_price * order_size
-            cash -= fill_price * order_size + fee
-            inventory += order_size
-            fills.append(
-                Fill(tick.timestamp_ms, "buy", fill_price, tick.venue_mid, fee, drift_hat)
-            )
-            total_fills += 1
-            live_bid_price = None
-        if ask_fills:
-            fill_price = live_ask_price
-            fee = fee_rate * fill_price * order_size
-            cash += fill_price * order_size - fee
-            inventory -= order_size
-            fills.append(
-                Fill(tick.timestamp_ms, "sell", fill_price, tick.venue_mid, fee, drift_hat)
-            )
-            total_fills += 1
-            live_ask_price = None
 
-    last_mid = ticks[-1].venue_mid if ticks else 0.0
+def _simulate_cell(
+    ticks: MakerTicks,
+    cell: SweepCell,
+    drift: np.ndarray | None,
+    quotable: np.ndarray | None,
+    dislocation: np.ndarray | None,
+    inventory_skew: float,
+    max_inventory: float,
+    single_sided: bool,
+    order_size: float,
+    requote_threshold: float,
+    unwind_half_spread_mult: float,
+) -> tuple[list[Fill], float, dict[str, float]]:
+    half_spread = cell.half_spread
+    drift_hat = None
+    if cell.drift_skew_coef != 0.0 and drift is not None:
+        clipped = np.maximum(-half_spread, np.minimum(half_spread, drift))
+        drift_hat = np.where(np.isnan(drift), 0.0, clipped)
+
+    simulator = MakerFillSimulator(
+        MakerQuoteConfig(
+            half_spread=half_spread,
+            fee_bps=cell.fee_bps,
+            max_inventory=max_inventory,
+            order_size=order_size,
+            skew_coef=cell.drift_skew_coef,
+            inventory_skew=inventory_skew,
+            latency_ms=cell.latency_ms,
+            queue_scale=cell.queue_scale,
+            requote_threshold=requote_threshold,
+            single_sided=single_sided,
+        )
+    )
+    filled = simulator.run(ticks, drift_hat, quotable=quotable, dislocation=dislocation)
+
+    fills = [
+        Fill(ts, "buy" if side == BUY else "sell", price, mid, fee, hat)
+        for ts, side, price, mid, fee, hat in zip(
+            ticks.timestamp_ms[filled.index].tolist(),
+            filled.side.tolist(),
+            filled.price.tolist(),
+            ticks.venue_mid[filled.index].tolist(),
+            filled.fee.tolist(),
+            drift_hat[filled.index].tolist() if drift_hat is not None else [0.0] * len(filled),
+            strict=True,
+        )
+    ]
+    total_quotes_posted = simulator.quotes_posted
+    inventory = simulator.inventory
+    last_mid = float(ticks.venue_mid[-1]) if len(ticks) else 0.0
     unwind_cost = abs(inventory) * half_spread * unwind_half_spread_mult
-    mtm = cash + inventory * last_mid - unwind_cost
+    mtm = simulator.cash + inventory * last_mid - unwind_cost
 
     diagnostics = {
         "quotes_posted": float(total_quotes_posted),
-        "fill_rate": (total_fills / total_quotes_posted) if total_quotes_posted else 0.0,
-        "avg_quote_ms_bid": (total_quote_ms_bid / max(total_quotes_posted, 1)),
-        "avg_quote_ms_ask": (total_quote_ms_ask / max(total_quotes_posted, 1)),
+        "fill_rate": (len(fills) / total_quotes_posted) if total_quotes_posted else 0.0,
+        "avg_quote_ms_bid": (simulator.quote_ms_bid / max(total_quotes_posted, 1)),
+        "avg_quote_ms_ask": (simulator.quote_ms_ask / max(total_quotes_posted, 1)),
         "unwind_cost": unwind_cost,
         "final_inventory": inventory,
     }
-    if drift_hats:
-        arr = np.asarray(drift_hats)
-        print(
-            f"    drift_hat stats: n={len(arr)}  "
-            f"mean={arr.mean():+.4f}  std={arr.std():.4f}  "
-            f"p5={np.percentile(arr, 5):+.3f}  p95={np.percentile(arr, 95):+.3f}  "
-            f"max|={np.max(np.abs(arr)):.2f}"
-        )
     return fills, mtm, diagnostics
 
 
+def print_drift_stats(drift_hats: np.ndarray) -> None:
+    if len(drift_hats) == 0:
+        return
+    arr = np.asarray(drift_hats)
+    print(
+        f"    drift_hat stats: n={len(arr)}  "
+        f"mean={arr.mean():+.4f}  std={arr.std():.4f}  "
+        f"p5={np.percentile(arr, 5):+.3f}  p95={np.percentile(arr, 95):+.3f}  "
+        f"max|={np.max(np.abs(arr)):.2f}"
+    )
+
+
 def summarize(
     fills: list[Fill],
     mtm: float,
@@ -554,22 +695,21 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--half-spreads", default="0.5,1,2,5,10")
     parser.add_argument(
         "--fee-bps",
-        type=float,
         default=None,
-        help="override maker fee (bps); negative = rebate. Defaults to DEFAULT_FEE_BPS[venue].",
+        help="comma-separated maker fees to sweep (bps); negative = rebate, pass as "
+             "--fee-bps=-1,2. Defaults to DEFAULT_FEE_BPS[venue].",
     )
     parser.add_argument(
         "--latency-ms",
-        type=int,
-        default=50,
-        help="one-way latency: new quotes go live after this delay (0 disables)",
+        default="50",
+        help="comma-separated one-way latencies to sweep: new quotes go live after "
+             "this delay (0 disables)",
     )
     parser.add_argument(
         "--queue-scale",
-        type=float,
-        default=1.0,
-        help="multiply top-of-book depth by this to get queue-ahead size. "
-             "0 = you're always front-of-queue (optimistic).",
+        default="1.0",
+        help="comma-separated values to sweep; top-of-book depth is multiplied by "
+             "this to get queue-ahead size. 0 = you're always front-of-queue (optimistic).",
     )
     parser.add_argument(
         "--order-size",
@@ -610,6 +750,12 @@ def build_parser() -> argparse.ArgumentParser:
         "When set, bypasses the internal Kalman predictor and uses these "
         "pre-computed cross-venue+lagged Ridge predictions.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to spread grid cells over; results match a single process",
+    )
     return parser
 
 
@@ -661,56 +807,90 @@ def main() -> None:
             f"Q={np.diag(predictor_template.Q).round(6)}"
         )
 
-    fee_bps = (
-        args.fee_bps if args.fee_bps is not None else DEFAULT_FEE_BPS.get(args.venue, 0.0)
+    fee_bps_values = (
+        [float(x) for x in args.fee_bps.split(",") if x]
+        if args.fee_bps is not None
+        else [DEFAULT_FEE_BPS.get(args.venue, 0.0)]
     )
+    latencies = [int(x) for x in args.latency_ms.split(",") if x]
+    queue_scales = [float(x) for x in args.queue_scale.split(",") if x]
     print(
         f"venue={args.venue}  ticks={len(ticks)}  duration={hours*60:.1f} min  "
-        f"fee_bps={fee_bps:+.2f}  latency={args.latency_ms}ms  "
-        f"queue_scale={args.queue_scale}  order_size={args.order_size}  "
+        f"fee_bps={_axis(fee_bps_values, '{:+.2f}')}  "
+        f"latency={_axis(latencies, '{}ms')}  "
+        f"queue_scale={_axis(queue_scales, '{}')}  order_size={args.order_size}  "
         f"max_inv={args.max_inventory}  skew_coefs={skew_coefs}"
     )
-    for hs in half_spreads:
-        print(f"half_spread=${hs:.2f}")
-        for coef in skew_coefs:
-            predictor = None
-            if coef != 0.0 and predictor_template is not None:
-                predictor = DriftPredictor(
-                    beta=predictor_template.beta.copy(),
-                    P=predictor_template.P.copy(),
-                    Q=predictor_template.Q.copy(),
-                    r=predictor_template.r,
-                    mean=predictor_template.mean.copy(),
-                    std=predictor_template.std.copy(),
-                )
-            fills, mtm, diagnostics = simulate(
-                ticks,
-                hs,
-                fee_bps,
-                args.inventory_skew,
-                args.max_inventory,
-                args.max_basis_stddev,
-                args.single_sided,
-                coef,
-                predictor,
-                cal_end,
-                args.drift_horizon_ms,
-                args.latency_ms,
-                args.queue_scale,
-                args.order_size,
-                args.requote_threshold,
-                args.unwind_half_spread_mult,
-                external_predictions,
-            )
-            summarize(
-                fills,
-                mtm,
-                hours,
-                f"skew_coef={coef:+.2f}",
-                ticks,
-                args.drift_horizon_ms,
-                diagnostics,
-            )
+    cells = sweep_grid(half_spreads, skew_coefs, fee_bps_values, latencies, queue_scales)
+    # Quoting never feeds back into the predictor: run it once, not per cell.
+    drift = None
+    if needs_predictor:
+        drift = drift_path(
+            ticks, predictor_template, cal_end, args.drift_horizon_ms, external_predictions
+        )
+    results = run_sweep(
+        tick_columns(ticks),
+        cells,
+        drift,
+        args.workers,
+        inventory_skew=args.inventory_skew,
+        max_inventory=args.max_inventory,
+        max_basis_stddev=args.max_basis_stddev,
+        single_sided=args.single_sided,
+        order_size=args.order_size,
+        requote_threshold=args.requote_threshold,
+        unwind_half_spread_mult=args.unwind_half_spread_mult,
+    )
+
+    for i, (cell, (fills, mtm, diagnostics)) in enumerate(zip(cells, results, strict=True)):
+        if i == 0 or cell.half_spread != cells[i - 1].half_spread:
+            print(f"half_spread=${cell.half_spread:.2f}")
+        if drift is not None and cell.drift_skew_coef != 0.0:
+            print_drift_stats(clipped_drift_hats(drift, cell.half_spread))
+        label = f"skew_coef={cell.drift_skew_coef:+.2f}"
+        if len(fee_bps_values) > 1:
+            label += f"  fee_bps={cell.fee_bps:+.2f}"
+        if len(latencies) > 1:
+            label += f"  latency={cell.latency_ms}ms"
+        if len(queue_scales) > 1:
+            label += f"  queue_scale={cell.queue_scale}"
+        summarize(
+            fills,
+            mtm,
+            hours,
+            label,
+            ticks,
+            args.drift_horizon_ms,
+            diagnostics,
+        )
+
+
+def _axis(values: list, fmt: str) -> str:
+    if len(values) == 1:
+        return fmt.format(values[0])
+    return "[" + ",".join(fmt.format(v) for v in values) + "]"
+
+
+def run_sweep(
+    columns: TickColumns,
+    cells: list[SweepCell],
+    drift: np.ndarray | None,
+    workers: int,
+    **params: Any,
+) -> list[tuple[list[Fill], float, dict[str, float]]]:
+    """``simulate_cells`` over the grid, dealt round-robin to ``workers`` processes.
+
+    Results come back in cell order whatever the worker count.
+    """
+    if workers <= 1 or len(cells) <= 1:
+        return simulate_cells(columns, cells, drift, **params)
+    chunks = deal_round_robin(cells, workers)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as executor:
+        futures = [
+            executor.submit(simulate_cells, columns, chunk, drift, **params) for chunk in chunks
+        ]
+        return collect_round_robin([future.result() for future in futures])
 
 
 if __name__ == "__main__":
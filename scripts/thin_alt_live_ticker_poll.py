@@ -14,30 +14,50 @@ best bid/ask. This lets us compute:
 Output: rows to data/altscan_cache/ticker_poll_<ts>.jsonl, plus a summary
 table at exit.
 
-The script is deliberately dumb: sequential GETs per tick. At 5s interval
-and 5 symbols across 3 venues that's 15 req per tick (~3 req/s per venue),
-comfortably under public rate limits.
+Each tick fires every venue request at once over kept-alive connections,
+so quotes from different venues are taken within the same few hundred ms
+rather than seconds apart. Kraken and OKX are batched into one request per
+tick (Kraken takes a pair list; OKX serves all spot tickers together);
+Coinbase has no batch ticker, so it gets one request per symbol, paced by
+the client's per-host rate budget. Every row records when its request was
+sent and its response received. Ticks run on a fixed grid: a tick that
+overruns the interval skips the missed slots instead of pushing later
+ticks back.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import signal
 import sys
 import time
-import urllib.parse
-import urllib.request
 from collections import defaultdict
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.fetch import (
+    DEFAULT_HOST_RATES,
+    AsyncHttpClient,
+    HttpError,
+    ResponseCache,
+    TickGrid,
+    budget_span_s,
+)
+
 CB_PRODUCTS_URL = "https://api.exchange.coinbase.com/products"
 CB_TICKER_URL = "https://api.exchange.coinbase.com/products/{id}/ticker"
 KR_ASSETPAIRS_URL = "https://api.kraken.com/0/public/AssetPairs"
 KR_TICKER_URL = "https://api.kraken.com/0/public/Ticker"
-OKX_TICKER_URL = "https://www.okx.com/api/v5/market/ticker"
+OKX_INSTR_URL = "https://www.okx.com/api/v5/public/instruments"
+OKX_TICKERS_URL = "https://www.okx.com/api/v5/market/tickers"
 
 CACHE_DIR = Path("data/altscan_cache")
 
@@ -47,19 +67,32 @@ KR_TAKER_BPS = 25.0   # Kraken pro default; volume tiers bring it down
 OKX_TAKER_BPS = 10.0  # default taker
 
 
-def http_get(url: str, params: dict | None = None, timeout: int = 10) -> dict | list:
-    if params:
-        url = f"{url}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers={"User-Agent": "icarus-altscan/0.1"})
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read())
+# (bid, ask, sent_ms, received_ms)
+type Quote = tuple[float, float, int, int]
+
 
+async def _cached_json(
+    client: AsyncHttpClient, cache: ResponseCache, url: str, params: dict | None = None
+) -> Any:
+    # Same cache entries as thin_alt_spread_scan.py's stage 1.
+    request = {"url": url, "params": params}
+    data = cache.get("lists", request)
+    if data is None:
+        data = await client.get_json(url, params)
+        cache.put("lists", request, data)
+    return data
 
-def load_ids_for_bases(bases: list[str]) -> dict[str, dict[str, str]]:
-    """Return {base: {venue: inst_id}} using cached product-list JSON from stage-1."""
-    cb_raw = json.loads((CACHE_DIR / "cb_products.json").read_text())
-    kr_raw = json.loads((CACHE_DIR / "kr_assetpairs.json").read_text())
-    okx_raw = json.loads((CACHE_DIR / "okx_instruments.json").read_text())
+
+async def load_ids_for_bases(
+    client: AsyncHttpClient, bases: list[str]
+) -> dict[str, dict[str, str]]:
+    """Return {base: {venue: inst_id}} from the stage-1 product lists (fetched if not cached)."""
+    cache = ResponseCache(CACHE_DIR)
+    cb_raw, kr_raw, okx_raw = await asyncio.gather(
+        _cached_json(client, cache, CB_PRODUCTS_URL),
+        _cached_json(client, cache, KR_ASSETPAIRS_URL),
+        _cached_json(client, cache, OKX_INSTR_URL, {"instType": "SPOT"}),
+    )
 
     out: dict[str, dict[str, str]] = {b: {} for b in bases}
     bases_up = {b.upper() for b in bases}
@@ -129,59 +162,204 @@ def load_ids_for_bases(bases: list[str]) -> dict[str, dict[str, str]]:
     return {b: v for b, v in out.items() if all(k in v for k in ("coinbase", "kraken", "okx"))}
 
 
-def poll_coinbase(inst_id: str) -> tuple[float, float] | None:
+async def poll_coinbase(client: AsyncHttpClient, inst_id: str) -> Quote | None:
     try:
-        r = http_get(CB_TICKER_URL.format(id=inst_id))
-    except Exception as e:
+        resp = await client.request("GET", CB_TICKER_URL.format(id=inst_id))
+        r = resp.json()
+        return (float(r["bid"]), float(r["ask"]),
+                resp.sent_timestamp_ms, resp.received_timestamp_ms)
+    except (HttpError, OSError) as e:
         print(f"  cb {inst_id}: {e}", file=sys.stderr)
-        return None
-    try:
-        return float(r["bid"]), float(r["ask"])
     except (KeyError, ValueError, TypeError):
-        return None
+        pass
+    return None
 
 
-def poll_kraken(pair_id: str) -> tuple[float, float] | None:
+async def poll_kraken(client: AsyncHttpClient, pair_ids: list[str]) -> dict[str, Quote]:
+    """One Ticker request for every pair; keyed by the AssetPairs key."""
     try:
-        r = http_get(KR_TICKER_URL, {"pair": pair_id})
-    except Exception as e:
-        print(f"  kr {pair_id}: {e}", file=sys.stderr)
-        return None
-    res = r.get("result", {}) if isinstance(r, dict) else {}
-    for _, v in res.items():
+        resp = await client.request("GET", KR_TICKER_URL, params={"pair": ",".join(pair_ids)})
+        r = resp.json()
+    except (HttpError, OSError, ValueError) as e:
+        print(f"  kr ticker: {e}", file=sys.stderr)
+        return {}
+    if r.get("error"):
+        print(f"  kr ticker: {r['error']}", file=sys.stderr)
+    out: dict[str, Quote] = {}
+    for pair_id, v in r.get("result", {}).items():
         try:
-            bid = float(v["b"][0])
-            ask = float(v["a"][0])
-            return bid, ask
+            out[pair_id] = (float(v["b"][0]), float(v["a"][0]),
+                            resp.sent_timestamp_ms, resp.received_timestamp_ms)
         except (KeyError, ValueError, TypeError, IndexError):
-            return None
-    return None
+            continue
+    return out
 
 
-def poll_okx(inst_id: str) -> tuple[float, float] | None:
-    try:
-        r = http_get(OKX_TICKER_URL, {"instId": inst_id})
-    except Exception as e:
-        print(f"  okx {inst_id}: {e}", file=sys.stderr)
-        return None
-    data = r.get("data", []) if isinstance(r, dict) else []
-    if not data:
-        return None
+async def poll_okx(client: AsyncHttpClient, inst_ids: set[str]) -> dict[str, Quote]:
+    """All OKX spot tickers in one request, filtered to ``inst_ids``."""
     try:
-        return float(data[0]["bidPx"]), float(data[0]["askPx"])
-    except (KeyError, ValueError, TypeError):
-        return None
-
-
-def mid(ba: tuple[float, float] | None) -> float | None:
+        resp = await client.request("GET", OKX_TICKERS_URL, params={"instType": "SPOT"})
+        r = resp.json()
+    except (HttpError, OSError, ValueError) as e:
+        print(f"  okx tickers: {e}", file=sys.stderr)
+        return {}
+    out: dict[str, Quote] = {}
+    for d in r.get("data", []):
+        if d.get("instId") not in inst_ids:
+            continue
+        try:
+            out[d["instId"]] = (float(d["bidPx"]), float(d["askPx"]),
+                                resp.sent_timestamp_ms, resp.received_timestamp_ms)
+        except (KeyError, ValueError, TypeError):
+            continue
+    return out
+
+
+async def poll_tick(
+    client: AsyncHttpClient, ids: dict[str, dict[str, str]], usdt_usd_id: str
+) -> tuple[Quote | None, dict[str, dict[str, Quote]]]:
+    """Every venue request for one tick, concurrently.
+
+    Returns the USDT/USD quote and {base: {venue: quote}}.
+    """
+    cb_ids = [usdt_usd_id] + [v["coinbase"] for v in ids.values()]
+    cb_quotes, kr_quotes, okx_quotes = await asyncio.gather(
+        asyncio.gather(*(poll_coinbase(client, i) for i in cb_ids)),
+        poll_kraken(client, [v["kraken"] for v in ids.values()]),
+        poll_okx(client, {v["okx"] for v in ids.values()}),
+    )
+    per_base: dict[str, dict[str, Quote]] = {}
+    for (base, venue_ids), cb_q in zip(ids.items(), cb_quotes[1:], strict=True):
+        quotes = {"coinbase": cb_q,
+                  "kraken": kr_quotes.get(venue_ids["kraken"]),
+                  "okx": okx_quotes.get(venue_ids["okx"])}
+        per_base[base] = {v: q for v, q in quotes.items() if q is not None}
+    return cb_quotes[0], per_base
+
+
+def mid(ba: Quote | None) -> float | None:
     if ba is None:
         return None
-    b, a = ba
+    b, a = ba[0], ba[1]
     if b <= 0 or a <= 0:
         return None
     return 0.5 * (b + a)
 
 
+async def capture(
+    bases: list[str], out_path: Path, duration_s: float, interval_s: float
+) -> tuple[
+    dict[str, dict[str, str]],
+    list[tuple[float, float]],
+    dict[tuple[str, str], list[tuple[float, float, float]]],
+]:
+    """Poll until ``duration_s`` elapses or SIGINT; returns (ids, usdt_series, bas)."""
+    # A quote that misses its tick is stale, so no retries; the next tick
+    # is the retry.
+    async with AsyncHttpClient(timeout_s=max(interval_s, 1.0), retries=0,
+                               headers={"User-Agent": "icarus-altscan/0.1"}) as client:
+        ids = await load_ids_for_bases(client, bases)
+        if not ids:
+            raise SystemExit("no symbols resolved across all 3 venues")
+        print(f"resolved {len(ids)} / {len(bases)} symbols with ids on all venues:")
+        for b, v in ids.items():
+            print(f"  {b}: cb={v['coinbase']}  kr={v['kraken']}  okx={v['okx']} ({v['okx_quote']})")
+
+        # USDT/USD reference from Coinbase
+        usdt_usd_id = "USDT-USD"
+
+        # Coinbase is the only per-symbol venue; past its rate budget the
+        # grid keeps its phase but drops slots.
+        cb_host = "api.exchange.coinbase.com"
+        cb_rate, _ = DEFAULT_HOST_RATES[cb_host]
+        cb_tick_s = budget_span_s(len(ids) + 1, cb_host)
+        if cb_tick_s > interval_s:
+            print(f"WARN: {len(ids) + 1} coinbase tickers per tick need ~{cb_tick_s:.1f}s "
+                  f"at {cb_rate:.0f} req/s; ticks will skip slots at {interval_s}s interval",
+                  file=sys.stderr)
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fh = out_path.open("w")
+        print(f"writing {out_path}")
+
+        stop = asyncio.Event()
+        def _handle() -> None:
+            stop.set()
+            print("\nstopping on signal...")
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, _handle)
+
+        start_ts = time.time()
+        end_ts = start_ts + duration_s
+        tick_count = 0
+        grid = TickGrid(start_ts, interval_s)
+
+        # Per-(symbol,venue) (ts, bid, ask) series
+        bas: dict[tuple[str, str], list[tuple[float, float, float]]] = defaultdict(list)
+        usdt_series: list[tuple[float, float]] = []  # (ts, usdt_usd_mid)
+        latency_ms: dict[str, list[int]] = defaultdict(list)
+        tick_spans_ms: list[float] = []
+
+        def write(tick_ts: float, venue: str, symbol: str, q: Quote) -> None:
+            latency_ms[venue].append(q[3] - q[2])
+            fh.write(json.dumps({"ts": tick_ts, "venue": venue, "symbol": symbol,
+                                 "bid": q[0], "ask": q[1],
+                                 "sent_ms": q[2], "received_ms": q[3]}) + "\n")
+
+        try:
+            while not stop.is_set() and time.time() < end_ts:
+                tick_start = grid.slot_start_s
+                usdt_q, per_base = await poll_tick(client, ids, usdt_usd_id)
+
+                m = mid(usdt_q)
+                if usdt_q is not None and m is not None:
+                    usdt_series.append((tick_start, m))
+                    write(tick_start, "coinbase", "USDT", usdt_q)
+
+                # Spread of request midpoints across every quote this tick:
+                # how far from simultaneous the snapshot really is.
+                midpoints = [0.5 * (q[2] + q[3]) for quotes in per_base.values()
+                             for q in quotes.values()]
+                if midpoints:
+                    tick_spans_ms.append(max(midpoints) - min(midpoints))
+
+                for base, quotes in per_base.items():
+                    for venue, q in quotes.items():
+                        if mid(q) is None:
+                            continue
+                        bas[(base, venue)].append((tick_start, q[0], q[1]))
+                        write(tick_start, venue, base, q)
+
+                fh.flush()
+                tick_count += 1
+                elapsed = time.time() - tick_start
+                if tick_count % 6 == 0:
+                    print(f"  tick {tick_count}  ({int(time.time() - start_ts)}s elapsed, "
+                          f"last tick took {elapsed:.1f}s)")
+                remaining = grid.advance(time.time())
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(stop.wait(), remaining)
+                    except TimeoutError:
+                        pass
+        finally:
+            fh.close()
+
+    print(f"\ncaptured {tick_count} ticks over {int(time.time() - start_ts)}s "
+          f"({grid.skipped} slots skipped)")
+    print(f"output: {out_path}")
+
+    print("\n=== request timing (ms) ===")
+    for venue, lat in sorted(latency_ms.items()):
+        arr = np.asarray(lat, dtype=float)
+        print(f"  {venue:<10} round trip median={float(np.median(arr)):.0f}  "
+              f"p95={float(np.percentile(arr, 95)):.0f}")
+    if tick_spans_ms:
+        arr = np.asarray(tick_spans_ms)
+        print(f"  quote spread within a tick  median={float(np.median(arr)):.0f}  "
+              f"p95={float(np.percentile(arr, 95)):.0f}")
+    return ids, usdt_series, bas
+
+
 def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--symbols", type=str,
@@ -192,84 +370,15 @@ def main() -> None:
     p.add_argument("--output", type=Path, default=None,
                    help="output JSONL; default data/altscan_cache/ticker_poll_<ts>.jsonl")
     args = p.parse_args()
+    if args.interval_seconds <= 0:
+        raise SystemExit("--interval-seconds must be positive")
 
     bases = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
     print(f"symbols: {bases}")
 
-    ids = load_ids_for_bases(bases)
-    if not ids:
-        raise SystemExit("no symbols resolved across all 3 venues")
-    print(f"resolved {len(ids)} / {len(bases)} symbols with ids on all venues:")
-    for b, v in ids.items():
-        print(f"  {b}: cb={v['coinbase']}  kr={v['kraken']}  okx={v['okx']} ({v['okx_quote']})")
-
-    # USDT/USD reference from Coinbase
-    usdt_usd_id = "USDT-USD"
-
     out_path = args.output or CACHE_DIR / f"ticker_poll_{int(time.time())}.jsonl"
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    fh = out_path.open("w")
-    print(f"writing {out_path}")
-
-    stop_flag = {"stop": False}
-    def _handle(signum, frame):
-        stop_flag["stop"] = True
-        print("\nstopping on signal...")
-    signal.signal(signal.SIGINT, _handle)
-
-    start_ts = time.time()
-    end_ts = start_ts + args.duration_minutes * 60
-    tick_count = 0
-
-    # Per-(symbol,venue) mid time series
-    mids: dict[tuple[str, str], list[tuple[float, float]]] = defaultdict(list)  # (ts, mid)
-    bas:  dict[tuple[str, str], list[tuple[float, float, float]]] = defaultdict(list)  # (ts, bid, ask)
-    usdt_series: list[tuple[float, float]] = []  # (ts, usdt_usd_mid)
-
-    try:
-        while not stop_flag["stop"] and time.time() < end_ts:
-            tick_start = time.time()
-            ts_iso = int(tick_start)
-
-            # USDT/USD reference
-            ba = poll_coinbase(usdt_usd_id)
-            m = mid(ba)
-            if m is not None:
-                usdt_series.append((tick_start, m))
-                fh.write(json.dumps({"ts": tick_start, "venue": "coinbase",
-                                     "symbol": "USDT", "bid": ba[0], "ask": ba[1]}) + "\n")
-
-            for base, venue_ids in ids.items():
-                # Sequential polls - cheap enough
-                cb_ba = poll_coinbase(venue_ids["coinbase"])
-                kr_ba = poll_kraken(venue_ids["kraken"])
-                okx_ba = poll_okx(venue_ids["okx"])
-
-                for venue, ba_val in [("coinbase", cb_ba), ("kraken", kr_ba), ("okx", okx_ba)]:
-                    if ba_val is None:
-                        continue
-                    m2 = mid(ba_val)
-                    if m2 is None:
-                        continue
-                    mids[(base, venue)].append((tick_start, m2))
-                    bas[(base, venue)].append((tick_start, ba_val[0], ba_val[1]))
-                    fh.write(json.dumps({"ts": tick_start, "venue": venue,
-                                         "symbol": base, "bid": ba_val[0], "ask": ba_val[1]}) + "\n")
-
-            fh.flush()
-            tick_count += 1
-            elapsed = time.time() - tick_start
-            remaining = args.interval_seconds - elapsed
-            if tick_count % 6 == 0:
-                print(f"  tick {tick_count}  ({int(time.time() - start_ts)}s elapsed, "
-                      f"last tick took {elapsed:.1f}s)")
-            if remaining > 0 and not stop_flag["stop"]:
-                time.sleep(remaining)
-    finally:
-        fh.close()
-
-    print(f"\ncaptured {tick_count} ticks over {int(time.time() - start_ts)}s")
-    print(f"output: {out_path}")
+    ids, usdt_series, bas = asyncio.run(
+        capture(bases, out_path, args.duration_minutes * 60, args.interval_seconds))
 
     # ----- analysis -----
 
@@ -26,63 +26,58 @@ Caches both stages to data/altscan_cache/ to be nice to public APIs.
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
 import sys
 import time
-import urllib.parse
-import urllib.request
-from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.fetch import (
+    AsyncHttpClient,
+    HttpError,
+    ResponseCache,
+    coinbase_candles,
+    kraken_ohlc,
+    okx_history_candles,
+)
+
 CB_PRODUCTS_URL = "https://api.exchange.coinbase.com/products"
-CB_CANDLES_URL = "https://api.exchange.coinbase.com/products/{product}/candles"
 KR_ASSETPAIRS_URL = "https://api.kraken.com/0/public/AssetPairs"
-KR_OHLC_URL = "https://api.kraken.com/0/public/OHLC"
 OKX_INSTR_URL = "https://www.okx.com/api/v5/public/instruments"
-OKX_CANDLES_URL = "https://www.okx.com/api/v5/market/history-candles"
 
 # Exclude from the "thin-alt" universe: these are known tightly-arbed.
 MAJORS = {"BTC", "ETH", "SOL", "USDT", "USDC", "DAI", "BUSD", "TUSD", "USD", "EUR", "GBP"}
 
 CACHE_DIR = Path("data/altscan_cache")
+CACHE_TTL_S = 3600
 
 
 def _user_agent_headers() -> dict:
     return {"User-Agent": "icarus-altscan/0.1"}
 
 
-def http_get(url: str, params: dict | None = None, timeout: int = 30) -> dict | list:
-    if params:
-        url = f"{url}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers=_user_agent_headers())
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read())
-
-
-def _cache_path(name: str) -> Path:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    return CACHE_DIR / name
-
-
-def _cached_json(name: str, fetch_fn, ttl_sec: int = 3600) -> dict | list:
-    path = _cache_path(name)
-    if path.exists() and (time.time() - path.stat().st_mtime) < ttl_sec:
-        return json.loads(path.read_text())
-    data = fetch_fn()
-    path.write_text(json.dumps(data))
+async def _cached_json(
+    client: AsyncHttpClient, cache: ResponseCache, url: str, params: dict | None = None
+) -> Any:
+    request = {"url": url, "params": params}
+    data = cache.get("lists", request, max_age_s=CACHE_TTL_S)
+    if data is None:
+        data = await client.get_json(url, params)
+        cache.put("lists", request, data)
     return data
 
 
 # ----- Stage 1: product lists -----
 
-def fetch_coinbase_products() -> list[dict]:
+async def fetch_coinbase_products(client: AsyncHttpClient, cache: ResponseCache) -> list[dict]:
     """Returns list of {base, quote, id, online, volume_24h_usd_est}."""
-    def _fetch():
-        raw = http_get(CB_PRODUCTS_URL)
-        return raw
-    raw = _cached_json("cb_products.json", _fetch)
+    raw = await _cached_json(client, cache, CB_PRODUCTS_URL)
     out = []
     for p in raw:
         if p.get("trading_disabled") or p.get("status") != "online":
@@ -101,10 +96,8 @@ def fetch_coinbase_products() -> list[dict]:
     return out
 
 
-def fetch_kraken_pairs() -> list[dict]:
-    def _fetch():
-        return http_get(KR_ASSETPAIRS_URL)
-    raw = _cached_json("kr_assetpairs.json", _fetch)
+async def fetch_kraken_pairs(client: AsyncHttpClient, cache: ResponseCache) -> list[dict]:
+    raw = await _cached_json(client, cache, KR_ASSETPAIRS_URL)
     result = raw.get("result", {})
     out = []
     # Kraken uses legacy altnames like XBT for BTC, XDG for DOGE, etc.
@@ -134,10 +127,10 @@ def fetch_kraken_pairs() -> list[dict]:
     return out
 
 
-def fetch_okx_spot_instruments() -> list[dict]:
-    def _fetch():
-        return http_get(OKX_INSTR_URL, {"instType": "SPOT"})
-    raw = _cached_json("okx_instruments.json", _fetch)
+async def fetch_okx_spot_instruments(
+    client: AsyncHttpClient, cache: ResponseCache
+) -> list[dict]:
+    raw = await _cached_json(client, cache, OKX_INSTR_URL, {"instType": "SPOT"})
     data = raw.get("data", [])
     out = []
     for i in data:
@@ -188,99 +181,111 @@ def compute_overlap(
     }
 
 
+async def fetch_product_lists() -> tuple[list[dict], list[dict], list[dict]]:
+    cache = ResponseCache(CACHE_DIR)
+    async with AsyncHttpClient(headers=_user_agent_headers()) as client:
+        return await asyncio.gather(
+            fetch_coinbase_products(client, cache),
+            fetch_kraken_pairs(client, cache),
+            fetch_okx_spot_instruments(client, cache),
+        )
+
+
 # ----- Stage 2: hourly candles -----
 
-def fetch_coinbase_hourly(product: str, start_ms: int, end_ms: int) -> list[list]:
+async def fetch_coinbase_hourly(
+    client: AsyncHttpClient, pages: ResponseCache, product: str, start_ms: int, end_ms: int
+) -> list[list]:
     """Returns list of [time_s, low, high, open, close, volume] ascending."""
-    out: list[list] = []
-    cursor = start_ms // 1000
-    end_s = end_ms // 1000
-    step_s = 300 * 3600
-    url = CB_CANDLES_URL.format(product=product)
-    while cursor < end_s:
-        page_end = min(cursor + step_s, end_s)
-        params = {
-            "granularity": 3600,
-            "start": datetime.fromtimestamp(cursor, UTC).isoformat(),
-            "end": datetime.fromtimestamp(page_end, UTC).isoformat(),
-        }
-        try:
-            batch = http_get(url, params)
-        except Exception as e:
-            print(f"  cb {product} fail: {e}", file=sys.stderr)
-            cursor = page_end
-            time.sleep(1.0)
-            continue
-        if isinstance(batch, list):
-            out.extend(batch)
-        cursor = page_end
-        time.sleep(0.2)
-    seen: dict[int, list] = {int(c[0]): c for c in out}
-    return [seen[t] for t in sorted(seen)]
+    return await coinbase_candles(
+        client, product, 3600, start_ms // 1000, end_ms // 1000, cache=pages
+    )
 
 
-def fetch_kraken_hourly(pair_id: str, start_ms: int, end_ms: int) -> list[list]:
+async def fetch_kraken_hourly(
+    client: AsyncHttpClient, pair_id: str, start_ms: int, end_ms: int
+) -> list[list]:
     """Kraken OHLC API returns at most ~720 bars (most recent). We accept that
     and just take whatever fits in window. Returns [[time_s, o, h, l, c, vwap, volume, count]]."""
-    since_s = start_ms // 1000
-    try:
-        raw = http_get(KR_OHLC_URL, {"pair": pair_id, "interval": 60, "since": since_s})
-    except Exception as e:
-        print(f"  kr {pair_id} fail: {e}", file=sys.stderr)
-        return []
-    time.sleep(0.3)
-    err = raw.get("error", []) if isinstance(raw, dict) else []
-    if err:
-        print(f"  kr {pair_id} err: {err}", file=sys.stderr)
-        return []
-    result = raw.get("result", {})
-    # result has key pair_id (or similar) + "last"
-    rows: list[list] = []
-    for k, v in result.items():
-        if k == "last":
-            continue
-        rows = v
-        break
-    end_s = end_ms // 1000
+    rows = await kraken_ohlc(client, pair_id, 60, start_ms // 1000, end_ms // 1000)
     return [[int(r[0]), float(r[1]), float(r[2]), float(r[3]),
              float(r[4]), float(r[5]), float(r[6]), int(r[7])]
-            for r in rows if int(r[0]) <= end_s]
-
-
-def fetch_okx_hourly(inst_id: str, start_ms: int, end_ms: int) -> list[list]:
-    """OKX history-candles: returns list of [ts_ms, o, h, l, c, vol, volCcy, volCcyQuote, confirm]
-    in DESCENDING order. Paginate via `after` (exclusive upper bound ts_ms).
-    Limit 100 per request for history-candles endpoint.
+            for r in rows]
+
+
+async def fetch_okx_hourly(
+    client: AsyncHttpClient, pages: ResponseCache, inst_id: str, start_ms: int, end_ms: int
+) -> list[list]:
+    """OKX history-candles as [time_s, o, h, l, c, vol] ascending."""
+    rows = await okx_history_candles(client, inst_id, "1H", start_ms, end_ms, cache=pages)
+    return [[int(r[0]) // 1000, float(r[1]), float(r[2]), float(r[3]),
+             float(r[4]), float(r[5])]
+            for r in rows]
+
+
+async def fetch_base_candles(
+    client: AsyncHttpClient,
+    cache: ResponseCache,
+    base: str,
+    venues: dict[str, dict],
+    start_ms: int,
+    end_ms: int,
+    days: int,
+) -> tuple[dict[str, list[list]], bool]:
+    """Hourly candles for one base from all three venues concurrently.
+
+    Returns (candles_per_venue, from_cache). A venue that fails is reported
+    and comes back empty, so the base is skipped downstream.
     """
-    out: list[list] = []
-    cursor = end_ms
-    while cursor > start_ms:
+    request = {"base": base, "days": days}
+    cached = cache.get("candles", request, max_age_s=CACHE_TTL_S)
+    if cached is not None:
+        return cached, True
+    pages = ResponseCache(cache.root / "pages")
+
+    async def venue(name: str, fetch: Any) -> list[list]:
         try:
-            raw = http_get(OKX_CANDLES_URL, {
-                "instId": inst_id, "bar": "1H",
-                "after": str(cursor), "limit": "100",
-            })
-        except Exception as e:
-            print(f"  okx {inst_id} fail: {e}", file=sys.stderr)
-            break
-        time.sleep(0.15)
-        batch = raw.get("data", []) if isinstance(raw, dict) else []
-        if not batch:
-            break
-        for r in batch:
-            ts = int(r[0])
-            if ts < start_ms:
-                continue
-            out.append([ts // 1000, float(r[1]), float(r[2]), float(r[3]),
-                        float(r[4]), float(r[5])])
-        # advance: the oldest ts in batch becomes the next `after`
-        oldest = min(int(r[0]) for r in batch)
-        if oldest >= cursor:
-            break
-        cursor = oldest
-    # dedupe + ascending
-    seen: dict[int, list] = {int(c[0]): c for c in out}
-    return [seen[t] for t in sorted(seen)]
+            rows: list[list] = await fetch
+            return rows
+        except (HttpError, RuntimeError, OSError) as e:
+            print(f"  {name} {venues[name]['id']} fail: {e}", file=sys.stderr)
+            return []
+
+    cb, kr, okx = await asyncio.gather(
+        venue("coinbase", fetch_coinbase_hourly(
+            client, pages, venues["coinbase"]["id"], start_ms, end_ms)),
+        venue("kraken", fetch_kraken_hourly(
+            client, venues["kraken"]["id"], start_ms, end_ms)),
+        venue("okx", fetch_okx_hourly(
+            client, pages, venues["okx"]["id"], start_ms, end_ms)),
+    )
+    candles_per_venue = {"coinbase": cb, "kraken": kr, "okx": okx}
+    cache.put("candles", request, candles_per_venue)
+    return candles_per_venue, False
+
+
+async def fetch_all_candles(
+    overlap: dict[str, dict[str, dict]], start_ms: int, end_ms: int, days: int
+) -> dict[str, dict[str, list[list]]]:
+    """Candles for every base, all bases in flight at once.
+
+    Per-host rate budgets in the client keep each venue within its public
+    limits; bases are reported as they complete.
+    """
+    cache = ResponseCache(CACHE_DIR)
+    done = 0
+
+    async def one(base: str) -> dict[str, list[list]]:
+        nonlocal done
+        candles, from_cache = await fetch_base_candles(
+            client, cache, base, overlap[base], start_ms, end_ms, days)
+        done += 1
+        print(f"  [{done}/{len(overlap)}] {base}" + ("  (cached)" if from_cache else ""))
+        return candles
+
+    async with AsyncHttpClient(headers=_user_agent_headers()) as client:
+        results = await asyncio.gather(*(one(base) for base in overlap))
+    return dict(zip(overlap, results, strict=True))
 
 
 # ----- Stage 3: metrics -----
@@ -383,9 +388,7 @@ def main() -> None:
     args = p.parse_args()
 
     print("fetching venue product lists...")
-    cb = fetch_coinbase_products()
-    kr = fetch_kraken_pairs()
-    okx = fetch_okx_spot_instruments()
+    cb, kr, okx = asyncio.run(fetch_product_lists())
     print(f"  coinbase: {len(cb)} usd-quoted products")
     print(f"  kraken:   {len(kr)} usd-quoted pairs")
     print(f"  okx:      {len(okx)} usd-quoted instruments")
@@ -411,26 +414,13 @@ def main() -> None:
     end_ms = int(time.time() * 1000)
     start_ms = end_ms - args.days * 86_400_000
 
+    print(f"\nfetching {args.days}d hourly candles for {len(overlap)} bases...")
+    candles_by_base = asyncio.run(fetch_all_candles(overlap, start_ms, end_ms, args.days))
+
     rows: list[dict] = []
     for i, (base, venues) in enumerate(overlap.items(), 1):
         print(f"\n[{i}/{len(overlap)}] {base}")
-        cache_key = f"candles_{base}_{args.days}d.json"
-        cache_path = _cache_path(cache_key)
-        if cache_path.exists() and (time.time() - cache_path.stat().st_mtime) < 3600:
-            candles_per_venue = json.loads(cache_path.read_text())
-            print("  (cached)")
-        else:
-            candles_per_venue = {}
-            print(f"  coinbase {venues['coinbase']['id']}...")
-            candles_per_venue["coinbase"] = fetch_coinbase_hourly(
-                venues["coinbase"]["id"], start_ms, end_ms)
-            print(f"  kraken   {venues['kraken']['id']}...")
-            candles_per_venue["kraken"] = fetch_kraken_hourly(
-                venues["kraken"]["id"], start_ms, end_ms)
-            print(f"  okx      {venues['okx']['id']}...")
-            candles_per_venue["okx"] = fetch_okx_hourly(
-                venues["okx"]["id"], start_ms, end_ms)
-            cache_path.write_text(json.dumps(candles_per_venue))
+        candles_per_venue = candles_by_base[base]
 
         mids = {v: _mids_from_candles(c, v) for v, c in candles_per_venue.items()}
         vols = {v: _volumes_from_candles(c, v) for v, c in candles_per_venue.items()}
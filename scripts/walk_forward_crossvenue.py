@@ -16,12 +16,15 @@ Targets:
     y = mid_V(t + horizon) - mid_V(t)   (drift, for R² and directional accuracy)
 
 Horizon is configurable so we can sweep 500ms, 2s, 5s and see where signal lives.
+--workers spreads the folds of every venue over a process pool; the output is
+identical to a serial run.
 """
 
 from __future__ import annotations
 
 import argparse
 import sqlite3
+import sys
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
@@ -29,6 +32,12 @@ from pathlib import Path
 import numpy as np
 from sklearn.linear_model import Ridge
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.features import Fold, WalkForwardJob, WalkForwardPool, make_folds
+
 
 OWN_FEATURE_NAMES = (
     "microprice-mid",
@@ -49,12 +58,12 @@ class VenueSeries:
 
 
 @dataclass(frozen=True, slots=True)
-class Fold:
-    fold_index: int
-    train_start: int
-    train_end: int
-    test_start: int
-    test_end: int
+class VenueEvaluation:
+    venue: str
+    x: np.ndarray
+    y: np.ndarray
+    feature_names: list[str]
+    folds: list[Fold]
 
 
 def load_series(db_paths: list[Path]) -> dict[str, VenueSeries]:
@@ -191,25 +200,6 @@ def build_crossvenue_dataset(
     return np.asarray(xs), np.asarray(ys), feature_names
 
 
-def make_folds(n: int, train_size: int, test_size: int, step: int) -> list[Fold]:
-    folds: list[Fold] = []
-    start = 0
-    idx = 0
-    while start + train_size + test_size <= n:
-        folds.append(
-            Fold(
-                fold_index=idx,
-                train_start=start,
-                train_end=start + train_size,
-                test_start=start + train_size,
-                test_end=start + train_size + test_size,
-            )
-        )
-        start += step
-        idx += 1
-    return folds
-
-
 def run_fold(
     x_train: np.ndarray, y_train: np.ndarray, x_test: np.ndarray, y_test: np.ndarray,
     ridge_alpha: float,
@@ -235,7 +225,7 @@ def run_fold(
     return {"r2": r2, "dir": dir_acc, "conf_dir": conf_dir}, model.coef_
 
 
-def evaluate_venue(
+def prepare_venue(
     venue: str,
     series: dict[str, VenueSeries],
     horizon_ms: int,
@@ -243,28 +233,29 @@ def evaluate_venue(
     train_size: int,
     test_size: int,
     step: int,
-    ridge_alpha: float,
-    top_n_coefs: int,
-) -> None:
+) -> VenueEvaluation | str:
+    """The venue's dataset and folds, or the line to print when it is skipped."""
     data = build_crossvenue_dataset(venue, series, horizon_ms, tolerance_ms)
     if data is None:
-        print(f"{venue:<13}  SKIP  insufficient aligned data")
-        return
+        return f"{venue:<13}  SKIP  insufficient aligned data"
     x, y, feature_names = data
     folds = make_folds(len(y), train_size, test_size, step)
     if not folds:
-        print(f"{venue:<13}  SKIP  only {len(y)} rows")
-        return
+        return f"{venue:<13}  SKIP  only {len(y)} rows"
+    return VenueEvaluation(venue, x, y, feature_names, folds)
+
+
+def report_venue(
+    evaluation: VenueEvaluation,
+    fold_results: list[tuple[dict[str, float], np.ndarray]],
+    top_n_coefs: int,
+) -> None:
+    venue, y, feature_names, folds = (
+        evaluation.venue, evaluation.y, evaluation.feature_names, evaluation.folds,
+    )
     r2s, dirs, confs = [], [], []
     coefs: list[np.ndarray] = []
-    for f in folds:
-        scores, coef = run_fold(
-            x[f.train_start : f.train_end],
-            y[f.train_start : f.train_end],
-            x[f.test_start : f.test_end],
-            y[f.test_start : f.test_end],
-            ridge_alpha,
-        )
+    for scores, coef in fold_results:
         r2s.append(scores["r2"])
         dirs.append(scores["dir"])
         confs.append(scores["conf_dir"])
@@ -308,20 +299,36 @@ def main() -> None:
     parser.add_argument("--step", type=int, default=10000)
     parser.add_argument("--ridge-alpha", type=float, default=1.0)
     parser.add_argument("--top-n-coefs", type=int, default=6)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processes to spread folds over; results match a serial run",
+    )
     args = parser.parse_args()
 
     horizons = [int(x) for x in args.horizons_ms.split(",") if x]
     series = load_series(args.db_paths)
     print(f"loaded series: {[(v, len(s.ts)) for v, s in series.items()]}")
-    for horizon in horizons:
-        print(f"\n=== horizon={horizon}ms  tolerance={args.tolerance_ms}ms ===")
-        for venue in sorted(series.keys()):
-            evaluate_venue(
-                venue, series, horizon, args.tolerance_ms,
-                args.train_size, args.test_size, args.step,
-                args.ridge_alpha, args.top_n_coefs,
-            )
-
+    with WalkForwardPool(args.workers) as pool:
+        for horizon in horizons:
+            print(f"\n=== horizon={horizon}ms  tolerance={args.tolerance_ms}ms ===")
+            prepared = [
+                prepare_venue(
+                    venue, series, horizon, args.tolerance_ms,
+                    args.train_size, args.test_size, args.step,
+                )
+                for venue in sorted(series.keys())
+            ]
+            jobs = [
+                WalkForwardJob(e.x, e.y, e.folds, run_fold, (args.ridge_alpha,))
+                for e in prepared
+                if isinstance(e, VenueEvaluation)
+            ]
+            results = iter(pool.run(jobs))
+            for e in prepared:
+                if isinstance(e, str):
+                    print(e)
+                else:
+                    report_venue(e, next(results), args.top_n_coefs)
 
 if __name__ == "__main__":
     main()
@@ -19,12 +19,16 @@ GBDT should handle that interaction natively.
 Bar to pass: directional accuracy meaningfully > Ridge's 0.553 (coinbase) /
 0.539 (hyperliquid) at horizon=5s, measured on identical folds. If GBDT
 matches rather than beats, the feature set is the ceiling.
+
+--workers spreads the folds of every venue over a process pool; the output is
+identical to a serial run.
 """
 
 from __future__ import annotations
 
 import argparse
 import sqlite3
+import sys
 import warnings
 from collections import defaultdict
 from dataclasses import dataclass
@@ -33,6 +37,12 @@ from pathlib import Path
 import lightgbm as lgb
 import numpy as np
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.features import Fold, WalkForwardJob, WalkForwardPool, make_folds
+
 
 OWN_FEATURE_NAMES = (
     "microprice-mid",
@@ -53,12 +63,12 @@ class VenueSeries:
 
 
 @dataclass(frozen=True, slots=True)
-class Fold:
-    fold_index: int
-    train_start: int
-    train_end: int
-    test_start: int
-    test_end: int
+class VenueEvaluation:
+    venue: str
+    x: np.ndarray
+    y: np.ndarray
+    feature_names: list[str]
+    folds: list[Fold]
 
 
 def load_series(db_paths: list[Path]) -> dict[str, VenueSeries]:
@@ -176,25 +186,6 @@ def build_crossvenue_dataset(
     return np.asarray(xs), np.asarray(ys), feature_names
 
 
-def make_folds(n: int, train_size: int, test_size: int, step: int) -> list[Fold]:
-    folds: list[Fold] = []
-    start = 0
-    idx = 0
-    while start + train_size + test_size <= n:
-        folds.append(
-            Fold(
-                fold_index=idx,
-                train_start=start,
-                train_end=start + train_size,
-                test_start=start + train_size,
-                test_end=start + train_size + test_size,
-            )
-        )
-        start += step
-        idx += 1
-    return folds
-
-
 def run_fold(
     x_train: np.ndarray, y_train: np.ndarray,
     x_test: np.ndarray, y_test: np.ndarray,
@@ -243,7 +234,7 @@ def run_fold(
     return {"r2": r2, "dir": dir_acc, "conf_dir": conf_dir}, importance
 
 
-def evaluate_venue(
+def prepare_venue(
     venue: str,
     series: dict[str, VenueSeries],
     horizon_ms: int,
@@ -251,30 +242,29 @@ def evaluate_venue(
     train_size: int,
     test_size: int,
     step: int,
-    params: dict,
-    num_boost_round: int,
-    early_stopping_rounds: int,
-    top_n_feats: int,
-) -> None:
+) -> VenueEvaluation | str:
+    """The venue's dataset and folds, or the line to print when it is skipped."""
     data = build_crossvenue_dataset(venue, series, horizon_ms, tolerance_ms)
     if data is None:
-        print(f"{venue:<13}  SKIP  insufficient aligned data")
-        return
+        return f"{venue:<13}  SKIP  insufficient aligned data"
     x, y, feature_names = data
     folds = make_folds(len(y), train_size, test_size, step)
     if not folds:
-        print(f"{venue:<13}  SKIP  only {len(y)} rows")
-        return
+        return f"{venue:<13}  SKIP  only {len(y)} rows"
+    return VenueEvaluation(venue, x, y, feature_names, folds)
+
+
+def report_venue(
+    evaluation: VenueEvaluation,
+    fold_results: list[tuple[dict[str, float], np.ndarray]],
+    top_n_feats: int,
+) -> None:
+    venue, y, feature_names, folds = (
+        evaluation.venue, evaluation.y, evaluation.feature_names, evaluation.folds,
+    )
     r2s, dirs, confs = [], [], []
     importances: list[np.ndarray] = []
-    for f in folds:
-        scores, importance = run_fold(
-            x[f.train_start : f.train_end],
-            y[f.train_start : f.train_end],
-            x[f.test_start : f.test_end],
-            y[f.test_start : f.test_end],
-            feature_names, params, num_boost_round, early_stopping_rounds,
-        )
+    for scores, importance in fold_results:
         r2s.append(scores["r2"])
         dirs.append(scores["dir"])
         confs.append(scores["conf_dir"])
@@ -324,6 +314,14 @@ def main() -> None:
     parser.add_argument("--bagging-fraction", type=float, default=0.9)
     parser.add_argument("--bagging-freq", type=int, default=5)
     parser.add_argument("--lambda-l2", type=float, default=1.0)
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processes to spread folds over; results match a serial run",
+    )
+    parser.add_argument(
+        "--gbdt-threads", type=int, default=1,
+        help="LightGBM threads per fold (fixed so results don't depend on --workers)",
+    )
     args = parser.parse_args()
 
     params = {
@@ -336,6 +334,8 @@ def main() -> None:
         "bagging_fraction": args.bagging_fraction,
         "bagging_freq": args.bagging_freq,
         "lambda_l2": args.lambda_l2,
+        "num_threads": args.gbdt_threads,
+        "deterministic": True,
         "verbose": -1,
     }
 
@@ -343,16 +343,30 @@ def main() -> None:
     series = load_series(args.db_paths)
     print(f"loaded series: {[(v, len(s.ts)) for v, s in series.items()]}")
     print(f"params: {params}")
-    for horizon in horizons:
-        print(f"\n=== horizon={horizon}ms  tolerance={args.tolerance_ms}ms ===")
-        for venue in sorted(series.keys()):
-            evaluate_venue(
-                venue, series, horizon, args.tolerance_ms,
-                args.train_size, args.test_size, args.step,
-                params, args.num_boost_round, args.early_stopping_rounds,
-                args.top_n_feats,
-            )
-
+    with WalkForwardPool(args.workers, threads_per_worker=args.gbdt_threads) as pool:
+        for horizon in horizons:
+            print(f"\n=== horizon={horizon}ms  tolerance={args.tolerance_ms}ms ===")
+            prepared = [
+                prepare_venue(
+                    venue, series, horizon, args.tolerance_ms,
+                    args.train_size, args.test_size, args.step,
+                )
+                for venue in sorted(series.keys())
+            ]
+            jobs = [
+                WalkForwardJob(
+                    e.x, e.y, e.folds, run_fold,
+                    (e.feature_names, params, args.num_boost_round, args.early_stopping_rounds),
+                )
+                for e in prepared
+                if isinstance(e, VenueEvaluation)
+            ]
+            results = iter(pool.run(jobs))
+            for e in prepared:
+                if isinstance(e, str):
+                    print(e)
+                else:
+                    report_venue(e, next(results), args.top_n_feats)
 
 if __name__ == "__main__":
     main()
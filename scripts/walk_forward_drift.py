@@ -17,12 +17,17 @@ This lets us distinguish "the drift filter has real edge" from "we got lucky
 on one sample." If R² is positive on ≥70% of folds across multiple days of
 data, the signal is real. If it's positive on 1/3 folds, we should stop
 building on it.
+
+The online Kalman pass is a Python loop per row, so folds are the slow part;
+--workers spreads them over a process pool with output identical to a serial
+run.
 """
 
 from __future__ import annotations
 
 import argparse
 import sqlite3
+import sys
 from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass
@@ -30,6 +35,12 @@ from pathlib import Path
 
 import numpy as np
 
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.features import Fold, WalkForwardJob, WalkForwardPool, make_folds
+
 
 FEATURE_NAMES = (
     "microprice-mid",
@@ -48,15 +59,6 @@ class VenueDataset:
     ts: np.ndarray  # (n,) timestamp_ms per row
 
 
-@dataclass(frozen=True, slots=True)
-class Fold:
-    fold_index: int
-    train_start: int
-    train_end: int
-    test_start: int
-    test_end: int
-
-
 @dataclass
 class FoldResult:
     fold: Fold
@@ -133,25 +135,6 @@ def load_datasets(
     return datasets
 
 
-def make_folds(n: int, train_size: int, test_size: int, step: int) -> list[Fold]:
-    folds: list[Fold] = []
-    start = 0
-    idx = 0
-    while start + train_size + test_size <= n:
-        folds.append(
-            Fold(
-                fold_index=idx,
-                train_start=start,
-                train_end=start + train_size,
-                test_start=start + train_size,
-                test_end=start + train_size + test_size,
-            )
-        )
-        start += step
-        idx += 1
-    return folds
-
-
 def fit_predictor(
     x_train: np.ndarray,
     y_train: np.ndarray,
@@ -227,26 +210,33 @@ def score_fold(preds: np.ndarray, y: np.ndarray) -> dict[str, float]:
     }
 
 
-def evaluate_venue(
-    dataset: VenueDataset,
-    folds: list[Fold],
+def run_fold(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_test: np.ndarray,
+    y_test: np.ndarray,
     q_floor: float,
     q_ceiling: float,
     q_init: float,
+) -> dict[str, float] | None:
+    if len(y_train) < 200 or len(y_test) < 50:
+        return None
+    beta0, q_vec, mean, std, r = fit_predictor(
+        x_train, y_train, q_floor, q_ceiling, q_init
+    )
+    preds = run_online_kalman(beta0, q_vec, r, mean, std, x_test, y_test)
+    return score_fold(preds, y_test)
+
+
+def evaluate_venue(
+    dataset: VenueDataset,
+    folds: list[Fold],
+    fold_scores: list[dict[str, float] | None],
 ) -> list[FoldResult]:
     results: list[FoldResult] = []
-    for fold in folds:
-        x_train = dataset.x[fold.train_start : fold.train_end]
-        y_train = dataset.y[fold.train_start : fold.train_end]
-        x_test = dataset.x[fold.test_start : fold.test_end]
-        y_test = dataset.y[fold.test_start : fold.test_end]
-        if len(y_train) < 200 or len(y_test) < 50:
+    for fold, scores in zip(folds, fold_scores, strict=True):
+        if scores is None:
             continue
-        beta0, q_vec, mean, std, r = fit_predictor(
-            x_train, y_train, q_floor, q_ceiling, q_init
-        )
-        preds = run_online_kalman(beta0, q_vec, r, mean, std, x_test, y_test)
-        scores = score_fold(preds, y_test)
         results.append(
             FoldResult(
                 fold=fold,
@@ -255,8 +245,8 @@ def evaluate_venue(
                 directional_acc=scores["directional"],
                 residual_mean=scores["residual_mean"],
                 residual_std=scores["residual_std"],
-                n_test=len(y_test),
-                n_train=len(y_train),
+                n_test=fold.test_end - fold.test_start,
+                n_train=fold.train_end - fold.train_start,
             )
         )
     return results
@@ -323,6 +313,12 @@ def main() -> None:
     parser.add_argument("--q-init", type=float, default=1e-4)
     parser.add_argument("--q-floor", type=float, default=1e-9)
     parser.add_argument("--q-ceiling", type=float, default=1e-3)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to spread folds over; results match a serial run",
+    )
     args = parser.parse_args()
 
     datasets = load_datasets(args.db_paths, args.horizon_ms, args.tolerance_ms)
@@ -331,11 +327,25 @@ def main() -> None:
         f"train/test/step={args.train_size}/{args.test_size}/{args.step}  "
         f"venues={sorted(datasets.keys())}"
     )
-    for venue in sorted(datasets.keys()):
-        ds = datasets[venue]
-        folds = make_folds(len(ds.y), args.train_size, args.test_size, args.step)
-        results = evaluate_venue(ds, folds, args.q_floor, args.q_ceiling, args.q_init)
-        summarize(venue, results)
+    venues = sorted(datasets.keys())
+    folds = {
+        venue: make_folds(len(datasets[venue].y), args.train_size, args.test_size, args.step)
+        for venue in venues
+    }
+    jobs = [
+        WalkForwardJob(
+            datasets[venue].x,
+            datasets[venue].y,
+            folds[venue],
+            run_fold,
+            (args.q_floor, args.q_ceiling, args.q_init),
+        )
+        for venue in venues
+    ]
+    with WalkForwardPool(args.workers) as pool:
+        scores = pool.run(jobs)
+    for venue, fold_scores in zip(venues, scores, strict=True):
+        summarize(venue, evaluate_venue(datasets[venue], folds[venue], fold_scores))
 
 
 if __name__ == "__main__":
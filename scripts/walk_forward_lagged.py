@@ -22,12 +22,15 @@ Rows where any lag lookup returns no tick or a stale tick (> 2x lag window)
 are skipped.
 
 Runs both Ridge(α=1) and LightGBM on the same folds for direct comparison.
+--workers spreads the folds of every venue over a process pool; the output is
+identical to a serial run.
 """
 
 from __future__ import annotations
 
 import argparse
 import sqlite3
+import sys
 import warnings
 from collections import defaultdict
 from dataclasses import dataclass
@@ -37,107 +40,152 @@ import lightgbm as lgb
 import numpy as np
 from sklearn.linear_model import Ridge
 
-
-OWN_FEATURE_NAMES = (
-    "microprice-mid",
-    "depth_imbalance",
-    "vol_bps",
-    "trade_net_flow",
-    "trade_total_size",
-    "basis_dislocation",
+PROJECT_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(PROJECT_SRC) not in sys.path:
+    sys.path.insert(0, str(PROJECT_SRC))
+
+from icarus.capture import ColumnarCaptureReader
+from icarus.features import (
+    OWN_FEATURE_NAMES,
+    Fold,
+    VenueSeries,
+    WalkForwardJob,
+    WalkForwardPool,
+    build_lagged_feature_matrix,
+    make_folds,
 )
 
-# Indices into the 6-feature vector that we compute lagged diffs for.
-LAGGED_FEATURE_INDICES = (0, 5)  # microprice-mid, basis_dislocation
-LAGGED_FEATURE_NAMES = tuple(OWN_FEATURE_NAMES[i] for i in LAGGED_FEATURE_INDICES)
-
 
 @dataclass(frozen=True, slots=True)
-class VenueSeries:
+class VenueEvaluation:
     venue: str
-    ts: np.ndarray
-    mid: np.ndarray
-    features: np.ndarray  # (n, 6)
-
-
-@dataclass(frozen=True, slots=True)
-class Fold:
-    fold_index: int
-    train_start: int
-    train_end: int
-    test_start: int
-    test_end: int
+    x: np.ndarray
+    y: np.ndarray
+    feature_names: list[str]
+    kept_ts: np.ndarray
+    folds: list[Fold]
 
 
 def load_series(db_paths: list[Path]) -> dict[str, VenueSeries]:
-    per_venue: dict[str, list[tuple[int, float, tuple[float, ...]]]] = defaultdict(list)
+    """Load per-venue series from SQLite captures and/or columnar capture stores."""
+    per_venue: dict[str, list[tuple[np.ndarray, np.ndarray, np.ndarray]]] = defaultdict(list)
     for db_path in db_paths:
-        conn = sqlite3.connect(str(db_path))
-        query = """
-            SELECT u.timestamp_ms, v.exchange, u.basis_common_price,
-                   b.basis_estimate, v.fair_value, v.microprice,
-                   v.depth_imbalance, v.mid_volatility_bps,
-                   COALESCE(v.trade_net_flow, 0.0),
-                   COALESCE(v.trade_buy_size, 0.0) + COALESCE(v.trade_sell_size, 0.0)
-            FROM updates u
-            JOIN venue_states v ON v.update_id = u.id
-            LEFT JOIN basis_states b
-              ON b.update_id = u.id AND b.exchange = v.exchange
-            WHERE v.microprice IS NOT NULL
-              AND v.depth_imbalance IS NOT NULL
-              AND v.mid_volatility_bps IS NOT NULL
-              AND u.basis_common_price IS NOT NULL
-              AND b.basis_estimate IS NOT NULL
-            ORDER BY v.exchange, u.timestamp_ms, u.id
-        """
-        for (
-            ts, exchange, basis_common, basis_est, mid, microprice,
-            imb, vol, net_flow, total_size,
-        ) in conn.execute(query):
-            reconstructed = float(basis_common) + float(basis_est)
-            per_venue[exchange].append(
-                (
-                    int(ts),
-                    float(mid),
-                    (
-                        float(microprice) - float(mid),
-                        float(imb),
-                        float(vol),
-                        float(net_flow),
-                        float(total_size),
-                        float(mid) - reconstructed,
-                    ),
-                )
-            )
-        conn.close()
+        if ColumnarCaptureReader.is_store(db_path):
+            chunks = _load_columnar_chunks(db_path)
+        else:
+            chunks = _load_sqlite_chunks(db_path)
+        for venue, chunk in chunks.items():
+            per_venue[venue].append(chunk)
 
     out: dict[str, VenueSeries] = {}
-    for venue, rows in per_venue.items():
-        rows.sort(key=lambda r: r[0])
-        if len(rows) < 200:
+    for venue, venue_chunks in per_venue.items():
+        ts = np.concatenate([c[0] for c in venue_chunks])
+        if len(ts) < 200:
             continue
+        order = np.argsort(ts, kind="stable")
         out[venue] = VenueSeries(
             venue=venue,
-            ts=np.asarray([r[0] for r in rows]),
-            mid=np.asarray([r[1] for r in rows]),
-            features=np.asarray([r[2] for r in rows]),
+            ts=ts[order],
+            mid=np.concatenate([c[1] for c in venue_chunks])[order],
+            features=np.concatenate([c[2] for c in venue_chunks])[order],
         )
     return out
 
 
-def build_feature_names(
-    predict_venue: str, other_venues: list[str], lag_windows_ms: list[int]
-) -> list[str]:
-    names = [f"own_{n}" for n in OWN_FEATURE_NAMES]
-    for ov in other_venues:
-        names.extend(f"{ov}_{n}" for n in OWN_FEATURE_NAMES)
-    venues_in_order = [predict_venue] + other_venues
-    for v in venues_in_order:
-        v_tag = "own" if v == predict_venue else v
-        for fname in LAGGED_FEATURE_NAMES:
-            for w in lag_windows_ms:
-                names.append(f"{v_tag}_{fname}_diff_{w}ms")
-    return names
+def _load_sqlite_chunks(db_path: Path) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    per_venue: dict[str, list[tuple[int, float, tuple[float, ...]]]] = defaultdict(list)
+    conn = sqlite3.connect(str(db_path))
+    query = """
+        SELECT u.timestamp_ms, v.exchange, u.basis_common_price,
+               b.basis_estimate, v.fair_value, v.microprice,
+               v.depth_imbalance, v.mid_volatility_bps,
+               COALESCE(v.trade_net_flow, 0.0),
+               COALESCE(v.trade_buy_size, 0.0) + COALESCE(v.trade_sell_size, 0.0)
+        FROM updates u
+        JOIN venue_states v ON v.update_id = u.id
+        LEFT JOIN basis_states b
+          ON b.update_id = u.id AND b.exchange = v.exchange
+        WHERE v.microprice IS NOT NULL
+          AND v.depth_imbalance IS NOT NULL
+          AND v.mid_volatility_bps IS NOT NULL
+          AND u.basis_common_price IS NOT NULL
+          AND b.basis_estimate IS NOT NULL
+        ORDER BY v.exchange, u.timestamp_ms, u.id
+    """
+    for (
+        ts, exchange, basis_common, basis_est, mid, microprice,
+        imb, vol, net_flow, total_size,
+    ) in conn.execute(query):
+        reconstructed = float(basis_common) + float(basis_est)
+        per_venue[exchange].append(
+            (
+                int(ts),
+                float(mid),
+                (
+                    float(microprice) - float(mid),
+                    float(imb),
+                    float(vol),
+                    float(net_flow),
+                    float(total_size),
+                    float(mid) - reconstructed,
+                ),
+            )
+        )
+    conn.close()
+    return {
+        venue: (
+            np.asarray([r[0] for r in rows], dtype=np.int64),
+            np.asarray([r[1] for r in rows], dtype=float),
+            np.asarray([r[2] for r in rows], dtype=float).reshape(-1, len(OWN_FEATURE_NAMES)),
+        )
+        for venue, rows in per_venue.items()
+    }
+
+
+def _load_columnar_chunks(
+    store_path: Path,
+) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Same rows as ``_load_sqlite_chunks``, read as whole columns from the store."""
+    reader = ColumnarCaptureReader(store_path)
+    out: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    for venue in reader.venues():
+        cols = reader.read_venue_joined(
+            venue,
+            [
+                "fair_value", "microprice", "depth_imbalance", "mid_volatility_bps",
+                "trade_net_flow", "trade_buy_size", "trade_sell_size",
+            ],
+            update_columns=["basis_common_price"],
+            basis_columns=["basis_estimate"],
+        )
+        keep = (
+            np.isfinite(cols["microprice"])
+            & np.isfinite(cols["depth_imbalance"])
+            & np.isfinite(cols["mid_volatility_bps"])
+            & np.isfinite(cols["basis_common_price"])
+            & np.isfinite(cols["basis_estimate"])
+        )
+        if not keep.any():
+            continue
+        rows = np.flatnonzero(keep)
+        rows = rows[np.lexsort((cols["update_id"][rows], cols["timestamp_ms"][rows]))]
+        mid = cols["fair_value"][rows]
+        reconstructed = cols["basis_common_price"][rows] + cols["basis_estimate"][rows]
+        total_size = np.nan_to_num(cols["trade_buy_size"][rows], nan=0.0) + np.nan_to_num(
+            cols["trade_sell_size"][rows], nan=0.0
+        )
+        features = np.column_stack(
+            (
+                cols["microprice"][rows] - mid,
+                cols["depth_imbalance"][rows],
+                cols["mid_volatility_bps"][rows],
+                np.nan_to_num(cols["trade_net_flow"][rows], nan=0.0),
+                total_size,
+                mid - reconstructed,
+            )
+        )
+        out[venue] = (cols["timestamp_ms"][rows].astype(np.int64), mid, features)
+    return out
 
 
 def build_dataset(
@@ -147,137 +195,13 @@ def build_dataset(
     tolerance_ms: int,
     lag_windows_ms: list[int],
 ) -> tuple[np.ndarray, np.ndarray, list[str]] | None:
-    if predict_venue not in series:
-        return None
-    own = series[predict_venue]
-    other_venues = sorted(v for v in series if v != predict_venue)
-    if not other_venues:
-        return None
-    feature_names = build_feature_names(predict_venue, other_venues, lag_windows_ms)
-
-    ts_own = own.ts
-    ts_own_list = ts_own.tolist()
-    other_ts_lists = {ov: series[ov].ts.tolist() for ov in other_venues}
-    other_features = {ov: series[ov].features for ov in other_venues}
-    other_ts_arrays = {ov: series[ov].ts for ov in other_venues}
-
-    target_ts = ts_own + horizon_ms
-    j_idx = np.searchsorted(ts_own, target_ts, side="left")
-    j_idx = np.maximum(j_idx, np.arange(len(ts_own)) + 1)
-
-    # Current (latest-known) indices for other venues.
-    other_k: dict[str, np.ndarray] = {}
-    for ov in other_venues:
-        other_k[ov] = np.searchsorted(other_ts_lists[ov], ts_own, side="right") - 1
-
-    # Lagged indices per venue per window.
-    own_lag_k: dict[int, np.ndarray] = {}
-    other_lag_k: dict[str, dict[int, np.ndarray]] = defaultdict(dict)
-    for w in lag_windows_ms:
-        target_lag = ts_own - w
-        own_lag_k[w] = np.searchsorted(ts_own_list, target_lag, side="right") - 1
-        for ov in other_venues:
-            other_lag_k[ov][w] = (
-                np.searchsorted(other_ts_lists[ov], target_lag, side="right") - 1
-            )
-
-    # Order venues for lagged-feature emission (own first, then others in sorted order).
-    venue_order = [predict_venue] + other_venues
-
-    max_lag_gap_ms = {w: 2 * w for w in lag_windows_ms}
-
-    xs: list[np.ndarray] = []
-    ys: list[float] = []
-    for i in range(len(ts_own)):
-        j = int(j_idx[i])
-        if j >= len(ts_own):
-            break
-        if int(ts_own[j]) - (int(ts_own[i]) + horizon_ms) > tolerance_ms:
-            continue
-        t_i = int(ts_own[i])
-
-        skip = False
-        other_feats: list[np.ndarray] = []
-        for ov in other_venues:
-            k = int(other_k[ov][i])
-            if k < 0:
-                skip = True
-                break
-            other_feats.append(other_features[ov][k])
-        if skip:
-            continue
-
-        # Compute lagged diffs, ordered by venue then lagged-feature then window.
-        lagged: list[float] = []
-        for v in venue_order:
-            if v == predict_venue:
-                current_feats = own.features[i]
-                for fi in LAGGED_FEATURE_INDICES:
-                    for w in lag_windows_ms:
-                        k = int(own_lag_k[w][i])
-                        if k < 0:
-                            skip = True
-                            break
-                        lag_ts = int(ts_own[k])
-                        if t_i - lag_ts > max_lag_gap_ms[w]:
-                            skip = True
-                            break
-                        lagged.append(
-                            float(current_feats[fi]) - float(own.features[k][fi])
-                        )
-                    if skip:
-                        break
-                if skip:
-                    break
-            else:
-                k_now = int(other_k[v][i])
-                current_feats = other_features[v][k_now]
-                for fi in LAGGED_FEATURE_INDICES:
-                    for w in lag_windows_ms:
-                        k = int(other_lag_k[v][w][i])
-                        if k < 0:
-                            skip = True
-                            break
-                        lag_ts = int(other_ts_arrays[v][k])
-                        if t_i - lag_ts > max_lag_gap_ms[w]:
-                            skip = True
-                            break
-                        lagged.append(
-                            float(current_feats[fi])
-                            - float(other_features[v][k][fi])
-                        )
-                    if skip:
-                        break
-                if skip:
-                    break
-        if skip:
-            continue
-
-        combined = np.concatenate([own.features[i]] + other_feats + [np.asarray(lagged)])
-        xs.append(combined)
-        ys.append(float(own.mid[j] - own.mid[i]))
-    if len(ys) < 200:
+    data = build_dataset_with_ts(
+        predict_venue, series, horizon_ms, tolerance_ms, lag_windows_ms,
+    )
+    if data is None:
         return None
-    return np.asarray(xs), np.asarray(ys), feature_names
-
-
-def make_folds(n: int, train_size: int, test_size: int, step: int) -> list[Fold]:
-    folds: list[Fold] = []
-    start = 0
-    idx = 0
-    while start + train_size + test_size <= n:
-        folds.append(
-            Fold(
-                fold_index=idx,
-                train_start=start,
-                train_end=start + train_size,
-                test_start=start + train_size,
-                test_end=start + train_size + test_size,
-            )
-        )
-        start += step
-        idx += 1
-    return folds
+    x, y, feature_names, _ = data
+    return x, y, feature_names
 
 
 def _metrics(preds: np.ndarray, y_test: np.ndarray) -> dict[str, float]:
@@ -308,22 +232,23 @@ def _ridge_fit_predict(
     return model.predict(xs)
 
 
-def run_fold_ridge(
+def run_fold(
     x_train: np.ndarray, y_train: np.ndarray,
     x_test: np.ndarray, y_test: np.ndarray,
     ridge_alpha: float,
-) -> dict[str, float]:
+    keep_predictions: bool,
+    gbdt: tuple[list[str], dict, int, int] | None,
+) -> tuple[dict[str, float], np.ndarray | None, dict[str, float] | None, np.ndarray | None]:
+    """Ridge, and GBDT unless ``gbdt`` is None, on one fold (runs in pool workers).
+
+    Returns Ridge scores, Ridge test predictions if ``keep_predictions``, and
+    GBDT scores and gain importances.
+    """
     preds = _ridge_fit_predict(x_train, y_train, x_test, ridge_alpha)
-    return _metrics(preds, y_test)
-
-
-def _run_fold_ridge_with_preds(
-    x_train: np.ndarray, y_train: np.ndarray,
-    x_test: np.ndarray, y_test: np.ndarray,
-    ridge_alpha: float,
-) -> tuple[dict[str, float], np.ndarray]:
-    preds = _ridge_fit_predict(x_train, y_train, x_test, ridge_alpha)
-    return _metrics(preds, y_test), preds
+    gbdt_scores = importance = None
+    if gbdt is not None:
+        gbdt_scores, importance = run_fold_gbdt(x_train, y_train, x_test, y_test, *gbdt)
+    return _metrics(preds, y_test), preds if keep_predictions else None, gbdt_scores, importance
 
 
 def run_fold_gbdt(
@@ -365,90 +290,19 @@ def build_dataset_with_ts(
     lag_windows_ms: list[int],
 ) -> tuple[np.ndarray, np.ndarray, list[str], np.ndarray] | None:
     """Same as build_dataset, plus the per-row source timestamp for the own venue."""
-    if predict_venue not in series:
-        return None
-    own = series[predict_venue]
-    result = build_dataset(
-        predict_venue, series, horizon_ms, tolerance_ms, lag_windows_ms,
+    matrix = build_lagged_feature_matrix(
+        predict_venue,
+        series,
+        horizon_ms=horizon_ms,
+        tolerance_ms=tolerance_ms,
+        lag_windows_ms=lag_windows_ms,
     )
-    if result is None:
+    if matrix is None or len(matrix.y) < 200:
         return None
-    x, y, feature_names = result
-    # Re-derive kept timestamps by replaying alignment and re-filtering against
-    # the same skip rules. Simpler: rebuild with ts tracking inline.
-    other_venues = sorted(v for v in series if v != predict_venue)
-    ts_own = own.ts
-    ts_own_list = ts_own.tolist()
-    other_ts_lists = {ov: series[ov].ts.tolist() for ov in other_venues}
-    other_features = {ov: series[ov].features for ov in other_venues}
-    other_ts_arrays = {ov: series[ov].ts for ov in other_venues}
-
-    target_ts = ts_own + horizon_ms
-    j_idx = np.searchsorted(ts_own, target_ts, side="left")
-    j_idx = np.maximum(j_idx, np.arange(len(ts_own)) + 1)
-    other_k = {
-        ov: np.searchsorted(other_ts_lists[ov], ts_own, side="right") - 1
-        for ov in other_venues
-    }
-    own_lag_k = {}
-    other_lag_k: dict[str, dict[int, np.ndarray]] = defaultdict(dict)
-    for w in lag_windows_ms:
-        target_lag = ts_own - w
-        own_lag_k[w] = np.searchsorted(ts_own_list, target_lag, side="right") - 1
-        for ov in other_venues:
-            other_lag_k[ov][w] = (
-                np.searchsorted(other_ts_lists[ov], target_lag, side="right") - 1
-            )
-    venue_order = [predict_venue] + other_venues
-    max_lag_gap_ms = {w: 2 * w for w in lag_windows_ms}
-
-    kept_ts: list[int] = []
-    for i in range(len(ts_own)):
-        j = int(j_idx[i])
-        if j >= len(ts_own):
-            break
-        if int(ts_own[j]) - (int(ts_own[i]) + horizon_ms) > tolerance_ms:
-            continue
-        t_i = int(ts_own[i])
-        skip = False
-        for ov in other_venues:
-            if int(other_k[ov][i]) < 0:
-                skip = True
-                break
-        if skip:
-            continue
-        for v in venue_order:
-            if v == predict_venue:
-                for _fi in LAGGED_FEATURE_INDICES:
-                    for w in lag_windows_ms:
-                        k = int(own_lag_k[w][i])
-                        if k < 0 or t_i - int(ts_own[k]) > max_lag_gap_ms[w]:
-                            skip = True
-                            break
-                    if skip:
-                        break
-            else:
-                for _fi in LAGGED_FEATURE_INDICES:
-                    for w in lag_windows_ms:
-                        k = int(other_lag_k[v][w][i])
-                        if k < 0 or t_i - int(other_ts_arrays[v][k]) > max_lag_gap_ms[w]:
-                            skip = True
-                            break
-                    if skip:
-                        break
-            if skip:
-                break
-        if skip:
-            continue
-        kept_ts.append(t_i)
-    kept_ts_arr = np.asarray(kept_ts)
-    assert len(kept_ts_arr) == len(y), (
-        f"kept ts ({len(kept_ts_arr)}) != dataset rows ({len(y)}) — skip rules drifted"
-    )
-    return x, y, feature_names, kept_ts_arr
+    return matrix.x, matrix.y, matrix.feature_names, matrix.timestamps_ms
 
 
-def evaluate_venue(
+def prepare_venue(
     venue: str,
     series: dict[str, VenueSeries],
     horizon_ms: int,
@@ -457,61 +311,43 @@ def evaluate_venue(
     train_size: int,
     test_size: int,
     step: int,
-    ridge_alpha: float,
-    gbdt_params: dict,
-    num_boost_round: int,
-    early_stopping_rounds: int,
+) -> VenueEvaluation | str:
+    """The venue's dataset and folds, or the line to print when it is skipped."""
+    data = build_dataset_with_ts(
+        venue, series, horizon_ms, tolerance_ms, lag_windows_ms,
+    )
+    if data is None:
+        return f"{venue:<13}  SKIP  insufficient aligned data"
+    x, y, feature_names, kept_ts = data
+    folds = make_folds(len(y), train_size, test_size, step)
+    if not folds:
+        return f"{venue:<13}  SKIP  only {len(y)} rows"
+    return VenueEvaluation(venue, x, y, feature_names, kept_ts, folds)
+
+
+def report_venue(
+    evaluation: VenueEvaluation,
+    fold_results: list[tuple],
+    horizon_ms: int,
     top_n_feats: int,
     emit_predictions_path: Path | None,
     ridge_only: bool,
 ) -> None:
-    if emit_predictions_path is not None:
-        data = build_dataset_with_ts(
-            venue, series, horizon_ms, tolerance_ms, lag_windows_ms,
-        )
-        if data is None:
-            print(f"{venue:<13}  SKIP  insufficient aligned data")
-            return
-        x, y, feature_names, kept_ts = data
-    else:
-        raw = build_dataset(
-            venue, series, horizon_ms, tolerance_ms, lag_windows_ms,
-        )
-        if raw is None:
-            print(f"{venue:<13}  SKIP  insufficient aligned data")
-            return
-        x, y, feature_names = raw
-        kept_ts = None
-    folds = make_folds(len(y), train_size, test_size, step)
-    if not folds:
-        print(f"{venue:<13}  SKIP  only {len(y)} rows")
-        return
-
+    venue, y, feature_names = evaluation.venue, evaluation.y, evaluation.feature_names
     r2_ridge, dir_ridge, conf_ridge = [], [], []
     r2_gbdt, dir_gbdt, conf_gbdt = [], [], []
     importances: list[np.ndarray] = []
     emitted_ts: list[int] = []
     emitted_pred: list[float] = []
-    for f in folds:
-        xtr, ytr = x[f.train_start : f.train_end], y[f.train_start : f.train_end]
-        xte, yte = x[f.test_start : f.test_end], y[f.test_start : f.test_end]
-
-        if emit_predictions_path is not None:
-            rs, ridge_preds = _run_fold_ridge_with_preds(xtr, ytr, xte, yte, ridge_alpha)
-            if kept_ts is not None:
-                emitted_ts.extend(kept_ts[f.test_start : f.test_end].tolist())
-                emitted_pred.extend(ridge_preds.tolist())
-        else:
-            rs = run_fold_ridge(xtr, ytr, xte, yte, ridge_alpha)
+    for f, (rs, ridge_preds, gs, imp) in zip(evaluation.folds, fold_results, strict=True):
+        if ridge_preds is not None:
+            emitted_ts.extend(evaluation.kept_ts[f.test_start : f.test_end].tolist())
+            emitted_pred.extend(ridge_preds.tolist())
         r2_ridge.append(rs["r2"])
         dir_ridge.append(rs["dir"])
         conf_ridge.append(rs["conf_dir"])
 
-        if not ridge_only:
-            gs, imp = run_fold_gbdt(
-                xtr, ytr, xte, yte, feature_names,
-                gbdt_params, num_boost_round, early_stopping_rounds,
-            )
+        if gs is not None:
             r2_gbdt.append(gs["r2"])
             dir_gbdt.append(gs["dir"])
             conf_gbdt.append(gs["conf_dir"])
@@ -529,7 +365,10 @@ def evaluate_venue(
     r_r2 = np.asarray(r2_ridge)
     r_dir = np.asarray(dir_ridge)
     r_conf = np.asarray(conf_ridge)
-    print(f"{venue:<13}  n={len(y)}  folds={len(folds)}  n_features={x.shape[1]}")
+    print(
+        f"{venue:<13}  n={len(y)}  folds={len(evaluation.folds)}  "
+        f"n_features={evaluation.x.shape[1]}"
+    )
     print(
         f"               Ridge  R²={r_r2.mean():+.3f}±{r_r2.std():.2f}  "
         f"dir={r_dir.mean():.3f}  conf_dir={r_conf.mean():.3f}"
@@ -591,6 +430,14 @@ def main() -> None:
         "--ridge-only", action="store_true",
         help="skip GBDT (useful when generating predictions without comparison)",
     )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="processes to spread folds over; results match a serial run",
+    )
+    parser.add_argument(
+        "--gbdt-threads", type=int, default=1,
+        help="LightGBM/BLAS threads per fold (fixed so results don't depend on --workers)",
+    )
     args = parser.parse_args()
 
     gbdt_params = {
@@ -603,6 +450,8 @@ def main() -> None:
         "bagging_fraction": args.bagging_fraction,
         "bagging_freq": args.bagging_freq,
         "lambda_l2": args.lambda_l2,
+        "num_threads": args.gbdt_threads,
+        "deterministic": True,
         "verbose": -1,
     }
 
@@ -613,17 +462,41 @@ def main() -> None:
     print(f"lag windows (ms): {lag_windows}")
     print(f"gbdt params: {gbdt_params}")
 
-    for horizon in horizons:
-        print(f"\n=== horizon={horizon}ms  tolerance={args.tolerance_ms}ms ===")
-        for venue in sorted(series.keys()):
-            evaluate_venue(
-                venue, series, horizon, args.tolerance_ms, lag_windows,
-                args.train_size, args.test_size, args.step,
-                args.ridge_alpha, gbdt_params, args.num_boost_round,
-                args.early_stopping_rounds, args.top_n_feats,
-                args.emit_predictions_dir, args.ridge_only,
-            )
-
+    keep_predictions = args.emit_predictions_dir is not None
+    with WalkForwardPool(args.workers, threads_per_worker=args.gbdt_threads) as pool:
+        for horizon in horizons:
+            print(f"\n=== horizon={horizon}ms  tolerance={args.tolerance_ms}ms ===")
+            prepared = [
+                prepare_venue(
+                    venue, series, horizon, args.tolerance_ms, lag_windows,
+                    args.train_size, args.test_size, args.step,
+                )
+                for venue in sorted(series.keys())
+            ]
+            evaluations = [e for e in prepared if isinstance(e, VenueEvaluation)]
+            jobs = [
+                WalkForwardJob(
+                    e.x, e.y, e.folds, run_fold,
+                    (
+                        args.ridge_alpha,
+                        keep_predictions,
+                        None if args.ridge_only else (
+                            e.feature_names, gbdt_params,
+                            args.num_boost_round, args.early_stopping_rounds,
+                        ),
+                    ),
+                )
+                for e in evaluations
+            ]
+            results = iter(pool.run(jobs))
+            for e in prepared:
+                if isinstance(e, str):
+                    print(e)
+                    continue
+                report_venue(
+                    e, next(results), horizon, args.top_n_feats,
+                    args.emit_predictions_dir, args.ridge_only,
+                )
 
 if __name__ == "__main__":
     main()
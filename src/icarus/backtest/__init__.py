@@ -0,0 +1,24 @@
+"""Backtest and paper-trading kernels shared by offline sweeps and live simulation."""
+
+from icarus.backtest.maker import (
+    BUY,
+    SELL,
+    MakerFills,
+    MakerFillSimulator,
+    MakerQuoteConfig,
+    MakerTicks,
+)
+from icarus.backtest.sweep import SweepCell, collect_round_robin, deal_round_robin, sweep_grid
+
+__all__ = [
+    "BUY",
+    "SELL",
+    "MakerFillSimulator",
+    "MakerFills",
+    "MakerQuoteConfig",
+    "MakerTicks",
+    "SweepCell",
+    "collect_round_robin",
+    "deal_round_robin",
+    "sweep_grid",
+]
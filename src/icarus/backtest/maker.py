@@ -0,0 +1,468 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import math
+from collections.abc import MutableSequence, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+numba = importlib.import_module("numba") if importlib.util.find_spec("numba") else None
+
+type FloatArray = npt.NDArray[np.float64]
+type IntArray = npt.NDArray[np.int64]
+type BoolArray = npt.NDArray[np.bool_]
+
+BUY = 1
+SELL = -1
+
+# Slots of the float and int state vectors carried between kernel calls. A
+# quote price of NaN means no live quote on that side.
+_INVENTORY, _CASH, _BID_PRICE, _BID_QUEUE, _ASK_PRICE, _ASK_QUEUE = range(6)
+_BID_GO_LIVE_TS, _ASK_GO_LIVE_TS, _QUOTES_POSTED, _QUOTE_MS_BID, _QUOTE_MS_ASK = range(5)
+_LAST_TS, _TICKS_SEEN = 5, 6
+
+
+@dataclass(frozen=True, slots=True)
+class MakerQuoteConfig:
+    """Quoting rules for one maker: a two-sided quote around a skewed center.
+
+    Quotes sit at ``venue_mid + skew_coef * drift_hat - inventory *
+    inventory_skew ± half_spread`` and are reposted when they drift more than
+    ``requote_threshold`` from that, which resets the queue and waits
+    ``latency_ms`` before the order can fill. With ``single_sided`` only the
+    side facing the dislocation is quoted.
+    """
+
+    half_spread: float
+    fee_bps: float
+    max_inventory: float
+    order_size: float = 1.0
+    skew_coef: float = 0.0
+    inventory_skew: float = 0.0
+    latency_ms: int = 0
+    queue_scale: float = 1.0
+    requote_threshold: float = 0.0
+    single_sided: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class MakerTicks:
+    """One venue's market ticks as aligned arrays; a missing bid/ask is NaN.
+
+    ``trade_buy_size``/``trade_sell_size`` are the taker flow since the
+    previous tick and ``top_*_depth`` the size resting at the touch.
+    """
+
+    timestamp_ms: IntArray
+    venue_mid: FloatArray
+    venue_bid: FloatArray
+    venue_ask: FloatArray
+    top_bid_depth: FloatArray
+    top_ask_depth: FloatArray
+    trade_buy_size: FloatArray
+    trade_sell_size: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ms)
+
+
+@dataclass(frozen=True, slots=True)
+class MakerFills:
+    """Fills from one kernel call: tick index, side (``BUY``/``SELL``), price, fee."""
+
+    index: IntArray
+    side: npt.NDArray[np.int8]
+    price: FloatArray
+    fee: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class MakerFillSimulator:
+    """Queue-and-latency fill model for a single resting maker quote per side.
+
+    Each tick the quotes are reposted if needed, then a live bid fills when
+    the book crosses it or when it sits at or inside the best bid and the
+    tick's sell flow drains the queue ahead of it (symmetric for the ask).
+    State carries across calls, so a backtest can ``run`` a whole array of
+    ticks and a live paper trader can ``step`` one tick at a time through the
+    same kernel with the same fills. ``run`` uses a numba-compiled kernel
+    when numba is installed (``use_numba=None``) and plain Python otherwise;
+    the arithmetic, and so every fill, is the same either way.
+    """
+
+    def __init__(self, config: MakerQuoteConfig, *, use_numba: bool | None = None) -> None:
+        if use_numba and numba is None:
+            raise RuntimeError("The 'numba' package is required for the compiled fill kernel.")
+        self.config = config
+        self.use_numba = numba is not None if use_numba is None else use_numba
+        self._quote_state: list[float] = [0.0, 0.0, math.nan, 0.0, math.nan, 0.0]
+        self._counters: list[int] = [0, 0, 0, 0, 0, 0, 0]
+
+    @property
+    def inventory(self) -> float:
+        return self._quote_state[_INVENTORY]
+
+    @property
+    def cash(self) -> float:
+        return self._quote_state[_CASH]
+
+    @property
+    def live_bid_price(self) -> float | None:
+        price = self._quote_state[_BID_PRICE]
+        return None if math.isnan(price) else price
+
+    @property
+    def live_ask_price(self) -> float | None:
+        price = self._quote_state[_ASK_PRICE]
+        return None if math.isnan(price) else price
+
+    @property
+    def quotes_posted(self) -> int:
+        return self._counters[_QUOTES_POSTED]
+
+    @property
+    def quote_ms_bid(self) -> int:
+        """Milliseconds a bid rested without being reposted, summed over ticks."""
+        return self._counters[_QUOTE_MS_BID]
+
+    @property
+    def quote_ms_ask(self) -> int:
+        return self._counters[_QUOTE_MS_ASK]
+
+    def run(
+        self,
+        ticks: MakerTicks,
+        drift_hat: FloatArray | None = None,
+        *,
+        quotable: BoolArray | None = None,
+        dislocation: FloatArray | None = None,
+    ) -> MakerFills:
+        """Quote and fill over ``ticks`` in order.
+
+        ``drift_hat`` is the already-clipped drift per tick (zero when None).
+        Where ``quotable`` is False both quotes are cancelled and the tick is
+        skipped. ``dislocation`` (venue mid minus its model price) is required
+        for ``single_sided`` quoting.
+        """
+        n = len(ticks)
+        if self.config.single_sided and dislocation is None:
+            raise ValueError("single_sided quoting needs a dislocation per tick.")
+        for name, column in (("drift_hat", drift_hat), ("quotable", quotable)):
+            if column is not None and len(column) != n:
+                raise ValueError(f"{name} must have one value per tick.")
+        if dislocation is not None and len(dislocation) != n:
+            raise ValueError("dislocation must have one value per tick.")
+
+        if self.use_numba:
+            return self._run_compiled(ticks, drift_hat, quotable, dislocation)
+        inputs = [
+            ticks.timestamp_ms.tolist(),
+            ticks.venue_mid.tolist(),
+            ticks.venue_bid.tolist(),
+            ticks.venue_ask.tolist(),
+            ticks.top_bid_depth.tolist(),
+            ticks.top_ask_depth.tolist(),
+            ticks.trade_buy_size.tolist(),
+            ticks.trade_sell_size.tolist(),
+            drift_hat.tolist() if drift_hat is not None else [0.0] * n,
+            quotable.tolist() if quotable is not None else [True] * n,
+            dislocation.tolist() if dislocation is not None else [0.0] * n,
+        ]
+        index: list[int] = [0] * (2 * n)
+        side: list[int] = [0] * (2 * n)
+        price: list[float] = [0.0] * (2 * n)
+        fee: list[float] = [0.0] * (2 * n)
+        count = self._call(inputs, [index, side, price, fee])
+        return MakerFills(
+            index=np.asarray(index[:count], dtype=np.int64),
+            side=np.asarray(side[:count], dtype=np.int8),
+            price=np.asarray(price[:count], dtype=np.float64),
+            fee=np.asarray(fee[:count], dtype=np.float64),
+        )
+
+    def step(
+        self,
+        timestamp_ms: int,
+        venue_mid: float,
+        venue_bid: float | None,
+        venue_ask: float | None,
+        top_bid_depth: float,
+        top_ask_depth: float,
+        trade_buy_size: float,
+        trade_sell_size: float,
+        drift_hat: float = 0.0,
+    ) -> list[tuple[int, float, float]]:
+        """One live tick through the kernel; returns its (side, price, fee) fills.
+
+        Always runs the plain-Python kernel: for a single tick it is cheaper
+        than converting to arrays, and fills match ``run`` exactly.
+        """
+        inputs: list[list[Any]] = [
+            [timestamp_ms],
+            [venue_mid],
+            [math.nan if venue_bid is None else venue_bid],
+            [math.nan if venue_ask is None else venue_ask],
+            [top_bid_depth],
+            [top_ask_depth],
+            [trade_buy_size],
+            [trade_sell_size],
+            [drift_hat],
+            [True],
+            [0.0],
+        ]
+        outputs: list[list[Any]] = [[0, 0], [0, 0], [0.0, 0.0], [0.0, 0.0]]
+        count = self._call(inputs, outputs)
+        _, side, price, fee = outputs
+        return [(side[k], price[k], fee[k]) for k in range(count)]
+
+    def _run_compiled(
+        self,
+        ticks: MakerTicks,
+        drift_hat: FloatArray | None,
+        quotable: BoolArray | None,
+        dislocation: FloatArray | None,
+    ) -> MakerFills:
+        n = len(ticks)
+
+        def floats(values: FloatArray | None) -> FloatArray:
+            if values is None:
+                return np.zeros(n, dtype=np.float64)
+            return np.ascontiguousarray(values, dtype=np.float64)
+
+        inputs = [
+            np.ascontiguousarray(ticks.timestamp_ms, dtype=np.int64),
+            floats(ticks.venue_mid),
+            floats(ticks.venue_bid),
+            floats(ticks.venue_ask),
+            floats(ticks.top_bid_depth),
+            floats(ticks.top_ask_depth),
+            floats(ticks.trade_buy_size),
+            floats(ticks.trade_sell_size),
+            floats(drift_hat),
+            (
+                np.ascontiguousarray(quotable, dtype=np.bool_)
+                if quotable is not None
+                else np.ones(n, dtype=np.bool_)
+            ),
+            floats(dislocation),
+        ]
+        index = np.empty(2 * n, dtype=np.int64)
+        side = np.empty(2 * n, dtype=np.int8)
+        price = np.empty(2 * n, dtype=np.float64)
+        fee = np.empty(2 * n, dtype=np.float64)
+        quote_state = np.asarray(self._quote_state, dtype=np.float64)
+        counters = np.asarray(self._counters, dtype=np.int64)
+        count = int(
+            _compiled_fill_kernel()(
+                *inputs, *self._scalars(), quote_state, counters, index, side, price, fee
+            )
+        )
+        self._quote_state = quote_state.tolist()
+        self._counters = counters.tolist()
+        return MakerFills(
+            index=index[:count].copy(),
+            side=side[:count].copy(),
+            price=price[:count].copy(),
+            fee=fee[:count].copy(),
+        )
+
+    def _call(self, inputs: Sequence[Any], outputs: Sequence[MutableSequence[Any]]) -> int:
+        args = [*inputs, *self._scalars(), self._quote_state, self._counters, *outputs]
+        count: int = _fill_kernel(*args)
+        return count
+
+    def _scalars(self) -> tuple[Any, ...]:
+        config = self.config
+        return (
+            config.half_spread,
+            config.skew_coef,
+            config.fee_bps / 10_000.0,
+            config.latency_ms,
+            config.queue_scale,
+            config.order_size,
+            config.requote_threshold,
+            config.inventory_skew,
+            config.max_inventory,
+            config.single_sided,
+        )
+
+
+def _fill_kernel(
+    timestamp_ms: Any,
+    venue_mid: Any,
+    venue_bid: Any,
+    venue_ask: Any,
+    top_bid_depth: Any,
+    top_ask_depth: Any,
+    trade_buy_size: Any,
+    trade_sell_size: Any,
+    drift_hat: Any,
+    quotable: Any,
+    dislocation: Any,
+    half_spread: float,
+    skew_coef: float,
+    fee_rate: float,
+    latency_ms: int,
+    queue_scale: float,
+    order_size: float,
+    requote_threshold: float,
+    inventory_skew: float,
+    max_inventory: float,
+    single_sided: bool,
+    quote_state: Any,
+    counters: Any,
+    fill_index: Any,
+    fill_side: Any,
+    fill_price: Any,
+    fill_fee: Any,
+) -> int:
+    # Written against indexable sequences so the same body runs compiled over
+    # arrays and as plain Python over lists. State lives in locals for the
+    # loop and is written back at the end.
+    inventory = quote_state[_INVENTORY]
+    cash = quote_state[_CASH]
+    bid_price = quote_state[_BID_PRICE]
+    bid_queue = quote_state[_BID_QUEUE]
+    ask_price = quote_state[_ASK_PRICE]
+    ask_queue = quote_state[_ASK_QUEUE]
+    bid_go_live_ts = counters[_BID_GO_LIVE_TS]
+    ask_go_live_ts = counters[_ASK_GO_LIVE_TS]
+    quotes_posted = counters[_QUOTES_POSTED]
+    quote_ms_bid = counters[_QUOTE_MS_BID]
+    quote_ms_ask = counters[_QUOTE_MS_ASK]
+    n = len(timestamp_ms)
+    last_ts = counters[_LAST_TS]
+    if counters[_TICKS_SEEN] == 0 and n > 0:
+        last_ts = timestamp_ms[0]
+    count = 0
+
+    for i in range(n):
+        ts = timestamp_ms[i]
+        dt_ms = ts - last_ts
+        last_ts = ts
+
+        if not quotable[i]:
+            # Cancel any live quotes while the tick is gated out.
+            bid_price = math.nan
+            ask_price = math.nan
+            continue
+
+        mid = venue_mid[i]
+        best_bid = venue_bid[i]
+        best_ask = venue_ask[i]
+        center = mid + skew_coef * drift_hat[i] + -inventory * inventory_skew
+        desired_bid = center - half_spread
+        desired_ask = center + half_spread
+
+        quote_bid = inventory < max_inventory
+        quote_ask = inventory > -max_inventory
+        if single_sided:
+            quote_bid = quote_bid and dislocation[i] < 0
+            quote_ask = quote_ask and dislocation[i] > 0
+
+        # Repost when the desired price moved past the threshold: pay the
+        # latency again and queue behind the touch unless strictly inside it.
+        if quote_bid:
+            if math.isnan(bid_price) or abs(bid_price - desired_bid) > requote_threshold:
+                bid_price = desired_bid
+                if bid_price > best_bid:
+                    bid_queue = 0.0
+                else:
+                    bid_queue = top_bid_depth[i] * queue_scale
+                bid_go_live_ts = ts + latency_ms
+                quotes_posted += 1
+            else:
+                quote_ms_bid += dt_ms
+        else:
+            bid_price = math.nan
+
+        if quote_ask:
+            if math.isnan(ask_price) or abs(ask_price - desired_ask) > requote_threshold:
+                ask_price = desired_ask
+                if ask_price < best_ask:
+                    ask_queue = 0.0
+                else:
+                    ask_queue = top_ask_depth[i] * queue_scale
+                ask_go_live_ts = ts + latency_ms
+                quotes_posted += 1
+            else:
+                quote_ms_ask += dt_ms
+        else:
+            ask_price = math.nan
+
+        # A live bid fills when the book crosses it, or when it is at or inside
+        # the best bid and the sell flow drains the queue ahead of it. NaN
+        # comparisons are False, so a missing side never crosses.
+        bid_fills = False
+        if not math.isnan(bid_price) and ts >= bid_go_live_ts and inventory < max_inventory:
+            if best_ask <= bid_price:
+                bid_fills = True
+            elif (math.isnan(best_bid) or bid_price >= best_bid) and trade_sell_size[i] > 0:
+                consumed = min(trade_sell_size[i], bid_queue)
+                bid_queue -= consumed
+                if trade_sell_size[i] - consumed > 0 and bid_queue <= 0.0:
+                    bid_fills = True
+
+        ask_fills = False
+        if not math.isnan(ask_price) and ts >= ask_go_live_ts and inventory > -max_inventory:
+            if best_bid >= ask_price:
+                ask_fills = True
+            elif (math.isnan(best_ask) or ask_price <= best_ask) and trade_buy_size[i] > 0:
+                consumed = min(trade_buy_size[i], ask_queue)
+                ask_queue -= consumed
+                if trade_buy_size[i] - consumed > 0 and ask_queue <= 0.0:
+                    ask_fills = True
+
+        if bid_fills:
+            fee = fee_rate * bid_price * order_size
+            cash -= bid_price * order_size + fee
+            inventory += order_size
+            fill_index[count] = i
+            fill_side[count] = BUY
+            fill_price[count] = bid_price
+            fill_fee[count] = fee
+            count += 1
+            bid_price = math.nan
+        if ask_fills:
+            fee = fee_rate * ask_price * order_size
+            cash += ask_price * order_size - fee
+            inventory -= order_size
+            fill_index[count] = i
+            fill_side[count] = SELL
+            fill_price[count] = ask_price
+            fill_fee[count] = fee
+            count += 1
+            ask_price = math.nan
+
+    quote_state[_INVENTORY] = inventory
+    quote_state[_CASH] = cash
+    quote_state[_BID_PRICE] = bid_price
+    quote_state[_BID_QUEUE] = bid_queue
+    quote_state[_ASK_PRICE] = ask_price
+    quote_state[_ASK_QUEUE] = ask_queue
+    counters[_BID_GO_LIVE_TS] = bid_go_live_ts
+    counters[_ASK_GO_LIVE_TS] = ask_go_live_ts
+    counters[_QUOTES_POSTED] = quotes_posted
+    counters[_QUOTE_MS_BID] = quote_ms_bid
+    counters[_QUOTE_MS_ASK] = quote_ms_ask
+    counters[_LAST_TS] = last_ts
+    counters[_TICKS_SEEN] += n
+    return count
+
+
+_compiled: Any = None
+
+
+def _compiled_fill_kernel() -> Any:
+    """``_fill_kernel`` under numba, compiled (and disk-cached) on first use."""
+    global _compiled
+    if _compiled is None:
+        assert numba is not None
+        _compiled = numba.njit(cache=True)(_fill_kernel)
+    return _compiled
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import product
+
+
+@dataclass(frozen=True, slots=True)
+class SweepCell:
+    """One parameter combination of a maker sweep."""
+
+    half_spread: float
+    drift_skew_coef: float
+    fee_bps: float
+    latency_ms: int
+    queue_scale: float
+
+
+def sweep_grid(
+    half_spreads: Sequence[float],
+    skew_coefs: Sequence[float],
+    fee_bps: Sequence[float],
+    latencies_ms: Sequence[int],
+    queue_scales: Sequence[float],
+) -> list[SweepCell]:
+    """Cartesian product of the sweep axes, in print order.
+
+    Cells come in half-spread blocks, then skew, fee, latency and queue scale,
+    with the last axis varying fastest.
+    """
+    return [
+        SweepCell(half_spread, skew_coef, fee, latency_ms, queue_scale)
+        for half_spread, skew_coef, fee, latency_ms, queue_scale in product(
+            half_spreads, skew_coefs, fee_bps, latencies_ms, queue_scales
+        )
+    ]
+
+
+def deal_round_robin[T](items: Sequence[T], workers: int) -> list[list[T]]:
+    """Deal ``items`` round-robin into at most ``workers`` non-empty chunks.
+
+    Neighbouring cells usually cost about the same, so dealing rather than
+    slicing keeps the chunks balanced.
+    """
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    return [list(items[i::workers]) for i in range(min(workers, len(items)))]
+
+
+def collect_round_robin[T](chunks: Sequence[Sequence[T]]) -> list[T]:
+    """Invert ``deal_round_robin``: interleave per-chunk results back into item order."""
+    merged: list[T] = []
+    for position in range(max((len(chunk) for chunk in chunks), default=0)):
+        merged.extend(chunk[position] for chunk in chunks if position < len(chunk))
+    return merged
@@ -0,0 +1,35 @@
+"""Capture storage: columnar store, SQLite import, off-loop writer and raw frame recorder."""
+
+from icarus.capture.frames import (
+    FrameRecorder,
+    FrameRecorderStats,
+    FrameSegmentReader,
+    RecordedFrame,
+    iter_recorded_frames,
+)
+from icarus.capture.sqlite import convert_sqlite_capture
+from icarus.capture.store import (
+    BASIS_STATE_COLUMNS,
+    UPDATE_COLUMNS,
+    VENUE_STATE_COLUMNS,
+    ColumnarCaptureReader,
+    ColumnarCaptureWriter,
+)
+from icarus.capture.writer import CaptureSink, CaptureWriterStats, CaptureWriterThread
+
+__all__ = [
+    "BASIS_STATE_COLUMNS",
+    "CaptureSink",
+    "CaptureWriterStats",
+    "CaptureWriterThread",
+    "ColumnarCaptureReader",
+    "ColumnarCaptureWriter",
+    "FrameRecorder",
+    "FrameRecorderStats",
+    "FrameSegmentReader",
+    "RecordedFrame",
+    "UPDATE_COLUMNS",
+    "VENUE_STATE_COLUMNS",
+    "convert_sqlite_capture",
+    "iter_recorded_frames",
+]
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import gzip
+import importlib
+import importlib.util
+import logging
+import queue
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+zstandard = importlib.import_module("zstandard") if importlib.util.find_spec("zstandard") else None
+
+type FrameCodec = Literal["gzip", "zstd"]
+
+DEFAULT_BLOCK_FRAMES = 2_048
+DEFAULT_BLOCK_INTERVAL_S = 1.0
+DEFAULT_SEGMENT_BYTES = 256 * 1024 * 1024
+DEFAULT_SEGMENT_INTERVAL_S = 3_600.0
+DEFAULT_MAX_PENDING_BLOCKS = 512
+
+SEGMENT_SUFFIXES: dict[FrameCodec, str] = {"gzip": ".frames.gz", "zstd": ".frames.zst"}
+INDEX_SUFFIX = ".idx"
+
+# One entry per compressed block, appended once the block is on disk.
+INDEX_DTYPE = np.dtype(
+    [
+        ("offset", "<u8"),
+        ("length", "<u4"),
+        ("frames", "<u4"),
+        ("first_ns", "<i8"),
+        ("last_ns", "<i8"),
+    ]
+)
+# Per frame inside a block: receive time (ns since epoch), payload length, payload kind.
+_FRAME_HEADER = struct.Struct("<qIB")
+_TEXT = 0
+_BINARY = 1
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedFrame:
+    received_ns: int
+    payload: str | bytes
+
+    @property
+    def received_timestamp_ms(self) -> int:
+        return self.received_ns // 1_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class FrameRecorderStats:
+    label: str
+    frames: int
+    blocks_written: int
+    raw_bytes: int
+    compressed_bytes: int
+    dropped_frames: int
+    segments: int
+
+
+_CLOSE = object()
+
+
+class FrameRecorder:
+    """Tees raw websocket frames, with receive timestamps, into compressed segments.
+
+    ``record`` only stamps the frame and appends it to the open block, so the
+    socket's read loop pays well under a microsecond per message. A block is
+    handed to a writer thread once it holds ``block_frames`` frames, or when a
+    frame arrives ``block_interval_s`` after the block opened. The thread
+    compresses each block as one independent gzip member or zstd frame,
+    appends it to the current segment, then appends the block's offset and
+    time range to the segment's ``.idx`` sidecar. A segment is therefore a
+    plain concatenated gzip/zstd stream, and the index makes it seekable by
+    receive time. Segments roll over after ``segment_bytes`` compressed bytes
+    or ``segment_interval_s`` seconds and are named ``<label>-<first receive ns>``.
+
+    If the writer falls ``max_pending_blocks`` behind, or has stopped on an
+    error (raised again by ``close``), blocks are dropped and counted rather
+    than stalling the socket. The writer thread starts on first use and only
+    configuration is pickled, so a socket carrying a recorder can be handed to
+    an ingest worker process, which then records on its own. ``clock`` returns
+    the receive time in nanoseconds since the epoch. ``zstd`` needs the
+    optional ``zstandard`` package.
+    """
+
+    _block: list[tuple[int, str | bytes]]
+    _queue: queue.Queue[Any]
+    _thread: threading.Thread | None
+    _error: BaseException | None
+
+    def __init__(
+        self,
+        directory: Path,
+        label: str,
+        *,
+        codec: FrameCodec = "gzip",
+        level: int | None = None,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        block_interval_s: float = DEFAULT_BLOCK_INTERVAL_S,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        segment_interval_s: float = DEFAULT_SEGMENT_INTERVAL_S,
+        max_pending_blocks: int = DEFAULT_MAX_PENDING_BLOCKS,
+        clock: Callable[[], int] = time.time_ns,
+    ) -> None:
+        if codec not in SEGMENT_SUFFIXES:
+            raise ValueError(f"unknown frame codec {codec!r}.")
+        if codec == "zstd" and zstandard is None:
+            raise RuntimeError(
+                "The 'zstandard' package is required for zstd frame segments. "
+                "Install it or record with codec='gzip'."
+            )
+        if block_frames <= 0:
+            raise ValueError("block_frames must be positive.")
+        if block_interval_s <= 0 or segment_interval_s <= 0:
+            raise ValueError("block_interval_s and segment_interval_s must be positive.")
+        if segment_bytes <= 0 or max_pending_blocks <= 0:
+            raise ValueError("segment_bytes and max_pending_blocks must be positive.")
+        self.directory = Path(directory)
+        self.label = label
+        self.codec: FrameCodec = codec
+        self.level = level
+        self.block_frames = block_frames
+        self.block_interval_s = block_interval_s
+        self.segment_bytes = segment_bytes
+        self.segment_interval_s = segment_interval_s
+        self.max_pending_blocks = max_pending_blocks
+        self.clock = clock
+        self._reset_runtime()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "label": self.label,
+            "codec": self.codec,
+            "level": self.level,
+            "block_frames": self.block_frames,
+            "block_interval_s": self.block_interval_s,
+            "segment_bytes": self.segment_bytes,
+            "segment_interval_s": self.segment_interval_s,
+            "max_pending_blocks": self.max_pending_blocks,
+            "clock": self.clock,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset_runtime()
+
+    def record(self, payload: str | bytes) -> None:
+        """Stamp ``payload`` with the current time and append it to the open block."""
+        received_ns = self.clock()
+        block = self._block
+        block.append((received_ns, payload))
+        if len(block) == 1:
+            self._block_due_ns = received_ns + self._block_interval_ns
+        if len(block) >= self.block_frames or received_ns >= self._block_due_ns:
+            self._submit()
+
+    def flush(self) -> None:
+        """Hand the open block to the writer without waiting for it to fill."""
+        if self._block:
+            self._submit()
+
+    def close(self) -> None:
+        """Write every recorded frame, finish the current segment and stop the writer.
+
+        Recording again afterwards starts a new segment.
+        """
+        self.flush()
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_CLOSE)
+        thread.join()
+        self._thread = None
+        error = self._error
+        self._error = None
+        if error is not None:
+            raise error
+
+    def stats(self) -> FrameRecorderStats:
+        return FrameRecorderStats(
+            label=self.label,
+            frames=self._frames,
+            blocks_written=self._blocks_written,
+            raw_bytes=self._raw_bytes,
+            compressed_bytes=self._compressed_bytes,
+            dropped_frames=self._dropped_frames,
+            segments=self._segments,
+        )
+
+    def _reset_runtime(self) -> None:
+        self._block = []
+        self._block_interval_ns = int(self.block_interval_s * 1e9)
+        self._block_due_ns = 0
+        self._queue = queue.Queue(maxsize=self.max_pending_blocks)
+        self._thread = None
+        self._error = None
+        self._frames = 0
+        self._blocks_written = 0
+        self._raw_bytes = 0
+        self._compressed_bytes = 0
+        self._dropped_frames = 0
+        self._segments = 0
+
+    def _submit(self) -> None:
+        block = self._block
+        self._block = []
+        self._frames += len(block)
+        if self._error is not None:
+            # The writer already logged why it stopped; keep the socket reading.
+            self._dropped_frames += len(block)
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"frame-recorder-{self.label}", daemon=True
+            )
+            self._thread.start()
+        try:
+            self._queue.put_nowait(block)
+        except queue.Full:
+            self._dropped_frames += len(block)
+
+    def _run(self) -> None:
+        segment: BinaryIO | None = None
+        index: BinaryIO | None = None
+        segment_started_ns = 0
+        segment_size = 0
+        compress = _compressor(self.codec, self.level)
+        try:
+            while True:
+                block = self._queue.get()
+                if block is _CLOSE:
+                    break
+                first_ns = block[0][0]
+                if segment is not None and (
+                    segment_size >= self.segment_bytes
+                    or first_ns - segment_started_ns >= self.segment_interval_s * 1e9
+                ):
+                    _close_files(segment, index)
+                    segment = index = None
+                if segment is None:
+                    segment, index = self._open_segment(first_ns)
+                    segment_started_ns = first_ns
+                    segment_size = 0
+
+                raw = _encode_block(block)
+                data = compress(raw)
+                segment.write(data)
+                segment.flush()
+                assert index is not None
+                entry = np.array(
+                    [(segment_size, len(data), len(block), first_ns, block[-1][0])],
+                    dtype=INDEX_DTYPE,
+                )
+                index.write(entry.tobytes())
+                index.flush()
+                segment_size += len(data)
+                self._blocks_written += 1
+                self._raw_bytes += len(raw)
+                self._compressed_bytes += len(data)
+        except BaseException as exc:
+            logger.exception("frame recorder %s stopped", self.label)
+            self._error = exc
+        finally:
+            if segment is not None:
+                _close_files(segment, index)
+
+    def _open_segment(self, first_ns: int) -> tuple[BinaryIO, BinaryIO]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.label}-{first_ns:020d}{SEGMENT_SUFFIXES[self.codec]}"
+        self._segments += 1
+        return path.open("ab"), _index_path(path).open("ab")
+
+
+class FrameSegmentReader:
+    """Reads one recorded segment, using its index to seek by receive time."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.codec = _segment_codec(self.path)
+        raw = _index_path(self.path).read_bytes()
+        # A crash can leave a partial trailing entry; every whole entry is on disk.
+        usable = len(raw) - len(raw) % INDEX_DTYPE.itemsize
+        self.index: npt.NDArray[Any] = np.frombuffer(raw[:usable], dtype=INDEX_DTYPE)
+
+    @property
+    def frames(self) -> int:
+        return int(self.index["frames"].sum())
+
+    @property
+    def first_ns(self) -> int | None:
+        return int(self.index["first_ns"][0]) if len(self.index) else None
+
+    @property
+    def last_ns(self) -> int | None:
+        return int(self.index["last_ns"][-1]) if len(self.index) else None
+
+    def iter_frames(
+        self,
+        *,
+        start_ns: int | None = None,
+        end_ns: int | None = None,
+    ) -> Iterator[RecordedFrame]:
+        """Yield frames received in ``[start_ns, end_ns)``, decompressing only those blocks."""
+        index = self.index
+        first = 0 if start_ns is None else int(np.searchsorted(index["last_ns"], start_ns))
+        stop = len(index) if end_ns is None else int(np.searchsorted(index["first_ns"], end_ns))
+        if first >= stop:
+            return
+        decompress = _decompressor(self.codec)
+        with self.path.open("rb") as handle:
+            for entry in index[first:stop]:
+                handle.seek(int(entry["offset"]))
+                raw = decompress(handle.read(int(entry["length"])))
+                for frame in _decode_block(raw):
+                    if start_ns is not None and frame.received_ns < start_ns:
+                        continue
+                    if end_ns is not None and frame.received_ns >= end_ns:
+                        return
+                    yield frame
+
+
+def list_frame_segments(directory: Path, label: str | None = None) -> list[Path]:
+    """Recorded segments under ``directory`` (optionally for one label), oldest first."""
+    segments = [
+        path
+        for suffix in SEGMENT_SUFFIXES.values()
+        for path in Path(directory).glob(f"{label or '*'}-*{suffix}")
+        if label is None or path.name[: -len(suffix)].rsplit("-", 1)[0] == label
+    ]
+    return sorted(segments, key=lambda path: (_segment_label(path), path.name))
+
+
+def frame_labels(directory: Path) -> list[str]:
+    return sorted({_segment_label(path) for path in list_frame_segments(directory)})
+
+
+def iter_recorded_frames(
+    directory: Path,
+    label: str,
+    *,
+    start_ns: int | None = None,
+    end_ns: int | None = None,
+) -> Iterator[RecordedFrame]:
+    """Yield one label's recorded frames across all of its segments, in receive order."""
+    for path in list_frame_segments(directory, label):
+        reader = FrameSegmentReader(path)
+        if end_ns is not None and reader.first_ns is not None and reader.first_ns >= end_ns:
+            break
+        yield from reader.iter_frames(start_ns=start_ns, end_ns=end_ns)
+
+
+def _encode_block(block: Iterable[tuple[int, str | bytes]]) -> bytes:
+    pack = _FRAME_HEADER.pack
+    parts: list[bytes] = []
+    for received_ns, payload in block:
+        if isinstance(payload, str):
+            data = payload.encode()
+            kind = _TEXT
+        else:
+            data = bytes(payload)
+            kind = _BINARY
+        parts.append(pack(received_ns, len(data), kind))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _decode_block(raw: bytes) -> Iterator[RecordedFrame]:
+    unpack = _FRAME_HEADER.unpack_from
+    header_size = _FRAME_HEADER.size
+    position = 0
+    view = memoryview(raw)
+    while position < len(raw):
+        received_ns, length, kind = unpack(raw, position)
+        position += header_size
+        data = view[position : position + length]
+        position += length
+        payload: str | bytes = str(data, "utf-8") if kind == _TEXT else bytes(data)
+        yield RecordedFrame(received_ns=received_ns, payload=payload)
+
+
+def _compressor(codec: FrameCodec, level: int | None) -> Any:
+    if codec == "zstd":
+        assert zstandard is not None
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress
+    compresslevel = 6 if level is None else level
+    return lambda data: gzip.compress(data, compresslevel=compresslevel, mtime=0)
+
+
+def _decompressor(codec: FrameCodec) -> Any:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("The 'zstandard' package is required to read zstd segments.")
+        return zstandard.ZstdDecompressor().decompress
+    return gzip.decompress
+
+
+def _segment_codec(path: Path) -> FrameCodec:
+    for codec, suffix in SEGMENT_SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return codec
+    raise ValueError(f"{path} is not a recorded frame segment.")
+
+
+def _segment_label(path: Path) -> str:
+    suffix = SEGMENT_SUFFIXES[_segment_codec(path)]
+    return path.name[: -len(suffix)].rsplit("-", 1)[0]
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + INDEX_SUFFIX)
+
+
+def _close_files(segment: BinaryIO, index: BinaryIO | None) -> None:
+    segment.close()
+    if index is not None:
+        index.close()
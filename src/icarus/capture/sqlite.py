@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .store import (
+    ALL,
+    BASIS_STATES,
+    DEFAULT_SEGMENT_ROWS,
+    UPDATES,
+    VENUE_STATES,
+    ColumnarCaptureReader,
+    ColumnarCaptureWriter,
+)
+
+_VENUE_FLOAT_COLUMNS = (
+    "fair_value",
+    "variance",
+    "age_ms",
+    "bid_price",
+    "ask_price",
+    "microprice",
+    "depth_imbalance",
+    "top_bid_depth",
+    "top_ask_depth",
+    "mid_volatility_bps",
+    "trade_net_flow",
+    "trade_buy_size",
+    "trade_sell_size",
+)
+_UPDATE_FLOAT_COLUMNS = (
+    "composite_price",
+    "composite_variance",
+    "kalman_filtered_price",
+    "kalman_raw_fused_price",
+    "basis_common_price",
+    "basis_common_stddev",
+)
+_UPDATE_MASK_COLUMNS = (
+    ("contributing_exchanges_json", "contributing_exchanges_mask"),
+    ("kalman_used_venues_json", "kalman_used_venues_mask"),
+    ("basis_active_venues_json", "basis_active_venues_mask"),
+)
+
+
+def convert_sqlite_capture(
+    sqlite_path: Path,
+    store_path: Path,
+    *,
+    segment_rows: int = DEFAULT_SEGMENT_ROWS,
+    chunk_updates: int = 50_000,
+) -> int:
+    """Convert a ``capture_filter_eval`` SQLite file into a columnar store.
+
+    Reads ``updates`` in ``id`` order, ``chunk_updates`` at a time, with the
+    matching ``venue_states``/``basis_states`` rows, and appends them as whole
+    columns. Original update ids are preserved. Venue columns added to the
+    capture schema over time (top of book, depth, trade flow) are filled with
+    NaN/0 when an older file lacks them. Returns the number of updates written.
+    """
+    if ColumnarCaptureReader.is_store(store_path):
+        raise ValueError(f"{store_path} already contains a columnar capture store")
+
+    conn = sqlite3.connect(str(sqlite_path))
+    try:
+        venue_present = _table_columns(conn, "venue_states")
+        venue_select = ", ".join(
+            name if name in venue_present else f"NULL AS {name}"
+            for name in (*_VENUE_FLOAT_COLUMNS, "trade_count")
+        )
+        update_query = f"""
+            SELECT id, timestamp_ms, event_exchange, event_market, anchor_exchange,
+                   anchor_present, basis_is_live, {", ".join(_UPDATE_FLOAT_COLUMNS)},
+                   {", ".join(source for source, _ in _UPDATE_MASK_COLUMNS)}
+            FROM updates
+            ORDER BY id
+        """
+        venue_query = f"""
+            SELECT update_id, exchange, venue_kind, {venue_select}
+            FROM venue_states
+            WHERE update_id BETWEEN ? AND ?
+            ORDER BY update_id
+        """
+        basis_query = """
+            SELECT update_id, exchange, basis_estimate, basis_stddev
+            FROM basis_states
+            WHERE update_id BETWEEN ? AND ?
+            ORDER BY update_id
+        """
+
+        total = 0
+        with ColumnarCaptureWriter(store_path, segment_rows=segment_rows) as writer:
+            cursor = conn.execute(update_query)
+            while True:
+                rows = cursor.fetchmany(chunk_updates)
+                if not rows:
+                    break
+                update_ids = np.fromiter((row[0] for row in rows), dtype="<i8", count=len(rows))
+                timestamps = np.fromiter((row[1] for row in rows), dtype="<i8", count=len(rows))
+                _append_updates(writer, rows, update_ids, timestamps)
+
+                lo, hi = int(update_ids[0]), int(update_ids[-1])
+                _append_partitioned(
+                    writer,
+                    VENUE_STATES,
+                    conn.execute(venue_query, (lo, hi)).fetchall(),
+                    update_ids,
+                    timestamps,
+                )
+                _append_partitioned(
+                    writer,
+                    BASIS_STATES,
+                    conn.execute(basis_query, (lo, hi)).fetchall(),
+                    update_ids,
+                    timestamps,
+                )
+                total += len(rows)
+                writer.maybe_flush()
+        return total
+    finally:
+        conn.close()
+
+
+def _append_updates(
+    writer: ColumnarCaptureWriter,
+    rows: list[tuple[Any, ...]],
+    update_ids: np.ndarray,
+    timestamps: np.ndarray,
+) -> None:
+    mask_cache: dict[str, int] = {}
+
+    def mask(payload: str | None) -> int:
+        if payload is None:
+            return 0
+        cached = mask_cache.get(payload)
+        if cached is None:
+            cached = writer.symbol_mask(json.loads(payload))
+            mask_cache[payload] = cached
+        return cached
+
+    float_offset = 7
+    mask_offset = float_offset + len(_UPDATE_FLOAT_COLUMNS)
+    columns: dict[str, Any] = {
+        "update_id": update_ids,
+        "timestamp_ms": timestamps,
+        "event_exchange": [writer.symbol_code(row[2]) for row in rows],
+        "event_market": [writer.symbol_code(row[3]) for row in rows],
+        "anchor_exchange": [writer.symbol_code(row[4]) for row in rows],
+        "anchor_present": [bool(row[5]) for row in rows],
+        "basis_is_live": [bool(row[6]) for row in rows],
+    }
+    for offset, name in enumerate(_UPDATE_FLOAT_COLUMNS):
+        columns[name] = [row[float_offset + offset] for row in rows]
+    for offset, (_, name) in enumerate(_UPDATE_MASK_COLUMNS):
+        columns[name] = [mask(row[mask_offset + offset]) for row in rows]
+    writer.append_columns(UPDATES, ALL, columns)
+
+
+def _append_partitioned(
+    writer: ColumnarCaptureWriter,
+    table: str,
+    rows: list[tuple[Any, ...]],
+    update_ids: np.ndarray,
+    timestamps: np.ndarray,
+) -> None:
+    if not rows:
+        return
+    row_update_ids = np.fromiter((row[0] for row in rows), dtype="<i8", count=len(rows))
+    row_timestamps = timestamps[np.searchsorted(update_ids, row_update_ids)]
+    exchanges = np.asarray([row[1] for row in rows])
+    for exchange in np.unique(exchanges):
+        selected = np.flatnonzero(exchanges == exchange)
+        picked = [rows[i] for i in selected]
+        columns: dict[str, Any] = {
+            "update_id": row_update_ids[selected],
+            "timestamp_ms": row_timestamps[selected],
+        }
+        if table == VENUE_STATES:
+            columns["is_perp"] = [row[2] == "perp" for row in picked]
+            for offset, name in enumerate(_VENUE_FLOAT_COLUMNS):
+                columns[name] = [row[3 + offset] for row in picked]
+            columns["trade_count"] = [
+                row[3 + len(_VENUE_FLOAT_COLUMNS)] or 0 for row in picked
+            ]
+        else:
+            columns["basis_estimate"] = [row[2] for row in picked]
+            columns["basis_stddev"] = [row[3] for row in picked]
+        writer.append_columns(table, str(exchange), columns)
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {str(row[1]) for row in conn.execute(f"PRAGMA table_info({table})")}
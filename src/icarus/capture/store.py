@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+FORMAT_NAME = "icarus-columnar-capture"
+FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+DEFAULT_SEGMENT_ROWS = 100_000
+
+UPDATES = "updates"
+VENUE_STATES = "venue_states"
+BASIS_STATES = "basis_states"
+
+# Single unpartitioned partition name used for the ``updates`` table.
+ALL = "all"
+
+# Column name -> dtype for each table. Missing float values are stored as NaN.
+# Symbol columns hold codes into the store's symbol table; ``*_mask`` columns
+# hold one bit per symbol code (so a store can name at most 64 symbols).
+UPDATE_COLUMNS: dict[str, str] = {
+    "update_id": "<i8",
+    "timestamp_ms": "<i8",
+    "event_exchange": "<i2",
+    "event_market": "<i2",
+    "anchor_exchange": "<i2",
+    "anchor_present": "|b1",
+    "basis_is_live": "|b1",
+    "composite_price": "<f8",
+    "composite_variance": "<f8",
+    "kalman_filtered_price": "<f8",
+    "kalman_raw_fused_price": "<f8",
+    "basis_common_price": "<f8",
+    "basis_common_stddev": "<f8",
+    "contributing_exchanges_mask": "<u8",
+    "kalman_used_venues_mask": "<u8",
+    "basis_active_venues_mask": "<u8",
+}
+VENUE_STATE_COLUMNS: dict[str, str] = {
+    "update_id": "<i8",
+    "timestamp_ms": "<i8",
+    "is_perp": "|b1",
+    "fair_value": "<f8",
+    "variance": "<f8",
+    "age_ms": "<f8",
+    "bid_price": "<f8",
+    "ask_price": "<f8",
+    "microprice": "<f8",
+    "depth_imbalance": "<f8",
+    "top_bid_depth": "<f8",
+    "top_ask_depth": "<f8",
+    "mid_volatility_bps": "<f8",
+    "trade_net_flow": "<f8",
+    "trade_buy_size": "<f8",
+    "trade_sell_size": "<f8",
+    "trade_count": "<i8",
+}
+BASIS_STATE_COLUMNS: dict[str, str] = {
+    "update_id": "<i8",
+    "timestamp_ms": "<i8",
+    "basis_estimate": "<f8",
+    "basis_stddev": "<f8",
+}
+TABLE_COLUMNS: dict[str, dict[str, str]] = {
+    UPDATES: UPDATE_COLUMNS,
+    VENUE_STATES: VENUE_STATE_COLUMNS,
+    BASIS_STATES: BASIS_STATE_COLUMNS,
+}
+
+_MAX_MASK_SYMBOLS = 64
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentInfo:
+    path: str
+    rows: int
+    start_ms: int
+    end_ms: int
+    is_sorted: bool
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "rows": self.rows,
+            "start_ms": self.start_ms,
+            "end_ms": self.end_ms,
+            "sorted": self.is_sorted,
+        }
+
+    @classmethod
+    def from_json(cls, payload: Mapping[str, Any]) -> SegmentInfo:
+        return cls(
+            path=str(payload["path"]),
+            rows=int(payload["rows"]),
+            start_ms=int(payload["start_ms"]),
+            end_ms=int(payload["end_ms"]),
+            is_sorted=bool(payload["sorted"]),
+        )
+
+
+class _ColumnBuffer:
+    __slots__ = ("_columns", "_values", "_chunks", "rows")
+
+    def __init__(self, columns: Mapping[str, str]) -> None:
+        self._columns = columns
+        self._values: dict[str, list[Any]] = {name: [] for name in columns}
+        self._chunks: list[dict[str, npt.NDArray[Any]]] = []
+        self.rows = 0
+
+    def append_row(self, row: Mapping[str, Any]) -> None:
+        for name, values in self._values.items():
+            values.append(row.get(name))
+        self.rows += 1
+
+    def append_columns(self, columns: Mapping[str, Sequence[Any] | npt.NDArray[Any]]) -> None:
+        self._spill_rows()
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("bulk append columns must all have the same length")
+        (length,) = lengths
+        chunk: dict[str, npt.NDArray[Any]] = {}
+        for name, dtype in self._columns.items():
+            if name not in columns:
+                raise ValueError(f"bulk append is missing column {name!r}")
+            chunk[name] = _as_column(columns[name], dtype)
+        self._chunks.append(chunk)
+        self.rows += length
+
+    def take(self) -> dict[str, npt.NDArray[Any]]:
+        self._spill_rows()
+        chunks = self._chunks
+        self._chunks = []
+        self.rows = 0
+        return {
+            name: np.concatenate([chunk[name] for chunk in chunks])
+            if len(chunks) > 1
+            else chunks[0][name]
+            for name in self._columns
+        }
+
+    def _spill_rows(self) -> None:
+        if not self._values[next(iter(self._columns))]:
+            return
+        self._chunks.append(
+            {
+                name: _as_column(self._values[name], dtype)
+                for name, dtype in self._columns.items()
+            }
+        )
+        self._values = {name: [] for name in self._columns}
+
+
+def _as_column(values: Sequence[Any] | npt.NDArray[Any], dtype: str) -> npt.NDArray[Any]:
+    """Missing values (``None``) become NaN in float columns and zero elsewhere."""
+    if isinstance(values, np.ndarray):
+        return np.asarray(values, dtype=dtype)
+    missing = np.nan if np.dtype(dtype).kind == "f" else 0
+    return np.asarray([missing if value is None else value for value in values], dtype=dtype)
+
+
+class ColumnarCaptureWriter:
+    """Append-only writer for a columnar capture store directory.
+
+    Rows are buffered in memory and written as one ``.npy`` file per column per
+    segment. ``updates`` is a single partition; ``venue_states`` and
+    ``basis_states`` are partitioned by exchange so a reader can pull one
+    venue's columns without touching the others. The index is rewritten
+    atomically after every flush, so a crash loses at most the unflushed
+    buffer and never leaves a half-listed segment.
+    """
+
+    def __init__(self, path: Path, *, segment_rows: int = DEFAULT_SEGMENT_ROWS) -> None:
+        if segment_rows <= 0:
+            raise ValueError("segment_rows must be positive.")
+        self.path = path
+        self.segment_rows = segment_rows
+        path.mkdir(parents=True, exist_ok=True)
+        index = _read_index(path) if (path / INDEX_FILE).exists() else _empty_index()
+        self._symbols: list[str] = list(index["symbols"])
+        self._symbol_codes = {symbol: code for code, symbol in enumerate(self._symbols)}
+        self._segments: dict[str, dict[str, list[SegmentInfo]]] = {
+            table: {
+                partition: [SegmentInfo.from_json(segment) for segment in segments]
+                for partition, segments in index["tables"].get(table, {}).items()
+            }
+            for table in TABLE_COLUMNS
+        }
+        self._next_segment = int(index.get("next_segment", 0))
+        self._next_update_id = int(index.get("next_update_id", 1))
+        self._buffers: dict[tuple[str, str], _ColumnBuffer] = {}
+        self._closed = False
+
+    @property
+    def pending_updates(self) -> int:
+        buffer = self._buffers.get((UPDATES, ALL))
+        return buffer.rows if buffer is not None else 0
+
+    def symbol_code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbols.append(symbol)
+            self._symbol_codes[symbol] = code
+        return code
+
+    def symbol_mask(self, symbols: Iterable[str]) -> int:
+        mask = 0
+        for symbol in symbols:
+            code = self.symbol_code(symbol)
+            if code >= _MAX_MASK_SYMBOLS:
+                raise ValueError(
+                    f"symbol {symbol!r} cannot be stored in a mask column; "
+                    f"at most {_MAX_MASK_SYMBOLS} symbols are supported."
+                )
+            mask |= 1 << code
+        return mask
+
+    def next_update_id(self) -> int:
+        update_id = self._next_update_id
+        self._next_update_id += 1
+        return update_id
+
+    def append_update(self, row: Mapping[str, Any]) -> None:
+        update_id = int(row["update_id"])
+        self._next_update_id = max(self._next_update_id, update_id + 1)
+        self._buffer(UPDATES, ALL).append_row(row)
+
+    def append_venue_state(self, exchange: str, row: Mapping[str, Any]) -> None:
+        self.symbol_code(exchange)
+        self._buffer(VENUE_STATES, exchange).append_row(row)
+
+    def append_basis_state(self, exchange: str, row: Mapping[str, Any]) -> None:
+        self.symbol_code(exchange)
+        self._buffer(BASIS_STATES, exchange).append_row(row)
+
+    def append_columns(
+        self,
+        table: str,
+        partition: str,
+        columns: Mapping[str, Sequence[Any] | npt.NDArray[Any]],
+    ) -> None:
+        """Bulk-append whole columns; used by converters and batch writers."""
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"unknown table {table!r}")
+        if table == UPDATES:
+            if partition != ALL:
+                raise ValueError("the updates table is not partitioned")
+            update_ids = np.asarray(columns["update_id"], dtype="<i8")
+            if update_ids.size:
+                self._next_update_id = max(self._next_update_id, int(update_ids.max()) + 1)
+        else:
+            self.symbol_code(partition)
+        self._buffer(table, partition).append_columns(columns)
+
+    def maybe_flush(self) -> bool:
+        if self.pending_updates >= self.segment_rows:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """Write every non-empty buffer as a new segment and publish the index."""
+        buffers = [(key, buffer) for key, buffer in self._buffers.items() if buffer.rows]
+        if not buffers:
+            return
+        segment_name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        for (table, partition), buffer in buffers:
+            columns = buffer.take()
+            relative = (
+                Path(table) / segment_name
+                if table == UPDATES
+                else Path(table) / partition / segment_name
+            )
+            directory = self.path / relative
+            directory.mkdir(parents=True, exist_ok=True)
+            for name, values in columns.items():
+                np.save(directory / f"{name}.npy", values, allow_pickle=False)
+            timestamps = columns["timestamp_ms"]
+            self._segments[table].setdefault(partition, []).append(
+                SegmentInfo(
+                    path=relative.as_posix(),
+                    rows=int(timestamps.size),
+                    start_ms=int(timestamps.min()),
+                    end_ms=int(timestamps.max()),
+                    is_sorted=bool(np.all(timestamps[1:] >= timestamps[:-1])),
+                )
+            )
+        self._write_index()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._write_index()
+        self._closed = True
+
+    def __enter__(self) -> ColumnarCaptureWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _buffer(self, table: str, partition: str) -> _ColumnBuffer:
+        key = (table, partition)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = _ColumnBuffer(TABLE_COLUMNS[table])
+            self._buffers[key] = buffer
+        return buffer
+
+    def _write_index(self) -> None:
+        payload = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "symbols": self._symbols,
+            "next_segment": self._next_segment,
+            "next_update_id": self._next_update_id,
+            "tables": {
+                table: {
+                    partition: [segment.to_json() for segment in segments]
+                    for partition, segments in partitions.items()
+                }
+                for table, partitions in self._segments.items()
+            },
+        }
+        tmp_path = self.path / f"{INDEX_FILE}.tmp"
+        tmp_path.write_text(json.dumps(payload, indent=1))
+        os.replace(tmp_path, self.path / INDEX_FILE)
+
+
+class ColumnarCaptureReader:
+    """Memory-mapped reader for a columnar capture store.
+
+    Column files are opened with ``mmap_mode="r"``. A read that falls inside a
+    single segment returns read-only views onto the mapped file, so no data
+    is copied. Reads that span several segments are concatenated. Time ranges
+    are half-open, ``[start_ms, end_ms)``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        index = _read_index(path)
+        self.symbols: tuple[str, ...] = tuple(index["symbols"])
+        self._segments: dict[str, dict[str, list[SegmentInfo]]] = {
+            table: {
+                partition: [SegmentInfo.from_json(segment) for segment in segments]
+                for partition, segments in index["tables"].get(table, {}).items()
+            }
+            for table in TABLE_COLUMNS
+        }
+
+    @staticmethod
+    def is_store(path: Path) -> bool:
+        return (path / INDEX_FILE).is_file()
+
+    def venues(self) -> list[str]:
+        return sorted(self._segments[VENUE_STATES])
+
+    def decode(self, codes: npt.NDArray[Any]) -> list[str]:
+        return [self.symbols[int(code)] for code in codes]
+
+    def decode_mask(self, mask: int) -> tuple[str, ...]:
+        """Symbols set in a venue-list bitmask, in name order."""
+        mask = int(mask)
+        return tuple(
+            sorted(symbol for code, symbol in enumerate(self.symbols) if mask >> code & 1)
+        )
+
+    def read_updates(
+        self,
+        columns: Sequence[str] | None = None,
+        *,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> dict[str, npt.NDArray[Any]]:
+        return self._read(UPDATES, ALL, columns, start_ms, end_ms)
+
+    def read_venue(
+        self,
+        exchange: str,
+        columns: Sequence[str] | None = None,
+        *,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> dict[str, npt.NDArray[Any]]:
+        return self._read(VENUE_STATES, exchange, columns, start_ms, end_ms)
+
+    def read_basis(
+        self,
+        exchange: str,
+        columns: Sequence[str] | None = None,
+        *,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> dict[str, npt.NDArray[Any]]:
+        return self._read(BASIS_STATES, exchange, columns, start_ms, end_ms)
+
+    def read_venue_joined(
+        self,
+        exchange: str,
+        columns: Sequence[str],
+        *,
+        update_columns: Sequence[str] = (),
+        basis_columns: Sequence[str] = (),
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+    ) -> dict[str, npt.NDArray[Any]]:
+        """One venue's rows with update- and basis-level columns aligned onto them.
+
+        This is the columnar equivalent of joining ``venue_states`` to
+        ``updates`` and ``basis_states`` on ``update_id``. Rows whose update or
+        basis row is missing get NaN (floats) or the column's zero value.
+        """
+        venue_columns = list(dict.fromkeys(["update_id", "timestamp_ms", *columns]))
+        venue = self.read_venue(exchange, venue_columns, start_ms=start_ms, end_ms=end_ms)
+        result = dict(venue)
+        update_ids = venue["update_id"]
+        if update_columns:
+            updates = self.read_updates(
+                ["update_id", *update_columns], start_ms=start_ms, end_ms=end_ms
+            )
+            result.update(_align(update_ids, updates, update_columns, UPDATE_COLUMNS))
+        if basis_columns:
+            basis = self.read_basis(
+                exchange, ["update_id", *basis_columns], start_ms=start_ms, end_ms=end_ms
+            )
+            result.update(_align(update_ids, basis, basis_columns, BASIS_STATE_COLUMNS))
+        return result
+
+    def _read(
+        self,
+        table: str,
+        partition: str,
+        columns: Sequence[str] | None,
+        start_ms: int | None,
+        end_ms: int | None,
+    ) -> dict[str, npt.NDArray[Any]]:
+        schema = TABLE_COLUMNS[table]
+        names = list(columns) if columns is not None else list(schema)
+        unknown = [name for name in names if name not in schema]
+        if unknown:
+            raise ValueError(f"unknown {table} columns: {unknown}")
+
+        pieces: dict[str, list[npt.NDArray[Any]]] = {name: [] for name in names}
+        for segment in self._segments[table].get(partition, []):
+            if start_ms is not None and segment.end_ms < start_ms:
+                continue
+            if end_ms is not None and segment.start_ms >= end_ms:
+                continue
+            selector = self._segment_selector(segment, start_ms, end_ms)
+            for name in names:
+                values = np.load(self.path / segment.path / f"{name}.npy", mmap_mode="r")
+                pieces[name].append(values if selector is None else values[selector])
+
+        return {
+            name: (
+                parts[0]
+                if len(parts) == 1
+                else np.concatenate(parts)
+                if parts
+                else np.empty(0, dtype=schema[name])
+            )
+            for name, parts in pieces.items()
+        }
+
+    def _segment_selector(
+        self,
+        segment: SegmentInfo,
+        start_ms: int | None,
+        end_ms: int | None,
+    ) -> slice | npt.NDArray[np.bool_] | None:
+        inside_start = start_ms is None or segment.start_ms >= start_ms
+        inside_end = end_ms is None or segment.end_ms < end_ms
+        if inside_start and inside_end:
+            return None
+        timestamps = np.load(self.path / segment.path / "timestamp_ms.npy", mmap_mode="r")
+        if segment.is_sorted:
+            lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, "left"))
+            hi = (
+                segment.rows
+                if end_ms is None
+                else int(np.searchsorted(timestamps, end_ms, "left"))
+            )
+            return slice(lo, hi)
+        mask = np.ones(segment.rows, dtype=bool)
+        if start_ms is not None:
+            mask &= timestamps >= start_ms
+        if end_ms is not None:
+            mask &= timestamps < end_ms
+        return mask
+
+
+def _align(
+    update_ids: npt.NDArray[Any],
+    source: Mapping[str, npt.NDArray[Any]],
+    columns: Sequence[str],
+    schema: Mapping[str, str],
+) -> dict[str, npt.NDArray[Any]]:
+    source_ids = np.asarray(source["update_id"])
+    order = None
+    if source_ids.size > 1 and not np.all(source_ids[1:] >= source_ids[:-1]):
+        order = np.argsort(source_ids, kind="stable")
+        source_ids = source_ids[order]
+    positions = np.searchsorted(source_ids, update_ids)
+    clipped = np.minimum(positions, max(source_ids.size - 1, 0))
+    found = (
+        (positions < source_ids.size) & (source_ids[clipped] == update_ids)
+        if source_ids.size
+        else np.zeros(update_ids.size, dtype=bool)
+    )
+    aligned: dict[str, npt.NDArray[Any]] = {}
+    for name in columns:
+        values = np.asarray(source[name])
+        if order is not None:
+            values = values[order]
+        dtype = np.dtype(schema[name])
+        out = np.full(update_ids.size, np.nan if dtype.kind == "f" else 0, dtype=dtype)
+        if source_ids.size:
+            out[found] = values[clipped[found]]
+        aligned[name] = out
+    return aligned
+
+
+def _empty_index() -> dict[str, Any]:
+    return {"format": FORMAT_NAME, "version": FORMAT_VERSION, "symbols": [], "tables": {}}
+
+
+def _read_index(path: Path) -> dict[str, Any]:
+    index_path = path / INDEX_FILE
+    if not index_path.is_file():
+        raise ValueError(f"{path} is not a columnar capture store (no {INDEX_FILE})")
+    payload: dict[str, Any] = json.loads(index_path.read_text())
+    if payload.get("format") != FORMAT_NAME:
+        raise ValueError(f"{index_path} is not an {FORMAT_NAME} index")
+    if int(payload.get("version", 0)) > FORMAT_VERSION:
+        raise ValueError(
+            f"{index_path} has format version {payload['version']}; "
+            f"this reader supports up to {FORMAT_VERSION}"
+        )
+    return payload
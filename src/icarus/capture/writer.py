@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from icarus.telemetry import LatencyHistogram, LatencyRecorder
+
+DEFAULT_MAX_QUEUE = 10_000
+DEFAULT_COMMIT_EVERY = 100
+DEFAULT_MAX_COMMIT_DELAY_S = 1.0
+
+_PUT_POLL_S = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureSink(Protocol):
+    """Storage backend driven by ``CaptureWriterThread``; only ever used from that thread."""
+
+    def write(self, record: Any) -> None: ...
+
+    def commit(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureWriterStats:
+    path: Path
+    queue_depth: int
+    max_queue_depth: int
+    records_written: int
+    commits: int
+    last_commit_ms: float
+    max_commit_ms: float
+    mean_commit_ms: float
+    producer_waits: int
+    producer_wait_ms: float
+
+
+@dataclass(frozen=True, slots=True)
+class _Rotate:
+    path: Path
+
+
+@dataclass(frozen=True, slots=True)
+class _Stamped:
+    item: Any
+    put_ns: int
+
+
+_CLOSE = object()
+
+
+class CaptureWriterThread:
+    """Owns a capture sink on a dedicated thread, fed through a bounded queue.
+
+    Producers on the event loop hand over records with ``put``; the thread
+    writes them in order and commits in groups, once ``commit_every`` records
+    are pending or the oldest uncommitted record is ``max_commit_delay_s`` old.
+    Disk latency therefore never runs on the loop. When the queue is full,
+    ``put`` waits off-loop (sockets keep reading) and the wait is counted in
+    ``stats()`` as backpressure.
+
+    ``open_sink`` is called on the writer thread, both at start and on
+    ``rotate``, so sinks that are bound to their creating thread (``sqlite3``)
+    work unchanged. Rotation and ``close`` travel through the same queue, so
+    every record submitted before them lands in the old sink.
+
+    With ``latency`` set, the time one record in ``latency.sample_every``
+    spends queued and the time spent in every ``sink.write`` and
+    ``sink.commit`` are recorded into the
+    ``<latency_label>.queue``/``.write``/``.commit`` histograms from the
+    writer thread; writers sharing a recorder need distinct labels.
+    """
+
+    def __init__(
+        self,
+        open_sink: Callable[[Path], CaptureSink],
+        path: Path,
+        *,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        commit_every: int = DEFAULT_COMMIT_EVERY,
+        max_commit_delay_s: float = DEFAULT_MAX_COMMIT_DELAY_S,
+        latency: LatencyRecorder | None = None,
+        latency_label: str = "store",
+    ) -> None:
+        if max_queue <= 0:
+            raise ValueError("max_queue must be positive.")
+        if commit_every <= 0:
+            raise ValueError("commit_every must be positive.")
+        if max_commit_delay_s <= 0:
+            raise ValueError("max_commit_delay_s must be positive.")
+        self.open_sink = open_sink
+        self.path = path
+        self.commit_every = commit_every
+        self.max_commit_delay_s = max_commit_delay_s
+        self.latency = latency
+        self._queue_latency: LatencyHistogram | None = None
+        self._write_latency: LatencyHistogram | None = None
+        self._commit_latency: LatencyHistogram | None = None
+        self._unstamped = 0
+        if latency is not None:
+            self._queue_latency = latency.histogram(f"{latency_label}.queue")
+            self._write_latency = latency.histogram(f"{latency_label}.write")
+            self._commit_latency = latency.histogram(f"{latency_label}.commit")
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+        self._error: BaseException | None = None
+        self._closing = False
+
+        self._max_queue_depth = 0
+        self._records_written = 0
+        self._commits = 0
+        self._last_commit_ms = 0.0
+        self._max_commit_ms = 0.0
+        self._total_commit_ms = 0.0
+        self._producer_waits = 0
+        self._producer_wait_ms = 0.0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put_nowait(self, record: Any) -> bool:
+        """Enqueue ``record`` without waiting; ``False`` if the queue is full."""
+        self._check_open()
+        return self._enqueue_nowait(self._stamp(record))
+
+    async def put(self, record: Any) -> None:
+        """Enqueue ``record``, waiting off-loop for room if the writer is behind."""
+        self._check_open()
+        # Stamp once: a full queue retries the same item, so the sampling
+        # cadence holds and a sampled record keeps its stamp.
+        item = self._stamp(record)
+        if self._enqueue_nowait(item):
+            return
+        started = time.perf_counter()
+        await asyncio.to_thread(self._put_blocking, item)
+        self._producer_waits += 1
+        self._producer_wait_ms += (time.perf_counter() - started) * 1000.0
+        self._note_depth()
+
+    async def rotate(self, path: Path) -> None:
+        """Commit and close the current sink after queued records, then open ``path``."""
+        await self.put(_Rotate(path))
+
+    async def close(self) -> None:
+        """Flush every queued record, close the sink and stop the thread."""
+        if self._closing:
+            return
+        if self._thread.is_alive():
+            await self.put(_CLOSE)
+        self._closing = True
+        await asyncio.to_thread(self._thread.join)
+        if self._error is not None:
+            raise self._error
+
+    def stats(self) -> CaptureWriterStats:
+        commits = self._commits
+        return CaptureWriterStats(
+            path=self.path,
+            queue_depth=self._queue.qsize(),
+            max_queue_depth=self._max_queue_depth,
+            records_written=self._records_written,
+            commits=commits,
+            last_commit_ms=self._last_commit_ms,
+            max_commit_ms=self._max_commit_ms,
+            mean_commit_ms=self._total_commit_ms / commits if commits else 0.0,
+            producer_waits=self._producer_waits,
+            producer_wait_ms=self._producer_wait_ms,
+        )
+
+    def _check_open(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._closing:
+            raise ValueError("capture writer is closed.")
+
+    def _enqueue_nowait(self, item: Any) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        self._note_depth()
+        return True
+
+    def _stamp(self, item: Any) -> Any:
+        if self.latency is None or item is _CLOSE or isinstance(item, _Rotate):
+            return item
+        self._unstamped -= 1
+        if self._unstamped > 0:
+            return item
+        self._unstamped = self.latency.sample_every
+        return _Stamped(item, time.perf_counter_ns())
+
+    def _note_depth(self) -> None:
+        depth = self._queue.qsize()
+        if depth > self._max_queue_depth:
+            self._max_queue_depth = depth
+
+    def _put_blocking(self, item: Any) -> None:
+        # Poll so a writer that died with a full queue surfaces its error
+        # instead of leaving the producer waiting forever.
+        while True:
+            self._check_open()
+            try:
+                self._queue.put(item, timeout=_PUT_POLL_S)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        sink: CaptureSink | None = None
+        pending = 0
+        oldest_pending = 0.0
+        queue_latency = self._queue_latency
+        write_latency = self._write_latency
+        try:
+            sink = self.open_sink(self.path)
+            while True:
+                timeout = None
+                if pending:
+                    timeout = max(0.0, oldest_pending + self.max_commit_delay_s - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    self._commit(sink)
+                    pending = 0
+                    continue
+
+                if isinstance(item, _Stamped):
+                    assert queue_latency is not None
+                    queue_latency.record(time.perf_counter_ns() - item.put_ns)
+                    item = item.item
+                if item is _CLOSE:
+                    break
+                if isinstance(item, _Rotate):
+                    if pending:
+                        self._commit(sink)
+                        pending = 0
+                    sink.close()
+                    sink = None
+                    sink = self.open_sink(item.path)
+                    self.path = item.path
+                    continue
+
+                if write_latency is None:
+                    sink.write(item)
+                else:
+                    started_ns = time.perf_counter_ns()
+                    sink.write(item)
+                    write_latency.record(time.perf_counter_ns() - started_ns)
+                self._records_written += 1
+                if not pending:
+                    oldest_pending = time.monotonic()
+                pending += 1
+                if pending >= self.commit_every:
+                    self._commit(sink)
+                    pending = 0
+            if pending:
+                self._commit(sink)
+        except BaseException as exc:
+            logger.exception("capture writer stopped")
+            self._error = exc
+        finally:
+            if sink is not None:
+                try:
+                    sink.close()
+                except Exception as exc:
+                    logger.exception("capture writer failed to close %s", self.path)
+                    if self._error is None:
+                        self._error = exc
+
+    def _commit(self, sink: CaptureSink) -> None:
+        started_ns = time.perf_counter_ns()
+        sink.commit()
+        elapsed_ns = time.perf_counter_ns() - started_ns
+        if self._commit_latency is not None:
+            self._commit_latency.record(elapsed_ns)
+        elapsed_ms = elapsed_ns / 1e6
+        self._commits += 1
+        self._last_commit_ms = elapsed_ms
+        self._total_commit_ms += elapsed_ms
+        if elapsed_ms > self._max_commit_ms:
+            self._max_commit_ms = elapsed_ms
@@ -0,0 +1,44 @@
+"""Concentrated-liquidity LP research engine over DEX swap histories."""
+
+from icarus.dex.liquidity import (
+    Q96,
+    estimate_pool_liquidity,
+    liquidity_for_deposit,
+    position_value,
+    price_to_sqrtx96,
+    sqrtx96_to_price,
+    token_amounts,
+)
+from icarus.dex.lp import (
+    ActiveLPResult,
+    PassiveLPSweep,
+    SwapAttribution,
+    SwapPath,
+    passive_lp_sweep,
+    range_bounds,
+    simulate_active_lp,
+    swap_attribution,
+)
+from icarus.dex.swaps import CexReference, SwapArrays, load_cex, load_swaps
+
+__all__ = [
+    "Q96",
+    "ActiveLPResult",
+    "CexReference",
+    "PassiveLPSweep",
+    "SwapArrays",
+    "SwapAttribution",
+    "SwapPath",
+    "estimate_pool_liquidity",
+    "liquidity_for_deposit",
+    "load_cex",
+    "load_swaps",
+    "passive_lp_sweep",
+    "position_value",
+    "price_to_sqrtx96",
+    "range_bounds",
+    "simulate_active_lp",
+    "sqrtx96_to_price",
+    "swap_attribution",
+    "token_amounts",
+]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+type FloatArray = npt.NDArray[np.float64]
+
+Q96 = float(2**96)
+# The ETH/USDC pools: token0 is ETH (18 decimals), token1 is USDC (6).
+TOKEN0_DECIMALS = 18
+TOKEN1_DECIMALS = 6
+TOKEN0_UNIT = 10.0**TOKEN0_DECIMALS
+TOKEN1_UNIT = 10.0**TOKEN1_DECIMALS
+DECIMAL_ADJUSTMENT = 10.0 ** (TOKEN0_DECIMALS - TOKEN1_DECIMALS)
+
+# Every function broadcasts over NumPy arrays, so one call can price a whole
+# swap history against a whole grid of ranges, e.g. ``(ranges, 1)`` bounds
+# against ``(swaps,)`` prices. Plain floats in give NumPy scalars out.
+
+
+def sqrtx96_to_price(sqrt_x96: float | FloatArray) -> FloatArray:
+    """``sqrtPriceX96`` to a token1-per-token0 price in human units (USDC/ETH)."""
+    s = np.divide(sqrt_x96, Q96)
+    return s * s * DECIMAL_ADJUSTMENT
+
+
+def price_to_sqrtx96(price: float | FloatArray) -> FloatArray:
+    return np.sqrt(np.divide(price, DECIMAL_ADJUSTMENT)) * Q96
+
+
+def token_amounts(
+    liquidity: float | FloatArray,
+    sqrt_price: float | FloatArray,
+    sqrt_lower: float | FloatArray,
+    sqrt_upper: float | FloatArray,
+) -> tuple[FloatArray, FloatArray]:
+    """Raw (integer-scaled) token0 and token1 held by a position.
+
+    Uniswap V3 concentrated liquidity: inside the range ``x = L (1/√P -
+    1/√Pu)`` and ``y = L (√P - √Pl)``; below it the position is all token0,
+    above it all token1. Clamping √P to the range gives all three cases.
+    """
+    clamped = np.clip(sqrt_price, sqrt_lower, sqrt_upper)
+    amount0 = np.multiply(liquidity, 1.0 / clamped - np.divide(1.0, sqrt_upper)) * Q96
+    amount1 = np.multiply(liquidity, clamped - np.asarray(sqrt_lower)) / Q96
+    return amount0, amount1
+
+
+def position_value(
+    liquidity: float | FloatArray,
+    sqrt_price: float | FloatArray,
+    sqrt_lower: float | FloatArray,
+    sqrt_upper: float | FloatArray,
+    mark_price: float | FloatArray,
+) -> FloatArray:
+    """Position value in token1 (USDC) with token0 marked at ``mark_price``."""
+    amount0, amount1 = token_amounts(liquidity, sqrt_price, sqrt_lower, sqrt_upper)
+    return amount0 / TOKEN0_UNIT * mark_price + amount1 / TOKEN1_UNIT
+
+
+def liquidity_for_deposit(
+    deposit: float | FloatArray,
+    sqrt_price: float | FloatArray,
+    sqrt_lower: float | FloatArray,
+    sqrt_upper: float | FloatArray,
+    price: float | FloatArray,
+) -> FloatArray:
+    """Liquidity whose position is worth ``deposit`` (USDC) at ``price``."""
+    unit_value = position_value(1.0, sqrt_price, sqrt_lower, sqrt_upper, price)
+    if np.any(unit_value <= 0):
+        raise ValueError("Zero-value unit position; check the range against the price.")
+    return np.divide(deposit, unit_value)
+
+
+def estimate_pool_liquidity(
+    amount0: FloatArray,
+    amount1: FloatArray,
+    sqrt_pre: FloatArray,
+    sqrt_post: FloatArray,
+) -> FloatArray:
+    """Active pool liquidity implied by each swap's amounts and price move.
+
+    ``L = |Δy| Q96 / |Δ√P|`` from the token1 leg, whose 6-decimal units keep
+    more precision, else ``L = |Δx| / (|Δ(1/√P)| Q96)`` from the token0 leg.
+    NaN where the swap did not move the price or traded nothing.
+    """
+    amount0 = np.asarray(amount0, dtype=np.float64)
+    amount1 = np.asarray(amount1, dtype=np.float64)
+    sqrt_pre = np.asarray(sqrt_pre, dtype=np.float64)
+    sqrt_post = np.asarray(sqrt_post, dtype=np.float64)
+    d_sqrt = np.abs(sqrt_post - sqrt_pre)
+    raw1 = np.abs(amount1) * TOKEN1_UNIT
+    raw0 = np.abs(amount0) * TOKEN0_UNIT
+    with np.errstate(divide="ignore", invalid="ignore"):
+        from_token1 = raw1 * Q96 / d_sqrt
+        d_inverse = np.abs(1.0 / sqrt_pre - 1.0 / sqrt_post)
+        from_token0 = raw0 / (d_inverse * Q96)
+    token0_usable = (raw0 > 0) & (sqrt_pre > 0) & (sqrt_post > 0) & (d_inverse > 0)
+    liquidity = np.where(raw1 > 0, from_token1, np.where(token0_usable, from_token0, np.nan))
+    return np.where(d_sqrt > 0, liquidity, np.nan)
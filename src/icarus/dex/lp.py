@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from icarus.dex.liquidity import (
+    TOKEN0_UNIT,
+    TOKEN1_UNIT,
+    estimate_pool_liquidity,
+    liquidity_for_deposit,
+    position_value,
+    price_to_sqrtx96,
+    sqrtx96_to_price,
+    token_amounts,
+)
+from icarus.dex.swaps import CexReference, SwapArrays
+
+type FloatArray = npt.NDArray[np.float64]
+type IntArray = npt.NDArray[np.int64]
+type BoolArray = npt.NDArray[np.bool_]
+
+# Cap on (ranges x swaps) cells evaluated at once by a passive sweep.
+DEFAULT_MAX_CELLS = 1_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class SwapPath:
+    """Per-swap quantities shared by every LP configuration, from the deposit on.
+
+    Entry ``i`` is the ``i``-th swap after the deposit swap: it moves the
+    pool from ``sqrt_pre[i]`` to ``sqrt_post[i]``, ``dt_s[i]`` after the
+    previous one. ``ext_price`` is the CEX reference at the swap,
+    ``pool_liquidity`` the active liquidity it implies (NaN if unknown) and
+    ``toward_oracle`` whether it moved the pool price toward the reference,
+    i.e. was an arbitrage against LPs.
+    """
+
+    timestamp: IntArray
+    dt_s: IntArray
+    sqrt_pre: FloatArray
+    sqrt_post: FloatArray
+    price_pre: FloatArray
+    price_post: FloatArray
+    amount_usd: FloatArray
+    ext_price: FloatArray
+    pool_liquidity: FloatArray
+    toward_oracle: BoolArray
+    deposit_timestamp: int
+    deposit_sqrt: float
+    final_ext_price: float
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def build(cls, swaps: SwapArrays, cex: CexReference, *, skip_s: float = 0.0) -> SwapPath:
+        """Deposit at the first swap ``skip_s`` after the first one and follow the rest.
+
+        The skipped warm-up is the history a pool-liquidity estimate would
+        need live.
+        """
+        if len(swaps) < 2 or len(cex) == 0:
+            raise ValueError("Need at least two swaps and one CEX reference bar.")
+        warm_end = int(swaps.timestamp[0]) + int(skip_s)
+        deposit = int(np.searchsorted(swaps.timestamp, warm_end, side="left"))
+        if deposit >= len(swaps) - 1:
+            raise ValueError("No swaps left after the warm-up.")
+        timestamp = swaps.timestamp[deposit:]
+        sqrt_price = swaps.sqrt_price_x96[deposit:]
+        price = sqrtx96_to_price(sqrt_price)
+        ext_price = cex.price_at(timestamp[1:])
+        distance_pre = np.abs(price[:-1] - ext_price)
+        distance_post = np.abs(price[1:] - ext_price)
+        # Marks the end of the path: the bar nearest the last swap.
+        last = int(np.argmin(np.abs(cex.timestamp - timestamp[-1])))
+        return cls(
+            timestamp=timestamp[1:],
+            dt_s=np.diff(timestamp),
+            sqrt_pre=sqrt_price[:-1],
+            sqrt_post=sqrt_price[1:],
+            price_pre=price[:-1],
+            price_post=price[1:],
+            amount_usd=swaps.amount_usd[deposit + 1 :],
+            ext_price=ext_price,
+            pool_liquidity=estimate_pool_liquidity(
+                swaps.amount0[deposit + 1 :],
+                swaps.amount1[deposit + 1 :],
+                sqrt_price[:-1],
+                sqrt_price[1:],
+            ),
+            toward_oracle=distance_post < distance_pre,
+            deposit_timestamp=int(timestamp[0]),
+            deposit_sqrt=float(sqrt_price[0]),
+            final_ext_price=float(cex.price[last]),
+        )
+
+    @property
+    def deposit_price(self) -> float:
+        return float(sqrtx96_to_price(self.deposit_sqrt))
+
+    @property
+    def span_s(self) -> int:
+        return int(self.timestamp[-1]) - self.deposit_timestamp
+
+    def fee_base(self, fee_bps: float) -> FloatArray:
+        """Fee per unit of position liquidity on each swap; 0 where pool L is unknown."""
+        valid = np.isfinite(self.pool_liquidity) & (self.pool_liquidity > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            base = self.amount_usd * (fee_bps / 10_000.0) / self.pool_liquidity
+        return np.where(valid, base, 0.0)
+
+
+@dataclass(frozen=True, slots=True)
+class PassiveLPSweep:
+    """Fixed-range LP results, one entry per swept ``range_pct``.
+
+    Values are in USDC. ``value_lp``/``value_hodl`` mark the final position
+    and the initial inventory at the final pool price, the ``*_ext`` pair at
+    the final CEX price. ``lvr`` sums the position's value lost to in-range
+    swaps at the CEX price, split into ``toxic_lvr`` (swaps toward the
+    reference) and ``noise_lvr``.
+    """
+
+    range_pct: FloatArray
+    sqrt_lower: FloatArray
+    sqrt_upper: FloatArray
+    liquidity: FloatArray
+    amount0: FloatArray
+    amount1: FloatArray
+    fees: FloatArray
+    lvr: FloatArray
+    toxic_lvr: FloatArray
+    noise_lvr: FloatArray
+    in_range_frac: FloatArray
+    value_lp: FloatArray
+    value_hodl: FloatArray
+    value_lp_ext: FloatArray
+    value_hodl_ext: FloatArray
+    deposit: float
+    span_s: int
+
+    def __len__(self) -> int:
+        return len(self.range_pct)
+
+    @property
+    def net_pnl(self) -> FloatArray:
+        """P&L versus holding the initial inventory, at the final pool price."""
+        return self.value_lp - self.value_hodl + self.fees
+
+    @property
+    def annualized_pct(self) -> FloatArray:
+        return self.net_pnl / self.deposit * 365.0 * 86_400 / self.span_s * 100.0
+
+
+@dataclass(frozen=True, slots=True)
+class SwapAttribution:
+    """One position's per-swap economics along a ``SwapPath``.
+
+    ``fee_share`` is the position's share of the pool's active liquidity
+    (0 when the swap midpoint is outside the range or pool L is unknown)
+    and ``value_change`` the position's value change at the CEX price.
+    """
+
+    in_range: BoolArray
+    fee_share: FloatArray
+    fee: FloatArray
+    value_change: FloatArray
+
+
+@dataclass(frozen=True, slots=True)
+class ActiveLPResult:
+    range_pct: float
+    trigger_pct: float
+    n_rebalances: int
+    gas_usd: float
+    fees_usd: float
+    in_range_frac: float
+    v_lp: float
+    v_hodl: float
+    final_price: float
+    center_price: float
+    rebalance_slippage: float
+    net_pnl: float
+    net_pnl_pct: float
+    annualized_pct: float
+    span_d: float
+
+
+def range_bounds(center_price: float, range_pct: float | FloatArray) -> tuple[Any, Any]:
+    """``sqrtPriceX96`` bounds of ``center_price`` ± ``range_pct`` percent."""
+    half_width = np.divide(range_pct, 100.0)
+    return (
+        price_to_sqrtx96(center_price * (1.0 - half_width)),
+        price_to_sqrtx96(center_price * (1.0 + half_width)),
+    )
+
+
+def swap_attribution(
+    path: SwapPath,
+    sqrt_lower: float,
+    sqrt_upper: float,
+    liquidity: float,
+    *,
+    fee_bps: float,
+) -> SwapAttribution:
+    pre = path.sqrt_pre
+    post = path.sqrt_post
+    in_range = ((sqrt_lower <= pre) & (pre <= sqrt_upper)) | (
+        (sqrt_lower <= post) & (post <= sqrt_upper)
+    )
+    mid = 0.5 * (pre + post)
+    earning = (
+        np.isfinite(path.pool_liquidity)
+        & (path.pool_liquidity > 0)
+        & (sqrt_lower <= mid)
+        & (mid <= sqrt_upper)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fee_share = np.where(earning, liquidity / path.pool_liquidity, 0.0)
+    value_change = position_value(
+        liquidity, post, sqrt_lower, sqrt_upper, path.ext_price
+    ) - position_value(liquidity, pre, sqrt_lower, sqrt_upper, path.ext_price)
+    return SwapAttribution(
+        in_range=in_range,
+        fee_share=fee_share,
+        fee=path.amount_usd * (fee_bps / 10_000.0) * fee_share,
+        value_change=value_change,
+    )
+
+
+def passive_lp_sweep(
+    path: SwapPath,
+    range_pcts: FloatArray | list[float],
+    *,
+    deposit: float,
+    fee_bps: float,
+    max_cells: int = DEFAULT_MAX_CELLS,
+) -> PassiveLPSweep:
+    """Evaluate fixed ranges ± ``range_pcts`` around the deposit price in one pass.
+
+    Every range is broadcast against every swap, ``max_cells`` (ranges x
+    swaps) at a time, so a whole width grid costs a few array passes over
+    the history instead of a Python loop per swap per configuration.
+    """
+    range_pct = np.asarray(range_pcts, dtype=np.float64)
+    if range_pct.ndim != 1 or np.any(range_pct <= 0) or np.any(range_pct >= 100):
+        raise ValueError("range_pcts must be a list of half-widths in (0, 100).")
+    center = path.deposit_price
+    sqrt_lower, sqrt_upper = range_bounds(center, range_pct)
+    liquidity = liquidity_for_deposit(deposit, path.deposit_sqrt, sqrt_lower, sqrt_upper, center)
+    amount0, amount1 = token_amounts(liquidity, path.deposit_sqrt, sqrt_lower, sqrt_upper)
+    amount0 = amount0 / TOKEN0_UNIT
+    amount1 = amount1 / TOKEN1_UNIT
+
+    n = len(path)
+    fees = np.empty(len(range_pct))
+    lvr = np.empty(len(range_pct))
+    toxic_lvr = np.empty(len(range_pct))
+    in_range_s = np.empty(len(range_pct))
+    pre = path.sqrt_pre
+    post = path.sqrt_post
+    mid = 0.5 * (pre + post)
+    fee_base = path.fee_base(fee_bps)
+    dt_s = path.dt_s.astype(np.float64)
+    rows = max(1, max_cells // max(n, 1))
+    for start in range(0, len(range_pct), rows):
+        block = slice(start, start + rows)
+        lo = sqrt_lower[block, None]
+        hi = sqrt_upper[block, None]
+        position_liquidity = liquidity[block, None]
+        in_range_pre = (lo <= pre) & (pre <= hi)
+        in_range = in_range_pre | ((lo <= post) & (post <= hi))
+        in_range_s[block] = (in_range_pre * dt_s).sum(axis=1)
+        earned = np.where((lo <= mid) & (mid <= hi), fee_base, 0.0)
+        fees[block] = (earned * position_liquidity).sum(axis=1)
+        loss = np.where(
+            in_range,
+            position_value(position_liquidity, pre, lo, hi, path.ext_price)
+            - position_value(position_liquidity, post, lo, hi, path.ext_price),
+            0.0,
+        )
+        lvr[block] = loss.sum(axis=1)
+        toxic_lvr[block] = (loss * path.toward_oracle).sum(axis=1)
+
+    final_sqrt = float(post[-1])
+    final_price = float(path.price_post[-1])
+    ext = path.final_ext_price
+    return PassiveLPSweep(
+        range_pct=range_pct,
+        sqrt_lower=sqrt_lower,
+        sqrt_upper=sqrt_upper,
+        liquidity=liquidity,
+        amount0=amount0,
+        amount1=amount1,
+        fees=fees,
+        lvr=lvr,
+        toxic_lvr=toxic_lvr,
+        noise_lvr=lvr - toxic_lvr,
+        in_range_frac=in_range_s / (float(dt_s.sum()) + 1e-9),
+        value_lp=position_value(liquidity, final_sqrt, sqrt_lower, sqrt_upper, final_price),
+        value_hodl=amount0 * final_price + amount1,
+        value_lp_ext=position_value(liquidity, price_to_sqrtx96(ext), sqrt_lower, sqrt_upper, ext),
+        value_hodl_ext=amount0 * ext + amount1,
+        deposit=deposit,
+        span_s=path.span_s,
+    )
+
+
+def simulate_active_lp(
+    path: SwapPath,
+    *,
+    range_pct: float,
+    trigger_pct: float,
+    deposit: float,
+    fee_bps: float,
+    gas_usd: float,
+    oor_grace_s: int = 0,
+    search_block: int = 4096,
+) -> ActiveLPResult:
+    """A ± ``range_pct`` position recentred on the pool price when it drifts.
+
+    Rebalances once the post-swap pool price is more than ``trigger_pct``
+    (log) from the range center, or the pre-swap price has been out of
+    range for ``oor_grace_s``. A rebalance pays ``gas_usd`` and the pool fee
+    on the inventory swap, then reopens centred on the current price.
+
+    The position only changes at rebalances, so each stretch between two is
+    evaluated with array operations: the next trigger is found by scanning
+    ahead in growing blocks, and fees and time in range are summed over the
+    stretch at once.
+    """
+    fee_rate = fee_bps / 10_000.0
+    tp = trigger_pct / 100.0
+    center_price = path.deposit_price
+    sqrt_lo, sqrt_hi = range_bounds(center_price, range_pct)
+    liquidity = float(
+        liquidity_for_deposit(deposit, path.deposit_sqrt, sqrt_lo, sqrt_hi, center_price)
+    )
+    x0_raw, y0_raw = token_amounts(liquidity, path.deposit_sqrt, sqrt_lo, sqrt_hi)
+    x0 = float(x0_raw) / TOKEN0_UNIT
+    y0 = float(y0_raw) / TOKEN1_UNIT
+
+    n = len(path)
+    pre = path.sqrt_pre
+    post = path.sqrt_post
+    mid = 0.5 * (pre + post)
+    valid_pool = np.isfinite(path.pool_liquidity) & (path.pool_liquidity > 0)
+    fee_base = path.fee_base(fee_bps)
+    dt_s = path.dt_s
+
+    fees_usd = 0.0
+    gas_total = 0.0
+    rebalance_slippage = 0.0
+    n_rebalances = 0
+    in_range_s = 0
+    out_range_s = 0
+    start = 0
+    length = search_block
+    while start < n:
+        while True:
+            end = min(start + length, n)
+            segment = slice(start, end)
+            out_of_range = ~((sqrt_lo <= pre[segment]) & (pre[segment] <= sqrt_hi))
+            trigger = np.abs(np.log(path.price_post[segment] / center_price)) > tp
+            if oor_grace_s > 0:
+                # Length of the out-of-range run each swap ends, in seconds.
+                elapsed = np.cumsum(np.where(out_of_range, dt_s[segment], 0))
+                run_s = elapsed - np.maximum.accumulate(np.where(out_of_range, 0, elapsed))
+                trigger |= out_of_range & (run_s >= oor_grace_s)
+            else:
+                trigger |= out_of_range
+            hits = np.flatnonzero(trigger)
+            if hits.size or end == n:
+                break
+            length *= 2
+        stop = start + int(hits[0]) + 1 if hits.size else n
+        stretch = slice(start, stop)
+        out_of_range = out_of_range[: stop - start]
+        in_range_s += int(dt_s[stretch][~out_of_range].sum())
+        out_range_s += int(dt_s[stretch][out_of_range].sum())
+        earning = valid_pool[stretch] & (sqrt_lo <= mid[stretch]) & (mid[stretch] <= sqrt_hi)
+        fees_usd += float((fee_base[stretch][earning] * liquidity).sum())
+        if not hits.size:
+            break
+
+        k = stop - 1
+        sqrt_post = float(post[k])
+        pp_post = float(path.price_post[k])
+        # Close at the pool price and reopen centred on it with what is left.
+        x_old_raw, y_old_raw = token_amounts(liquidity, sqrt_post, sqrt_lo, sqrt_hi)
+        x_old = float(x_old_raw) / TOKEN0_UNIT
+        v_pool = x_old * pp_post + float(y_old_raw) / TOKEN1_UNIT
+        v_after_gas = v_pool - gas_usd
+        new_lo, new_hi = range_bounds(pp_post, range_pct)
+        x_new = 0.0
+        if v_after_gas > 0:
+            l_new = liquidity_for_deposit(v_after_gas, sqrt_post, new_lo, new_hi, pp_post)
+            x_new_raw, _ = token_amounts(l_new, sqrt_post, new_lo, new_hi)
+            x_new = float(x_new_raw) / TOKEN0_UNIT
+        # The inventory change trades through the pool at its fee.
+        swap_fee = abs(x_new - x_old) * pp_post * fee_rate
+        v_final = v_after_gas - swap_fee
+        liquidity = (
+            float(liquidity_for_deposit(v_final, sqrt_post, new_lo, new_hi, pp_post))
+            if v_final > 0
+            else 0.0
+        )
+        gas_total += gas_usd
+        rebalance_slippage += swap_fee
+        n_rebalances += 1
+        center_price = pp_post
+        sqrt_lo, sqrt_hi = new_lo, new_hi
+        # Stretches tend to be alike, so the next search starts near this one's length.
+        length = max(64, min(search_block, 2 * (stop - start)))
+        start = stop
+
+    final_price = float(path.price_post[-1])
+    v_lp = float(position_value(liquidity, float(post[-1]), sqrt_lo, sqrt_hi, final_price))
+    v_hodl = x0 * final_price + y0
+    span_d = path.span_s / 86_400.0
+    net_pnl = v_lp + fees_usd - v_hodl
+    return ActiveLPResult(
+        range_pct=range_pct,
+        trigger_pct=trigger_pct,
+        n_rebalances=n_rebalances,
+        gas_usd=gas_total,
+        fees_usd=fees_usd,
+        in_range_frac=in_range_s / (in_range_s + out_range_s + 1e-9),
+        v_lp=v_lp,
+        v_hodl=v_hodl,
+        final_price=final_price,
+        center_price=center_price,
+        rebalance_slippage=rebalance_slippage,
+        net_pnl=net_pnl,
+        net_pnl_pct=net_pnl / deposit * 100,
+        annualized_pct=net_pnl / deposit * 365.0 / span_d * 100 if span_d > 0 else math.nan,
+        span_d=span_d,
+    )
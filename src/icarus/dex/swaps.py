@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from icarus.dex.liquidity import sqrtx96_to_price
+
+type FloatArray = npt.NDArray[np.float64]
+type IntArray = npt.NDArray[np.int64]
+
+
+@dataclass(frozen=True, slots=True)
+class SwapArrays:
+    """A pool's swap history as aligned arrays in (timestamp, logIndex) order.
+
+    ``sqrt_price_x96`` is the pool price after each swap; ``amount0`` and
+    ``amount1`` are the pool's token deltas in human units (positive: the
+    swapper paid that token in).
+    """
+
+    timestamp: IntArray
+    log_index: IntArray
+    sqrt_price_x96: FloatArray
+    amount0: FloatArray
+    amount1: FloatArray
+    amount_usd: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def price(self) -> FloatArray:
+        return sqrtx96_to_price(self.sqrt_price_x96)
+
+    def window(self, start_s: int, end_s: int) -> SwapArrays:
+        """The swaps with ``start_s <= timestamp <= end_s``."""
+        lo = int(np.searchsorted(self.timestamp, start_s, side="left"))
+        hi = int(np.searchsorted(self.timestamp, end_s, side="right"))
+        return self[lo:hi]
+
+    def __getitem__(self, index: slice) -> SwapArrays:
+        return SwapArrays(
+            timestamp=self.timestamp[index],
+            log_index=self.log_index[index],
+            sqrt_price_x96=self.sqrt_price_x96[index],
+            amount0=self.amount0[index],
+            amount1=self.amount1[index],
+            amount_usd=self.amount_usd[index],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CexReference:
+    """External reference prices (CEX candle closes) by bar start, ascending."""
+
+    timestamp: IntArray
+    price: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def price_at(self, timestamp: int | IntArray) -> FloatArray:
+        """The price of the first bar starting at or after ``timestamp``, clamped."""
+        index = np.searchsorted(self.timestamp, timestamp)
+        return self.price[np.clip(index, 0, len(self.price) - 1)]
+
+
+def load_swaps(path: Path) -> SwapArrays:
+    """Read a gzipped JSONL swap dump (as written by dex_pull_swaps) into arrays."""
+    timestamp: list[int] = []
+    log_index: list[int] = []
+    sqrt_price: list[float] = []
+    amount0: list[float] = []
+    amount1: list[float] = []
+    amount_usd: list[float] = []
+    with gzip.open(path, "rb") as fh:
+        for line in fh:
+            row = json.loads(line)
+            timestamp.append(int(row["timestamp"]))
+            log_index.append(int(row["logIndex"]))
+            sqrt_price.append(float(row["sqrtPriceX96"]))
+            amount0.append(float(row["amount0"]))
+            amount1.append(float(row["amount1"]))
+            amount_usd.append(float(row["amountUSD"]))
+    timestamps = np.asarray(timestamp, dtype=np.int64)
+    log_indices = np.asarray(log_index, dtype=np.int64)
+    order = np.lexsort((log_indices, timestamps))
+    return SwapArrays(
+        timestamp=timestamps[order],
+        log_index=log_indices[order],
+        sqrt_price_x96=np.asarray(sqrt_price, dtype=np.float64)[order],
+        amount0=np.asarray(amount0, dtype=np.float64)[order],
+        amount1=np.asarray(amount1, dtype=np.float64)[order],
+        amount_usd=np.asarray(amount_usd, dtype=np.float64)[order],
+    )
+
+
+def load_cex(path: Path) -> CexReference:
+    """Read a JSONL candle dump (``ts_s``, ``close``; see dex_pull_cex_ref)."""
+    timestamp: list[int] = []
+    price: list[float] = []
+    with path.open("rb") as fh:
+        for line in fh:
+            row = json.loads(line)
+            timestamp.append(int(row["ts_s"]))
+            price.append(float(row["close"]))
+    timestamps = np.asarray(timestamp, dtype=np.int64)
+    order = np.argsort(timestamps, kind="stable")
+    return CexReference(
+        timestamp=timestamps[order],
+        price=np.asarray(price, dtype=np.float64)[order],
+    )
@@ -0,0 +1,28 @@
+"""Model feature matrices shared by training and live serving, and walk-forward runs."""
+
+from icarus.features.lagged import (
+    LAGGED_FEATURE_INDICES,
+    LAGGED_FEATURE_NAMES,
+    OWN_FEATURE_NAMES,
+    LaggedFeatureMatrix,
+    VenueSeries,
+    build_lagged_feature_matrix,
+    lagged_feature_names,
+    lagged_feature_rows,
+)
+from icarus.features.walk_forward import Fold, WalkForwardJob, WalkForwardPool, make_folds
+
+__all__ = [
+    "LAGGED_FEATURE_INDICES",
+    "LAGGED_FEATURE_NAMES",
+    "OWN_FEATURE_NAMES",
+    "Fold",
+    "LaggedFeatureMatrix",
+    "VenueSeries",
+    "WalkForwardJob",
+    "WalkForwardPool",
+    "build_lagged_feature_matrix",
+    "lagged_feature_names",
+    "lagged_feature_rows",
+    "make_folds",
+]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+# Per-venue snapshot features, in column order.
+OWN_FEATURE_NAMES = (
+    "microprice-mid",
+    "depth_imbalance",
+    "vol_bps",
+    "trade_net_flow",
+    "trade_total_size",
+    "basis_dislocation",
+)
+
+# Indices into the snapshot vector that get lagged diffs: microprice-mid and
+# basis_dislocation.
+LAGGED_FEATURE_INDICES = (0, 5)
+LAGGED_FEATURE_NAMES = tuple(OWN_FEATURE_NAMES[i] for i in LAGGED_FEATURE_INDICES)
+
+# A lag lookup is rejected when the as-of tick is more than this many lag
+# windows older than the row it feeds.
+MAX_LAG_GAP_WINDOWS = 2
+
+type FloatArray = npt.NDArray[np.float64]
+type IntArray = npt.NDArray[np.int64]
+type BoolArray = npt.NDArray[np.bool_]
+
+
+@dataclass(frozen=True, slots=True)
+class VenueSeries:
+    """One venue's ticks in timestamp order: ``features`` is (n, 6)."""
+
+    venue: str
+    ts: IntArray
+    mid: FloatArray
+    features: FloatArray
+
+
+@dataclass(frozen=True, slots=True)
+class LaggedFeatureMatrix:
+    """Training rows for one venue: features, forward mid drift and provenance.
+
+    ``rows`` are indices into the predicted venue's series and ``timestamps_ms``
+    their tick times, both aligned with ``x``/``y``.
+    """
+
+    x: FloatArray
+    y: FloatArray
+    timestamps_ms: IntArray
+    rows: IntArray
+    feature_names: list[str]
+
+
+def lagged_feature_names(
+    predict_venue: str,
+    other_venues: Sequence[str],
+    lag_windows_ms: Sequence[int],
+) -> list[str]:
+    names = [f"own_{name}" for name in OWN_FEATURE_NAMES]
+    for venue in other_venues:
+        names.extend(f"{venue}_{name}" for name in OWN_FEATURE_NAMES)
+    for venue in (predict_venue, *other_venues):
+        tag = "own" if venue == predict_venue else venue
+        for name in LAGGED_FEATURE_NAMES:
+            names.extend(f"{tag}_{name}_diff_{window}ms" for window in lag_windows_ms)
+    return names
+
+
+def as_of_indices(ts: npt.ArrayLike, targets: npt.ArrayLike) -> IntArray:
+    """Index of the last tick at or before each target; -1 where there is none."""
+    return np.searchsorted(ts, targets, side="right").astype(np.int64) - 1
+
+
+def lagged_feature_rows(
+    now_ms: IntArray,
+    current: Sequence[FloatArray],
+    histories: Sequence[tuple[IntArray, FloatArray]],
+    lag_windows_ms: Sequence[int],
+) -> tuple[FloatArray, BoolArray]:
+    """Assemble feature rows from per-venue snapshots and their tick histories.
+
+    ``current`` and ``histories`` are in feature order (predicted venue first):
+    ``current[v]`` holds venue v's snapshot for each row, ``histories[v]`` its
+    sorted (ts, features) ticks to take lagged values from. Returns the
+    (n, 6 * venues + venues * 2 * windows) matrix and a mask of rows whose lag
+    lookups all found a tick no more than ``MAX_LAG_GAP_WINDOWS`` windows old.
+    Training and live serving both build rows here.
+    """
+    n = len(now_ms)
+    n_lagged = len(LAGGED_FEATURE_INDICES)
+    n_windows = len(lag_windows_ms)
+    width = len(OWN_FEATURE_NAMES) * len(current) + len(current) * n_lagged * n_windows
+    x = np.empty((n, width), dtype=np.float64)
+    ok = np.ones(n, dtype=np.bool_)
+
+    column = 0
+    for snapshot in current:
+        x[:, column : column + snapshot.shape[1]] = snapshot
+        column += snapshot.shape[1]
+    lagged_columns = list(LAGGED_FEATURE_INDICES)
+    for snapshot, (ts, features) in zip(current, histories, strict=True):
+        # Columns run feature-major, window-minor within each venue.
+        diffs = np.empty((n, n_lagged, n_windows), dtype=np.float64)
+        for w, window in enumerate(lag_windows_ms):
+            k = as_of_indices(ts, now_ms - window)
+            found = k >= 0
+            k = np.where(found, k, 0)
+            if len(ts):
+                ok &= found & (now_ms - ts[k] <= MAX_LAG_GAP_WINDOWS * window)
+                diffs[:, :, w] = snapshot[:, lagged_columns] - features[k][:, lagged_columns]
+            else:
+                ok[:] = False
+                diffs[:, :, w] = np.nan
+        x[:, column : column + n_lagged * n_windows] = diffs.reshape(n, -1)
+        column += n_lagged * n_windows
+    return x, ok
+
+
+def build_lagged_feature_matrix(
+    predict_venue: str,
+    series: Mapping[str, VenueSeries],
+    *,
+    horizon_ms: int,
+    tolerance_ms: int,
+    lag_windows_ms: Sequence[int],
+) -> LaggedFeatureMatrix | None:
+    """Lagged cross-venue features for every usable tick of ``predict_venue``.
+
+    Each row is the venue's snapshot, every other venue's latest snapshot at
+    or before the tick (venues in sorted order), and lagged diffs for all of
+    them. The target is the venue's mid change to its first tick at least
+    ``horizon_ms`` later. Rows are dropped when that tick lands more than
+    ``tolerance_ms`` past the horizon, when another venue has no tick yet, or
+    when a lag lookup misses. Returns None without a predicted venue or any
+    other venue.
+    """
+    own = series.get(predict_venue)
+    other_venues = sorted(venue for venue in series if venue != predict_venue)
+    if own is None or not other_venues:
+        return None
+    feature_names = lagged_feature_names(predict_venue, other_venues, lag_windows_ms)
+
+    ts = own.ts
+    n = len(ts)
+    target = np.maximum(
+        np.searchsorted(ts, ts + horizon_ms, side="left"),
+        np.arange(1, n + 1),
+    )
+    keep = target < n
+    target = np.where(keep, target, n - 1)
+    keep &= ts[target] - (ts + horizon_ms) <= tolerance_ms
+    latest: dict[str, IntArray] = {}
+    for venue in other_venues:
+        latest[venue] = as_of_indices(series[venue].ts, ts)
+        keep &= latest[venue] >= 0
+
+    rows = np.flatnonzero(keep)
+    current = [own.features[rows]]
+    current.extend(series[venue].features[latest[venue][rows]] for venue in other_venues)
+    histories = [(own.ts, own.features)]
+    histories.extend((series[venue].ts, series[venue].features) for venue in other_venues)
+    x, ok = lagged_feature_rows(ts[rows], current, histories, lag_windows_ms)
+
+    rows = rows[ok]
+    return LaggedFeatureMatrix(
+        x=x[ok],
+        y=own.mid[target[rows]] - own.mid[rows],
+        timestamps_ms=ts[rows],
+        rows=rows.astype(np.int64),
+        feature_names=feature_names,
+    )
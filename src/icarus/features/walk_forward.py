@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+# Native thread pools that would otherwise each grab every core in every worker.
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@dataclass(frozen=True, slots=True)
+class Fold:
+    fold_index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def make_folds(n: int, train_size: int, test_size: int, step: int) -> list[Fold]:
+    """Rolling train/test windows over ``n`` time-ordered rows, ``step`` apart."""
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    folds: list[Fold] = []
+    start = 0
+    while start + train_size + test_size <= n:
+        folds.append(
+            Fold(
+                fold_index=len(folds),
+                train_start=start,
+                train_end=start + train_size,
+                test_start=start + train_size,
+                test_end=start + train_size + test_size,
+            )
+        )
+        start += step
+    return folds
+
+
+@dataclass(frozen=True, slots=True)
+class WalkForwardJob:
+    """One (x, y) matrix and the fold function to run on each of its folds.
+
+    ``fn(x_train, y_train, x_test, y_test, *args)`` must be a module-level
+    function so workers can import it, and must not return views of its inputs.
+    """
+
+    x: npt.NDArray[Any]
+    y: npt.NDArray[Any]
+    folds: Sequence[Fold]
+    fn: Callable[..., Any]
+    args: tuple[Any, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class _SharedArray:
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+type _FoldTask = tuple[_SharedArray, _SharedArray, Fold, Callable[..., Any], tuple[Any, ...]]
+
+
+class WalkForwardPool:
+    """Runs walk-forward folds across a pool of worker processes.
+
+    Each ``run`` copies every job's matrices into shared memory once; workers
+    map them by name per fold instead of receiving pickled slices. Results
+    come back per job in fold order, so the output does not depend on the
+    worker count. Each worker's BLAS/OpenMP pools are capped at
+    ``threads_per_worker`` threads. With ``workers=1`` folds run in this
+    process on the original arrays.
+    """
+
+    def __init__(self, workers: int = 1, *, threads_per_worker: int = 1) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if threads_per_worker < 1:
+            raise ValueError("threads_per_worker must be at least 1.")
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> WalkForwardPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def run(self, jobs: Sequence[WalkForwardJob]) -> list[list[Any]]:
+        if self.workers == 1 or not any(job.folds for job in jobs):
+            return [
+                [_call_fold(job.fn, job.x, job.y, fold, job.args) for fold in job.folds]
+                for job in jobs
+            ]
+
+        segments: list[shared_memory.SharedMemory] = []
+        try:
+            tasks: list[_FoldTask] = []
+            for job in jobs:
+                x_ref = _share(job.x, segments)
+                y_ref = _share(job.y, segments)
+                tasks.extend((x_ref, y_ref, fold, job.fn, job.args) for fold in job.folds)
+            # Workers are spawned on demand during submission and inherit the
+            # environment as it is then.
+            with _native_thread_limit(self.threads_per_worker):
+                executor = self._ensure_executor()
+                flat = list(executor.map(_run_shared_fold, *zip(*tasks, strict=True)))
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+        results: list[list[Any]] = []
+        offset = 0
+        for job in jobs:
+            results.append(flat[offset : offset + len(job.folds)])
+            offset += len(job.folds)
+        return results
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+
+def _call_fold(
+    fn: Callable[..., Any],
+    x: npt.NDArray[Any],
+    y: npt.NDArray[Any],
+    fold: Fold,
+    args: tuple[Any, ...],
+) -> Any:
+    return fn(
+        x[fold.train_start : fold.train_end],
+        y[fold.train_start : fold.train_end],
+        x[fold.test_start : fold.test_end],
+        y[fold.test_start : fold.test_end],
+        *args,
+    )
+
+
+def _share(array: npt.NDArray[Any], segments: list[shared_memory.SharedMemory]) -> _SharedArray:
+    array = np.ascontiguousarray(array)
+    # SharedMemory rejects zero-sized segments.
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    view: npt.NDArray[Any] = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    view[...] = array
+    del view
+    return _SharedArray(name=segment.name, shape=array.shape, dtype=array.dtype.str)
+
+
+def _run_shared_fold(
+    x_ref: _SharedArray,
+    y_ref: _SharedArray,
+    fold: Fold,
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+) -> Any:
+    # If ``fn`` raises, the traceback keeps the views alive and the mappings
+    # are released with the worker instead.
+    x_segment = shared_memory.SharedMemory(name=x_ref.name)
+    y_segment = shared_memory.SharedMemory(name=y_ref.name)
+    x: npt.NDArray[Any] = np.ndarray(x_ref.shape, dtype=x_ref.dtype, buffer=x_segment.buf)
+    y: npt.NDArray[Any] = np.ndarray(y_ref.shape, dtype=y_ref.dtype, buffer=y_segment.buf)
+    result = _call_fold(fn, x, y, fold, args)
+    # Drop the numpy views first; SharedMemory refuses to close while they exist.
+    del x, y
+    x_segment.close()
+    y_segment.close()
+    return result
+
+
+@contextmanager
+def _native_thread_limit(threads: int) -> Iterator[None]:
+    saved = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
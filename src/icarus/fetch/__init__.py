@@ -0,0 +1,38 @@
+"""Concurrent, rate-limited and cached fetching of venue REST and subgraph history."""
+
+from icarus.fetch.budget import DEFAULT_HOST_RATES, RateBudget, default_budgets
+from icarus.fetch.cache import ResponseCache
+from icarus.fetch.client import AsyncHttpClient, HttpError, HttpResponse
+from icarus.fetch.paging import TimeWindow, fetch_windows, split_windows
+from icarus.fetch.schedule import TickGrid, budget_span_s
+from icarus.fetch.venues import (
+    coinbase_candles,
+    graph_query,
+    graph_swaps,
+    hyperliquid_candles,
+    hyperliquid_funding,
+    kraken_ohlc,
+    okx_history_candles,
+)
+
+__all__ = [
+    "DEFAULT_HOST_RATES",
+    "AsyncHttpClient",
+    "HttpError",
+    "HttpResponse",
+    "RateBudget",
+    "ResponseCache",
+    "TickGrid",
+    "TimeWindow",
+    "budget_span_s",
+    "coinbase_candles",
+    "default_budgets",
+    "fetch_windows",
+    "graph_query",
+    "graph_swaps",
+    "hyperliquid_candles",
+    "hyperliquid_funding",
+    "kraken_ohlc",
+    "okx_history_candles",
+    "split_windows",
+]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+# Public REST limits per host as (requests per second, burst), a little under
+# the documented figures. Hyperliquid weighs info requests at 20 of 1200 per
+# minute; OKX's history-candles allows 20 per 2 s; Kraken's public counter
+# decays at about one call per second.
+DEFAULT_HOST_RATES: dict[str, tuple[float, int]] = {
+    "api.exchange.coinbase.com": (8.0, 8),
+    "api.hyperliquid.xyz": (0.9, 4),
+    "api.kraken.com": (0.9, 1),
+    "gateway.thegraph.com": (10.0, 10),
+    "www.okx.com": (8.0, 8),
+}
+
+
+class RateBudget:
+    """Token bucket shared by every request to one host.
+
+    Allows ``burst`` requests back to back, then ``rate_per_s`` on average.
+    Waiters are served in arrival order.
+    """
+
+    __slots__ = ("rate_per_s", "burst", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate_per_s: float, *, burst: int = 1) -> None:
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive.")
+        if burst < 1:
+            raise ValueError("burst must be at least 1.")
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate_per_s
+            )
+            self._updated = now
+            if self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) / self.rate_per_s)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1.0
+
+
+def default_budgets() -> dict[str, RateBudget]:
+    """Fresh budgets for ``DEFAULT_HOST_RATES``; one set per client."""
+    return {
+        host: RateBudget(rate, burst=burst) for host, (rate, burst) in DEFAULT_HOST_RATES.items()
+    }
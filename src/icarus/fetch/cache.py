@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from icarus.fetch.paging import TimeWindow
+
+
+class ResponseCache:
+    """JSON results on disk, one file per (namespace, request, time window).
+
+    ``request`` is any JSON-able description of what was asked (endpoint,
+    symbol, interval, ...) and is hashed into the file name after the
+    window bounds, e.g. ``coinbase_candles/1700000000_1701080000_<hash>.json``.
+    Writes are atomic, so a killed run never leaves a torn entry. ``None``
+    results are not distinguishable from misses.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path(self, namespace: str, request: object, window: TimeWindow | None = None) -> Path:
+        encoded = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha256(encoded.encode()).hexdigest()[:16]
+        name = f"{digest}.json" if window is None else f"{window.start}_{window.end}_{digest}.json"
+        return self.root / namespace / name
+
+    def get(
+        self,
+        namespace: str,
+        request: object,
+        window: TimeWindow | None = None,
+        *,
+        max_age_s: float | None = None,
+    ) -> Any:
+        """The stored result, or None if absent or older than ``max_age_s``."""
+        path = self.path(namespace, request, window)
+        try:
+            if max_age_s is not None and time.time() - path.stat().st_mtime > max_age_s:
+                return None
+            return json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def put(
+        self, namespace: str, request: object, value: Any, window: TimeWindow | None = None
+    ) -> None:
+        path = self.path(namespace, request, window)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(f".{os.getpid()}.tmp")
+        partial.write_text(json.dumps(value, separators=(",", ":")))
+        os.replace(partial, path)
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import gzip
+import json
+import ssl
+import time
+import zlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from icarus.fetch.budget import RateBudget, default_budgets
+
+DEFAULT_USER_AGENT = "icarus-research/0.1"
+DEFAULT_TIMEOUT_S = 30.0
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 8
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF_S = 1.0
+MAX_BACKOFF_S = 30.0
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class HttpError(RuntimeError):
+    """A response with an error status, after any retries."""
+
+    def __init__(self, status: int, url: str, body: bytes) -> None:
+        super().__init__(f"HTTP {status} from {url}: {body[:200]!r}")
+        self.status = status
+        self.url = url
+        self.body = body
+
+
+@dataclass(frozen=True, slots=True)
+class HttpResponse:
+    """A decoded response; the timestamps bracket the request on the wire.
+
+    ``sent_timestamp_ms`` is taken just before the request is written and
+    ``received_timestamp_ms`` once the whole body has arrived; ``elapsed_ns``
+    is the same span on the monotonic clock.
+    """
+
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    sent_timestamp_ms: int
+    received_timestamp_ms: int
+    elapsed_ns: int
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class _Connection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool:
+    __slots__ = ("scheme", "host", "port", "idle", "slots")
+
+    def __init__(self, scheme: str, host: str, port: int, max_connections: int) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.idle: list[_Connection] = []
+        self.slots = asyncio.Semaphore(max_connections)
+
+
+class AsyncHttpClient:
+    """HTTP/1.1 client on asyncio streams with keep-alive pools per host.
+
+    Each host gets up to ``max_connections_per_host`` concurrent connections,
+    kept open between requests, and requests to a host listed in ``budgets``
+    wait on its ``RateBudget`` first (``default_budgets()`` unless given;
+    pass ``{}`` for none). Connection failures, timeouts and 408/425/429/5xx
+    responses are retried with exponential backoff (honouring a numeric
+    ``Retry-After``); any other non-2xx status raises ``HttpError``.
+    Redirects are not followed: venue endpoints don't redirect, so a 3xx
+    means a wrong URL rather than a body to parse.
+
+    Use as an async context manager, within one event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        budgets: Mapping[str, RateBudget] | None = None,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        retries: int = DEFAULT_RETRIES,
+        backoff_s: float = DEFAULT_BACKOFF_S,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        if max_connections_per_host < 1:
+            raise ValueError("max_connections_per_host must be at least 1.")
+        if retries < 0:
+            raise ValueError("retries must be non-negative.")
+        self.budgets = dict(default_budgets() if budgets is None else budgets)
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout_s = timeout_s
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.headers = {"User-Agent": DEFAULT_USER_AGENT, **(headers or {})}
+        self._pools: dict[tuple[str, str, int], _HostPool] = {}
+        self._ssl: ssl.SSLContext | None = None
+
+    async def __aenter__(self) -> AsyncHttpClient:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        connections = [conn for pool in self._pools.values() for conn in pool.idle]
+        for pool in self._pools.values():
+            pool.idle.clear()
+        for conn in connections:
+            conn.close()
+        for conn in connections:
+            with contextlib.suppress(OSError):
+                await conn.writer.wait_closed()
+
+    async def get_json(self, url: str, params: Mapping[str, Any] | None = None) -> Any:
+        return (await self.request("GET", url, params=params)).json()
+
+    async def post_json(self, url: str, payload: Any) -> Any:
+        return (await self.request("POST", url, json_body=payload)).json()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        body: bytes | None = None,
+        json_body: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> HttpResponse:
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+        merged = dict(self.headers)
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            merged["Content-Type"] = "application/json"
+        merged.update(headers or {})
+        parts = urlsplit(url)
+        if parts.scheme not in _DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url!r}")
+        port = parts.port or _DEFAULT_PORTS[parts.scheme]
+        pool = self._pool(parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        head = _request_head(method, target, parts.netloc, merged, body)
+        budget = self.budgets.get(parts.hostname)
+
+        delay = self.backoff_s
+        attempt = 0
+        while True:
+            if budget is not None:
+                await budget.acquire()
+            try:
+                response = await self._exchange(pool, url, method, head, body)
+            except (OSError, EOFError):
+                if attempt >= self.retries:
+                    raise
+            else:
+                if 200 <= response.status < 300:
+                    return response
+                if response.status not in RETRY_STATUSES or attempt >= self.retries:
+                    raise HttpError(response.status, url, response.body)
+                retry_after = _retry_after_s(response.headers)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+            await asyncio.sleep(min(delay, MAX_BACKOFF_S))
+            delay = min(delay * 2.0, MAX_BACKOFF_S)
+            attempt += 1
+
+    def _pool(self, scheme: str, host: str, port: int) -> _HostPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _HostPool(scheme, host, port, self.max_connections_per_host)
+            self._pools[key] = pool
+        return pool
+
+    async def _connect(self, pool: _HostPool) -> _Connection:
+        context = None
+        if pool.scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.open_connection(pool.host, pool.port, ssl=context)
+        return _Connection(reader, writer)
+
+    async def _exchange(
+        self, pool: _HostPool, url: str, method: str, head: bytes, body: bytes | None
+    ) -> HttpResponse:
+        async with pool.slots:
+            while True:
+                conn = _idle_connection(pool)
+                reused = conn is not None
+                try:
+                    async with asyncio.timeout(self.timeout_s):
+                        if conn is None:
+                            conn = await self._connect(pool)
+                        sent_ms = time.time_ns() // 1_000_000
+                        started_ns = time.perf_counter_ns()
+                        conn.writer.write(head + body if body else head)
+                        await conn.writer.drain()
+                        status, headers, payload, keep_alive = await _read_response(
+                            conn.reader, method
+                        )
+                    received_ms = time.time_ns() // 1_000_000
+                    elapsed_ns = time.perf_counter_ns() - started_ns
+                except BaseException as exc:
+                    if conn is not None:
+                        conn.close()
+                    # The server may have dropped an idle connection; that
+                    # costs a reconnect, not a retry.
+                    stale = isinstance(exc, OSError | EOFError) and not isinstance(
+                        exc, TimeoutError
+                    )
+                    if reused and stale:
+                        continue
+                    raise
+                if keep_alive:
+                    pool.idle.append(conn)
+                else:
+                    conn.close()
+                return HttpResponse(
+                    url=url,
+                    status=status,
+                    headers=headers,
+                    body=_decode_body(payload, headers.get("content-encoding", "")),
+                    sent_timestamp_ms=sent_ms,
+                    received_timestamp_ms=received_ms,
+                    elapsed_ns=elapsed_ns,
+                )
+
+
+def _idle_connection(pool: _HostPool) -> _Connection | None:
+    while pool.idle:
+        conn = pool.idle.pop()
+        if not conn.reader.at_eof():
+            return conn
+        conn.close()
+    return None
+
+
+def _request_head(
+    method: str, target: str, netloc: str, headers: Mapping[str, str], body: bytes | None
+) -> bytes:
+    lines = [
+        f"{method} {target} HTTP/1.1",
+        f"Host: {netloc}",
+        "Accept-Encoding: gzip, deflate",
+        "Connection: keep-alive",
+    ]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    if body is not None or method in ("POST", "PUT", "PATCH"):
+        lines.append(f"Content-Length: {len(body or b'')}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str
+) -> tuple[int, dict[str, str], bytes, bool]:
+    """Status, lower-cased headers, raw body and whether the connection is reusable."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed before a response.")
+    try:
+        version, status_text = status_line.decode("latin-1").split(" ", 2)[:2]
+        status = int(status_text)
+    except ValueError as exc:
+        raise ConnectionError(f"Malformed status line: {status_line[:100]!r}") from exc
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        payload = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        payload = await _read_chunked(reader)
+    elif "content-length" in headers:
+        try:
+            length = int(headers["content-length"])
+        except ValueError as exc:
+            raise ConnectionError("Malformed Content-Length.") from exc
+        payload = await reader.readexactly(length)
+    else:
+        payload = await reader.read()
+        keep_alive = False
+    return status, headers, payload, keep_alive
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readline()
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError as exc:
+            raise ConnectionError(f"Malformed chunk size: {size_line[:100]!r}") from exc
+        if size == 0:
+            # Skip any trailers.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+def _decode_body(payload: bytes, encoding: str) -> bytes:
+    encoding = encoding.lower()
+    if encoding == "gzip":
+        return gzip.decompress(payload)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(payload)
+        except zlib.error:
+            return zlib.decompress(payload, -zlib.MAX_WBITS)
+    return payload
+
+
+def _retry_after_s(headers: Mapping[str, str]) -> float | None:
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from icarus.fetch.cache import ResponseCache
+
+DEFAULT_CONCURRENCY = 8
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class TimeWindow:
+    """Half-open ``[start, end)`` in the caller's units (seconds or ms)."""
+
+    start: int
+    end: int
+
+
+def split_windows(start: int, end: int, step: int) -> list[TimeWindow]:
+    """Cover ``[start, end)`` with windows on a fixed grid of ``step``.
+
+    Boundaries are multiples of ``step``, so a sliding span requested again
+    later ("the last 30 days") maps onto the same windows and reuses their
+    cached pages. The first window may begin before ``start``; the last is
+    cut at ``end``.
+    """
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    if end <= start:
+        return []
+    first = start // step * step
+    return [TimeWindow(t, min(t + step, end)) for t in range(first, end, step)]
+
+
+async def fetch_windows[T](
+    windows: Sequence[TimeWindow],
+    fetch_page: Callable[[TimeWindow], Awaitable[T]],
+    *,
+    cache: ResponseCache | None = None,
+    namespace: str = "pages",
+    request: object = None,
+    settled_before: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: Callable[[TimeWindow, T, bool], None] | None = None,
+) -> list[T]:
+    """Fetch each window's page, ``concurrency`` at a time; results in window order.
+
+    With a ``cache``, windows stored under (``namespace``, ``request``) are
+    read back instead of fetched, and every fetched page is stored as soon
+    as it arrives, so an interrupted backfill resumes where it stopped.
+    Windows ending after ``settled_before`` (still filling, like the current
+    candle) are always fetched and never stored. If pages fail, the rest
+    still finish and are stored before the first error is raised.
+
+    ``on_page(window, page, from_cache)`` is called as each page lands.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(window: TimeWindow) -> T:
+        settled = settled_before is None or window.end <= settled_before
+        if cache is not None and settled:
+            page: T | None = cache.get(namespace, request, window)
+            if page is not None:
+                if on_page is not None:
+                    on_page(window, page, True)
+                return page
+        async with slots:
+            page = await fetch_page(window)
+        if cache is not None and settled:
+            cache.put(namespace, request, page, window)
+        if on_page is not None:
+            on_page(window, page, False)
+        return page
+
+    results = await asyncio.gather(*(one(w) for w in windows), return_exceptions=True)
+    pages: list[T] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        pages.append(result)
+    return pages
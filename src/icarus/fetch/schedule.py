@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+
+from icarus.fetch.budget import DEFAULT_HOST_RATES
+
+
+def budget_span_s(
+    requests: int,
+    host: str,
+    rates: Mapping[str, tuple[float, int]] = DEFAULT_HOST_RATES,
+) -> float:
+    """Seconds ``host``'s rate budget needs to serve ``requests`` every tick.
+
+    This is the sustained figure. A burst covers a first tick, but after that
+    a tick can never take less than ``requests / rate``. Hosts without a
+    budget take 0.0.
+    """
+    if requests < 0:
+        raise ValueError("requests must be non-negative.")
+    rate = rates.get(host)
+    if rate is None:
+        return 0.0
+    return requests / rate[0]
+
+
+class TickGrid:
+    """Polling slots on a fixed grid of ``interval_s`` starting at ``start_s``.
+
+    A tick that overruns its interval doesn't push later ticks back. Instead,
+    ``advance`` moves to the first slot that hasn't started yet and counts
+    the missed slots in ``skipped``, so the grid keeps its phase.
+    """
+
+    __slots__ = ("start_s", "interval_s", "slot", "skipped")
+
+    def __init__(self, start_s: float, interval_s: float) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive.")
+        self.start_s = start_s
+        self.interval_s = interval_s
+        self.slot = 0
+        self.skipped = 0
+
+    @property
+    def slot_start_s(self) -> float:
+        return self.start_s + self.slot * self.interval_s
+
+    def advance(self, now_s: float) -> float:
+        """Move to the next slot due at or after ``now_s``; returns the wait until it starts."""
+        due = max(self.slot + 1, math.ceil((now_s - self.start_s) / self.interval_s))
+        self.skipped += due - self.slot - 1
+        self.slot = due
+        return max(0.0, self.slot_start_s - now_s)
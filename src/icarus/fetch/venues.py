@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+from icarus.fetch.cache import ResponseCache
+from icarus.fetch.client import AsyncHttpClient
+from icarus.fetch.paging import DEFAULT_CONCURRENCY, TimeWindow, fetch_windows, split_windows
+
+type PageCallback = Callable[[TimeWindow, Any, bool], None]
+
+COINBASE_CANDLES_URL = "https://api.exchange.coinbase.com/products/{product}/candles"
+HYPERLIQUID_INFO_URL = "https://api.hyperliquid.xyz/info"
+KRAKEN_OHLC_URL = "https://api.kraken.com/0/public/OHLC"
+OKX_HISTORY_CANDLES_URL = "https://www.okx.com/api/v5/market/history-candles"
+
+# Rows per request each venue serves.
+COINBASE_MAX_CANDLES = 300
+HYPERLIQUID_MAX_ROWS = 500
+OKX_MAX_CANDLES = 100
+GRAPH_PAGE_SIZE = 1000
+
+HYPERLIQUID_INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+OKX_BAR_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1H": 3_600_000,
+    "4H": 14_400_000,
+    "1D": 86_400_000,
+}
+HYPERLIQUID_FUNDING_INTERVAL_MS = 3_600_000
+# Bars closed at least this long ago are final and safe to cache.
+SETTLE_S = 60
+# The subgraph can lag the chain; swap windows are cached only once this old.
+GRAPH_SETTLE_S = 3600
+GRAPH_WINDOW_S = 6 * 3600
+SWAP_FIELDS = "id timestamp sender origin amount0 amount1 amountUSD sqrtPriceX96 tick logIndex"
+
+
+async def coinbase_candles(
+    client: AsyncHttpClient,
+    product: str,
+    granularity_s: int,
+    start_s: int,
+    end_s: int,
+    *,
+    cache: ResponseCache | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: PageCallback | None = None,
+) -> list[list[float]]:
+    """Coinbase Exchange candles ``[time_s, low, high, open, close, volume]``.
+
+    Ascending, one row per bar start in ``[start_s, end_s]``.
+    """
+    url = COINBASE_CANDLES_URL.format(product=product)
+
+    async def page(window: TimeWindow) -> list[list[float]]:
+        params = {
+            "granularity": granularity_s,
+            "start": datetime.fromtimestamp(window.start, UTC).isoformat(),
+            "end": datetime.fromtimestamp(window.end, UTC).isoformat(),
+        }
+        rows: list[list[float]] = await client.get_json(url, params)
+        return rows
+
+    pages = await fetch_windows(
+        split_windows(start_s, end_s, granularity_s * COINBASE_MAX_CANDLES),
+        page,
+        cache=cache,
+        namespace="coinbase_candles",
+        request={"product": product, "granularity": granularity_s},
+        settled_before=int(time.time()) - granularity_s - SETTLE_S,
+        concurrency=concurrency,
+        on_page=on_page,
+    )
+    return _by_time(pages, lambda row: int(row[0]), start_s, end_s)
+
+
+async def hyperliquid_candles(
+    client: AsyncHttpClient,
+    coin: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    *,
+    cache: ResponseCache | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: PageCallback | None = None,
+) -> list[dict[str, Any]]:
+    """Hyperliquid ``candleSnapshot`` bars (``{t, T, o, h, l, c, v, n, ...}``).
+
+    Ascending, one per open time ``t`` in ``[start_ms, end_ms]``.
+    """
+    try:
+        bar_ms = HYPERLIQUID_INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported Hyperliquid interval: {interval!r}") from None
+
+    async def page(window: TimeWindow) -> list[dict[str, Any]]:
+        body = {
+            "type": "candleSnapshot",
+            "req": {
+                "coin": coin,
+                "interval": interval,
+                "startTime": window.start,
+                "endTime": window.end - 1,
+            },
+        }
+        rows: list[dict[str, Any]] = await client.post_json(HYPERLIQUID_INFO_URL, body)
+        return rows
+
+    pages = await fetch_windows(
+        split_windows(start_ms, end_ms, bar_ms * HYPERLIQUID_MAX_ROWS),
+        page,
+        cache=cache,
+        namespace="hyperliquid_candles",
+        request={"coin": coin, "interval": interval},
+        settled_before=_now_ms() - bar_ms - SETTLE_S * 1000,
+        concurrency=concurrency,
+        on_page=on_page,
+    )
+    return _by_time(pages, lambda row: int(row["t"]), start_ms, end_ms)
+
+
+async def hyperliquid_funding(
+    client: AsyncHttpClient,
+    coin: str,
+    start_ms: int,
+    end_ms: int,
+    *,
+    cache: ResponseCache | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: PageCallback | None = None,
+) -> list[dict[str, Any]]:
+    """Hyperliquid ``fundingHistory`` records (``{coin, fundingRate, premium, time}``).
+
+    Ascending, one per ``time`` in ``[start_ms, end_ms]``.
+    """
+
+    async def page(window: TimeWindow) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        cursor = window.start
+        while cursor < window.end:
+            body = {
+                "type": "fundingHistory",
+                "coin": coin,
+                "startTime": cursor,
+                "endTime": window.end - 1,
+            }
+            batch: list[dict[str, Any]] = await client.post_json(HYPERLIQUID_INFO_URL, body)
+            rows.extend(batch)
+            if len(batch) < HYPERLIQUID_MAX_ROWS:
+                break
+            cursor = int(batch[-1]["time"]) + 1
+        return rows
+
+    pages = await fetch_windows(
+        split_windows(start_ms, end_ms, HYPERLIQUID_FUNDING_INTERVAL_MS * HYPERLIQUID_MAX_ROWS),
+        page,
+        cache=cache,
+        namespace="hyperliquid_funding",
+        request={"coin": coin},
+        settled_before=_now_ms() - SETTLE_S * 1000,
+        concurrency=concurrency,
+        on_page=on_page,
+    )
+    return _by_time(pages, lambda row: int(row["time"]), start_ms, end_ms)
+
+
+async def kraken_ohlc(
+    client: AsyncHttpClient,
+    pair: str,
+    interval_min: int,
+    start_s: int,
+    end_s: int,
+) -> list[list[Any]]:
+    """Kraken OHLC rows ``[time_s, open, high, low, close, vwap, volume, count]``.
+
+    Ascending, as sent (prices are strings), limited to ``end_s``. Kraken
+    serves only its latest 720 bars whatever ``since`` asks for, so this
+    follows ``since`` sequentially and is not cached. Kraken's error list
+    raises ``RuntimeError``.
+    """
+    rows_by_time: dict[int, list[Any]] = {}
+    cursor = start_s
+    while cursor < end_s:
+        params = {"pair": pair, "interval": interval_min, "since": cursor}
+        data = await client.get_json(KRAKEN_OHLC_URL, params)
+        if data.get("error"):
+            raise RuntimeError(f"Kraken OHLC {pair}: {data['error']}")
+        result = data.get("result", {})
+        rows: list[list[Any]] = next((v for k, v in result.items() if k != "last"), [])
+        if not rows:
+            break
+        for row in rows:
+            if int(row[0]) <= end_s:
+                rows_by_time[int(row[0])] = row
+        last = int(rows[-1][0])
+        if last <= cursor:
+            break
+        cursor = last + 1
+    return [rows_by_time[t] for t in sorted(rows_by_time)]
+
+
+async def okx_history_candles(
+    client: AsyncHttpClient,
+    inst_id: str,
+    bar: str,
+    start_ms: int,
+    end_ms: int,
+    *,
+    cache: ResponseCache | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: PageCallback | None = None,
+) -> list[list[str]]:
+    """OKX ``history-candles`` rows ``[ts_ms, o, h, l, c, vol, volCcy, volCcyQuote, confirm]``.
+
+    Ascending and as sent (strings), one per ``ts_ms`` in ``[start_ms,
+    end_ms]``. A non-zero OKX ``code`` raises ``RuntimeError``.
+    """
+    try:
+        bar_ms = OKX_BAR_MS[bar]
+    except KeyError:
+        raise ValueError(f"Unsupported OKX bar: {bar!r}") from None
+
+    async def page(window: TimeWindow) -> list[list[str]]:
+        # ``after`` is exclusive: the newest OKX_MAX_CANDLES bars before it.
+        params = {
+            "instId": inst_id,
+            "bar": bar,
+            "after": str(window.end),
+            "limit": str(OKX_MAX_CANDLES),
+        }
+        data = await client.get_json(OKX_HISTORY_CANDLES_URL, params)
+        if str(data.get("code", "0")) != "0":
+            raise RuntimeError(f"OKX history-candles {inst_id}: {data.get('msg')!r}")
+        return [row for row in data.get("data", []) if window.start <= int(row[0]) < window.end]
+
+    pages = await fetch_windows(
+        split_windows(start_ms, end_ms, bar_ms * OKX_MAX_CANDLES),
+        page,
+        cache=cache,
+        namespace="okx_history_candles",
+        request={"inst_id": inst_id, "bar": bar},
+        settled_before=_now_ms() - bar_ms - SETTLE_S * 1000,
+        concurrency=concurrency,
+        on_page=on_page,
+    )
+    return _by_time(pages, lambda row: int(row[0]), start_ms, end_ms)
+
+
+async def graph_query(
+    client: AsyncHttpClient,
+    url: str,
+    query: str,
+    *,
+    retries: int = 6,
+    backoff_s: float = 2.0,
+) -> dict[str, Any]:
+    """The ``data`` of a GraphQL query; indexer errors (served as 200s) are retried."""
+    delay = backoff_s
+    for attempt in range(retries + 1):
+        response = await client.post_json(url, {"query": query})
+        errors = response.get("errors")
+        if not errors:
+            data: dict[str, Any] = response.get("data") or {}
+            return data
+        message = str(errors)[:300]
+        if "indexer" not in message or attempt == retries:
+            raise RuntimeError(f"GraphQL errors: {message}")
+        await asyncio.sleep(delay)
+        delay *= 2.0
+    raise AssertionError("unreachable")
+
+
+def swap_query(pool: str, window: TimeWindow, after_id: str, first: int) -> str:
+    where = f'pool: "{pool}", timestamp_gte: "{window.start}", timestamp_lt: "{window.end}"'
+    if after_id:
+        where += f', id_gt: "{after_id}"'
+    return (
+        f"{{ swaps(where: {{{where}}} orderBy: id orderDirection: asc first: {first}) "
+        f"{{ {SWAP_FIELDS} }} }}"
+    )
+
+
+async def graph_swaps(
+    client: AsyncHttpClient,
+    url: str,
+    pool: str,
+    start_s: int,
+    end_s: int,
+    *,
+    window_s: int = GRAPH_WINDOW_S,
+    page_size: int = GRAPH_PAGE_SIZE,
+    cache: ResponseCache | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_page: PageCallback | None = None,
+) -> list[dict[str, Any]]:
+    """Uniswap subgraph swaps of ``pool`` with ``start_s <= timestamp < end_s``.
+
+    Sorted by (timestamp, logIndex). Time windows are fetched concurrently;
+    inside one, pages follow ``id`` rather than the timestamp, so swaps
+    sharing a timestamp are never lost at a page boundary.
+    """
+
+    async def page(window: TimeWindow) -> list[dict[str, Any]]:
+        swaps: list[dict[str, Any]] = []
+        after_id = ""
+        while True:
+            data = await graph_query(client, url, swap_query(pool, window, after_id, page_size))
+            batch: list[dict[str, Any]] = data.get("swaps") or []
+            swaps.extend(batch)
+            if len(batch) < page_size:
+                return swaps
+            after_id = batch[-1]["id"]
+
+    pages = await fetch_windows(
+        split_windows(start_s, end_s, window_s),
+        page,
+        cache=cache,
+        namespace="graph_swaps",
+        # The URL carries the API key; key the cache on the subgraph id only.
+        request={"subgraph": urlsplit(url).path.rsplit("/", 1)[-1], "pool": pool},
+        settled_before=int(time.time()) - GRAPH_SETTLE_S,
+        concurrency=concurrency,
+        on_page=on_page,
+    )
+    swaps = {swap["id"]: swap for rows in pages for swap in rows}
+    return sorted(
+        (s for s in swaps.values() if start_s <= int(s["timestamp"]) < end_s),
+        key=lambda s: (int(s["timestamp"]), int(s["logIndex"])),
+    )
+
+
+def _by_time[Row](
+    pages: Iterable[list[Row]], time_of: Callable[[Row], int], start: int, end: int
+) -> list[Row]:
+    """Rows of all pages, one per time in ``[start, end]`` (last wins), ascending."""
+    rows_by_time: dict[int, Row] = {}
+    for rows in pages:
+        for row in rows:
+            t = time_of(row)
+            if start <= t <= end:
+                rows_by_time[t] = row
+    return [rows_by_time[t] for t in sorted(rows_by_time)]
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
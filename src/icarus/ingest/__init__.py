@@ -0,0 +1,14 @@
+"""Venue ingestion: shared-memory observation rings, worker processes and market routing."""
+
+from icarus.ingest.ring import ObservationRing, record_dtype
+from icarus.ingest.routing import MarketRouter
+from icarus.ingest.workers import MultiProcessIngestor, VenueIngestStats, run_venue_worker
+
+__all__ = [
+    "MarketRouter",
+    "MultiProcessIngestor",
+    "ObservationRing",
+    "VenueIngestStats",
+    "record_dtype",
+    "run_venue_worker",
+]
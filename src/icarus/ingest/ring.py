@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from icarus.observations import (
+    BBOObservation,
+    Observation,
+    OrderBookLevel,
+    OrderBookObservation,
+    TradeObservation,
+)
+from icarus.observations.normalizers import number_parser
+from icarus.observations.types import EMPTY_RAW_MESSAGE, Number, NumericMode
+
+DEFAULT_CAPACITY = 16_384
+DEFAULT_BOOK_LEVELS = 5
+
+KIND_BBO = 1
+KIND_BOOK = 2
+KIND_TRADE = 3
+
+_SIDE_CODES = {"buy": 1, "sell": 2}
+_SIDES: dict[int, Any] = {1: "buy", 2: "sell"}
+_NAME_BYTES = 24
+_TRADE_ID_BYTES = 40
+_MISSING_TIMESTAMP = np.iinfo(np.int64).min
+
+# Header words, each an aligned 8-byte slot at the start of the segment.
+_WRITE_INDEX = 0
+_READ_INDEX = 1
+_DROPPED = 2
+_HEADER_WORDS = 8
+
+
+def record_dtype(book_levels: int = DEFAULT_BOOK_LEVELS) -> np.dtype[Any]:
+    """Fixed layout of one ring record.
+
+    ``seq`` is written last by the producer and checked by the consumer, so a
+    slot is never read before all of its fields are in place. BBO records use
+    the first bid/ask entry; book records carry up to ``book_levels`` levels
+    per side, best first; trade records use ``price``/``size``/``side``.
+    """
+    if book_levels <= 0:
+        raise ValueError("book_levels must be positive.")
+    return np.dtype(
+        [
+            ("seq", "<u8"),
+            ("source_timestamp_ms", "<i8"),
+            ("received_timestamp_ms", "<i8"),
+            ("kind", "u1"),
+            ("side", "u1"),
+            ("n_bids", "u1"),
+            ("n_asks", "u1"),
+            ("exchange", f"S{_NAME_BYTES}"),
+            ("market", f"S{_NAME_BYTES}"),
+            ("trade_id", f"S{_TRADE_ID_BYTES}"),
+            ("price", "<f8"),
+            ("size", "<f8"),
+            ("bid_price", "<f8", (book_levels,)),
+            ("bid_size", "<f8", (book_levels,)),
+            ("ask_price", "<f8", (book_levels,)),
+            ("ask_size", "<f8", (book_levels,)),
+        ],
+        align=True,
+    )
+
+
+class ObservationRing:
+    """Single-producer, single-consumer ring of observation records in shared memory.
+
+    The producer (a venue worker process) ``publish``es BBO, built order-book
+    and trade observations as fixed-layout records; the consumer ``consume``s
+    them as a structured array and ``decode``s them back into observations.
+    When the ring is full the producer drops the record and counts it rather
+    than waiting on the consumer. ``raw_message`` is not carried across;
+    decoded observations all share the read-only ``EMPTY_RAW_MESSAGE``.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        *,
+        capacity: int,
+        book_levels: int,
+        owner: bool,
+    ) -> None:
+        self.shm = shm
+        self.capacity = capacity
+        self.book_levels = book_levels
+        self.owner = owner
+        self.dtype = record_dtype(book_levels)
+        self._header: npt.NDArray[np.uint64] = np.ndarray(
+            (_HEADER_WORDS,), dtype="<u8", buffer=shm.buf
+        )
+        self._records: npt.NDArray[Any] = np.ndarray(
+            (capacity,), dtype=self.dtype, buffer=shm.buf, offset=_HEADER_WORDS * 8
+        )
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        book_levels: int = DEFAULT_BOOK_LEVELS,
+    ) -> ObservationRing:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        size = _HEADER_WORDS * 8 + capacity * record_dtype(book_levels).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        ring = cls(shm, capacity=capacity, book_levels=book_levels, owner=True)
+        ring._header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, *, capacity: int, book_levels: int) -> ObservationRing:
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, capacity=capacity, book_levels=book_levels, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def published(self) -> int:
+        return int(self._header[_WRITE_INDEX])
+
+    @property
+    def dropped(self) -> int:
+        return int(self._header[_DROPPED])
+
+    @property
+    def backlog(self) -> int:
+        return int(self._header[_WRITE_INDEX]) - int(self._header[_READ_INDEX])
+
+    def publish(
+        self,
+        observation: Observation,
+        *,
+        exchange: str | None = None,
+        market: str | None = None,
+    ) -> bool:
+        """Append ``observation``; ``False`` if it was dropped or has no record layout.
+
+        ``exchange``/``market`` override the observation's own names.
+        """
+        if isinstance(observation, BBOObservation):
+            kind = KIND_BBO
+        elif isinstance(observation, OrderBookObservation):
+            kind = KIND_BOOK
+        elif isinstance(observation, TradeObservation):
+            kind = KIND_TRADE
+        else:
+            return False
+
+        header = self._header
+        index = int(header[_WRITE_INDEX])
+        if index - int(header[_READ_INDEX]) >= self.capacity:
+            header[_DROPPED] += 1
+            return False
+
+        slot = self._records[index % self.capacity]
+        slot["source_timestamp_ms"] = _encode_timestamp(observation.source_timestamp_ms)
+        slot["received_timestamp_ms"] = _encode_timestamp(observation.received_timestamp_ms)
+        slot["kind"] = kind
+        slot["exchange"] = (exchange or observation.exchange).encode()[:_NAME_BYTES]
+        slot["market"] = (market or observation.market).encode()[:_NAME_BYTES]
+        if isinstance(observation, BBOObservation):
+            slot["n_bids"] = slot["n_asks"] = 1
+            slot["bid_price"][0] = observation.bid_price
+            slot["bid_size"][0] = observation.bid_size
+            slot["ask_price"][0] = observation.ask_price
+            slot["ask_size"][0] = observation.ask_size
+        elif isinstance(observation, OrderBookObservation):
+            self._encode_levels(slot, observation.levels)
+        else:
+            slot["side"] = _SIDE_CODES[observation.side]
+            slot["trade_id"] = (observation.trade_id or "").encode()[:_TRADE_ID_BYTES]
+            slot["price"] = observation.price
+            slot["size"] = observation.size
+
+        slot["seq"] = index + 1
+        header[_WRITE_INDEX] = index + 1
+        return True
+
+    def consume(self, max_records: int | None = None) -> npt.NDArray[Any]:
+        """Copy out and release up to ``max_records`` published records, oldest first."""
+        header = self._header
+        start = int(header[_READ_INDEX])
+        stop = int(header[_WRITE_INDEX])
+        if max_records is not None:
+            stop = min(stop, start + max_records)
+        if stop <= start:
+            return self._records[:0].copy()
+
+        first = start % self.capacity
+        count = stop - start
+        if first + count <= self.capacity:
+            records = self._records[first : first + count].copy()
+        else:
+            records = np.concatenate(
+                (self._records[first:], self._records[: first + count - self.capacity])
+            )
+        # Stop at the first slot whose sequence number is not yet visible.
+        expected = np.arange(start + 1, stop + 1, dtype=np.uint64)
+        torn = np.flatnonzero(records["seq"] != expected)
+        if len(torn):
+            records = records[: torn[0]]
+        header[_READ_INDEX] = start + len(records)
+        return records
+
+    def decode(
+        self,
+        records: npt.NDArray[Any],
+        *,
+        numeric_mode: NumericMode = "decimal",
+    ) -> list[Observation]:
+        parse = number_parser(numeric_mode)
+
+        def number(value: Any) -> Number:
+            # float() first: parse_decimal then goes through the shortest repr,
+            # so exchange prices such as "75165.94" come back exactly.
+            return parse(float(value))
+
+        observations: list[Observation] = []
+        for record in records:
+            kind = int(record["kind"])
+            exchange = record["exchange"].decode()
+            market = record["market"].decode()
+            source_ms = _decode_timestamp(record["source_timestamp_ms"])
+            received_ms = _decode_timestamp(record["received_timestamp_ms"])
+            if kind == KIND_BBO:
+                observations.append(
+                    BBOObservation(
+                        exchange=exchange,
+                        market=market,
+                        source_timestamp_ms=source_ms,
+                        received_timestamp_ms=received_ms,
+                        raw_message=EMPTY_RAW_MESSAGE,
+                        bid_price=number(record["bid_price"][0]),
+                        bid_size=number(record["bid_size"][0]),
+                        ask_price=number(record["ask_price"][0]),
+                        ask_size=number(record["ask_size"][0]),
+                    )
+                )
+            elif kind == KIND_BOOK:
+                bids = [
+                    OrderBookLevel(side="buy", price=number(price), size=number(size))
+                    for price, size in zip(
+                        record["bid_price"][: record["n_bids"]].tolist(),
+                        record["bid_size"][: record["n_bids"]].tolist(),
+                        strict=True,
+                    )
+                ]
+                asks = [
+                    OrderBookLevel(side="sell", price=number(price), size=number(size))
+                    for price, size in zip(
+                        record["ask_price"][: record["n_asks"]].tolist(),
+                        record["ask_size"][: record["n_asks"]].tolist(),
+                        strict=True,
+                    )
+                ]
+                observations.append(
+                    OrderBookObservation(
+                        exchange=exchange,
+                        market=market,
+                        source_timestamp_ms=source_ms,
+                        received_timestamp_ms=received_ms,
+                        raw_message=EMPTY_RAW_MESSAGE,
+                        update_type="snapshot",
+                        levels=(*bids, *asks),
+                    )
+                )
+            elif kind == KIND_TRADE:
+                observations.append(
+                    TradeObservation(
+                        exchange=exchange,
+                        market=market,
+                        source_timestamp_ms=source_ms,
+                        received_timestamp_ms=received_ms,
+                        raw_message=EMPTY_RAW_MESSAGE,
+                        trade_id=record["trade_id"].decode() or None,
+                        side=_SIDES[int(record["side"])],
+                        price=number(record["price"]),
+                        size=number(record["size"]),
+                    )
+                )
+        return observations
+
+    def close(self) -> None:
+        # Drop the numpy views first; SharedMemory refuses to close while they exist.
+        del self._records
+        del self._header
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def _encode_levels(self, slot: Any, levels: tuple[OrderBookLevel, ...]) -> None:
+        # Builders emit each side best first, so the first ``book_levels`` seen
+        # per side are the top of the book.
+        n_bids = n_asks = 0
+        limit = self.book_levels
+        bid_price, bid_size = slot["bid_price"], slot["bid_size"]
+        ask_price, ask_size = slot["ask_price"], slot["ask_size"]
+        for level in levels:
+            if level.side == "buy":
+                if n_bids < limit:
+                    bid_price[n_bids] = level.price
+                    bid_size[n_bids] = level.size
+                    n_bids += 1
+            elif n_asks < limit:
+                ask_price[n_asks] = level.price
+                ask_size[n_asks] = level.size
+                n_asks += 1
+            if n_bids >= limit and n_asks >= limit:
+                break
+        slot["n_bids"] = n_bids
+        slot["n_asks"] = n_asks
+
+
+def _encode_timestamp(timestamp_ms: int | None) -> int:
+    return _MISSING_TIMESTAMP if timestamp_ms is None else timestamp_ms
+
+
+def _decode_timestamp(value: Any) -> int | None:
+    value = int(value)
+    return None if value == _MISSING_TIMESTAMP else value
+
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from icarus.observations import Observation
+
+
+class MarketRouter[T]:
+    """Demultiplex observations from shared venue connections by market.
+
+    One socket can carry several markets (``CoinbaseSocket(product_ids=[...])``
+    and friends); ``route`` hands each observation to the target registered
+    for its ``(exchange, market)``, e.g. a per-asset pipeline. Markets match
+    case-insensitively. Observations of unregistered pairs go to ``default``
+    when one is given, otherwise they are counted in ``unrouted`` and dropped.
+    """
+
+    def __init__(self, default: T | None = None) -> None:
+        self.default = default
+        self.unrouted = 0
+        self._targets: dict[tuple[str, str], T] = {}
+
+    def add(self, exchange: str, market: str, target: T) -> None:
+        key = (exchange, market.upper())
+        existing = self._targets.get(key)
+        if existing is not None and existing is not target:
+            raise ValueError(f"{exchange} {market} is already routed elsewhere.")
+        self._targets[key] = target
+
+    def route(self, observation: Observation) -> T | None:
+        target = self._targets.get((observation.exchange, observation.market.upper()))
+        if target is not None:
+            return target
+        if self.default is None:
+            self.unrouted += 1
+        return self.default
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from icarus.observations import Observation
+from icarus.observations.types import NumericMode
+from icarus.sockets.base import BaseSocket
+
+from .ring import DEFAULT_BOOK_LEVELS, DEFAULT_CAPACITY, ObservationRing
+
+DEFAULT_POLL_INTERVAL_S = 0.0005
+DEFAULT_MAX_BATCH = 4_096
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class VenueIngestStats:
+    venue: str
+    alive: bool
+    published: int
+    dropped: int
+    consumed: int
+    backlog: int
+    last_lag_ms: int | None
+    max_lag_ms: int | None
+
+
+@dataclass(slots=True)
+class _Venue:
+    label: str
+    socket: BaseSocket
+    exchange_override: str | None
+    market_override: str | None
+    ring: ObservationRing
+    numeric_mode: NumericMode
+    process: BaseProcess | None = None
+    consumed: int = 0
+    last_lag_ms: int | None = None
+    max_lag_ms: int | None = None
+    reported_dead: bool = False
+
+
+class MultiProcessIngestor:
+    """Run each venue socket in its own process, feeding a shared-memory ring.
+
+    Each worker process connects its socket and runs the socket's own
+    ``stream_observations`` (JSON parsing, normalisation, book building), then
+    publishes BBO, book and trade observations into that venue's
+    ``ObservationRing``. The parent polls every ring at least once per
+    ``poll_interval_s`` while idle, so hand-off latency stays bounded, and
+    merges each sweep in received-timestamp order.
+
+    ``stats()`` reports per-venue published/dropped/consumed counts, the
+    current ring backlog and the receive-to-consume lag.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[tuple[BaseSocket, str | None, str | None]],
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        book_levels: int = DEFAULT_BOOK_LEVELS,
+        poll_interval_s: float = DEFAULT_POLL_INTERVAL_S,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        if poll_interval_s <= 0:
+            raise ValueError("poll_interval_s must be positive.")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive.")
+        self.capacity = capacity
+        self.book_levels = book_levels
+        self.poll_interval_s = poll_interval_s
+        self.max_batch = max_batch
+        self._context = multiprocessing.get_context("spawn")
+        self._venues = [
+            _Venue(
+                label=exchange_override or _socket_label(socket),
+                socket=socket,
+                exchange_override=exchange_override,
+                market_override=market_override,
+                ring=ObservationRing.create(capacity=capacity, book_levels=book_levels),
+                numeric_mode=_socket_numeric_mode(socket),
+            )
+            for socket, exchange_override, market_override in specs
+        ]
+
+    def start(self) -> None:
+        for venue in self._venues:
+            process = self._context.Process(
+                target=run_venue_worker,
+                args=(
+                    venue.socket,
+                    venue.ring.name,
+                    self.capacity,
+                    self.book_levels,
+                    venue.exchange_override,
+                    venue.market_override,
+                ),
+                name=f"ingest-{venue.label}",
+                daemon=True,
+            )
+            process.start()
+            venue.process = process
+
+    def poll(self) -> list[Observation]:
+        """Drain up to ``max_batch`` records per venue, merged in received order."""
+        now_ms = time.time_ns() // 1_000_000
+        observations: list[Observation] = []
+        for venue in self._venues:
+            records = venue.ring.consume(self.max_batch)
+            if not len(records):
+                self._check_alive(venue)
+                continue
+            venue.consumed += len(records)
+            lag_ms = now_ms - int(records["received_timestamp_ms"].min())
+            venue.last_lag_ms = lag_ms
+            if venue.max_lag_ms is None or lag_ms > venue.max_lag_ms:
+                venue.max_lag_ms = lag_ms
+            observations.extend(venue.ring.decode(records, numeric_mode=venue.numeric_mode))
+        if len(observations) > 1:
+            observations.sort(key=_received_order)
+        return observations
+
+    async def pump(self, output_queue: asyncio.Queue[Observation]) -> None:
+        """Forward observations from every ring into ``output_queue`` until cancelled."""
+        while True:
+            observations = self.poll()
+            for observation in observations:
+                await output_queue.put(observation)
+            if not observations:
+                await asyncio.sleep(self.poll_interval_s)
+            else:
+                await asyncio.sleep(0)
+
+    def stats(self) -> list[VenueIngestStats]:
+        return [
+            VenueIngestStats(
+                venue=venue.label,
+                alive=venue.process is not None and venue.process.is_alive(),
+                published=venue.ring.published,
+                dropped=venue.ring.dropped,
+                consumed=venue.consumed,
+                backlog=venue.ring.backlog,
+                last_lag_ms=venue.last_lag_ms,
+                max_lag_ms=venue.max_lag_ms,
+            )
+            for venue in self._venues
+        ]
+
+    def close(self) -> None:
+        for venue in self._venues:
+            if venue.process is not None and venue.process.is_alive():
+                venue.process.terminate()
+        for venue in self._venues:
+            if venue.process is not None:
+                venue.process.join(timeout=5.0)
+            venue.ring.close()
+        self._venues = []
+
+    def _check_alive(self, venue: _Venue) -> None:
+        process = venue.process
+        if process is None or venue.reported_dead or process.is_alive():
+            return
+        venue.reported_dead = True
+        logger.warning("ingest worker %s exited with code %s", venue.label, process.exitcode)
+
+
+def run_venue_worker(
+    socket: BaseSocket,
+    ring_name: str,
+    capacity: int,
+    book_levels: int,
+    exchange_override: str | None,
+    market_override: str | None,
+) -> None:
+    """Worker-process entry point: stream ``socket`` into the named ring until killed."""
+    # ``close`` terminates workers; exit through the event loop so the socket,
+    # and any frame recorder on it, shuts down cleanly.
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    ring = ObservationRing.attach(ring_name, capacity=capacity, book_levels=book_levels)
+    try:
+        asyncio.run(_publish_observations(socket, ring, exchange_override, market_override))
+    finally:
+        ring.close()
+
+
+async def _publish_observations(
+    socket: BaseSocket,
+    ring: ObservationRing,
+    exchange_override: str | None,
+    market_override: str | None,
+) -> None:
+    stream: Any = socket.stream_observations()  # type: ignore[attr-defined]
+    try:
+        async for observation in stream:
+            ring.publish(observation, exchange=exchange_override, market=market_override)
+    finally:
+        await socket.close()
+
+
+def _exit_on_sigterm(signum: int, frame: Any) -> None:
+    sys.exit(0)
+
+
+def _socket_label(socket: BaseSocket) -> str:
+    return type(socket).__name__.removesuffix("Socket").lower()
+
+
+def _socket_numeric_mode(socket: BaseSocket) -> NumericMode:
+    # Decode in the numeric mode the socket's own normalizer produces.
+    return "float" if getattr(socket, "numeric_mode", "decimal") == "float" else "decimal"
+
+
+def _received_order(observation: Observation) -> int:
+    received_ms = observation.received_timestamp_ms
+    return received_ms if received_ms is not None else 0
@@ -1,11 +1,23 @@
-"""Stateful rolling measurement engine and output types."""
+"""Stateful rolling measurement engine, venue clock offsets and output types."""
 
+from icarus.measurements.clock import (
+    ClockOffsetConfig,
+    ClockOffsetEstimator,
+    TimestampBasis,
+    VenueClockEstimate,
+    event_timestamp_ms,
+)
 from icarus.measurements.engine import MarketMeasurementEngine, MeasurementEngineConfig
 from icarus.measurements.types import MarketMeasurement, Measurement
 
 __all__ = [
+    "ClockOffsetConfig",
+    "ClockOffsetEstimator",
     "MarketMeasurement",
     "MarketMeasurementEngine",
     "Measurement",
     "MeasurementEngineConfig",
+    "TimestampBasis",
+    "VenueClockEstimate",
+    "event_timestamp_ms",
 ]
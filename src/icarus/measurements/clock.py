@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from icarus.observations import (
+    BBOObservation,
+    Observation,
+    OrderBookDeltaObservation,
+    OrderBookObservation,
+)
+
+if TYPE_CHECKING:
+    from icarus.telemetry import LatencyHistogram, LatencyRecorder
+
+type TimestampBasis = Literal["received", "source", "corrected"]
+TIMESTAMP_BASES: tuple[TimestampBasis, ...] = ("received", "source", "corrected")
+
+
+@dataclass(frozen=True, slots=True)
+class ClockOffsetConfig:
+    # Span of the running minimum; long enough to contain a quiet network
+    # moment, short enough to follow clock drift.
+    window_ms: int = 30_000
+    # Quotes seen before a venue's offset is trusted; until then its events
+    # keep their receive time.
+    min_samples: int = 20
+    # Smoothing of the excess-delay average used to flag degraded connections.
+    excess_alpha: float = 0.05
+
+    def __post_init__(self) -> None:
+        if self.window_ms <= 0:
+            raise ValueError("window_ms must be positive.")
+        if self.min_samples < 1:
+            raise ValueError("min_samples must be at least 1.")
+        if not 0.0 < self.excess_alpha <= 1.0:
+            raise ValueError("excess_alpha must be in (0, 1].")
+
+
+@dataclass(frozen=True, slots=True)
+class VenueClockEstimate:
+    exchange: str
+    # Local receive time minus venue time on the fastest recent message: the
+    # clock offset plus the venue's minimum one-way latency.
+    offset_ms: int
+    # Delay of the latest quote beyond the offset, and its running average.
+    last_excess_ms: int
+    mean_excess_ms: float
+    samples: int
+    ready: bool
+
+
+class _VenueClock:
+    __slots__ = ("_window", "samples", "last_excess_ms", "mean_excess_ms", "histogram")
+
+    def __init__(self, histogram: LatencyHistogram | None) -> None:
+        # (received_ms, delay_ms) with increasing delays: the head is the
+        # minimum over the window.
+        self._window: deque[tuple[int, int]] = deque()
+        self.samples = 0
+        self.last_excess_ms = 0
+        self.mean_excess_ms = 0.0
+        self.histogram = histogram
+
+    @property
+    def offset_ms(self) -> int:
+        return self._window[0][1]
+
+    def add(self, received_ms: int, delay_ms: int, config: ClockOffsetConfig) -> None:
+        window = self._window
+        while window and window[-1][1] >= delay_ms:
+            window.pop()
+        window.append((received_ms, delay_ms))
+        cutoff_ms = received_ms - config.window_ms
+        while window[0][0] < cutoff_ms:
+            window.popleft()
+
+        excess_ms = delay_ms - window[0][1]
+        self.samples += 1
+        self.last_excess_ms = excess_ms
+        if self.samples == 1:
+            self.mean_excess_ms = float(excess_ms)
+        else:
+            self.mean_excess_ms += config.excess_alpha * (excess_ms - self.mean_excess_ms)
+        if self.histogram is not None:
+            self.histogram.record(excess_ms * 1_000_000)
+
+
+class ClockOffsetEstimator:
+    """Online per-venue clock offset from (received - source) timestamps.
+
+    Every quote's ``received - source`` is the venue-to-local clock offset
+    plus that message's one-way latency. The running minimum over
+    ``window_ms`` is the offset plus the venue's best-case latency, which a
+    single clock cannot separate; the remainder of each delay is network and
+    queueing jitter. ``observe`` maps an observation's venue timestamp into
+    local time with that offset, so a quote delayed by jitter is stamped as
+    if it had arrived at best-case speed and venues line up on event time
+    rather than arrival time.
+
+    Only quotes (BBO, book snapshots and deltas) feed the estimate: trade and
+    candle timestamps are set when the trade or bar began, not when the
+    message was sent. Every observation kind is corrected once its venue has
+    ``min_samples`` quotes. With ``latency`` set, each quote's excess delay
+    is recorded into the ``<exchange>.delay`` histogram.
+    """
+
+    def __init__(
+        self,
+        config: ClockOffsetConfig | None = None,
+        *,
+        latency: LatencyRecorder | None = None,
+    ) -> None:
+        self.config = config or ClockOffsetConfig()
+        self.latency = latency
+        self._venues: dict[str, _VenueClock] = {}
+
+    def observe(self, observation: Observation) -> int | None:
+        """Update the estimate with ``observation`` and return its corrected time."""
+        source_ms = observation.source_timestamp_ms
+        received_ms = observation.received_timestamp_ms
+        if (
+            source_ms is not None
+            and received_ms is not None
+            and isinstance(
+                observation, BBOObservation | OrderBookObservation | OrderBookDeltaObservation
+            )
+        ):
+            venue = self._venues.get(observation.exchange)
+            if venue is None:
+                venue = _VenueClock(
+                    self.latency.histogram(f"{observation.exchange}.delay")
+                    if self.latency is not None
+                    else None
+                )
+                self._venues[observation.exchange] = venue
+            venue.add(received_ms, received_ms - source_ms, self.config)
+        return self.corrected_timestamp_ms(observation)
+
+    def corrected_timestamp_ms(self, observation: Observation) -> int | None:
+        """Venue time shifted by the current offset, never later than receipt.
+
+        Falls back to the receive time (then the venue time) while the venue
+        is warming up or the observation lacks a venue timestamp. Does not
+        update the estimate.
+        """
+        source_ms = observation.source_timestamp_ms
+        received_ms = observation.received_timestamp_ms
+        venue = self._venues.get(observation.exchange)
+        if source_ms is None or venue is None or venue.samples < self.config.min_samples:
+            return received_ms if received_ms is not None else source_ms
+        corrected_ms = source_ms + venue.offset_ms
+        if received_ms is not None and corrected_ms > received_ms:
+            return received_ms
+        return corrected_ms
+
+    def estimate(self, exchange: str) -> VenueClockEstimate | None:
+        venue = self._venues.get(exchange)
+        if venue is None:
+            return None
+        return VenueClockEstimate(
+            exchange=exchange,
+            offset_ms=venue.offset_ms,
+            last_excess_ms=venue.last_excess_ms,
+            mean_excess_ms=venue.mean_excess_ms,
+            samples=venue.samples,
+            ready=venue.samples >= self.config.min_samples,
+        )
+
+    def estimates(self) -> list[VenueClockEstimate]:
+        return [
+            estimate
+            for exchange in self._venues
+            if (estimate := self.estimate(exchange)) is not None
+        ]
+
+
+def event_timestamp_ms(
+    observation: Observation,
+    basis: TimestampBasis,
+    clock: ClockOffsetEstimator | None = None,
+) -> int | None:
+    """``observation``'s time on ``basis``, falling back to the other stamp if missing.
+
+    ``"corrected"`` reads ``clock`` without updating it; whoever owns the
+    stream feeds the estimator with ``observe`` first.
+    """
+    if basis == "corrected":
+        if clock is None:
+            raise ValueError("The corrected timestamp basis needs a ClockOffsetEstimator.")
+        return clock.corrected_timestamp_ms(observation)
+    if basis == "source":
+        if observation.source_timestamp_ms is not None:
+            return observation.source_timestamp_ms
+        return observation.received_timestamp_ms
+    if observation.received_timestamp_ms is not None:
+        return observation.received_timestamp_ms
+    return observation.source_timestamp_ms
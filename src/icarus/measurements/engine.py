@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from collections import deque
-from collections.abc import Iterable
 from dataclasses import dataclass, field
 from decimal import Decimal
-from math import sqrt
+from itertools import islice
+from math import fsum, sqrt
 
+from icarus.measurements.clock import ClockOffsetEstimator, TimestampBasis, event_timestamp_ms
 from icarus.measurements.types import MarketMeasurement
 from icarus.observations import (
     BBOObservation,
@@ -13,32 +14,128 @@ from icarus.observations import (
     OrderBookDeltaObservation,
     OrderBookObservation,
 )
+from icarus.observations.types import Number, as_floats
 
 
 @dataclass(frozen=True, slots=True)
 class MeasurementEngineConfig:
     volatility_window_ms: int = 60_000
+    # Which clock stamps quotes: local receipt, the venue's own timestamp, or
+    # the venue timestamp shifted by a ``ClockOffsetEstimator`` ("corrected").
+    timestamp_basis: TimestampBasis = "received"
+
+
+class _RollingReturnMoments:
+    """Windowed bps returns with running first and second moments.
+
+    Each point stores the return from the point before it. The return carried
+    by the oldest point in the window has lost its predecessor and is excluded,
+    which matches recomputing returns over the pruned price list. Appends and
+    prunes adjust the running sums, so volatility is O(1) per call; the sums
+    are rebuilt from the window every ``_RESYNC_EVERY`` evictions to stop
+    floating-point drift from accumulating.
+    """
+
+    _RESYNC_EVERY = 4096
+
+    __slots__ = ("_points", "_count", "_sum", "_sum_sq", "_evictions")
+
+    def __init__(self) -> None:
+        self._points: deque[tuple[int, Number, float | None]] = deque()
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._evictions = 0
+
+    def append(self, timestamp_ms: int, price: Number) -> None:
+        return_bps: float | None = None
+        if self._points:
+            previous_price = self._points[-1][1]
+            if previous_price != 0:
+                return_bps = _return_bps(previous_price, price)
+                self._count += 1
+                self._sum += return_bps
+                self._sum_sq += return_bps * return_bps
+        self._points.append((timestamp_ms, price, return_bps))
+
+    def prune(self, cutoff_ms: int) -> None:
+        points = self._points
+        evicted = 0
+        while points and points[0][0] < cutoff_ms:
+            points.popleft()
+            evicted += 1
+            if points:
+                # The new oldest point's return now refers to an evicted price.
+                head_return = points[0][2]
+                if head_return is not None:
+                    self._count -= 1
+                    self._sum -= head_return
+                    self._sum_sq -= head_return * head_return
+        if evicted:
+            self._evictions += evicted
+            if self._evictions >= self._RESYNC_EVERY:
+                self._resync()
+
+    @property
+    def oldest_timestamp_ms(self) -> int | None:
+        return self._points[0][0] if self._points else None
+
+    def volatility_bps(self) -> Number | None:
+        if self._count == 0:
+            return None
+        if self._count == 1:
+            volatility = abs(self._sum)
+        else:
+            mean_return = self._sum / self._count
+            variance = self._sum_sq / self._count - mean_return * mean_return
+            volatility = sqrt(variance) if variance > 0 else 0.0
+        # Volatility is reported in the same numeric type as the prices it came from.
+        if isinstance(self._points[-1][1], Decimal):
+            return Decimal(str(volatility))
+        return volatility
+
+    def _resync(self) -> None:
+        returns = [point[2] for point in islice(self._points, 1, None) if point[2] is not None]
+        self._count = len(returns)
+        self._sum = fsum(returns)
+        self._sum_sq = fsum(value * value for value in returns)
+        self._evictions = 0
 
 
 @dataclass(slots=True)
 class _MeasurementState:
     last_quote_observation: BBOObservation | OrderBookObservation | None = None
     last_quote_timestamp_ms: int | None = None
-    recent_midpoints: deque[tuple[int, Decimal]] = field(default_factory=deque)
-    recent_microprices: deque[tuple[int, Decimal]] = field(default_factory=deque)
+    last_timestamp_ms: int | None = None
+    recent_midpoints: _RollingReturnMoments = field(default_factory=_RollingReturnMoments)
+    recent_microprices: _RollingReturnMoments = field(default_factory=_RollingReturnMoments)
 
 
 class MarketMeasurementEngine:
+    """Rolling per-market measurements from one venue's observations.
+
+    Observations are stamped on ``config.timestamp_basis``. The
+    ``"corrected"`` basis reads ``clock``, which the caller feeds with every
+    observation (``ClockOffsetEstimator.observe``) before handing it here.
+    Event times can arrive out of order (a trade stamped before the quote
+    received ahead of it, or a corrected time after the offset drops), so the
+    engine clock never moves backwards and ``quote_age_ms`` is never negative.
+    """
+
     def __init__(
         self,
         *,
         exchange: str,
         market: str,
         config: MeasurementEngineConfig | None = None,
+        clock: ClockOffsetEstimator | None = None,
     ) -> None:
         self.exchange = exchange
         self.market = market
         self.config = config or MeasurementEngineConfig()
+        if self.config.timestamp_basis == "corrected" and clock is None:
+            raise ValueError("The corrected timestamp basis needs a ClockOffsetEstimator.")
+        self.clock = clock
         self._state = _MeasurementState()
 
     def on_observation(self, observation: Observation) -> MarketMeasurement | None:
@@ -48,13 +145,13 @@ class MarketMeasurementEngine:
                 f"engine {self.exchange}/{self.market}."
             )
 
-        timestamp_ms = (
-            observation.received_timestamp_ms
-            if observation.received_timestamp_ms is not None
-            else observation.source_timestamp_ms
-        )
+        timestamp_ms = event_timestamp_ms(observation, self.config.timestamp_basis, self.clock)
         if timestamp_ms is None:
             return None
+        last_timestamp_ms = self._state.last_timestamp_ms
+        if last_timestamp_ms is not None and timestamp_ms < last_timestamp_ms:
+            timestamp_ms = last_timestamp_ms
+        self._state.last_timestamp_ms = timestamp_ms
 
         if isinstance(observation, BBOObservation | OrderBookObservation):
             self._state.last_quote_observation = observation
@@ -108,27 +205,43 @@ class MarketMeasurementEngine:
             ask_price=ask_price,
         )
 
+    def next_window_expiry_ms(self) -> int | None:
+        """Earliest timestamp at which a price point leaves a volatility window.
+
+        Before then, and absent new quotes, ``current_measurement`` differs only
+        in ``timestamp_ms`` and ``quote_age_ms``.
+        """
+        oldest = [
+            timestamp_ms
+            for timestamp_ms in (
+                self._state.recent_midpoints.oldest_timestamp_ms,
+                self._state.recent_microprices.oldest_timestamp_ms,
+            )
+            if timestamp_ms is not None
+        ]
+        if not oldest:
+            return None
+        return min(oldest) + self.config.volatility_window_ms + 1
+
     def _record_prices(
         self,
         observation: BBOObservation | OrderBookObservation,
         timestamp_ms: int,
     ) -> None:
         if observation.midprice is not None:
-            self._state.recent_midpoints.append((timestamp_ms, observation.midprice))
+            self._state.recent_midpoints.append(timestamp_ms, observation.midprice)
         if observation.microprice is not None:
-            self._state.recent_microprices.append((timestamp_ms, observation.microprice))
+            self._state.recent_microprices.append(timestamp_ms, observation.microprice)
         self._prune_old_points(self._state.recent_midpoints, timestamp_ms)
         self._prune_old_points(self._state.recent_microprices, timestamp_ms)
 
-    def _prune_old_points(self, values: deque[tuple[int, Decimal]], timestamp_ms: int) -> None:
-        cutoff = timestamp_ms - self.config.volatility_window_ms
-        while values and values[0][0] < cutoff:
-            values.popleft()
+    def _prune_old_points(self, values: _RollingReturnMoments, timestamp_ms: int) -> None:
+        values.prune(timestamp_ms - self.config.volatility_window_ms)
 
     def _extract_top_depths(
         self,
         observation: BBOObservation | OrderBookObservation,
-    ) -> tuple[Decimal | None, Decimal | None]:
+    ) -> tuple[Number | None, Number | None]:
         if isinstance(observation, BBOObservation):
             return observation.bid_size, observation.ask_size
         best_bid = observation.best_bid_level
@@ -141,7 +254,7 @@ class MarketMeasurementEngine:
     def _extract_top_prices(
         self,
         observation: BBOObservation | OrderBookObservation,
-    ) -> tuple[Decimal | None, Decimal | None]:
+    ) -> tuple[Number | None, Number | None]:
         if isinstance(observation, BBOObservation):
             return observation.bid_price, observation.ask_price
         best_bid = observation.best_bid_level
@@ -153,37 +266,33 @@ class MarketMeasurementEngine:
 
     def _compute_depth_imbalance(
         self,
-        top_bid_depth: Decimal | None,
-        top_ask_depth: Decimal | None,
-    ) -> Decimal | None:
+        top_bid_depth: Number | None,
+        top_ask_depth: Number | None,
+    ) -> Number | None:
         if top_bid_depth is None or top_ask_depth is None:
             return None
-        total_depth = top_bid_depth + top_ask_depth
-        if total_depth == 0:
-            return None
-        return (top_bid_depth - top_ask_depth) / total_depth
+        return _imbalance(top_bid_depth, top_ask_depth)
 
     def _compute_rolling_volatility_bps(
         self,
-        values: Iterable[tuple[int, Decimal]],
-    ) -> Decimal | None:
-        price_values = [value for _, value in values]
-        if len(price_values) < 2:
-            return None
+        values: _RollingReturnMoments,
+    ) -> Number | None:
+        return values.volatility_bps()
 
-        returns_bps: list[float] = []
-        for previous_price, current_price in zip(price_values, price_values[1:], strict=False):
-            if previous_price == 0:
-                continue
-            returns_bps.append(
-                float(((current_price - previous_price) / previous_price) * Decimal("10000"))
-            )
 
-        if not returns_bps:
-            return None
-        if len(returns_bps) == 1:
-            return Decimal(str(abs(returns_bps[0])))
+def _return_bps(previous_price: Number, price: Number) -> float:
+    if isinstance(price, float) and isinstance(previous_price, float):
+        return ((price - previous_price) / previous_price) * 10000
+    if isinstance(price, Decimal) and isinstance(previous_price, Decimal):
+        return float(((price - previous_price) / previous_price) * 10000)
+    return _return_bps(*as_floats(previous_price, price))
+
 
-        mean_return = sum(returns_bps) / len(returns_bps)
-        variance = sum((value - mean_return) ** 2 for value in returns_bps) / len(returns_bps)
-        return Decimal(str(sqrt(variance)))
+def _imbalance(bid_depth: Number, ask_depth: Number) -> Number | None:
+    if isinstance(bid_depth, float) and isinstance(ask_depth, float):
+        total = bid_depth + ask_depth
+        return None if total == 0 else (bid_depth - ask_depth) / total
+    if isinstance(bid_depth, Decimal) and isinstance(ask_depth, Decimal):
+        decimal_total = bid_depth + ask_depth
+        return None if decimal_total == 0 else (bid_depth - ask_depth) / decimal_total
+    return _imbalance(*as_floats(bid_depth, ask_depth))
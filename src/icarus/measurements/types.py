@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import abc
 from dataclasses import dataclass
-from decimal import Decimal
 from typing import Any
 
+from icarus.observations.types import Number
+
 
 @dataclass(frozen=True, slots=True, repr=False)
 class Measurement(abc.ABC):
@@ -25,17 +26,17 @@ class Measurement(abc.ABC):
 
 @dataclass(frozen=True, slots=True, repr=False)
 class MarketMeasurement(Measurement):
-    midprice: Decimal | None
-    microprice: Decimal | None
-    spread_bps: Decimal | None
-    top_bid_depth: Decimal | None
-    top_ask_depth: Decimal | None
-    depth_imbalance: Decimal | None
+    midprice: Number | None
+    microprice: Number | None
+    spread_bps: Number | None
+    top_bid_depth: Number | None
+    top_ask_depth: Number | None
+    depth_imbalance: Number | None
     quote_age_ms: int | None
-    mid_volatility_bps: Decimal | None
-    micro_volatility_bps: Decimal | None
-    bid_price: Decimal | None = None
-    ask_price: Decimal | None = None
+    mid_volatility_bps: Number | None
+    micro_volatility_bps: Number | None
+    bid_price: Number | None = None
+    ask_price: Number | None = None
 
     def display_fields(self) -> tuple[tuple[str, Any], ...]:
         return (
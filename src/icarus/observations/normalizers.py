@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import AsyncIterator
-from copy import deepcopy
+from collections.abc import AsyncIterator, Callable, Mapping
 from datetime import datetime
 from decimal import Decimal
+from types import MappingProxyType
 from typing import Any, cast
 
 from icarus.observations.types import (
+    EMPTY_RAW_MESSAGE,
     BBOObservation,
     CandleObservation,
+    Number,
+    NumericMode,
     Observation,
     OrderBookDeltaObservation,
     OrderBookLevel,
@@ -22,14 +25,45 @@ def parse_decimal(value: str | int | float | Decimal) -> Decimal:
     return value if isinstance(value, Decimal) else Decimal(str(value))
 
 
+def parse_float(value: str | int | float | Decimal) -> float:
+    return value if isinstance(value, float) else float(value)
+
+
+def number_parser(numeric_mode: NumericMode) -> Callable[[str | int | float | Decimal], Number]:
+    if numeric_mode == "decimal":
+        return parse_decimal
+    if numeric_mode == "float":
+        return parse_float
+    raise ValueError(f"Unsupported numeric mode: {numeric_mode!r}.")
+
+
 def parse_iso8601_to_ms(value: str) -> int:
     normalized = value.replace("Z", "+00:00")
     return int(datetime.fromisoformat(normalized).timestamp() * 1000)
 
 
 class BaseObservationNormalizer(abc.ABC):
+    """Base class for venue normalizers.
+
+    Every observation produced from one payload shares a single read-only view
+    of it as ``raw_message``. With ``keep_raw_messages=False`` observations get
+    an empty mapping instead, except book snapshots and deltas whose order book
+    builder still reads sequence numbers or checksums from the payload; the
+    builders drop it from the books they emit.
+    """
+
     exchange: str
 
+    def __init__(
+        self,
+        *,
+        numeric_mode: NumericMode = "decimal",
+        keep_raw_messages: bool = True,
+    ) -> None:
+        self.numeric_mode = numeric_mode
+        self.keep_raw_messages = keep_raw_messages
+        self._parse_number = number_parser(numeric_mode)
+
     @abc.abstractmethod
     def normalize_message(
         self,
@@ -52,6 +86,9 @@ class BaseObservationNormalizer(abc.ABC):
             ):
                 yield observation
 
+    def _retained(self, raw_view: Mapping[str, Any]) -> Mapping[str, Any]:
+        return raw_view if self.keep_raw_messages else EMPTY_RAW_MESSAGE
+
 
 class HyperliquidObservationNormalizer(BaseObservationNormalizer):
     exchange = "hyperliquid"
@@ -66,22 +103,23 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
         data = raw_message.get("data")
         if not isinstance(data, dict | list):
             return []
+        raw_view = MappingProxyType(raw_message)
 
         if channel == "bbo" and isinstance(data, dict):
-            bbo_observation = self._normalize_bbo(raw_message, data, received_timestamp_ms)
+            bbo_observation = self._normalize_bbo(raw_view, data, received_timestamp_ms)
             return [bbo_observation] if bbo_observation is not None else []
         if channel == "trades" and isinstance(data, list):
-            return self._normalize_trades(raw_message, data, received_timestamp_ms)
+            return self._normalize_trades(raw_view, data, received_timestamp_ms)
         if channel == "candle" and isinstance(data, list):
-            return self._normalize_candles(raw_message, data, received_timestamp_ms)
+            return self._normalize_candles(raw_view, data, received_timestamp_ms)
         if channel == "l2Book" and isinstance(data, dict):
-            book_observation = self._normalize_l2_book(raw_message, data, received_timestamp_ms)
+            book_observation = self._normalize_l2_book(raw_view, data, received_timestamp_ms)
             return [book_observation] if book_observation is not None else []
         return []
 
     def _normalize_bbo(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: dict[str, Any],
         received_timestamp_ms: int | None,
     ) -> BBOObservation | None:
@@ -100,16 +138,16 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
             market=str(data.get("coin", "")),
             source_timestamp_ms=self._extract_ms_timestamp(data.get("time")),
             received_timestamp_ms=received_timestamp_ms,
-            raw_message=deepcopy(raw_message),
-            bid_price=parse_decimal(top_bid["px"]),
-            bid_size=parse_decimal(top_bid["sz"]),
-            ask_price=parse_decimal(top_ask["px"]),
-            ask_size=parse_decimal(top_ask["sz"]),
+            raw_message=self._retained(raw_message),
+            bid_price=self._parse_number(top_bid["px"]),
+            bid_size=self._parse_number(top_bid["sz"]),
+            ask_price=self._parse_number(top_ask["px"]),
+            ask_size=self._parse_number(top_ask["sz"]),
         )
 
     def _normalize_trades(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         trades: list[Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -126,18 +164,18 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
                     market=str(trade.get("coin", "")),
                     source_timestamp_ms=self._extract_ms_timestamp(trade.get("time")),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
+                    raw_message=self._retained(raw_message),
                     trade_id=self._coerce_optional_str(trade.get("hash")),
                     side="buy" if side == "B" else "sell",
-                    price=parse_decimal(trade["px"]),
-                    size=parse_decimal(trade["sz"]),
+                    price=self._parse_number(trade["px"]),
+                    size=self._parse_number(trade["sz"]),
                 )
             )
         return observations
 
     def _normalize_candles(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         candles: list[Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -151,15 +189,15 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
                     market=str(candle.get("s", "")),
                     source_timestamp_ms=int(candle["t"]),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
+                    raw_message=self._retained(raw_message),
                     interval=self._coerce_optional_str(candle.get("i")),
                     open_timestamp_ms=int(candle["t"]),
                     close_timestamp_ms=int(candle["T"]),
-                    open_price=parse_decimal(candle["o"]),
-                    high_price=parse_decimal(candle["h"]),
-                    low_price=parse_decimal(candle["l"]),
-                    close_price=parse_decimal(candle["c"]),
-                    volume=parse_decimal(candle["v"]),
+                    open_price=self._parse_number(candle["o"]),
+                    high_price=self._parse_number(candle["h"]),
+                    low_price=self._parse_number(candle["l"]),
+                    close_price=self._parse_number(candle["c"]),
+                    volume=self._parse_number(candle["v"]),
                     trade_count=self._coerce_optional_int(candle.get("n")),
                 )
             )
@@ -167,7 +205,7 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
 
     def _normalize_l2_book(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: dict[str, Any],
         received_timestamp_ms: int | None,
     ) -> OrderBookObservation | None:
@@ -185,8 +223,8 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
                 normalized_levels.append(
                     OrderBookLevel(
                         side=cast("Any", side_name),
-                        price=parse_decimal(level["px"]),
-                        size=parse_decimal(level["sz"]),
+                        price=self._parse_number(level["px"]),
+                        size=self._parse_number(level["sz"]),
                     )
                 )
         return OrderBookObservation(
@@ -194,7 +232,7 @@ class HyperliquidObservationNormalizer(BaseObservationNormalizer):
             market=str(data.get("coin", "")),
             source_timestamp_ms=self._extract_ms_timestamp(data.get("time")),
             received_timestamp_ms=received_timestamp_ms,
-            raw_message=deepcopy(raw_message),
+            raw_message=self._retained(raw_message),
             update_type="snapshot",
             levels=tuple(normalized_levels),
         )
@@ -234,31 +272,32 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
         if not isinstance(events, list):
             return []
 
+        raw_view = MappingProxyType(raw_message)
         observations: list[Observation] = []
         for event in events:
             if not isinstance(event, dict):
                 continue
             if channel in {"ticker", "ticker_batch"}:
                 observations.extend(
-                    self._normalize_tickers(raw_message, event, received_timestamp_ms)
+                    self._normalize_tickers(raw_view, event, received_timestamp_ms)
                 )
             elif channel == "market_trades":
                 observations.extend(
-                    self._normalize_market_trades(raw_message, event, received_timestamp_ms)
+                    self._normalize_market_trades(raw_view, event, received_timestamp_ms)
                 )
             elif channel == "candles":
                 observations.extend(
-                    self._normalize_candles(raw_message, event, received_timestamp_ms)
+                    self._normalize_candles(raw_view, event, received_timestamp_ms)
                 )
             elif channel in {"level2", "l2_data"}:
-                book_observation = self._normalize_level2(raw_message, event, received_timestamp_ms)
+                book_observation = self._normalize_level2(raw_view, event, received_timestamp_ms)
                 if book_observation is not None:
                     observations.append(book_observation)
         return observations
 
     def _normalize_tickers(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         event: dict[str, Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -283,18 +322,18 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
                     market=str(ticker.get("product_id", "")),
                     source_timestamp_ms=source_timestamp_ms,
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
-                    bid_price=parse_decimal(ticker["best_bid"]),
-                    bid_size=parse_decimal(ticker["best_bid_quantity"]),
-                    ask_price=parse_decimal(ticker["best_ask"]),
-                    ask_size=parse_decimal(ticker["best_ask_quantity"]),
+                    raw_message=self._retained(raw_message),
+                    bid_price=self._parse_number(ticker["best_bid"]),
+                    bid_size=self._parse_number(ticker["best_bid_quantity"]),
+                    ask_price=self._parse_number(ticker["best_ask"]),
+                    ask_size=self._parse_number(ticker["best_ask_quantity"]),
                 )
             )
         return observations
 
     def _normalize_market_trades(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         event: dict[str, Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -314,18 +353,18 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
                     market=str(trade.get("product_id", "")),
                     source_timestamp_ms=self._extract_source_timestamp(trade),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
+                    raw_message=self._retained(raw_message),
                     trade_id=self._coerce_optional_str(trade.get("trade_id")),
                     side="buy" if side == "BUY" else "sell",
-                    price=parse_decimal(trade["price"]),
-                    size=parse_decimal(trade["size"]),
+                    price=self._parse_number(trade["price"]),
+                    size=self._parse_number(trade["size"]),
                 )
             )
         return observations
 
     def _normalize_candles(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         event: dict[str, Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -343,15 +382,15 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
                     market=str(candle.get("product_id", "")),
                     source_timestamp_ms=open_timestamp_ms,
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
+                    raw_message=self._retained(raw_message),
                     interval=None,
                     open_timestamp_ms=open_timestamp_ms,
                     close_timestamp_ms=open_timestamp_ms,
-                    open_price=parse_decimal(candle["open"]),
-                    high_price=parse_decimal(candle["high"]),
-                    low_price=parse_decimal(candle["low"]),
-                    close_price=parse_decimal(candle["close"]),
-                    volume=parse_decimal(candle["volume"]),
+                    open_price=self._parse_number(candle["open"]),
+                    high_price=self._parse_number(candle["high"]),
+                    low_price=self._parse_number(candle["low"]),
+                    close_price=self._parse_number(candle["close"]),
+                    volume=self._parse_number(candle["volume"]),
                     trade_count=None,
                 )
             )
@@ -359,7 +398,7 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
 
     def _normalize_level2(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         event: dict[str, Any],
         received_timestamp_ms: int | None,
     ) -> Observation | None:
@@ -376,8 +415,8 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
             levels.append(
                 OrderBookLevel(
                     side="buy" if side == "bid" else "sell",
-                    price=parse_decimal(update["price_level"]),
-                    size=parse_decimal(update["new_quantity"]),
+                    price=self._parse_number(update["price_level"]),
+                    size=self._parse_number(update["new_quantity"]),
                 )
             )
         update_type = event.get("type")
@@ -386,14 +425,14 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
 
         market = str(event.get("product_id", ""))
         source_timestamp_ms = self._extract_source_timestamp(raw_message)
-        raw_message_copy = deepcopy(raw_message)
+        # Kept even without keep_raw_messages: the builder checks sequence_num.
         if update_type == "snapshot":
             return OrderBookObservation(
                 exchange=self.exchange,
                 market=market,
                 source_timestamp_ms=source_timestamp_ms,
                 received_timestamp_ms=received_timestamp_ms,
-                raw_message=raw_message_copy,
+                raw_message=raw_message,
                 update_type="snapshot",
                 levels=tuple(levels),
             )
@@ -406,12 +445,12 @@ class CoinbaseObservationNormalizer(BaseObservationNormalizer):
             market=market,
             source_timestamp_ms=source_timestamp_ms,
             received_timestamp_ms=received_timestamp_ms,
-            raw_message=raw_message_copy,
+            raw_message=raw_message,
             levels=tuple(levels),
         )
 
     @staticmethod
-    def _extract_source_timestamp(payload: dict[str, Any]) -> int | None:
+    def _extract_source_timestamp(payload: Mapping[str, Any]) -> int | None:
         timestamp = payload.get("timestamp") or payload.get("time")
         if isinstance(timestamp, str):
             return parse_iso8601_to_ms(timestamp)
@@ -436,14 +475,15 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
         data = raw_message.get("data")
         if not isinstance(data, list):
             return []
+        raw_view = MappingProxyType(raw_message)
 
         if channel == "ticker":
-            return self._normalize_tickers(raw_message, data, received_timestamp_ms)
+            return self._normalize_tickers(raw_view, data, received_timestamp_ms)
         if channel == "trade":
-            return self._normalize_trades(raw_message, data, received_timestamp_ms)
+            return self._normalize_trades(raw_view, data, received_timestamp_ms)
         if channel == "book":
             book_observation = self._normalize_book(
-                raw_message,
+                raw_view,
                 data,
                 message_type,
                 received_timestamp_ms,
@@ -453,7 +493,7 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
 
     def _normalize_tickers(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: list[Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -470,18 +510,18 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
                     market=str(ticker["symbol"]),
                     source_timestamp_ms=self._extract_source_timestamp(ticker),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
-                    bid_price=parse_decimal(ticker["bid"]),
-                    bid_size=parse_decimal(ticker["bid_qty"]),
-                    ask_price=parse_decimal(ticker["ask"]),
-                    ask_size=parse_decimal(ticker["ask_qty"]),
+                    raw_message=self._retained(raw_message),
+                    bid_price=self._parse_number(ticker["bid"]),
+                    bid_size=self._parse_number(ticker["bid_qty"]),
+                    ask_price=self._parse_number(ticker["ask"]),
+                    ask_size=self._parse_number(ticker["ask_qty"]),
                 )
             )
         return observations
 
     def _normalize_trades(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: list[Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -498,18 +538,18 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
                     market=str(trade.get("symbol", "")),
                     source_timestamp_ms=self._extract_source_timestamp(trade),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
+                    raw_message=self._retained(raw_message),
                     trade_id=self._coerce_optional_str(trade.get("trade_id")),
                     side=cast("Any", side),
-                    price=parse_decimal(trade["price"]),
-                    size=parse_decimal(trade["qty"]),
+                    price=self._parse_number(trade["price"]),
+                    size=self._parse_number(trade["qty"]),
                 )
             )
         return observations
 
     def _normalize_book(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: list[Any],
         message_type: Any,
         received_timestamp_ms: int | None,
@@ -525,6 +565,8 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
             for level in side_levels:
                 if not isinstance(level, dict):
                     continue
+                # Book levels stay Decimal in every numeric mode: the builder's
+                # CRC32 checksum hashes their exact decimal string form.
                 levels.append(
                     OrderBookLevel(
                         side=cast("Any", side_name),
@@ -535,14 +577,14 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
 
         market = str(book.get("symbol", ""))
         source_timestamp_ms = self._extract_source_timestamp(book)
-        raw_message_copy = deepcopy(raw_message)
+        # Kept even without keep_raw_messages: the builder verifies the checksum.
         if message_type == "snapshot":
             return OrderBookObservation(
                 exchange=self.exchange,
                 market=market,
                 source_timestamp_ms=source_timestamp_ms,
                 received_timestamp_ms=received_timestamp_ms,
-                raw_message=raw_message_copy,
+                raw_message=raw_message,
                 update_type="snapshot",
                 levels=tuple(levels),
             )
@@ -552,13 +594,13 @@ class KrakenObservationNormalizer(BaseObservationNormalizer):
                 market=market,
                 source_timestamp_ms=source_timestamp_ms,
                 received_timestamp_ms=received_timestamp_ms,
-                raw_message=raw_message_copy,
+                raw_message=raw_message,
                 levels=tuple(levels),
             )
         return None
 
     @staticmethod
-    def _extract_source_timestamp(payload: dict[str, Any]) -> int | None:
+    def _extract_source_timestamp(payload: Mapping[str, Any]) -> int | None:
         timestamp = payload.get("timestamp")
         if isinstance(timestamp, str):
             return parse_iso8601_to_ms(timestamp)
@@ -582,20 +624,21 @@ class OkxObservationNormalizer(BaseObservationNormalizer):
         data = raw_message.get("data")
         if not isinstance(arg, dict) or not isinstance(data, list):
             return []
+        raw_view = MappingProxyType(raw_message)
 
         channel = arg.get("channel")
         if channel == "tickers":
-            return self._normalize_tickers(raw_message, data, received_timestamp_ms)
+            return self._normalize_tickers(raw_view, data, received_timestamp_ms)
         if channel == "trades":
-            return self._normalize_trades(raw_message, data, received_timestamp_ms)
+            return self._normalize_trades(raw_view, data, received_timestamp_ms)
         if channel == "books5":
-            book_observation = self._normalize_books5(raw_message, data, received_timestamp_ms)
+            book_observation = self._normalize_books5(raw_view, data, received_timestamp_ms)
             return [book_observation] if book_observation is not None else []
         return []
 
     def _normalize_tickers(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: list[Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -612,18 +655,18 @@ class OkxObservationNormalizer(BaseObservationNormalizer):
                     market=str(ticker["instId"]),
                     source_timestamp_ms=self._extract_source_timestamp(ticker),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
-                    bid_price=parse_decimal(ticker["bidPx"]),
-                    bid_size=parse_decimal(ticker["bidSz"]),
-                    ask_price=parse_decimal(ticker["askPx"]),
-                    ask_size=parse_decimal(ticker["askSz"]),
+                    raw_message=self._retained(raw_message),
+                    bid_price=self._parse_number(ticker["bidPx"]),
+                    bid_size=self._parse_number(ticker["bidSz"]),
+                    ask_price=self._parse_number(ticker["askPx"]),
+                    ask_size=self._parse_number(ticker["askSz"]),
                 )
             )
         return observations
 
     def _normalize_trades(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: list[Any],
         received_timestamp_ms: int | None,
     ) -> list[Observation]:
@@ -640,18 +683,18 @@ class OkxObservationNormalizer(BaseObservationNormalizer):
                     market=str(trade.get("instId", "")),
                     source_timestamp_ms=self._extract_source_timestamp(trade),
                     received_timestamp_ms=received_timestamp_ms,
-                    raw_message=deepcopy(raw_message),
+                    raw_message=self._retained(raw_message),
                     trade_id=self._coerce_optional_str(trade.get("tradeId")),
                     side=cast("Any", side),
-                    price=parse_decimal(trade["px"]),
-                    size=parse_decimal(trade["sz"]),
+                    price=self._parse_number(trade["px"]),
+                    size=self._parse_number(trade["sz"]),
                 )
             )
         return observations
 
     def _normalize_books5(
         self,
-        raw_message: dict[str, Any],
+        raw_message: Mapping[str, Any],
         data: list[Any],
         received_timestamp_ms: int | None,
     ) -> OrderBookObservation | None:
@@ -674,8 +717,8 @@ class OkxObservationNormalizer(BaseObservationNormalizer):
                 levels.append(
                     OrderBookLevel(
                         side=cast("Any", side_name),
-                        price=parse_decimal(level[0]),
-                        size=parse_decimal(level[1]),
+                        price=self._parse_number(level[0]),
+                        size=self._parse_number(level[1]),
                     )
                 )
 
@@ -684,13 +727,13 @@ class OkxObservationNormalizer(BaseObservationNormalizer):
             market=str(inst_id),
             source_timestamp_ms=self._extract_source_timestamp(book),
             received_timestamp_ms=received_timestamp_ms,
-            raw_message=deepcopy(raw_message),
+            raw_message=self._retained(raw_message),
             update_type="snapshot",
             levels=tuple(levels),
         )
 
     @staticmethod
-    def _extract_source_timestamp(payload: dict[str, Any]) -> int | None:
+    def _extract_source_timestamp(payload: Mapping[str, Any]) -> int | None:
         timestamp = payload.get("ts")
         if isinstance(timestamp, int):
             return timestamp
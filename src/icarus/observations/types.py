@@ -1,12 +1,88 @@
 from __future__ import annotations
 
 import abc
+from collections.abc import Mapping
 from dataclasses import dataclass
 from decimal import Decimal
+from types import MappingProxyType
 from typing import Any, Literal
 
 type Side = Literal["buy", "sell"]
 type BookUpdateType = Literal["snapshot", "update"]
+# Prices and sizes are Decimal by default. The opt-in "float" numeric mode keeps
+# them as float64 end to end; downstream arithmetic preserves whichever type it
+# is given and never mixes the two.
+type Number = Decimal | float
+type NumericMode = Literal["decimal", "float"]
+
+# Observations share one read-only view of the payload they were normalized
+# from (never a copy), so every observation from a message points at the same
+# object; treat it as immutable. Normalizers and builders built with
+# ``keep_raw_messages=False`` attach this empty mapping instead.
+EMPTY_RAW_MESSAGE: Mapping[str, Any] = MappingProxyType({})
+
+
+# Quote arithmetic shared by BBO and book observations. Each helper narrows
+# its operands once, to all float (checked first: it is the cheap isinstance)
+# or all Decimal. Anything else (ints) is retried as float, and a Decimal
+# mixed with a float raises TypeError, as the arithmetic itself would.
+def _midprice(bid: Number, ask: Number) -> Number:
+    if isinstance(bid, float) and isinstance(ask, float):
+        return (bid + ask) / 2
+    if isinstance(bid, Decimal) and isinstance(ask, Decimal):
+        return (bid + ask) / 2
+    return _midprice(*as_floats(bid, ask))
+
+
+def _spread(bid: Number, ask: Number) -> Number:
+    if isinstance(bid, float) and isinstance(ask, float):
+        return ask - bid
+    if isinstance(bid, Decimal) and isinstance(ask, Decimal):
+        return ask - bid
+    return _spread(*as_floats(bid, ask))
+
+
+def _spread_bps(bid: Number, ask: Number) -> Number | None:
+    if isinstance(bid, float) and isinstance(ask, float):
+        mid = (bid + ask) / 2
+        return None if mid == 0 else ((ask - bid) / mid) * 10000
+    if isinstance(bid, Decimal) and isinstance(ask, Decimal):
+        decimal_mid = (bid + ask) / 2
+        return None if decimal_mid == 0 else ((ask - bid) / decimal_mid) * 10000
+    return _spread_bps(*as_floats(bid, ask))
+
+
+def _microprice(
+    bid_price: Number, bid_size: Number, ask_price: Number, ask_size: Number
+) -> Number | None:
+    if (
+        isinstance(bid_price, float)
+        and isinstance(bid_size, float)
+        and isinstance(ask_price, float)
+        and isinstance(ask_size, float)
+    ):
+        total = bid_size + ask_size
+        if total == 0:
+            return None
+        return (ask_price * bid_size + bid_price * ask_size) / total
+    if (
+        isinstance(bid_price, Decimal)
+        and isinstance(bid_size, Decimal)
+        and isinstance(ask_price, Decimal)
+        and isinstance(ask_size, Decimal)
+    ):
+        decimal_total = bid_size + ask_size
+        if decimal_total == 0:
+            return None
+        return (ask_price * bid_size + bid_price * ask_size) / decimal_total
+    return _microprice(*as_floats(bid_price, bid_size, ask_price, ask_size))
+
+
+def as_floats(*values: Number) -> tuple[float, ...]:
+    """Float-mode values (ints included) as floats; a Decimal among them raises TypeError."""
+    if any(isinstance(value, Decimal) for value in values):
+        raise TypeError("Quote fields mix Decimal and float; numeric modes never mix.")
+    return tuple(float(value) for value in values)
 
 
 @dataclass(frozen=True, slots=True, repr=False)
@@ -15,7 +91,7 @@ class Observation(abc.ABC):
     market: str
     source_timestamp_ms: int | None
     received_timestamp_ms: int | None
-    raw_message: dict[str, Any]
+    raw_message: Mapping[str, Any]
 
     @abc.abstractmethod
     def display_fields(self) -> tuple[tuple[str, Any], ...]:
@@ -30,10 +106,10 @@ class Observation(abc.ABC):
 
 @dataclass(frozen=True, slots=True, repr=False)
 class BBOObservation(Observation):
-    bid_price: Decimal
-    bid_size: Decimal
-    ask_price: Decimal
-    ask_size: Decimal
+    bid_price: Number
+    bid_size: Number
+    ask_price: Number
+    ask_size: Number
 
     def display_fields(self) -> tuple[tuple[str, Any], ...]:
         return (
@@ -45,33 +121,28 @@ class BBOObservation(Observation):
         )
 
     @property
-    def midprice(self) -> Decimal:
-        return (self.bid_price + self.ask_price) / Decimal("2")
+    def midprice(self) -> Number:
+        return _midprice(self.bid_price, self.ask_price)
 
     @property
-    def spread(self) -> Decimal:
-        return self.ask_price - self.bid_price
+    def spread(self) -> Number:
+        return _spread(self.bid_price, self.ask_price)
 
     @property
-    def spread_bps(self) -> Decimal | None:
-        if self.midprice == 0:
-            return None
-        return (self.spread / self.midprice) * Decimal("10000")
+    def spread_bps(self) -> Number | None:
+        return _spread_bps(self.bid_price, self.ask_price)
 
     @property
-    def microprice(self) -> Decimal | None:
-        total_size = self.bid_size + self.ask_size
-        if total_size == 0:
-            return None
-        return ((self.ask_price * self.bid_size) + (self.bid_price * self.ask_size)) / total_size
+    def microprice(self) -> Number | None:
+        return _microprice(self.bid_price, self.bid_size, self.ask_price, self.ask_size)
 
 
 @dataclass(frozen=True, slots=True, repr=False)
 class TradeObservation(Observation):
     trade_id: str | None
     side: Side
-    price: Decimal
-    size: Decimal
+    price: Number
+    size: Number
 
     def display_fields(self) -> tuple[tuple[str, Any], ...]:
         return (
@@ -90,11 +161,11 @@ class CandleObservation(Observation):
     interval: str | None
     open_timestamp_ms: int
     close_timestamp_ms: int
-    open_price: Decimal
-    high_price: Decimal
-    low_price: Decimal
-    close_price: Decimal
-    volume: Decimal
+    open_price: Number
+    high_price: Number
+    low_price: Number
+    close_price: Number
+    volume: Number
     trade_count: int | None
 
     def display_fields(self) -> tuple[tuple[str, Any], ...]:
@@ -113,8 +184,8 @@ class CandleObservation(Observation):
 @dataclass(frozen=True, slots=True, repr=False)
 class OrderBookLevel:
     side: Side
-    price: Decimal
-    size: Decimal
+    price: Number
+    size: Number
 
     def __repr__(self) -> str:
         return f"OrderBookLevel(side={self.side!r}, price={self.price!r}, size={self.size!r})"
@@ -151,39 +222,36 @@ class OrderBookObservation(Observation):
         return min(ask_levels, key=lambda level: level.price) if ask_levels else None
 
     @property
-    def midprice(self) -> Decimal | None:
+    def midprice(self) -> Number | None:
         best_bid = self.best_bid_level
         best_ask = self.best_ask_level
         if best_bid is None or best_ask is None:
             return None
-        return (best_bid.price + best_ask.price) / Decimal("2")
+        return _midprice(best_bid.price, best_ask.price)
 
     @property
-    def spread(self) -> Decimal | None:
+    def spread(self) -> Number | None:
         best_bid = self.best_bid_level
         best_ask = self.best_ask_level
         if best_bid is None or best_ask is None:
             return None
-        return best_ask.price - best_bid.price
+        return _spread(best_bid.price, best_ask.price)
 
     @property
-    def spread_bps(self) -> Decimal | None:
-        midprice = self.midprice
-        spread = self.spread
-        if midprice is None or spread is None or midprice == 0:
+    def spread_bps(self) -> Number | None:
+        best_bid = self.best_bid_level
+        best_ask = self.best_ask_level
+        if best_bid is None or best_ask is None:
             return None
-        return (spread / midprice) * Decimal("10000")
+        return _spread_bps(best_bid.price, best_ask.price)
 
     @property
-    def microprice(self) -> Decimal | None:
+    def microprice(self) -> Number | None:
         best_bid = self.best_bid_level
         best_ask = self.best_ask_level
         if best_bid is None or best_ask is None:
             return None
-        total_size = best_bid.size + best_ask.size
-        if total_size == 0:
-            return None
-        return ((best_ask.price * best_bid.size) + (best_bid.price * best_ask.size)) / total_size
+        return _microprice(best_bid.price, best_bid.size, best_ask.price, best_ask.size)
 
 
 @dataclass(frozen=True, slots=True, repr=False)
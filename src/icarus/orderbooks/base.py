@@ -1,22 +1,135 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Mapping
+from typing import Any
 
 from icarus.observations import OrderBookLevel, OrderBookObservation
+from icarus.observations.types import Number, NumericMode, Side
+
+
+class _BookSide:
+    """One side of the book as a price -> size map plus an ascending price ladder.
+
+    The ladder is kept sorted on every insert/remove so the best price and any
+    depth-limited view are read straight off the ends of the list instead of
+    re-sorting the whole side. Materialized ``OrderBookLevel`` tuples are cached
+    until the side next changes.
+    """
+
+    __slots__ = ("_sizes", "_prices", "_side", "_descending", "_levels_cache", "_best_cache")
+
+    def __init__(self, side: Side, *, descending: bool) -> None:
+        self._sizes: dict[Number, Number] = {}
+        self._prices: list[Number] = []
+        self._side = side
+        self._descending = descending
+        self._levels_cache: tuple[OrderBookLevel, ...] | None = None
+        self._best_cache: OrderBookLevel | None = None
+
+    def clear(self) -> None:
+        self._sizes.clear()
+        self._prices.clear()
+        self._invalidate()
+
+    def load(self, sizes: dict[Number, Number]) -> None:
+        self._sizes = sizes
+        self._prices = sorted(sizes)
+        self._invalidate()
+
+    def set(self, price: Number, size: Number) -> None:
+        sizes = self._sizes
+        if size <= 0:
+            if sizes.pop(price, None) is None:
+                return
+            prices = self._prices
+            del prices[bisect_left(prices, price)]
+        else:
+            if price not in sizes:
+                insort(self._prices, price)
+            sizes[price] = size
+        self._invalidate()
+
+    def truncate(self, depth: int) -> None:
+        excess = len(self._prices) - depth
+        if excess <= 0:
+            return
+        prices = self._prices
+        if self._descending:
+            removed = prices[:excess]
+            del prices[:excess]
+        else:
+            removed = prices[depth:]
+            del prices[depth:]
+        for price in removed:
+            del self._sizes[price]
+        self._invalidate()
+
+    def best(self) -> OrderBookLevel | None:
+        if self._best_cache is None and self._prices:
+            price = self._prices[-1] if self._descending else self._prices[0]
+            self._best_cache = OrderBookLevel(
+                side=self._side,
+                price=price,
+                size=self._sizes[price],
+            )
+        return self._best_cache
+
+    def levels(self, depth: int | None = None) -> tuple[OrderBookLevel, ...]:
+        if self._levels_cache is not None:
+            return self._levels_cache if depth is None else self._levels_cache[: max(depth, 0)]
+
+        if depth is not None:
+            # Build only the requested prefix; a deep side is never materialized
+            # just to hand out its top few levels.
+            if depth <= 0:
+                return ()
+            prices = self._prices[: -depth - 1 : -1] if self._descending else self._prices[:depth]
+            return self._materialize(prices)
+
+        self._levels_cache = self._materialize(
+            reversed(self._prices) if self._descending else self._prices
+        )
+        return self._levels_cache
+
+    def _materialize(self, prices: Iterable[Number]) -> tuple[OrderBookLevel, ...]:
+        sizes = self._sizes
+        side = self._side
+        return tuple(OrderBookLevel(side=side, price=price, size=sizes[price]) for price in prices)
+
+    def _invalidate(self) -> None:
+        self._levels_cache = None
+        self._best_cache = None
 
 
 class OrderBook:
-    """Canonical in-memory order book using absolute per-level quantities."""
+    """Canonical in-memory order book using absolute per-level quantities.
 
-    def __init__(self) -> None:
-        self._bids: dict[Decimal, Decimal] = {}
-        self._asks: dict[Decimal, Decimal] = {}
+    Each side maintains a sorted price ladder, so level updates cost a binary
+    search, best bid/ask are O(1), and ``truncate``/``levels`` never re-sort.
+
+    Levels are stored and read back in whatever numeric type they arrive in.
+    With ``numeric_mode="float"`` only ``to_observation`` converts to float, so
+    a builder can keep exact Decimal state for checksums while feeding the
+    float pipeline downstream.
+    """
+
+    def __init__(self, *, numeric_mode: NumericMode = "decimal") -> None:
+        self._emit_float = numeric_mode == "float"
+        self._bids = _BookSide("buy", descending=True)
+        self._asks = _BookSide("sell", descending=False)
 
     def load_snapshot(self, levels: tuple[OrderBookLevel, ...]) -> None:
-        self._bids.clear()
-        self._asks.clear()
+        bids: dict[Number, Number] = {}
+        asks: dict[Number, Number] = {}
         for level in levels:
-            self.apply_level(level.side, level.price, level.size)
+            book_side = bids if level.side == "buy" else asks
+            if level.size <= 0:
+                book_side.pop(level.price, None)
+            else:
+                book_side[level.price] = level.size
+        self._bids.load(bids)
+        self._asks.load(asks)
 
     def apply_delta(self, levels: tuple[OrderBookLevel, ...]) -> None:
         for level in levels:
@@ -27,38 +140,29 @@ class OrderBook:
             self._bids.clear()
             self._asks.clear()
             return
-        self._bids = dict(sorted(self._bids.items(), reverse=True)[:depth])
-        self._asks = dict(sorted(self._asks.items())[:depth])
+        self._bids.truncate(depth)
+        self._asks.truncate(depth)
 
-    def apply_level(self, side: str, price: Decimal, size: Decimal) -> None:
+    def apply_level(self, side: str, price: Number, size: Number) -> None:
         book_side = self._bids if side == "buy" else self._asks
-        if size <= 0:
-            book_side.pop(price, None)
-            return
-        book_side[price] = size
+        book_side.set(price, size)
 
     def best_bid_level(self) -> OrderBookLevel | None:
-        if not self._bids:
-            return None
-        best_price = max(self._bids)
-        return OrderBookLevel(side="buy", price=best_price, size=self._bids[best_price])
+        return self._bids.best()
 
     def best_ask_level(self) -> OrderBookLevel | None:
-        if not self._asks:
-            return None
-        best_price = min(self._asks)
-        return OrderBookLevel(side="sell", price=best_price, size=self._asks[best_price])
-
-    def levels(self) -> tuple[OrderBookLevel, ...]:
-        bid_levels = tuple(
-            OrderBookLevel(side="buy", price=price, size=size)
-            for price, size in sorted(self._bids.items(), reverse=True)
-        )
-        ask_levels = tuple(
-            OrderBookLevel(side="sell", price=price, size=size)
-            for price, size in sorted(self._asks.items())
-        )
-        return bid_levels + ask_levels
+        return self._asks.best()
+
+    def bid_levels(self, depth: int | None = None) -> tuple[OrderBookLevel, ...]:
+        """Bids from best to worst, optionally limited to the top ``depth`` levels."""
+        return self._bids.levels(depth)
+
+    def ask_levels(self, depth: int | None = None) -> tuple[OrderBookLevel, ...]:
+        """Asks from best to worst, optionally limited to the top ``depth`` levels."""
+        return self._asks.levels(depth)
+
+    def levels(self, depth: int | None = None) -> tuple[OrderBookLevel, ...]:
+        return self._bids.levels(depth) + self._asks.levels(depth)
 
     def to_observation(
         self,
@@ -67,14 +171,21 @@ class OrderBook:
         market: str,
         source_timestamp_ms: int | None,
         received_timestamp_ms: int | None,
-        raw_message: dict[str, object],
+        raw_message: Mapping[str, Any],
+        depth: int | None = None,
     ) -> OrderBookObservation:
+        levels = self.levels(depth)
+        if self._emit_float:
+            levels = tuple(
+                OrderBookLevel(side=level.side, price=float(level.price), size=float(level.size))
+                for level in levels
+            )
         return OrderBookObservation(
             exchange=exchange,
             market=market,
             source_timestamp_ms=source_timestamp_ms,
             received_timestamp_ms=received_timestamp_ms,
-            raw_message=dict(raw_message),
+            raw_message=raw_message,
             update_type="snapshot",
-            levels=self.levels(),
+            levels=levels,
         )
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from icarus.observations import Observation, OrderBookDeltaObservation, OrderBookObservation
+from icarus.observations.types import EMPTY_RAW_MESSAGE
 from icarus.orderbooks.base import OrderBook
 
 
 class CoinbaseOrderBookBuilder:
-    """Reconstruct full Coinbase order book state from snapshot plus delta observations."""
+    """Reconstruct full Coinbase order book state from snapshot plus delta observations.
 
-    def __init__(self) -> None:
+    The full book is always maintained locally; ``depth`` only limits how many
+    levels per side are emitted on each observation. With
+    ``keep_raw_messages=False`` emitted books carry no raw payload; the input's
+    sequence number has already been read by then.
+    """
+
+    def __init__(self, *, depth: int | None = None, keep_raw_messages: bool = True) -> None:
         self._book = OrderBook()
+        self._depth = depth
+        self._keep_raw_messages = keep_raw_messages
         self._is_initialized = False
         self._last_sequence_num: int | None = None
 
@@ -27,7 +37,10 @@ class CoinbaseOrderBookBuilder:
                 market=observation.market,
                 source_timestamp_ms=observation.source_timestamp_ms,
                 received_timestamp_ms=observation.received_timestamp_ms,
-                raw_message=observation.raw_message,
+                raw_message=(
+                    observation.raw_message if self._keep_raw_messages else EMPTY_RAW_MESSAGE
+                ),
+                depth=self._depth,
             )
 
         if isinstance(observation, OrderBookDeltaObservation):
@@ -57,7 +70,10 @@ class CoinbaseOrderBookBuilder:
                 market=observation.market,
                 source_timestamp_ms=observation.source_timestamp_ms,
                 received_timestamp_ms=observation.received_timestamp_ms,
-                raw_message=observation.raw_message,
+                raw_message=(
+                    observation.raw_message if self._keep_raw_messages else EMPTY_RAW_MESSAGE
+                ),
+                depth=self._depth,
             )
 
         return None
@@ -68,6 +84,6 @@ class CoinbaseOrderBookBuilder:
         self._last_sequence_num = None
 
     @staticmethod
-    def _extract_sequence_num(raw_message: dict[str, Any]) -> int | None:
+    def _extract_sequence_num(raw_message: Mapping[str, Any]) -> int | None:
         sequence_num = raw_message.get("sequence_num")
         return sequence_num if isinstance(sequence_num, int) else None
@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 import zlib
-from decimal import Decimal
+from collections.abc import Mapping
 
 from icarus.observations import Observation, OrderBookDeltaObservation, OrderBookObservation
+from icarus.observations.types import EMPTY_RAW_MESSAGE, Number, NumericMode
 from icarus.orderbooks.base import OrderBook
 
 
 class KrakenOrderBookBuilder:
-    """Reconstruct full Kraken order book state from snapshot plus delta observations."""
-
-    def __init__(self, *, depth: int = 10) -> None:
-        self._book = OrderBook()
+    """Reconstruct full Kraken order book state from snapshot plus delta observations.
+
+    Book state is always held as Decimal so the CRC32 checksum sees exact price
+    strings; ``numeric_mode`` only controls the type of the emitted levels. With
+    ``keep_raw_messages=False`` emitted books carry no raw payload; the input's
+    checksum has already been verified by then.
+    """
+
+    def __init__(
+        self,
+        *,
+        depth: int = 10,
+        numeric_mode: NumericMode = "decimal",
+        keep_raw_messages: bool = True,
+    ) -> None:
+        self._numeric_mode = numeric_mode
+        self._keep_raw_messages = keep_raw_messages
+        self._book = OrderBook(numeric_mode=numeric_mode)
         self._is_initialized = False
         self._depth = depth
         self._needs_resync = False
@@ -33,7 +48,9 @@ class KrakenOrderBookBuilder:
                 market=observation.market,
                 source_timestamp_ms=observation.source_timestamp_ms,
                 received_timestamp_ms=observation.received_timestamp_ms,
-                raw_message=observation.raw_message,
+                raw_message=(
+                    observation.raw_message if self._keep_raw_messages else EMPTY_RAW_MESSAGE
+                ),
             )
 
         if isinstance(observation, OrderBookDeltaObservation):
@@ -51,18 +68,20 @@ class KrakenOrderBookBuilder:
                 market=observation.market,
                 source_timestamp_ms=observation.source_timestamp_ms,
                 received_timestamp_ms=observation.received_timestamp_ms,
-                raw_message=observation.raw_message,
+                raw_message=(
+                    observation.raw_message if self._keep_raw_messages else EMPTY_RAW_MESSAGE
+                ),
             )
 
         return None
 
     def reset(self) -> None:
-        self._book = OrderBook()
+        self._book = OrderBook(numeric_mode=self._numeric_mode)
         self._is_initialized = False
         self._needs_resync = False
 
     def request_resync(self) -> None:
-        self._book = OrderBook()
+        self._book = OrderBook(numeric_mode=self._numeric_mode)
         self._is_initialized = False
         self._needs_resync = True
 
@@ -78,12 +97,8 @@ class KrakenOrderBookBuilder:
         return self._compute_checksum() == expected
 
     def _compute_checksum(self) -> int:
-        ask_levels = [
-            level for level in self._book.levels() if level.side == "sell"
-        ][:10]
-        bid_levels = [
-            level for level in self._book.levels() if level.side == "buy"
-        ][:10]
+        ask_levels = self._book.ask_levels(10)
+        bid_levels = self._book.bid_levels(10)
         checksum_input = "".join(
             self._format_checksum_part(level.price, level.size) for level in ask_levels
         )
@@ -93,19 +108,19 @@ class KrakenOrderBookBuilder:
         return zlib.crc32(checksum_input.encode("utf-8")) & 0xFFFFFFFF
 
     @staticmethod
-    def _format_checksum_part(price: Decimal, size: Decimal) -> str:
+    def _format_checksum_part(price: Number, size: Number) -> str:
         return (
             KrakenOrderBookBuilder._normalize_checksum_value(price)
             + KrakenOrderBookBuilder._normalize_checksum_value(size)
         )
 
     @staticmethod
-    def _normalize_checksum_value(value: Decimal) -> str:
+    def _normalize_checksum_value(value: Number) -> str:
         normalized = str(value).replace(".", "").lstrip("0")
         return normalized or "0"
 
     @staticmethod
-    def _extract_checksum(raw_message: dict[str, object]) -> int | None:
+    def _extract_checksum(raw_message: Mapping[str, object]) -> int | None:
         data = raw_message.get("data")
         if not isinstance(data, list) or len(data) != 1 or not isinstance(data[0], dict):
             return None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from icarus.observations import Observation, OrderBookObservation
+from icarus.observations.types import EMPTY_RAW_MESSAGE
 from icarus.orderbooks.base import OrderBook
 
 
@@ -9,11 +10,13 @@ class OkxOrderBookBuilder:
 
     OKX books5 always delivers complete top-of-book snapshots, so no delta
     merging is required. Each incoming OrderBookObservation seeds the local
-    book and is re-emitted as a canonical full-book observation.
+    book and is re-emitted as a canonical full-book observation, without its
+    raw payload when ``keep_raw_messages`` is False.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, keep_raw_messages: bool = True) -> None:
         self._book = OrderBook()
+        self._keep_raw_messages = keep_raw_messages
         self._is_initialized = False
 
     def on_observation(self, observation: Observation) -> OrderBookObservation | None:
@@ -28,7 +31,9 @@ class OkxOrderBookBuilder:
                 market=observation.market,
                 source_timestamp_ms=observation.source_timestamp_ms,
                 received_timestamp_ms=observation.received_timestamp_ms,
-                raw_message=observation.raw_message,
+                raw_message=(
+                    observation.raw_message if self._keep_raw_messages else EMPTY_RAW_MESSAGE
+                ),
             )
 
         return None
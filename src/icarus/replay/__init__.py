@@ -0,0 +1,17 @@
+"""Deterministic replay of recorded captures through the live fair-value pipeline."""
+
+from icarus.replay.engine import ReplayPacer, ReplayStep, replay
+from icarus.replay.sources import (
+    iter_capture_quotes,
+    iter_frame_observations,
+    merge_observations,
+)
+
+__all__ = [
+    "ReplayPacer",
+    "ReplayStep",
+    "iter_capture_quotes",
+    "iter_frame_observations",
+    "merge_observations",
+    "replay",
+]
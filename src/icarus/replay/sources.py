@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import heapq
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from icarus.capture import ColumnarCaptureReader
+from icarus.capture.frames import RecordedFrame
+from icarus.observations import BBOObservation, Observation
+from icarus.observations.normalizers import number_parser
+from icarus.observations.types import EMPTY_RAW_MESSAGE, NumericMode
+from icarus.sockets.base import BaseSocket
+
+DEFAULT_CHUNK_UPDATES = 20_000
+DEFAULT_WINDOW_MS = 15 * 60 * 1000
+
+# (update_id, update timestamp_ms, exchange, age_ms, bid, ask, bid depth, ask depth)
+type _QuoteRow = tuple[int, int, str, float, float, float, float | None, float | None]
+
+
+def iter_capture_quotes(
+    path: Path,
+    *,
+    markets: Mapping[str, str] | None = None,
+    numeric_mode: NumericMode = "decimal",
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    chunk_updates: int = DEFAULT_CHUNK_UPDATES,
+    window_ms: int = DEFAULT_WINDOW_MS,
+) -> Iterator[BBOObservation]:
+    """Rebuild each venue's top-of-book quotes from a ``capture_filter_eval`` capture.
+
+    Captures record every venue's latest top of book on every update; this
+    yields one ``BBOObservation`` per distinct quote, stamped with the time it
+    arrived (update time minus the recorded quote age), in timestamp order.
+    Quotes that first appear in the same update are ordered by arrival time,
+    then exchange. Depth missing from older captures is treated as zero.
+
+    ``path`` may be a SQLite capture or a columnar ``.cols`` store; both are
+    read lazily (``chunk_updates`` rows / ``window_ms`` of data at a time).
+    Captures do not record each venue's market, so ``markets`` maps exchange
+    to market name and defaults to the exchange name itself.
+    """
+    if ColumnarCaptureReader.is_store(path):
+        rows = _columnar_quote_rows(path, start_ms=start_ms, end_ms=end_ms, window_ms=window_ms)
+    else:
+        rows = _sqlite_quote_rows(path, start_ms=start_ms, end_ms=end_ms, chunk=chunk_updates)
+    return _quotes_from_rows(rows, markets or {}, numeric_mode)
+
+
+def iter_frame_observations(
+    socket: BaseSocket,
+    frames: Iterable[RecordedFrame],
+    *,
+    exchange: str | None = None,
+    market: str | None = None,
+) -> Iterator[Observation]:
+    """Re-normalise recorded raw frames with ``socket``'s current parsing code.
+
+    Each frame goes through ``parse_message`` and
+    ``convert_message_to_observations`` stamped with its recorded receive
+    time, then through the socket's local order-book builder where it has one,
+    so the output matches what ``stream_observations`` produced live.
+    ``exchange``/``market`` override the observation names, as the capture's
+    socket specs do. The socket is never connected.
+    """
+    convert: Any = socket.convert_message_to_observations  # type: ignore[attr-defined]
+    build_book = getattr(socket, "_pipeline_observation", None)
+    for frame in frames:
+        message = socket.parse_message(frame.payload)
+        for observation in convert(
+            message, received_timestamp_ms=frame.received_timestamp_ms
+        ):
+            if build_book is not None:
+                try:
+                    observation = build_book(observation)
+                except ConnectionError:
+                    # Live, a book resync reconnects; the recording carries the
+                    # fresh snapshot that followed, which reseeds the builder.
+                    continue
+                if observation is None:
+                    continue
+            if exchange is not None or market is not None:
+                observation = replace(
+                    observation,
+                    exchange=exchange or observation.exchange,
+                    market=market or observation.market,
+                )
+            yield observation
+
+
+def merge_observations(*streams: Iterable[Observation]) -> Iterator[Observation]:
+    """Lazily merge timestamp-ordered observation streams into one ordered stream."""
+    return heapq.merge(*streams, key=_event_time)
+
+
+def _quotes_from_rows(
+    rows: Iterable[_QuoteRow],
+    markets: Mapping[str, str],
+    numeric_mode: NumericMode,
+) -> Iterator[BBOObservation]:
+    parse = number_parser(numeric_mode)
+    last_quote: dict[str, tuple[int, float, float, float, float]] = {}
+    pending: list[tuple[int, str, float, float, float, float]] = []
+    current_update: int | None = None
+
+    def flush() -> Iterator[BBOObservation]:
+        pending.sort(key=lambda quote: (quote[0], quote[1]))
+        for quote_ms, exchange, bid, ask, bid_size, ask_size in pending:
+            yield BBOObservation(
+                exchange=exchange,
+                market=markets.get(exchange, exchange),
+                source_timestamp_ms=quote_ms,
+                received_timestamp_ms=quote_ms,
+                raw_message=EMPTY_RAW_MESSAGE,
+                bid_price=parse(bid),
+                bid_size=parse(bid_size),
+                ask_price=parse(ask),
+                ask_size=parse(ask_size),
+            )
+        pending.clear()
+
+    for update_id, timestamp_ms, exchange, age_ms, bid, ask, bid_size, ask_size in rows:
+        if update_id != current_update:
+            yield from flush()
+            current_update = update_id
+        quote = (
+            timestamp_ms - round(age_ms),
+            bid,
+            ask,
+            bid_size if bid_size is not None else 0.0,
+            ask_size if ask_size is not None else 0.0,
+        )
+        if last_quote.get(exchange) == quote:
+            continue
+        last_quote[exchange] = quote
+        pending.append((quote[0], exchange, *quote[1:]))
+    yield from flush()
+
+
+def _sqlite_quote_rows(
+    path: Path,
+    *,
+    start_ms: int | None,
+    end_ms: int | None,
+    chunk: int,
+) -> Iterator[_QuoteRow]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        columns = {str(row[1]) for row in conn.execute("PRAGMA table_info(venue_states)")}
+        if not {"bid_price", "ask_price"} <= columns:
+            raise ValueError(f"{path} predates top-of-book capture columns; nothing to replay")
+        depth = (
+            "v.top_bid_depth, v.top_ask_depth"
+            if {"top_bid_depth", "top_ask_depth"} <= columns
+            else "NULL, NULL"
+        )
+        where = ["v.bid_price IS NOT NULL", "v.ask_price IS NOT NULL"]
+        params: list[Any] = []
+        if start_ms is not None:
+            where.append("u.timestamp_ms >= ?")
+            params.append(start_ms)
+        if end_ms is not None:
+            where.append("u.timestamp_ms < ?")
+            params.append(end_ms)
+        cursor = conn.execute(
+            f"""
+            SELECT u.id, u.timestamp_ms, v.exchange, v.age_ms,
+                   v.bid_price, v.ask_price, {depth}
+            FROM updates u
+            JOIN venue_states v ON v.update_id = u.id
+            WHERE {" AND ".join(where)}
+            ORDER BY u.id
+            """,
+            params,
+        )
+        while True:
+            batch = cursor.fetchmany(chunk)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        conn.close()
+
+
+def _columnar_quote_rows(
+    path: Path,
+    *,
+    start_ms: int | None,
+    end_ms: int | None,
+    window_ms: int,
+) -> Iterator[_QuoteRow]:
+    reader = ColumnarCaptureReader(path)
+    timestamps = reader.read_updates(["timestamp_ms"])["timestamp_ms"]
+    venues = reader.venues()
+    if not len(timestamps) or not venues:
+        return
+    first_ms = int(timestamps.min()) if start_ms is None else start_ms
+    stop_ms = int(timestamps.max()) + 1 if end_ms is None else end_ms
+    columns = ["update_id", "timestamp_ms", "age_ms", "bid_price", "ask_price",
+               "top_bid_depth", "top_ask_depth"]
+
+    for window_start in range(first_ms, stop_ms, window_ms):
+        window_end = min(window_start + window_ms, stop_ms)
+        parts = [
+            reader.read_venue(venue, columns, start_ms=window_start, end_ms=window_end)
+            for venue in venues
+        ]
+        venue_index = np.concatenate(
+            [np.full(len(part["update_id"]), i, dtype=np.int32) for i, part in enumerate(parts)]
+        )
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in columns}
+        keep = np.isfinite(merged["bid_price"]) & np.isfinite(merged["ask_price"])
+        rows = np.flatnonzero(keep)
+        rows = rows[np.lexsort((venue_index[rows], merged["update_id"][rows]))]
+        bid_depth = merged["top_bid_depth"][rows]
+        ask_depth = merged["top_ask_depth"][rows]
+        for update_id, timestamp_ms, venue_i, age_ms, bid, ask, bid_size, ask_size in zip(
+            merged["update_id"][rows].tolist(),
+            merged["timestamp_ms"][rows].tolist(),
+            venue_index[rows].tolist(),
+            merged["age_ms"][rows].tolist(),
+            merged["bid_price"][rows].tolist(),
+            merged["ask_price"][rows].tolist(),
+            np.where(np.isnan(bid_depth), 0.0, bid_depth).tolist(),
+            np.where(np.isnan(ask_depth), 0.0, ask_depth).tolist(),
+            strict=True,
+        ):
+            yield (update_id, timestamp_ms, venues[venue_i], age_ms, bid, ask, bid_size, ask_size)
+
+
+def _event_time(observation: Observation) -> int:
+    if observation.received_timestamp_ms is not None:
+        return observation.received_timestamp_ms
+    return observation.source_timestamp_ms if observation.source_timestamp_ms is not None else 0
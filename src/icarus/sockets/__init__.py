@@ -2,8 +2,18 @@
 
 from icarus.sockets.base import BaseSocket
 from icarus.sockets.coinbase import CoinbaseSocket
+from icarus.sockets.decoding import JSON_BACKENDS, JsonBackend, json_decoder
 from icarus.sockets.hyperliquid import HyperliquidSocket
 from icarus.sockets.kraken import KrakenSocket
 from icarus.sockets.okx import OkxSocket
 
-__all__ = ["BaseSocket", "CoinbaseSocket", "HyperliquidSocket", "KrakenSocket", "OkxSocket"]
+__all__ = [
+    "JSON_BACKENDS",
+    "BaseSocket",
+    "CoinbaseSocket",
+    "HyperliquidSocket",
+    "JsonBackend",
+    "KrakenSocket",
+    "OkxSocket",
+    "json_decoder",
+]
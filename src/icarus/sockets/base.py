@@ -6,8 +6,22 @@ import importlib
 import importlib.util
 import json
 import logging
-from collections.abc import AsyncIterator
-from typing import Any, cast
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from typing import TYPE_CHECKING, Any, cast
+
+from icarus.sockets.decoding import (
+    ChannelSchemaDecoder,
+    JsonBackend,
+    JsonDecoder,
+    json_decoder,
+    resolve_json_backend,
+)
+
+if TYPE_CHECKING:
+    from icarus.capture.frames import FrameRecorder
+    from icarus.observations import Observation
+    from icarus.telemetry import LatencyRecorder
 
 websockets = (
     importlib.import_module("websockets") if importlib.util.find_spec("websockets") else None
@@ -15,7 +29,20 @@ websockets = (
 
 
 class BaseSocket(abc.ABC):
-    """Reusable async websocket client with reconnect/backoff support."""
+    """Reusable async websocket client with reconnect/backoff support.
+
+    Set ``frame_recorder`` to tee every raw frame, before parsing, into a
+    ``FrameRecorder``; ``close`` finishes the recording.
+
+    Set ``latency`` to time the parse, normalise and book-building stages
+    of one message in ``latency.sample_every`` into
+    ``<latency_label>.parse``/``.normalize``/``.book`` histograms. It
+    takes effect on the next ``stream_messages``/``stream_observations``.
+
+    Frames are decoded with ``json_backend`` (see ``json_decoder``); with
+    msgspec, frames matching one of ``json_schemas`` (marker -> type, see
+    ``ChannelSchemaDecoder``) are decoded typed and in lax mode.
+    """
 
     def __init__(
         self,
@@ -27,6 +54,12 @@ class BaseSocket(abc.ABC):
         reconnect_delay: float = 1.0,
         max_reconnect_delay: float = 30.0,
         logger: logging.Logger | None = None,
+        frame_recorder: FrameRecorder | None = None,
+        latency: LatencyRecorder | None = None,
+        latency_label: str | None = None,
+        json_backend: JsonBackend = "auto",
+        json_float_text: bool = False,
+        json_schemas: Mapping[str, Any] | None = None,
     ) -> None:
         self.url = url
         self.ping_interval = ping_interval
@@ -35,6 +68,13 @@ class BaseSocket(abc.ABC):
         self.reconnect_delay = reconnect_delay
         self.max_reconnect_delay = max_reconnect_delay
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.frame_recorder = frame_recorder
+        self.latency = latency
+        self.latency_label = latency_label or type(self).__name__.removesuffix("Socket").lower()
+        self.json_backend = resolve_json_backend(json_backend, float_text=json_float_text)
+        self.json_float_text = json_float_text
+        self.json_schemas = json_schemas
+        self._decode = self._build_decoder()
 
         self._ws: Any | None = None
         self._closed = False
@@ -65,6 +105,8 @@ class BaseSocket(abc.ABC):
         if self._ws is not None:
             await self._ws.close()
             self._ws = None
+        if self.frame_recorder is not None:
+            await asyncio.to_thread(self.frame_recorder.close)
 
     async def send_json(self, payload: dict[str, Any]) -> None:
         if self._ws is None:
@@ -72,8 +114,24 @@ class BaseSocket(abc.ABC):
 
         await self._ws.send(json.dumps(payload))
 
-    def parse_message(self, raw_message: str) -> dict[str, Any]:
-        return cast(dict[str, Any], json.loads(raw_message))
+    def __getstate__(self) -> dict[str, Any]:
+        # Decoders are not picklable; worker processes rebuild their own.
+        state = self.__dict__.copy()
+        del state["_decode"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._decode = self._build_decoder()
+
+    def _build_decoder(self) -> JsonDecoder:
+        decoder = json_decoder(self.json_backend, float_text=self.json_float_text)
+        if self.json_schemas and self.json_backend == "msgspec":
+            return ChannelSchemaDecoder(self.json_schemas, decoder, lax=True)
+        return decoder
+
+    def parse_message(self, raw_message: str | bytes) -> dict[str, Any]:
+        return cast(dict[str, Any], self._decode(raw_message))
 
     async def recv_json(self) -> dict[str, Any]:
         if self._ws is None:
@@ -92,8 +150,24 @@ class BaseSocket(abc.ABC):
                 backoff = self.reconnect_delay
 
                 assert self._ws is not None
+                recorder = self.frame_recorder
+                parse_latency = None
+                sample_every = skip = 0
+                if self.latency is not None:
+                    parse_latency = self.latency.histogram(f"{self.latency_label}.parse")
+                    sample_every = skip = self.latency.sample_every
                 async for raw_message in self._ws:
-                    yield self.parse_message(raw_message)
+                    if recorder is not None:
+                        recorder.record(raw_message)
+                    skip -= 1
+                    if parse_latency is None or skip > 0:
+                        yield self.parse_message(raw_message)
+                        continue
+                    skip = sample_every
+                    started_ns = time.perf_counter_ns()
+                    message = self.parse_message(raw_message)
+                    parse_latency.record(time.perf_counter_ns() - started_ns)
+                    yield message
             except asyncio.CancelledError:
                 raise
             except RuntimeError:
@@ -112,3 +186,71 @@ class BaseSocket(abc.ABC):
                 if self._ws is not None:
                     await self._ws.close()
                     self._ws = None
+
+    def _normalized_observations(
+        self,
+        convert: Callable[..., list[Observation]],
+        build_book: Callable[[Observation], Observation | None] | None = None,
+    ) -> AsyncIterator[Observation]:
+        """Normalise every streamed message, passing each observation through ``build_book``."""
+        if self.latency is not None:
+            return self._stream_normalized_timed(convert, build_book)
+        return self._stream_normalized(convert, build_book)
+
+    async def _stream_normalized(
+        self,
+        convert: Callable[..., list[Observation]],
+        build_book: Callable[[Observation], Observation | None] | None,
+    ) -> AsyncIterator[Observation]:
+        async for raw_message in self.stream_messages():
+            for observation in convert(
+                raw_message,
+                received_timestamp_ms=time.time_ns() // 1_000_000,
+            ):
+                if build_book is None:
+                    yield observation
+                    continue
+                pipeline_observation = build_book(observation)
+                if pipeline_observation is not None:
+                    yield pipeline_observation
+
+    async def _stream_normalized_timed(
+        self,
+        convert: Callable[..., list[Observation]],
+        build_book: Callable[[Observation], Observation | None] | None,
+    ) -> AsyncIterator[Observation]:
+        assert self.latency is not None
+        normalize_latency = self.latency.histogram(f"{self.latency_label}.normalize")
+        book_latency = self.latency.histogram(f"{self.latency_label}.book")
+        sample_every = skip = self.latency.sample_every
+        perf_counter_ns = time.perf_counter_ns
+        async for raw_message in self.stream_messages():
+            skip -= 1
+            if skip > 0:
+                for observation in convert(
+                    raw_message,
+                    received_timestamp_ms=time.time_ns() // 1_000_000,
+                ):
+                    if build_book is None:
+                        yield observation
+                        continue
+                    pipeline_observation = build_book(observation)
+                    if pipeline_observation is not None:
+                        yield pipeline_observation
+                continue
+            skip = sample_every
+            started_ns = perf_counter_ns()
+            observations = convert(
+                raw_message,
+                received_timestamp_ms=time.time_ns() // 1_000_000,
+            )
+            normalize_latency.record(perf_counter_ns() - started_ns)
+            for observation in observations:
+                if build_book is None:
+                    yield observation
+                    continue
+                started_ns = perf_counter_ns()
+                pipeline_observation = build_book(observation)
+                book_latency.record(perf_counter_ns() - started_ns)
+                if pipeline_observation is not None:
+                    yield pipeline_observation
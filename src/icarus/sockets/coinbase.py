@@ -1,12 +1,39 @@
 from __future__ import annotations
 
-import time
 from collections.abc import AsyncIterator
-from typing import Any
+from typing import Any, NotRequired, TypedDict
 
 from icarus.observations import CoinbaseObservationNormalizer, Observation
+from icarus.observations.types import NumericMode
 from icarus.orderbooks import CoinbaseOrderBookBuilder
 from icarus.sockets.base import BaseSocket
+from icarus.sockets.decoding import JsonBackend
+
+
+class _L2Update(TypedDict):
+    side: str
+    event_time: NotRequired[str]
+    price_level: float
+    new_quantity: float
+
+
+class _L2Event(TypedDict):
+    type: str
+    product_id: str
+    updates: list[_L2Update]
+
+
+class _L2Message(TypedDict):
+    channel: str
+    client_id: NotRequired[str]
+    timestamp: NotRequired[str]
+    sequence_num: NotRequired[int]
+    events: list[_L2Event]
+
+
+# Level2 frames dominate the feed; in float mode msgspec decodes them typed,
+# converting the quoted prices and sizes to floats while parsing.
+L2_FLOAT_SCHEMAS: dict[str, Any] = {'"channel":"l2_data"': _L2Message}
 
 
 class CoinbaseSocket(BaseSocket):
@@ -22,17 +49,34 @@ class CoinbaseSocket(BaseSocket):
         *,
         channels: list[str] | None = None,
         sandbox: bool = False,
+        book_depth: int | None = None,
+        numeric_mode: NumericMode = "decimal",
+        keep_raw_messages: bool = True,
+        json_backend: JsonBackend = "auto",
     ) -> None:
         super().__init__(
             self.SANDBOX_WS_URL if sandbox else self.MAINNET_WS_URL,
             max_message_size=self.DEFAULT_MAX_MESSAGE_SIZE,
+            json_backend=json_backend,
+            # Typed decoding keeps only the declared keys, so not when raw
+            # messages are retained.
+            json_schemas=(
+                L2_FLOAT_SCHEMAS if numeric_mode == "float" and not keep_raw_messages else None
+            ),
         )
         if isinstance(product_ids, str):
             product_ids = [product_ids]
 
         self.product_ids = [product_id.upper() for product_id in product_ids]
         self.channels = channels or ["ticker", "heartbeats", "level2"]
-        self.observation_normalizer = CoinbaseObservationNormalizer()
+        # Limits emitted book levels per side; the local book is always full depth.
+        self.book_depth = book_depth
+        self.numeric_mode = numeric_mode
+        self.keep_raw_messages = keep_raw_messages
+        self.observation_normalizer = CoinbaseObservationNormalizer(
+            numeric_mode=numeric_mode,
+            keep_raw_messages=keep_raw_messages,
+        )
         self._orderbook_builders: dict[str, CoinbaseOrderBookBuilder] = {}
 
     async def after_connect(self) -> None:
@@ -52,11 +96,12 @@ class CoinbaseSocket(BaseSocket):
             for channel in self.channels
         ]
 
-    def parse_message(self, raw_message: str) -> dict[str, Any]:
+    def parse_message(self, raw_message: str | bytes) -> dict[str, Any]:
         message = super().parse_message(raw_message)
 
         events = message.get("events")
-        if isinstance(events, list):
+        # Rebuilt only in the rare case it holds non-dict entries.
+        if isinstance(events, list) and not all(isinstance(event, dict) for event in events):
             message["events"] = [event for event in events if isinstance(event, dict)]
 
         return message
@@ -80,16 +125,15 @@ class CoinbaseSocket(BaseSocket):
 
         builder = self._orderbook_builders.get(observation.market)
         if builder is None:
-            builder = CoinbaseOrderBookBuilder()
+            builder = CoinbaseOrderBookBuilder(
+                depth=self.book_depth,
+                keep_raw_messages=self.keep_raw_messages,
+            )
             self._orderbook_builders[observation.market] = builder
         return builder.on_observation(observation)
 
-    async def stream_observations(self) -> AsyncIterator[Observation]:
-        async for raw_message in self.stream_messages():
-            for observation in self.convert_message_to_observations(
-                raw_message,
-                received_timestamp_ms=time.time_ns() // 1_000_000,
-            ):
-                pipeline_observation = self._pipeline_observation(observation)
-                if pipeline_observation is not None:
-                    yield pipeline_observation
+    def stream_observations(self) -> AsyncIterator[Observation]:
+        return self._normalized_observations(
+            self.convert_message_to_observations,
+            self._pipeline_observation,
+        )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+from collections.abc import Callable, Mapping
+from typing import Any, Literal
+
+orjson = importlib.import_module("orjson") if importlib.util.find_spec("orjson") else None
+msgspec = importlib.import_module("msgspec") if importlib.util.find_spec("msgspec") else None
+
+type JsonBackend = Literal["auto", "stdlib", "orjson", "msgspec"]
+type JsonDecoder = Callable[[str | bytes], Any]
+JSON_BACKENDS: tuple[JsonBackend, ...] = ("auto", "stdlib", "orjson", "msgspec")
+
+
+def available_json_backends() -> list[JsonBackend]:
+    """Concrete backends importable here, fastest first; stdlib is always last."""
+    backends: list[JsonBackend] = []
+    if msgspec is not None:
+        backends.append("msgspec")
+    if orjson is not None:
+        backends.append("orjson")
+    backends.append("stdlib")
+    return backends
+
+
+def resolve_json_backend(backend: JsonBackend, *, float_text: bool = False) -> JsonBackend:
+    """The concrete backend ``json_decoder`` would use for ``backend``."""
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unsupported JSON backend: {backend!r}.")
+    if backend == "auto":
+        for candidate in available_json_backends():
+            if not (float_text and candidate == "orjson"):
+                return candidate
+    if backend == "orjson":
+        if orjson is None:
+            raise ValueError("The orjson JSON backend needs the orjson package.")
+        if float_text:
+            raise ValueError("orjson cannot keep float literals as text; use msgspec or stdlib.")
+    if backend == "msgspec" and msgspec is None:
+        raise ValueError("The msgspec JSON backend needs the msgspec package.")
+    return backend
+
+
+def json_decoder(backend: JsonBackend = "auto", *, float_text: bool = False) -> JsonDecoder:
+    """A ``str``/``bytes`` -> object JSON decoder on ``backend``.
+
+    ``"auto"`` picks the fastest installed backend (msgspec, orjson, then the
+    stdlib). ``float_text`` keeps float literals as their source text, like
+    ``json.loads(..., parse_float=str)``, for venues whose checksums are
+    computed over the exact digits. Every backend raises a ``ValueError``
+    subclass on malformed input.
+    """
+    backend = resolve_json_backend(backend, float_text=float_text)
+    if backend == "msgspec":
+        assert msgspec is not None
+        decoder = msgspec.json.Decoder(float_hook=str if float_text else None)
+        return decoder.decode  # type: ignore[no-any-return]
+    if backend == "orjson":
+        assert orjson is not None
+        return orjson.loads  # type: ignore[no-any-return]
+    if float_text:
+        return lambda raw: json.loads(raw, parse_float=str)
+    return json.loads
+
+
+class ChannelSchemaDecoder:
+    """Typed msgspec decoding for known message shapes, generic for the rest.
+
+    ``schemas`` maps a marker that identifies a message shape (e.g.
+    ``'"channel":"l2_data"'``), looked for within the first ``marker_span``
+    characters of the frame, to the type to decode it as. Typed decoding
+    converts fields in C as it parses, e.g. numeric strings straight into
+    ``float`` with ``lax=True``. Frames without a known marker, or that turn
+    out not to match their schema, go through ``fallback``. Schemas must
+    declare every field the consumers read: msgspec drops undeclared keys.
+    """
+
+    def __init__(
+        self,
+        schemas: Mapping[str, Any],
+        fallback: JsonDecoder,
+        *,
+        lax: bool = False,
+        marker_span: int = 64,
+    ) -> None:
+        if msgspec is None:
+            raise ValueError("Typed schema decoding needs the msgspec package.")
+        self.fallback = fallback
+        self.marker_span = marker_span
+        self._decoders = [
+            (marker, marker.encode(), msgspec.json.Decoder(schema, strict=not lax))
+            for marker, schema in schemas.items()
+        ]
+
+    def __call__(self, raw: str | bytes) -> Any:
+        span = self.marker_span
+        for marker, marker_bytes, decoder in self._decoders:
+            found = (
+                raw.find(marker, 0, span)
+                if isinstance(raw, str)
+                else raw.find(marker_bytes, 0, span)
+            )
+            if found >= 0:
+                try:
+                    return decoder.decode(raw)
+                except msgspec.ValidationError:  # type: ignore[union-attr]
+                    break
+        return self.fallback(raw)
@@ -1,40 +1,62 @@
 from __future__ import annotations
 
-import time
 from collections.abc import AsyncIterator
 from typing import Any
 
 from icarus.observations import HyperliquidObservationNormalizer, Observation
+from icarus.observations.types import NumericMode
 from icarus.sockets.base import BaseSocket
+from icarus.sockets.decoding import JsonBackend
 
 
 class HyperliquidSocket(BaseSocket):
-    """Stream raw market updates from Hyperliquid."""
+    """Stream raw market updates from Hyperliquid.
+
+    Several markets can share one connection; ``subscription_coin`` then
+    lists one coin per market, in the same order.
+    """
 
     MAINNET_WS_URL = "wss://api.hyperliquid.xyz/ws"
     TESTNET_WS_URL = "wss://api.hyperliquid-testnet.xyz/ws"
 
     def __init__(
         self,
-        market: str,
+        market: str | list[str],
         *,
-        subscription_coin: str | None = None,
+        subscription_coin: str | list[str] | None = None,
         testnet: bool = False,
         candle_interval: str | None = "1m",
         include_trades: bool = True,
         include_l2_book: bool = True,
         include_bbo: bool = True,
         include_active_asset_ctx: bool = True,
+        numeric_mode: NumericMode = "decimal",
+        keep_raw_messages: bool = True,
+        json_backend: JsonBackend = "auto",
     ) -> None:
-        super().__init__(self.TESTNET_WS_URL if testnet else self.MAINNET_WS_URL)
-        self.market = market.upper()
-        self.subscription_coin = subscription_coin or self.market
+        super().__init__(
+            self.TESTNET_WS_URL if testnet else self.MAINNET_WS_URL, json_backend=json_backend
+        )
+        if isinstance(market, str):
+            market = [market]
+        if isinstance(subscription_coin, str):
+            subscription_coin = [subscription_coin]
+
+        self.markets = [item.upper() for item in market]
+        self.subscription_coins = subscription_coin or list(self.markets)
+        if len(self.subscription_coins) != len(self.markets):
+            raise ValueError("subscription_coin must give one coin per market.")
         self.candle_interval = candle_interval
         self.include_trades = include_trades
         self.include_l2_book = include_l2_book
         self.include_bbo = include_bbo
         self.include_active_asset_ctx = include_active_asset_ctx
-        self.observation_normalizer = HyperliquidObservationNormalizer()
+        self.numeric_mode = numeric_mode
+        self.keep_raw_messages = keep_raw_messages
+        self.observation_normalizer = HyperliquidObservationNormalizer(
+            numeric_mode=numeric_mode,
+            keep_raw_messages=keep_raw_messages,
+        )
 
     async def after_connect(self) -> None:
         for subscription in self.subscriptions():
@@ -48,22 +70,23 @@ class HyperliquidSocket(BaseSocket):
     def subscriptions(self) -> list[dict[str, Any]]:
         subscriptions: list[dict[str, Any]] = []
 
-        if self.include_trades:
-            subscriptions.append({"type": "trades", "coin": self.subscription_coin})
-        if self.include_l2_book:
-            subscriptions.append({"type": "l2Book", "coin": self.subscription_coin})
-        if self.include_bbo:
-            subscriptions.append({"type": "bbo", "coin": self.subscription_coin})
-        if self.include_active_asset_ctx:
-            subscriptions.append({"type": "activeAssetCtx", "coin": self.subscription_coin})
-        if self.candle_interval:
-            subscriptions.append(
-                {
-                    "type": "candle",
-                    "coin": self.subscription_coin,
-                    "interval": self.candle_interval,
-                }
-            )
+        for coin in self.subscription_coins:
+            if self.include_trades:
+                subscriptions.append({"type": "trades", "coin": coin})
+            if self.include_l2_book:
+                subscriptions.append({"type": "l2Book", "coin": coin})
+            if self.include_bbo:
+                subscriptions.append({"type": "bbo", "coin": coin})
+            if self.include_active_asset_ctx:
+                subscriptions.append({"type": "activeAssetCtx", "coin": coin})
+            if self.candle_interval:
+                subscriptions.append(
+                    {
+                        "type": "candle",
+                        "coin": coin,
+                        "interval": self.candle_interval,
+                    }
+                )
 
         return subscriptions
 
@@ -78,10 +101,5 @@ class HyperliquidSocket(BaseSocket):
             received_timestamp_ms=received_timestamp_ms,
         )
 
-    async def stream_observations(self) -> AsyncIterator[Observation]:
-        async for raw_message in self.stream_messages():
-            for observation in self.convert_message_to_observations(
-                raw_message,
-                received_timestamp_ms=time.time_ns() // 1_000_000,
-            ):
-                yield observation
+    def stream_observations(self) -> AsyncIterator[Observation]:
+        return self._normalized_observations(self.convert_message_to_observations)
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import json
-import time
 from collections.abc import AsyncIterator
-from typing import Any, cast
+from typing import Any
 
 from icarus.observations import KrakenObservationNormalizer, Observation
+from icarus.observations.types import NumericMode
 from icarus.orderbooks import KrakenOrderBookBuilder
 from icarus.sockets.base import BaseSocket
+from icarus.sockets.decoding import JsonBackend
 
 
 class KrakenSocket(BaseSocket):
@@ -24,8 +24,17 @@ class KrakenSocket(BaseSocket):
         include_book: bool = True,
         include_trades: bool = True,
         book_depth: int = 10,
+        numeric_mode: NumericMode = "decimal",
+        keep_raw_messages: bool = True,
+        json_backend: JsonBackend = "auto",
     ) -> None:
-        super().__init__(self.MAINNET_WS_URL)
+        # Book checksums are computed over the exact digits Kraken sent, which
+        # orjson cannot keep; a shared orjson choice falls back to the next best.
+        super().__init__(
+            self.MAINNET_WS_URL,
+            json_backend="auto" if json_backend == "orjson" else json_backend,
+            json_float_text=True,
+        )
         if isinstance(symbols, str):
             symbols = [symbols]
 
@@ -35,7 +44,12 @@ class KrakenSocket(BaseSocket):
         self.include_book = include_book
         self.include_trades = include_trades
         self.book_depth = book_depth
-        self.observation_normalizer = KrakenObservationNormalizer()
+        self.numeric_mode = numeric_mode
+        self.keep_raw_messages = keep_raw_messages
+        self.observation_normalizer = KrakenObservationNormalizer(
+            numeric_mode=numeric_mode,
+            keep_raw_messages=keep_raw_messages,
+        )
         self._orderbook_builders: dict[str, KrakenOrderBookBuilder] = {}
 
     async def after_connect(self) -> None:
@@ -93,9 +107,6 @@ class KrakenSocket(BaseSocket):
             received_timestamp_ms=received_timestamp_ms,
         )
 
-    def parse_message(self, raw_message: str) -> dict[str, Any]:
-        return cast(dict[str, Any], json.loads(raw_message, parse_float=str))
-
     def _pipeline_observation(self, observation: Observation) -> Observation | None:
         from icarus.observations import OrderBookDeltaObservation, OrderBookObservation
 
@@ -104,7 +115,11 @@ class KrakenSocket(BaseSocket):
 
         builder = self._orderbook_builders.get(observation.market)
         if builder is None:
-            builder = KrakenOrderBookBuilder(depth=self.book_depth)
+            builder = KrakenOrderBookBuilder(
+                depth=self.book_depth,
+                numeric_mode=self.numeric_mode,
+                keep_raw_messages=self.keep_raw_messages,
+            )
             self._orderbook_builders[observation.market] = builder
         pipeline_observation = builder.on_observation(observation)
         if pipeline_observation is None and builder.consume_resync_request():
@@ -113,12 +128,8 @@ class KrakenSocket(BaseSocket):
             )
         return pipeline_observation
 
-    async def stream_observations(self) -> AsyncIterator[Observation]:
-        async for raw_message in self.stream_messages():
-            for observation in self.convert_message_to_observations(
-                raw_message,
-                received_timestamp_ms=time.time_ns() // 1_000_000,
-            ):
-                pipeline_observation = self._pipeline_observation(observation)
-                if pipeline_observation is not None:
-                    yield pipeline_observation
+    def stream_observations(self) -> AsyncIterator[Observation]:
+        return self._normalized_observations(
+            self.convert_message_to_observations,
+            self._pipeline_observation,
+        )
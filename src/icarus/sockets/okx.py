@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import time
 from collections.abc import AsyncIterator
 from typing import Any
 
 from icarus.observations import Observation, OkxObservationNormalizer, OrderBookObservation
+from icarus.observations.types import NumericMode
 from icarus.orderbooks import OkxOrderBookBuilder
 from icarus.sockets.base import BaseSocket
+from icarus.sockets.decoding import JsonBackend
 
 
 class OkxSocket(BaseSocket):
@@ -21,8 +22,11 @@ class OkxSocket(BaseSocket):
         include_tickers: bool = True,
         include_books5: bool = True,
         include_trades: bool = True,
+        numeric_mode: NumericMode = "decimal",
+        keep_raw_messages: bool = True,
+        json_backend: JsonBackend = "auto",
     ) -> None:
-        super().__init__(self.MAINNET_WS_URL)
+        super().__init__(self.MAINNET_WS_URL, json_backend=json_backend)
         if isinstance(inst_ids, str):
             inst_ids = [inst_ids]
 
@@ -30,7 +34,12 @@ class OkxSocket(BaseSocket):
         self.include_tickers = include_tickers
         self.include_books5 = include_books5
         self.include_trades = include_trades
-        self.observation_normalizer = OkxObservationNormalizer()
+        self.numeric_mode = numeric_mode
+        self.keep_raw_messages = keep_raw_messages
+        self.observation_normalizer = OkxObservationNormalizer(
+            numeric_mode=numeric_mode,
+            keep_raw_messages=keep_raw_messages,
+        )
         self._orderbook_builders: dict[str, OkxOrderBookBuilder] = {}
 
     async def after_connect(self) -> None:
@@ -69,16 +78,12 @@ class OkxSocket(BaseSocket):
 
         builder = self._orderbook_builders.get(observation.market)
         if builder is None:
-            builder = OkxOrderBookBuilder()
+            builder = OkxOrderBookBuilder(keep_raw_messages=self.keep_raw_messages)
             self._orderbook_builders[observation.market] = builder
         return builder.on_observation(observation)
 
-    async def stream_observations(self) -> AsyncIterator[Observation]:
-        async for raw_message in self.stream_messages():
-            for observation in self.convert_message_to_observations(
-                raw_message,
-                received_timestamp_ms=time.time_ns() // 1_000_000,
-            ):
-                pipeline_observation = self._pipeline_observation(observation)
-                if pipeline_observation is not None:
-                    yield pipeline_observation
+    def stream_observations(self) -> AsyncIterator[Observation]:
+        return self._normalized_observations(
+            self.convert_message_to_observations,
+            self._pipeline_observation,
+        )
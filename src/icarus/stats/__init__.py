@@ -0,0 +1,26 @@
+"""Time-windowed rolling statistics, over whole arrays or updated per sample."""
+
+from icarus.stats.rolling import (
+    interpolate_sorted,
+    rolling_mean_std,
+    trailing_windows,
+    window_mean,
+    window_quantile,
+    window_sum,
+    window_var,
+)
+from icarus.stats.streaming import RollingMoments, RollingQuantile, RollingSum, TradeFlowTracker
+
+__all__ = [
+    "RollingMoments",
+    "RollingQuantile",
+    "RollingSum",
+    "TradeFlowTracker",
+    "interpolate_sorted",
+    "rolling_mean_std",
+    "trailing_windows",
+    "window_mean",
+    "window_quantile",
+    "window_sum",
+    "window_var",
+]
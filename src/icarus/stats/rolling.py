@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+import numpy as np
+import numpy.typing as npt
+
+type FloatArray = npt.NDArray[np.float64]
+type IntArray = npt.NDArray[np.int64]
+
+
+def trailing_windows(
+    ts: npt.ArrayLike, window: float, at: npt.ArrayLike | None = None
+) -> tuple[IntArray, IntArray]:
+    """Index bounds ``[start, stop)`` of the samples in ``[t - window, t]``.
+
+    ``ts`` must be ascending. Without ``at`` the windows end at each sample
+    (so ``stop[i] == i + 1`` and ties after ``i`` are left out); otherwise
+    they end at each query time in ``at``, ties included. Bounds from here
+    or anywhere else (say, the last 100 samples) feed the ``window_*``
+    reductions below.
+    """
+    times = np.asarray(ts)
+    if window < 0:
+        raise ValueError("window must be non-negative.")
+    if at is None:
+        start = np.searchsorted(times, times - window, side="left")
+        stop = np.arange(1, len(times) + 1)
+    else:
+        targets = np.asarray(at)
+        start = np.searchsorted(times, targets - window, side="left")
+        stop = np.searchsorted(times, targets, side="right")
+    return start.astype(np.int64), stop.astype(np.int64)
+
+
+def window_sum(values: npt.ArrayLike, start: IntArray, stop: IntArray) -> FloatArray:
+    """Sums of ``values[start:stop]`` per window; 0 for empty windows."""
+    cum = _cumsum(np.asarray(values, dtype=np.float64))
+    return cum[stop] - cum[start]
+
+
+def window_mean(values: npt.ArrayLike, start: IntArray, stop: IntArray) -> FloatArray:
+    """Means of ``values[start:stop]`` per window; NaN for empty windows."""
+    count = stop - start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, window_sum(values, start, stop) / count, np.nan)
+
+
+def window_var(
+    values: npt.ArrayLike, start: IntArray, stop: IntArray, *, ddof: int = 0
+) -> FloatArray:
+    """Variances of ``values[start:stop]`` per window; NaN where count <= ``ddof``.
+
+    From cumulative sums of the values centred on their overall mean, so
+    precision is relative to the spread of the whole series.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    x = x - x.mean() if x.size else x
+    count = stop - start
+    s1 = window_sum(x, start, stop)
+    s2 = window_sum(x * x, start, stop)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # A lone sample has no spread; cancellation would leave a residue.
+        sq_dev = np.where(count > 1, np.maximum(s2 - s1 * s1 / count, 0.0), 0.0)
+        return np.where(count > ddof, sq_dev / (count - ddof), np.nan)
+
+
+def window_quantile(values: npt.ArrayLike, start: IntArray, stop: IntArray, q: float) -> FloatArray:
+    """``q``-quantiles (linear interpolation) of ``values[start:stop]``; NaN if empty.
+
+    Windows that only move forward (both bounds non-decreasing, as trailing
+    windows do) are swept with one sorted window, so each sample is inserted
+    and removed once; other bounds fall back to a quantile per window.
+    Values must not be NaN.
+    """
+    if not 0.0 <= q <= 1.0:
+        raise ValueError("q must be in [0, 1].")
+    x = np.asarray(values, dtype=np.float64)
+    out = np.full(len(start), np.nan)
+    forward = bool(np.all(np.diff(start) >= 0) and np.all(np.diff(stop) >= 0))
+    if not forward:
+        for k, (lo, hi) in enumerate(zip(start.tolist(), stop.tolist(), strict=True)):
+            if hi > lo:
+                out[k] = np.quantile(x[lo:hi], q)
+        return out
+
+    xs = x.tolist()
+    window: list[float] = []
+    lo = hi = 0  # ``window`` holds xs[lo:hi], sorted
+    for k, (s, e) in enumerate(zip(start.tolist(), stop.tolist(), strict=True)):
+        if s >= hi:
+            window.clear()
+            lo = hi = s
+        while hi < e:
+            insort(window, xs[hi])
+            hi += 1
+        while lo < s:
+            del window[bisect_left(window, xs[lo])]
+            lo += 1
+        if window:
+            out[k] = interpolate_sorted(window, q)
+    return out
+
+
+def rolling_mean_std(
+    ts: npt.ArrayLike, values: npt.ArrayLike, window: float
+) -> tuple[FloatArray, FloatArray]:
+    """Mean and (population) std of each sample's trailing ``window``, itself included.
+
+    The window expands from the first sample until it spans ``window``.
+    """
+    start, stop = trailing_windows(ts, window)
+    return window_mean(values, start, stop), np.sqrt(window_var(values, start, stop))
+
+
+def _cumsum(x: FloatArray) -> FloatArray:
+    cum = np.zeros(len(x) + 1)
+    np.cumsum(x, out=cum[1:])
+    return cum
+
+
+def interpolate_sorted(ordered: list[float], q: float) -> float:
+    """The ``q`` quantile of non-empty sorted ``ordered``, interpolated as ``numpy.quantile``."""
+    pos = q * (len(ordered) - 1)
+    i = int(pos)
+    frac = pos - i
+    if frac == 0.0:
+        return ordered[i]
+    return ordered[i] + (ordered[i + 1] - ordered[i]) * frac
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+
+from icarus.stats.rolling import interpolate_sorted
+
+
+class RollingSum:
+    """Sum and count of the samples added in the trailing time ``window``.
+
+    Samples must arrive in time order. ``advance(now)`` drops those older
+    than ``now - window``; both it and ``add`` are O(1) amortised, the
+    running total being adjusted rather than re-summed. The total resets
+    to exactly zero whenever the window empties, so rounding cannot pile
+    up across quiet spells.
+    """
+
+    __slots__ = ("window", "total", "_samples")
+
+    def __init__(self, window: float) -> None:
+        if window < 0:
+            raise ValueError("window must be non-negative.")
+        self.window = window
+        self.total = 0.0
+        self._samples: deque[tuple[float, float]] = deque()
+
+    def add(self, ts: float, value: float = 1.0) -> None:
+        self._samples.append((ts, value))
+        self.total += value
+
+    def advance(self, now: float) -> None:
+        cutoff = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            self.total -= samples.popleft()[1]
+        if not samples:
+            self.total = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+
+class TradeFlowTracker:
+    """Taker buy and sell size over the trailing ``window_ms`` of one venue's trades."""
+
+    __slots__ = ("window_ms", "_buys", "_sells")
+
+    def __init__(self, window_ms: int = 1000) -> None:
+        self.window_ms = window_ms
+        self._buys = RollingSum(window_ms)
+        self._sells = RollingSum(window_ms)
+
+    def add(self, ts_ms: int, side: str, size: float) -> None:
+        if side == "buy":
+            self._buys.add(ts_ms, size)
+        elif side == "sell":
+            self._sells.add(ts_ms, size)
+
+    def snapshot(self, now_ms: int) -> tuple[float, float, float, int]:
+        """(net size, buy size, sell size, trade count) in the window ending at ``now_ms``."""
+        self._buys.advance(now_ms)
+        self._sells.advance(now_ms)
+        buy_size = self._buys.total
+        sell_size = self._sells.total
+        return buy_size - sell_size, buy_size, sell_size, self._buys.count + self._sells.count
+
+
+class RollingMoments:
+    """Mean and variance of the samples in the trailing time ``window``.
+
+    Welford updates in both directions keep ``add`` and ``advance`` O(1)
+    amortised without the cancellation of running sums of squares.
+    ``mean`` and ``variance`` (population) are NaN while the window is
+    empty.
+    """
+
+    __slots__ = ("window", "_samples", "_mean", "_m2")
+
+    def __init__(self, window: float) -> None:
+        if window < 0:
+            raise ValueError("window must be non-negative.")
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, ts: float, value: float) -> None:
+        self._samples.append((ts, value))
+        delta = value - self._mean
+        self._mean += delta / len(self._samples)
+        self._m2 += delta * (value - self._mean)
+
+    def advance(self, now: float) -> None:
+        cutoff = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            value = samples.popleft()[1]
+            if not samples:
+                self._mean = self._m2 = 0.0
+                break
+            delta = value - self._mean
+            self._mean -= delta / len(samples)
+            self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self._samples else math.nan
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / len(self._samples) if self._samples else math.nan
+
+
+class RollingQuantile:
+    """Quantiles of the samples in the trailing time ``window``.
+
+    Keeps the window both in arrival order and sorted: an update is a
+    binary search plus a list shift, so cost grows with the window's sample
+    count (cheap into the tens of thousands). Values must not be NaN.
+    """
+
+    __slots__ = ("window", "_samples", "_sorted")
+
+    def __init__(self, window: float) -> None:
+        if window < 0:
+            raise ValueError("window must be non-negative.")
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._sorted: list[float] = []
+
+    def add(self, ts: float, value: float) -> None:
+        self._samples.append((ts, value))
+        insort(self._sorted, value)
+
+    def advance(self, now: float) -> None:
+        cutoff = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] < cutoff:
+            value = samples.popleft()[1]
+            del self._sorted[bisect_left(self._sorted, value)]
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> float:
+        """Linearly interpolated, as ``numpy.quantile``; NaN while empty."""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be in [0, 1].")
+        return interpolate_sorted(self._sorted, q) if self._sorted else math.nan
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Any
+
+from icarus.observations.types import Number
 
 from .types import CombinedFairValueEstimate, VenueFairValueState
 from .weighting import cap_and_renormalize
@@ -24,11 +27,11 @@ class CrossVenueCombinerConfig:
 @dataclass(frozen=True, slots=True)
 class VenueCombinerDiagnostic:
     exchange: str
-    base_variance: Decimal
-    effective_variance: Decimal
-    raw_weight: Decimal
-    capped_weight: Decimal
-    fair_value: Decimal
+    base_variance: Number
+    effective_variance: Number
+    raw_weight: Number
+    capped_weight: Number
+    fair_value: Number
     age_ms: int
 
 
@@ -65,7 +68,10 @@ class CrossVenueFairValueCombiner:
         return self.combine(now_ms=now_ms if now_ms is not None else state.timestamp_ms)
 
     def combine(self, *, now_ms: int) -> CombinedFairValueEstimate | None:
-        live_states: list[tuple[VenueFairValueState, Decimal, int]] = []
+        # Venue states are either all Decimal or all float (see NumericMode).
+        # Config knobs are converted to match so the arithmetic never mixes types.
+        is_decimal = all(isinstance(state.fair_value, Decimal) for state in self._states.values())
+        live_states: list[tuple[VenueFairValueState, Any, int]] = []
 
         for state in self._states.values():
             age_ms = now_ms - state.timestamp_ms
@@ -84,15 +90,16 @@ class CrossVenueFairValueCombiner:
             self._last_diagnostics = CombinerDiagnostics(timestamp_ms=now_ms, venues=())
             return None
 
-        raw_weights: list[Decimal] = []
-        fair_values: list[Decimal] = []
-        variances: list[Decimal] = []
+        one: Any = Decimal("1") if is_decimal else 1.0
+        raw_weights: list[Any] = []
+        fair_values: list[Any] = []
+        variances: list[Any] = []
         exchanges: list[str] = []
         ages_ms: list[int] = []
-        base_variances: list[Decimal] = []
+        base_variances: list[Number] = []
 
         for state, effective_variance, age_ms in live_states:
-            weight = Decimal("1") / effective_variance
+            weight = one / effective_variance
             raw_weights.append(weight)
             fair_values.append(state.fair_value)
             variances.append(effective_variance)
@@ -108,7 +115,7 @@ class CrossVenueFairValueCombiner:
         normalized_raw = [w / weight_sum for w in raw_weights]
         capped_weights = cap_and_renormalize(
             normalized_raw,
-            max_weight=self.config.max_venue_weight,
+            max_weight=self._config_value(self.config.max_venue_weight, is_decimal),
         )
 
         combined_fv = sum(
@@ -125,11 +132,13 @@ class CrossVenueFairValueCombiner:
         )
 
         combined_variance = intrinsic_variance + (
-            self.config.disagreement_scale * disagreement_variance
+            self._config_value(self.config.disagreement_scale, is_decimal)
+            * disagreement_variance
         )
 
-        if combined_variance < self.config.variance_floor:
-            combined_variance = self.config.variance_floor
+        variance_floor = self._config_value(self.config.variance_floor, is_decimal)
+        if combined_variance < variance_floor:
+            combined_variance = variance_floor
 
         self._last_diagnostics = CombinerDiagnostics(
             timestamp_ms=now_ms,
@@ -155,7 +164,14 @@ class CrossVenueFairValueCombiner:
             contributing_exchanges=tuple(sorted(exchanges)),
         )
 
-    def _effective_variance(self, variance: Decimal, age_ms: int) -> Decimal:
+    def _effective_variance(self, variance: Number, age_ms: int) -> Any:
+        if isinstance(variance, float):
+            if variance <= 0:
+                return 0.0
+            return variance * (
+                1.0 + float(self.config.age_penalty_per_second) * (age_ms / 1000.0)
+            )
+
         if variance <= 0:
             return Decimal("0")
 
@@ -164,3 +180,7 @@ class CrossVenueFairValueCombiner:
             self.config.age_penalty_per_second * age_seconds
         )
         return variance * age_multiplier
+
+    @staticmethod
+    def _config_value(value: Decimal, is_decimal: bool) -> Any:
+        return value if is_decimal else float(value)
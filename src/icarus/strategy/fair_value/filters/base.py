@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import abc
-from decimal import Decimal
+
+from icarus.observations.types import Number
 
 
 class BaseFairValueFilter(abc.ABC):
@@ -9,8 +10,8 @@ class BaseFairValueFilter(abc.ABC):
     def update(
         self,
         *,
-        measurement: Decimal,
-        measurement_variance: Decimal,
+        measurement: Number,
+        measurement_variance: Number,
         timestamp_ms: int,
-    ) -> tuple[Decimal, Decimal]:
+    ) -> tuple[Number, Number]:
         raise NotImplementedError
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+from icarus.observations.types import Number
+
 from .base import BaseFairValueFilter
 
 
@@ -10,17 +12,21 @@ class EMAFairValueFilter(BaseFairValueFilter):
         if not (Decimal("0") < alpha <= Decimal("1")):
             raise ValueError("alpha must be in (0, 1].")
         self.alpha = alpha
-        self._value: Decimal | None = None
+        self._alpha_float = float(alpha)
+        self._value: Number | None = None
 
     def update(
         self,
         *,
-        measurement: Decimal,
-        measurement_variance: Decimal,
+        measurement: Number,
+        measurement_variance: Number,
         timestamp_ms: int,
-    ) -> tuple[Decimal, Decimal]:
+    ) -> tuple[Number, Number]:
         if self._value is None:
             self._value = measurement
+        elif isinstance(measurement, float):
+            alpha = self._alpha_float
+            self._value = alpha * measurement + (1.0 - alpha) * float(self._value)
         else:
-            self._value = self.alpha * measurement + (Decimal("1") - self.alpha) * self._value
+            self._value = self.alpha * measurement + (Decimal("1") - self.alpha) * self._value  # type: ignore[operator]
         return self._value, measurement_variance
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+import numpy as np
+import numpy.typing as npt
+
 from ..weighting import cap_and_renormalize
 
+type FloatArray = npt.NDArray[np.float64]
+type BoolArray = npt.NDArray[np.bool_]
+
 
 @dataclass
 class VenueObservation:
@@ -113,6 +120,24 @@ class KalmanFilterConfig:
     reliability_enabled: bool = True
 
 
+@dataclass(slots=True)
+class _Fusion:
+    """Per-venue fuse inputs and weights for the latest update, kept so the
+    result and its diagnostics can be built on request."""
+
+    slots: list[int]
+    names: list[str]
+    fair_values: list[float]
+    base_variances: list[float]
+    reliability_scores: list[float]
+    multipliers: list[float]
+    effective_variances: list[float]
+    raw_weights: list[float]
+    capped_weights: list[float]
+    raw_fused_price: float
+    measurement_variance: float
+
+
 class AdaptiveEfficientPriceKalman:
     """
     1D Kalman filter on a fused cross-venue fair value.
@@ -132,6 +157,11 @@ class AdaptiveEfficientPriceKalman:
     score built from its history of *pre-update* innovations against the
     latent state (not the post-update composite — see ``_update_reliability``
     for the non-circularity rationale).
+
+    ``update`` takes observation objects and returns a ``FilterResult`` with
+    per-venue diagnostics. ``update_arrays`` is the lean path underneath it:
+    per-venue NumPy inputs in a fixed venue order, weights written into a
+    caller-owned array, and no result objects unless ``last_result`` asks.
     """
 
     def __init__(
@@ -152,71 +182,187 @@ class AdaptiveEfficientPriceKalman:
         # expectation of a properly-standardized z^2 is 1) so new or
         # returning venues do not start over- or under-penalized.
         self._venue_reliability: Dict[str, float] = {}
+        # What the latest accepted update fused, and its gain, process
+        # variance and prior (None on the bootstrap update).
+        self._last_fusion: _Fusion | None = None
+        self._last_step: tuple[float, float, float | None, float] = (1.0, 0.0, None, 0.0)
 
     def update(
         self,
         timestamp_s: float,
         observations: List[VenueObservation],
     ) -> Optional[FilterResult]:
-        live = self._select_live_observations(observations)
-        if not live:
+        updated = self._update_venues(
+            timestamp_s,
+            [obs.name for obs in observations],
+            [obs.fair_value for obs in observations],
+            [obs.local_variance for obs in observations],
+            [obs.age_ms for obs in observations],
+            [obs.valid for obs in observations],
+        )
+        if not updated:
             return None
+        return self.last_result()
+
+    def update_arrays(
+        self,
+        timestamp_s: float,
+        venues: Sequence[str],
+        fair_values: FloatArray,
+        local_variances: FloatArray,
+        *,
+        ages_ms: FloatArray | None = None,
+        valid: BoolArray | None = None,
+        weights_out: FloatArray | None = None,
+    ) -> float | None:
+        """Update from per-venue arrays in ``venues`` order; returns the filtered price.
+
+        A venue is used when it is ``valid``, its fair value and variance are
+        finite (NaN marks a missing venue) and it is no older than
+        ``stale_cutoff_ms``. Each venue's capped weight, zero if unused, goes
+        into ``weights_out``. Returns None, leaving ``weights_out`` untouched,
+        when no venue is usable.
+        """
+        n = len(venues)
+        if len(fair_values) != n or len(local_variances) != n:
+            raise ValueError("fair_values and local_variances must match venues.")
+        updated = self._update_venues(
+            timestamp_s,
+            venues,
+            fair_values.tolist(),
+            local_variances.tolist(),
+            ages_ms.tolist() if ages_ms is not None else [0.0] * n,
+            valid.tolist() if valid is not None else None,
+        )
+        if not updated:
+            return None
+        assert self.x is not None
+        assert self._last_fusion is not None
+        if weights_out is not None:
+            weights = [0.0] * n
+            fusion = self._last_fusion
+            for slot, weight in zip(fusion.slots, fusion.capped_weights, strict=True):
+                weights[slot] = weight
+            weights_out[:] = weights
+        return self.x
+
+    def last_result(self) -> Optional[FilterResult]:
+        """The full result, with per-venue diagnostics, of the latest update."""
+        fusion = self._last_fusion
+        if fusion is None or self.x is None or self.last_timestamp_s is None:
+            return None
+        kalman_gain, process_variance, x_prior, p_prior = self._last_step
+
+        # Innovation is against the pre-update prior (zero on bootstrap, when
+        # there is no prior).
+        diagnostics: List[VenueFilterDiagnostic] = []
+        for i, name in enumerate(fusion.names):
+            if x_prior is None:
+                innovation = 0.0
+                z2 = 0.0
+            else:
+                innovation = fusion.fair_values[i] - x_prior
+                denom = max(fusion.base_variances[i] + p_prior, 1e-12)
+                z2 = min(
+                    (innovation * innovation) / denom,
+                    self.config.reliability_z2_clip,
+                )
+            diagnostics.append(
+                VenueFilterDiagnostic(
+                    name=name,
+                    base_variance=fusion.base_variances[i],
+                    reliability_score=fusion.reliability_scores[i],
+                    reliability_multiplier=fusion.multipliers[i],
+                    effective_variance=fusion.effective_variances[i],
+                    raw_weight=fusion.raw_weights[i],
+                    capped_weight=fusion.capped_weights[i],
+                    innovation=innovation,
+                    standardized_z2=z2,
+                )
+            )
+
+        weights = dict(zip(fusion.names, fusion.capped_weights, strict=True))
+        return FilterResult(
+            timestamp_s=self.last_timestamp_s,
+            filtered_price=self.x,
+            raw_fused_price=fusion.raw_fused_price,
+            kalman_gain=kalman_gain,
+            process_variance_q=process_variance,
+            measurement_variance_r=fusion.measurement_variance,
+            posterior_variance_p=self.p,
+            weights=weights,
+            used_venues=list(weights.keys()),
+            venue_diagnostics=diagnostics,
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _update_venues(
+        self,
+        timestamp_s: float,
+        all_names: Sequence[str],
+        all_fair_values: Sequence[float],
+        all_local_variances: Sequence[float],
+        all_ages_ms: Sequence[float],
+        all_valid: Sequence[bool] | None,
+    ) -> bool:
+        """Select live venues from parallel per-venue inputs and run one update."""
+        stale_cutoff_ms = self.config.stale_cutoff_ms
+        slots: list[int] = []
+        for i, fair_value in enumerate(all_fair_values):
+            if all_valid is not None and not all_valid[i]:
+                continue
+            if not math.isfinite(fair_value):
+                continue
+            if not math.isfinite(all_local_variances[i]):
+                continue
+            if all_ages_ms[i] > stale_cutoff_ms:
+                continue
+            slots.append(i)
+        if not slots:
+            return False
+        names = [all_names[i] for i in slots]
+        fair_values = [all_fair_values[i] for i in slots]
+        base_vars = [
+            self._effective_local_variance(all_local_variances[i], all_ages_ms[i]) for i in slots
+        ]
 
         # Step 1: predict (so x_prior and p_prior exist for innovations)
         if self.x is None:
             # First ever observation — fuse with zero reliability history
             # and seed the state. No innovation update possible yet.
-            raw_fused_price, r_t, weights, diagnostics = self._fuse_observations(
-                live,
-                x_prior=None,
-                p_prior=self.config.initial_variance,
-            )
-            self.x = raw_fused_price
+            fusion = self._fuse_observations(slots, names, fair_values, base_vars)
+            self.x = fusion.raw_fused_price
             self.p = self.config.initial_variance
             self.last_timestamp_s = timestamp_s
-            self.last_raw_fused_price = raw_fused_price
-            return FilterResult(
-                timestamp_s=timestamp_s,
-                filtered_price=self.x,
-                raw_fused_price=raw_fused_price,
-                kalman_gain=1.0,
-                process_variance_q=0.0,
-                measurement_variance_r=r_t,
-                posterior_variance_p=self.p,
-                weights=weights,
-                used_venues=list(weights.keys()),
-                venue_diagnostics=diagnostics,
-            )
+            self.last_raw_fused_price = fusion.raw_fused_price
+            self._last_fusion = fusion
+            self._last_step = (1.0, 0.0, None, self.config.initial_variance)
+            return True
 
         dt = 0.0
         if self.last_timestamp_s is not None:
             dt = max(timestamp_s - self.last_timestamp_s, 1e-3)
         x_prior = self.x
 
-        # Preview the current fused observation so the process-noise proxy
-        # can respond to actual observation moves instead of comparing the
-        # previous fused value to itself.
-        raw_fused_preview, _, _, _ = self._fuse_observations(
-            live,
-            x_prior=x_prior,
-            p_prior=self.p,
-        )
-        q_t = self._compute_process_variance(dt, raw_fused_preview)
+        # Fuse the current observations so the process-noise proxy can
+        # respond to actual observation moves instead of comparing the
+        # previous fused value to itself. The reliability scores used here
+        # are from the PREVIOUS call — they reflect how surprising each venue
+        # has been against prior x's, never including the current
+        # observation. This is what breaks the circularity. The fuse does not
+        # depend on the prior, so one pass serves both the process-noise
+        # preview and the update.
+        fusion = self._fuse_observations(slots, names, fair_values, base_vars)
+        raw_fused_price = fusion.raw_fused_price
+        r_t = fusion.measurement_variance
+        q_t = self._compute_process_variance(dt, raw_fused_price)
 
         # Predict. Under the random-walk transition, x_prior == self.x.
         p_prior = self.p + q_t
 
-        # Step 2: fuse observations using the current reliability scores.
-        # The reliability scores here are from the PREVIOUS call — they
-        # reflect how surprising each venue has been against prior x's,
-        # never including the current observation. This is what breaks
-        # the circularity.
-        raw_fused_price, r_t, weights, diagnostics = self._fuse_observations(
-            live,
-            x_prior=x_prior,
-            p_prior=p_prior,
-        )
-
         # Step 3: Kalman update using the fused observation.
         k_t = p_prior / (p_prior + r_t)
         x_post = x_prior + k_t * (raw_fused_price - x_prior)
@@ -226,54 +372,23 @@ class AdaptiveEfficientPriceKalman:
         # prior x_prior as the reference, not x_post or raw_fused_price.
         # This ensures venue j's reliability is computed against a
         # quantity independent of venue j's current observation.
-        self._update_reliability(live, x_prior=x_prior, p_prior=p_prior)
+        self._update_reliability(names, fair_values, base_vars, x_prior=x_prior, p_prior=p_prior)
 
         # Persist state
         self.x = x_post
         self.p = p_post
         self.last_timestamp_s = timestamp_s
         self.last_raw_fused_price = raw_fused_price
+        self._last_fusion = fusion
+        self._last_step = (k_t, q_t, x_prior, p_prior)
+        return True
 
-        return FilterResult(
-            timestamp_s=timestamp_s,
-            filtered_price=x_post,
-            raw_fused_price=raw_fused_price,
-            kalman_gain=k_t,
-            process_variance_q=q_t,
-            measurement_variance_r=r_t,
-            posterior_variance_p=p_post,
-            weights=weights,
-            used_venues=list(weights.keys()),
-            venue_diagnostics=diagnostics,
-        )
-
-    # ------------------------------------------------------------------
-    # Internals
-    # ------------------------------------------------------------------
-
-    def _select_live_observations(
-        self,
-        observations: List[VenueObservation],
-    ) -> List[VenueObservation]:
-        live: List[VenueObservation] = []
-        for obs in observations:
-            if not obs.valid:
-                continue
-            if not math.isfinite(obs.fair_value):
-                continue
-            if not math.isfinite(obs.local_variance):
-                continue
-            if obs.age_ms > self.config.stale_cutoff_ms:
-                continue
-            live.append(obs)
-        return live
-
-    def _effective_local_variance(self, obs: VenueObservation) -> float:
+    def _effective_local_variance(self, local_variance: float, age_ms: float) -> float:
         """Microstructure base variance, inflated only by staleness."""
         cfg = self.config
-        base_var = max(obs.local_variance, cfg.local_var_floor)
+        base_var = max(local_variance, cfg.local_var_floor)
         age_factor = 1.0 + cfg.age_variance_scale * (
-            obs.age_ms / max(cfg.stale_cutoff_ms, 1.0)
+            age_ms / max(cfg.stale_cutoff_ms, 1.0)
         ) ** 2
         return base_var * age_factor
 
@@ -291,19 +406,20 @@ class AdaptiveEfficientPriceKalman:
 
     def _fuse_observations(
         self,
-        live: List[VenueObservation],
-        *,
-        x_prior: Optional[float],
-        p_prior: float,
-    ) -> tuple[float, float, Dict[str, float], List[VenueFilterDiagnostic]]:
+        slots: list[int],
+        names: list[str],
+        fair_values: list[float],
+        base_vars: list[float],
+    ) -> _Fusion:
         """
-        Returns (z_t, R_t, weights, per-venue diagnostics).
+        Fuse the live venues into z_t with measurement variance R_t.
 
         Weights are inverse-effective-variance with a per-venue max-weight
         cap. Effective variance = base variance * reliability multiplier.
         """
-        base_vars = [self._effective_local_variance(obs) for obs in live]
-        multipliers = [self._reliability_multiplier(obs.name) for obs in live]
+        reliability = self._venue_reliability
+        scores = [reliability.get(name, 1.0) for name in names]
+        multipliers = [self._reliability_multiplier(name) for name in names]
         effective_vars = [b * m for b, m in zip(base_vars, multipliers)]
 
         inv_vars = [1.0 / v for v in effective_vars]
@@ -315,53 +431,37 @@ class AdaptiveEfficientPriceKalman:
             max_weight=self.config.max_venue_weight,
         )
 
-        z_t = sum(a * obs.fair_value for a, obs in zip(capped_weights, live))
+        z_t = sum(a * fair_value for a, fair_value in zip(capped_weights, fair_values))
 
         intrinsic_fused_var = sum(
             (a ** 2) * v for a, v in zip(capped_weights, effective_vars)
         )
         disagreement_var = sum(
-            a * ((obs.fair_value - z_t) ** 2) for a, obs in zip(capped_weights, live)
+            a * ((fair_value - z_t) ** 2) for a, fair_value in zip(capped_weights, fair_values)
         )
         r_t = max(
             self.config.r_floor,
             intrinsic_fused_var + self.config.disagreement_scale * disagreement_var,
         )
-
-        # Build per-venue diagnostic snapshot. Innovation is against the
-        # pre-update prior (or raw_fused on bootstrap when there's no prior).
-        diagnostics: List[VenueFilterDiagnostic] = []
-        for i, obs in enumerate(live):
-            if x_prior is None:
-                innovation = 0.0
-                z2 = 0.0
-            else:
-                innovation = obs.fair_value - x_prior
-                denom = max(base_vars[i] + p_prior, 1e-12)
-                z2 = min(
-                    (innovation * innovation) / denom,
-                    self.config.reliability_z2_clip,
-                )
-            diagnostics.append(
-                VenueFilterDiagnostic(
-                    name=obs.name,
-                    base_variance=base_vars[i],
-                    reliability_score=self._venue_reliability.get(obs.name, 1.0),
-                    reliability_multiplier=multipliers[i],
-                    effective_variance=effective_vars[i],
-                    raw_weight=raw_weights[i],
-                    capped_weight=capped_weights[i],
-                    innovation=innovation,
-                    standardized_z2=z2,
-                )
-            )
-
-        weights = {obs.name: a for obs, a in zip(live, capped_weights)}
-        return z_t, r_t, weights, diagnostics
+        return _Fusion(
+            slots=slots,
+            names=names,
+            fair_values=fair_values,
+            base_variances=base_vars,
+            reliability_scores=scores,
+            multipliers=multipliers,
+            effective_variances=effective_vars,
+            raw_weights=raw_weights,
+            capped_weights=capped_weights,
+            raw_fused_price=z_t,
+            measurement_variance=r_t,
+        )
 
     def _update_reliability(
         self,
-        live: List[VenueObservation],
+        names: list[str],
+        fair_values: list[float],
+        base_vars: list[float],
         *,
         x_prior: float,
         p_prior: float,
@@ -393,15 +493,14 @@ class AdaptiveEfficientPriceKalman:
             return  # no adaptation
         z2_clip = cfg.reliability_z2_clip
 
-        for obs in live:
-            base_var = self._effective_local_variance(obs)
+        for name, fair_value, base_var in zip(names, fair_values, base_vars, strict=True):
             denom = max(base_var + p_prior, 1e-12)
-            innovation = obs.fair_value - x_prior
+            innovation = fair_value - x_prior
             z2 = (innovation * innovation) / denom
             if z2 > z2_clip:
                 z2 = z2_clip
-            prev = self._venue_reliability.get(obs.name, 1.0)
-            self._venue_reliability[obs.name] = lam * prev + (1.0 - lam) * z2
+            prev = self._venue_reliability.get(name, 1.0)
+            self._venue_reliability[name] = lam * prev + (1.0 - lam) * z2
 
     def _compute_process_variance(self, dt: float, reference_price: float) -> float:
         cfg = self.config
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Dict, List, Literal, Optional
 
 import numpy as np
+import numpy.typing as npt
 
 type VenueBasisKind = Literal["spot", "perp"]
+type VenueBasisUpdateMethod = Literal["joint", "sequential"]
+type FloatArray = npt.NDArray[np.float64]
+type BoolArray = npt.NDArray[np.bool_]
 
 
 @dataclass
@@ -74,6 +79,106 @@ class VenueBasisKalmanConfig:
     local_var_floor: float = 1e-4
     innovation_var_floor: float = 1e-8
     covariance_floor: float = 1e-10
+    # "joint" solves every live venue at once with dense H/R/S matrices.
+    # "sequential" exploits the diagonal R and the 0/1 rows of H to fold venues
+    # in one scalar update at a time (float loops up to eight states, numpy
+    # past that); it gives the same posterior to rounding at about half the
+    # cost for these few-state layouts.
+    update_method: VenueBasisUpdateMethod = "sequential"
+
+
+@dataclass(frozen=True, slots=True)
+class VenueBasisLayout:
+    """Fixed venue order for ``update_arrays``.
+
+    Slot ``i`` of every input and output array belongs to ``names[i]``, a
+    venue of kind ``kinds[i]``.
+    """
+
+    names: tuple[str, ...]
+    kinds: tuple[VenueBasisKind, ...]
+
+    def __post_init__(self) -> None:
+        if len(self.names) != len(self.kinds):
+            raise ValueError("names and kinds must have the same length.")
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("venue names in a layout must be unique.")
+
+    @classmethod
+    def from_config(cls, config: VenueBasisKalmanConfig) -> VenueBasisLayout:
+        """Anchor, then ``venue_order`` spot venues, then ``perp_exchange_order``."""
+        spot = [config.anchor_exchange]
+        spot.extend(venue for venue in config.venue_order if venue != config.anchor_exchange)
+        kinds: list[VenueBasisKind] = ["spot"] * len(spot)
+        kinds.extend(["perp"] * len(config.perp_exchange_order))
+        return cls(names=(*spot, *config.perp_exchange_order), kinds=tuple(kinds))
+
+
+@dataclass(frozen=True, slots=True)
+class VenueBasisBuffers:
+    """Caller-owned per-venue outputs of ``update_arrays``, in layout order.
+
+    ``basis``/``basis_stddev`` are zero for the anchor and NaN for venues
+    without a basis state yet. ``innovation`` and ``observation_variance``
+    are NaN for venues that were not live in the update.
+    """
+
+    basis: FloatArray
+    basis_stddev: FloatArray
+    innovation: FloatArray
+    observation_variance: FloatArray
+
+    @classmethod
+    def allocate(cls, layout: VenueBasisLayout) -> VenueBasisBuffers:
+        n = len(layout.names)
+        return cls(
+            basis=np.full(n, np.nan),
+            basis_stddev=np.full(n, np.nan),
+            innovation=np.full(n, np.nan),
+            observation_variance=np.full(n, np.nan),
+        )
+
+
+# The accepted inputs of the latest update, in input order, kept so results
+# and diagnostics can be built on request: (input slots, names, fair values,
+# observation variances, predicted fair values, innovations).
+type _LastUpdate = tuple[
+    list[int], list[str], list[float], list[float], list[float], list[float]
+]
+
+
+# Up to this many states (the common price plus seven basis states) the
+# sequential update runs as plain float loops. Past it, the O(dim^2) inner
+# loops cost more than numpy's fixed per-call overhead, so it uses numpy.
+_SCALAR_MAX_DIM = 8
+
+
+class _SequentialWorkspace:
+    """Per-layout dynamics and scratch arrays reused by every sequential update."""
+
+    __slots__ = (
+        "rho_per_sec_values",
+        "process_var_per_sec_values",
+        "rho_per_sec",
+        "process_var_per_sec",
+        "rho",
+        "process_var",
+        "ph",
+        "gain",
+        "outer",
+    )
+
+    def __init__(self, rho_per_sec: list[float], process_var_per_sec: list[float]) -> None:
+        dim = len(rho_per_sec)
+        self.rho_per_sec_values = rho_per_sec
+        self.process_var_per_sec_values = process_var_per_sec
+        self.rho_per_sec = np.array(rho_per_sec, dtype=np.float64)
+        self.process_var_per_sec = np.array(process_var_per_sec, dtype=np.float64)
+        self.rho = np.empty(dim)
+        self.process_var = np.empty(dim)
+        self.ph = np.empty(dim)
+        self.gain = np.empty(dim)
+        self.outer = np.empty((dim, dim))
 
 
 class VenueBasisKalmanFilter:
@@ -86,6 +191,12 @@ class VenueBasisKalmanFilter:
     where x_t is the common efficient price and each b_j,t is a non-anchor
     venue's persistent local basis relative to the anchor venue, whose basis is
     fixed at zero for identifiability.
+
+    ``update`` takes observation objects and returns a full result with
+    per-venue diagnostics. ``update_arrays`` is the lean path underneath it:
+    per-venue NumPy inputs in a fixed ``VenueBasisLayout``, outputs written
+    into caller-owned ``VenueBasisBuffers``, and no result objects unless
+    ``last_result`` asks for them.
     """
 
     def __init__(
@@ -103,6 +214,10 @@ class VenueBasisKalmanFilter:
         self._known_perp_venues: set[str] = set()
         self._basis_state_indices: dict[str, int] = {}
         self._basis_state_kinds: dict[str, VenueBasisKind] = {}
+        # Dynamics and scratch arrays for the sequential update, rebuilt
+        # whenever the state layout changes.
+        self._workspace: _SequentialWorkspace | None = None
+        self._last_update: _LastUpdate | None = None
         self.last_timestamp_s: float | None = None
 
         if initial_price is not None:
@@ -120,99 +235,130 @@ class VenueBasisKalmanFilter:
     def basis_state_kinds(self) -> Dict[str, VenueBasisKind]:
         return dict(self._basis_state_kinds)
 
+    @property
+    def common_price_stddev(self) -> float | None:
+        if self._covariance is None:
+            return None
+        return math.sqrt(max(float(self._covariance[0, 0]), 0.0))
+
     def update(
         self,
         timestamp_s: float,
         observations: List[VenueBasisObservation],
     ) -> Optional[VenueBasisFilterResult]:
-        live = self._select_live_observations(observations)
-        if not live:
-            return None
-        live_spot_count = sum(1 for obs in live if obs.venue_kind != "perp")
-        if live_spot_count < self.config.min_live_spot_venues:
+        updated = self._update_venues(
+            timestamp_s,
+            [obs.name for obs in observations],
+            [obs.venue_kind for obs in observations],
+            [_to_float(obs.fair_value) for obs in observations],
+            [_to_float(obs.local_variance) for obs in observations],
+            [obs.age_ms for obs in observations],
+            [obs.valid for obs in observations],
+        )
+        if not updated:
             return None
+        return self.last_result()
 
-        # The anchor requirement only pins the common price to the anchor's
-        # price space at bootstrap. Once state exists, non-anchor observations
-        # update x_t and b_j jointly through the covariance structure; a
-        # re-arriving anchor tick snaps things back via its Kalman gain.
-        is_bootstrap = self._state is None or self._covariance is None
-        if (
-            is_bootstrap
-            and self.config.require_anchor_observation
-            and not any(obs.name == self.config.anchor_exchange for obs in live)
-        ):
+    def update_arrays(
+        self,
+        timestamp_s: float,
+        layout: VenueBasisLayout,
+        fair_values: FloatArray,
+        local_variances: FloatArray,
+        out: VenueBasisBuffers,
+        *,
+        ages_ms: FloatArray | None = None,
+        valid: BoolArray | None = None,
+    ) -> float | None:
+        """Update from per-venue arrays in ``layout`` order; returns the common price.
+
+        A venue is live when it is ``valid``, its fair value and variance are
+        finite (NaN marks a missing venue) and it is no older than
+        ``stale_cutoff_ms``. Returns None, leaving ``out`` untouched, when the
+        filter declines to update.
+        """
+        n = len(layout.names)
+        if len(fair_values) != n or len(local_variances) != n:
+            raise ValueError("fair_values and local_variances must match the layout.")
+        updated = self._update_venues(
+            timestamp_s,
+            layout.names,
+            layout.kinds,
+            fair_values.tolist(),
+            local_variances.tolist(),
+            ages_ms.tolist() if ages_ms is not None else None,
+            valid.tolist() if valid is not None else None,
+        )
+        if not updated:
             return None
-
-        self._ensure_state_layout(live)
-
-        if self._state is None or self._covariance is None:
-            self._bootstrap_state(live)
-
         assert self._state is not None
         assert self._covariance is not None
-
-        dt = 0.0
-        if self.last_timestamp_s is not None:
-            dt = max(timestamp_s - self.last_timestamp_s, 1e-3)
-
-        state_prior, covariance_prior = self._predict(
-            self._state,
-            self._covariance,
-            dt,
-        )
-        measurement_model = self._build_measurement_model(live, state_prior)
-        if measurement_model is None:
+        assert self._last_update is not None
+
+        state = self._state
+        covariance = self._covariance
+        indices = self._basis_state_indices
+        anchor = self.config.anchor_exchange
+        basis = [math.nan] * n
+        basis_stddev = [math.nan] * n
+        for slot, name in enumerate(layout.names):
+            if name == anchor:
+                basis[slot] = 0.0
+                basis_stddev[slot] = 0.0
+                continue
+            idx = indices.get(name)
+            if idx is not None:
+                basis[slot] = float(state[idx])
+                basis_stddev[slot] = math.sqrt(max(float(covariance[idx, idx]), 0.0))
+        out.basis[:] = basis
+        out.basis_stddev[:] = basis_stddev
+
+        slots, _, _, variances, _, innovations = self._last_update
+        innovation_out = [math.nan] * n
+        variance_out = [math.nan] * n
+        for k, slot in enumerate(slots):
+            innovation_out[slot] = innovations[k]
+            variance_out[slot] = variances[k]
+        out.innovation[:] = innovation_out
+        out.observation_variance[:] = variance_out
+        return float(state[0])
+
+    def last_result(self) -> Optional[VenueBasisFilterResult]:
+        """The full result, with per-venue diagnostics, of the latest accepted update."""
+        if self._last_update is None or self.last_timestamp_s is None:
             return None
-
-        h_matrix, y_vector, r_matrix, diagnostics_seed = measurement_model
-        innovation = y_vector - (h_matrix @ state_prior)
-        s_matrix = (h_matrix @ covariance_prior @ h_matrix.T) + r_matrix
-        s_matrix = self._stabilize_innovation_covariance(s_matrix)
-        kalman_gain = covariance_prior @ h_matrix.T @ np.linalg.inv(s_matrix)
-
-        state_post = state_prior + (kalman_gain @ innovation)
-        identity = np.eye(len(state_prior), dtype=np.float64)
-        kh = kalman_gain @ h_matrix
-        i_minus_kh = identity - kh
-        covariance_post = (
-            (i_minus_kh @ covariance_prior @ i_minus_kh.T)
-            + (kalman_gain @ r_matrix @ kalman_gain.T)
-        )
-        covariance_post = self._stabilize_covariance(covariance_post)
-
-        self._state = state_post
-        self._covariance = covariance_post
-        self.last_timestamp_s = timestamp_s
+        assert self._state is not None
+        assert self._covariance is not None
+        _, names, fair_values, variances, predicted, innovation_values = self._last_update
+        state_post = self._state
+        covariance_post = self._covariance
 
         basis_estimates = self._basis_estimates(state_post)
         basis_stddevs = self._basis_stddevs(covariance_post)
-        observation_variances = {
-            diag.name: diag.observation_variance for diag in diagnostics_seed
-        }
-        innovations = {
-            diagnostics_seed[i].name: innovation[i] for i in range(len(diagnostics_seed))
-        }
+        observation_variances = dict(zip(names, variances, strict=True))
+        innovations = dict(zip(names, innovation_values, strict=True))
 
         diagnostics = [
             VenueBasisObservationDiagnostic(
-                name=seed.name,
-                fair_value=seed.fair_value,
-                predicted_fair_value=seed.predicted_fair_value,
-                innovation=innovations[seed.name],
-                observation_variance=seed.observation_variance,
-                basis_estimate=basis_estimates[seed.name],
-                basis_stddev=basis_stddevs[seed.name],
+                name=name,
+                fair_value=fair_value,
+                predicted_fair_value=predicted_value,
+                innovation=innovations[name],
+                observation_variance=variance,
+                basis_estimate=basis_estimates[name],
+                basis_stddev=basis_stddevs[name],
+            )
+            for name, fair_value, variance, predicted_value in zip(
+                names, fair_values, variances, predicted, strict=True
             )
-            for seed in diagnostics_seed
         ]
 
         return VenueBasisFilterResult(
-            timestamp_s=timestamp_s,
+            timestamp_s=self.last_timestamp_s,
             common_price=state_post[0],
             common_price_stddev=math.sqrt(max(float(covariance_post[0, 0]), 0.0)),
             anchor_exchange=self.config.anchor_exchange,
-            active_venues=[diag.name for diag in diagnostics],
+            active_venues=list(names),
             basis_estimates=basis_estimates,
             basis_stddevs=basis_stddevs,
             observation_variances=observation_variances,
@@ -223,6 +369,98 @@ class VenueBasisKalmanFilter:
             observation_diagnostics=diagnostics,
         )
 
+    def _update_venues(
+        self,
+        timestamp_s: float,
+        all_names: Sequence[str],
+        all_kinds: Sequence[VenueBasisKind],
+        all_fair_values: Sequence[float],
+        all_local_variances: Sequence[float],
+        all_ages_ms: Sequence[float] | None,
+        all_valid: Sequence[bool] | None,
+    ) -> bool:
+        """Select live venues from parallel per-venue inputs and run one update."""
+        config = self.config
+        stale_cutoff_ms = config.stale_cutoff_ms
+        slots: list[int] = []
+        for i, fair_value in enumerate(all_fair_values):
+            if all_valid is not None and not all_valid[i]:
+                continue
+            if not math.isfinite(fair_value):
+                continue
+            if not math.isfinite(all_local_variances[i]):
+                continue
+            if all_ages_ms is not None and all_ages_ms[i] > stale_cutoff_ms:
+                continue
+            slots.append(i)
+        if not slots:
+            return False
+
+        names = [all_names[i] for i in slots]
+        kinds = [all_kinds[i] for i in slots]
+        live_spot_count = sum(1 for kind in kinds if kind != "perp")
+        if live_spot_count < config.min_live_spot_venues:
+            return False
+
+        # The anchor requirement only pins the common price to the anchor's
+        # price space at bootstrap. Once state exists, non-anchor observations
+        # update x_t and b_j jointly through the covariance structure; a
+        # re-arriving anchor tick snaps things back via its Kalman gain.
+        is_bootstrap = self._state is None or self._covariance is None
+        if (
+            is_bootstrap
+            and config.require_anchor_observation
+            and config.anchor_exchange not in names
+        ):
+            return False
+
+        fair_values = [all_fair_values[i] for i in slots]
+        variances = [self._effective_local_variance(all_local_variances[i]) for i in slots]
+        self._ensure_state_layout(names, kinds)
+
+        if self._state is None or self._covariance is None:
+            self._bootstrap_state(names, fair_values, variances)
+
+        assert self._state is not None
+        assert self._covariance is not None
+
+        dt = 0.0
+        if self.last_timestamp_s is not None:
+            dt = max(timestamp_s - self.last_timestamp_s, 1e-3)
+
+        if config.update_method == "sequential":
+            predicted, innovations = self._sequential_update(names, fair_values, variances, dt)
+        else:
+            state_prior, covariance_prior = self._predict(
+                self._state,
+                self._covariance,
+                dt,
+            )
+            h_matrix, y_vector, r_matrix, predicted = self._build_measurement_model(
+                names, fair_values, variances, state_prior
+            )
+            innovation = y_vector - (h_matrix @ state_prior)
+            s_matrix = (h_matrix @ covariance_prior @ h_matrix.T) + r_matrix
+            s_matrix = self._stabilize_innovation_covariance(s_matrix)
+            kalman_gain = covariance_prior @ h_matrix.T @ np.linalg.inv(s_matrix)
+
+            state_post = state_prior + (kalman_gain @ innovation)
+            identity = np.eye(len(state_prior), dtype=np.float64)
+            kh = kalman_gain @ h_matrix
+            i_minus_kh = identity - kh
+            covariance_post = (
+                (i_minus_kh @ covariance_prior @ i_minus_kh.T)
+                + (kalman_gain @ r_matrix @ kalman_gain.T)
+            )
+            covariance_post = self._stabilize_covariance(covariance_post)
+
+            self._state = state_post
+            self._covariance = covariance_post
+            innovations = innovation.tolist()
+        self.last_timestamp_s = timestamp_s
+        self._last_update = (slots, names, fair_values, variances, predicted, innovations)
+        return True
+
     def _validate_config(self) -> None:
         if not self.config.anchor_exchange:
             raise ValueError("anchor_exchange must be non-empty.")
@@ -244,45 +482,23 @@ class VenueBasisKalmanFilter:
                 )
         if self.config.anchor_exchange in self.config.perp_exchange_order:
             raise ValueError("anchor_exchange cannot also be configured as a perp exchange.")
+        if self.config.update_method not in ("joint", "sequential"):
+            raise ValueError("update_method must be 'joint' or 'sequential'.")
 
-    def _select_live_observations(
-        self,
-        observations: List[VenueBasisObservation],
-    ) -> List[VenueBasisObservation]:
-        live: List[VenueBasisObservation] = []
-        for obs in observations:
-            fair_value = _to_float(obs.fair_value)
-            local_variance = _to_float(obs.local_variance)
-            if not obs.valid:
-                continue
-            if not math.isfinite(fair_value):
-                continue
-            if not math.isfinite(local_variance):
-                continue
-            if obs.age_ms > self.config.stale_cutoff_ms:
-                continue
-            live.append(
-                VenueBasisObservation(
-                    name=obs.name,
-                    fair_value=fair_value,
-                    local_variance=local_variance,
-                    age_ms=float(obs.age_ms),
-                    valid=obs.valid,
-                    venue_kind=obs.venue_kind,
-                )
-            )
-        return live
-
-    def _ensure_state_layout(self, live: List[VenueBasisObservation]) -> None:
-        seen_spot = {obs.name for obs in live if obs.venue_kind != "perp"}
-        seen_perp = {obs.name for obs in live if obs.venue_kind == "perp"}
+    def _ensure_state_layout(self, names: list[str], kinds: list[VenueBasisKind]) -> None:
         if self.config.anchor_exchange not in self._known_spot_venues:
             self._known_spot_venues.add(self.config.anchor_exchange)
-        if seen_spot.issubset(self._known_spot_venues) and seen_perp.issubset(
-            self._known_perp_venues
+        known_spot = self._known_spot_venues
+        known_perp = self._known_perp_venues
+        if all(
+            name in (known_perp if kind == "perp" else known_spot)
+            for name, kind in zip(names, kinds, strict=True)
         ):
             return
 
+        seen_spot = {name for name, kind in zip(names, kinds, strict=True) if kind != "perp"}
+        seen_perp = {name for name, kind in zip(names, kinds, strict=True) if kind == "perp"}
+
         self._known_spot_venues.update(seen_spot)
         self._known_perp_venues.update(seen_perp)
         ordered_spot = self._ordered_non_anchor_spot_venues(self._known_spot_venues)
@@ -294,6 +510,7 @@ class VenueBasisKalmanFilter:
             for exchange in ordered_basis
         }
 
+        self._workspace = None
         if self._state is None or self._covariance is None:
             self._basis_state_indices = new_indices
             self._basis_state_kinds = new_kinds
@@ -347,24 +564,25 @@ class VenueBasisKalmanFilter:
         discovered = sorted(venue for venue in venues if venue not in configured_set)
         return configured + discovered
 
-    def _bootstrap_state(self, live: List[VenueBasisObservation]) -> None:
+    def _bootstrap_state(
+        self,
+        names: list[str],
+        fair_values: list[float],
+        variances: list[float],
+    ) -> None:
         dim = 1 + len(self._basis_state_indices)
         state = np.zeros(dim, dtype=np.float64)
 
-        anchor_obs = next((obs for obs in live if obs.name == self.config.anchor_exchange), None)
-        if anchor_obs is not None:
-            state[0] = anchor_obs.fair_value
+        if self.config.anchor_exchange in names:
+            state[0] = fair_values[names.index(self.config.anchor_exchange)]
         else:
-            weights = [
-                1.0 / self._effective_local_variance(obs)
-                for obs in live
-            ]
+            weights = [1.0 / variance for variance in variances]
             total_weight = sum(weights)
             if total_weight <= 0.0:
-                state[0] = live[0].fair_value
+                state[0] = fair_values[0]
             else:
                 state[0] = sum(
-                    weight * obs.fair_value for weight, obs in zip(weights, live)
+                    weight * fair_value for weight, fair_value in zip(weights, fair_values)
                 ) / total_weight
 
         covariance = np.zeros((dim, dim), dtype=np.float64)
@@ -409,60 +627,213 @@ class VenueBasisKalmanFilter:
         covariance_prior = (transition @ covariance @ transition.T) + process_noise
         return state_prior, self._stabilize_covariance(covariance_prior)
 
+    def _sequential_update(
+        self,
+        names: list[str],
+        fair_values: list[float],
+        variances: list[float],
+        dt: float,
+    ) -> tuple[list[float], list[float]]:
+        """Predict and fold in the live venues one scalar measurement at a time.
+
+        Each venue observes ``x`` (anchor) or ``x + b_j``, with independent
+        noise, so its update only needs ``P h`` (one or two covariance
+        columns) and a scalar innovation variance. Applying them in turn gives
+        the joint posterior; predicted fair values and innovations are still
+        reported against the shared prior, as the joint update does. Layouts
+        of up to ``_SCALAR_MAX_DIM`` states run on Python floats; larger ones
+        update the state and covariance arrays in place, with scratch space
+        from the layout's ``_SequentialWorkspace``.
+        """
+        assert self._state is not None
+        assert self._covariance is not None
+        if len(self._state) <= _SCALAR_MAX_DIM:
+            return self._scalar_sequential_update(names, fair_values, variances, dt)
+        config = self.config
+        floor = config.covariance_floor
+        work = self._sequential_workspace()
+        x = self._state
+        p = self._covariance
+        # Every covariance this filter builds is C-contiguous, so this is a view.
+        diagonal = p.reshape(-1)[:: len(x) + 1]
+
+        # The transition is diagonal, so T P T' scales entry (i, j) by rho_i * rho_j.
+        rho = work.rho
+        if dt > 0.0:
+            np.power(work.rho_per_sec, dt, out=rho)
+        else:
+            rho.fill(1.0)
+        x *= rho
+        np.multiply.outer(rho, rho, out=work.outer)
+        p *= work.outer
+        np.multiply(work.process_var_per_sec, dt, out=work.process_var)
+        np.maximum(work.process_var, floor, out=work.process_var)
+        diagonal += work.process_var
+        np.maximum(diagonal, floor, out=diagonal)
+
+        indices = self._basis_state_indices
+        basis_indices = [indices.get(name) for name in names]
+        x0 = float(x[0])
+        predicted = [
+            x0 if basis_idx is None else x0 + float(x[basis_idx]) for basis_idx in basis_indices
+        ]
+        innovations = [
+            fair_value - prior for fair_value, prior in zip(fair_values, predicted, strict=True)
+        ]
+
+        innovation_floor = config.innovation_var_floor
+        ph = work.ph
+        for basis_idx, fair_value, variance in zip(
+            basis_indices, fair_values, variances, strict=True
+        ):
+            if basis_idx is None:
+                np.copyto(ph, p[:, 0])
+                s_value = float(ph[0]) + variance
+                residual = fair_value - float(x[0])
+            else:
+                np.add(p[:, 0], p[:, basis_idx], out=ph)
+                s_value = float(ph[0]) + float(ph[basis_idx]) + variance
+                residual = fair_value - float(x[0]) - float(x[basis_idx])
+            if s_value < innovation_floor:
+                s_value = innovation_floor
+            np.multiply(ph, residual / s_value, out=work.gain)
+            x += work.gain
+            np.divide(ph, s_value, out=work.gain)
+            np.multiply.outer(work.gain, ph, out=work.outer)
+            p -= work.outer
+
+        np.add(p, p.T, out=work.outer)
+        np.multiply(work.outer, 0.5, out=p)
+        np.maximum(diagonal, floor, out=diagonal)
+        return predicted, innovations
+
+    def _scalar_sequential_update(
+        self,
+        names: list[str],
+        fair_values: list[float],
+        variances: list[float],
+        dt: float,
+    ) -> tuple[list[float], list[float]]:
+        """``_sequential_update`` on Python floats, for small layouts.
+
+        The state and the row-major covariance are copied out to flat lists,
+        updated, and written back once. Every covariance step is a symmetric
+        product (``P_ij rho_i rho_j``, ``P_ij - ph_i ph_j / s``), so ``P``
+        stays exactly symmetric and needs no final symmetrization.
+        """
+        assert self._state is not None
+        assert self._covariance is not None
+        config = self.config
+        floor = config.covariance_floor
+        work = self._sequential_workspace()
+        dim = len(self._state)
+        x = self._state.tolist()
+        # Every covariance this filter builds is C-contiguous, so this is a view.
+        flat_covariance = self._covariance.reshape(-1)
+        p = flat_covariance.tolist()
+        diagonal = range(0, dim * dim, dim + 1)
+
+        if dt > 0.0:
+            rho = [rho_per_sec**dt for rho_per_sec in work.rho_per_sec_values]
+            x = [value * rho_i for value, rho_i in zip(x, rho, strict=False)]
+            p = [
+                value * scale
+                for value, scale in zip(
+                    p, [rho_i * rho_j for rho_i in rho for rho_j in rho], strict=False
+                )
+            ]
+        for idx, process_var_per_sec in zip(
+            diagonal, work.process_var_per_sec_values, strict=False
+        ):
+            process_var = process_var_per_sec * dt
+            if process_var < floor:
+                process_var = floor
+            value = p[idx] + process_var
+            p[idx] = value if value > floor else floor
+
+        indices = self._basis_state_indices
+        basis_indices = [indices.get(name) for name in names]
+        x0 = x[0]
+        predicted = [x0 if basis_idx is None else x0 + x[basis_idx] for basis_idx in basis_indices]
+        innovations = [
+            fair_value - prior for fair_value, prior in zip(fair_values, predicted, strict=True)
+        ]
+
+        innovation_floor = config.innovation_var_floor
+        for basis_idx, fair_value, variance in zip(
+            basis_indices, fair_values, variances, strict=True
+        ):
+            # P is symmetric, so row 0 (plus row j) is the P h column.
+            if basis_idx is None:
+                ph = p[:dim]
+                s_value = ph[0] + variance
+                residual = fair_value - x[0]
+            else:
+                row = basis_idx * dim
+                ph = [a + b for a, b in zip(p[:dim], p[row : row + dim], strict=False)]
+                s_value = ph[0] + ph[basis_idx] + variance
+                residual = fair_value - x[0] - x[basis_idx]
+            if s_value < innovation_floor:
+                s_value = innovation_floor
+            step = residual / s_value
+            x = [value + ph_i * step for value, ph_i in zip(x, ph, strict=False)]
+            p = [
+                value - product / s_value
+                for value, product in zip(
+                    p, [ph_i * ph_j for ph_i in ph for ph_j in ph], strict=False
+                )
+            ]
+
+        for idx in diagonal:
+            if p[idx] < floor:
+                p[idx] = floor
+        self._state[:] = x
+        flat_covariance[:] = p
+        return predicted, innovations
+
+    def _sequential_workspace(self) -> _SequentialWorkspace:
+        if self._workspace is None:
+            dim = 1 + len(self._basis_state_indices)
+            rho_per_sec = [1.0] * dim
+            process_var_per_sec = [0.0] * dim
+            process_var_per_sec[0] = self.config.common_price_process_var_per_sec
+            for exchange, idx in self._basis_state_indices.items():
+                venue_kind = self._basis_state_kinds.get(exchange, "spot")
+                rho_per_sec[idx] = self._basis_rho(exchange, venue_kind, 1.0)
+                process_var_per_sec[idx] = self._basis_process_var_per_sec(exchange, venue_kind)
+            self._workspace = _SequentialWorkspace(rho_per_sec, process_var_per_sec)
+        return self._workspace
+
     def _build_measurement_model(
         self,
-        live: List[VenueBasisObservation],
+        names: list[str],
+        fair_values: list[float],
+        variances: list[float],
         state_prior: np.ndarray,
-    ) -> tuple[
-        np.ndarray,
-        np.ndarray,
-        np.ndarray,
-        list[VenueBasisObservationDiagnostic],
-    ] | None:
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, list[float]]:
         h_rows: list[list[float]] = []
-        y_values: list[float] = []
-        r_diag: list[float] = []
-        diagnostics: list[VenueBasisObservationDiagnostic] = []
-
-        for obs in live:
+        predicted: list[float] = []
+        for name in names:
             row = [0.0] * len(state_prior)
             row[0] = 1.0
-            basis_idx = self._basis_state_indices.get(obs.name)
+            basis_idx = self._basis_state_indices.get(name)
             if basis_idx is not None:
                 row[basis_idx] = 1.0
-
-            predicted = float(np.dot(np.asarray(row, dtype=np.float64), state_prior))
-            variance = self._effective_local_variance(obs)
-
             h_rows.append(row)
-            y_values.append(obs.fair_value)
-            r_diag.append(variance)
-            diagnostics.append(
-                VenueBasisObservationDiagnostic(
-                    name=obs.name,
-                    fair_value=obs.fair_value,
-                    predicted_fair_value=predicted,
-                    innovation=obs.fair_value - predicted,
-                    observation_variance=variance,
-                    basis_estimate=0.0,
-                    basis_stddev=0.0,
-                )
-            )
+            predicted.append(float(np.dot(np.asarray(row, dtype=np.float64), state_prior)))
 
-        if not h_rows:
-            return None
         return (
             np.asarray(h_rows, dtype=np.float64),
-            np.asarray(y_values, dtype=np.float64),
-            np.diag(np.asarray(r_diag, dtype=np.float64)),
-            diagnostics,
+            np.asarray(fair_values, dtype=np.float64),
+            np.diag(np.asarray(variances, dtype=np.float64)),
+            predicted,
         )
 
-    def _effective_local_variance(self, obs: VenueBasisObservation) -> float:
+    def _effective_local_variance(self, local_variance: float) -> float:
         # local_variance is already the microstructure heuristic R_j,t, including
         # spread/depth/age effects from variance.py. Keep it as the observation
         # noise input here rather than re-applying an age penalty.
-        return max(obs.local_variance, self.config.innovation_var_floor, self.config.local_var_floor)
+        return max(local_variance, self.config.innovation_var_floor, self.config.local_var_floor)
 
     def _basis_rho(self, exchange: str, venue_kind: VenueBasisKind, dt: float) -> float:
         if venue_kind == "perp":
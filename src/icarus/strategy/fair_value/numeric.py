@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from icarus.observations.types import Number
+
+
+def decimal_or(value: Number | None, default: Decimal) -> Decimal:
+    """``value`` as a Decimal, or ``default`` when it is None.
+
+    For the Decimal-mode paths, where a float would be a mixed-mode bug
+    rather than something to convert, so it raises TypeError.
+    """
+    if value is None:
+        return default
+    if not isinstance(value, Decimal):
+        raise TypeError(f"expected Decimal in decimal numeric mode, got {type(value).__name__}")
+    return value
+
+
+def float_or(value: Number | None, default: float = 0.0) -> float:
+    """``value`` as a float, or ``default`` when it is None."""
+    return default if value is None else float(value)
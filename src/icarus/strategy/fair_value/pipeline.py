@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from icarus.measurements import (
+    ClockOffsetEstimator,
+    MarketMeasurement,
+    MarketMeasurementEngine,
+    MeasurementEngineConfig,
+)
+from icarus.observations import (
+    BBOObservation,
+    Observation,
+    OrderBookObservation,
+    TradeObservation,
+)
+from icarus.telemetry import LatencyHistogram
+
+from .combiner import CrossVenueCombinerConfig, CrossVenueFairValueCombiner
+from .estimator import RawFairValueEstimator
+from .filters.base import BaseFairValueFilter
+from .filters.kalman_1d import AdaptiveEfficientPriceKalman, KalmanFilterConfig
+from .filters.venue_basis_kalman_filter import (
+    VenueBasisBuffers,
+    VenueBasisKalmanConfig,
+    VenueBasisKalmanFilter,
+    VenueBasisKind,
+    VenueBasisLayout,
+)
+from .tiers import QUOTE_AGE_TIER_EDGES_MS
+from .types import CombinedFairValueEstimate, VenueFairValueState
+
+
+@dataclass(slots=True)
+class _VenueSlot:
+    engine: MarketMeasurementEngine
+    estimator: RawFairValueEstimator
+    fair_value_filter: BaseFairValueFilter | None
+    dirty: bool = True
+    pending_measurement: MarketMeasurement | None = None
+    measurement: MarketMeasurement | None = None
+    state: VenueFairValueState | None = None
+    computed_at_ms: int | None = None
+    valid_until_ms: int | None = None
+
+
+class VenueFairValuePipeline:
+    """Per-venue measurement -> raw estimate -> filter -> ``VenueFairValueState``.
+
+    Caches each venue's latest measurement and state. ``refresh`` rebuilds only
+    venues that received a quote since the last refresh, or whose estimate is
+    due an age-driven change (a quote-age tier edge, or a price point leaving
+    the volatility window). Every other venue is served from cache, so the
+    per-event cost no longer scales with the number of venues.
+
+    States are keyed by exchange, matching the cross-venue combiner. ``clock``
+    is handed to every venue's engine for the ``"corrected"`` timestamp basis.
+    """
+
+    def __init__(
+        self,
+        market: str,
+        *,
+        filter_factory: Callable[[], BaseFairValueFilter | None] | None = None,
+        engine_config: MeasurementEngineConfig | None = None,
+        clock: ClockOffsetEstimator | None = None,
+    ) -> None:
+        self.market = market
+        self.filter_factory = filter_factory
+        self.engine_config = engine_config
+        self.clock = clock
+        self._slots: dict[tuple[str, str], _VenueSlot] = {}
+
+    def on_observation(self, observation: Observation) -> None:
+        key = (observation.exchange, observation.market)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = _VenueSlot(
+                engine=MarketMeasurementEngine(
+                    exchange=observation.exchange,
+                    market=observation.market,
+                    config=self.engine_config,
+                    clock=self.clock,
+                ),
+                estimator=RawFairValueEstimator(),
+                fair_value_filter=self.filter_factory() if self.filter_factory else None,
+            )
+            self._slots[key] = slot
+
+        measurement = slot.engine.on_observation(observation)
+        if isinstance(observation, BBOObservation | OrderBookObservation):
+            slot.dirty = True
+            slot.pending_measurement = measurement
+
+    def refresh(self, now_ms: int) -> dict[str, VenueFairValueState]:
+        """Bring every venue up to ``now_ms`` and return the live states by exchange."""
+        states: dict[str, VenueFairValueState] = {}
+        for slot in self._slots.values():
+            if self._is_stale(slot, now_ms):
+                self._recompute(slot, now_ms)
+            if slot.state is not None:
+                states[slot.engine.exchange] = slot.state
+        return states
+
+    def measurements(self) -> dict[str, MarketMeasurement]:
+        """Latest measurement of each venue that currently has a state, by exchange.
+
+        Quote-derived fields are current as of the last ``refresh``; the
+        ``timestamp_ms``/``quote_age_ms`` are those of the last recompute.
+        """
+        return {
+            slot.engine.exchange: slot.measurement
+            for slot in self._slots.values()
+            if slot.state is not None and slot.measurement is not None
+        }
+
+    def _is_stale(self, slot: _VenueSlot, now_ms: int) -> bool:
+        if slot.dirty or slot.computed_at_ms is None or now_ms < slot.computed_at_ms:
+            return True
+        return slot.valid_until_ms is not None and now_ms >= slot.valid_until_ms
+
+    def _recompute(self, slot: _VenueSlot, now_ms: int) -> None:
+        pending = slot.pending_measurement
+        if pending is not None and pending.timestamp_ms == now_ms:
+            measurement: MarketMeasurement | None = pending
+        else:
+            measurement = slot.engine.current_measurement(now_ms)
+        slot.dirty = False
+        slot.pending_measurement = None
+        slot.computed_at_ms = now_ms
+        slot.measurement = measurement
+        slot.state = None
+        slot.valid_until_ms = None
+        if measurement is None:
+            return
+
+        slot.valid_until_ms = self._next_change_ms(slot.engine, measurement, now_ms)
+        raw_estimate = slot.estimator.estimate(measurement)
+        if raw_estimate.raw_fair_value is None or raw_estimate.measurement_variance is None:
+            return
+
+        if slot.fair_value_filter is None:
+            fair_value = raw_estimate.raw_fair_value
+            variance = raw_estimate.measurement_variance
+        else:
+            fair_value, variance = slot.fair_value_filter.update(
+                measurement=raw_estimate.raw_fair_value,
+                measurement_variance=raw_estimate.measurement_variance,
+                timestamp_ms=raw_estimate.timestamp_ms,
+            )
+
+        slot.state = VenueFairValueState(
+            exchange=slot.engine.exchange,
+            market=self.market,
+            timestamp_ms=(
+                raw_estimate.timestamp_ms - measurement.quote_age_ms
+                if measurement.quote_age_ms is not None
+                else raw_estimate.timestamp_ms
+            ),
+            fair_value=fair_value,
+            variance=variance,
+        )
+
+    @staticmethod
+    def _next_change_ms(
+        engine: MarketMeasurementEngine,
+        measurement: MarketMeasurement,
+        now_ms: int,
+    ) -> int | None:
+        candidates: list[int] = []
+        window_expiry_ms = engine.next_window_expiry_ms()
+        if window_expiry_ms is not None:
+            candidates.append(window_expiry_ms)
+        if measurement.quote_age_ms is not None:
+            quote_ms = now_ms - measurement.quote_age_ms
+            candidates.extend(
+                quote_ms + edge_ms + 1
+                for edge_ms in QUOTE_AGE_TIER_EDGES_MS
+                if quote_ms + edge_ms + 1 > now_ms
+            )
+        return min(candidates) if candidates else None
+
+
+@dataclass(frozen=True, slots=True)
+class KalmanFilterSnapshot:
+    """What the 1-D Kalman filter produced on one update."""
+
+    filtered_price: float
+    raw_fused_price: float
+    used_venues: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class BasisFilterSnapshot:
+    """The venue-basis filter's estimates after one accepted update.
+
+    ``basis_estimates``/``basis_stddevs`` cover the anchor (at zero) and every
+    venue with a basis state; ``active_venues`` are those observed live.
+    """
+
+    common_price: float
+    common_price_stddev: float
+    active_venues: tuple[str, ...]
+    basis_estimates: dict[str, float]
+    basis_stddevs: dict[str, float]
+
+
+@dataclass(frozen=True, slots=True)
+class AssetFairValueStep:
+    """Every stage's output after one quote event.
+
+    ``composite`` and ``kalman`` fuse the spot venues only. ``basis`` is this
+    event's basis filter snapshot, ``None`` when the filter declined to update
+    (for example, no live anchor yet); ``last_basis`` carries the most recent
+    one forward.
+    """
+
+    timestamp_ms: int
+    observation: Observation
+    venue_states: dict[str, VenueFairValueState]
+    composite: CombinedFairValueEstimate | None
+    kalman: KalmanFilterSnapshot | None
+    basis: BasisFilterSnapshot | None
+    last_basis: BasisFilterSnapshot | None
+
+
+class AssetFairValuePipeline:
+    """One asset's full fair-value stack, stepped once per quote event.
+
+    ``step`` runs the ``VenueFairValuePipeline`` refresh, then the
+    cross-venue combiner, the 1-D Kalman filter and the venue-basis filter.
+    The live capture and ``icarus.replay`` both drive this class, so a replay
+    reproduces what the capture computed. Trades don't step it.
+
+    Both Kalman filters run on their ``update_arrays`` paths. Venues get a
+    fixed slot in first-seen order, and the input arrays and basis buffers
+    are reallocated only when a new venue appears. For per-venue
+    diagnostics, call the filters' ``last_result`` after a step.
+
+    With ``stage_latency`` set to four histograms, the measure, combine,
+    kalman and basis stages are timed into them, in that order.
+    """
+
+    def __init__(
+        self,
+        market: str,
+        *,
+        basis_config: VenueBasisKalmanConfig,
+        kalman_config: KalmanFilterConfig | None = None,
+        combiner_config: CrossVenueCombinerConfig | None = None,
+        filter_factory: Callable[[], BaseFairValueFilter | None] | None = None,
+        engine_config: MeasurementEngineConfig | None = None,
+        clock: ClockOffsetEstimator | None = None,
+        stage_latency: Sequence[LatencyHistogram] | None = None,
+    ) -> None:
+        if stage_latency is not None and len(stage_latency) != 4:
+            raise ValueError("stage_latency needs one histogram per stage (4).")
+        self.market = market
+        self.venue_pipeline = VenueFairValuePipeline(
+            market,
+            filter_factory=filter_factory,
+            engine_config=engine_config,
+            clock=clock,
+        )
+        self.combiner = CrossVenueFairValueCombiner(market, config=combiner_config)
+        self.kalman = AdaptiveEfficientPriceKalman(config=kalman_config)
+        self.basis_filter = VenueBasisKalmanFilter(config=basis_config)
+        self.last_basis: BasisFilterSnapshot | None = None
+        self.stage_latency = stage_latency
+        self._set_layout(())
+
+    def step(self, observation: Observation, now_ms: int) -> AssetFairValueStep | None:
+        """Feed one quote and update every stage at ``now_ms``.
+
+        Returns None for trades and while no spot venue has a state.
+        """
+        if isinstance(observation, TradeObservation):
+            return None
+        stages = self.stage_latency
+        started_ns = time.perf_counter_ns() if stages is not None else 0
+        venue_pipeline = self.venue_pipeline
+        venue_pipeline.on_observation(observation)
+        venue_states = venue_pipeline.refresh(now_ms)
+        if stages is not None:
+            _lap(stages[0], started_ns)
+
+        if not self._slot_of.keys() >= venue_states.keys():
+            new_venues = [exchange for exchange in venue_states if exchange not in self._slot_of]
+            self._set_layout((*self.layout.names, *new_venues))
+        n = len(self.layout.names)
+        fair_values = [math.nan] * n
+        variances = [math.nan] * n
+        ages_ms = [0.0] * n
+        spot_states = []
+        for exchange, state in venue_states.items():
+            slot = self._slot_of[exchange]
+            fair_values[slot] = float(state.fair_value)
+            variances[slot] = float(state.variance)
+            ages_ms[slot] = float(max(now_ms - state.timestamp_ms, 0))
+            if not self._is_perp_slot[slot]:
+                spot_states.append(state)
+        if not spot_states:
+            return None
+
+        if stages is not None:
+            started_ns = time.perf_counter_ns()
+        for state in spot_states:
+            self.combiner.update(state, now_ms=now_ms)
+        composite = self.combiner.combine(now_ms=now_ms)
+        if stages is not None:
+            started_ns = _lap(stages[1], started_ns)
+
+        timestamp_s = now_ms / 1000.0
+        spot_slots = self._spot_slots
+        self._spot_fair_values[:] = [fair_values[i] for i in spot_slots]
+        self._spot_variances[:] = [variances[i] for i in spot_slots]
+        self._spot_ages_ms[:] = [ages_ms[i] for i in spot_slots]
+        filtered_price = self.kalman.update_arrays(
+            timestamp_s,
+            self._spot_venues,
+            self._spot_fair_values,
+            self._spot_variances,
+            ages_ms=self._spot_ages_ms,
+            weights_out=self._kalman_weights,
+        )
+        kalman = None
+        if filtered_price is not None:
+            raw_fused_price = self.kalman.last_raw_fused_price
+            assert raw_fused_price is not None
+            kalman = KalmanFilterSnapshot(
+                filtered_price=filtered_price,
+                raw_fused_price=raw_fused_price,
+                used_venues=tuple(
+                    venue
+                    for venue, weight in zip(
+                        self._spot_venues, self._kalman_weights.tolist(), strict=True
+                    )
+                    if weight > 0.0
+                ),
+            )
+        if stages is not None:
+            started_ns = _lap(stages[2], started_ns)
+
+        self._fair_values[:] = fair_values
+        self._variances[:] = variances
+        self._ages_ms[:] = ages_ms
+        common_price = self.basis_filter.update_arrays(
+            timestamp_s,
+            self.layout,
+            self._fair_values,
+            self._variances,
+            self._basis_out,
+            ages_ms=self._ages_ms,
+        )
+        basis = None
+        if common_price is not None:
+            basis = self._basis_snapshot(common_price)
+            self.last_basis = basis
+        if stages is not None:
+            _lap(stages[3], started_ns)
+        return AssetFairValueStep(
+            timestamp_ms=now_ms,
+            observation=observation,
+            venue_states=venue_states,
+            composite=composite,
+            kalman=kalman,
+            basis=basis,
+            last_basis=self.last_basis,
+        )
+
+    def _set_layout(self, names: Sequence[str]) -> None:
+        kinds: tuple[VenueBasisKind, ...] = tuple(
+            "perp" if _is_perp(name) else "spot" for name in names
+        )
+        self.layout = VenueBasisLayout(names=tuple(names), kinds=kinds)
+        self._slot_of = {name: slot for slot, name in enumerate(names)}
+        self._is_perp_slot = [kind == "perp" for kind in kinds]
+        self._spot_slots = [slot for slot, kind in enumerate(kinds) if kind == "spot"]
+        self._spot_venues = [names[slot] for slot in self._spot_slots]
+        self._fair_values = np.full(len(names), np.nan)
+        self._variances = np.full(len(names), np.nan)
+        self._ages_ms = np.zeros(len(names))
+        self._basis_out = VenueBasisBuffers.allocate(self.layout)
+        self._spot_fair_values = np.full(len(self._spot_slots), np.nan)
+        self._spot_variances = np.full(len(self._spot_slots), np.nan)
+        self._spot_ages_ms = np.zeros(len(self._spot_slots))
+        self._kalman_weights = np.zeros(len(self._spot_slots))
+
+    def _basis_snapshot(self, common_price: float) -> BasisFilterSnapshot:
+        out = self._basis_out
+        names = self.layout.names
+        anchor = self.basis_filter.config.anchor_exchange
+        estimates = {anchor: 0.0}
+        stddevs = {anchor: 0.0}
+        for name, estimate, stddev in zip(
+            names, out.basis.tolist(), out.basis_stddev.tolist(), strict=True
+        ):
+            if not math.isnan(estimate):
+                estimates[name] = estimate
+                stddevs[name] = stddev
+        common_price_stddev = self.basis_filter.common_price_stddev
+        assert common_price_stddev is not None
+        return BasisFilterSnapshot(
+            common_price=common_price,
+            common_price_stddev=common_price_stddev,
+            active_venues=tuple(
+                name
+                for name, innovation in zip(names, out.innovation.tolist(), strict=True)
+                if not math.isnan(innovation)
+            ),
+            basis_estimates=estimates,
+            basis_stddevs=stddevs,
+        )
+
+
+def _is_perp(exchange: str) -> bool:
+    return exchange.endswith("_perp")
+
+
+def _lap(histogram: LatencyHistogram, started_ns: int) -> int:
+    now_ns = time.perf_counter_ns()
+    histogram.record(now_ns - started_ns)
+    return now_ns
@@ -1,8 +1,14 @@
 from __future__ import annotations
 # ruff: noqa: I001
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
 from decimal import Decimal
 
+from icarus.observations.types import Number
+
+from .numeric import decimal_or, float_or
+from .tiers import QUOTE_AGE_TIER_EDGES_MS, Tiers
 from .types import FairValueFeatures
 
 
@@ -10,8 +16,38 @@ ZERO = Decimal("0")
 ONE = Decimal("1")
 MAX_MICRO_ALPHA = Decimal("1")
 
+# Micro-alpha gates, shared by both numeric modes. Spread (bps) and quote age
+# (ms) tiers are inclusive upper bounds; depth tiers are exclusive, after an
+# empty or negative book takes ``MICRO_ALPHA_EMPTY_BOOK_FACTOR``.
+MICRO_ALPHA_SPREAD_TIERS = (("1", "2", "5"), ("1", "0.6", "0.25", "0"))
+MICRO_ALPHA_AGE_TIERS = (QUOTE_AGE_TIER_EDGES_MS, ("1", "0.7", "0.4", "0"))
+MICRO_ALPHA_DEPTH_TIERS = (("1", "5"), ("0.6", "0.8", "1"))
+MICRO_ALPHA_EMPTY_BOOK_FACTOR = "0.5"
+
+
+class _MicroAlphaTiers[N: (Decimal, float)]:
+    __slots__ = ("spread", "age", "depth", "empty_book")
+
+    spread: Tiers[N]
+    age: Tiers[N]
+    depth: Tiers[N]
+    empty_book: N
+
+    def __init__(self, number: Callable[[str], N]) -> None:
+        self.spread = Tiers.of(number, *MICRO_ALPHA_SPREAD_TIERS)
+        self.age = Tiers.of(number, *MICRO_ALPHA_AGE_TIERS)
+        self.depth = Tiers.of(number, *MICRO_ALPHA_DEPTH_TIERS, inclusive=False)
+        self.empty_book = number(MICRO_ALPHA_EMPTY_BOOK_FACTOR)
+
+
+_DECIMAL_TIERS = _MicroAlphaTiers(Decimal)
+_FLOAT_TIERS = _MicroAlphaTiers(float)
+
+
+def compute_micro_alpha(features: FairValueFeatures) -> Number:
+    if isinstance(features.midprice, float):
+        return _compute_micro_alpha_float(features)
 
-def compute_micro_alpha(features: FairValueFeatures) -> Decimal:
     if features.midprice is None or features.microprice is None:
         return ZERO
 
@@ -21,41 +57,20 @@ def compute_micro_alpha(features: FairValueFeatures) -> Decimal:
     if features.depth_imbalance is None:
         return ZERO
 
-    spread_bps = features.spread_bps
-    imbalance = abs(features.depth_imbalance)
+    spread_bps = decimal_or(features.spread_bps, ZERO)
+    imbalance = abs(decimal_or(features.depth_imbalance, ZERO))
     quote_age_ms = features.quote_age_ms or 0
 
-    total_depth = (features.top_bid_depth or ZERO) + (features.top_ask_depth or ZERO)
+    top_bid_depth = decimal_or(features.top_bid_depth, ZERO)
+    total_depth = top_bid_depth + decimal_or(features.top_ask_depth, ZERO)
 
+    tiers = _DECIMAL_TIERS
     # spread gate: trust micro more when spread is tight
-    if spread_bps <= Decimal("1"):
-        spread_factor = Decimal("1")
-    elif spread_bps <= Decimal("2"):
-        spread_factor = Decimal("0.6")
-    elif spread_bps <= Decimal("5"):
-        spread_factor = Decimal("0.25")
-    else:
-        spread_factor = Decimal("0")
-
+    spread_factor = tiers.spread(spread_bps)
     # age penalty
-    if quote_age_ms <= 100:
-        age_factor = Decimal("1")
-    elif quote_age_ms <= 250:
-        age_factor = Decimal("0.7")
-    elif quote_age_ms <= 500:
-        age_factor = Decimal("0.4")
-    else:
-        age_factor = Decimal("0")
-
+    age_factor = tiers.age(quote_age_ms)
     # depth bonus, capped
-    if total_depth <= 0:
-        depth_factor = Decimal("0.5")
-    elif total_depth < Decimal("1"):
-        depth_factor = Decimal("0.6")
-    elif total_depth < Decimal("5"):
-        depth_factor = Decimal("0.8")
-    else:
-        depth_factor = Decimal("1")
+    depth_factor = tiers.empty_book if total_depth <= 0 else tiers.depth(total_depth)
 
     alpha = ONE * imbalance * spread_factor * age_factor * depth_factor
 
@@ -66,9 +81,38 @@ def compute_micro_alpha(features: FairValueFeatures) -> Decimal:
     return alpha
 
 
+def _compute_micro_alpha_float(features: FairValueFeatures) -> float:
+    """Float-mode ``compute_micro_alpha``, on the same tier tables."""
+    if features.microprice is None:
+        return 0.0
+
+    spread_bps = features.spread_bps
+    if spread_bps is None or spread_bps <= 0:
+        return 0.0
+
+    if features.depth_imbalance is None:
+        return 0.0
+
+    imbalance = abs(float_or(features.depth_imbalance))
+    quote_age_ms = features.quote_age_ms or 0
+    total_depth = float_or(features.top_bid_depth) + float_or(features.top_ask_depth)
+
+    # ``Tiers`` lookups inlined: this runs for every quote in float mode.
+    spread, age, depth = _FLOAT_TIERS.spread, _FLOAT_TIERS.age, _FLOAT_TIERS.depth
+    spread_factor = spread.factors[bisect_left(spread.bounds, spread_bps)]
+    age_factor = age.factors[bisect_left(age.bounds, quote_age_ms)]
+    if total_depth <= 0:
+        depth_factor = _FLOAT_TIERS.empty_book
+    else:
+        depth_factor = depth.factors[bisect_right(depth.bounds, total_depth)]
+
+    alpha = imbalance * spread_factor * age_factor * depth_factor
+    return min(max(alpha, 0.0), 1.0)
+
+
 def compute_raw_fair_value(
     features: FairValueFeatures,
-) -> tuple[Decimal | None, Decimal | None, str]:
+) -> tuple[Number | None, Number | None, str]:
     if features.midprice is None and features.microprice is None:
         return None, None, "no_price"
 
@@ -79,5 +123,12 @@ def compute_raw_fair_value(
         return features.midprice, None, "mid_only"
 
     alpha = compute_micro_alpha(features)
-    raw_fair = features.midprice + alpha * (features.microprice - features.midprice)
+    midprice = features.midprice
+    raw_fair: Number
+    if isinstance(midprice, float):
+        raw_fair = midprice + float_or(alpha) * (float_or(features.microprice) - midprice)
+    else:
+        raw_fair = midprice + decimal_or(alpha, ZERO) * (
+            decimal_or(features.microprice, ZERO) - midprice
+        )
     return raw_fair, alpha, "mid_plus_micro_adjustment"
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Sequence
+from decimal import Decimal
+
+# Quote-age tier edges used by ``compute_micro_alpha`` and
+# ``compute_measurement_variance``; a venue's estimate changes with age only
+# when its quote age crosses one of these.
+QUOTE_AGE_TIER_EDGES_MS = (100, 250, 500)
+
+
+class Tiers[N: (Decimal, float)]:
+    """A step function over ascending ``bounds``.
+
+    A value takes the factor of the first bound it is within (``<=``, or
+    ``<`` when ``inclusive`` is false) and the last factor past every bound.
+    The heuristics build one instance per numeric mode from a single table of
+    strings, so the Decimal and float paths cannot drift apart.
+    """
+
+    __slots__ = ("bounds", "factors", "inclusive")
+
+    bounds: tuple[N, ...]
+    factors: tuple[N, ...]
+    inclusive: bool
+
+    def __init__(
+        self, bounds: Sequence[N], factors: Sequence[N], *, inclusive: bool = True
+    ) -> None:
+        if len(factors) != len(bounds) + 1:
+            raise ValueError("Tiers need exactly one more factor than bounds.")
+        self.bounds = tuple(bounds)
+        self.factors = tuple(factors)
+        self.inclusive = inclusive
+
+    @classmethod
+    def of(
+        cls,
+        number: Callable[[str], N],
+        bounds: Sequence[object],
+        factors: Sequence[str],
+        *,
+        inclusive: bool = True,
+    ) -> Tiers[N]:
+        """Build from a shared table, converting every entry with ``number``."""
+        return cls(
+            [number(str(bound)) for bound in bounds],
+            [number(factor) for factor in factors],
+            inclusive=inclusive,
+        )
+
+    def __call__(self, value: N | int) -> N:
+        if self.inclusive:
+            return self.factors[bisect_left(self.bounds, value)]
+        return self.factors[bisect_right(self.bounds, value)]
@@ -2,19 +2,20 @@ from __future__ import annotations
 # ruff: noqa: I001
 
 from dataclasses import dataclass
-from decimal import Decimal
+
+from icarus.observations.types import Number
 
 @dataclass(frozen=True, slots=True)
 class FairValueFeatures:
-    midprice: Decimal | None
-    microprice: Decimal | None
-    spread_bps: Decimal | None
-    depth_imbalance: Decimal | None
+    midprice: Number | None
+    microprice: Number | None
+    spread_bps: Number | None
+    depth_imbalance: Number | None
     quote_age_ms: int | None
-    mid_volatility_bps: Decimal | None
-    micro_volatility_bps: Decimal | None
-    top_bid_depth: Decimal | None
-    top_ask_depth: Decimal | None
+    mid_volatility_bps: Number | None
+    micro_volatility_bps: Number | None
+    top_bid_depth: Number | None
+    top_ask_depth: Number | None
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,11 +23,11 @@ class RawFairValueEstimate:
     timestamp_ms: int
     exchange: str
     market: str
-    raw_fair_value: Decimal | None
-    measurement_variance: Decimal | None
-    micro_alpha: Decimal | None
-    used_midprice: Decimal | None
-    used_microprice: Decimal | None
+    raw_fair_value: Number | None
+    measurement_variance: Number | None
+    micro_alpha: Number | None
+    used_midprice: Number | None
+    used_microprice: Number | None
 
 
 @dataclass(frozen=True, slots=True)
@@ -34,16 +35,16 @@ class VenueFairValueState:
     exchange: str
     market: str
     timestamp_ms: int
-    fair_value: Decimal
-    variance: Decimal
+    fair_value: Number
+    variance: Number
 
 
 @dataclass(frozen=True, slots=True)
 class CombinedFairValueEstimate:
     market: str
     timestamp_ms: int
-    fair_value: Decimal
-    variance: Decimal
+    fair_value: Number
+    variance: Number
     contributing_exchanges: tuple[str, ...]
 
     
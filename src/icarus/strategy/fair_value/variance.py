@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
 
+from icarus.observations.types import Number
+
+from .numeric import decimal_or, float_or
+from .tiers import QUOTE_AGE_TIER_EDGES_MS, Tiers
 from .types import FairValueFeatures
 
 
@@ -46,22 +52,37 @@ MIN_NOISE_BPS = DEFAULT_VARIANCE_CONFIG.min_noise_bps
 REFERENCE_TOP_NOTIONAL = DEFAULT_VARIANCE_CONFIG.reference_top_notional
 MIN_VAR = DEFAULT_VARIANCE_CONFIG.min_variance
 
+# Stale-quote variance inflation by quote age (inclusive ms bounds), and the
+# thin-book factor for a book with no top-of-book notional. Shared by both
+# numeric modes.
+VARIANCE_AGE_TIERS = (QUOTE_AGE_TIER_EDGES_MS, ("1.0", "1.2", "1.5", "2.0"))
+EMPTY_BOOK_DEPTH_FACTOR = "10000"
+
+_DECIMAL_AGE_TIERS = Tiers.of(Decimal, *VARIANCE_AGE_TIERS)
+_FLOAT_AGE_TIERS = Tiers.of(float, *VARIANCE_AGE_TIERS)
+_DECIMAL_EMPTY_BOOK_FACTOR = Decimal(EMPTY_BOOK_DEPTH_FACTOR)
+_FLOAT_EMPTY_BOOK_FACTOR = float(EMPTY_BOOK_DEPTH_FACTOR)
+
 
 def compute_measurement_variance(
     features: FairValueFeatures,
     *,
     config: FairValueVarianceConfig = DEFAULT_VARIANCE_CONFIG,
-) -> Decimal | None:
+) -> Number | None:
+    if isinstance(features.midprice, float):
+        return _compute_measurement_variance_float(features, config)
+
     midprice = features.midprice
     if midprice is None or midprice <= 0:
         return None
 
-    spread_bps = features.spread_bps or Decimal("0")
+    zero = Decimal("0")
+    spread_bps = decimal_or(features.spread_bps, zero)
     quote_age_ms = Decimal(features.quote_age_ms or 0)
-    mid_vol_bps = features.mid_volatility_bps or Decimal("0")
-    micro_vol_bps = features.micro_volatility_bps or Decimal("0")
+    mid_vol_bps = decimal_or(features.mid_volatility_bps, zero)
+    micro_vol_bps = decimal_or(features.micro_volatility_bps, zero)
 
-    top_depth = (features.top_bid_depth or Decimal("0")) + (features.top_ask_depth or Decimal("0"))
+    top_depth = decimal_or(features.top_bid_depth, zero) + decimal_or(features.top_ask_depth, zero)
 
     # Base noise from spread and short-horizon movement.
     spread_component = spread_bps / Decimal("10000")
@@ -74,9 +95,9 @@ def compute_measurement_variance(
         noise_squared = min_noise_squared
 
     # Thin-book penalty based on top-of-book notional.
-    top_notional = top_depth * midprice
+    top_notional = top_depth * decimal_or(midprice, zero)
     if top_notional <= 0:
-        depth_factor = Decimal("10000")
+        depth_factor = _DECIMAL_EMPTY_BOOK_FACTOR
     elif top_notional >= config.reference_top_notional:
         depth_factor = Decimal("1.0")
     else:
@@ -84,17 +105,55 @@ def compute_measurement_variance(
         depth_factor = ratio * ratio
 
     # Stale quote penalty.
-    if quote_age_ms <= 100:
-        age_factor = Decimal("1.0")
-    elif quote_age_ms <= 250:
-        age_factor = Decimal("1.2")
-    elif quote_age_ms <= 500:
-        age_factor = Decimal("1.5")
-    else:
-        age_factor = Decimal("2.0")
+    age_factor = _DECIMAL_AGE_TIERS(quote_age_ms)
 
     variance = noise_squared * depth_factor * age_factor * midprice**2
 
     if variance < config.min_variance:
         return config.min_variance
     return variance
+
+
+@lru_cache(maxsize=16)
+def _float_config(config: FairValueVarianceConfig) -> tuple[float, float, float]:
+    return (
+        float(config.min_noise_bps),
+        float(config.reference_top_notional),
+        float(config.min_variance),
+    )
+
+
+def _compute_measurement_variance_float(
+    features: FairValueFeatures,
+    config: FairValueVarianceConfig,
+) -> float | None:
+    """Float-mode ``compute_measurement_variance``, on the same tier tables."""
+    midprice = float_or(features.midprice)
+    if midprice <= 0:
+        return None
+
+    min_noise_bps, reference_top_notional, min_variance = _float_config(config)
+    spread_bps = float_or(features.spread_bps)
+    quote_age_ms = features.quote_age_ms or 0
+    vol_bps = max(float_or(features.mid_volatility_bps), float_or(features.micro_volatility_bps))
+    top_depth = float_or(features.top_bid_depth) + float_or(features.top_ask_depth)
+
+    spread_component = spread_bps / 10000.0
+    vol_component = vol_bps / 10000.0
+    min_component = min_noise_bps / 10000.0
+    noise_squared = max(spread_component**2 + vol_component**2, min_component**2)
+
+    top_notional = top_depth * midprice
+    if top_notional <= 0:
+        depth_factor = _FLOAT_EMPTY_BOOK_FACTOR
+    elif top_notional >= reference_top_notional:
+        depth_factor = 1.0
+    else:
+        ratio = reference_top_notional / top_notional
+        depth_factor = ratio * ratio
+
+    # Inlined ``Tiers`` lookup: this runs for every quote in float mode.
+    age_factor = _FLOAT_AGE_TIERS.factors[bisect_left(_FLOAT_AGE_TIERS.bounds, quote_age_ms)]
+
+    variance = noise_squared * depth_factor * age_factor * midprice**2
+    return max(variance, min_variance)
@@ -3,6 +3,9 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import List, Sequence, TypeVar
 
+import numpy as np
+import numpy.typing as npt
+
 Number = TypeVar("Number", Decimal, float)
 
 
@@ -91,6 +94,59 @@ def cap_and_renormalize(
     return current
 
 
+def cap_and_renormalize_rows(
+    normalized_weights: npt.NDArray[np.float64],
+    valid: npt.NDArray[np.bool_],
+    *,
+    max_weight: float,
+) -> npt.NDArray[np.float64]:
+    """
+    ``cap_and_renormalize`` applied to every row of a float matrix at once.
+
+    Each row's weight vector is its entries where ``valid`` is set, in column
+    order; entries outside ``valid`` come back as 0. Sums run column by
+    column in the same order as the scalar version, so every row matches
+    ``cap_and_renormalize`` on that row's valid entries exactly.
+    """
+    current = np.where(valid, normalized_weights, 0.0)
+    n = valid.sum(axis=1)
+    pending = (n > 1) & (max_weight * n >= 1.0) & (_sum_columns(current, valid) > 0.0)
+    capped = np.zeros_like(valid)
+
+    for _ in range(current.shape[1]):
+        pending &= ~np.all(capped | ~valid, axis=1)
+        if not pending.any():
+            break
+        capped_mass = _sum_columns(current, valid & capped)
+        uncapped_sum = _sum_columns(current, valid & ~capped)
+        pending &= uncapped_sum > 0.0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = (1.0 - capped_mass) / uncapped_sum
+            new_weights = np.where(capped, max_weight, current * scale[:, None])
+        newly_capped = valid & ~capped & (new_weights > max_weight) & pending[:, None]
+        settled = pending & ~newly_capped.any(axis=1)
+
+        # Settled rows take ``new_weights`` (their capped entries already
+        # hold ``max_weight``); the rest cap their new entries and go again.
+        rows = pending[:, None]
+        current = np.where(rows & (newly_capped | capped), max_weight, current)
+        current = np.where(rows & ~(newly_capped | capped), new_weights, current)
+        capped |= newly_capped
+        pending &= ~settled
+
+    return np.where(valid, current, 0.0)
+
+
+def _sum_columns(
+    values: npt.NDArray[np.float64], mask: npt.NDArray[np.bool_]
+) -> npt.NDArray[np.float64]:
+    total = np.zeros(values.shape[0])
+    for column, keep in zip(values.T, mask.T, strict=True):
+        total = np.where(keep, total + column, total)
+    return total
+
+
 def _sum(values, zero: Number) -> Number:
     total: Number = zero
     for v in values:
@@ -0,0 +1,18 @@
+"""Pipeline latency instrumentation: lock-free stage histograms and periodic reports."""
+
+from icarus.telemetry.latency import (
+    LatencyHistogram,
+    LatencyRecorder,
+    LatencySnapshot,
+    TimedQueue,
+)
+from icarus.telemetry.report import LatencyReporter, format_snapshot
+
+__all__ = [
+    "LatencyHistogram",
+    "LatencyRecorder",
+    "LatencyReporter",
+    "LatencySnapshot",
+    "TimedQueue",
+    "format_snapshot",
+]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+# 2**(7-1) = 64 buckets per doubling above 128ns: every recorded value is
+# within 1/64 (1.6%) of its bucket's bounds.
+DEFAULT_SUB_BUCKET_BITS = 7
+DEFAULT_MAX_VALUE_NS = 60_000_000_000
+# Hot paths time one event in this many: a stamp pair plus ``record`` costs a
+# sizeable fraction of a socket frame's parse-and-normalise work.
+DEFAULT_SAMPLE_EVERY = 32
+
+
+@dataclass(frozen=True, slots=True)
+class LatencySnapshot:
+    """Summary of one stage's samples; percentiles are bucket upper bounds."""
+
+    stage: str
+    count: int
+    mean_ns: float
+    p50_ns: int
+    p90_ns: int
+    p99_ns: int
+    p999_ns: int
+    max_ns: int
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of nanosecond durations.
+
+    Values below ``2**sub_bucket_bits`` ns are counted exactly; above that
+    every power of two is split into ``2**(sub_bucket_bits - 1)`` equal
+    buckets, so relative error is bounded whatever the scale. Values above
+    ``max_value_ns`` land in the last bucket; values must not be negative.
+
+    ``record`` is a few integer operations and one list increment, with no
+    lock: each histogram must have a single recording thread. Readers on
+    other threads copy the counts with ``counts()``; a sample being recorded
+    during the copy may be missed until the next one.
+    """
+
+    __slots__ = ("stage", "sub_bucket_bits", "total_ns", "_half_shift", "_counts")
+
+    def __init__(
+        self,
+        stage: str,
+        *,
+        sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS,
+        max_value_ns: int = DEFAULT_MAX_VALUE_NS,
+    ) -> None:
+        if sub_bucket_bits < 1:
+            raise ValueError("sub_bucket_bits must be at least 1.")
+        if max_value_ns <= 0:
+            raise ValueError("max_value_ns must be positive.")
+        self.stage = stage
+        self.sub_bucket_bits = sub_bucket_bits
+        self.total_ns = 0
+        self._half_shift = sub_bucket_bits - 1
+        self._counts = [0] * (self._index(max_value_ns) + 1)
+
+    def record(self, value_ns: int) -> None:
+        self.total_ns += value_ns
+        shift = value_ns.bit_length() - self.sub_bucket_bits
+        index = value_ns if shift <= 0 else (shift << self._half_shift) + (value_ns >> shift)
+        try:
+            self._counts[index] += 1
+        except IndexError:
+            self._counts[-1] += 1
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def counts(self) -> npt.NDArray[np.int64]:
+        return np.array(self._counts, dtype=np.int64)
+
+    def upper_bounds(self) -> npt.NDArray[np.int64]:
+        """Largest value each bucket can hold, aligned with ``counts()``."""
+        index = np.arange(len(self._counts), dtype=np.int64)
+        half = 1 << self._half_shift
+        shift = np.maximum(index // half - 1, 0)
+        exact = index < 2 * half
+        mantissa = np.where(exact, index, index - shift * half)
+        return np.where(exact, index, ((mantissa + 1) << shift) - 1)
+
+    def snapshot(self) -> LatencySnapshot:
+        return summarize(self.stage, self.counts(), self.total_ns, self.upper_bounds())
+
+    def _index(self, value_ns: int) -> int:
+        shift = value_ns.bit_length() - self.sub_bucket_bits
+        return value_ns if shift <= 0 else (shift << self._half_shift) + (value_ns >> shift)
+
+
+def summarize(
+    stage: str,
+    counts: npt.NDArray[np.int64],
+    total_ns: int,
+    upper_bounds: npt.NDArray[np.int64],
+) -> LatencySnapshot:
+    """Percentiles of a bucket-count vector (possibly a difference of two)."""
+    count = int(counts.sum())
+    if count == 0:
+        return LatencySnapshot(stage, 0, 0.0, 0, 0, 0, 0, 0)
+    cumulative = np.cumsum(counts)
+    ranks = np.ceil(np.array([0.5, 0.9, 0.99, 0.999]) * count).astype(np.int64)
+    p50, p90, p99, p999 = upper_bounds[np.searchsorted(cumulative, ranks)].tolist()
+    max_ns = int(upper_bounds[np.flatnonzero(counts)[-1]])
+    return LatencySnapshot(stage, count, total_ns / count, p50, p90, p99, p999, max_ns)
+
+
+class LatencyRecorder:
+    """Named per-stage ``LatencyHistogram``s, created on first use.
+
+    Hot paths look their histogram up once and call ``record`` with a
+    ``time.perf_counter_ns()`` difference. Per-message stages time only one
+    message in ``sample_every``, which keeps the percentiles honest at a
+    fraction of the cost; 1 times every message.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_every: int = DEFAULT_SAMPLE_EVERY,
+        sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS,
+    ) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1.")
+        self.sample_every = sample_every
+        self.sub_bucket_bits = sub_bucket_bits
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = LatencyHistogram(stage, sub_bucket_bits=self.sub_bucket_bits)
+            self._histograms[stage] = histogram
+        return histogram
+
+    def histograms(self) -> list[LatencyHistogram]:
+        return list(self._histograms.values())
+
+    def snapshot(self) -> list[LatencySnapshot]:
+        return [histogram.snapshot() for histogram in self.histograms()]
+
+
+class TimedQueue[T](asyncio.Queue[T]):
+    """FIFO ``asyncio.Queue`` that records items' time in the queue.
+
+    Every ``sample_every``-th item is timed; being FIFO, the n-th get is the
+    n-th put, so only the sampled put times are kept. ``_put``/``_get``
+    replace the base ones rather than extend them, as they run per item.
+    """
+
+    _queue: deque[T]
+
+    def __init__(
+        self, histogram: LatencyHistogram, maxsize: int = 0, *, sample_every: int = 1
+    ) -> None:
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1.")
+        super().__init__(maxsize)
+        self.histogram = histogram
+        self.sample_every = sample_every
+        self._unstamped_puts = sample_every
+        self._unstamped_gets = sample_every
+        self._put_ns: deque[int] = deque()
+
+    def _put(self, item: T) -> None:
+        self._queue.append(item)
+        self._unstamped_puts -= 1
+        if not self._unstamped_puts:
+            self._unstamped_puts = self.sample_every
+            self._put_ns.append(time.perf_counter_ns())
+
+    def _get(self) -> T:
+        self._unstamped_gets -= 1
+        if not self._unstamped_gets:
+            self._unstamped_gets = self.sample_every
+            self.histogram.record(time.perf_counter_ns() - self._put_ns.popleft())
+        return self._queue.popleft()
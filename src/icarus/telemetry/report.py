@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from .latency import LatencyRecorder, LatencySnapshot, summarize
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyReporter:
+    """Periodically dump per-stage latency over the last interval.
+
+    Each report covers the samples recorded since the previous one, worked
+    out from the difference of two copies of every histogram's counts, so
+    the recording threads are never reset or locked. Reports go to the log,
+    or as one JSON line per stage to ``path`` when it is given.
+    """
+
+    def __init__(
+        self,
+        recorder: LatencyRecorder,
+        *,
+        interval_s: float = 10.0,
+        path: Path | None = None,
+    ) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive.")
+        self.recorder = recorder
+        self.interval_s = interval_s
+        self.path = path
+        self._previous: dict[str, tuple[npt.NDArray[np.int64], int]] = {}
+
+    def report(self) -> list[LatencySnapshot]:
+        """Snapshot every stage's interval and write it out."""
+        snapshots = self.interval_snapshots()
+        if self.path is not None:
+            timestamp_ms = time.time_ns() // 1_000_000
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                for snapshot in snapshots:
+                    record = {"timestamp_ms": timestamp_ms, **dataclasses.asdict(snapshot)}
+                    handle.write(json.dumps(record) + "\n")
+        else:
+            for snapshot in snapshots:
+                logger.info("latency %s", format_snapshot(snapshot))
+        return snapshots
+
+    def interval_snapshots(self) -> list[LatencySnapshot]:
+        snapshots: list[LatencySnapshot] = []
+        for histogram in self.recorder.histograms():
+            # Total first: a sample racing with the copy then only ever adds
+            # to the counts, never to the mean without its count.
+            total_ns = histogram.total_ns
+            counts = histogram.counts()
+            previous_counts, previous_total = self._previous.get(
+                histogram.stage, (np.zeros_like(counts), 0)
+            )
+            self._previous[histogram.stage] = (counts, total_ns)
+            snapshots.append(
+                summarize(
+                    histogram.stage,
+                    counts - previous_counts,
+                    total_ns - previous_total,
+                    histogram.upper_bounds(),
+                )
+            )
+        return snapshots
+
+    async def run(self) -> None:
+        """Report every ``interval_s`` until cancelled, then once more."""
+        try:
+            while True:
+                await asyncio.sleep(self.interval_s)
+                self.report()
+        finally:
+            self.report()
+
+
+def format_snapshot(snapshot: LatencySnapshot) -> str:
+    return (
+        f"{snapshot.stage} n={snapshot.count} mean={snapshot.mean_ns / 1000:.1f}us "
+        f"p50={snapshot.p50_ns / 1000:.1f}us p90={snapshot.p90_ns / 1000:.1f}us "
+        f"p99={snapshot.p99_ns / 1000:.1f}us p99.9={snapshot.p999_ns / 1000:.1f}us "
+        f"max={snapshot.max_ns / 1000:.1f}us"
+    )
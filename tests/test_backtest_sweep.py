@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from icarus.backtest import SweepCell, collect_round_robin, deal_round_robin, sweep_grid
+
+
+def test_sweep_grid_is_the_product_in_print_order() -> None:
+    cells = sweep_grid([0.1, 0.2], [0.0, 0.5], [1.0], [0, 50], [1.0])
+
+    assert len(cells) == 8
+    assert cells[0] == SweepCell(0.1, 0.0, 1.0, 0, 1.0)
+    assert cells[1] == SweepCell(0.1, 0.0, 1.0, 50, 1.0)
+    assert cells[2] == SweepCell(0.1, 0.5, 1.0, 0, 1.0)
+    assert [cell.half_spread for cell in cells] == [0.1] * 4 + [0.2] * 4
+
+
+def test_sweep_grid_with_an_empty_axis_is_empty() -> None:
+    assert sweep_grid([0.1], [], [1.0], [0], [1.0]) == []
+
+
+def test_deal_round_robin_balances_and_caps_chunk_count() -> None:
+    assert deal_round_robin(list(range(7)), 3) == [[0, 3, 6], [1, 4], [2, 5]]
+    assert deal_round_robin([0, 1], 8) == [[0], [1]]
+    assert deal_round_robin([], 4) == []
+
+
+def test_collect_round_robin_restores_item_order() -> None:
+    items = list(range(11))
+    for workers in range(1, 14):
+        assert collect_round_robin(deal_round_robin(items, workers)) == items
+
+
+def test_deal_round_robin_rejects_non_positive_workers() -> None:
+    with pytest.raises(ValueError):
+        deal_round_robin([1, 2], 0)
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from typing import Any
+
 import pytest
 
 from icarus.sockets.base import BaseSocket
+from icarus.telemetry import LatencyRecorder
 
 
 class DummyWebSocket:
@@ -126,3 +130,44 @@ async def test_stream_messages_does_not_warn_or_sleep_after_close(
 
     assert messages == []
     assert "Socket error for" not in caplog.text
+
+
+class FramesWebSocket(DummyWebSocket):
+    def __init__(self, socket: BaseSocket, frames: list[str]) -> None:
+        super().__init__()
+        self.socket = socket
+        self.frames = frames
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        for frame in self.frames:
+            yield frame
+        self.socket._closed = True
+
+
+@pytest.mark.asyncio
+async def test_normalized_observations_time_sampled_stages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    socket = DummySocket()
+    socket.latency = LatencyRecorder(sample_every=2)
+    assert socket.latency_label == "dummy"
+
+    async def fake_connect() -> None:
+        socket._ws = FramesWebSocket(socket, [f'{{"n": {n}}}' for n in range(1, 6)])
+
+    def convert(message: dict[str, Any], *, received_timestamp_ms: int) -> list[Any]:
+        return [message["n"], -message["n"]]
+
+    monkeypatch.setattr(socket, "connect", fake_connect)
+
+    observations = [
+        observation
+        async for observation in socket._normalized_observations(
+            convert, lambda observation: observation if observation > 0 else None
+        )
+    ]
+
+    assert observations == [1, 2, 3, 4, 5]
+    counts = {h.stage: h.count for h in socket.latency.histograms()}
+    # Frames 2 and 4 are timed; the book stage once per observation of each.
+    assert counts == {"dummy.parse": 2, "dummy.normalize": 2, "dummy.book": 4}
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icarus.capture import ColumnarCaptureReader, ColumnarCaptureWriter, convert_sqlite_capture
+
+
+def _write_store(path: Path, *, n_updates: int, segment_rows: int) -> None:
+    with ColumnarCaptureWriter(path, segment_rows=segment_rows) as writer:
+        for i in range(n_updates):
+            update_id = writer.next_update_id()
+            timestamp_ms = 1_000 + 10 * i
+            writer.append_update(
+                {
+                    "update_id": update_id,
+                    "timestamp_ms": timestamp_ms,
+                    "event_exchange": writer.symbol_code("coinbase" if i % 2 else "okx"),
+                    "event_market": writer.symbol_code("BTC-USD"),
+                    "anchor_exchange": writer.symbol_code("coinbase"),
+                    "anchor_present": True,
+                    "basis_is_live": i >= 3,
+                    "basis_common_price": None if i < 3 else 60_000.0 + i,
+                    "basis_active_venues_mask": writer.symbol_mask(["coinbase", "okx"]),
+                }
+            )
+            writer.append_venue_state(
+                "coinbase",
+                {
+                    "update_id": update_id,
+                    "timestamp_ms": timestamp_ms,
+                    "fair_value": 60_000.0 + i,
+                    "age_ms": 5.0,
+                    "trade_count": i,
+                },
+            )
+            if i % 3 == 0:
+                writer.append_venue_state(
+                    "okx",
+                    {"update_id": update_id, "timestamp_ms": timestamp_ms, "fair_value": 1.0 * i},
+                )
+                writer.append_basis_state(
+                    "okx",
+                    {
+                        "update_id": update_id,
+                        "timestamp_ms": timestamp_ms,
+                        "basis_estimate": 0.5 * i,
+                        "basis_stddev": 0.1,
+                    },
+                )
+            writer.maybe_flush()
+
+
+def test_columnar_store_round_trips_across_segments(tmp_path: Path) -> None:
+    store = tmp_path / "capture.cols"
+    _write_store(store, n_updates=25, segment_rows=7)
+
+    reader = ColumnarCaptureReader(store)
+    assert ColumnarCaptureReader.is_store(store)
+    assert reader.venues() == ["coinbase", "okx"]
+
+    updates = reader.read_updates(["update_id", "timestamp_ms", "basis_common_price"])
+    assert updates["update_id"].tolist() == list(range(1, 26))
+    assert np.isnan(updates["basis_common_price"][:3]).all()
+    assert updates["basis_common_price"][3] == 60_003.0
+
+    window = reader.read_venue(
+        "coinbase", ["timestamp_ms", "fair_value", "trade_count"], start_ms=1_050, end_ms=1_120
+    )
+    assert window["timestamp_ms"].tolist() == list(range(1_050, 1_120, 10))
+    assert window["fair_value"].tolist() == [60_000.0 + i for i in range(5, 12)]
+    assert window["trade_count"].tolist() == list(range(5, 12))
+
+    assert reader.decode(reader.read_updates(["event_exchange"])["event_exchange"][:2]) == [
+        "okx",
+        "coinbase",
+    ]
+    mask = int(reader.read_updates(["basis_active_venues_mask"])["basis_active_venues_mask"][0])
+    assert reader.decode_mask(mask) == ("coinbase", "okx")
+
+
+def test_single_segment_reads_are_memory_mapped_views(tmp_path: Path) -> None:
+    store = tmp_path / "capture.cols"
+    _write_store(store, n_updates=10, segment_rows=1_000)
+
+    fair_value = ColumnarCaptureReader(store).read_venue("coinbase", ["fair_value"])["fair_value"]
+    assert isinstance(fair_value.base, np.memmap) or isinstance(fair_value, np.memmap)
+    assert not fair_value.flags.writeable
+
+
+def test_writer_appends_to_an_existing_store(tmp_path: Path) -> None:
+    store = tmp_path / "capture.cols"
+    _write_store(store, n_updates=4, segment_rows=100)
+    _write_store(store, n_updates=4, segment_rows=100)
+
+    update_ids = ColumnarCaptureReader(store).read_updates(["update_id"])["update_id"]
+    assert update_ids.tolist() == list(range(1, 9))
+
+
+def test_joined_read_aligns_update_and_basis_columns(tmp_path: Path) -> None:
+    store = tmp_path / "capture.cols"
+    _write_store(store, n_updates=12, segment_rows=5)
+
+    joined = ColumnarCaptureReader(store).read_venue_joined(
+        "coinbase",
+        ["fair_value"],
+        update_columns=["basis_common_price", "basis_is_live"],
+        basis_columns=["basis_estimate"],
+    )
+    assert joined["update_id"].tolist() == list(range(1, 13))
+    assert joined["basis_is_live"].tolist() == [i >= 3 for i in range(12)]
+    # coinbase never has a basis row, so every aligned estimate is missing.
+    assert np.isnan(joined["basis_estimate"]).all()
+
+    okx = ColumnarCaptureReader(store).read_venue_joined(
+        "okx", ["fair_value"], basis_columns=["basis_estimate"]
+    )
+    assert okx["basis_estimate"].tolist() == [0.0, 1.5, 3.0, 4.5]
+
+
+def _legacy_capture(path: Path) -> None:
+    """A capture from before top-of-book/trade-flow columns were recorded."""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE updates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp_ms INTEGER NOT NULL,
+            event_exchange TEXT NOT NULL,
+            event_market TEXT NOT NULL,
+            anchor_exchange TEXT NOT NULL,
+            anchor_present INTEGER NOT NULL,
+            basis_is_live INTEGER NOT NULL,
+            composite_price REAL,
+            composite_variance REAL,
+            kalman_filtered_price REAL,
+            kalman_raw_fused_price REAL,
+            basis_common_price REAL,
+            basis_common_stddev REAL,
+            contributing_exchanges_json TEXT NOT NULL,
+            kalman_used_venues_json TEXT NOT NULL,
+            basis_active_venues_json TEXT NOT NULL
+        );
+        CREATE TABLE venue_states (
+            update_id INTEGER NOT NULL,
+            exchange TEXT NOT NULL,
+            venue_kind TEXT NOT NULL,
+            fair_value REAL NOT NULL,
+            variance REAL NOT NULL,
+            age_ms REAL NOT NULL,
+            microprice REAL,
+            depth_imbalance REAL,
+            mid_volatility_bps REAL,
+            PRIMARY KEY (update_id, exchange)
+        );
+        CREATE TABLE basis_states (
+            update_id INTEGER NOT NULL,
+            exchange TEXT NOT NULL,
+            basis_estimate REAL NOT NULL,
+            basis_stddev REAL NOT NULL,
+            PRIMARY KEY (update_id, exchange)
+        );
+        """
+    )
+    venues = json.dumps(["coinbase", "hyperliquid_perp"])
+    for i in range(1, 8):
+        conn.execute(
+            "INSERT INTO updates VALUES (?, ?, 'coinbase', 'BTC-USD', 'coinbase', 1, ?,"
+            " NULL, NULL, NULL, NULL, ?, 0.5, ?, '[]', ?)",
+            (i, 1_000 * i, int(i > 1), 60_000.0 + i if i > 1 else None, venues, venues),
+        )
+        conn.execute(
+            "INSERT INTO venue_states VALUES (?, 'coinbase', 'spot', ?, 1.0, 3.0, ?, 0.1, 2.0)",
+            (i, 60_000.0 + i, None if i == 4 else 60_000.5 + i),
+        )
+        conn.execute(
+            "INSERT INTO venue_states VALUES (?, 'hyperliquid_perp', 'perp', ?, 2.0, 8.0,"
+            " NULL, NULL, NULL)",
+            (i, 60_010.0 + i),
+        )
+        conn.execute("INSERT INTO basis_states VALUES (?, 'hyperliquid_perp', ?, 0.2)", (i, 9.0))
+    conn.commit()
+    conn.close()
+
+
+def test_convert_sqlite_capture_preserves_rows(tmp_path: Path) -> None:
+    db_path = tmp_path / "2026-04-21.sqlite3"
+    _legacy_capture(db_path)
+    store = tmp_path / "2026-04-21.cols"
+
+    assert convert_sqlite_capture(db_path, store, segment_rows=3, chunk_updates=2) == 7
+
+    reader = ColumnarCaptureReader(store)
+    assert reader.venues() == ["coinbase", "hyperliquid_perp"]
+    updates = reader.read_updates(["update_id", "timestamp_ms", "basis_is_live"])
+    assert updates["update_id"].tolist() == list(range(1, 8))
+    assert updates["timestamp_ms"].tolist() == [1_000 * i for i in range(1, 8)]
+    masks = reader.read_updates(["contributing_exchanges_mask"])["contributing_exchanges_mask"]
+    assert reader.decode_mask(int(masks[0])) == ("coinbase", "hyperliquid_perp")
+
+    coinbase = reader.read_venue(
+        "coinbase", ["is_perp", "microprice", "bid_price", "trade_count"]
+    )
+    assert not coinbase["is_perp"].any()
+    assert math.isnan(coinbase["microprice"][3])
+    assert coinbase["microprice"][4] == 60_005.5
+    assert np.isnan(coinbase["bid_price"]).all()
+    assert coinbase["trade_count"].tolist() == [0] * 7
+
+    perp = reader.read_venue_joined(
+        "hyperliquid_perp", ["is_perp"], basis_columns=["basis_estimate"], start_ms=2_000
+    )
+    assert perp["is_perp"].all()
+    assert perp["basis_estimate"].tolist() == [9.0] * 6
+
+    with pytest.raises(ValueError):
+        convert_sqlite_capture(db_path, store)
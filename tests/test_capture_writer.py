@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from icarus.capture import CaptureWriterThread
+from icarus.telemetry import LatencyRecorder
+
+
+class RecordingSink:
+    def __init__(self, path: Path, log: list[tuple[str, Path, Any]]) -> None:
+        self.path = path
+        self.log = log
+        self.thread = threading.current_thread()
+
+    def write(self, record: Any) -> None:
+        assert threading.current_thread() is self.thread
+        self.log.append(("write", self.path, record))
+
+    def commit(self) -> None:
+        self.log.append(("commit", self.path, None))
+
+    def close(self) -> None:
+        self.log.append(("close", self.path, None))
+
+
+def _writes(log: list[tuple[str, Path, Any]], path: Path) -> list[Any]:
+    return [record for event, sink_path, record in log if event == "write" and sink_path == path]
+
+
+async def test_writer_preserves_order_and_group_commits() -> None:
+    log: list[tuple[str, Path, Any]] = []
+    writer = CaptureWriterThread(
+        lambda path: RecordingSink(path, log),
+        Path("a"),
+        commit_every=10,
+        max_commit_delay_s=60.0,
+    )
+    writer.start()
+    for i in range(25):
+        await writer.put(i)
+    await writer.close()
+
+    assert _writes(log, Path("a")) == list(range(25))
+    events = [event for event, _, _ in log]
+    # Two full groups of ten, then the five left over are committed on close.
+    assert events.count("commit") == 3
+    assert events[10] == "commit" and events[21] == "commit"
+    assert events[-2:] == ["commit", "close"]
+    stats = writer.stats()
+    assert stats.records_written == 25
+    assert stats.commits == 3
+    assert stats.queue_depth == 0
+
+
+async def test_writer_rotation_keeps_earlier_records_in_the_old_sink() -> None:
+    log: list[tuple[str, Path, Any]] = []
+    writer = CaptureWriterThread(lambda path: RecordingSink(path, log), Path("day-1"))
+    writer.start()
+    for i in range(5):
+        await writer.put(i)
+    await writer.rotate(Path("day-2"))
+    for i in range(5, 8):
+        await writer.put(i)
+    await writer.close()
+
+    assert _writes(log, Path("day-1")) == [0, 1, 2, 3, 4]
+    assert _writes(log, Path("day-2")) == [5, 6, 7]
+    day_1_events = [event for event, path, _ in log if path == Path("day-1")]
+    assert day_1_events[-2:] == ["commit", "close"]
+    assert writer.stats().path == Path("day-2")
+
+
+async def test_writer_commits_idle_records_after_the_commit_delay() -> None:
+    log: list[tuple[str, Path, Any]] = []
+    writer = CaptureWriterThread(
+        lambda path: RecordingSink(path, log),
+        Path("a"),
+        commit_every=1_000,
+        max_commit_delay_s=0.02,
+    )
+    writer.start()
+    await writer.put("only")
+    for _ in range(100):
+        if writer.stats().commits:
+            break
+        await asyncio.sleep(0.01)
+    assert writer.stats().commits == 1
+    await writer.close()
+
+
+async def test_full_queue_waits_off_loop_and_counts_backpressure() -> None:
+    release = threading.Event()
+    log: list[tuple[str, Path, Any]] = []
+
+    class SlowSink(RecordingSink):
+        def write(self, record: Any) -> None:
+            release.wait()
+            super().write(record)
+
+    writer = CaptureWriterThread(lambda path: SlowSink(path, log), Path("a"), max_queue=2)
+    writer.start()
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while not release.is_set():
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    async def release_later() -> None:
+        await asyncio.sleep(0.1)
+        release.set()
+
+    ticking = asyncio.create_task(ticker())
+    releasing = asyncio.create_task(release_later())
+    for i in range(6):
+        await writer.put(i)
+    await asyncio.gather(ticking, releasing)
+    await writer.close()
+
+    assert _writes(log, Path("a")) == list(range(6))
+    # The loop kept running while the producer waited for room in the queue.
+    assert ticks > 5
+    stats = writer.stats()
+    assert stats.producer_waits >= 1
+    assert stats.producer_wait_ms > 0
+    assert stats.max_queue_depth == 2
+
+
+async def test_writer_surfaces_sink_errors() -> None:
+    class FailingSink(RecordingSink):
+        def write(self, record: Any) -> None:
+            raise OSError("disk full")
+
+    writer = CaptureWriterThread(lambda path: FailingSink(path, []), Path("a"))
+    writer.start()
+    await writer.put(1)
+    with pytest.raises(OSError, match="disk full"):
+        await writer.close()
+    with pytest.raises(OSError, match="disk full"):
+        writer.put_nowait(2)
+
+
+async def test_writer_records_sampled_store_latency() -> None:
+    log: list[tuple[str, Path, Any]] = []
+    latency = LatencyRecorder(sample_every=4)
+    writer = CaptureWriterThread(
+        lambda path: RecordingSink(path, log),
+        Path("a"),
+        commit_every=5,
+        latency=latency,
+        latency_label="store.BTC",
+    )
+    writer.start()
+    for i in range(10):
+        await writer.put(i)
+    await writer.rotate(Path("b"))
+    for i in range(10, 12):
+        await writer.put(i)
+    await writer.close()
+
+    # Records arrive unwrapped; one in four (from the first) had its queue
+    # time taken, and rotation and close are not records.
+    assert _writes(log, Path("a")) == list(range(10))
+    assert _writes(log, Path("b")) == [10, 11]
+    counts = {histogram.stage: histogram.count for histogram in latency.histograms()}
+    assert counts == {"store.BTC.queue": 3, "store.BTC.write": 12, "store.BTC.commit": 3}
+
+
+async def test_full_queue_keeps_the_latency_sample_cadence() -> None:
+    release = threading.Event()
+    log: list[tuple[str, Path, Any]] = []
+
+    class SlowSink(RecordingSink):
+        def write(self, record: Any) -> None:
+            release.wait()
+            super().write(record)
+
+    latency = LatencyRecorder(sample_every=2)
+    writer = CaptureWriterThread(
+        lambda path: SlowSink(path, log),
+        Path("a"),
+        max_queue=1,
+        latency=latency,
+        latency_label="store.BTC",
+    )
+    writer.start()
+
+    async def release_later() -> None:
+        await asyncio.sleep(0.05)
+        release.set()
+
+    releasing = asyncio.create_task(release_later())
+    for i in range(8):
+        await writer.put(i)
+    await releasing
+    await writer.close()
+
+    # Most puts found the queue full and retried; each record was still
+    # stamped once, so every second one carries a queue time.
+    assert _writes(log, Path("a")) == list(range(8))
+    assert writer.stats().producer_waits >= 1
+    counts = {histogram.stage: histogram.count for histogram in latency.histograms()}
+    assert counts["store.BTC.queue"] == 4
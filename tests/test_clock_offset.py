@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from icarus.measurements import (
+    ClockOffsetConfig,
+    ClockOffsetEstimator,
+    MarketMeasurementEngine,
+    MeasurementEngineConfig,
+    event_timestamp_ms,
+)
+from icarus.observations import BBOObservation, TradeObservation
+from icarus.telemetry import LatencyRecorder
+
+
+def _quote(exchange: str, source_ms: int | None, received_ms: int | None) -> BBOObservation:
+    return BBOObservation(
+        exchange=exchange,
+        market="BTC-USD",
+        source_timestamp_ms=source_ms,
+        received_timestamp_ms=received_ms,
+        raw_message={},
+        bid_price=100.0,
+        bid_size=1.0,
+        ask_price=101.0,
+        ask_size=1.0,
+    )
+
+
+def _trade(exchange: str, source_ms: int, received_ms: int) -> TradeObservation:
+    return TradeObservation(
+        exchange=exchange,
+        market="BTC-USD",
+        source_timestamp_ms=source_ms,
+        received_timestamp_ms=received_ms,
+        raw_message={},
+        trade_id=None,
+        side="buy",
+        price=100.5,
+        size=0.1,
+    )
+
+
+def test_offset_is_the_running_minimum_delay_and_strips_jitter() -> None:
+    # Venue clock 400ms behind ours, 20ms best-case latency, exponential jitter.
+    rng = random.Random(11)
+    clock = ClockOffsetEstimator()
+    corrected = []
+    for i in range(2000):
+        source_ms = 1_000_000 + i * 10
+        received_ms = source_ms + 400 + 20 + int(rng.expovariate(1 / 15))
+        corrected.append(
+            (source_ms, received_ms, clock.observe(_quote("okx", source_ms, received_ms)))
+        )
+
+    estimate = clock.estimate("okx")
+    assert estimate is not None and estimate.ready
+    assert estimate.offset_ms == 420
+    assert 8.0 < estimate.mean_excess_ms < 25.0
+    for source_ms, received_ms, corrected_ms in corrected[100:]:
+        assert corrected_ms == source_ms + 420
+        assert corrected_ms <= received_ms
+
+
+def test_warm_up_and_missing_venue_time_fall_back_to_receipt() -> None:
+    clock = ClockOffsetEstimator(ClockOffsetConfig(min_samples=3))
+    assert clock.observe(_quote("kraken", 1_000, 1_050)) == 1_050
+    assert clock.observe(_quote("kraken", 1_100, 1_140)) == 1_140
+    assert clock.observe(_quote("kraken", 1_200, 1_260)) == 1_240
+    assert clock.observe(_quote("kraken", None, 1_300)) == 1_300
+    assert clock.corrected_timestamp_ms(_quote("coinbase", 1_000, 1_500)) == 1_500
+    assert clock.corrected_timestamp_ms(_quote("coinbase", 1_000, None)) == 1_000
+
+
+def test_trades_are_corrected_but_do_not_move_the_offset() -> None:
+    clock = ClockOffsetEstimator(ClockOffsetConfig(min_samples=1))
+    clock.observe(_quote("coinbase", 1_000, 1_030))
+    # A trade printed long before its message was sent.
+    assert clock.observe(_trade("coinbase", 500, 1_040)) == 530
+    estimate = clock.estimate("coinbase")
+    assert estimate is not None
+    assert (estimate.offset_ms, estimate.samples) == (30, 1)
+
+
+def test_offset_follows_the_window_after_a_clock_step() -> None:
+    clock = ClockOffsetEstimator(ClockOffsetConfig(window_ms=1_000, min_samples=1))
+    for i in range(50):
+        clock.observe(_quote("okx", i * 100, i * 100 + 50))
+    # The venue clock jumps 30ms ahead: delays shrink at once and the new
+    # minimum takes over immediately.
+    clock.observe(_quote("okx", 5_030, 5_050))
+    assert clock.estimate("okx").offset_ms == 20  # type: ignore[union-attr]
+    # Back again: the smaller delay is remembered until it leaves the window.
+    clock.observe(_quote("okx", 5_100, 5_150))
+    assert clock.estimate("okx").offset_ms == 20  # type: ignore[union-attr]
+    clock.observe(_quote("okx", 6_100, 6_150))
+    assert clock.estimate("okx").offset_ms == 50  # type: ignore[union-attr]
+
+
+def test_degraded_connection_raises_excess_delay_and_histogram() -> None:
+    latency = LatencyRecorder()
+    clock = ClockOffsetEstimator(ClockOffsetConfig(min_samples=1), latency=latency)
+    for i in range(100):
+        clock.observe(_quote("hyperliquid", i * 10, i * 10 + 5))
+    healthy = clock.estimate("hyperliquid")
+    for i in range(100, 200):
+        clock.observe(_quote("hyperliquid", i * 10, i * 10 + 205))
+    degraded = clock.estimate("hyperliquid")
+
+    assert healthy is not None and degraded is not None
+    assert healthy.mean_excess_ms == 0.0
+    assert degraded.last_excess_ms == 200
+    assert degraded.mean_excess_ms > 190.0
+    delay = latency.histogram("hyperliquid.delay").snapshot()
+    assert delay.count == 200
+    assert delay.p50_ns == 0
+    assert 200_000_000 <= delay.max_ns <= 200_000_000 * (1 + 1 / 64)
+
+
+def test_engine_stamps_quotes_on_the_selected_basis() -> None:
+    quote = _quote("okx", 1_000, 1_450)
+    assert event_timestamp_ms(quote, "received") == 1_450
+    assert event_timestamp_ms(quote, "source") == 1_000
+    assert event_timestamp_ms(_quote("okx", None, 1_450), "source") == 1_450
+
+    clock = ClockOffsetEstimator(ClockOffsetConfig(min_samples=1))
+    clock.observe(_quote("okx", 900, 1_300))
+    engine = MarketMeasurementEngine(
+        exchange="okx",
+        market="BTC-USD",
+        config=MeasurementEngineConfig(timestamp_basis="corrected"),
+        clock=clock,
+    )
+    clock.observe(quote)
+    measurement = engine.on_observation(quote)
+    assert measurement is not None
+    assert measurement.timestamp_ms == 1_400
+
+    with pytest.raises(ValueError):
+        MarketMeasurementEngine(
+            exchange="okx",
+            market="BTC-USD",
+            config=MeasurementEngineConfig(timestamp_basis="corrected"),
+        )
+    with pytest.raises(ValueError):
+        ClockOffsetConfig(window_ms=0)
+
+
+def test_engine_clock_never_steps_back_for_an_earlier_trade() -> None:
+    engine = MarketMeasurementEngine(
+        exchange="okx",
+        market="BTC-USD",
+        config=MeasurementEngineConfig(timestamp_basis="source"),
+    )
+    engine.on_observation(_quote("okx", 1_000, 1_050))
+    measurement = engine.on_observation(_trade("okx", 900, 1_060))
+
+    assert measurement is not None
+    assert measurement.timestamp_ms == 1_000
+    assert measurement.quote_age_ms == 0
+
+    later = engine.on_observation(_quote("okx", 950, 1_070))
+    assert later is not None
+    assert later.timestamp_ms == 1_000
+    assert later.quote_age_ms == 0
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import gzip
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icarus.dex import (
+    Q96,
+    CexReference,
+    SwapArrays,
+    SwapPath,
+    estimate_pool_liquidity,
+    load_cex,
+    load_swaps,
+    passive_lp_sweep,
+    price_to_sqrtx96,
+    simulate_active_lp,
+    sqrtx96_to_price,
+    swap_attribution,
+    token_amounts,
+)
+
+
+def _swaps(n: int, seed: int) -> tuple[SwapArrays, CexReference]:
+    rng = np.random.default_rng(seed)
+    timestamp = 1_700_000_000 + np.cumsum(rng.integers(0, 40, n)).astype(np.int64)
+    price = 3_000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.0015, n)))
+    sqrt_price = price_to_sqrtx96(price)
+    pool_liquidity = 5e17 * rng.uniform(0.5, 2.0, n)
+    d_sqrt = np.diff(sqrt_price, prepend=sqrt_price[0])
+    amount1 = pool_liquidity * d_sqrt / Q96 / 1e6
+    amount0 = -amount1 / price
+    # Some token1 legs missing, so the token0 estimate is exercised.
+    amount1[rng.random(n) < 0.05] = 0.0
+    swaps = SwapArrays(
+        timestamp=timestamp,
+        log_index=np.arange(n, dtype=np.int64),
+        sqrt_price_x96=sqrt_price,
+        amount0=amount0,
+        amount1=amount1,
+        amount_usd=np.abs(amount0) * price,
+    )
+    bars = np.arange(timestamp[0] - 60, timestamp[-1] + 60, 60, dtype=np.int64)
+    cex = CexReference(
+        timestamp=bars,
+        price=np.interp(bars, timestamp, price) * np.exp(rng.normal(0.0, 0.0005, len(bars))),
+    )
+    return swaps, cex
+
+
+def _pool_liquidity(a0: float, a1: float, sp: float, sq: float) -> float:
+    d = abs(sq - sp)
+    if d <= 0:
+        return float("nan")
+    if abs(a1) * 1e6 > 0:
+        return abs(a1) * 1e6 * Q96 / d
+    di = abs(1.0 / sp - 1.0 / sq)
+    if abs(a0) * 1e18 > 0 and di > 0:
+        return abs(a0) * 1e18 / (di * Q96)
+    return float("nan")
+
+
+def _value(liquidity: float, sp: float, sl: float, sh: float, mark: float) -> float:
+    x, y = token_amounts(liquidity, sp, sl, sh)
+    return float(x) / 1e18 * mark + float(y) / 1e6
+
+
+def _deposit_liquidity(deposit: float, sp: float, sl: float, sh: float, price: float) -> float:
+    return deposit / _value(1.0, sp, sl, sh, price)
+
+
+def _reference_passive(
+    swaps: SwapArrays, cex: CexReference, range_pct: float, skip_s: int
+) -> dict[str, float]:
+    """dex_lp_backtest's per-swap loop."""
+    rows = list(
+        zip(
+            swaps.timestamp.tolist(),
+            swaps.sqrt_price_x96.tolist(),
+            swaps.amount0.tolist(),
+            swaps.amount1.tolist(),
+            swaps.amount_usd.tolist(),
+            strict=True,
+        )
+    )
+    dep = next(i for i, row in enumerate(rows) if row[0] >= rows[0][0] + skip_s)
+    prev_ts, prev_sqrt = rows[dep][0], rows[dep][1]
+    dep_price = float(sqrtx96_to_price(prev_sqrt))
+    lo = float(price_to_sqrtx96(dep_price * (1 - range_pct / 100)))
+    hi = float(price_to_sqrtx96(dep_price * (1 + range_pct / 100)))
+    liquidity = _deposit_liquidity(10_000.0, prev_sqrt, lo, hi, dep_price)
+    fees = lvr = toxic = 0.0
+    in_s = out_s = 0
+    for ts, sqrt_post, a0, a1, usd in rows[dep + 1 :]:
+        in_pre = lo <= prev_sqrt <= hi
+        in_range = in_pre or lo <= sqrt_post <= hi
+        if in_pre:
+            in_s += ts - prev_ts
+        else:
+            out_s += ts - prev_ts
+        ext = float(cex.price_at(ts))
+        dv = _value(liquidity, sqrt_post, lo, hi, ext) - _value(liquidity, prev_sqrt, lo, hi, ext)
+        pool_l = _pool_liquidity(a0, a1, prev_sqrt, sqrt_post)
+        if pool_l == pool_l and pool_l > 0 and lo <= 0.5 * (prev_sqrt + sqrt_post) <= hi:
+            fees += usd * 0.0005 * (liquidity / pool_l)
+        if in_range:
+            lvr -= dv
+            pre_gap = abs(float(sqrtx96_to_price(prev_sqrt)) - ext)
+            if abs(float(sqrtx96_to_price(sqrt_post)) - ext) < pre_gap:
+                toxic -= dv
+        prev_ts, prev_sqrt = ts, sqrt_post
+    return {
+        "fees": fees,
+        "lvr": lvr,
+        "toxic_lvr": toxic,
+        "in_range_frac": in_s / (in_s + out_s + 1e-9),
+        "value_lp": _value(liquidity, prev_sqrt, lo, hi, float(sqrtx96_to_price(prev_sqrt))),
+    }
+
+
+def _reference_active(
+    path: SwapPath, range_pct: float, trigger_pct: float, grace_s: int
+) -> tuple[int, float, float, float]:
+    """dex_active_lp's per-swap loop, on the same path."""
+    rp, tp, fee_rate, gas = range_pct / 100, trigger_pct / 100, 0.0005, 0.3
+    center = path.deposit_price
+    lo = float(price_to_sqrtx96(center * (1 - rp)))
+    hi = float(price_to_sqrtx96(center * (1 + rp)))
+    liquidity = _deposit_liquidity(10_000.0, path.deposit_sqrt, lo, hi, center)
+    fees = 0.0
+    rebalances = in_s = out_s = run_s = 0
+    for i in range(len(path)):
+        pre, post, dt = float(path.sqrt_pre[i]), float(path.sqrt_post[i]), int(path.dt_s[i])
+        in_pre = lo <= pre <= hi
+        if in_pre:
+            in_s += dt
+            run_s = 0
+        else:
+            out_s += dt
+            run_s += dt
+        pool_l = float(path.pool_liquidity[i])
+        if pool_l == pool_l and pool_l > 0 and lo <= 0.5 * (pre + post) <= hi:
+            fees += float(path.amount_usd[i]) * fee_rate * (liquidity / pool_l)
+        pp_post = float(sqrtx96_to_price(post))
+        if abs(math.log(pp_post / center)) > tp or (not in_pre and run_s >= grace_s):
+            x_old, y_old = token_amounts(liquidity, post, lo, hi)
+            v_after_gas = float(x_old) / 1e18 * pp_post + float(y_old) / 1e6 - gas
+            new_lo = float(price_to_sqrtx96(pp_post * (1 - rp)))
+            new_hi = float(price_to_sqrtx96(pp_post * (1 + rp)))
+            l_new = _deposit_liquidity(v_after_gas, post, new_lo, new_hi, pp_post)
+            x_new, _ = token_amounts(l_new, post, new_lo, new_hi)
+            swap_fee = abs(float(x_new) - float(x_old)) / 1e18 * pp_post * fee_rate
+            liquidity = _deposit_liquidity(v_after_gas - swap_fee, post, new_lo, new_hi, pp_post)
+            rebalances += 1
+            center, lo, hi, run_s = pp_post, new_lo, new_hi, 0
+    final = float(path.price_post[-1])
+    return (
+        rebalances,
+        fees,
+        in_s / (in_s + out_s + 1e-9),
+        _value(liquidity, float(path.sqrt_post[-1]), lo, hi, final),
+    )
+
+
+def test_vectorised_math_matches_scalar_formulas() -> None:
+    swaps, _ = _swaps(500, 1)
+    sp = swaps.sqrt_price_x96
+    lo, hi = float(np.quantile(sp, 0.3)), float(np.quantile(sp, 0.7))
+    x, y = token_amounts(2.5e15, sp, lo, hi)
+    for i in range(len(sp)):
+        s = float(sp[i])
+        if s <= lo:
+            expected = (2.5e15 * (1 / lo - 1 / hi) * Q96, 0.0)
+        elif s >= hi:
+            expected = (0.0, 2.5e15 * (hi - lo) / Q96)
+        else:
+            expected = (2.5e15 * (1 / s - 1 / hi) * Q96, 2.5e15 * (s - lo) / Q96)
+        assert (x[i], y[i]) == pytest.approx(expected, rel=1e-12, abs=1e-6)
+
+    pool = estimate_pool_liquidity(swaps.amount0[1:], swaps.amount1[1:], sp[:-1], sp[1:])
+    reference = [
+        _pool_liquidity(a0, a1, p, q)
+        for a0, a1, p, q in zip(swaps.amount0[1:], swaps.amount1[1:], sp[:-1], sp[1:], strict=True)
+    ]
+    np.testing.assert_allclose(pool, reference, rtol=1e-12)
+    assert np.isfinite(pool).mean() > 0.9
+    assert float(sqrtx96_to_price(price_to_sqrtx96(3_210.5))) == pytest.approx(3_210.5)
+
+
+def test_passive_sweep_matches_the_per_swap_loop() -> None:
+    swaps, cex = _swaps(4_000, 2)
+    path = SwapPath.build(swaps, cex, skip_s=3_600)
+    ranges = [0.5, 1.0, 2.5, 5.0, 20.0]
+    # A small cell budget forces several range blocks.
+    sweep = passive_lp_sweep(path, ranges, deposit=10_000.0, fee_bps=5.0, max_cells=9_000)
+
+    for i, range_pct in enumerate(ranges):
+        reference = _reference_passive(swaps, cex, range_pct, 3_600)
+        assert sweep.fees[i] == pytest.approx(reference["fees"], rel=1e-9)
+        assert sweep.lvr[i] == pytest.approx(reference["lvr"], rel=1e-9, abs=1e-9)
+        assert sweep.toxic_lvr[i] == pytest.approx(reference["toxic_lvr"], rel=1e-9, abs=1e-9)
+        assert sweep.in_range_frac[i] == pytest.approx(reference["in_range_frac"])
+        assert sweep.value_lp[i] == pytest.approx(reference["value_lp"], rel=1e-12)
+
+    # Narrow ranges leave the price more often and earn more per dollar while in.
+    assert sweep.in_range_frac[0] < sweep.in_range_frac[-1]
+    assert sweep.fees[2] > sweep.fees[-1] > 0
+    np.testing.assert_allclose(sweep.lvr, sweep.toxic_lvr + sweep.noise_lvr)
+
+    attribution = swap_attribution(
+        path,
+        float(sweep.sqrt_lower[3]),
+        float(sweep.sqrt_upper[3]),
+        float(sweep.liquidity[3]),
+        fee_bps=5.0,
+    )
+    assert attribution.fee.sum() == pytest.approx(sweep.fees[3], rel=1e-9)
+    assert -attribution.value_change[attribution.in_range].sum() == pytest.approx(sweep.lvr[3])
+
+
+@pytest.mark.parametrize("grace_s", [0, 900])
+def test_active_lp_matches_the_per_swap_loop(grace_s: int) -> None:
+    swaps, cex = _swaps(6_000, 3)
+    path = SwapPath.build(swaps, cex, skip_s=3_600)
+    counts = []
+    for range_pct, trigger_pct in ((1.0, 0.5), (2.0, 2.0), (5.0, 20.0)):
+        result = simulate_active_lp(
+            path,
+            range_pct=range_pct,
+            trigger_pct=trigger_pct,
+            deposit=10_000.0,
+            fee_bps=5.0,
+            gas_usd=0.3,
+            oor_grace_s=grace_s,
+            search_block=64,
+        )
+        rebalances, fees, in_range_frac, value_lp = _reference_active(
+            path, range_pct, trigger_pct, grace_s
+        )
+        assert result.n_rebalances == rebalances
+        assert result.fees_usd == pytest.approx(fees, rel=1e-9)
+        assert result.in_range_frac == pytest.approx(in_range_frac)
+        assert result.v_lp == pytest.approx(value_lp, rel=1e-9)
+        assert result.gas_usd == pytest.approx(0.3 * rebalances)
+        counts.append(rebalances)
+    assert counts[0] > counts[1] > counts[2] > 0
+
+
+def test_loaders_read_dumps_in_swap_order(tmp_path: Path) -> None:
+    swaps_path = tmp_path / "swaps.jsonl.gz"
+    rows = [
+        {"timestamp": "20", "logIndex": "7", "sqrtPriceX96": str(int(Q96 * 1.1e-4)),
+         "amount0": "-1.5", "amount1": "3000.25", "amountUSD": "3000.25"},
+        {"timestamp": "10", "logIndex": "3", "sqrtPriceX96": str(int(Q96 * 1e-4)),
+         "amount0": "0.5", "amount1": "-1000", "amountUSD": "1000"},
+        {"timestamp": "20", "logIndex": "2", "sqrtPriceX96": str(int(Q96 * 1.05e-4)),
+         "amount0": "0.1", "amount1": "-200", "amountUSD": "200"},
+    ]  # fmt: skip
+    with gzip.open(swaps_path, "wt") as fh:
+        fh.writelines(json.dumps(row) + "\n" for row in rows)
+    cex_path = tmp_path / "cex.jsonl"
+    cex_path.write_text(
+        "".join(json.dumps({"ts_s": ts, "close": px}) + "\n" for ts, px in ((60, 2.0), (0, 1.0)))
+    )
+
+    swaps = load_swaps(swaps_path)
+    assert swaps.timestamp.tolist() == [10, 20, 20]
+    assert swaps.log_index.tolist() == [3, 2, 7]
+    assert swaps.amount_usd.tolist() == [1000.0, 200.0, 3000.25]
+    assert swaps.price[0] == pytest.approx(1e-8 * 1e12)
+    assert len(swaps.window(11, 20)) == 2
+
+    cex = load_cex(cex_path)
+    assert cex.timestamp.tolist() == [0, 60]
+    assert cex.price_at(np.array([-5, 0, 30, 90])).tolist() == [1.0, 1.0, 2.0, 2.0]
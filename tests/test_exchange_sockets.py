@@ -57,6 +57,26 @@ def test_hyperliquid_respects_disabled_streams() -> None:
     assert socket.subscriptions() == [{"type": "l2Book", "coin": "ETH"}]
 
 
+def test_hyperliquid_shares_one_connection_across_markets() -> None:
+    socket = HyperliquidSocket(
+        ["btc", "eth"],
+        subscription_coin=["@142", "@151"],
+        candle_interval=None,
+        include_trades=False,
+        include_active_asset_ctx=False,
+    )
+
+    assert socket.markets == ["BTC", "ETH"]
+    assert socket.subscriptions() == [
+        {"type": "l2Book", "coin": "@142"},
+        {"type": "bbo", "coin": "@142"},
+        {"type": "l2Book", "coin": "@151"},
+        {"type": "bbo", "coin": "@151"},
+    ]
+    with pytest.raises(ValueError):
+        HyperliquidSocket(["btc", "eth"], subscription_coin="@142")
+
+
 def test_coinbase_normalizes_products_and_channels() -> None:
     socket = CoinbaseSocket("btc-usd")
 
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+import pytest
+
 from icarus.strategy.fair_value.combiner import (
     CrossVenueCombinerConfig,
     CrossVenueFairValueCombiner,
@@ -189,3 +191,46 @@ def test_cross_venue_combiner_records_empty_diagnostics_when_all_venues_stale()
     assert diagnostics is not None
     assert diagnostics.timestamp_ms == 1100
     assert diagnostics.venues == ()
+
+
+def test_cross_venue_combiner_float_states_match_decimal_result() -> None:
+    config = CrossVenueCombinerConfig(
+        age_penalty_per_second=Decimal("0.1"),
+        max_venue_weight=Decimal("0.7"),
+    )
+    decimal_combiner = CrossVenueFairValueCombiner("BTC-USD", config=config)
+    float_combiner = CrossVenueFairValueCombiner("BTC-USD", config=config)
+    venues = (
+        ("coinbase", 1000, "100", "1"),
+        ("kraken", 1500, "102", "4"),
+        ("okx", 2000, "99", "2"),
+    )
+
+    for exchange, timestamp_ms, fair_value, variance in venues:
+        decimal_combiner.update(
+            VenueFairValueState(
+                exchange=exchange,
+                market="BTC-USD",
+                timestamp_ms=timestamp_ms,
+                fair_value=Decimal(fair_value),
+                variance=Decimal(variance),
+            )
+        )
+        float_combiner.update(
+            VenueFairValueState(
+                exchange=exchange,
+                market="BTC-USD",
+                timestamp_ms=timestamp_ms,
+                fair_value=float(fair_value),
+                variance=float(variance),
+            )
+        )
+
+    decimal_result = decimal_combiner.combine(now_ms=2500)
+    float_result = float_combiner.combine(now_ms=2500)
+
+    assert decimal_result is not None
+    assert float_result is not None
+    assert isinstance(float_result.fair_value, float)
+    assert float_result.fair_value == pytest.approx(float(decimal_result.fair_value), rel=1e-12)
+    assert float_result.variance == pytest.approx(float(decimal_result.variance), rel=1e-12)
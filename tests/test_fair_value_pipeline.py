@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from icarus.measurements import MarketMeasurement, MarketMeasurementEngine
+from icarus.observations import BBOObservation, TradeObservation
+from icarus.strategy.fair_value.estimator import RawFairValueEstimator
+from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import VenueBasisKalmanConfig
+from icarus.strategy.fair_value.pipeline import AssetFairValuePipeline, VenueFairValuePipeline
+from icarus.strategy.fair_value.types import RawFairValueEstimate, VenueFairValueState
+from icarus.telemetry import LatencyRecorder
+
+
+def _quote(exchange: str, timestamp_ms: int, mid: Decimal, rng: random.Random) -> BBOObservation:
+    half_spread = Decimal(rng.choice(("0.01", "0.02", "0.05", "0.5")))
+    return BBOObservation(
+        exchange=exchange,
+        market="BTC-USD",
+        source_timestamp_ms=timestamp_ms,
+        received_timestamp_ms=timestamp_ms,
+        raw_message={},
+        bid_price=mid - half_spread,
+        bid_size=Decimal(rng.randint(1, 20)) / Decimal("4"),
+        ask_price=mid + half_spread,
+        ask_size=Decimal(rng.randint(1, 20)) / Decimal("4"),
+    )
+
+
+def _rebuild_all(
+    engines: dict[str, MarketMeasurementEngine],
+    estimator: RawFairValueEstimator,
+    now_ms: int,
+) -> dict[str, VenueFairValueState]:
+    """The per-event loop the capture scripts used before the pipeline existed."""
+    states: dict[str, VenueFairValueState] = {}
+    for exchange, engine in engines.items():
+        measurement = engine.current_measurement(now_ms)
+        if measurement is None:
+            continue
+        estimate = estimator.estimate(measurement)
+        if estimate.raw_fair_value is None or estimate.measurement_variance is None:
+            continue
+        assert measurement.quote_age_ms is not None
+        states[exchange] = VenueFairValueState(
+            exchange=exchange,
+            market="BTC",
+            timestamp_ms=estimate.timestamp_ms - measurement.quote_age_ms,
+            fair_value=estimate.raw_fair_value,
+            variance=estimate.measurement_variance,
+        )
+    return states
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pipeline_matches_rebuilding_every_venue_on_every_event(seed: int) -> None:
+    rng = random.Random(seed)
+    exchanges = ("coinbase", "kraken", "okx", "hyperliquid")
+    # Kraken/OKX quote rarely so their estimates mostly age between quotes.
+    quote_weights = (10, 1, 1, 4)
+    pipeline = VenueFairValuePipeline("BTC")
+    engines: dict[str, MarketMeasurementEngine] = {}
+    estimator = RawFairValueEstimator()
+    mid = Decimal("60000")
+    now_ms = 0
+
+    for _ in range(600):
+        now_ms += rng.choice((1, 7, 40, 90, 160, 400, 2_000))
+        mid += Decimal(rng.randint(-3, 3)) / Decimal("100")
+        exchange = rng.choices(exchanges, weights=quote_weights)[0]
+        observation = _quote(exchange, now_ms, mid, rng)
+
+        pipeline.on_observation(observation)
+        engine = engines.get(exchange)
+        if engine is None:
+            engine = MarketMeasurementEngine(exchange=exchange, market="BTC-USD")
+            engines[exchange] = engine
+        engine.on_observation(observation)
+
+        assert pipeline.refresh(now_ms) == _rebuild_all(engines, estimator, now_ms)
+
+
+def test_pipeline_only_recomputes_venues_that_changed(monkeypatch: pytest.MonkeyPatch) -> None:
+    estimated: list[str] = []
+    original_estimate = RawFairValueEstimator.estimate
+
+    def counting_estimate(
+        self: RawFairValueEstimator,
+        measurement: MarketMeasurement,
+    ) -> RawFairValueEstimate:
+        estimated.append(measurement.exchange)
+        return original_estimate(self, measurement)
+
+    monkeypatch.setattr(RawFairValueEstimator, "estimate", counting_estimate)
+    rng = random.Random(0)
+    pipeline = VenueFairValuePipeline("BTC")
+    pipeline.on_observation(_quote("kraken", 1_000, Decimal("60000"), rng))
+    pipeline.refresh(1_000)
+
+    estimated.clear()
+    for offset_ms in range(1, 51):
+        pipeline.on_observation(_quote("coinbase", 1_000 + offset_ms, Decimal("60000"), rng))
+        states = pipeline.refresh(1_000 + offset_ms)
+        assert set(states) == {"coinbase", "kraken"}
+
+    # Kraken stays inside its first quote-age tier, so only Coinbase is rebuilt.
+    assert estimated == ["coinbase"] * 50
+
+    estimated.clear()
+    pipeline.on_observation(_quote("coinbase", 1_101, Decimal("60000"), rng))
+    pipeline.refresh(1_101)
+    assert sorted(estimated) == ["coinbase", "kraken"]
+
+
+def test_pipeline_ignores_trades_until_a_quote_arrives() -> None:
+    pipeline = VenueFairValuePipeline("BTC")
+    pipeline.on_observation(
+        TradeObservation(
+            exchange="okx",
+            market="BTC-USDT",
+            source_timestamp_ms=1_000,
+            received_timestamp_ms=1_000,
+            raw_message={},
+            trade_id="1",
+            side="buy",
+            price=Decimal("60000"),
+            size=Decimal("0.1"),
+        )
+    )
+
+    assert pipeline.refresh(1_000) == {}
+    assert pipeline.measurements() == {}
+
+
+def test_asset_pipeline_steps_quotes_only_and_times_every_stage() -> None:
+    rng = random.Random(0)
+    recorder = LatencyRecorder()
+    stages = [recorder.histogram(stage) for stage in ("measure", "combine", "kalman", "basis")]
+    pipeline = AssetFairValuePipeline(
+        "BTC",
+        basis_config=VenueBasisKalmanConfig(anchor_exchange="coinbase"),
+        stage_latency=stages,
+    )
+    trade = TradeObservation(
+        exchange="coinbase",
+        market="BTC-USD",
+        source_timestamp_ms=1_000,
+        received_timestamp_ms=1_000,
+        raw_message={},
+        trade_id="1",
+        side="buy",
+        price=Decimal("60000"),
+        size=Decimal("0.1"),
+    )
+
+    assert pipeline.step(trade, 1_000) is None
+    assert pipeline.step(_quote("hyperliquid_perp", 1_000, Decimal("60010"), rng), 1_000) is None
+    step = pipeline.step(_quote("coinbase", 1_001, Decimal("60000"), rng), 1_001)
+
+    assert step is not None
+    assert sorted(step.venue_states) == ["coinbase", "hyperliquid_perp"]
+    assert step.composite is not None and step.composite.contributing_exchanges == ("coinbase",)
+    assert step.kalman is not None and step.kalman.used_venues == ("coinbase",)
+    assert step.basis is not None and step.last_basis is step.basis
+    assert [histogram.count for histogram in stages] == [2, 1, 1, 1]
+    with pytest.raises(ValueError):
+        AssetFairValuePipeline(
+            "BTC",
+            basis_config=VenueBasisKalmanConfig(anchor_exchange="coinbase"),
+            stage_latency=stages[:3],
+        )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import itertools
+from decimal import Decimal
+
+import pytest
+
+from icarus.strategy.fair_value.raw import compute_micro_alpha
+from icarus.strategy.fair_value.tiers import Tiers
+from icarus.strategy.fair_value.types import FairValueFeatures
+
+SPREADS_BPS = ("0.5", "1", "1.01", "2", "2.01", "5", "5.01", "9")
+AGES_MS = (0, 100, 101, 250, 251, 500, 501)
+HALF_DEPTHS = ("0", "0.25", "0.5", "0.75", "2.5", "3")
+
+
+def _features(spread_bps: str, age_ms: int, half_depth: str, number: type) -> FairValueFeatures:
+    return FairValueFeatures(
+        midprice=number("100"),
+        microprice=number("100.02"),
+        spread_bps=number(spread_bps),
+        depth_imbalance=number("-0.8"),
+        quote_age_ms=age_ms,
+        mid_volatility_bps=None,
+        micro_volatility_bps=None,
+        top_bid_depth=number(half_depth),
+        top_ask_depth=number(half_depth),
+    )
+
+
+def test_micro_alpha_modes_agree_on_every_tier_boundary() -> None:
+    for spread_bps, age_ms, half_depth in itertools.product(SPREADS_BPS, AGES_MS, HALF_DEPTHS):
+        decimal_alpha = compute_micro_alpha(_features(spread_bps, age_ms, half_depth, Decimal))
+        float_alpha = compute_micro_alpha(_features(spread_bps, age_ms, half_depth, float))
+        assert isinstance(decimal_alpha, Decimal)
+        assert isinstance(float_alpha, float)
+        assert float_alpha == pytest.approx(float(decimal_alpha), rel=1e-12, abs=0.0)
+
+
+def test_micro_alpha_tiers_at_the_edges() -> None:
+    # Tight spread, fresh quote, deep book: alpha is the imbalance itself.
+    assert compute_micro_alpha(_features("1", 100, "2.5", Decimal)) == Decimal("0.8")
+    # Each gate steps down just past its edge.
+    assert compute_micro_alpha(_features("1.01", 100, "2.5", Decimal)) == Decimal("0.48")
+    assert compute_micro_alpha(_features("1", 101, "2.5", Decimal)) == Decimal("0.56")
+    assert compute_micro_alpha(_features("1", 100, "2", Decimal)) == Decimal("0.64")
+    assert compute_micro_alpha(_features("1", 100, "0", Decimal)) == Decimal("0.4")
+    assert compute_micro_alpha(_features("5.01", 100, "2.5", Decimal)) == 0
+
+
+def test_tiers_need_one_factor_past_the_last_bound() -> None:
+    with pytest.raises(ValueError):
+        Tiers.of(float, ("1", "2"), ("1", "0.5"))
@@ -131,3 +131,70 @@ def test_age_factor_tiers(age_ms: int, expected_factor: Decimal) -> None:
     v_aged = compute_measurement_variance(f_aged)
     assert v_fresh is not None and v_aged is not None
     assert v_aged == v_fresh * expected_factor
+
+
+def test_float_features_match_decimal_variance() -> None:
+    decimal_features = _features(
+        spread_bps=Decimal("3.2"),
+        top_depth_btc=Decimal("0.4"),
+        quote_age_ms=900,
+        mid_vol_bps=Decimal("2.5"),
+    )
+    float_features = FairValueFeatures(
+        midprice=float(decimal_features.midprice),
+        microprice=None,
+        spread_bps=3.2,
+        depth_imbalance=0.0,
+        quote_age_ms=900,
+        mid_volatility_bps=2.5,
+        micro_volatility_bps=1.0,
+        top_bid_depth=0.2,
+        top_ask_depth=0.2,
+    )
+
+    decimal_variance = compute_measurement_variance(decimal_features)
+    float_variance = compute_measurement_variance(float_features)
+
+    assert decimal_variance is not None
+    assert isinstance(float_variance, float)
+    assert float_variance == pytest.approx(float(decimal_variance), rel=1e-12)
+
+
+def test_decimal_mode_rejects_mixed_float_inputs() -> None:
+    features = _features()
+    mixed = FairValueFeatures(
+        midprice=features.midprice,
+        microprice=None,
+        spread_bps=1.0,
+        depth_imbalance=Decimal("0"),
+        quote_age_ms=50,
+        mid_volatility_bps=None,
+        micro_volatility_bps=None,
+        top_bid_depth=None,
+        top_ask_depth=None,
+    )
+    with pytest.raises(TypeError):
+        compute_measurement_variance(mixed)
+
+
+@pytest.mark.parametrize("age_ms", [0, 100, 101, 250, 251, 500, 501])
+@pytest.mark.parametrize("top_depth_btc", ["0", "4", "8.3333333333"])
+def test_variance_modes_agree_on_tier_boundaries(age_ms: int, top_depth_btc: str) -> None:
+    decimal_features = _features(top_depth_btc=Decimal(top_depth_btc), quote_age_ms=age_ms)
+    float_features = FairValueFeatures(
+        midprice=60000.0,
+        microprice=None,
+        spread_bps=1.0,
+        depth_imbalance=0.0,
+        quote_age_ms=age_ms,
+        mid_volatility_bps=1.0,
+        micro_volatility_bps=1.0,
+        top_bid_depth=float(top_depth_btc) / 2,
+        top_ask_depth=float(top_depth_btc) / 2,
+    )
+
+    decimal_variance = compute_measurement_variance(decimal_features)
+    float_variance = compute_measurement_variance(float_features)
+
+    assert decimal_variance is not None and float_variance is not None
+    assert float_variance == pytest.approx(float(decimal_variance), rel=1e-9)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from decimal import Decimal
 
-from icarus.strategy.fair_value.weighting import cap_and_renormalize
+import numpy as np
+
+from icarus.strategy.fair_value.weighting import cap_and_renormalize, cap_and_renormalize_rows
 
 
 def _approx_sum(weights: list[Decimal]) -> Decimal:
@@ -62,3 +64,18 @@ def test_cap_works_with_float_inputs() -> None:
     out = cap_and_renormalize([0.99, 0.01], max_weight=0.75)
     assert out[0] == 0.75
     assert abs(out[1] - 0.25) < 1e-12
+
+
+def test_cap_rows_match_scalar_cap_per_row() -> None:
+    rng = np.random.default_rng(5)
+    raw = rng.pareto(1.0, size=(2_000, 6)) + 1e-3
+    valid = rng.random((2_000, 6)) < 0.7
+    normalized = raw / np.where(valid, raw, 0.0).sum(axis=1, keepdims=True)
+    for max_weight in (0.2, 0.4, 0.75):
+        out = cap_and_renormalize_rows(normalized, valid, max_weight=max_weight)
+        for row in range(len(raw)):
+            expected = cap_and_renormalize(
+                normalized[row][valid[row]].tolist(), max_weight=max_weight
+            )
+            assert out[row][valid[row]].tolist() == expected
+            assert not out[row][~valid[row]].any()
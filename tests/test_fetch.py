@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from icarus.fetch import (
+    AsyncHttpClient,
+    HttpError,
+    RateBudget,
+    ResponseCache,
+    TickGrid,
+    TimeWindow,
+    budget_span_s,
+    coinbase_candles,
+    fetch_windows,
+    graph_swaps,
+    split_windows,
+    venues,
+)
+
+type Route = Callable[[BaseHTTPRequestHandler, dict[str, list[str]], bytes], None]
+
+
+class _StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, routes: dict[str, Route]) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.routes = routes
+        self.requests: list[tuple[str, int]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _StandIn
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._route(b"")
+
+    def do_POST(self) -> None:
+        self._route(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+    def _route(self, body: bytes) -> None:
+        parts = urlsplit(self.path)
+        with self.server.lock:
+            self.server.requests.append((parts.path, self.client_address[1]))
+        self.server.routes[parts.path](self, parse_qs(parts.query), body)
+
+
+def _send(
+    handler: BaseHTTPRequestHandler,
+    payload: Any,
+    *,
+    status: int = 200,
+    headers: dict[str, str] | None = None,
+) -> None:
+    body = json.dumps(payload).encode()
+    handler.send_response(status)
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    if (headers or {}).get("Content-Encoding") == "gzip":
+        body = gzip.compress(body)
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def _send_chunked(handler: BaseHTTPRequestHandler, payload: Any) -> None:
+    body = json.dumps(payload).encode()
+    handler.send_response(200)
+    handler.send_header("Transfer-Encoding", "chunked")
+    handler.end_headers()
+    for i in range(0, len(body), 7):
+        chunk = body[i : i + 7]
+        handler.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+    handler.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def stand_in() -> Iterator[Callable[[dict[str, Route]], _StandIn]]:
+    servers: list[_StandIn] = []
+
+    def start(routes: dict[str, Route]) -> _StandIn:
+        server = _StandIn(routes)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+async def test_client_pools_connections_and_decodes_bodies(
+    stand_in: Callable[[dict[str, Route]], _StandIn],
+) -> None:
+    server = stand_in(
+        {
+            "/plain": lambda h, q, b: _send(h, {"n": int(q["n"][0])}),
+            "/gzip": lambda h, q, b: _send(
+                h, {"n": int(q["n"][0])}, headers={"Content-Encoding": "gzip"}
+            ),
+            "/chunked": lambda h, q, b: _send_chunked(h, {"n": int(q["n"][0]), "pad": "x" * 50}),
+            "/echo": lambda h, q, b: _send(h, json.loads(b)),
+        }
+    )
+    async with AsyncHttpClient(budgets={}, max_connections_per_host=3) as client:
+        paths = ["/plain", "/gzip", "/chunked"] * 10
+        results = await asyncio.gather(
+            *(client.get_json(server.url + path, {"n": i}) for i, path in enumerate(paths))
+        )
+        echoed = await client.post_json(server.url + "/echo", {"a": [1, 2]})
+        response = await client.request("GET", server.url + "/plain?n=7")
+
+    assert [r["n"] for r in results] == list(range(len(paths)))
+    assert echoed == {"a": [1, 2]}
+    assert response.status == 200 and response.json() == {"n": 7}
+    assert response.sent_timestamp_ms <= response.received_timestamp_ms
+    assert response.elapsed_ns > 0
+    # 32 requests over at most three kept-alive connections.
+    assert len(server.requests) == 32
+    assert len({port for _, port in server.requests}) <= 3
+
+
+async def test_client_retries_transient_statuses_then_raises(
+    stand_in: Callable[[dict[str, Route]], _StandIn],
+) -> None:
+    calls = {"flaky": 0}
+
+    def flaky(handler: BaseHTTPRequestHandler, query: Any, body: bytes) -> None:
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            _send(handler, {"error": "busy"}, status=503, headers={"Retry-After": "0"})
+        else:
+            _send(handler, {"ok": True})
+
+    server = stand_in(
+        {
+            "/flaky": flaky,
+            "/missing": lambda h, q, b: _send(h, {"error": "nope"}, status=404),
+            "/busy": lambda h, q, b: _send(h, {"error": "busy"}, status=429),
+        }
+    )
+    async with AsyncHttpClient(budgets={}, retries=3, backoff_s=0.01) as client:
+        assert await client.get_json(server.url + "/flaky") == {"ok": True}
+        with pytest.raises(HttpError) as missing:
+            await client.get_json(server.url + "/missing")
+        with pytest.raises(HttpError) as busy:
+            await client.get_json(server.url + "/busy")
+
+    assert calls["flaky"] == 3
+    assert missing.value.status == 404
+    assert busy.value.status == 429
+    paths = [path for path, _ in server.requests]
+    assert paths.count("/missing") == 1
+    assert paths.count("/busy") == 4
+
+
+async def test_client_raises_on_redirects(
+    stand_in: Callable[[dict[str, Route]], _StandIn],
+) -> None:
+    server = stand_in(
+        {
+            "/moved": lambda h, q, b: _send(
+                h, {"error": "moved"}, status=301, headers={"Location": "/elsewhere"}
+            ),
+        }
+    )
+    async with AsyncHttpClient(budgets={}, retries=3, backoff_s=0.01) as client:
+        with pytest.raises(HttpError) as moved:
+            await client.get_json(server.url + "/moved")
+
+    assert moved.value.status == 301
+    assert [path for path, _ in server.requests] == ["/moved"]
+
+
+async def test_rate_budget_spaces_requests_after_the_burst() -> None:
+    budget = RateBudget(40.0, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        await budget.acquire()
+    assert time.monotonic() - started < 0.02
+    await asyncio.gather(*(budget.acquire() for _ in range(6)))
+    assert time.monotonic() - started >= 6 / 40.0 * 0.9
+
+    with pytest.raises(ValueError):
+        RateBudget(0.0)
+
+
+def test_tick_grid_skips_overrun_slots_and_keeps_phase() -> None:
+    grid = TickGrid(100.0, 5.0)
+    assert grid.slot_start_s == 100.0
+    assert grid.advance(101.5) == pytest.approx(3.5)
+    assert (grid.slot, grid.skipped) == (1, 0)
+
+    # A tick that runs past two slot starts drops both.
+    assert grid.advance(116.0) == pytest.approx(4.0)
+    assert (grid.slot, grid.skipped, grid.slot_start_s) == (4, 2, 120.0)
+
+    with pytest.raises(ValueError):
+        TickGrid(0.0, 0.0)
+
+
+def test_coinbase_budget_cannot_cover_fifty_symbols_per_interval() -> None:
+    host = "api.exchange.coinbase.com"
+    # 8 req/s: 30 symbols plus USDT-USD fit a 5 s interval, 50 plus one don't.
+    assert budget_span_s(31, host) == pytest.approx(3.875)
+    assert budget_span_s(51, host) == pytest.approx(6.375)
+    assert budget_span_s(51, "example.com") == 0.0
+
+    # Ticks paced by the budget land on every other slot, each 10 s apart.
+    grid = TickGrid(0.0, 5.0)
+    starts = []
+    for _ in range(4):
+        starts.append(grid.slot_start_s)
+        grid.advance(grid.slot_start_s + budget_span_s(51, host))
+    assert starts == [0.0, 10.0, 20.0, 30.0]
+    assert grid.skipped == 4
+
+    grid = TickGrid(0.0, 5.0)
+    for _ in range(4):
+        grid.advance(grid.slot_start_s + budget_span_s(31, host))
+    assert (grid.slot, grid.skipped) == (4, 0)
+
+
+def test_split_windows_follow_a_fixed_grid() -> None:
+    assert split_windows(250, 1000, 300) == [
+        TimeWindow(0, 300),
+        TimeWindow(300, 600),
+        TimeWindow(600, 900),
+        TimeWindow(900, 1000),
+    ]
+    # A later, overlapping span shares every full window.
+    assert split_windows(310, 1500, 300)[:2] == [TimeWindow(300, 600), TimeWindow(600, 900)]
+    assert split_windows(5, 5, 10) == []
+    with pytest.raises(ValueError):
+        split_windows(0, 10, 0)
+
+
+async def test_fetch_windows_caches_pages_and_resumes(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path)
+    windows = split_windows(0, 1000, 100)
+    fetched: list[TimeWindow] = []
+    failures = {"left": 1}
+    in_flight = {"now": 0, "max": 0}
+
+    async def page(window: TimeWindow) -> list[int]:
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        fetched.append(window)
+        if window.start == 300 and failures["left"]:
+            failures["left"] -= 1
+            raise ConnectionError("dropped")
+        return list(range(window.start, window.end, 50))
+
+    options: dict[str, Any] = {
+        "cache": cache,
+        "namespace": "test",
+        "request": {"symbol": "X"},
+        "settled_before": 900,
+        "concurrency": 4,
+    }
+    with pytest.raises(ConnectionError):
+        await fetch_windows(windows, page, **options)
+    assert len(fetched) == len(windows)
+    assert in_flight["max"] == 4
+
+    # Rerun: only the failed window and the unsettled last one go out again.
+    fetched.clear()
+    seen: list[bool] = []
+    pages = await fetch_windows(
+        windows, page, on_page=lambda w, p, from_cache: seen.append(from_cache), **options
+    )
+    assert sorted(w.start for w in fetched) == [300, 900]
+    assert seen.count(True) == len(windows) - 2
+    assert [x for rows in pages for x in rows] == list(range(0, 1000, 50))
+    assert cache.get("test", {"symbol": "X"}, TimeWindow(900, 1000)) is None
+    assert cache.get("test", {"symbol": "Y"}, TimeWindow(0, 100)) is None
+
+
+async def test_coinbase_candles_pages_concurrently_against_stand_in(
+    stand_in: Callable[[dict[str, Route]], _StandIn],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    def candles(handler: BaseHTTPRequestHandler, query: dict[str, list[str]], body: bytes) -> None:
+        granularity = int(query["granularity"][0])
+        start = int(datetime.fromisoformat(query["start"][0]).timestamp())
+        end = int(datetime.fromisoformat(query["end"][0]).timestamp())
+        if (end - start) // granularity > 300:
+            _send(handler, {"message": "too many candles"}, status=400)
+            return
+        # Bars on the granularity grid, newest first and inclusive of both
+        # ends, as Coinbase serves them.
+        newest = end // granularity * granularity
+        rows = [[t, 1.0, 2.0, 1.5, t / 1e6, 3.0] for t in range(newest, start - 1, -granularity)]
+        _send(handler, rows)
+
+    server = stand_in({"/products/ETH-USD/candles": candles})
+    monkeypatch.setattr(venues, "COINBASE_CANDLES_URL", server.url + "/products/{product}/candles")
+    start, end = 1_700_000_030, 1_700_000_030 + 3 * 86_400
+    cache = ResponseCache(tmp_path)
+    async with AsyncHttpClient(budgets={}) as client:
+        rows = await coinbase_candles(client, "ETH-USD", 60, start, end, cache=cache)
+        requests = len(server.requests)
+        again = await coinbase_candles(client, "ETH-USD", 60, start, end, cache=cache)
+
+    times = [int(row[0]) for row in rows]
+    assert times == list(range(start + 10, end + 1, 60))
+    assert requests == len(split_windows(start, end, 60 * 300))
+    # Every window is long settled, so the rerun is served from the cache.
+    assert again == rows
+    assert len(server.requests) == requests
+
+
+async def test_graph_swaps_page_by_id_within_windows(
+    stand_in: Callable[[dict[str, Route]], _StandIn],
+) -> None:
+    # Bursts of swaps share a timestamp, across page boundaries.
+    swaps = [
+        {
+            "id": f"0x{i * 7919 % 10_007:05x}-{i}",
+            "timestamp": str(1_700_000_000 + (i // 40) * 97),
+            "logIndex": str(i % 40),
+            "amountUSD": "1",
+        }
+        for i in range(3000)
+    ]
+
+    def graphql(handler: BaseHTTPRequestHandler, query: Any, body: bytes) -> None:
+        text = json.loads(body)["query"]
+        lo, hi, first = (
+            int(re.findall(pattern, text)[0])
+            for pattern in (r'timestamp_gte: "(\d+)"', r'timestamp_lt: "(\d+)"', r"first: (\d+)")
+        )
+        after = re.search(r'id_gt: "([^"]+)"', text)
+        rows = sorted((s for s in swaps if lo <= int(s["timestamp"]) < hi), key=lambda s: s["id"])
+        if after is not None:
+            rows = [s for s in rows if s["id"] > after.group(1)]
+        _send(handler, {"data": {"swaps": rows[:first]}})
+
+    server = stand_in({"/subgraphs/id/abc": graphql})
+    start = 1_700_000_000
+    end = start + 75 * 97
+    async with AsyncHttpClient(budgets={}) as client:
+        result = await graph_swaps(
+            client,
+            server.url + "/subgraphs/id/abc",
+            "0xpool",
+            start,
+            end,
+            window_s=1800,
+            page_size=100,
+        )
+
+    expected = sorted(
+        (s for s in swaps if start <= int(s["timestamp"]) < end),
+        key=lambda s: (int(s["timestamp"]), int(s["logIndex"])),
+    )
+    assert result == expected
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import gzip
+import json
+import pickle
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from icarus.capture import FrameRecorder, FrameSegmentReader, iter_recorded_frames
+from icarus.capture.frames import list_frame_segments
+from icarus.observations import BBOObservation, OrderBookObservation, TradeObservation
+from icarus.replay import iter_frame_observations
+from icarus.sockets.base import BaseSocket
+from icarus.sockets.okx import OkxSocket
+
+
+class FakeClock:
+    def __init__(self, start_ns: int = 1_776_384_000_000_000_000, step_ns: int = 1_000) -> None:
+        self.now_ns = start_ns
+        self.step_ns = step_ns
+
+    def __call__(self) -> int:
+        self.now_ns += self.step_ns
+        return self.now_ns
+
+
+def test_recorder_round_trips_text_and_binary_frames(tmp_path: Path) -> None:
+    clock = FakeClock()
+    recorder = FrameRecorder(tmp_path, "okx", block_frames=4, clock=clock)
+    payloads: list[str | bytes] = [f'{{"seq": {i}, "px": "75165.9{i % 10}"}}' for i in range(10)]
+    payloads.insert(3, b"\x00\xffbinary")
+    for payload in payloads:
+        recorder.record(payload)
+    recorder.close()
+
+    frames = list(iter_recorded_frames(tmp_path, "okx"))
+
+    assert [frame.payload for frame in frames] == payloads
+    received = [frame.received_ns for frame in frames]
+    assert received == sorted(received) and len(set(received)) == len(received)
+    (segment,) = list_frame_segments(tmp_path)
+    # The segment is a plain multi-member gzip stream; the index makes it seekable.
+    assert b'"seq": 9' in gzip.decompress(segment.read_bytes())
+    stats = recorder.stats()
+    assert (stats.frames, stats.blocks_written, stats.dropped_frames) == (11, 3, 0)
+    assert FrameSegmentReader(segment).frames == 11
+
+
+def test_segments_roll_over_and_reads_seek_by_receive_time(tmp_path: Path) -> None:
+    clock = FakeClock(step_ns=1_000_000)
+    recorder = FrameRecorder(tmp_path, "coinbase", block_frames=5, segment_bytes=200, clock=clock)
+    for i in range(60):
+        recorder.record(json.dumps({"i": i}))
+    recorder.close()
+    other = FrameRecorder(tmp_path, "coinbase_perp", block_frames=5, clock=FakeClock())
+    other.record("{}")
+    other.close()
+
+    segments = list_frame_segments(tmp_path, "coinbase")
+    assert len(segments) > 1
+    frames = list(iter_recorded_frames(tmp_path, "coinbase"))
+    assert [json.loads(frame.payload)["i"] for frame in frames] == list(range(60))
+
+    start_ns, end_ns = frames[17].received_ns, frames[42].received_ns
+    window = list(iter_recorded_frames(tmp_path, "coinbase", start_ns=start_ns, end_ns=end_ns))
+    assert window == frames[17:42]
+    assert [f.received_timestamp_ms for f in window] == [f.received_ns // 1_000_000 for f in window]
+
+
+def test_recorder_pickles_configuration_only(tmp_path: Path) -> None:
+    recorder = FrameRecorder(tmp_path, "kraken", block_frames=1)
+    recorder.record("{}")
+
+    clone = pickle.loads(pickle.dumps(recorder))
+
+    assert (clone.directory, clone.label, clone.block_frames) == (tmp_path, "kraken", 1)
+    assert clone.stats().frames == 0
+    recorder.close()
+    with pytest.raises(ValueError):
+        FrameRecorder(tmp_path, "kraken", codec="lz4")  # type: ignore[arg-type]
+
+
+class ScriptedWebSocket:
+    def __init__(self, socket: BaseSocket, messages: list[str]) -> None:
+        self.socket = socket
+        self.messages = messages
+
+    async def close(self) -> None:
+        return None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        for message in self.messages:
+            yield message
+        self.socket._closed = True
+
+
+class ScriptedSocket(BaseSocket):
+    def __init__(self, messages: list[str]) -> None:
+        super().__init__("wss://example.test/socket")
+        self.messages = messages
+
+    async def connect(self) -> None:
+        self._ws = ScriptedWebSocket(self, self.messages)
+
+    async def after_connect(self) -> None:
+        return None
+
+
+async def test_stream_messages_tees_raw_frames_into_the_recorder(tmp_path: Path) -> None:
+    messages = ['{"n": 1.10}', '{"n": 2}', '{"n": 3}']
+    socket = ScriptedSocket(messages)
+    socket.frame_recorder = FrameRecorder(tmp_path, "scripted")
+
+    parsed = [message async for message in socket.stream_messages()]
+    await socket.close()
+
+    assert parsed == [{"n": 1.1}, {"n": 2}, {"n": 3}]
+    # Frames are recorded verbatim, before parsing.
+    assert [f.payload for f in iter_recorded_frames(tmp_path, "scripted")] == messages
+
+
+def _okx_frames() -> list[str]:
+    return [
+        json.dumps(
+            {
+                "arg": {"channel": "tickers", "instId": "BTC-USDT"},
+                "data": [
+                    {
+                        "instId": "BTC-USDT",
+                        "bidPx": "75165.93",
+                        "bidSz": "0.22",
+                        "askPx": "75165.94",
+                        "askSz": "0.20",
+                        "ts": "1776384014957",
+                    }
+                ],
+            }
+        ),
+        json.dumps({"event": "subscribe", "arg": {"channel": "tickers"}}),
+        json.dumps(
+            {
+                "arg": {"channel": "books5", "instId": "BTC-USDT"},
+                "action": "snapshot",
+                "data": [
+                    {
+                        "instId": "BTC-USDT",
+                        "bids": [["75165.93", "0.22", "0", "1"]],
+                        "asks": [["75165.94", "0.20", "0", "1"]],
+                        "ts": "1776384015100",
+                    }
+                ],
+            }
+        ),
+        json.dumps(
+            {
+                "arg": {"channel": "trades", "instId": "BTC-USDT"},
+                "data": [
+                    {
+                        "instId": "BTC-USDT",
+                        "tradeId": "12345",
+                        "px": "75165.93",
+                        "sz": "0.01",
+                        "side": "buy",
+                        "ts": "1776384015000",
+                    }
+                ],
+            }
+        ),
+    ]
+
+
+def test_recorded_frames_renormalise_through_the_socket(tmp_path: Path) -> None:
+    clock = FakeClock(step_ns=2_000_000)
+    recorder = FrameRecorder(tmp_path, "okx", clock=clock)
+    for frame in _okx_frames():
+        recorder.record(frame)
+    recorder.close()
+    frames = list(iter_recorded_frames(tmp_path, "okx"))
+
+    observations = list(iter_frame_observations(OkxSocket("BTC-USDT"), frames))
+
+    bbo, book, trade = observations
+    assert isinstance(bbo, BBOObservation)
+    assert bbo.bid_price == Decimal("75165.93")
+    assert bbo.received_timestamp_ms == frames[0].received_ns // 1_000_000
+    assert isinstance(book, OrderBookObservation)
+    assert book.received_timestamp_ms == frames[2].received_ns // 1_000_000
+    assert isinstance(trade, TradeObservation)
+
+    renamed = list(
+        iter_frame_observations(
+            OkxSocket("BTC-USDT", numeric_mode="float"), frames, exchange="okx_alt"
+        )
+    )
+    assert {obs.exchange for obs in renamed} == {"okx_alt"}
+    assert isinstance(renamed[0], BBOObservation) and isinstance(renamed[0].bid_price, float)
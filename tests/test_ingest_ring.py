@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+from icarus.ingest import MarketRouter, MultiProcessIngestor, ObservationRing
+from icarus.observations import (
+    BBOObservation,
+    Observation,
+    OrderBookLevel,
+    OrderBookObservation,
+    TradeObservation,
+)
+from icarus.observations.types import EMPTY_RAW_MESSAGE
+from icarus.sockets.base import BaseSocket
+
+
+def _bbo(timestamp_ms: int, mid: Decimal = Decimal("60000.25")) -> BBOObservation:
+    return BBOObservation(
+        exchange="coinbase",
+        market="BTC-USD",
+        source_timestamp_ms=timestamp_ms - 3,
+        received_timestamp_ms=timestamp_ms,
+        raw_message={"channel": "ticker"},
+        bid_price=mid - Decimal("0.01"),
+        bid_size=Decimal("0.5"),
+        ask_price=mid + Decimal("0.01"),
+        ask_size=Decimal("1.25"),
+    )
+
+
+def _book(timestamp_ms: int, levels_per_side: int) -> OrderBookObservation:
+    bids = tuple(
+        OrderBookLevel(side="buy", price=Decimal("60000") - i, size=Decimal("0.1") * (i + 1))
+        for i in range(levels_per_side)
+    )
+    asks = tuple(
+        OrderBookLevel(side="sell", price=Decimal("60001") + i, size=Decimal("0.2") * (i + 1))
+        for i in range(levels_per_side)
+    )
+    return OrderBookObservation(
+        exchange="okx",
+        market="BTC-USDT",
+        source_timestamp_ms=None,
+        received_timestamp_ms=timestamp_ms,
+        raw_message={},
+        update_type="snapshot",
+        levels=bids + asks,
+    )
+
+
+def _trade(timestamp_ms: int) -> TradeObservation:
+    return TradeObservation(
+        exchange="kraken",
+        market="BTC/USD",
+        source_timestamp_ms=timestamp_ms,
+        received_timestamp_ms=timestamp_ms,
+        raw_message={},
+        trade_id="t-42",
+        side="sell",
+        price=Decimal("60000.5"),
+        size=Decimal("0.003"),
+    )
+
+
+def test_ring_round_trips_bbo_book_and_trade_records() -> None:
+    ring = ObservationRing.create(capacity=8, book_levels=3)
+    try:
+        assert ring.publish(_bbo(1_000))
+        assert ring.publish(_book(1_001, levels_per_side=5))
+        assert ring.publish(_trade(1_002), exchange="kraken_spot")
+
+        bbo, book, trade = ring.decode(ring.consume())
+
+        assert bbo == replace(_bbo(1_000), raw_message={})
+        assert bbo.raw_message is book.raw_message is trade.raw_message is EMPTY_RAW_MESSAGE
+        assert isinstance(book, OrderBookObservation)
+        assert book.source_timestamp_ms is None
+        # Only the top ``book_levels`` per side cross the ring.
+        assert [level.price for level in book.levels] == [
+            Decimal("60000"),
+            Decimal("59999"),
+            Decimal("59998"),
+            Decimal("60001"),
+            Decimal("60002"),
+            Decimal("60003"),
+        ]
+        assert book.microprice == _book(1_001, levels_per_side=5).microprice
+        assert isinstance(trade, TradeObservation)
+        assert (trade.exchange, trade.trade_id, trade.side) == ("kraken_spot", "t-42", "sell")
+        assert trade.size == Decimal("0.003")
+        assert ring.backlog == 0
+    finally:
+        ring.close()
+
+
+def test_ring_decodes_to_float_in_float_mode() -> None:
+    ring = ObservationRing.create(capacity=4)
+    try:
+        ring.publish(_bbo(1_000))
+        (bbo,) = ring.decode(ring.consume(), numeric_mode="float")
+        assert isinstance(bbo, BBOObservation)
+        assert bbo.bid_price == pytest.approx(60000.24)
+        assert isinstance(bbo.bid_price, float)
+    finally:
+        ring.close()
+
+
+def test_full_ring_drops_and_counts_then_wraps_around() -> None:
+    ring = ObservationRing.create(capacity=4)
+    try:
+        results = [ring.publish(_bbo(1_000 + i)) for i in range(6)]
+        assert results == [True] * 4 + [False] * 2
+        assert (ring.published, ring.dropped, ring.backlog) == (4, 2, 4)
+
+        first = ring.decode(ring.consume(max_records=3))
+        assert [obs.received_timestamp_ms for obs in first] == [1_000, 1_001, 1_002]
+
+        for i in range(3):
+            assert ring.publish(_bbo(2_000 + i))
+        rest = ring.decode(ring.consume())
+        assert [obs.received_timestamp_ms for obs in rest] == [1_003, 2_000, 2_001, 2_002]
+        assert ring.dropped == 2
+    finally:
+        ring.close()
+
+
+class ReplaySocket(BaseSocket):
+    """Yields a fixed burst of quotes, standing in for a live venue connection."""
+
+    def __init__(self, count: int) -> None:
+        super().__init__("ws://unused")
+        self.count = count
+
+    async def after_connect(self) -> None:
+        return None
+
+    async def stream_observations(self) -> AsyncIterator[Observation]:
+        for i in range(self.count):
+            yield _bbo(time.time_ns() // 1_000_000, mid=Decimal("60000") + i)
+            await asyncio.sleep(0)
+
+
+def test_ingestor_collects_every_venue_from_worker_processes() -> None:
+    ingestor = MultiProcessIngestor(
+        [(ReplaySocket(50), None, None), (ReplaySocket(30), "coinbase_perp", "BTC-PERP")],
+        capacity=1_024,
+    )
+    try:
+        ingestor.start()
+        received: list[Observation] = []
+        deadline = time.monotonic() + 30.0
+        while len(received) < 80 and time.monotonic() < deadline:
+            received.extend(ingestor.poll())
+            time.sleep(0.01)
+
+        assert len(received) == 80
+        perp = [obs for obs in received if obs.exchange == "coinbase_perp"]
+        assert len(perp) == 30
+        assert {obs.market for obs in perp} == {"BTC-PERP"}
+        spot = [obs for obs in received if obs.exchange == "coinbase"]
+        assert [obs.bid_price for obs in spot if isinstance(obs, BBOObservation)] == [
+            Decimal("59999.99") + i for i in range(50)
+        ]
+        stats = {venue.venue: venue for venue in ingestor.stats()}
+        assert set(stats) == {"replay", "coinbase_perp"}
+        assert (stats["replay"].published, stats["replay"].consumed) == (50, 50)
+        assert stats["coinbase_perp"].dropped == 0
+        assert stats["coinbase_perp"].max_lag_ms is not None
+    finally:
+        ingestor.close()
+
+
+
+def test_market_router_demultiplexes_shared_connections() -> None:
+    router: MarketRouter[str] = MarketRouter()
+    router.add("coinbase", "btc-usd", "BTC")
+    router.add("coinbase", "ETH-USD", "ETH")
+    router.add("kraken", "ETH/USDT", "ETH")
+
+    assert router.route(_bbo(1)) == "BTC"
+    assert router.route(replace(_bbo(2), market="ETH-USD")) == "ETH"
+    assert router.route(replace(_bbo(3), exchange="kraken", market="eth/usdt")) == "ETH"
+    assert router.route(replace(_bbo(4), market="SOL-USD")) is None
+    assert router.unrouted == 1
+    with pytest.raises(ValueError):
+        router.add("coinbase", "BTC-USD", "ETH")
+
+    fallback = MarketRouter(default="BTC")
+    assert fallback.route(replace(_bbo(5), market="SOL-USD")) == "BTC"
+    assert fallback.unrouted == 0
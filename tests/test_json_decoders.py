@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import pickle
+from dataclasses import replace
+
+import pytest
+
+from icarus.sockets.coinbase import L2_FLOAT_SCHEMAS, CoinbaseSocket
+from icarus.sockets.decoding import (
+    ChannelSchemaDecoder,
+    available_json_backends,
+    json_decoder,
+    resolve_json_backend,
+)
+from icarus.sockets.kraken import KrakenSocket
+
+FRAME = '{"a":[1,2.5,"x"],"b":{"c":null,"d":true},"e":0.10000000,"f":-3}'
+
+L2_FRAME = json.dumps(
+    {
+        "channel": "l2_data",
+        "client_id": "",
+        "timestamp": "2026-10-17T12:00:00.123456Z",
+        "sequence_num": 7,
+        "events": [
+            {
+                "type": "update",
+                "product_id": "BTC-USD",
+                "updates": [
+                    {
+                        "side": "bid",
+                        "event_time": "2026-10-17T12:00:00.1Z",
+                        "price_level": "60000.01",
+                        "new_quantity": "0.5",
+                    },
+                    {
+                        "side": "offer",
+                        "event_time": "2026-10-17T12:00:00.1Z",
+                        "price_level": "60000.02",
+                        "new_quantity": "0",
+                    },
+                ],
+            }
+        ],
+    },
+    separators=(",", ":"),
+)
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_backends_decode_alike_from_str_and_bytes(backend: str) -> None:
+    decode = json_decoder(backend)  # type: ignore[arg-type]
+    assert decode(FRAME) == json.loads(FRAME)
+    assert decode(FRAME.encode()) == json.loads(FRAME)
+    with pytest.raises(ValueError):
+        decode('{"a":')
+
+
+@pytest.mark.parametrize(
+    "backend", [backend for backend in available_json_backends() if backend != "orjson"]
+)
+def test_float_text_keeps_the_exact_digits(backend: str) -> None:
+    decoded = json_decoder(backend, float_text=True)(FRAME)  # type: ignore[arg-type]
+    assert decoded["e"] == "0.10000000"
+    assert decoded["a"] == [1, "2.5", "x"]
+    assert decoded["f"] == -3
+
+
+def test_backend_resolution() -> None:
+    assert resolve_json_backend("auto") == available_json_backends()[0]
+    assert resolve_json_backend("auto", float_text=True) != "orjson"
+    assert resolve_json_backend("stdlib", float_text=True) == "stdlib"
+    with pytest.raises(ValueError):
+        resolve_json_backend("simdjson")  # type: ignore[arg-type]
+    if "orjson" in available_json_backends():
+        with pytest.raises(ValueError):
+            resolve_json_backend("orjson", float_text=True)
+
+
+def test_schema_decoder_types_known_channels_and_falls_back() -> None:
+    pytest.importorskip("msgspec")
+    decode = ChannelSchemaDecoder(L2_FLOAT_SCHEMAS, json.loads, lax=True)
+
+    typed = decode(L2_FRAME.encode())
+    assert typed["events"][0]["updates"][0]["price_level"] == 60000.01
+    assert typed["events"][0]["updates"][1]["new_quantity"] == 0.0
+    assert typed["sequence_num"] == 7
+
+    # Other channels, and known ones that do not fit their schema, decode generically.
+    assert decode('{"channel":"ticker","events":[]}') == {"channel": "ticker", "events": []}
+    broken = '{"channel":"l2_data","events":[{"type":"update"}]}'
+    assert decode(broken) == json.loads(broken)
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_kraken_keeps_float_text_for_checksums(backend: str) -> None:
+    socket = KrakenSocket("BTC/USD", json_backend=backend)  # type: ignore[arg-type]
+    parsed = socket.parse_message('{"data":[{"bids":[{"price":45283.50,"qty":0.10000000}]}]}')
+    assert parsed["data"][0]["bids"][0] == {"price": "45283.50", "qty": "0.10000000"}
+    assert socket.json_backend != "orjson"
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_coinbase_observations_match_stdlib_and_survive_pickling(backend: str) -> None:
+    def observations(socket: CoinbaseSocket) -> list[object]:
+        message = socket.parse_message(L2_FRAME)
+        return [
+            replace(observation, raw_message={})
+            for observation in socket.convert_message_to_observations(
+                message, received_timestamp_ms=1_000
+            )
+        ]
+
+    options = {"numeric_mode": "float", "keep_raw_messages": False}
+    expected = observations(CoinbaseSocket("BTC-USD", json_backend="stdlib", **options))  # type: ignore[arg-type]
+    socket = CoinbaseSocket("BTC-USD", json_backend=backend, **options)  # type: ignore[arg-type]
+    assert observations(socket) == expected
+    # Worker processes receive pickled sockets and rebuild the decoder.
+    assert observations(pickle.loads(pickle.dumps(socket))) == expected
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import math
+import random
+from dataclasses import asdict
 
+import numpy as np
 import pytest
 
 from icarus.strategy.fair_value.filters.kalman_1d import (
@@ -267,3 +270,60 @@ def test_process_variance_tracks_current_fused_move() -> None:
     assert second is not None
     assert second.raw_fused_price == pytest.approx(110.0, abs=1e-9)
     assert second.process_variance_q == pytest.approx(100.0, abs=1e-9)
+
+
+def test_update_arrays_matches_object_update() -> None:
+    rng = random.Random(5)
+    venues = ["A", "B", "C", "D"]
+    objects = AdaptiveEfficientPriceKalman(config=KalmanFilterConfig(max_venue_weight=0.4))
+    arrays = AdaptiveEfficientPriceKalman(config=KalmanFilterConfig(max_venue_weight=0.4))
+    weights = np.zeros(len(venues))
+
+    compared = 0
+    price = 100.0
+    for step in range(500):
+        price += rng.gauss(0.0, 0.05)
+        fair_values = [
+            math.nan if rng.random() < 0.1 else price + rng.gauss(0.0, 0.02) for _ in venues
+        ]
+        variances = [rng.uniform(1e-5, 1e-3) for _ in venues]
+        ages_ms = [rng.uniform(0.0, 1500.0) for _ in venues]
+        valid = [rng.random() > 0.05 for _ in venues]
+
+        expected = objects.update(
+            step * 0.1,
+            [
+                VenueObservation(name=name, fair_value=fv, local_variance=var, age_ms=age, valid=ok)
+                for name, fv, var, age, ok in zip(
+                    venues, fair_values, variances, ages_ms, valid, strict=True
+                )
+            ],
+        )
+        filtered = arrays.update_arrays(
+            step * 0.1,
+            venues,
+            np.array(fair_values),
+            np.array(variances),
+            ages_ms=np.array(ages_ms),
+            valid=np.array(valid),
+            weights_out=weights,
+        )
+
+        if expected is None:
+            assert filtered is None
+            continue
+        compared += 1
+        assert filtered == expected.filtered_price
+        assert weights.tolist() == [expected.weights.get(name, 0.0) for name in venues]
+        result = arrays.last_result()
+        assert result is not None
+        assert asdict(result) == asdict(expected)
+
+    assert compared > 400
+
+
+def test_update_arrays_rejects_mismatched_lengths() -> None:
+    k = AdaptiveEfficientPriceKalman()
+    with pytest.raises(ValueError):
+        k.update_arrays(0.0, ["A", "B"], np.array([100.0]), np.array([1.0, 1.0]))
+    assert k.last_result() is None
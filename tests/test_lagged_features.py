@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import bisect
+
+import numpy as np
+
+from icarus.features import (
+    LAGGED_FEATURE_INDICES,
+    VenueSeries,
+    build_lagged_feature_matrix,
+    lagged_feature_names,
+    lagged_feature_rows,
+)
+
+LAG_WINDOWS_MS = [2000, 5000]
+
+
+def _series(rng: np.random.Generator, venue: str, n: int, mean_gap_ms: float) -> VenueSeries:
+    gaps = rng.exponential(mean_gap_ms, n).astype(np.int64) + 1
+    gaps[rng.random(n) < 0.01] += 12_000  # outages that trip the lag-gap check
+    return VenueSeries(
+        venue=venue,
+        ts=np.cumsum(gaps) + int(rng.integers(0, 3000)),
+        mid=100.0 + rng.normal(0.0, 0.1, n).cumsum(),
+        features=rng.normal(0.0, 1.0, (n, 6)),
+    )
+
+
+def _reference_rows(
+    series: dict[str, VenueSeries], horizon_ms: int, tolerance_ms: int
+) -> tuple[list[list[float]], list[float]]:
+    """Row-at-a-time statement of the feature rules."""
+    own = series["coinbase"]
+    venues = ["coinbase", *sorted(v for v in series if v != "coinbase")]
+    ts = own.ts.tolist()
+    xs: list[list[float]] = []
+    ys: list[float] = []
+    for i, t in enumerate(ts):
+        j = max(bisect.bisect_left(ts, t + horizon_ms), i + 1)
+        if j >= len(ts) or ts[j] - (t + horizon_ms) > tolerance_ms:
+            continue
+        current = []
+        for venue in venues:
+            k = i if venue == "coinbase" else bisect.bisect_right(series[venue].ts.tolist(), t) - 1
+            current.append(series[venue].features[k] if k >= 0 else None)
+        if any(snapshot is None for snapshot in current):
+            continue
+        lagged: list[float] = []
+        for venue, snapshot in zip(venues, current, strict=True):
+            venue_ts = series[venue].ts.tolist()
+            for fi in LAGGED_FEATURE_INDICES:
+                for w in LAG_WINDOWS_MS:
+                    k = bisect.bisect_right(venue_ts, t - w) - 1
+                    if k < 0 or t - venue_ts[k] > 2 * w:
+                        break
+                    lagged.append(float(snapshot[fi] - series[venue].features[k][fi]))
+        if len(lagged) != len(venues) * len(LAGGED_FEATURE_INDICES) * len(LAG_WINDOWS_MS):
+            continue
+        xs.append([float(v) for snapshot in current for v in snapshot] + lagged)
+        ys.append(float(own.mid[j] - own.mid[i]))
+    return xs, ys
+
+
+def test_feature_matrix_matches_row_by_row_rules() -> None:
+    rng = np.random.default_rng(5)
+    series = {
+        "coinbase": _series(rng, "coinbase", 3000, 150.0),
+        "okx": _series(rng, "okx", 3000, 120.0),
+        "kraken": _series(rng, "kraken", 1500, 400.0),
+    }
+
+    matrix = build_lagged_feature_matrix(
+        "coinbase", series, horizon_ms=2000, tolerance_ms=1500, lag_windows_ms=LAG_WINDOWS_MS
+    )
+    xs, ys = _reference_rows(series, horizon_ms=2000, tolerance_ms=1500)
+
+    assert matrix is not None
+    assert 0 < len(ys) < len(series["coinbase"].ts)
+    assert np.array_equal(matrix.x, np.asarray(xs))
+    assert np.array_equal(matrix.y, np.asarray(ys))
+    assert np.array_equal(matrix.timestamps_ms, series["coinbase"].ts[matrix.rows])
+    assert matrix.feature_names == lagged_feature_names(
+        "coinbase", ["kraken", "okx"], LAG_WINDOWS_MS
+    )
+    assert len(matrix.feature_names) == matrix.x.shape[1] == 6 * 3 + 3 * 2 * 2
+
+
+def test_single_live_row_matches_training_row() -> None:
+    rng = np.random.default_rng(9)
+    series = {
+        "coinbase": _series(rng, "coinbase", 2000, 150.0),
+        "okx": _series(rng, "okx", 2000, 120.0),
+    }
+    matrix = build_lagged_feature_matrix(
+        "coinbase", series, horizon_ms=0, tolerance_ms=10**9, lag_windows_ms=LAG_WINDOWS_MS
+    )
+    assert matrix is not None
+    own, okx = series["coinbase"], series["okx"]
+
+    for position in (0, len(matrix.rows) // 2, len(matrix.rows) - 1):
+        row = int(matrix.rows[position])
+        now_ms = int(own.ts[row])
+        # What a live buffer holds at that moment: ticks up to now.
+        own_end = int(np.searchsorted(own.ts, now_ms, side="right"))
+        okx_end = int(np.searchsorted(okx.ts, now_ms, side="right"))
+        x, ok = lagged_feature_rows(
+            np.asarray([now_ms]),
+            [own.features[row : row + 1], okx.features[okx_end - 1 : okx_end]],
+            [
+                (own.ts[:own_end], own.features[:own_end]),
+                (okx.ts[:okx_end], okx.features[:okx_end]),
+            ],
+            LAG_WINDOWS_MS,
+        )
+        assert ok[0]
+        assert np.array_equal(x[0], matrix.x[position])
+
+
+def test_lag_lookup_rejects_missing_and_stale_history() -> None:
+    features = np.arange(12, dtype=np.float64).reshape(2, 6)
+    history = (np.asarray([0, 9_000]), features)
+    now = np.asarray([10_000, 12_500, 16_000])
+
+    _, ok = lagged_feature_rows(now, [np.repeat(features[1:], 3, axis=0)], [history], [2000])
+    # Lag gaps are measured from the row: 10000 - 0, 12500 - 9000, 16000 - 9000.
+    assert ok.tolist() == [False, True, False]
+
+    _, ok = lagged_feature_rows(now, [np.repeat(features[1:], 3, axis=0)], [history], [5000])
+    # Two 5s windows allow 10000 - 0 but not 12500 - 0.
+    assert ok.tolist() == [True, False, True]
+
+    _, ok = lagged_feature_rows(
+        now[:1], [features[:1]], [(np.asarray([20_000]), features[:1])], [2000]
+    )
+    assert ok.tolist() == [False]
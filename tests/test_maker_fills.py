@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from icarus.backtest import BUY, SELL, MakerFillSimulator, MakerQuoteConfig, MakerTicks, maker
+
+BACKENDS = [False, True] if maker.numba is not None else [False]
+
+
+def _ticks(rng: np.random.Generator, n: int) -> MakerTicks:
+    mid = 100.0 + rng.normal(0.0, 0.05, n).cumsum()
+    spread = rng.uniform(0.02, 0.6, n)
+    bid = mid - spread / 2
+    ask = mid + spread / 2
+    bid[rng.random(n) < 0.05] = np.nan
+    ask[rng.random(n) < 0.05] = np.nan
+    return MakerTicks(
+        timestamp_ms=np.cumsum(rng.integers(1, 400, n)).astype(np.int64),
+        venue_mid=mid,
+        venue_bid=bid,
+        venue_ask=ask,
+        top_bid_depth=rng.exponential(2.0, n),
+        top_ask_depth=rng.exponential(2.0, n),
+        trade_buy_size=np.where(rng.random(n) < 0.4, rng.exponential(1.5, n), 0.0),
+        trade_sell_size=np.where(rng.random(n) < 0.4, rng.exponential(1.5, n), 0.0),
+    )
+
+
+def _reference_fills(
+    ticks: MakerTicks,
+    config: MakerQuoteConfig,
+    drift_hat: np.ndarray,
+    quotable: np.ndarray,
+    dislocation: np.ndarray,
+) -> tuple[list[tuple[int, int, float, float]], float, float, int]:
+    """Tick-at-a-time statement of the fill rules, with None for missing values."""
+    inventory = cash = 0.0
+    bid = ask = None
+    bid_queue = ask_queue = 0.0
+    bid_live = ask_live = 0
+    posted = 0
+    fee_rate = config.fee_bps / 10_000.0
+    size = config.order_size
+    fills = []
+    for i in range(len(ticks)):
+        ts = int(ticks.timestamp_ms[i])
+        best_bid = None if np.isnan(ticks.venue_bid[i]) else float(ticks.venue_bid[i])
+        best_ask = None if np.isnan(ticks.venue_ask[i]) else float(ticks.venue_ask[i])
+        if not quotable[i]:
+            bid = ask = None
+            continue
+        center = (
+            float(ticks.venue_mid[i])
+            + config.skew_coef * float(drift_hat[i])
+            - inventory * config.inventory_skew
+        )
+        quote_bid = inventory < config.max_inventory
+        quote_ask = inventory > -config.max_inventory
+        if config.single_sided:
+            quote_bid = quote_bid and dislocation[i] < 0
+            quote_ask = quote_ask and dislocation[i] > 0
+
+        if not quote_bid:
+            bid = None
+        elif bid is None or abs(bid - (center - config.half_spread)) > config.requote_threshold:
+            bid = center - config.half_spread
+            inside = best_bid is not None and bid > best_bid
+            bid_queue = 0.0 if inside else float(ticks.top_bid_depth[i]) * config.queue_scale
+            bid_live = ts + config.latency_ms
+            posted += 1
+        if not quote_ask:
+            ask = None
+        elif ask is None or abs(ask - (center + config.half_spread)) > config.requote_threshold:
+            ask = center + config.half_spread
+            inside = best_ask is not None and ask < best_ask
+            ask_queue = 0.0 if inside else float(ticks.top_ask_depth[i]) * config.queue_scale
+            ask_live = ts + config.latency_ms
+            posted += 1
+
+        bid_fills = ask_fills = False
+        sells = float(ticks.trade_sell_size[i])
+        buys = float(ticks.trade_buy_size[i])
+        if bid is not None and ts >= bid_live and inventory < config.max_inventory:
+            if best_ask is not None and best_ask <= bid:
+                bid_fills = True
+            elif (best_bid is None or bid >= best_bid) and sells > 0:
+                consumed = min(sells, bid_queue)
+                bid_queue -= consumed
+                bid_fills = sells - consumed > 0 and bid_queue <= 0.0
+        if ask is not None and ts >= ask_live and inventory > -config.max_inventory:
+            if best_bid is not None and best_bid >= ask:
+                ask_fills = True
+            elif (best_ask is None or ask <= best_ask) and buys > 0:
+                consumed = min(buys, ask_queue)
+                ask_queue -= consumed
+                ask_fills = buys - consumed > 0 and ask_queue <= 0.0
+        if bid_fills:
+            assert bid is not None
+            fee = fee_rate * bid * size
+            cash -= bid * size + fee
+            inventory += size
+            fills.append((i, BUY, bid, fee))
+            bid = None
+        if ask_fills:
+            assert ask is not None
+            fee = fee_rate * ask * size
+            cash += ask * size - fee
+            inventory -= size
+            fills.append((i, SELL, ask, fee))
+            ask = None
+    return fills, inventory, cash, posted
+
+
+@pytest.mark.parametrize("use_numba", BACKENDS)
+@pytest.mark.parametrize(
+    "config",
+    [
+        MakerQuoteConfig(half_spread=0.1, fee_bps=-1.0, max_inventory=3.0),
+        MakerQuoteConfig(
+            half_spread=0.2,
+            fee_bps=2.0,
+            max_inventory=2.0,
+            skew_coef=1.5,
+            inventory_skew=0.1,
+            latency_ms=250,
+            queue_scale=2.0,
+            requote_threshold=0.2,
+        ),
+        MakerQuoteConfig(
+            half_spread=0.1,
+            fee_bps=0.0,
+            max_inventory=4.0,
+            latency_ms=50,
+            requote_threshold=0.1,
+            single_sided=True,
+        ),
+    ],
+)
+def test_kernel_matches_scalar_reference(config: MakerQuoteConfig, use_numba: bool) -> None:
+    rng = np.random.default_rng(17)
+    ticks = _ticks(rng, 4000)
+    drift_hat = rng.normal(0.0, 0.05, len(ticks))
+    quotable = rng.random(len(ticks)) > 0.03
+    dislocation = rng.normal(0.0, 1.0, len(ticks))
+
+    simulator = MakerFillSimulator(config, use_numba=use_numba)
+    fills = simulator.run(ticks, drift_hat, quotable=quotable, dislocation=dislocation)
+    expected, inventory, cash, posted = _reference_fills(
+        ticks, config, drift_hat, quotable, dislocation
+    )
+
+    assert len(expected) > 100
+    assert (
+        list(
+            zip(
+                fills.index.tolist(),
+                fills.side.tolist(),
+                fills.price.tolist(),
+                fills.fee.tolist(),
+                strict=True,
+            )
+        )
+        == expected
+    )
+    assert (simulator.inventory, simulator.cash, simulator.quotes_posted) == (
+        inventory,
+        cash,
+        posted,
+    )
+
+
+@pytest.mark.parametrize("use_numba", BACKENDS)
+def test_stepping_and_chunked_runs_match_one_run(use_numba: bool) -> None:
+    rng = np.random.default_rng(23)
+    ticks = _ticks(rng, 3000)
+    drift_hat = rng.normal(0.0, 0.05, len(ticks))
+    config = MakerQuoteConfig(
+        half_spread=0.15,
+        fee_bps=-1.0,
+        max_inventory=3.0,
+        skew_coef=1.0,
+        latency_ms=100,
+        requote_threshold=0.15,
+    )
+
+    whole = MakerFillSimulator(config, use_numba=use_numba)
+    fills = whole.run(ticks, drift_hat)
+
+    chunked = MakerFillSimulator(config, use_numba=use_numba)
+    chunk_fills = []
+    for start in range(0, len(ticks), 700):
+        part = MakerTicks(*(np.asarray(column)[start : start + 700] for column in _columns(ticks)))
+        out = chunked.run(part, drift_hat[start : start + 700])
+        chunk_fills.extend(zip((out.index + start).tolist(), out.price.tolist(), strict=True))
+
+    stepped = MakerFillSimulator(config, use_numba=use_numba)
+    step_fills = []
+    for i, row in enumerate(zip(*(column.tolist() for column in _columns(ticks)), strict=True)):
+        ts, mid, bid, ask, *rest = row
+        bid = None if np.isnan(bid) else bid
+        ask = None if np.isnan(ask) else ask
+        for _, price, _ in stepped.step(ts, mid, bid, ask, *rest, drift_hat=float(drift_hat[i])):
+            step_fills.append((i, price))
+
+    expected = list(zip(fills.index.tolist(), fills.price.tolist(), strict=True))
+    assert len(expected) > 100
+    assert chunk_fills == expected
+    assert step_fills == expected
+    for other in (chunked, stepped):
+        assert (other.inventory, other.cash, other.quotes_posted, other.quote_ms_bid) == (
+            whole.inventory,
+            whole.cash,
+            whole.quotes_posted,
+            whole.quote_ms_bid,
+        )
+        assert (other.live_bid_price, other.live_ask_price) == (
+            whole.live_bid_price,
+            whole.live_ask_price,
+        )
+
+
+def _columns(ticks: MakerTicks) -> list[np.ndarray]:
+    return [
+        ticks.timestamp_ms,
+        ticks.venue_mid,
+        ticks.venue_bid,
+        ticks.venue_ask,
+        ticks.top_bid_depth,
+        ticks.top_ask_depth,
+        ticks.trade_buy_size,
+        ticks.trade_sell_size,
+    ]
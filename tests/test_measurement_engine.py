@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import random
 from decimal import Decimal
+from math import sqrt
+
+import pytest
 
 from icarus.measurements import MarketMeasurement, MarketMeasurementEngine
+from icarus.measurements.engine import _RollingReturnMoments
 from icarus.observations import (
     BBOObservation,
     OrderBookDeltaObservation,
@@ -10,6 +15,7 @@ from icarus.observations import (
     OrderBookObservation,
     TradeObservation,
 )
+from icarus.observations.types import Number
 
 
 def test_measurement_engine_emits_from_bbo_observation() -> None:
@@ -140,3 +146,83 @@ def test_measurement_engine_delta_only_event_emits_no_bogus_features() -> None:
     measurement = engine.on_observation(delta)
 
     assert measurement is None
+
+
+def _reference_volatility_bps(prices: list[Number]) -> float | None:
+    """The original two-pass computation over the whole window."""
+    returns_bps = [
+        float(((current - previous) / previous) * 10000)  # type: ignore[operator]
+        for previous, current in zip(prices, prices[1:], strict=False)
+        if previous != 0
+    ]
+    if not returns_bps:
+        return None
+    if len(returns_bps) == 1:
+        return abs(returns_bps[0])
+    mean_return = sum(returns_bps) / len(returns_bps)
+    return sqrt(sum((value - mean_return) ** 2 for value in returns_bps) / len(returns_bps))
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_rolling_volatility_matches_two_pass_reference(
+    seed: int,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Resync often so the drift correction is exercised alongside the running sums.
+    monkeypatch.setattr(_RollingReturnMoments, "_RESYNC_EVERY", 7)
+    rng = random.Random(seed)
+    use_decimal = seed % 2 == 0
+    window_ms = rng.choice((50, 500, 5_000))
+    moments = _RollingReturnMoments()
+    window: list[tuple[int, Number]] = []
+    timestamp_ms = 0
+
+    for _ in range(600):
+        timestamp_ms += rng.choice((0, 1, 5, 20, 200))
+        raw_price = 0.0 if rng.random() < 0.03 else rng.uniform(90, 110)
+        price: Number = Decimal(f"{raw_price:.2f}") if use_decimal else raw_price
+        cutoff_ms = timestamp_ms - window_ms
+
+        moments.append(timestamp_ms, price)
+        moments.prune(cutoff_ms)
+        window.append((timestamp_ms, price))
+        window = [(ts, value) for ts, value in window if ts >= cutoff_ms]
+
+        expected = _reference_volatility_bps([value for _, value in window])
+        actual = moments.volatility_bps()
+        if expected is None:
+            assert actual is None
+        else:
+            assert actual is not None
+            assert isinstance(actual, Decimal) == use_decimal
+            assert float(actual) == pytest.approx(expected, rel=1e-6, abs=1e-6)
+
+
+def _bbo(bid: Number, bid_size: Number, ask: Number, ask_size: Number) -> BBOObservation:
+    return BBOObservation(
+        exchange="coinbase",
+        market="BTC-USD",
+        source_timestamp_ms=1000,
+        received_timestamp_ms=1000,
+        raw_message={},
+        bid_price=bid,
+        bid_size=bid_size,
+        ask_price=ask,
+        ask_size=ask_size,
+    )
+
+
+def test_quote_properties_keep_the_numeric_mode_and_reject_mixing() -> None:
+    float_quote = _bbo(100.0, 2.0, 101.0, 3.0)
+    assert float_quote.midprice == 100.5 and isinstance(float_quote.midprice, float)
+    assert float_quote.microprice == pytest.approx(100.4)
+    assert float_quote.spread_bps == pytest.approx(99.50248756218905)
+
+    # Ints are float-mode values.
+    assert _bbo(100, 2, 101, 3).microprice == pytest.approx(100.4)
+    assert _bbo(100.0, 0.0, 101.0, 0.0).microprice is None
+
+    mixed = _bbo(Decimal("100"), 2.0, 101.0, 3.0)
+    for name in ("midprice", "spread", "spread_bps", "microprice"):
+        with pytest.raises(TypeError):
+            getattr(mixed, name)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+import pytest
+
 from icarus.observations import (
     BBOObservation,
     CandleObservation,
@@ -13,6 +15,7 @@ from icarus.observations import (
     OrderBookObservation,
     TradeObservation,
 )
+from icarus.observations.types import EMPTY_RAW_MESSAGE
 
 
 def test_coinbase_normalizer_emits_bbo_and_l2_observations() -> None:
@@ -181,6 +184,67 @@ def test_coinbase_normalizer_emits_trade_and_candle_measurements() -> None:
     assert candle_measurements[0].volume == Decimal("0.20269406")
 
 
+def _coinbase_trades_message(count: int) -> dict[str, object]:
+    return {
+        "channel": "market_trades",
+        "sequence_num": 7,
+        "events": [
+            {
+                "type": "update",
+                "trades": [
+                    {
+                        "trade_id": str(100 + i),
+                        "product_id": "BTC-USD",
+                        "price": "75165.93",
+                        "size": "0.01",
+                        "side": "SELL",
+                        "time": "2026-04-17T00:00:15.000Z",
+                    }
+                    for i in range(count)
+                ],
+            }
+        ],
+    }
+
+
+def test_observations_share_one_read_only_raw_message() -> None:
+    message = _coinbase_trades_message(3)
+
+    trades = CoinbaseObservationNormalizer().normalize_message(message)
+
+    assert len(trades) == 3
+    assert trades[0].raw_message is trades[1].raw_message is trades[2].raw_message
+    assert trades[0].raw_message == message
+    with pytest.raises(TypeError):
+        trades[0].raw_message["channel"] = "ticker"  # type: ignore[index]
+
+
+def test_normalizer_can_drop_raw_messages_except_for_book_builders() -> None:
+    normalizer = CoinbaseObservationNormalizer(keep_raw_messages=False)
+    level2_message = {
+        "channel": "l2_data",
+        "timestamp": "2026-04-17T00:00:15.00000000Z",
+        "sequence_num": 12,
+        "events": [
+            {
+                "type": "update",
+                "product_id": "BTC-USD",
+                "updates": [
+                    {"side": "bid", "price_level": "75165.93", "new_quantity": "0.5"},
+                ],
+            }
+        ],
+    }
+
+    (trade,) = normalizer.normalize_message(_coinbase_trades_message(1))
+    (delta,) = normalizer.normalize_message(level2_message)
+
+    assert trade.raw_message is EMPTY_RAW_MESSAGE
+    # The book builder still needs the sequence number.
+    assert isinstance(delta, OrderBookDeltaObservation)
+    assert delta.raw_message["sequence_num"] == 12
+
+
 def test_hyperliquid_normalizer_emits_measurements() -> None:
     normalizer = HyperliquidObservationNormalizer()
 
@@ -390,3 +454,56 @@ def test_okx_normalizer_emits_bbo_trade_and_book_observations() -> None:
     assert book_observations[0].market == "BTC-USDT"
     assert book_observations[0].levels[0].side == "buy"
     assert book_observations[0].levels[1].side == "sell"
+
+
+def test_normalizer_float_mode_parses_numbers_as_float() -> None:
+    normalizer = CoinbaseObservationNormalizer(numeric_mode="float")
+    message = {
+        "channel": "ticker",
+        "timestamp": "2026-04-17T00:00:14.95780388Z",
+        "events": [
+            {
+                "type": "snapshot",
+                "tickers": [
+                    {
+                        "product_id": "BTC-USD",
+                        "best_bid": "75165.93",
+                        "best_bid_quantity": "0.22851376",
+                        "best_ask": "75165.94",
+                        "best_ask_quantity": "0.20719345",
+                    }
+                ],
+            }
+        ],
+    }
+
+    observation = normalizer.normalize_message(message, received_timestamp_ms=123)[0]
+
+    assert isinstance(observation, BBOObservation)
+    assert observation.bid_price == 75165.93
+    assert isinstance(observation.bid_price, float)
+    assert isinstance(observation.ask_size, float)
+
+
+def test_kraken_normalizer_keeps_decimal_book_levels_in_float_mode() -> None:
+    normalizer = KrakenObservationNormalizer(numeric_mode="float")
+    message = {
+        "channel": "book",
+        "type": "snapshot",
+        "data": [
+            {
+                "symbol": "BTC/USD",
+                "bids": [{"price": "100.0", "qty": "2.00000000"}],
+                "asks": [{"price": "101.0", "qty": "3.00000000"}],
+                "checksum": 0,
+                "timestamp": "2026-04-17T00:00:15.000000Z",
+            }
+        ],
+    }
+
+    observation = normalizer.normalize_message(message, received_timestamp_ms=1)[0]
+
+    # Book levels feed the CRC32 checksum, which needs the exact venue digits.
+    assert isinstance(observation, OrderBookObservation)
+    assert observation.levels[0].price == Decimal("100.0")
+    assert isinstance(observation.levels[0].price, Decimal)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+from icarus.observations import OrderBookLevel
+from icarus.observations.types import Side
+from icarus.orderbooks import OrderBook
+
+
+def _level(side: Side, price: str, size: str) -> OrderBookLevel:
+    return OrderBookLevel(side=side, price=Decimal(price), size=Decimal(size))
+
+
+def _price_size(level: OrderBookLevel | None) -> tuple[Decimal, Decimal] | None:
+    return (level.price, level.size) if level is not None else None
+
+
+def test_orderbook_keeps_sides_sorted_and_tracks_best_levels() -> None:
+    book = OrderBook()
+    book.load_snapshot(
+        (
+            _level("buy", "99", "1"),
+            _level("buy", "100", "2"),
+            _level("sell", "102", "4"),
+            _level("sell", "101", "3"),
+        )
+    )
+
+    book.apply_delta((_level("buy", "100.5", "5"), _level("sell", "101", "0")))
+
+    assert book.best_bid_level() == _level("buy", "100.5", "5")
+    assert book.best_ask_level() == _level("sell", "102", "4")
+    assert book.levels() == (
+        _level("buy", "100.5", "5"),
+        _level("buy", "100", "2"),
+        _level("buy", "99", "1"),
+        _level("sell", "102", "4"),
+    )
+
+
+def test_orderbook_depth_limited_views_and_truncate() -> None:
+    book = OrderBook()
+    book.load_snapshot(
+        tuple(_level("buy", str(100 - i), "1") for i in range(5))
+        + tuple(_level("sell", str(101 + i), "1") for i in range(5))
+    )
+
+    assert [level.price for level in book.bid_levels(2)] == [Decimal("100"), Decimal("99")]
+    assert [level.price for level in book.ask_levels(2)] == [Decimal("101"), Decimal("102")]
+    assert len(book.levels(3)) == 6
+    assert book.levels(0) == ()
+
+    book.truncate(2)
+
+    assert [level.price for level in book.levels()] == [
+        Decimal("100"),
+        Decimal("99"),
+        Decimal("101"),
+        Decimal("102"),
+    ]
+
+    # Removed levels must not linger in the price map after truncation.
+    book.apply_level("buy", Decimal("98"), Decimal("0"))
+    assert len(book.bid_levels()) == 2
+
+
+def test_orderbook_matches_reference_dict_book_under_random_updates() -> None:
+    rng = random.Random(7)
+    book = OrderBook()
+    bids: dict[Decimal, Decimal] = {}
+    asks: dict[Decimal, Decimal] = {}
+
+    for step in range(2000):
+        side: Side = rng.choice(("buy", "sell"))
+        price = Decimal(rng.randint(9_900, 10_100)) / Decimal("100")
+        size = Decimal(rng.choice((0, 0, 1, 2, 3)))
+        book.apply_level(side, price, size)
+        reference = bids if side == "buy" else asks
+        if size <= 0:
+            reference.pop(price, None)
+        else:
+            reference[price] = size
+
+        if step % 97 == 0:
+            book.truncate(25)
+            bids = dict(sorted(bids.items(), reverse=True)[:25])
+            asks = dict(sorted(asks.items())[:25])
+
+        expected_bids = sorted(bids.items(), reverse=True)
+        expected_asks = sorted(asks.items())
+        assert _price_size(book.best_bid_level()) == (expected_bids[0] if expected_bids else None)
+        assert _price_size(book.best_ask_level()) == (expected_asks[0] if expected_asks else None)
+
+    assert [(level.price, level.size) for level in book.bid_levels()] == sorted(
+        bids.items(), reverse=True
+    )
+    assert [(level.price, level.size) for level in book.ask_levels()] == sorted(asks.items())
@@ -4,6 +4,7 @@ import zlib
 from decimal import Decimal
 
 from icarus.observations import OrderBookDeltaObservation, OrderBookLevel, OrderBookObservation
+from icarus.observations.types import EMPTY_RAW_MESSAGE
 from icarus.orderbooks import CoinbaseOrderBookBuilder, KrakenOrderBookBuilder
 
 
@@ -131,6 +132,39 @@ def test_coinbase_orderbook_builder_resets_on_stale_sequence() -> None:
     assert builder.on_observation(fresh_delta_after_reset) is None
 
 
+def test_coinbase_orderbook_builder_passes_raw_message_through_or_drops_it() -> None:
+    raw_snapshot = {"type": "snapshot", "sequence_num": 10}
+    snapshot = OrderBookObservation(
+        exchange="coinbase",
+        market="BTC-USD",
+        source_timestamp_ms=1000,
+        received_timestamp_ms=1000,
+        raw_message=raw_snapshot,
+        update_type="snapshot",
+        levels=(
+            OrderBookLevel(side="buy", price=Decimal("100"), size=Decimal("2")),
+            OrderBookLevel(side="sell", price=Decimal("101"), size=Decimal("3")),
+        ),
+    )
+    gap_delta = OrderBookDeltaObservation(
+        exchange="coinbase",
+        market="BTC-USD",
+        source_timestamp_ms=1100,
+        received_timestamp_ms=1200,
+        raw_message={"type": "l2update", "sequence_num": 12},
+        levels=(OrderBookLevel(side="buy", price=Decimal("100.5"), size=Decimal("5")),),
+    )
+
+    kept = CoinbaseOrderBookBuilder().on_observation(snapshot)
+    dropping = CoinbaseOrderBookBuilder(keep_raw_messages=False)
+    dropped = dropping.on_observation(snapshot)
+
+    assert kept is not None and kept.raw_message is raw_snapshot
+    assert dropped is not None and dropped.raw_message is EMPTY_RAW_MESSAGE
+    # Sequence checks still run on the inputs' payloads.
+    assert dropping.on_observation(gap_delta) is None
+
+
 def test_coinbase_orderbook_builder_resets_on_sequence_gap() -> None:
     builder = CoinbaseOrderBookBuilder()
     snapshot = OrderBookObservation(
@@ -330,3 +364,31 @@ def test_kraken_orderbook_builder_resets_on_checksum_mismatch() -> None:
     assert builder.on_observation(snapshot) is not None
     assert builder.on_observation(bad_delta) is None
     assert builder.on_observation(post_reset_delta) is None
+
+
+def test_kraken_orderbook_builder_float_mode_validates_checksum_and_emits_floats() -> None:
+    builder = KrakenOrderBookBuilder(numeric_mode="float")
+    snapshot_levels = (
+        OrderBookLevel(side="buy", price=Decimal("100.1"), size=Decimal("2.00000000")),
+        OrderBookLevel(side="sell", price=Decimal("101.3"), size=Decimal("3.00000000")),
+    )
+    snapshot = OrderBookObservation(
+        exchange="kraken",
+        market="BTC/USD",
+        source_timestamp_ms=1000,
+        received_timestamp_ms=1000,
+        raw_message={
+            "type": "snapshot",
+            "data": [{"checksum": _kraken_checksum(snapshot_levels)}],
+        },
+        update_type="snapshot",
+        levels=snapshot_levels,
+    )
+
+    emitted = builder.on_observation(snapshot)
+
+    assert emitted is not None
+    assert not builder.consume_resync_request()
+    assert emitted.best_bid_level == OrderBookLevel(side="buy", price=100.1, size=2.0)
+    assert emitted.best_ask_level == OrderBookLevel(side="sell", price=101.3, size=3.0)
+    assert isinstance(emitted.levels[0].price, float)
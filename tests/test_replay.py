@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from icarus.capture import convert_sqlite_capture
+from icarus.observations import BBOObservation, Observation, TradeObservation
+from icarus.replay import ReplayPacer, iter_capture_quotes, merge_observations, replay
+from icarus.strategy.fair_value.combiner import CrossVenueFairValueCombiner
+from icarus.strategy.fair_value.filters.kalman_1d import (
+    AdaptiveEfficientPriceKalman,
+    VenueObservation,
+)
+from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import (
+    VenueBasisKalmanConfig,
+    VenueBasisKalmanFilter,
+    VenueBasisObservation,
+)
+from icarus.strategy.fair_value.pipeline import AssetFairValuePipeline, VenueFairValuePipeline
+
+VENUES = ("coinbase", "okx", "kraken", "hyperliquid_perp")
+
+
+def _basis_config() -> VenueBasisKalmanConfig:
+    return VenueBasisKalmanConfig(
+        anchor_exchange="coinbase",
+        venue_order=("coinbase", "okx", "kraken"),
+        perp_exchange_order=("hyperliquid_perp",),
+    )
+
+
+def _stream(seed: int, n_events: int) -> list[Observation]:
+    rng = random.Random(seed)
+    mid = Decimal("60000")
+    now_ms = 0
+    events: list[Observation] = []
+    for _ in range(n_events):
+        now_ms += rng.choice((1, 5, 30, 120, 600))
+        mid += Decimal(rng.randint(-5, 5)) / Decimal("100")
+        exchange = rng.choice(VENUES)
+        if rng.random() < 0.2:
+            events.append(
+                TradeObservation(
+                    exchange=exchange,
+                    market="BTC",
+                    source_timestamp_ms=now_ms,
+                    received_timestamp_ms=now_ms,
+                    raw_message={},
+                    trade_id=None,
+                    side=rng.choice(("buy", "sell")),
+                    price=mid,
+                    size=Decimal("0.01"),
+                )
+            )
+            continue
+        premium = Decimal("9") if exchange == "hyperliquid_perp" else Decimal("0")
+        events.append(
+            BBOObservation(
+                exchange=exchange,
+                market="BTC",
+                source_timestamp_ms=now_ms,
+                received_timestamp_ms=now_ms,
+                raw_message={},
+                bid_price=mid + premium - Decimal("0.5"),
+                bid_size=Decimal(rng.randint(1, 8)),
+                ask_price=mid + premium + Decimal("0.5"),
+                ask_size=Decimal(rng.randint(1, 8)),
+            )
+        )
+    return events
+
+
+def test_replay_matches_driving_the_live_objects_by_hand() -> None:
+    events = _stream(seed=3, n_events=800)
+
+    pipeline = AssetFairValuePipeline("BTC", basis_config=_basis_config())
+    steps = list(replay(iter(events), pipeline=pipeline))
+
+    venue_pipeline = VenueFairValuePipeline("BTC")
+    combiner = CrossVenueFairValueCombiner("BTC")
+    kalman = AdaptiveEfficientPriceKalman()
+    basis_filter = VenueBasisKalmanFilter(config=_basis_config())
+    expected = []
+    for observation in events:
+        now_ms = observation.received_timestamp_ms
+        assert now_ms is not None
+        if isinstance(observation, TradeObservation):
+            continue
+        venue_pipeline.on_observation(observation)
+        states = venue_pipeline.refresh(now_ms)
+        spot = [state for state in states.values() if not state.exchange.endswith("_perp")]
+        if not spot:
+            continue
+        for state in spot:
+            combiner.update(state, now_ms=now_ms)
+        composite = combiner.combine(now_ms=now_ms)
+        kalman_result = kalman.update(
+            timestamp_s=now_ms / 1000.0,
+            observations=[
+                VenueObservation(
+                    name=state.exchange,
+                    fair_value=float(state.fair_value),
+                    local_variance=float(state.variance),
+                    age_ms=float(max(now_ms - state.timestamp_ms, 0)),
+                )
+                for state in spot
+            ],
+        )
+        result = basis_filter.update(
+            timestamp_s=now_ms / 1000.0,
+            observations=[
+                VenueBasisObservation(
+                    name=state.exchange,
+                    fair_value=state.fair_value,
+                    local_variance=state.variance,
+                    age_ms=float(max(now_ms - state.timestamp_ms, 0)),
+                    venue_kind="perp" if state.exchange.endswith("_perp") else "spot",
+                )
+                for state in states.values()
+            ],
+        )
+        expected.append(
+            (
+                now_ms,
+                states,
+                composite.fair_value if composite else None,
+                kalman_result.filtered_price if kalman_result else None,
+                result,
+            )
+        )
+
+    assert [(s.timestamp_ms, s.venue_states) for s in steps] == [e[:2] for e in expected]
+    assert [s.composite.fair_value if s.composite else None for s in steps] == [
+        e[2] for e in expected
+    ]
+    assert [s.kalman.filtered_price if s.kalman else None for s in steps] == [
+        e[3] for e in expected
+    ]
+    for step, (*_, result) in zip(steps, expected, strict=True):
+        if result is None:
+            assert step.basis is None
+            continue
+        assert step.basis is not None
+        assert step.basis.common_price == pytest.approx(result.common_price, abs=1e-9)
+        assert step.basis.common_price_stddev == pytest.approx(result.common_price_stddev)
+        assert step.basis.active_venues == tuple(result.active_venues)
+        assert step.basis.basis_estimates == pytest.approx(result.basis_estimates, abs=1e-9)
+        assert step.basis.basis_stddevs == pytest.approx(result.basis_stddevs)
+    assert any(step.basis is not None for step in steps)
+    assert steps[-1].last_basis is not None
+
+
+def test_paced_replay_sleeps_to_event_time() -> None:
+    now = [100.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    pacer = ReplayPacer(2.0, clock=lambda: now[0], sleep=sleep)
+    for timestamp_ms in (10_000, 11_000, 11_000, 15_000):
+        pacer.wait_until(timestamp_ms)
+
+    assert sleeps == pytest.approx([0.5, 2.0])
+    with pytest.raises(ValueError):
+        ReplayPacer(0.0)
+
+
+def test_merge_observations_interleaves_by_timestamp() -> None:
+    events = _stream(seed=1, n_events=200)
+    coinbase = [e for e in events if e.exchange == "coinbase"]
+    others = [e for e in events if e.exchange != "coinbase"]
+
+    merged = list(merge_observations(iter(coinbase), iter(others)))
+
+    assert [e.received_timestamp_ms for e in merged] == sorted(
+        e.received_timestamp_ms or 0 for e in events
+    )
+
+
+def _capture_with_quotes(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE updates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp_ms INTEGER NOT NULL,
+            event_exchange TEXT NOT NULL,
+            event_market TEXT NOT NULL,
+            anchor_exchange TEXT NOT NULL,
+            anchor_present INTEGER NOT NULL,
+            basis_is_live INTEGER NOT NULL,
+            composite_price REAL,
+            composite_variance REAL,
+            kalman_filtered_price REAL,
+            kalman_raw_fused_price REAL,
+            basis_common_price REAL,
+            basis_common_stddev REAL,
+            contributing_exchanges_json TEXT NOT NULL,
+            kalman_used_venues_json TEXT NOT NULL,
+            basis_active_venues_json TEXT NOT NULL
+        );
+        CREATE TABLE venue_states (
+            update_id INTEGER NOT NULL,
+            exchange TEXT NOT NULL,
+            venue_kind TEXT NOT NULL,
+            fair_value REAL NOT NULL,
+            variance REAL NOT NULL,
+            age_ms REAL NOT NULL,
+            bid_price REAL,
+            ask_price REAL,
+            top_bid_depth REAL,
+            top_ask_depth REAL,
+            PRIMARY KEY (update_id, exchange)
+        );
+        CREATE TABLE basis_states (
+            update_id INTEGER NOT NULL,
+            exchange TEXT NOT NULL,
+            basis_estimate REAL NOT NULL,
+            basis_stddev REAL NOT NULL,
+            PRIMARY KEY (update_id, exchange)
+        );
+        """
+    )
+    # (update ts, [(exchange, age_ms, bid, ask, bid depth, ask depth)])
+    updates = [
+        (1_000, [("okx", 0.0, 99.5, 100.5, 1.0, 2.0)]),
+        (1_010, [("okx", 10.0, 99.5, 100.5, 1.0, 2.0), ("coinbase", 0.0, 99.0, 101.0, 3.0, None)]),
+        # Kraken's quote arrived 4 ms before Coinbase's update was recorded.
+        (
+            1_020,
+            [
+                ("okx", 20.0, 99.5, 100.5, 1.0, 2.0),
+                ("coinbase", 0.0, 99.1, 101.0, 3.0, 1.0),
+                ("kraken", 4.0, 98.0, 102.0, 1.0, 1.0),
+            ],
+        ),
+        (1_030, [("okx", 30.0, 99.5, 100.5, 1.0, 2.0), ("coinbase", 10.0, 99.1, 101.0, 3.0, 1.0)]),
+        (1_040, [("okx", 0.0, 99.6, 100.5, 1.0, 2.0), ("coinbase", None, None, None, None, None)]),
+    ]
+    for update_id, (timestamp_ms, rows) in enumerate(updates, start=1):
+        conn.execute(
+            "INSERT INTO updates VALUES (?, ?, 'okx', 'BTC-USDT', 'coinbase', 1, 0,"
+            " NULL, NULL, NULL, NULL, NULL, NULL, '[]', '[]', '[]')",
+            (update_id, timestamp_ms),
+        )
+        for exchange, age_ms, bid, ask, bid_depth, ask_depth in rows:
+            conn.execute(
+                "INSERT INTO venue_states VALUES (?, ?, 'spot', 100.0, 1.0, ?, ?, ?, ?, ?)",
+                (update_id, exchange, age_ms or 0.0, bid, ask, bid_depth, ask_depth),
+            )
+    conn.commit()
+    conn.close()
+
+
+def test_capture_quotes_are_deduplicated_and_time_ordered(tmp_path: Path) -> None:
+    db_path = tmp_path / "capture.sqlite3"
+    _capture_with_quotes(db_path)
+
+    quotes = list(iter_capture_quotes(db_path, markets={"okx": "BTC-USDT"}))
+
+    assert [(q.exchange, q.received_timestamp_ms, q.bid_price) for q in quotes] == [
+        ("okx", 1_000, Decimal("99.5")),
+        ("coinbase", 1_010, Decimal("99.0")),
+        ("kraken", 1_016, Decimal("98.0")),
+        ("coinbase", 1_020, Decimal("99.1")),
+        ("okx", 1_040, Decimal("99.6")),
+    ]
+    assert quotes[0].market == "BTC-USDT" and quotes[1].market == "coinbase"
+    assert quotes[1].ask_size == Decimal("0.0")
+
+    store = tmp_path / "capture.cols"
+    convert_sqlite_capture(db_path, store)
+    assert list(iter_capture_quotes(store, markets={"okx": "BTC-USDT"}, window_ms=15)) == quotes
+    # Starting mid-capture seeds every venue's standing quote from the first update.
+    late = list(iter_capture_quotes(db_path, start_ms=1_020))
+    assert [(q.exchange, q.received_timestamp_ms) for q in late] == [
+        ("okx", 1_000),
+        ("kraken", 1_016),
+        ("coinbase", 1_020),
+        ("okx", 1_040),
+    ]
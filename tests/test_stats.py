@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from icarus.stats import (
+    RollingMoments,
+    RollingQuantile,
+    RollingSum,
+    TradeFlowTracker,
+    interpolate_sorted,
+    rolling_mean_std,
+    trailing_windows,
+    window_mean,
+    window_quantile,
+    window_sum,
+    window_var,
+)
+
+
+def _stream(seed: int, n: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    # Bursts of equal timestamps and long gaps, so windows both fill and empty.
+    gaps = rng.choice([0, 0, 1, 3, 40], size=n)
+    return np.cumsum(gaps).astype(np.int64), rng.normal(100.0, 5.0, n)
+
+
+def test_trailing_windows_cover_the_closed_span_behind_each_time() -> None:
+    ts = np.array([0, 10, 10, 20, 35, 50])
+    start, stop = trailing_windows(ts, 10)
+    assert start.tolist() == [0, 0, 0, 1, 4, 5]
+    # Per sample, a window ends at the sample itself, not at later ties.
+    assert stop.tolist() == [1, 2, 3, 4, 5, 6]
+
+    start, stop = trailing_windows(ts, 10, at=[10, 30, 60])
+    assert start.tolist() == [0, 3, 5]
+    assert stop.tolist() == [3, 4, 6]
+    with pytest.raises(ValueError):
+        trailing_windows(ts, -1)
+
+
+def test_window_reductions_match_direct_computation() -> None:
+    ts, x = _stream(0, 2_000)
+    start, stop = trailing_windows(ts, 25, at=np.arange(ts[0] - 5, ts[-1] + 5, 3))
+    sums = window_sum(x, start, stop)
+    means = window_mean(x, start, stop)
+    variances = window_var(x, start, stop, ddof=1)
+    p90 = window_quantile(x, start, stop, 0.9)
+    for k, (lo, hi) in enumerate(zip(start, stop, strict=True)):
+        w = x[lo:hi]
+        assert sums[k] == pytest.approx(w.sum(), abs=1e-9)
+        if w.size == 0:
+            assert math.isnan(means[k]) and math.isnan(p90[k])
+            continue
+        assert means[k] == pytest.approx(w.mean())
+        assert p90[k] == pytest.approx(np.quantile(w, 0.9))
+        if w.size > 1:
+            assert variances[k] == pytest.approx(w.var(ddof=1), rel=1e-7)
+        else:
+            assert math.isnan(variances[k])
+
+
+def test_window_quantile_accepts_count_and_unordered_bounds() -> None:
+    _, x = _stream(1, 500)
+    stop = np.arange(1, 501)
+    start = np.maximum(stop - 50, 0)
+    expected = [np.quantile(x[lo:hi], 0.95) for lo, hi in zip(start, stop, strict=True)]
+    assert window_quantile(x, start, stop, 0.95) == pytest.approx(expected)
+    # Bounds that step backwards take the per-window path.
+    order = np.random.default_rng(2).permutation(500)
+    shuffled = window_quantile(x, start[order], stop[order], 0.95)
+    assert shuffled == pytest.approx(np.asarray(expected)[order])
+    with pytest.raises(ValueError):
+        window_quantile(x, start, stop, 1.5)
+
+
+def test_rolling_mean_std_expands_then_slides() -> None:
+    ts, x = _stream(3, 1_000)
+    mean, std = rolling_mean_std(ts, x, 30)
+    for i in range(len(ts)):
+        w = x[(ts >= ts[i] - 30) & (np.arange(len(ts)) <= i)]
+        assert mean[i] == pytest.approx(w.mean())
+        assert std[i] == pytest.approx(w.std(), rel=1e-6, abs=1e-9)
+    assert std[0] == 0.0
+
+
+def test_streaming_windows_match_batch_windows() -> None:
+    ts, x = _stream(4, 3_000)
+    window = 20
+    start, stop = trailing_windows(ts, window)
+    sums = window_sum(x, start, stop)
+    means = window_mean(x, start, stop)
+    variances = window_var(x, start, stop)
+    medians = window_quantile(x, start, stop, 0.5)
+
+    rolling_sum = RollingSum(window)
+    moments = RollingMoments(window)
+    quantiles = RollingQuantile(window)
+    for i, (t, v) in enumerate(zip(ts.tolist(), x.tolist(), strict=True)):
+        for stat in (rolling_sum, moments, quantiles):
+            stat.add(t, v)
+            stat.advance(t)
+        assert rolling_sum.count == moments.count == quantiles.count == stop[i] - start[i]
+        assert rolling_sum.total == pytest.approx(sums[i])
+        assert moments.mean == pytest.approx(means[i])
+        assert moments.variance == pytest.approx(variances[i], rel=1e-6, abs=1e-9)
+        assert quantiles.quantile(0.5) == pytest.approx(medians[i])
+
+
+def test_streaming_windows_empty_out_cleanly() -> None:
+    rolling_sum = RollingSum(1_000)
+    moments = RollingMoments(1_000)
+    quantiles = RollingQuantile(1_000)
+    for stat in (rolling_sum, moments, quantiles):
+        stat.add(0, 0.1)
+        stat.add(500, 0.2)
+        stat.advance(1_000)
+        assert stat.count == 2
+        stat.advance(1_400)
+        assert stat.count == 1
+        stat.advance(10_000)
+        assert stat.count == 0
+    assert rolling_sum.total == 0.0
+    assert math.isnan(moments.mean) and math.isnan(moments.variance)
+    assert math.isnan(quantiles.quantile(0.5))
+    with pytest.raises(ValueError):
+        RollingSum(-1)
+
+
+def test_interpolate_sorted_matches_numpy_quantile() -> None:
+    ordered = sorted(np.random.default_rng(2).normal(size=17).tolist())
+    for q in (0.0, 0.1, 0.5, 0.93, 1.0):
+        assert interpolate_sorted(ordered, q) == pytest.approx(np.quantile(ordered, q))
+
+
+def test_trade_flow_tracker_nets_buys_against_sells_in_the_window() -> None:
+    tracker = TradeFlowTracker(window_ms=1_000)
+    assert tracker.snapshot(0) == (0.0, 0.0, 0.0, 0)
+    tracker.add(0, "buy", 2.0)
+    tracker.add(400, "sell", 0.5)
+    tracker.add(600, "buy", 1.0)
+    tracker.add(700, "unknown", 9.0)
+
+    assert tracker.snapshot(1_000) == (2.5, 3.0, 0.5, 3)
+    # The first buy leaves the window.
+    assert tracker.snapshot(1_200) == (0.5, 1.0, 0.5, 2)
+    assert tracker.snapshot(5_000) == (0.0, 0.0, 0.0, 0)
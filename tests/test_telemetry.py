@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from icarus.telemetry import LatencyHistogram, LatencyRecorder, LatencyReporter, TimedQueue
+
+
+def test_histogram_buckets_bound_relative_error() -> None:
+    histogram = LatencyHistogram("stage")
+    upper = histogram.upper_bounds()
+    lower = np.concatenate([[0], upper[:-1] + 1])
+    assert np.all(upper >= lower)
+
+    rng = np.random.default_rng(3)
+    values = np.concatenate([np.arange(300), rng.integers(0, 10**10, 2000)]).tolist()
+    for value in values:
+        histogram.record(value)
+        index = int(np.searchsorted(upper, value))
+        assert lower[index] <= value <= upper[index]
+        # Exact below 128ns, otherwise a bucket spans under 1/64 of its values.
+        assert upper[index] - lower[index] <= value / 64
+
+    assert histogram.count == len(values)
+    assert (
+        histogram.counts().tolist()
+        == np.bincount(np.searchsorted(upper, values), minlength=len(upper)).tolist()
+    )
+
+    # Beyond max_value_ns: clamped into the last bucket.
+    histogram.record(2**40)
+    assert histogram.counts()[-1] >= 1
+    assert histogram.count == len(values) + 1
+
+
+def test_snapshot_percentiles_track_exact_ones() -> None:
+    histogram = LatencyHistogram("stage")
+    values = np.random.default_rng(5).lognormal(11.0, 1.0, 20_000).astype(np.int64)
+    for value in values.tolist():
+        histogram.record(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot.count == len(values)
+    assert snapshot.mean_ns == pytest.approx(values.mean())
+    for quantile, estimate in (
+        (0.5, snapshot.p50_ns),
+        (0.9, snapshot.p90_ns),
+        (0.99, snapshot.p99_ns),
+        (0.999, snapshot.p999_ns),
+    ):
+        exact = float(np.quantile(values, quantile, method="inverted_cdf"))
+        assert exact <= estimate <= exact * (1 + 1 / 64) + 1
+    assert values.max() <= snapshot.max_ns <= values.max() * (1 + 1 / 64)
+
+
+def test_empty_snapshot_is_zero() -> None:
+    snapshot = LatencyHistogram("idle").snapshot()
+    assert (snapshot.count, snapshot.p99_ns, snapshot.max_ns) == (0, 0, 0)
+
+
+def test_reporter_reports_each_interval_separately(tmp_path: Path) -> None:
+    recorder = LatencyRecorder()
+    parse = recorder.histogram("coinbase.parse")
+    assert recorder.histogram("coinbase.parse") is parse
+    for value in (1_000, 2_000, 3_000):
+        parse.record(value)
+    path = tmp_path / "latency" / "latency.jsonl"
+    reporter = LatencyReporter(recorder, interval_s=1.0, path=path)
+
+    first = reporter.report()
+    parse.record(500_000)
+    recorder.histogram("queue").record(40)
+    second = reporter.report()
+
+    assert [(s.stage, s.count, s.mean_ns) for s in first] == [("coinbase.parse", 3, 2_000.0)]
+    assert [(s.stage, s.count, s.p50_ns) for s in second] == [
+        ("coinbase.parse", 1, second[0].max_ns),
+        ("queue", 1, 40),
+    ]
+    assert 500_000 <= second[0].max_ns <= 500_000 * (1 + 1 / 64)
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(line["stage"], line["count"]) for line in lines] == [
+        ("coinbase.parse", 3),
+        ("coinbase.parse", 1),
+        ("queue", 1),
+    ]
+    assert all(isinstance(line["timestamp_ms"], int) for line in lines)
+
+
+async def test_reporter_run_reports_once_more_on_cancel(tmp_path: Path) -> None:
+    recorder = LatencyRecorder()
+    recorder.histogram("store.write").record(10_000)
+    path = tmp_path / "latency.jsonl"
+    task = asyncio.create_task(LatencyReporter(recorder, interval_s=60.0, path=path).run())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert [json.loads(line)["count"] for line in path.read_text().splitlines()] == [1]
+
+
+async def test_timed_queue_samples_every_nth_item() -> None:
+    histogram = LatencyHistogram("queue")
+    queue: TimedQueue[int] = TimedQueue(histogram, sample_every=3)
+    for i in range(10):
+        await queue.put(i)
+    received = [queue.get_nowait() for _ in range(7)]
+    await queue.put(10)
+    received.extend([await queue.get() for _ in range(4)])
+
+    assert received == list(range(11))
+    assert histogram.count == 3
+    assert queue.empty()
+
+
+def test_sampling_rates_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        LatencyRecorder(sample_every=0)
+    with pytest.raises(ValueError):
+        TimedQueue(LatencyHistogram("queue"), sample_every=0)
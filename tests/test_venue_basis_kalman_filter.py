@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import math
+import random
+from dataclasses import replace
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
+from icarus.strategy.fair_value.filters import venue_basis_kalman_filter
 from icarus.strategy.fair_value.filters.venue_basis_kalman_filter import (
+    VenueBasisBuffers,
     VenueBasisKalmanConfig,
     VenueBasisKalmanFilter,
+    VenueBasisLayout,
     VenueBasisObservation,
 )
 
@@ -392,3 +399,164 @@ def test_observation_variance_is_not_age_penalized_twice() -> None:
     assert result is not None
     assert result.observation_variances["coinbase"] == pytest.approx(9.0, abs=1e-9)
     assert result.observation_variances["kraken"] == pytest.approx(16.0, abs=1e-9)
+
+
+# 0 forces the numpy path that layouts past the float-loop size use.
+@pytest.mark.parametrize("scalar_max_dim", [venue_basis_kalman_filter._SCALAR_MAX_DIM, 0])
+def test_sequential_update_matches_joint_update(
+    scalar_max_dim: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(venue_basis_kalman_filter, "_SCALAR_MAX_DIM", scalar_max_dim)
+    rng = random.Random(11)
+    config = VenueBasisKalmanConfig(
+        anchor_exchange="coinbase",
+        venue_order=("coinbase", "kraken", "okx"),
+        perp_exchange_order=("hyperliquid_perp",),
+    )
+    joint = VenueBasisKalmanFilter(config=replace(config, update_method="joint"))
+    sequential = VenueBasisKalmanFilter(config=replace(config, update_method="sequential"))
+    offsets = {"coinbase": 0.0, "kraken": 3.0, "okx": -1.5, "hyperliquid_perp": 12.0}
+
+    mid = 100.0
+    timestamp_s = 0.0
+    compared = 0
+    for step in range(300):
+        timestamp_s += rng.choice((0.01, 0.1, 0.5))
+        mid += rng.gauss(0.0, 0.2)
+        # okx only appears later (layout growth); coinbase drops out now and then.
+        names = [
+            name
+            for name in offsets
+            if (name != "okx" or step >= 40) and (name != "coinbase" or step % 17)
+        ]
+        observations = [
+            _obs(
+                name,
+                mid + offsets[name] + rng.gauss(0.0, 0.1),
+                rng.uniform(0.01, 2.0),
+                age_ms=rng.uniform(0.0, 1500.0),
+                venue_kind="perp" if name == "hyperliquid_perp" else "spot",
+            )
+            for name in names
+        ]
+
+        expected = joint.update(timestamp_s, observations)
+        actual = sequential.update(timestamp_s, observations)
+
+        if expected is None:
+            assert actual is None
+            continue
+        assert actual is not None
+        compared += 1
+        assert actual.active_venues == expected.active_venues
+        assert actual.common_price == pytest.approx(expected.common_price, rel=1e-9)
+        assert actual.common_price_stddev == pytest.approx(expected.common_price_stddev, rel=1e-9)
+        for name, estimate in expected.basis_estimates.items():
+            assert actual.basis_estimates[name] == pytest.approx(estimate, rel=1e-9, abs=1e-9)
+            assert actual.basis_stddevs[name] == pytest.approx(
+                expected.basis_stddevs[name], rel=1e-9
+            )
+        assert actual.innovations == pytest.approx(expected.innovations, rel=1e-9, abs=1e-9)
+
+    assert compared > 200
+    assert sequential.basis_state_indices == joint.basis_state_indices
+
+
+def test_unknown_update_method_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        VenueBasisKalmanFilter(
+            config=VenueBasisKalmanConfig(
+                anchor_exchange="coinbase",
+                update_method="qr",  # type: ignore[arg-type]
+            )
+        )
+
+
+@pytest.mark.parametrize("update_method", ["joint", "sequential"])
+def test_update_arrays_matches_object_update(update_method: str) -> None:
+    rng = random.Random(13)
+    config = VenueBasisKalmanConfig(
+        anchor_exchange="coinbase",
+        venue_order=("coinbase", "kraken", "okx"),
+        perp_exchange_order=("hyperliquid_perp",),
+        update_method=update_method,  # type: ignore[arg-type]
+    )
+    layout = VenueBasisLayout.from_config(config)
+    assert layout.names == ("coinbase", "kraken", "okx", "hyperliquid_perp")
+    assert layout.kinds == ("spot", "spot", "spot", "perp")
+    objects = VenueBasisKalmanFilter(config=config)
+    arrays = VenueBasisKalmanFilter(config=config)
+    out = VenueBasisBuffers.allocate(layout)
+    offsets = [0.0, 3.0, -1.5, 12.0]
+
+    mid = 100.0
+    compared = 0
+    for step in range(300):
+        mid += rng.gauss(0.0, 0.2)
+        # okx only appears later; other venues drop out now and then.
+        fair_values = [
+            math.nan
+            if (slot == 2 and step < 40) or rng.random() < 0.08
+            else mid + offset + rng.gauss(0.0, 0.1)
+            for slot, offset in enumerate(offsets)
+        ]
+        variances = [rng.uniform(0.01, 2.0) for _ in offsets]
+        ages_ms = [rng.uniform(0.0, 1500.0) for _ in offsets]
+
+        expected = objects.update(
+            step * 0.1,
+            [
+                _obs(name, fair_value, variance, age_ms=age, venue_kind=kind)
+                for name, kind, fair_value, variance, age in zip(
+                    layout.names, layout.kinds, fair_values, variances, ages_ms, strict=True
+                )
+                if not math.isnan(fair_value)
+            ],
+        )
+        common_price = arrays.update_arrays(
+            step * 0.1,
+            layout,
+            np.array(fair_values),
+            np.array(variances),
+            out,
+            ages_ms=np.array(ages_ms),
+        )
+
+        if expected is None:
+            assert common_price is None
+            continue
+        compared += 1
+        assert common_price == expected.common_price
+        assert arrays.last_result() == expected
+        for slot, name in enumerate(layout.names):
+            if name in expected.basis_estimates:
+                assert out.basis[slot] == expected.basis_estimates[name]
+                assert out.basis_stddev[slot] == expected.basis_stddevs[name]
+            else:
+                assert math.isnan(out.basis[slot])
+            if name in expected.active_venues:
+                assert out.innovation[slot] == expected.innovations[name]
+                assert out.observation_variance[slot] == expected.observation_variances[name]
+            else:
+                assert math.isnan(out.innovation[slot])
+                assert math.isnan(out.observation_variance[slot])
+
+    assert compared > 200
+
+
+def test_layout_rejects_duplicate_venues_and_mismatched_inputs() -> None:
+    with pytest.raises(ValueError):
+        VenueBasisLayout(names=("coinbase", "coinbase"), kinds=("spot", "spot"))
+    with pytest.raises(ValueError):
+        VenueBasisLayout(names=("coinbase",), kinds=("spot", "perp"))
+
+    layout = VenueBasisLayout(names=("coinbase", "kraken"), kinds=("spot", "spot"))
+    filt = VenueBasisKalmanFilter(config=VenueBasisKalmanConfig(anchor_exchange="coinbase"))
+    with pytest.raises(ValueError):
+        filt.update_arrays(
+            0.0,
+            layout,
+            np.array([100.0]),
+            np.array([1.0, 1.0]),
+            VenueBasisBuffers.allocate(layout),
+        )
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from icarus.features import Fold, WalkForwardJob, WalkForwardPool, make_folds
+
+
+def _ridge_fold(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_test: np.ndarray,
+    y_test: np.ndarray,
+    alpha: float,
+) -> tuple[float, np.ndarray]:
+    gram = x_train.T @ x_train + alpha * np.eye(x_train.shape[1])
+    coef = np.linalg.solve(gram, x_train.T @ y_train)
+    return float(((y_test - x_test @ coef) ** 2).mean()), coef
+
+
+def test_make_folds_slides_fixed_windows() -> None:
+    assert make_folds(25, train_size=10, test_size=5, step=5) == [
+        Fold(0, 0, 10, 10, 15),
+        Fold(1, 5, 15, 15, 20),
+        Fold(2, 10, 20, 20, 25),
+    ]
+    assert make_folds(14, train_size=10, test_size=5, step=5) == []
+    with pytest.raises(ValueError):
+        make_folds(25, train_size=10, test_size=5, step=0)
+
+
+def test_parallel_run_matches_serial_run() -> None:
+    rng = np.random.default_rng(11)
+    jobs = []
+    for n, alpha in ((900, 1.0), (0, 1.0), (700, 0.1)):
+        x = rng.normal(size=(n, 8))
+        y = x @ rng.normal(size=8) + rng.normal(size=n)
+        jobs.append(WalkForwardJob(x, y, make_folds(n, 300, 100, 150), _ridge_fold, (alpha,)))
+
+    with WalkForwardPool(workers=1) as pool:
+        serial = pool.run(jobs)
+    with WalkForwardPool(workers=2) as pool:
+        parallel = pool.run(jobs)
+        # The pool is reused across runs.
+        again = pool.run(jobs[2:])
+
+    assert [len(results) for results in serial] == [4, 0, 3]
+    for serial_results, parallel_results in zip(serial + serial[2:], parallel + again, strict=True):
+        assert len(serial_results) == len(parallel_results)
+        for (mse, coef), (parallel_mse, parallel_coef) in zip(
+            serial_results, parallel_results, strict=True
+        ):
+            assert mse == parallel_mse
+            assert np.array_equal(coef, parallel_coef)